@@ -0,0 +1,76 @@
+"""permit customer match keys.
+
+Adds `permit_customer_match_keys`, a per-customer cache of the normalized
+address / phone / city / name keys used by the permit-to-customer linker.
+`batch_link_permits(persist_keys=True)` fills it so later runs only have to
+re-normalize customers that changed since the keys were computed.
+
+Revision ID: 122
+Revises: 121
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "122"
+down_revision = "121"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "permit_customer_match_keys",
+        sa.Column(
+            "customer_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("customers.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("address_key", sa.Text(), nullable=True),
+        sa.Column("phone_key", sa.String(length=10), nullable=True),
+        sa.Column("city_key", sa.String(length=100), nullable=True),
+        sa.Column("name_key", sa.String(length=255), nullable=True),
+        sa.Column("source_updated_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_index(
+        "ix_permit_customer_match_keys_address_key",
+        "permit_customer_match_keys",
+        ["address_key"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_permit_customer_match_keys_phone_key",
+        "permit_customer_match_keys",
+        ["phone_key"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_permit_customer_match_keys_city_key",
+        "permit_customer_match_keys",
+        ["city_key"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_permit_customer_match_keys_city_key",
+        table_name="permit_customer_match_keys",
+    )
+    op.drop_index(
+        "ix_permit_customer_match_keys_phone_key",
+        table_name="permit_customer_match_keys",
+    )
+    op.drop_index(
+        "ix_permit_customer_match_keys_address_key",
+        table_name="permit_customer_match_keys",
+    )
+    op.drop_table("permit_customer_match_keys")
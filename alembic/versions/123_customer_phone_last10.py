@@ -0,0 +1,83 @@
+"""customers.phone_last10 for indexed caller-ID lookups.
+
+Adds `customers.phone_last10` (the US 10-digit form of `phone`) with a btree index
+so inbound webhooks can resolve caller -> customer with one indexed probe
+instead of scanning every customer's phone in Python.
+
+The ORM keeps the column in sync via a `@validates("phone")` hook; a
+BEFORE INSERT/UPDATE trigger covers the raw-SQL writers (admin imports,
+dispatch quick-create, seed scripts).
+
+Revision ID: 123
+Revises: 122
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "123"
+down_revision = "122"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "customers",
+        sa.Column("phone_last10", sa.String(length=10), nullable=True),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION customers_sync_phone_last10() RETURNS trigger AS $$
+        DECLARE
+            digits TEXT;
+        BEGIN
+            digits := regexp_replace(COALESCE(NEW.phone, ''), '[^0-9]', '', 'g');
+            IF length(digits) = 11 AND left(digits, 1) = '1' THEN
+                digits := right(digits, 10);
+            END IF;
+            IF length(digits) = 10 THEN
+                NEW.phone_last10 := digits;
+            ELSE
+                NEW.phone_last10 := NULL;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_customers_phone_last10
+        BEFORE INSERT OR UPDATE OF phone ON customers
+        FOR EACH ROW EXECUTE FUNCTION customers_sync_phone_last10()
+        """
+    )
+
+    # Backfill existing rows
+    op.execute(
+        """
+        UPDATE customers
+        SET phone_last10 = right(d.digits, 10)
+        FROM (
+            SELECT id, regexp_replace(phone, '[^0-9]', '', 'g') AS digits
+            FROM customers
+            WHERE phone IS NOT NULL
+        ) AS d
+        WHERE customers.id = d.id
+          AND (length(d.digits) = 10
+               OR (length(d.digits) = 11 AND left(d.digits, 1) = '1'))
+        """
+    )
+
+    op.create_index(
+        "ix_customers_phone_last10", "customers", ["phone_last10"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_customers_phone_last10", table_name="customers")
+    op.execute("DROP TRIGGER IF EXISTS trg_customers_phone_last10 ON customers")
+    op.execute("DROP FUNCTION IF EXISTS customers_sync_phone_last10()")
+    op.drop_column("customers", "phone_last10")
@@ -0,0 +1,45 @@
+"""dispatch_plans for the multi-technician day planner.
+
+Holds proposed assignments of a day's unassigned work orders to
+technicians. Plans are written by auto_dispatch or on request and only
+touch work_orders when a dispatcher accepts them.
+
+Revision ID: 124
+Revises: 123
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "124"
+down_revision = "123"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dispatch_plans",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("plan_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="planning"),
+        sa.Column("time_limit_seconds", sa.Float(), nullable=True),
+        sa.Column("assignments", sa.JSON(), nullable=True),
+        sa.Column("unassigned", sa.JSON(), nullable=True),
+        sa.Column("summary", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.String(length=100), nullable=True),
+        sa.Column("accepted_by", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("accepted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_dispatch_plans_plan_date", "dispatch_plans", ["plan_date"])
+    op.create_index("ix_dispatch_plans_status", "dispatch_plans", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dispatch_plans_status", table_name="dispatch_plans")
+    op.drop_index("ix_dispatch_plans_plan_date", table_name="dispatch_plans")
+    op.drop_table("dispatch_plans")
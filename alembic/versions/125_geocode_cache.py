@@ -0,0 +1,32 @@
+"""geocode_cache for the shared geocoding subsystem.
+
+Address -> coordinates keyed by the same SHA256 address hash septic
+permits use. Rows without coordinates are cached misses.
+
+Revision ID: 125
+Revises: 124
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "125"
+down_revision = "124"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "geocode_cache",
+        sa.Column("address_hash", sa.String(length=64), primary_key=True),
+        sa.Column("query", sa.Text(), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("provider", sa.String(length=20), nullable=False, server_default="nominatim"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("geocode_cache")
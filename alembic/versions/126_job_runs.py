@@ -0,0 +1,37 @@
+"""job_runs for the shared job scheduler.
+
+One row per fire of a scheduled job; the unique (job_name, scheduled_for)
+pair lets exactly one replica claim each fire.
+
+Revision ID: 126
+Revises: 125
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+revision = "126"
+down_revision = "125"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_runs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_name", sa.String(length=100), nullable=False),
+        sa.Column("scheduled_for", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("replica", sa.String(length=100), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("duration_seconds", sa.Float(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.UniqueConstraint("job_name", "scheduled_for", name="uq_job_runs_job_fire"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_runs")
@@ -0,0 +1,42 @@
+"""ai_jobs for the durable AI analysis queue.
+
+One row per interaction to analyze, keyed by "<channel>:<source_id>";
+workers claim queued rows with FOR UPDATE SKIP LOCKED and hold a lease
+while running.
+
+Revision ID: 127
+Revises: 126
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+revision = "127"
+down_revision = "126"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("idempotency_key", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("source_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("channel", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_ai_jobs_status_run_after", "ai_jobs", ["status", "run_after"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_jobs_status_run_after", table_name="ai_jobs")
+    op.drop_table("ai_jobs")
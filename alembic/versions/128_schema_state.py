@@ -0,0 +1,32 @@
+"""schema_state for the startup schema fingerprint.
+
+One row ("app") holding the fingerprint of the last completed schema setup
+(create_all plus the ensure_* steps), so startup can skip that DDL when the
+schema is already current.
+
+Revision ID: 128
+Revises: 127
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "128"
+down_revision = "127"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "schema_state",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("applied_by", sa.String(length=100), nullable=True),
+        sa.Column("applied_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_seconds", sa.Float(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("schema_state")
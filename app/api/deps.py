@@ -14,7 +14,6 @@ from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status, Cookie, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from jose import JWTError, jwt
 import bcrypt
 from datetime import datetime, timedelta
@@ -24,6 +23,7 @@ from app.database import get_db, async_session_maker
 from app.config import settings
 from app.models.user import User
 from app.schemas.auth import TokenData
+from app.services.principal_cache import principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -112,8 +112,8 @@ async def get_current_user(
         logger.warning("Invalid token format", extra={"auth_method": auth_method})
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalar_one_or_none()
+    # Served from the principal cache on the common path (no query)
+    user = await principal_cache.get_user(db, token_data.user_id)
 
     if user is None:
         raise credentials_exception
@@ -152,34 +152,15 @@ async def get_entity_context(
     Extract entity context from X-Entity-ID header.
     Falls back to user's default entity, then system default.
     Returns None only if no entities exist yet.
+
+    Entities are resolved from the principal cache (one query per TTL for
+    all of them).
     """
-    entity_id = request.headers.get("X-Entity-ID")
-
-    if entity_id:
-        result = await db.execute(
-            select(CompanyEntity).where(
-                CompanyEntity.id == entity_id,
-                CompanyEntity.is_active == True,
-            )
-        )
-        entity = result.scalar_one_or_none()
-        if entity:
-            return entity
-
-    # Fallback: user's default entity
-    if current_user.default_entity_id:
-        result = await db.execute(
-            select(CompanyEntity).where(CompanyEntity.id == current_user.default_entity_id)
-        )
-        entity = result.scalar_one_or_none()
-        if entity:
-            return entity
-
-    # Fallback: system default entity (is_default=True)
-    result = await db.execute(
-        select(CompanyEntity).where(CompanyEntity.is_default == True)
+    return await principal_cache.resolve_entity(
+        db,
+        request.headers.get("X-Entity-ID"),
+        current_user.default_entity_id,
     )
-    return result.scalar_one_or_none()
 
 
 EntityCtx = Annotated[Optional[CompanyEntity], Depends(get_entity_context)]
@@ -227,9 +208,9 @@ async def get_current_user_ws(token: str | None, session_cookie: str | None = No
         return None
 
     # Get database session manually since we can't use dependency injection
+    # (it only connects if the principal cache misses)
     async with async_session_maker() as db:
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        user = await principal_cache.get_user(db, user_id)
 
         if user is None:
             logger.warning(f"WebSocket auth failed: user {user_id} not found")
@@ -9,16 +9,15 @@ import hashlib
 import secrets
 import logging
 from typing import Annotated, Optional
-from datetime import datetime
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.database import get_db
-from app.models.oauth import APIClient, APIToken
+from app.models.oauth import APIClient
 from app.core.rate_limit import get_public_api_rate_limiter, rate_limit_by_ip
+from app.services.principal_cache import principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -58,9 +57,8 @@ async def get_current_api_client(
     # Hash the token for lookup
     token_hash = hash_token(token)
 
-    # Find the token in database
-    result = await db.execute(select(APIToken).where(APIToken.token_hash == token_hash))
-    api_token = result.scalar_one_or_none()
+    # Find the token and its client (principal cache; no query on the common path)
+    api_token, client = await principal_cache.get_api_token(db, token_hash)
 
     if not api_token:
         logger.warning("Invalid token attempted")
@@ -80,26 +78,20 @@ async def get_current_api_client(
             )
         raise credentials_exception
 
-    # Get the client
-    result = await db.execute(select(APIClient).where(APIClient.id == api_token.client_id))
-    client = result.scalar_one_or_none()
-
     if not client or not client.is_active:
         logger.warning(f"Token used for inactive/missing client {api_token.client_id}")
         raise credentials_exception
 
     # Apply rate limiting
     rate_limiter = get_public_api_rate_limiter()
-    rate_limiter.check_rate_limit(
+    await rate_limiter.check_rate_limit(
         client_id=client.client_id,
         rate_limit_per_minute=client.rate_limit_per_minute,
         rate_limit_per_hour=client.rate_limit_per_hour,
     )
 
-    # Update last used timestamps
-    api_token.last_used_at = datetime.utcnow()
-    client.last_used_at = datetime.utcnow()
-    await db.commit()
+    # Update last used timestamps (throttled per token)
+    await principal_cache.touch_api_token(db, api_token, client)
 
     # Store token scopes in request state for scope checking
     request.state.token_scopes = api_token.scope_list
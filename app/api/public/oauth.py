@@ -117,7 +117,7 @@ async def get_token(
     - refresh_token: Refresh an existing token
     """
     # Rate limit by IP to prevent brute force
-    rate_limit_by_ip(request, requests_per_minute=30)
+    await rate_limit_by_ip(request, requests_per_minute=30)
 
     # Validate grant type
     if grant_type not in ("client_credentials", "refresh_token"):
@@ -354,7 +354,7 @@ async def revoke_token(
     Per RFC 7009, always return 200 OK even if token is invalid.
     """
     # Rate limit
-    rate_limit_by_ip(request, requests_per_minute=30)
+    await rate_limit_by_ip(request, requests_per_minute=30)
 
     # Verify client credentials
     result = await db.execute(select(APIClient).where(APIClient.client_id == client_id))
@@ -419,7 +419,7 @@ async def introspect_token(
     Returns information about a token including whether it's active.
     """
     # Rate limit
-    rate_limit_by_ip(request, requests_per_minute=60)
+    await rate_limit_by_ip(request, requests_per_minute=60)
 
     # Verify client credentials
     result = await db.execute(select(APIClient).where(APIClient.client_id == client_id))
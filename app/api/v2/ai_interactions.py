@@ -4,6 +4,8 @@ Routes (mounted at /api/v2):
   GET  /customers/{customer_id}/interactions       — per-customer history
   GET  /ai/interactions/hot                         — cross-channel hot leads inbox
   GET  /ai/budget                                   — daily/monthly spend + cap + paused
+  GET  /ai/queue/jobs                               — analysis job counts + jobs by status (dead letters)
+  POST /ai/queue/jobs/{job_id}/retry                — re-queue a dead job
   GET  /ai/interactions/{interaction_id}            — full detail (action items, latest run)
   POST /ai/interactions/{interaction_id}/reanalyze  — re-run worker pipeline
   POST /ai/interactions/{interaction_id}/dismiss-hot — clear hot_lead_score, mark dismissed
@@ -17,25 +19,29 @@ import logging
 import uuid as uuid_module
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import CurrentUser, DbSession
+from app.models.ai_job import AIJob
 from app.models.customer import Customer
 from app.models.customer_interaction import (
     CustomerInteraction,
     InteractionAnalysisRun,
 )
 from app.schemas.interactions import (
+    AIJobRead,
+    AIQueueSummary,
     BudgetSummary,
     HotLeadItem,
     InteractionListItem,
     InteractionRead,
 )
 from app.services.ai import budget as budget_module
+from app.services.ai.queue import retry_dead_job
 
 logger = logging.getLogger(__name__)
 
@@ -236,6 +242,53 @@ async def get_ai_budget(
     )
 
 
+# ---------------------------------------------------------------------------
+# GET /ai/queue/jobs
+# ---------------------------------------------------------------------------
+@router.get(
+    "/ai/queue/jobs",
+    response_model=AIQueueSummary,
+    summary="Analysis job counts by status, and the jobs in one status",
+    tags=["ai-interactions"],
+)
+async def list_ai_jobs(
+    db: DbSession,
+    current_user: CurrentUser,
+    job_status: Literal["queued", "running", "done", "dead"] = Query("dead", alias="status"),
+    limit: int = Query(50, ge=1, le=500),
+) -> AIQueueSummary:
+    """Counts per status plus the most recent jobs in `status` (dead letters by default)."""
+    counts = dict((await db.execute(select(AIJob.status, func.count()).group_by(AIJob.status))).all())
+    jobs = (
+        await db.execute(
+            select(AIJob).where(AIJob.status == job_status).order_by(AIJob.created_at.desc()).limit(limit)
+        )
+    ).scalars().all()
+    return AIQueueSummary(counts=counts, jobs=[AIJobRead.model_validate(job) for job in jobs])
+
+
+# ---------------------------------------------------------------------------
+# POST /ai/queue/jobs/{job_id}/retry
+# ---------------------------------------------------------------------------
+@router.post(
+    "/ai/queue/jobs/{job_id}/retry",
+    response_model=AIJobRead,
+    summary="Re-queue a dead analysis job with a fresh set of attempts",
+    tags=["ai-interactions"],
+)
+async def retry_ai_job(
+    job_id: str,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> AIJobRead:
+    job = await db.get(AIJob, _parse_uuid(job_id, label="Job"))
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job.status != "dead":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}, not dead")
+    return AIJobRead.model_validate(await retry_dead_job(db, job))
+
+
 # ---------------------------------------------------------------------------
 # GET /ai/interactions/{interaction_id}   (DYNAMIC — declared AFTER static)
 # ---------------------------------------------------------------------------
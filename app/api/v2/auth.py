@@ -47,14 +47,14 @@ async def login(
 ):
     """Authenticate user and return JWT token (or MFA challenge if enabled)."""
     # Rate limit: 120 requests/minute per IP to prevent brute force
-    rate_limit_by_ip(request, requests_per_minute=120)
+    await rate_limit_by_ip(request, requests_per_minute=120)
 
     # Per-email rate limit: prevent credential stuffing
     from app.core.rate_limit import get_public_api_rate_limiter
     import hashlib
     email_hash = hashlib.sha256(login_data.email.lower().encode()).hexdigest()[:16]
     email_limiter = get_public_api_rate_limiter()
-    email_limiter.check_rate_limit(
+    await email_limiter.check_rate_limit(
         client_id=f"login_email:{email_hash}",
         rate_limit_per_minute=30,
         rate_limit_per_hour=300,
@@ -136,8 +136,7 @@ async def login(
         )
 
         # Log successful login
-        import asyncio
-        asyncio.create_task(log_activity(
+        log_activity(
             category="auth",
             action="login",
             description=f"Login successful for {user.email}",
@@ -148,14 +147,13 @@ async def login(
             user_agent=(request.headers.get("user-agent", ""))[:500],
             source=request.headers.get("x-source", "crm"),
             session_id=request.headers.get("x-correlation-id", ""),
-        ))
+        )
 
         return Token(access_token=access_token, token=access_token, token_type="bearer")
     except HTTPException as he:
         # Log failed login attempt
         if he.status_code == 401:
-            import asyncio
-            asyncio.create_task(log_activity(
+            log_activity(
                 category="auth",
                 action="login_failed",
                 description=f"Failed login for {login_data.email}: {he.detail}",
@@ -163,7 +161,7 @@ async def login(
                 ip_address=get_client_ip(request),
                 user_agent=(request.headers.get("user-agent", ""))[:500],
                 source=request.headers.get("x-source", "crm"),
-            ))
+            )
         raise
     except Exception as e:
         logger.error(f"Login error: {type(e).__name__}: {str(e)}")
@@ -183,8 +181,7 @@ async def logout(request: Request, response: Response):
             payload = jwt_lib.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
             user_email = payload.get("email")
             user_id = payload.get("sub")
-            import asyncio
-            asyncio.create_task(log_activity(
+            log_activity(
                 category="auth",
                 action="logout",
                 description=f"Logout for {user_email}",
@@ -194,7 +191,7 @@ async def logout(request: Request, response: Response):
                 user_agent=(request.headers.get("user-agent", ""))[:500],
                 source=request.headers.get("x-source", "crm"),
                 session_id=request.headers.get("x-correlation-id", ""),
-            ))
+            )
     except Exception:
         pass  # Logout should always succeed
 
@@ -291,7 +288,7 @@ async def register(
 ):
     """Register a new user."""
     # Rate limit: 10 requests/minute per IP to prevent account enumeration
-    rate_limit_by_ip(request, requests_per_minute=10)
+    await rate_limit_by_ip(request, requests_per_minute=10)
 
     # Validate password complexity
     password_errors = validate_password(user_data.password)
@@ -339,7 +336,7 @@ async def login_mfa(
 ):
     """Complete login with MFA verification."""
     # Rate limit: 20 requests/minute per IP
-    rate_limit_by_ip(request, requests_per_minute=20)
+    await rate_limit_by_ip(request, requests_per_minute=20)
 
     mfa_manager = MFAManager(db)
     success, user_id, error_message = await mfa_manager.verify_mfa_session(
@@ -379,8 +376,7 @@ async def login_mfa(
     logger.info(f"MFA login successful for user {user.id}")
 
     # Log MFA login
-    import asyncio
-    asyncio.create_task(log_activity(
+    log_activity(
         category="auth",
         action="mfa_verified",
         description=f"MFA login successful for {user.email}",
@@ -389,7 +385,7 @@ async def login_mfa(
         ip_address=get_client_ip(request),
         user_agent=(request.headers.get("user-agent", ""))[:500],
         source=request.headers.get("x-source", "crm"),
-    ))
+    )
 
     return Token(access_token=access_token, token=access_token, token_type="bearer")
 
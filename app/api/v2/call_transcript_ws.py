@@ -7,7 +7,6 @@ Three WebSocket paths (mounted at app root, NOT under /api/v2):
 3. /ws/ringcentral-audio/{call_id}    -- Frontend sends RingCentral WebRTC audio here
 """
 
-import asyncio
 import base64
 import json
 import logging
@@ -19,7 +18,8 @@ from sqlalchemy import select
 from app.services.call_transcript_manager import transcript_manager
 from app.services import google_stt_service
 from app.services.google_stt_service import GoogleSTTStreamer
-from app.services.location_extractor import LocationExtractor, haversine_distance, estimate_drive_minutes
+from app.services.geo import haversine_miles
+from app.services.location_extractor import LocationExtractor, estimate_drive_minutes
 from app.services.market_config import get_market_by_area_code, get_zone
 from app.database import async_session_maker
 from app.models.customer import Customer
@@ -89,9 +89,7 @@ async def ws_twilio_media(websocket: WebSocket, call_sid: str):
                 # Run location extraction on final transcript chunks
                 if is_final and location_extractor:
                     try:
-                        location = await asyncio.to_thread(
-                            location_extractor.extract_location_from_text, text
-                        )
+                        location = await location_extractor.extract_location_from_text(text)
                         if location:
                             await transcript_manager.broadcast_event(
                                 call_sid, "location_detected", location
@@ -174,7 +172,7 @@ async def ws_twilio_media(websocket: WebSocket, call_sid: str):
                                 lng = float(customer.longitude)
                                 zone = get_zone(lat, lng, market["slug"])
                                 center = market["center"]
-                                dist = haversine_distance(center["lat"], center["lng"], lat, lng)
+                                dist = haversine_miles(center["lat"], center["lng"], lat, lng)
                                 drive_min = estimate_drive_minutes(dist)
 
                                 addr_parts = [
@@ -264,9 +262,7 @@ async def ws_ringcentral_audio(websocket: WebSocket, call_id: str):
                 # Run location extraction on final transcript chunks
                 if is_final and rc_location_extractor:
                     try:
-                        location = await asyncio.to_thread(
-                            rc_location_extractor.extract_location_from_text, text
-                        )
+                        location = await rc_location_extractor.extract_location_from_text(text)
                         if location:
                             await transcript_manager.broadcast_event(
                                 call_id, "location_detected", location
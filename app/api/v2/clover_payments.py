@@ -32,7 +32,7 @@ from app.core.rate_limit import get_public_api_rate_limiter
 logger = logging.getLogger(__name__)
 
 
-def _payment_rate_limit(request: Request, current_user: CurrentUser):
+async def _payment_rate_limit(request: Request, current_user: CurrentUser):
     """Rate limit sensitive payment operations: 10 requests/min per user.
 
     Prevents abuse of charge, refund, and collect endpoints.
@@ -41,19 +41,19 @@ def _payment_rate_limit(request: Request, current_user: CurrentUser):
     import hashlib
     user_hash = hashlib.sha256(current_user.email.encode()).hexdigest()[:16]
     limiter = get_public_api_rate_limiter()
-    limiter.check_rate_limit(
+    await limiter.check_rate_limit(
         client_id=f"payment:{user_hash}",
         rate_limit_per_minute=10,
         rate_limit_per_hour=100,
     )
 
 
-def _refund_rate_limit(request: Request, current_user: CurrentUser):
+async def _refund_rate_limit(request: Request, current_user: CurrentUser):
     """Stricter rate limit for refund operations: 5 requests/min per user."""
     import hashlib
     user_hash = hashlib.sha256(current_user.email.encode()).hexdigest()[:16]
     limiter = get_public_api_rate_limiter()
-    limiter.check_rate_limit(
+    await limiter.check_rate_limit(
         client_id=f"refund:{user_hash}",
         rate_limit_per_minute=5,
         rate_limit_per_hour=30,
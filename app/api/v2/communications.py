@@ -147,7 +147,7 @@ async def send_sms(
 
     # Rate limiting
     try:
-        rate_limit_sms(current_user, request.to)
+        await rate_limit_sms(current_user, request.to)
     except HTTPException:
         logger.warning(
             "SMS rate limit exceeded", extra={"user_id": current_user.id, "destination_suffix": request.to[-4:]}
@@ -112,7 +112,7 @@ async def list_customers(
         page=page,
         page_size=page_size,
     )
-    await cache.set(cache_key, jsonable_encoder(response), ttl=TTL.SHORT)
+    await cache.set(cache_key, jsonable_encoder(response), ttl=TTL.SHORT, tags=["customers"])
     return response
 
 
@@ -179,8 +179,7 @@ async def create_customer(
     db.add(customer)
     await db.commit()
     await db.refresh(customer)
-    await get_cache_service().delete_pattern("customers:*")
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("customers", "dashboard", f"customer:{customer.id}")
 
     # Try to set the customer_uuid for invoice FK optimization
     # This may fail if migration 040 hasn't run yet, which is OK
@@ -207,6 +206,7 @@ async def create_customer(
                 customer.city,
                 customer.state,
                 customer.postal_code,
+                county=customer.county,
             )
             if coords:
                 customer.latitude = coords[0]
@@ -266,6 +266,7 @@ async def update_customer(
                 customer.city,
                 customer.state,
                 customer.postal_code,
+                county=customer.county,
             )
             if coords:
                 customer.latitude = coords[0]
@@ -276,8 +277,7 @@ async def update_customer(
         except Exception as e:
             logger.warning(f"Auto-geocode skipped for customer {customer.id}: {e}")
 
-    await get_cache_service().delete_pattern("customers:*")
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("customers", "dashboard", f"customer:{customer.id}")
     return customer
 
 
@@ -305,8 +305,7 @@ async def delete_customer(
     # This preserves data integrity and historical records
     customer.is_active = False
     await db.commit()
-    await get_cache_service().delete_pattern("customers:*")
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("customers", "dashboard", f"customer:{customer.id}")
 
 
 @router.post("/{customer_id}/archive")
@@ -323,8 +322,7 @@ async def archive_customer(
     customer.is_archived = True
     await db.commit()
     await db.refresh(customer)
-    await get_cache_service().delete_pattern("customers:*")
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("customers", "dashboard", f"customer:{customer.id}")
     return {"success": True, "id": str(customer.id), "is_archived": True}
 
 
@@ -342,6 +340,5 @@ async def unarchive_customer(
     customer.is_archived = False
     await db.commit()
     await db.refresh(customer)
-    await get_cache_service().delete_pattern("customers:*")
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("customers", "dashboard", f"customer:{customer.id}")
     return {"success": True, "id": str(customer.id), "is_archived": False}
@@ -386,7 +386,7 @@ async def get_dashboard_stats(
         recent_customers=recent_customers,
         today_jobs=today_jobs_list,
     )
-    await cache.set(cache_key, jsonable_encoder(response), ttl=TTL.MEDIUM)
+    await cache.set(cache_key, jsonable_encoder(response), ttl=TTL.MEDIUM, tags=["dashboard"])
     return response
 
 
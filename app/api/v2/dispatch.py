@@ -1,6 +1,14 @@
 """
 Smart Dispatch API — recommends technicians for work orders
 based on proximity, skills, availability, and workload.
+- GET /recommend/{work_order_id} — ranked technicians for one job
+- POST /recommend/batch — rankings for a queue of jobs in one call
+
+Day plans — batch assignment of a day's unassigned jobs across technicians:
+- POST /day-plans — start planning a date (runs in the background)
+- GET /day-plans?plan_date=... — plans for a date, newest first
+- GET /day-plans/{plan_id} — one plan with its assignments
+- POST /day-plans/{plan_id}/accept — apply a proposed plan
 
 Also provides the Command Center endpoints for quick phone-to-dispatch workflow:
 - GET /customer-lookup?phone=... — find customer by phone
@@ -10,7 +18,7 @@ Also provides the Command Center endpoints for quick phone-to-dispatch workflow:
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 import logging
 import uuid as _uuid
 
@@ -18,8 +26,11 @@ from sqlalchemy import select, text
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import DbSession, CurrentUser
-from app.services.dispatch_service import recommend_technicians
+from app.services.dispatch_service import recommend_for_many, recommend_technicians
+from app.services.day_planner import accept_day_plan, create_day_plan, start_day_plan
+from app.services.technician_state import get_technician_state
 from app.models.customer import Customer
+from app.models.dispatch_plan import DispatchPlan
 from app.models.work_order import WorkOrder
 from app.models.technician import Technician
 
@@ -52,6 +63,15 @@ class DispatchRecommendation(BaseModel):
     error: Optional[str] = None
 
 
+class BatchRecommendRequest(BaseModel):
+    work_order_ids: list[str] = Field(..., min_length=1, max_length=200)
+    max_results: int = Field(5, ge=1, le=50)
+
+
+class BatchRecommendResponse(BaseModel):
+    results: list[DispatchRecommendation]
+
+
 class AssignRequest(BaseModel):
     technician_id: str
 
@@ -72,6 +92,16 @@ async def get_dispatch_recommendation(
     return result
 
 
+@router.post("/recommend/batch", response_model=BatchRecommendResponse)
+async def get_batch_recommendations(
+    req: BatchRecommendRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+):
+    """Recommendations for several work orders; unknown ids come back with an error instead of failing the batch."""
+    return {"results": await recommend_for_many(db, req.work_order_ids, req.max_results)}
+
+
 @router.post("/assign/{work_order_id}")
 async def dispatch_assign(
     work_order_id: str,
@@ -118,6 +148,7 @@ async def dispatch_assign(
         },
     )
     await db.commit()
+    get_technician_state().invalidate_workload()
 
     return {
         "success": True,
@@ -128,6 +159,109 @@ async def dispatch_assign(
     }
 
 
+# =====================================================
+# Day Plans — multi-technician auto-dispatch
+# =====================================================
+
+
+class DayPlanRequest(BaseModel):
+    plan_date: date
+    time_limit_seconds: Optional[float] = Field(None, gt=0, le=300)
+
+
+class DayPlanResponse(BaseModel):
+    id: str
+    plan_date: date
+    status: str
+    time_limit_seconds: Optional[float] = None
+    assignments: list[dict] = []
+    unassigned: list[dict] = []
+    summary: dict = {}
+    error: Optional[str] = None
+    created_by: Optional[str] = None
+    accepted_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    accepted_at: Optional[datetime] = None
+
+
+def _day_plan_response(plan: DispatchPlan) -> DayPlanResponse:
+    return DayPlanResponse(
+        id=str(plan.id),
+        plan_date=plan.plan_date,
+        status=plan.status,
+        time_limit_seconds=plan.time_limit_seconds,
+        assignments=plan.assignments or [],
+        unassigned=plan.unassigned or [],
+        summary=plan.summary or {},
+        error=plan.error,
+        created_by=plan.created_by,
+        accepted_by=plan.accepted_by,
+        created_at=plan.created_at,
+        completed_at=plan.completed_at,
+        accepted_at=plan.accepted_at,
+    )
+
+
+async def _get_day_plan(db, plan_id: str) -> DispatchPlan:
+    try:
+        plan = await db.get(DispatchPlan, _uuid.UUID(plan_id))
+    except ValueError:
+        plan = None
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Day plan not found")
+    return plan
+
+
+@router.post("/day-plans", response_model=DayPlanResponse, status_code=202)
+async def request_day_plan(
+    req: DayPlanRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+):
+    """Start planning a date's unassigned jobs; poll the returned plan until it leaves "planning"."""
+    plan = await create_day_plan(db, req.plan_date, req.time_limit_seconds, created_by=current_user.email)
+    start_day_plan(plan.id)
+    return _day_plan_response(plan)
+
+
+@router.get("/day-plans", response_model=list[DayPlanResponse])
+async def list_day_plans(
+    db: DbSession,
+    current_user: CurrentUser,
+    plan_date: date = Query(..., description="Date the plans cover"),
+):
+    """Plans for a date, newest first."""
+    result = await db.execute(
+        select(DispatchPlan).where(DispatchPlan.plan_date == plan_date).order_by(DispatchPlan.created_at.desc())
+    )
+    return [_day_plan_response(plan) for plan in result.scalars().all()]
+
+
+@router.get("/day-plans/{plan_id}", response_model=DayPlanResponse)
+async def get_day_plan(
+    plan_id: str,
+    db: DbSession,
+    current_user: CurrentUser,
+):
+    """One plan with its assignments, per-technician summary and unassigned jobs."""
+    return _day_plan_response(await _get_day_plan(db, plan_id))
+
+
+@router.post("/day-plans/{plan_id}/accept")
+async def accept_plan(
+    plan_id: str,
+    db: DbSession,
+    current_user: CurrentUser,
+):
+    """Assign the plan's jobs to its technicians; jobs changed since planning are skipped."""
+    plan = await _get_day_plan(db, plan_id)
+    try:
+        return await accept_day_plan(db, plan, accepted_by=current_user.email)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
 # =====================================================
 # Command Center — Quick Dispatch Endpoints
 # =====================================================
@@ -17,6 +17,9 @@ from app.database import get_db
 from app.api.deps import get_current_user
 from app.core.rate_limit import rate_limit_by_ip
 from app.services.gps_tracking_service import GPSTrackingService, GeofenceService
+from app.services import eta_service
+from app.services.eta_service import cached_eta
+from app.services.gps_ingest import ingest_locations
 from app.schemas.gps_tracking import (
     LocationUpdate,
     LocationUpdateBatch,
@@ -54,44 +57,12 @@ async def update_location(
     Update technician's current GPS location.
     Called by mobile app at configured intervals.
     """
-    from sqlalchemy import text
     technician_id = current_user.technician_id if hasattr(current_user, "technician_id") else current_user.id
 
     try:
-        await db.execute(
-            text("""
-            INSERT INTO technician_locations
-                (id, technician_id, latitude, longitude, accuracy, speed, heading,
-                 is_online, battery_level, captured_at, received_at, current_status)
-            VALUES
-                (gen_random_uuid(), :tech_id, :lat, :lng, :accuracy, :speed, :heading,
-                 true, :battery, :captured_at, NOW(), 'available')
-            ON CONFLICT (technician_id) DO UPDATE SET
-                latitude = EXCLUDED.latitude,
-                longitude = EXCLUDED.longitude,
-                accuracy = EXCLUDED.accuracy,
-                speed = EXCLUDED.speed,
-                heading = EXCLUDED.heading,
-                is_online = true,
-                battery_level = EXCLUDED.battery_level,
-                captured_at = EXCLUDED.captured_at,
-                received_at = NOW()
-            """),
-            {
-                "tech_id": str(technician_id),
-                "lat": location.latitude,
-                "lng": location.longitude,
-                "accuracy": getattr(location, "accuracy", None),
-                "speed": getattr(location, "speed", None),
-                "heading": getattr(location, "heading", None),
-                "battery": getattr(location, "battery_level", None),
-                "captured_at": location.captured_at if hasattr(location, "captured_at") and location.captured_at else datetime.utcnow(),
-            },
-        )
-        await db.commit()
+        await ingest_locations(db, [(technician_id, location)])
     except Exception as e:
         logger.warning(f"GPS location update failed: {e}")
-        await db.rollback()
 
     return {"technician_id": str(technician_id), "latitude": location.latitude, "longitude": location.longitude, "updated": True}
 
@@ -103,53 +74,24 @@ async def update_location_batch(
     """
     Submit batch of location updates (for offline sync).
     Mobile app can queue locations while offline and sync when online.
+    Every point goes to location history and is checked against geofences.
     """
-    from sqlalchemy import text
     technician_id = current_user.technician_id if hasattr(current_user, "technician_id") else current_user.id
-    processed = 0
-
-    for location in sorted(batch.locations, key=lambda x: x.captured_at):
-        try:
-            await db.execute(
-                text("""
-                INSERT INTO technician_locations
-                    (id, technician_id, latitude, longitude, accuracy, speed, heading,
-                     is_online, battery_level, captured_at, received_at, current_status)
-                VALUES
-                    (gen_random_uuid(), :tech_id, :lat, :lng, :accuracy, :speed, :heading,
-                     true, :battery, :captured_at, NOW(), 'available')
-                ON CONFLICT (technician_id) DO UPDATE SET
-                    latitude = EXCLUDED.latitude,
-                    longitude = EXCLUDED.longitude,
-                    accuracy = EXCLUDED.accuracy,
-                    speed = EXCLUDED.speed,
-                    heading = EXCLUDED.heading,
-                    is_online = true,
-                    battery_level = EXCLUDED.battery_level,
-                    captured_at = EXCLUDED.captured_at,
-                    received_at = NOW()
-                """),
-                {
-                    "tech_id": str(technician_id),
-                    "lat": location.latitude,
-                    "lng": location.longitude,
-                    "accuracy": getattr(location, "accuracy", None),
-                    "speed": getattr(location, "speed", None),
-                    "heading": getattr(location, "heading", None),
-                    "battery": getattr(location, "battery_level", None),
-                    "captured_at": location.captured_at if hasattr(location, "captured_at") and location.captured_at else datetime.utcnow(),
-                },
-            )
-            processed += 1
-        except Exception as e:
-            logger.warning(f"Batch GPS update failed for one entry: {e}")
 
     try:
-        await db.commit()
-    except Exception:
-        await db.rollback()
+        result = await ingest_locations(db, [(technician_id, location) for location in batch.locations])
+        processed = result["processed"]
+        events = result["geofence_events"]
+    except Exception as e:
+        logger.warning(f"Batch GPS update failed: {e}")
+        processed, events = 0, []
 
-    return {"processed": processed, "total": len(batch.locations), "success": processed == len(batch.locations)}
+    return {
+        "processed": processed,
+        "total": len(batch.locations),
+        "success": processed == len(batch.locations),
+        "geofence_events": events,
+    }
 
 
 @router.get("/location/{technician_id}", response_model=TechnicianLocationResponse)
@@ -384,13 +326,16 @@ async def get_eta(
 ):
     """
     Get ETA for a work order.
-    Calculates based on technician's current location and traffic.
+    Calculates based on technician's current location and traffic; served
+    from the ETA cache, which GPS updates keep current.
     """
-    # ETA calculation requires real-time routing — not yet implemented with async ORM
-    raise HTTPException(
-        status_code=503,
-        detail="ETA calculation is not available in the current deployment.",
-    )
+    eta = await eta_service.get_eta(db, work_order_id, recalculate=recalculate)
+    if eta is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No ETA: work order not found, not assigned, or technician/destination location unknown",
+        )
+    return eta
 
 
 @router.post("/eta/notify")
@@ -527,11 +472,13 @@ async def get_public_tracking(
     This is the endpoint customers access to track their technician.
     No authentication required.
     """
+    from app.models.customer import Customer
     from app.models.gps_tracking import CustomerTrackingLink, TrackingLinkStatus
     from app.models.technician import Technician
+    from app.models.work_order import WorkOrder
 
     # SECURITY: Rate limit to prevent enumeration and abuse
-    rate_limit_by_ip(http_request, requests_per_minute=60)
+    await rate_limit_by_ip(http_request, requests_per_minute=60)
 
     result = await db.execute(
         select(CustomerTrackingLink).where(
@@ -547,20 +494,68 @@ async def get_public_tracking(
     if link.expires_at and link.expires_at < datetime.utcnow():
         raise HTTPException(status_code=410, detail="Tracking link has expired")
 
-    # Get technician info
-    tech_result = await db.execute(
-        select(Technician).where(Technician.id == link.technician_id)
+    row = (
+        await db.execute(
+            select(WorkOrder, Technician, Customer)
+            .select_from(WorkOrder)
+            .outerjoin(Technician, Technician.id == link.technician_id)
+            .outerjoin(Customer, Customer.id == WorkOrder.customer_id)
+            .where(WorkOrder.id == link.work_order_id)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Tracking link not found or expired")
+    work_order, tech, customer = row
+
+    if work_order.service_latitude is not None and work_order.service_longitude is not None:
+        dest_lat, dest_lng = work_order.service_latitude, work_order.service_longitude
+    elif customer is not None and customer.latitude is not None and customer.longitude is not None:
+        dest_lat, dest_lng = float(customer.latitude), float(customer.longitude)
+    else:
+        # Not geocoded: no destination to show and nothing an ETA could be measured to
+        dest_lat = dest_lng = None
+
+    # Cache only: the GPS pipeline pushes estimates, customer polling never computes one
+    wants_eta = dest_lat is not None and (link.show_eta or link.show_live_map)
+    eta = await cached_eta(link.work_order_id) if wants_eta else None
+    eta_minutes = eta["adjusted_duration_minutes"] if eta and link.show_eta else None
+    status, status_message = _tracking_status(work_order.status, eta_minutes)
+
+    return PublicTrackingInfo(
+        work_order_id=link.work_order_id,
+        service_type=work_order.job_type or "Service",
+        scheduled_date=work_order.scheduled_date.strftime("%B %d, %Y") if work_order.scheduled_date else "TBD",
+        technician_name=f"{tech.first_name} {tech.last_name}" if tech and link.show_technician_name else None,
+        technician_latitude=eta["technician_latitude"] if eta and link.show_live_map else None,
+        technician_longitude=eta["technician_longitude"] if eta and link.show_live_map else None,
+        destination_latitude=dest_lat,
+        destination_longitude=dest_lng,
+        eta_minutes=eta_minutes,
+        eta_arrival_time=(
+            datetime.fromisoformat(eta["estimated_arrival"]).strftime("%I:%M %p") if eta_minutes is not None else None
+        ),
+        distance_miles=eta["distance_miles"] if eta_minutes is not None else None,
+        status=status,
+        status_message=status_message,
+        last_updated=datetime.fromisoformat(eta["calculated_at"]) if eta else datetime.utcnow(),
     )
-    tech = tech_result.scalar_one_or_none()
 
-    return {
-        "token": token,
-        "technician_name": f"{tech.first_name} {tech.last_name}" if tech and link.show_technician_name else None,
-        "show_live_map": link.show_live_map,
-        "show_eta": link.show_eta,
-        "expires_at": link.expires_at.isoformat() if link.expires_at else None,
-        "work_order_id": str(link.work_order_id) if link.work_order_id else None,
-    }
+
+def _tracking_status(wo_status: Optional[str], eta_minutes: Optional[int]) -> tuple[str, str]:
+    """Customer-facing status and message (GPSTrackingService._get_tracking_status, by work order status)."""
+    if wo_status == "completed":
+        return "completed", "Service completed. Thank you!"
+    if wo_status == "in_progress":
+        return "in_progress", "Your technician is currently working on your service."
+    if wo_status == "on_site":
+        return "arrived", "Your technician has arrived."
+    if wo_status == "enroute":
+        if eta_minutes and eta_minutes <= 5:
+            return "arriving_soon", f"Your technician is almost there! Arriving in about {eta_minutes} minutes."
+        if eta_minutes:
+            return "en_route", f"Your technician is on the way. Estimated arrival in {eta_minutes} minutes."
+        return "en_route", "Your technician is on the way."
+    return "scheduled", "Your service is scheduled. We'll notify you when your technician is on the way."
 
 
 # ==================== Geofences ====================
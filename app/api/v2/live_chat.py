@@ -21,6 +21,7 @@ from app.models.notification import Notification
 from app.models.user import User
 from app.api.deps import get_current_user
 from app.services.websocket_manager import manager
+from app.utils.phone_normalization import phone_last10
 from app.core.rate_limit import rate_limit_by_ip
 from app.config import settings
 import asyncio
@@ -147,26 +148,19 @@ async def _create_chat_notifications(
 _last_visitor_alert_ts: dict[str, float] = {}
 
 # Per-admin-phone rolling list of recently-alerted conversations.
-# Maps normalized admin phone (digits only) → list of (index, conversation_id, ts).
+# Maps normalized admin phone (last 10 digits) → list of (index, conversation_id, ts).
 # Newest entries pushed to the front; trimmed to RECENT_ALERT_LIMIT.
 RECENT_ALERT_LIMIT = 5
 _recent_alerts_by_phone: dict[str, list[tuple[int, str, float]]] = {}
 _alert_index_counter = 0
 
 
-def _digits_only(phone: str) -> str:
-    d = "".join(c for c in (phone or "") if c.isdigit())
-    if len(d) == 11 and d.startswith("1"):
-        d = d[1:]
-    return d
-
-
 def _track_alert(admin_phone: str, conversation_id: str) -> int:
     """Record a chat-alert SMS sent to admin_phone. Returns the short index."""
     global _alert_index_counter
     _alert_index_counter += 1
     idx = _alert_index_counter
-    key = _digits_only(admin_phone)
+    key = phone_last10(admin_phone)
     history = _recent_alerts_by_phone.setdefault(key, [])
     history.insert(0, (idx, conversation_id, time.time()))
     del history[RECENT_ALERT_LIMIT:]
@@ -182,7 +176,7 @@ def _resolve_chat_for_reply(
     prefix the admin used. conversation_id is None if no match.
     """
     body = text.strip()
-    key = _digits_only(from_phone)
+    key = phone_last10(from_phone)
     history = _recent_alerts_by_phone.get(key, [])
 
     # Form 1: "#<full-or-prefix-uuid> message"
@@ -216,7 +210,7 @@ def _resolve_chat_for_reply(
 
 
 def _send_chat_sms_alerts(body: str, conversation_id: Optional[str] = None) -> None:
-    """Fire-and-forget SMS blast to all numbers in CHAT_ALERT_SMS_NUMBERS.
+    """Queue an SMS blast to all numbers in CHAT_ALERT_SMS_NUMBERS.
 
     Each recipient gets a unique short [#N] index prepended so they can reply
     "N: message" to route their text-back to this conversation. Failures are
@@ -231,25 +225,18 @@ def _send_chat_sms_alerts(body: str, conversation_id: Optional[str] = None) -> N
     if not numbers:
         return
 
-    async def _send_one(number: str, indexed_body: str) -> None:
-        try:
-            from app.services.sms_service import send_sms
-            result = await send_sms(to=number, body=indexed_body)
-            if getattr(result, "error", None):
-                logger.warning(
-                    f"Chat SMS alert to {number} failed: {result.error}"
-                )
-        except Exception as e:
-            logger.warning(f"Chat SMS alert to {number} raised: {e}")
+    from app.services.sms_dispatcher import enqueue_sms
 
-    loop = asyncio.get_event_loop()
     for number in numbers:
         if conversation_id:
             idx = _track_alert(number, conversation_id)
             indexed_body = f"[#{idx}] {body}\n(Reply '{idx}: <msg>' to answer)"
         else:
             indexed_body = body
-        loop.create_task(_send_one(number, indexed_body))
+        try:
+            enqueue_sms(number, indexed_body)
+        except Exception as e:
+            logger.warning(f"Chat SMS alert to {number} raised: {e}")
 
 
 async def post_sms_reply_to_chat(
@@ -265,9 +252,9 @@ async def post_sms_reply_to_chat(
     if not admin_csv:
         return None
 
-    admin_keys = {_digits_only(n) for n in admin_csv.split(",") if n.strip()}
-    sender_key = _digits_only(from_phone)
-    if sender_key not in admin_keys:
+    admin_keys = {phone_last10(n) for n in admin_csv.split(",") if n.strip()}
+    sender_key = phone_last10(from_phone)
+    if not sender_key or sender_key not in admin_keys:
         return None  # Not an admin — let customer SMS routing handle it
 
     conv_id_str, cleaned_text = _resolve_chat_for_reply(from_phone, text)
@@ -401,7 +388,7 @@ async def get_chat_status():
 @router.post("/offline-message", response_model=OfflineMessageResponse)
 async def leave_offline_message(req: OfflineMessageRequest, request: Request):
     """Leave a message when staff is offline. Creates a conversation flagged for callback."""
-    rate_limit_by_ip(request, requests_per_minute=5)
+    await rate_limit_by_ip(request, requests_per_minute=5)
     async with async_session_maker() as db:
         conversation = ChatConversation(
             id=uuid.uuid4(),
@@ -467,7 +454,7 @@ async def leave_offline_message(req: OfflineMessageRequest, request: Request):
 @router.post("/conversations", response_model=StartConversationResponse)
 async def start_conversation(req: StartConversationRequest, request: Request):
     """Start a new chat conversation from the website widget."""
-    rate_limit_by_ip(request, requests_per_minute=5)
+    await rate_limit_by_ip(request, requests_per_minute=5)
     async with async_session_maker() as db:
         conversation = ChatConversation(
             id=uuid.uuid4(),
@@ -528,7 +515,7 @@ async def send_visitor_message(
     conversation_id: str, req: SendMessageRequest, request: Request
 ):
     """Send a message from the website visitor."""
-    rate_limit_by_ip(request, requests_per_minute=30)
+    await rate_limit_by_ip(request, requests_per_minute=30)
     try:
         conv_uuid = uuid.UUID(conversation_id)
     except ValueError:
@@ -1038,7 +1025,7 @@ async def set_typing(
 ):
     """Mark a conversation as being typed in. Public endpoint used by both
     widget (visitor) and CRM staff (agent). Rate-limited per IP."""
-    rate_limit_by_ip(request, requests_per_minute=60)
+    await rate_limit_by_ip(request, requests_per_minute=60)
     try:
         uuid.UUID(conversation_id)
     except ValueError:
@@ -26,6 +26,7 @@ import asyncpg
 import logging
 
 from app.api.deps import CurrentUser
+from app.services.cache_service import cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +56,6 @@ MONITORED_SITE_URL = os.getenv("MONITORED_SITE_URL", "https://www.ecbtx.com")
 PAGESPEED_API_URL = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
 
 # Cache for PageSpeed results (avoid hitting API on every request)
-_pagespeed_cache: Dict[str, Dict] = {}
 _pagespeed_cache_ttl = 300  # 5 minutes
 
 # Log configuration at module load
@@ -79,12 +79,12 @@ async def fetch_pagespeed_metrics(url: str = None, force_refresh: bool = False)
     target_url = url or MONITORED_SITE_URL
 
     # Check cache first (unless force refresh)
-    cache_key = target_url
-    if not force_refresh and cache_key in _pagespeed_cache:
-        cached = _pagespeed_cache[cache_key]
-        if (datetime.utcnow().timestamp() - cached.get("timestamp", 0)) < _pagespeed_cache_ttl:
+    cache_key = f"pagespeed:{target_url}"
+    if not force_refresh:
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
             logger.info(f"[marketing_tasks] Using cached PageSpeed data for {target_url}")
-            return cached.get("data")
+            return cached
 
     # PageSpeed API can be used without a key, but key is recommended for frequent use
     try:
@@ -127,10 +127,7 @@ async def fetch_pagespeed_metrics(url: str = None, force_refresh: bool = False)
                     result["fcpMs"] = audits["first-contentful-paint"].get("numericValue", 0)
 
                 # Cache the result
-                _pagespeed_cache[cache_key] = {
-                    "data": result,
-                    "timestamp": datetime.utcnow().timestamp(),
-                }
+                await cache_service.set(cache_key, result, ttl=_pagespeed_cache_ttl)
 
                 logger.info(f"[marketing_tasks] PageSpeed API success: performance={result['performanceScore']}, seo={result['seoScore']}")
                 return result
@@ -98,15 +98,14 @@ async def sso_callback(
         )
 
         # Log the SSO login
-        import asyncio
-        asyncio.create_task(log_activity(
+        log_activity(
             category="auth",
             action="login_sso_microsoft",
             description=f"Microsoft SSO login for {user.email}",
             user_id=user.id,
             user_email=user.email,
             user_name=f"{user.first_name or ''} {user.last_name or ''}".strip(),
-        ))
+        )
 
         return {
             "access_token": access_token,
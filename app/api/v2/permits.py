@@ -51,6 +51,7 @@ from app.schemas.septic_permit import (
     ProspectsResponse,
 )
 from app.models.customer import Customer
+from app.services.geocoding_service import get_geocoder
 from app.services.permit_ingestion_service import get_permit_ingestion_service
 from app.services.permit_search_service import get_permit_search_service
 from app.services.permit_customer_linker import find_customer_for_permit, batch_link_permits, normalize_address
@@ -162,7 +163,8 @@ async def lookup_permits(
     Used for auto-fill when creating customers.
     """
     try:
-        from app.services.permit_customer_linker import normalize_address, normalize_phone
+        from app.services.permit_customer_linker import normalize_address
+        from app.utils.phone_normalization import phone_last10
 
         results = []
 
@@ -230,8 +232,8 @@ async def lookup_permits(
                         })
 
         if phone:
-            from app.services.permit_customer_linker import normalize_phone
-            norm_phone = normalize_phone(phone)
+            from app.utils.phone_normalization import phone_last10
+            norm_phone = phone_last10(phone)
             if norm_phone:
                 # Search raw_data for phone matches
                 stmt = (
@@ -248,7 +250,7 @@ async def lookup_permits(
                 rows = result.all()
                 for permit, state, county in rows:
                     if permit.raw_data and isinstance(permit.raw_data, dict):
-                        permit_phone = normalize_phone(permit.raw_data.get("owner_phone"))
+                        permit_phone = phone_last10(permit.raw_data.get("owner_phone"))
                         if permit_phone == norm_phone:
                             results.append({
                                 "id": str(permit.id),
@@ -336,10 +338,13 @@ async def run_batch_link(
     current_user: CurrentUser,
     limit: int = Query(1000, ge=1, le=10000),
     include_medium: bool = Query(False, description="Also auto-link medium confidence matches"),
+    persist_keys: bool = Query(False, description="Reuse and store normalized customer match keys"),
 ):
     """Run auto-linking on unlinked permits."""
     try:
-        stats = await batch_link_permits(db, limit=limit, auto_link_only=not include_medium)
+        stats = await batch_link_permits(
+            db, limit=limit, auto_link_only=not include_medium, persist_keys=persist_keys
+        )
         return BatchLinkResponse(**stats)
     except Exception as e:
         logger.error(f"Batch linking failed: {e}")
@@ -535,7 +540,13 @@ async def get_permits_needing_geocoding(
     limit: int = Query(500, ge=1, le=5000),
     offset: int = Query(0, ge=0),
 ):
-    """Get permits that have no latitude/longitude (need geocoding)."""
+    """
+    Get permits that have no latitude/longitude (need geocoding).
+
+    Permits whose address is already in the geocode cache come back with
+    latitude/longitude filled in, so callers can apply them without
+    geocoding the address again.
+    """
     try:
         stmt = (
             select(SepticPermit)
@@ -564,6 +575,7 @@ async def get_permits_needing_geocoding(
 
         result = await db.execute(stmt)
         permits = result.scalars().all()
+        known = await get_geocoder().cached(p.address_hash for p in permits)
 
         return {
             "count": len(permits),
@@ -577,6 +589,8 @@ async def get_permits_needing_geocoding(
                     "zip_code": p.zip_code,
                     "county_name": None,  # Would need join
                     "permit_number": p.permit_number,
+                    "latitude": known[p.address_hash][0] if p.address_hash in known else None,
+                    "longitude": known[p.address_hash][1] if p.address_hash in known else None,
                 }
                 for p in permits
             ],
@@ -606,6 +620,7 @@ async def batch_geocode_update(
     try:
         updated = 0
         errors = 0
+        geocoded = []
 
         for item in updates:
             permit_id = item.get("id")
@@ -629,10 +644,14 @@ async def batch_geocode_update(
                 permit.city = item["city"]
             if item.get("zip_code"):
                 permit.zip_code = item["zip_code"]
+            if permit.address_hash and permit.latitude is not None and permit.longitude is not None:
+                geocoded.append((permit.address_hash, permit.address, (permit.latitude, permit.longitude)))
 
             updated += 1
 
         await db.commit()
+        # Share the results with every other geocoding caller
+        await get_geocoder().remember(geocoded, provider="permit")
 
         return {"updated": updated, "errors": errors}
 
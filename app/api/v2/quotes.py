@@ -8,6 +8,7 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from typing import Optional
 from datetime import datetime
+from functools import lru_cache
 from pydantic import BaseModel
 import uuid
 
@@ -24,15 +25,17 @@ from app.schemas.quote import (
 )
 from app.models.work_order import WorkOrder
 
-# PDF Generation imports
-try:
-    from weasyprint import HTML
+router = APIRouter()
 
-    WEASYPRINT_AVAILABLE = True
-except (ImportError, OSError):
-    WEASYPRINT_AVAILABLE = False
 
-router = APIRouter()
+@lru_cache(maxsize=1)
+def _weasyprint_html():
+    """WeasyPrint's HTML class (imported on the first PDF request), or None if it can't load."""
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        return None
+    return HTML
 
 
 def generate_quote_number() -> str:
@@ -769,7 +772,8 @@ async def generate_quote_pdf(
     current_user: CurrentUser,
 ):
     """Generate and download PDF for a quote."""
-    if not WEASYPRINT_AVAILABLE:
+    HTML = _weasyprint_html()
+    if HTML is None:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail="PDF generation is not available. WeasyPrint not installed.",
@@ -32,6 +32,7 @@ from app.schemas.realtor import (
     ReferralResponse,
     ReferralUpdate,
 )
+from app.utils.phone_normalization import phone_digits
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -42,10 +43,6 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 
-def _normalize_phone(phone: str) -> str:
-    return "".join(c for c in phone if c.isdigit())
-
-
 def _agent_to_response(a: RealtorAgent) -> RealtorAgentResponse:
     return RealtorAgentResponse.model_validate(a)
 
@@ -99,13 +96,13 @@ async def migrate_local(
 
     # Build phone index of existing agents to dedupe quickly
     existing = (await db.execute(select(RealtorAgent))).scalars().all()
-    by_phone = {_normalize_phone(a.phone): a for a in existing}
+    by_phone = {phone_digits(a.phone): a for a in existing}
     by_id = {str(a.id): a for a in existing}
 
     new_agents_by_legacy_id: dict[str, RealtorAgent] = {}
 
     for agent_in in payload.agents:
-        phone_norm = _normalize_phone(agent_in.phone)
+        phone_norm = phone_digits(agent_in.phone)
         if not phone_norm or len(phone_norm) < 10:
             agents_skipped += 1
             continue
@@ -181,7 +178,7 @@ async def create_agent(
     db: DbSession,
     current_user: CurrentUser,
 ):
-    phone_norm = _normalize_phone(payload.phone)
+    phone_norm = phone_digits(payload.phone)
     if not phone_norm or len(phone_norm) < 10:
         raise HTTPException(status_code=400, detail="Invalid phone number")
 
@@ -228,7 +225,7 @@ async def patch_agent(
         raise HTTPException(status_code=404, detail="Agent not found")
     data = payload.model_dump(exclude_unset=True)
     if "phone" in data and data["phone"]:
-        data["phone"] = _normalize_phone(data["phone"])
+        data["phone"] = phone_digits(data["phone"])
     if "stage" in data and data["stage"] and data["stage"] != row.stage:
         data["next_follow_up"] = _next_follow_up_for(data["stage"])
     for k, v in data.items():
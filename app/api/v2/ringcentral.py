@@ -23,8 +23,11 @@ import uuid as _uuid
 from app.api.deps import DbSession, CurrentUser
 from app.services.ringcentral_service import ringcentral_service
 from app.services.ai_gateway import ai_gateway
+from app.services.http_clients import get_http_client
 from app.models.call_log import CallLog
 from app.models.customer import Customer
+from app.services.phone_identity import phone_identity
+from app.utils.phone_normalization import format_us_phone, phone_last10
 from app.models.activity import Activity
 from app.database import async_session_maker
 
@@ -38,27 +41,9 @@ COMPANY_NUMBERS = {"+16153452544", "+16152362672", "6153452544", "6152362672"}
 NO_CONNECT_DISPOSITIONS = {"busy", "no_answer", "voicemail", "rejected", "cancelled", "missed"}
 
 
-def _normalize_phone_for_db(raw: str) -> str:
-    """Normalize any phone format to (XXX) XXX-XXXX for DB storage."""
-    digits = "".join(c for c in (raw or "") if c.isdigit())
-    if len(digits) == 11 and digits.startswith("1"):
-        digits = digits[1:]
-    if len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-    return raw or ""
-
-
-def _normalize_to_10_digits(raw: str) -> str:
-    """Extract exactly 10 digits from a phone number."""
-    digits = "".join(c for c in (raw or "") if c.isdigit())
-    if len(digits) == 11 and digits.startswith("1"):
-        digits = digits[1:]
-    return digits if len(digits) == 10 else ""
-
-
 def _is_company_number(phone: str) -> bool:
     """Check if a phone number belongs to MAC Septic."""
-    digits = _normalize_to_10_digits(phone)
+    digits = phone_last10(phone)
     return digits in COMPANY_NUMBERS or phone in COMPANY_NUMBERS
 
 
@@ -102,7 +87,7 @@ async def _match_or_create_customer(
     if _is_company_number(search_number):
         return None
 
-    normalized = _normalize_to_10_digits(search_number)
+    normalized = phone_last10(search_number)
     if not normalized:
         return None
 
@@ -133,7 +118,7 @@ async def _match_or_create_customer(
         return None
 
     # Create new customer profile from unknown caller
-    formatted_phone = _normalize_phone_for_db(search_number)
+    formatted_phone = format_us_phone(search_number)
     customer = Customer(
         first_name="Caller",
         last_name=formatted_phone,
@@ -417,36 +402,9 @@ def call_log_to_response(call: CallLog) -> dict:
 
 
 async def find_customer_by_phone(db, phone: str) -> Optional[Customer]:
-    """Look up customer by phone number with multi-format matching."""
+    """Look up customer by phone number (any format) via the indexed last-10 key."""
     try:
-        normalized = _normalize_to_10_digits(phone)
-        if not normalized:
-            return None
-
-        # Format variants to try exact match on
-        formatted = _normalize_phone_for_db(phone)  # (XXX) XXX-XXXX
-
-        # Exact match first (most reliable)
-        result = await db.execute(
-            select(Customer).where(
-                or_(
-                    Customer.phone == formatted,
-                    Customer.phone == f"+1{normalized}",
-                    Customer.phone == normalized,
-                )
-            ).limit(1)
-        )
-        customer = result.scalar_one_or_none()
-        if customer:
-            return customer
-
-        # Fallback: contains last 10 digits (for legacy data with odd formats)
-        result = await db.execute(
-            select(Customer).where(
-                Customer.phone.contains(normalized)
-            ).limit(1)
-        )
-        return result.scalar_one_or_none()
+        return await phone_identity.resolve_customer(db, phone)
     except Exception as e:
         logger.warning(f"Error finding customer by phone {phone}: {e}")
         return None
@@ -1432,7 +1390,7 @@ async def backfill_customer_links(
                 call.called_number if call.direction == "outbound"
                 else call.caller_number
             )
-            normalized = _normalize_to_10_digits(search_number or "")
+            normalized = phone_last10(search_number or "")
 
             if not normalized or _is_company_number(search_number or ""):
                 skipped += 1
@@ -2023,13 +1981,13 @@ async def stream_twilio_recording_content(
         # Twilio recording URL with .mp3 extension for audio format
         twilio_url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Recordings/{recording_sid}.mp3"
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                twilio_url,
-                auth=(account_sid, auth_token),
-                follow_redirects=True,
-                timeout=30.0,
-            )
+        client = get_http_client("twilio")
+        resp = await client.get(
+            twilio_url,
+            auth=(account_sid, auth_token),
+            follow_redirects=True,
+            timeout=30.0,
+        )
 
         if resp.status_code != 200:
             logger.error(f"Twilio recording fetch failed: {resp.status_code}")
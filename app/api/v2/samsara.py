@@ -6,7 +6,9 @@ Integrates with Samsara's Fleet API to provide:
 - Vehicle status (moving, idling, stopped, offline)
 - Driver assignments
 - Location history/breadcrumb trails
-- Server-Sent Events (SSE) for real-time push updates
+- Server-Sent Events (SSE) for real-time push updates: a snapshot on
+  connect, then only the vehicles that changed, optionally limited to a
+  bounding box or market
 
 API Documentation: https://developers.samsara.com/reference
 """
@@ -23,6 +25,10 @@ import json
 
 from app.api.deps import CurrentUser, get_current_user_ws
 from app.config import settings
+from app.services.http_clients import get_http_client
+from app.services.market_config import market_bbox
+from app.services.pubsub import get_pubsub
+from app.services.technician_state import get_technician_state
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -37,9 +43,10 @@ _vehicle_store: dict[str, "Vehicle"] = {}
 _vehicle_store_lock = asyncio.Lock()
 _last_update_time: datetime | None = None
 
-# SSE client management
-_sse_clients: set[asyncio.Queue] = set()
+# SSE client management (changes are shared with other workers on this pub/sub topic)
+_sse_clients: set["_SSESubscriber"] = set()
 _sse_clients_lock = asyncio.Lock()
+VEHICLES_TOPIC = "samsara.vehicles"
 
 # Feed poller state
 _feed_cursor: str | None = None
@@ -108,122 +115,122 @@ async def fetch_vehicles_from_samsara() -> list[Vehicle]:
     Fetch vehicles with GPS data from Samsara API.
     Uses /fleet/vehicles/stats?types=gps for real-time locations.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # First, get all vehicles
-        vehicles_response = await client.get(
-            f"{SAMSARA_API_BASE}/fleet/vehicles",
-            headers={"Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}"},
-        )
-
-        if vehicles_response.status_code == 401:
-            logger.error("Samsara API authentication failed - check SAMSARA_API_TOKEN")
-            raise HTTPException(status_code=503, detail="Fleet tracking service authentication failed")
-
-        if vehicles_response.status_code != 200:
-            logger.error(f"Samsara vehicles API error: {vehicles_response.status_code} - {vehicles_response.text}")
-            raise HTTPException(status_code=503, detail="Fleet tracking service unavailable")
-
-        vehicles_data = vehicles_response.json()
-
-        # Check if response is a dict before accessing keys
-        if not isinstance(vehicles_data, dict):
-            logger.error(f"Unexpected Samsara vehicles response format: {type(vehicles_data).__name__}")
-            return []
+    client = get_http_client("samsara")
+    # First, get all vehicles
+    vehicles_response = await client.get(
+        f"{SAMSARA_API_BASE}/fleet/vehicles",
+        headers={"Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}"},
+    )
 
-        vehicle_info = {v["id"]: v for v in vehicles_data.get("data", [])}
+    if vehicles_response.status_code == 401:
+        logger.error("Samsara API authentication failed - check SAMSARA_API_TOKEN")
+        raise HTTPException(status_code=503, detail="Fleet tracking service authentication failed")
 
-        # Then get GPS stats for all vehicles
-        stats_response = await client.get(
-            f"{SAMSARA_API_BASE}/fleet/vehicles/stats",
-            headers={"Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}"},
-            params={"types": "gps"},
-        )
+    if vehicles_response.status_code != 200:
+        logger.error(f"Samsara vehicles API error: {vehicles_response.status_code} - {vehicles_response.text}")
+        raise HTTPException(status_code=503, detail="Fleet tracking service unavailable")
 
-        if stats_response.status_code != 200:
-            logger.warning(f"Samsara stats API error: {stats_response.status_code}")
-            # Fall back to vehicle list without GPS
-            stats_data = {"data": []}
-        else:
-            stats_data = stats_response.json()
+    vehicles_data = vehicles_response.json()
 
-            # Check if response is a dict before accessing keys
-            if not isinstance(stats_data, dict):
-                logger.warning(f"Unexpected Samsara stats response format: {type(stats_data).__name__}, using empty data")
-                stats_data = {"data": []}
+    # Check if response is a dict before accessing keys
+    if not isinstance(vehicles_data, dict):
+        logger.error(f"Unexpected Samsara vehicles response format: {type(vehicles_data).__name__}")
+        return []
 
-        vehicles = []
-        now = datetime.now(timezone.utc)
+    vehicle_info = {v["id"]: v for v in vehicles_data.get("data", [])}
 
-        for v in stats_data.get("data", []):
-            if not isinstance(v, dict):
-                continue
-            vehicle_id = v.get("id", "")
-            raw_gps = v.get("gps", {})
+    # Then get GPS stats for all vehicles
+    stats_response = await client.get(
+        f"{SAMSARA_API_BASE}/fleet/vehicles/stats",
+        headers={"Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}"},
+        params={"types": "gps"},
+    )
 
-            # Samsara may return gps as a list of points or a single dict
-            if isinstance(raw_gps, list):
-                gps_data = raw_gps[-1] if raw_gps else {}
-            elif isinstance(raw_gps, dict):
-                gps_data = raw_gps
-            else:
-                gps_data = {}
+    if stats_response.status_code != 200:
+        logger.warning(f"Samsara stats API error: {stats_response.status_code}")
+        # Fall back to vehicle list without GPS
+        stats_data = {"data": []}
+    else:
+        stats_data = stats_response.json()
 
-            # Get additional vehicle info
-            info = vehicle_info.get(vehicle_id, {})
+        # Check if response is a dict before accessing keys
+        if not isinstance(stats_data, dict):
+            logger.warning(f"Unexpected Samsara stats response format: {type(stats_data).__name__}, using empty data")
+            stats_data = {"data": []}
 
-            # Parse the timestamp
-            updated_at_str = gps_data.get("time", now.isoformat())
-            try:
-                updated_at = datetime.fromisoformat(updated_at_str.replace("Z", "+00:00"))
-                time_since_update = (now - updated_at).total_seconds() / 60
-            except Exception:
-                time_since_update = 0
+    vehicles = []
+    now = datetime.now(timezone.utc)
 
-            # Speed is already in mph from Samsara stats endpoint
-            speed_mph = gps_data.get("speedMilesPerHour", 0) or 0
+    for v in stats_data.get("data", []):
+        if not isinstance(v, dict):
+            continue
+        vehicle_id = v.get("id", "")
+        raw_gps = v.get("gps", {})
+
+        # Samsara may return gps as a list of points or a single dict
+        if isinstance(raw_gps, list):
+            gps_data = raw_gps[-1] if raw_gps else {}
+        elif isinstance(raw_gps, dict):
+            gps_data = raw_gps
+        else:
+            gps_data = {}
 
-            # Determine status
-            status = determine_vehicle_status(speed_mph, time_since_update)
+        # Get additional vehicle info
+        info = vehicle_info.get(vehicle_id, {})
 
-            vehicle = Vehicle(
-                id=vehicle_id,
-                name=v.get("name", info.get("name", "Unknown Vehicle")),
-                vin=info.get("vin"),
-                driver_id=None,  # Driver assignment requires separate API call
-                driver_name=None,
-                location=VehicleLocation(
-                    lat=gps_data.get("latitude", 0),
-                    lng=gps_data.get("longitude", 0),
-                    heading=gps_data.get("headingDegrees", 0) or 0,
-                    speed=round(speed_mph, 1),
-                    updated_at=updated_at_str,
-                ),
-                status=status,
-            )
-            vehicles.append(vehicle)
-
-        # If no GPS data but we have vehicles, add them with offline status
-        if not vehicles and vehicle_info:
-            for vid, info in vehicle_info.items():
-                vehicles.append(
-                    Vehicle(
-                        id=vid,
-                        name=info.get("name", "Unknown Vehicle"),
-                        vin=info.get("vin"),
-                        driver_id=None,
-                        driver_name=None,
-                        location=VehicleLocation(
-                            lat=0,
-                            lng=0,
-                            heading=0,
-                            speed=0,
-                            updated_at=now.isoformat(),
-                        ),
-                        status="offline",
-                    )
+        # Parse the timestamp
+        updated_at_str = gps_data.get("time", now.isoformat())
+        try:
+            updated_at = datetime.fromisoformat(updated_at_str.replace("Z", "+00:00"))
+            time_since_update = (now - updated_at).total_seconds() / 60
+        except Exception:
+            time_since_update = 0
+
+        # Speed is already in mph from Samsara stats endpoint
+        speed_mph = gps_data.get("speedMilesPerHour", 0) or 0
+
+        # Determine status
+        status = determine_vehicle_status(speed_mph, time_since_update)
+
+        vehicle = Vehicle(
+            id=vehicle_id,
+            name=v.get("name", info.get("name", "Unknown Vehicle")),
+            vin=info.get("vin"),
+            driver_id=None,  # Driver assignment requires separate API call
+            driver_name=None,
+            location=VehicleLocation(
+                lat=gps_data.get("latitude", 0),
+                lng=gps_data.get("longitude", 0),
+                heading=gps_data.get("headingDegrees", 0) or 0,
+                speed=round(speed_mph, 1),
+                updated_at=updated_at_str,
+            ),
+            status=status,
+        )
+        vehicles.append(vehicle)
+
+    # If no GPS data but we have vehicles, add them with offline status
+    if not vehicles and vehicle_info:
+        for vid, info in vehicle_info.items():
+            vehicles.append(
+                Vehicle(
+                    id=vid,
+                    name=info.get("name", "Unknown Vehicle"),
+                    vin=info.get("vin"),
+                    driver_id=None,
+                    driver_name=None,
+                    location=VehicleLocation(
+                        lat=0,
+                        lng=0,
+                        heading=0,
+                        speed=0,
+                        updated_at=now.isoformat(),
+                    ),
+                    status="offline",
                 )
+            )
 
-        return vehicles
+    return vehicles
 
 
 # ── Feed poller (background task) ──────────────────────────────────────────
@@ -244,42 +251,42 @@ async def _poll_samsara_feed():
                 await asyncio.sleep(30)
                 continue
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                params = {"types": "gps"}
-                if _feed_cursor:
-                    params["after"] = _feed_cursor
+            client = get_http_client("samsara")
+            params = {"types": "gps"}
+            if _feed_cursor:
+                params["after"] = _feed_cursor
 
-                response = await client.get(
-                    f"{SAMSARA_API_BASE}/fleet/vehicles/stats/feed",
-                    headers={"Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}"},
-                    params=params,
-                )
+            response = await client.get(
+                f"{SAMSARA_API_BASE}/fleet/vehicles/stats/feed",
+                headers={"Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}"},
+                params=params,
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+
+                # Check if response is a dict before accessing keys
+                if isinstance(data, dict):
+                    new_cursor = data.get("pagination", {}).get("endCursor")
+                    if new_cursor:
+                        _feed_cursor = new_cursor
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Check if response is a dict before accessing keys
-                    if isinstance(data, dict):
-                        new_cursor = data.get("pagination", {}).get("endCursor")
-                        if new_cursor:
-                            _feed_cursor = new_cursor
-
-                        changed_vehicles = data.get("data", [])
-                        if changed_vehicles:
-                            await _process_feed_update(changed_vehicles)
-                    else:
-                        # Unexpected response format (list or other type)
-                        logger.warning(f"Unexpected Samsara feed response format: {type(data).__name__}, falling back to full fetch")
-                        await _do_full_fetch()
-                elif response.status_code == 429:
-                    # Rate limited - back off
-                    logger.warning("Samsara API rate limited, backing off 30s")
-                    await asyncio.sleep(30)
-                    continue
+                    changed_vehicles = data.get("data", [])
+                    if changed_vehicles:
+                        await _process_feed_update(changed_vehicles)
                 else:
-                    # Feed endpoint may not be available - fall back to full fetch
-                    logger.debug(f"Feed API returned {response.status_code}, using full fetch")
+                    # Unexpected response format (list or other type)
+                    logger.warning(f"Unexpected Samsara feed response format: {type(data).__name__}, falling back to full fetch")
                     await _do_full_fetch()
+            elif response.status_code == 429:
+                # Rate limited - back off
+                logger.warning("Samsara API rate limited, backing off 30s")
+                await asyncio.sleep(30)
+                continue
+            else:
+                # Feed endpoint may not be available - fall back to full fetch
+                logger.debug(f"Feed API returned {response.status_code}, using full fetch")
+                await _do_full_fetch()
 
         except httpx.RequestError as e:
             logger.warning(f"Samsara feed poll failed: {e}")
@@ -306,18 +313,21 @@ async def _do_full_fetch():
         now = datetime.now(timezone.utc)
 
         async with _vehicle_store_lock:
+            changed = [v for v in vehicles if _vehicle_store.get(v.id) != v]
+            removed = set(_vehicle_store) - {v.id for v in vehicles}
             _vehicle_store.clear()
             for v in vehicles:
                 _vehicle_store[v.id] = v
             _last_update_time = now
+        get_technician_state().record_vehicles(vehicles, replace=True)
 
         # Update legacy cache too
         async with _cache_lock:
             _vehicle_cache["data"] = vehicles
             _vehicle_cache["expires"] = now + timedelta(seconds=CACHE_TTL_SECONDS)
 
-        # Broadcast to SSE clients
-        await _broadcast_vehicles(vehicles)
+        # Broadcast what changed to SSE clients
+        await _broadcast_changes(changed, removed)
         logger.debug(f"Full fetch: {len(vehicles)} vehicles")
     except Exception as e:
         logger.warning(f"Full fetch failed: {e}")
@@ -376,15 +386,17 @@ async def _process_feed_update(changed_data: list):
                 ),
                 status=status,
             )
+            if vehicle == existing:
+                continue
             _vehicle_store[vehicle_id] = vehicle
             updated_vehicles.append(vehicle)
 
         _last_update_time = now
+        all_vehicles = list(_vehicle_store.values())
+    get_technician_state().record_vehicles(updated_vehicles)
 
     if updated_vehicles:
-        # Broadcast full vehicle list (all vehicles, not just changes)
-        all_vehicles = list(_vehicle_store.values())
-        await _broadcast_vehicles(all_vehicles)
+        await _broadcast_changes(updated_vehicles)
 
         # Update legacy cache
         async with _cache_lock:
@@ -396,24 +408,112 @@ async def _process_feed_update(changed_data: list):
 
 # ── SSE broadcasting ───────────────────────────────────────────────────────
 
-async def _broadcast_vehicles(vehicles: list[Vehicle]):
-    """Send vehicle data to all connected SSE clients."""
-    if not _sse_clients:
-        return
+class _SSESubscriber:
+    """
+    One /stream client: the vehicles it can see and the changes it has not been sent yet.
+
+    Pending changes are keyed by vehicle id, so a client that reads slower than
+    the feed ticks gets the latest position of each vehicle rather than a
+    backlog; what is held per client never exceeds one entry per vehicle.
+    """
+
+    def __init__(self, bbox: Optional[tuple[float, float, float, float]] = None):
+        self.bbox = bbox
+        self.visible: set[str] = set()
+        self.updated: dict[str, str] = {}  # vehicle id -> serialized vehicle
+        self.removed: set[str] = set()
+        self.wake = asyncio.Event()
+
+    def wants(self, vehicle: Vehicle) -> bool:
+        if self.bbox is None:
+            return True
+        min_lat, min_lng, max_lat, max_lng = self.bbox
+        return min_lat <= vehicle.location.lat <= max_lat and min_lng <= vehicle.location.lng <= max_lng
+
+    def snapshot(self, vehicles: list[Vehicle]) -> str:
+        """The initial "vehicles" event: every vehicle this client wants."""
+        shown = [v for v in vehicles if self.wants(v)]
+        self.visible = {v.id for v in shown}
+        return f"event: vehicles\ndata: [{','.join(v.model_dump_json() for v in shown)}]\n\n"
+
+    def offer(self, changed: list[tuple[Vehicle, str]], removed: set[str]) -> None:
+        for vehicle, data in changed:
+            if self.wants(vehicle):
+                self.visible.add(vehicle.id)
+                self.updated[vehicle.id] = data
+                self.removed.discard(vehicle.id)
+            elif vehicle.id in self.visible:
+                # Left the area this client watches
+                self._remove(vehicle.id)
+        for vehicle_id in removed:
+            if vehicle_id in self.visible:
+                self._remove(vehicle_id)
+        if self.updated or self.removed:
+            self.wake.set()
+
+    def _remove(self, vehicle_id: str) -> None:
+        self.visible.discard(vehicle_id)
+        self.updated.pop(vehicle_id, None)
+        self.removed.add(vehicle_id)
+
+    def drain(self) -> Optional[str]:
+        """A "vehicles_delta" event with everything pending, or None."""
+        self.wake.clear()
+        if not self.updated and not self.removed:
+            return None
+        message = (
+            f"event: vehicles_delta\ndata: {{\"updated\": [{','.join(self.updated.values())}], "
+            f"\"removed\": {json.dumps(sorted(self.removed))}}}\n\n"
+        )
+        self.updated = {}
+        self.removed = set()
+        return message
 
-    data = json.dumps([v.model_dump() for v in vehicles])
-    message = f"event: vehicles\ndata: {data}\n\n"
 
-    dead_clients = []
+async def _broadcast_changes(changed: list[Vehicle], removed: set[str] = frozenset()):
+    """
+    Hand changed and removed vehicles to every SSE client, serializing each vehicle once.
+
+    This worker's clients get them directly; other workers get them through
+    pub/sub (see _apply_published_changes).
+    """
+    if not (changed or removed):
+        return
+
+    encoded = [(v, v.model_dump_json()) for v in changed]
     async with _sse_clients_lock:
-        for queue in _sse_clients:
-            try:
-                queue.put_nowait(message)
-            except asyncio.QueueFull:
-                dead_clients.append(queue)
+        for subscriber in _sse_clients:
+            subscriber.offer(encoded, removed)
+    await get_pubsub().publish(
+        VEHICLES_TOPIC, f"[{','.join(data for _, data in encoded)}]", {"removed": sorted(removed)}, local=False
+    )
+
+
+def _apply_published_changes(text: str, meta: dict) -> int:
+    """
+    Vehicle changes published by another worker (pub/sub handler).
+
+    Only vehicles that differ from this worker's store are passed on, so
+    workers that poll the feed themselves don't send their clients repeats.
+    """
+    changed = []
+    for data in json.loads(text):
+        vehicle = Vehicle.model_validate(data)
+        if _vehicle_store.get(vehicle.id) != vehicle:
+            _vehicle_store[vehicle.id] = vehicle
+            changed.append(vehicle)
+    removed = {vehicle_id for vehicle_id in meta.get("removed", ()) if _vehicle_store.pop(vehicle_id, None)}
+    if not (changed or removed):
+        return 0
+    get_technician_state().record_vehicles(changed)
+
+    encoded = [(v, v.model_dump_json()) for v in changed]
+    for subscriber in _sse_clients:
+        subscriber.offer(encoded, removed)
+    return len(_sse_clients)
 
-        for q in dead_clients:
-            _sse_clients.discard(q)
+
+get_pubsub().subscribe(VEHICLES_TOPIC, _apply_published_changes)
 
 
 def start_feed_poller():
@@ -470,6 +570,7 @@ async def get_vehicles(current_user: CurrentUser) -> list[Vehicle]:
         async with _vehicle_store_lock:
             for v in vehicles:
                 _vehicle_store[v.id] = v
+        get_technician_state().record_vehicles(vehicles)
 
         async with _cache_lock:
             _vehicle_cache["data"] = vehicles
@@ -492,6 +593,8 @@ async def get_vehicles(current_user: CurrentUser) -> list[Vehicle]:
 async def stream_vehicles(
     request: Request,
     token: Optional[str] = Query(None),
+    bbox: Optional[str] = Query(None, description="Only vehicles inside min_lat,min_lng,max_lat,max_lng"),
+    market: Optional[str] = Query(None, description="Only vehicles inside a market's service area"),
 ):
     """
     Server-Sent Events endpoint for real-time vehicle updates.
@@ -500,8 +603,12 @@ async def stream_vehicles(
     - Bearer token in Authorization header (standard endpoints)
     - `token` query parameter (required for EventSource/SSE since it can't set headers)
 
-    Streams vehicle location updates as they arrive from the Samsara feed poller.
-    Sends heartbeat every 15 seconds to keep connection alive.
+    Events:
+    - `vehicles`: full list of (matching) vehicles, once on connect
+    - `vehicles_delta`: `{"updated": [vehicles], "removed": [vehicle ids]}` as the
+      Samsara feed poller reports changes; a vehicle that leaves the bbox/market
+      is reported as removed
+    - `heartbeat` every 15 seconds to keep the connection alive
     """
     # EventSource can't set headers, so accept token from query param, header, or session cookie
     jwt_token = None
@@ -518,20 +625,19 @@ async def stream_vehicles(
     user = await get_current_user_ws(jwt_token, session_cookie)
     if user is None:
         raise HTTPException(status_code=401, detail="Invalid token")
-    queue: asyncio.Queue = asyncio.Queue(maxsize=50)
+    subscriber = _SSESubscriber(_parse_stream_filter(bbox, market))
 
     async with _sse_clients_lock:
-        _sse_clients.add(queue)
+        _sse_clients.add(subscriber)
     logger.info(f"SSE client connected (total: {len(_sse_clients)})")
 
     async def event_generator():
         try:
             # Send initial data immediately
             async with _vehicle_store_lock:
-                if _vehicle_store:
-                    vehicles = list(_vehicle_store.values())
-                    data = json.dumps([v.model_dump() for v in vehicles])
-                    yield f"event: vehicles\ndata: {data}\n\n"
+                snapshot = subscriber.snapshot(list(_vehicle_store.values())) if _vehicle_store else None
+            if snapshot:
+                yield snapshot
 
             # Send connection confirmation
             yield f"event: connected\ndata: {{\"status\": \"ok\", \"clients\": {len(_sse_clients)}}}\n\n"
@@ -539,9 +645,11 @@ async def stream_vehicles(
             heartbeat_interval = 15
             while True:
                 try:
-                    # Wait for messages with timeout for heartbeat
-                    message = await asyncio.wait_for(queue.get(), timeout=heartbeat_interval)
-                    yield message
+                    # Wait for changes with timeout for heartbeat
+                    await asyncio.wait_for(subscriber.wake.wait(), timeout=heartbeat_interval)
+                    message = subscriber.drain()
+                    if message:
+                        yield message
                 except asyncio.TimeoutError:
                     # Send heartbeat
                     yield f"event: heartbeat\ndata: {{\"time\": \"{datetime.now(timezone.utc).isoformat()}\"}}\n\n"
@@ -553,7 +661,7 @@ async def stream_vehicles(
                     break
         finally:
             async with _sse_clients_lock:
-                _sse_clients.discard(queue)
+                _sse_clients.discard(subscriber)
             logger.info(f"SSE client disconnected (remaining: {len(_sse_clients)})")
 
     return StreamingResponse(
@@ -567,6 +675,24 @@ async def stream_vehicles(
     )
 
 
+def _parse_stream_filter(bbox: Optional[str], market: Optional[str]) -> Optional[tuple[float, float, float, float]]:
+    """The (min_lat, min_lng, max_lat, max_lng) a /stream client asked for, if any."""
+    if bbox:
+        try:
+            min_lat, min_lng, max_lat, max_lng = (float(part) for part in bbox.split(","))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="bbox must be min_lat,min_lng,max_lat,max_lng")
+        if min_lat > max_lat or min_lng > max_lng:
+            raise HTTPException(status_code=400, detail="bbox minimums must not exceed maximums")
+        return (min_lat, min_lng, max_lat, max_lng)
+    if market:
+        box = market_bbox(market)
+        if box is None:
+            raise HTTPException(status_code=400, detail=f"Unknown market: {market}")
+        return box
+    return None
+
+
 @router.get("/vehicles/{vehicle_id}/history")
 async def get_vehicle_history(
     vehicle_id: str,
@@ -587,42 +713,42 @@ async def get_vehicle_history(
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{SAMSARA_API_BASE}/fleet/vehicles/stats/history",
-                headers={
-                    "Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}",
-                },
-                params={
-                    "types": "gps",
-                    "vehicleIds": vehicle_id,
-                    "startTime": start_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "endTime": end_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                },
-            )
+        client = get_http_client("samsara")
+        response = await client.get(
+            f"{SAMSARA_API_BASE}/fleet/vehicles/stats/history",
+            headers={
+                "Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}",
+            },
+            params={
+                "types": "gps",
+                "vehicleIds": vehicle_id,
+                "startTime": start_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "endTime": end_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            },
+        )
 
-            if response.status_code != 200:
-                logger.warning(f"Failed to get vehicle history: {response.status_code} - {response.text}")
-                return []
+        if response.status_code != 200:
+            logger.warning(f"Failed to get vehicle history: {response.status_code} - {response.text}")
+            return []
 
-            data = response.json()
-            history = []
-
-            # Response structure: data[].gps[] array
-            for vehicle_data in data.get("data", []):
-                if vehicle_data.get("id") == vehicle_id:
-                    for point in vehicle_data.get("gps", []):
-                        history.append(
-                            LocationHistoryPoint(
-                                lat=point.get("latitude", 0),
-                                lng=point.get("longitude", 0),
-                                timestamp=point.get("time", ""),
-                                speed=round(point.get("speedMilesPerHour", 0) or 0, 1),
-                            )
+        data = response.json()
+        history = []
+
+        # Response structure: data[].gps[] array
+        for vehicle_data in data.get("data", []):
+            if vehicle_data.get("id") == vehicle_id:
+                for point in vehicle_data.get("gps", []):
+                    history.append(
+                        LocationHistoryPoint(
+                            lat=point.get("latitude", 0),
+                            lng=point.get("longitude", 0),
+                            timestamp=point.get("time", ""),
+                            speed=round(point.get("speedMilesPerHour", 0) or 0, 1),
                         )
+                    )
 
-            logger.info(f"Retrieved {len(history)} history points for vehicle {vehicle_id}")
-            return history
+        logger.info(f"Retrieved {len(history)} history points for vehicle {vehicle_id}")
+        return history
 
     except httpx.RequestError as e:
         logger.error(f"Samsara history request failed: {e}")
@@ -650,44 +776,44 @@ async def get_samsara_status(current_user: CurrentUser) -> dict:
     token_prefix = settings.SAMSARA_API_TOKEN[:10] + "..." if len(settings.SAMSARA_API_TOKEN) > 10 else "too_short"
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{SAMSARA_API_BASE}/fleet/vehicles",
-                headers={
-                    "Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}",
-                },
-                params={"limit": 1},
-            )
+        client = get_http_client("samsara")
+        response = await client.get(
+            f"{SAMSARA_API_BASE}/fleet/vehicles",
+            headers={
+                "Authorization": f"Bearer {settings.SAMSARA_API_TOKEN}",
+            },
+            params={"limit": 1},
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                vehicle_count = len(data.get("data", []))
-                return {
-                    "configured": True,
-                    "connected": True,
-                    "message": "Samsara API connected successfully",
-                    "token_prefix": token_prefix,
-                    "vehicle_count": vehicle_count,
-                    "sse_clients": len(_sse_clients),
-                    "feed_poller_active": _feed_poller_task is not None and not _feed_poller_task.done(),
-                    "cached_vehicles": len(_vehicle_store),
-                }
-            elif response.status_code == 401:
-                return {
-                    "configured": True,
-                    "connected": False,
-                    "message": "Invalid API token - authentication failed",
-                    "token_prefix": token_prefix,
-                    "samsara_error": response.text[:200] if response.text else None,
-                }
-            else:
-                return {
-                    "configured": True,
-                    "connected": False,
-                    "message": f"API error: {response.status_code}",
-                    "token_prefix": token_prefix,
-                    "samsara_error": response.text[:200] if response.text else None,
-                }
+        if response.status_code == 200:
+            data = response.json()
+            vehicle_count = len(data.get("data", []))
+            return {
+                "configured": True,
+                "connected": True,
+                "message": "Samsara API connected successfully",
+                "token_prefix": token_prefix,
+                "vehicle_count": vehicle_count,
+                "sse_clients": len(_sse_clients),
+                "feed_poller_active": _feed_poller_task is not None and not _feed_poller_task.done(),
+                "cached_vehicles": len(_vehicle_store),
+            }
+        elif response.status_code == 401:
+            return {
+                "configured": True,
+                "connected": False,
+                "message": "Invalid API token - authentication failed",
+                "token_prefix": token_prefix,
+                "samsara_error": response.text[:200] if response.text else None,
+            }
+        else:
+            return {
+                "configured": True,
+                "connected": False,
+                "message": f"API error: {response.status_code}",
+                "token_prefix": token_prefix,
+                "samsara_error": response.text[:200] if response.text else None,
+            }
     except Exception as e:
         return {
             "configured": True,
@@ -12,8 +12,8 @@ from sqlalchemy import select, func, and_
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime, date, timedelta
+import asyncio
 import logging
-import math
 
 from app.api.deps import DbSession, CurrentUser
 from app.models.work_order import WorkOrder
@@ -21,6 +21,7 @@ from app.models.technician import Technician
 from app.models.gps_tracking import TechnicianLocation
 from app.models.customer import Customer
 from app.models.gps_tracking import TechnicianLocation
+from app.services.geo import RouteStop, job_clusters, minutes_of_day, plan_route
 from app.services.websocket_manager import manager
 
 logger = logging.getLogger(__name__)
@@ -48,48 +49,8 @@ class RouteOptimizeRequest(BaseModel):
     technician_id: str
     work_order_ids: List[str]
     optimize_for: str = "distance"  # distance, time, priority
-
-
-# Helper functions
-
-
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two points in miles."""
-    R = 3959  # Earth's radius in miles
-
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
-
-    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    return R * c
-
-
-def simple_route_optimize(locations: List[dict], start_location: dict) -> List[dict]:
-    """Simple nearest-neighbor route optimization."""
-    if not locations:
-        return []
-
-    route = []
-    remaining = locations.copy()
-    current = start_location
-
-    while remaining:
-        # Find nearest location
-        nearest = min(
-            remaining,
-            key=lambda loc: haversine_distance(
-                current["latitude"], current["longitude"], loc["latitude"], loc["longitude"]
-            ),
-        )
-        route.append(nearest)
-        remaining.remove(nearest)
-        current = nearest
-
-    return route
+    return_home: bool = False  # finish the route back at the technician's home
+    start_time: Optional[str] = None  # departure HH:MM, default 08:00
 
 
 # Endpoints
@@ -230,65 +191,26 @@ async def get_job_clusters(
     current_user: CurrentUser,
     date_filter: Optional[date] = None,
     cluster_radius_miles: float = 5.0,
+    zoom: Optional[float] = Query(None, ge=0, le=22, description="Map zoom level; sets the cluster radius"),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lng: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lng: Optional[float] = Query(None, ge=-180, le=180),
 ):
-    """Get job clusters for overview map."""
-    # Get all jobs for the date
-    query = select(WorkOrder)
-
-    if date_filter:
-        query = query.where(WorkOrder.scheduled_date == date_filter)
-    else:
-        query = query.where(WorkOrder.scheduled_date == date.today())
-
-    result = await db.execute(query)
-    work_orders = result.scalars().all()
-
-    # Simple clustering by proximity
-    jobs_with_location = [
-        {
-            "id": str(wo.id),
-            "latitude": wo.service_latitude,
-            "longitude": wo.service_longitude,
-            "status": wo.status,
-        }
-        for wo in work_orders
-        if wo.service_latitude and wo.service_longitude
-    ]
-
-    if not jobs_with_location:
-        return {"clusters": []}
-
-    # Group nearby jobs
-    clusters = []
-    used = set()
-
-    for job in jobs_with_location:
-        if job["id"] in used:
-            continue
-
-        cluster = {
-            "center_latitude": job["latitude"],
-            "center_longitude": job["longitude"],
-            "job_count": 1,
-            "job_ids": [job["id"]],
-        }
-        used.add(job["id"])
-
-        # Find nearby jobs
-        for other in jobs_with_location:
-            if other["id"] in used:
-                continue
-
-            distance = haversine_distance(job["latitude"], job["longitude"], other["latitude"], other["longitude"])
-
-            if distance <= cluster_radius_miles:
-                cluster["job_count"] += 1
-                cluster["job_ids"].append(other["id"])
-                used.add(other["id"])
-
-        clusters.append(cluster)
-
-    return {"clusters": clusters}
+    """Get job clusters for overview map, optionally for one viewport at one zoom level."""
+    bounds = (min_lat, min_lng, max_lat, max_lng)
+    if any(v is None for v in bounds) and any(v is not None for v in bounds):
+        raise HTTPException(status_code=400, detail="min_lat, min_lng, max_lat and max_lng must be given together")
+    if min_lat is not None and (min_lat > max_lat or min_lng > max_lng):
+        raise HTTPException(status_code=400, detail="Bounding box minimums must not exceed maximums")
+
+    return await job_clusters(
+        db,
+        date_filter or date.today(),
+        radius_miles=cluster_radius_miles,
+        zoom=zoom,
+        bbox=bounds if min_lat is not None else None,
+    )
 
 
 @router.post("/route/optimize")
@@ -297,7 +219,7 @@ async def optimize_route(
     db: DbSession,
     current_user: CurrentUser,
 ):
-    """Optimize route for a technician's jobs."""
+    """Order a technician's jobs from home, honouring time windows, with per-leg ETAs."""
     # Get technician home location
     tech_result = await db.execute(select(Technician).where(Technician.id == request.technician_id))
     technician = tech_result.scalar_one_or_none()
@@ -312,38 +234,38 @@ async def optimize_route(
     wo_result = await db.execute(select(WorkOrder).where(WorkOrder.id.in_(request.work_order_ids)))
     work_orders = wo_result.scalars().all()
 
-    # Build location list
-    locations = [
-        {
-            "work_order_id": str(wo.id),
-            "latitude": wo.service_latitude,
-            "longitude": wo.service_longitude,
-            "priority": wo.priority,
-            "time_window_start": wo.time_window_start,
-        }
+    depart_minute = minutes_of_day(request.start_time) if request.start_time else 8 * 60
+    if depart_minute is None:
+        raise HTTPException(status_code=400, detail="start_time must be HH:MM")
+
+    stops = [
+        RouteStop.with_window(
+            str(wo.id),
+            wo.service_latitude,
+            wo.service_longitude,
+            wo.time_window_start,
+            wo.time_window_end,
+            service_minutes=(wo.estimated_duration_hours or 1) * 60,
+        )
         for wo in work_orders
         if wo.service_latitude and wo.service_longitude
     ]
-
-    start = {
-        "latitude": technician.home_latitude,
-        "longitude": technician.home_longitude,
-    }
-
-    # Optimize route (simple nearest-neighbor)
-    optimized = simple_route_optimize(locations, start)
-
-    # Calculate total distance
-    total_distance = 0.0
-    prev = start
-    for loc in optimized:
-        total_distance += haversine_distance(prev["latitude"], prev["longitude"], loc["latitude"], loc["longitude"])
-        prev = loc
+    home = (technician.home_latitude, technician.home_longitude)
+    # CPU-bound search: off the event loop
+    plan = await asyncio.to_thread(
+        plan_route,
+        stops,
+        home,
+        home if request.return_home else None,
+        depart_minute=depart_minute,
+    )
 
     return {
-        "optimized_route": [loc["work_order_id"] for loc in optimized],
-        "total_distance_miles": round(total_distance, 1),
-        "estimated_drive_time_minutes": round(total_distance * 2, 0),  # Rough estimate
+        "optimized_route": [stop.id for stop in plan.stops],
+        "total_distance_miles": round(plan.distance_miles, 1),
+        "estimated_drive_time_minutes": round(plan.drive_minutes, 0),
+        "total_late_minutes": round(plan.late_minutes, 1),
+        "legs": [leg.as_dict() for leg in plan.legs],
     }
 
 
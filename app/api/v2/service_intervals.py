@@ -796,26 +796,14 @@ async def run_reminder_check_now(
 async def get_scheduler_status(
     _current_user=Depends(get_current_user),
 ):
-    """Get the status of the reminder scheduler."""
-    from app.tasks.reminder_scheduler import get_scheduler
-
-    scheduler = get_scheduler()
-
-    jobs = []
-    if scheduler:
-        for job in scheduler.get_jobs():
-            jobs.append(
-                {
-                    "id": job.id,
-                    "name": job.name,
-                    "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
-                    "trigger": str(job.trigger),
-                }
-            )
+    """Get the status of the scheduled jobs on this replica (reminders included)."""
+    from app.services.job_scheduler import get_job_scheduler
+
+    scheduler = get_job_scheduler()
 
     return {
-        "running": scheduler.running if scheduler else False,
-        "jobs": jobs,
+        "running": scheduler.running,
+        "jobs": scheduler.status(),
     }
 
 
@@ -5,7 +5,8 @@ Service Markets API — read-only for now, admin can view market configs.
 from fastapi import APIRouter, HTTPException
 from app.api.deps import CurrentUser
 from app.services.market_config import MARKETS, CITY_TABLES
-from app.services.location_extractor import haversine_distance, estimate_drive_minutes
+from app.services.geo import haversine_miles
+from app.services.location_extractor import estimate_drive_minutes
 from app.services.market_config import get_zone
 
 router = APIRouter(prefix="/service-markets", tags=["service-markets"])
@@ -48,7 +49,7 @@ async def check_zone(slug: str, lat: float, lng: float, current_user: CurrentUse
 
     zone = get_zone(lat, lng, slug)
     center = market["center"]
-    distance = haversine_distance(center["lat"], center["lng"], lat, lng)
+    distance = haversine_miles(center["lat"], center["lng"], lat, lng)
     drive_minutes = estimate_drive_minutes(distance)
 
     return {
@@ -117,7 +117,7 @@ async def list_technicians(
             "page": page,
             "page_size": page_size,
         }
-        await cache.set(cache_key, result, ttl=TTL.LONG)
+        await cache.set(cache_key, result, ttl=TTL.LONG, tags=["technicians"])
         return result
     except Exception as e:
         import traceback
@@ -394,8 +394,7 @@ async def create_technician(
         db.add(technician)
         await db.commit()
         await db.refresh(technician)
-        await get_cache_service().delete_pattern("technicians:*")
-        await get_cache_service().delete_pattern("dashboard:*")
+        await get_cache_service().invalidate_tags("technicians", "dashboard")
         return technician_to_response(technician)
     except Exception as e:
         logger.error(f"Error creating technician: {type(e).__name__}: {e}")
@@ -430,8 +429,7 @@ async def update_technician(
 
         await db.commit()
         await db.refresh(technician)
-        await get_cache_service().delete_pattern("technicians:*")
-        await get_cache_service().delete_pattern("dashboard:*")
+        await get_cache_service().invalidate_tags("technicians", "dashboard")
         return technician_to_response(technician)
     except HTTPException:
         raise
@@ -472,8 +470,7 @@ async def delete_technician(
 
         # Cache clearing is non-critical — don't let it block deletion
         try:
-            await get_cache_service().delete_pattern("technicians:*")
-            await get_cache_service().delete_pattern("dashboard:*")
+            await get_cache_service().invalidate_tags("technicians", "dashboard")
         except Exception as cache_err:
             logger.warning(f"Cache clear failed after technician delete (non-blocking): {cache_err}")
     except HTTPException:
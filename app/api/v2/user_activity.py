@@ -12,7 +12,6 @@ bound parameters using make_interval(days => :days). Although the `days`
 parameter was validated as int by FastAPI's Query(), defense-in-depth requires
 that NO user-supplied value ever appear in an f-string passed to text().
 """
-import asyncio
 import logging
 from typing import Optional
 
@@ -41,7 +40,7 @@ async def track_frontend_event(
     request: Request,
 ):
     """Receive lightweight page-view / session events from the frontend."""
-    asyncio.create_task(log_activity(
+    log_activity(
         category=event.category,
         action=event.action,
         description=event.description,
@@ -52,7 +51,7 @@ async def track_frontend_event(
         user_agent=request.headers.get("user-agent", "")[:500],
         source="frontend",
         session_id=event.session_id,
-    ))
+    )
     return {"ok": True}
 
 
@@ -31,6 +31,7 @@ import logging
 import time
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
@@ -42,14 +43,13 @@ from app.services.campaign_dialer import (
     remove_pending_call_data,
 )
 from app.services.voice_agent import greeting_prerender, voicemail
-from app.services.voice_agent.pipeline_factory import build_pipeline
 from app.services.voice_agent.session import OutboundAgentSession
 from app.services.voice_agent.greeting_prerender import render_text as render_greeting_text
 
-# Pipecat 0.0.108 imports — verified against installed package.
-from pipecat.frames.frames import OutputAudioRawFrame, TTSSpeakFrame
-from pipecat.pipeline.runner import PipelineRunner
-from pipecat.pipeline.task import PipelineParams, PipelineTask
+# Pipecat (pipeline_factory and the pipecat.* imports) loads on the first call:
+# it pulls in scipy-backed VAD and takes seconds to import at startup.
+if TYPE_CHECKING:
+    from pipecat.pipeline.task import PipelineTask
 
 
 logger = logging.getLogger(__name__)
@@ -211,6 +211,13 @@ async def _run_human_branch(
     The caller owns it so transcript capture can read messages off of it after
     the pipeline ends.
     """
+    # Pipecat 0.0.108 imports — verified against installed package.
+    from pipecat.frames.frames import TTSSpeakFrame
+    from pipecat.pipeline.runner import PipelineRunner
+    from pipecat.pipeline.task import PipelineParams, PipelineTask
+
+    from app.services.voice_agent.pipeline_factory import build_pipeline
+
     short_sid = call_sid[:8]
 
     # Build the aggregator pair that brackets the LLM in the pipeline. Done
@@ -429,7 +436,7 @@ async def _send_audio_via_twilio_ws(
         await asyncio.sleep(0.02)
 
 
-async def _push_audio_into_pipeline(task: PipelineTask, audio: bytes) -> None:
+async def _push_audio_into_pipeline(task: "PipelineTask", audio: bytes) -> None:
     """Inject prerendered μ-law audio into Pipecat's output stream.
 
     Pipecat 0.0.108 ``PipelineTask`` exposes ``queue_frame`` / ``queue_frames``
@@ -437,6 +444,8 @@ async def _push_audio_into_pipeline(task: PipelineTask, audio: bytes) -> None:
     output audio frame. Greeting audio is μ-law 8kHz mono (matches Twilio
     Media Streams' inbound serializer expectations).
     """
+    from pipecat.frames.frames import OutputAudioRawFrame
+
     try:
         frame = OutputAudioRawFrame(audio=audio, sample_rate=8000, num_channels=1)
         if hasattr(task, "queue_frames"):
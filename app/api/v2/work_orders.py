@@ -5,17 +5,20 @@ from sqlalchemy.orm import aliased
 from typing import Optional, List
 from datetime import datetime, date as date_type
 from pydantic import BaseModel, Field
+import asyncio
 import uuid
 import logging
 import traceback
 
 from app.api.deps import DbSession, CurrentUser, EntityCtx
+from app.config import settings
 from app.models.work_order import WorkOrder
 from app.models.work_order_audit import WorkOrderAuditLog
 from app.models.customer import Customer
 from app.models.technician import Technician
 from app.services.commission_service import auto_create_commission
 from app.services.cache_service import get_cache_service, TTL
+from app.services.geo import RouteStop, minutes_of_day, plan_route
 from app.schemas.work_order import (
     WorkOrderCreate,
     WorkOrderUpdate,
@@ -1160,7 +1163,10 @@ async def list_work_orders(
             page=page,
             page_size=page_size,
         )
-        await cache.set(cache_key, jsonable_encoder(response), ttl=TTL.SHORT)
+        list_tags = ["workorders"]
+        if customer_id:
+            list_tags.append(f"customer:{customer_id}")
+        await cache.set(cache_key, jsonable_encoder(response), ttl=TTL.SHORT, tags=list_tags)
         return response
     except Exception as e:
         logger.error(f"Error in list_work_orders: {e}")
@@ -1336,7 +1342,7 @@ async def bulk_update_status(
 
     # Invalidate cache
     cache = get_cache_service()
-    await cache.delete_pattern("work-orders:*")
+    await cache.invalidate_tags("workorders", "dashboard")
 
     # Broadcast WebSocket event
     await manager.broadcast({
@@ -1392,7 +1398,7 @@ async def bulk_assign_technician(
     await db.commit()
 
     cache = get_cache_service()
-    await cache.delete_pattern("work-orders:*")
+    await cache.invalidate_tags("workorders", "dashboard")
 
     await manager.broadcast({
         "type": "dispatch_update",
@@ -1427,7 +1433,7 @@ async def bulk_delete_work_orders(
     await db.commit()
 
     cache = get_cache_service()
-    await cache.delete_pattern("work-orders:*")
+    await cache.invalidate_tags("workorders", "dashboard")
 
     return BulkResult(success_count=success, failed_count=len(errors), errors=errors)
 
@@ -1436,111 +1442,6 @@ async def bulk_delete_work_orders(
 # Route Optimization
 # ============================================
 
-import math
-
-
-def _haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate great-circle distance between two points in miles."""
-    R = 3958.8  # Earth radius in miles
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(dlon / 2) ** 2
-    )
-    return R * 2 * math.asin(math.sqrt(a))
-
-
-def _nearest_neighbor_route(
-    jobs: list[dict], start_lat: float, start_lng: float
-) -> tuple[list[dict], float]:
-    """Nearest-neighbor TSP that respects time_window_start constraints.
-
-    Jobs WITH a time_window_start are pinned at their correct chronological
-    position. Jobs WITHOUT a time window are slotted into the remaining gaps
-    using nearest-neighbor distance optimization.
-
-    This means: if Tod has a 9:00 AM job and a 1:00 PM job, the optimizer
-    routes flexible jobs between those two fixed appointments.
-    """
-    from datetime import time as time_type
-
-    def _parse_time(t) -> time_type | None:
-        """Parse a time_window_start value (time obj, str, or None)."""
-        if t is None:
-            return None
-        if isinstance(t, time_type):
-            return t
-        if isinstance(t, str):
-            try:
-                parts = t.split(":")
-                return time_type(int(parts[0]), int(parts[1]))
-            except (ValueError, IndexError):
-                return None
-        return None
-
-    # Separate time-pinned vs flexible jobs
-    pinned = []
-    flexible = []
-    for j in jobs:
-        tw = _parse_time(j.get("time_window_start"))
-        if tw is not None:
-            pinned.append((tw, j))
-        else:
-            flexible.append(j)
-
-    # Sort pinned jobs by time
-    pinned.sort(key=lambda x: x[0])
-
-    # Build final route: interleave pinned jobs with nearest-neighbor flexible fills
-    ordered = []
-    total_dist = 0.0
-    current_lat, current_lng = start_lat, start_lng
-
-    for _tw, pinned_job in pinned:
-        # Before each pinned job, greedily fill with nearest flexible jobs
-        # that are closer to current position than the pinned job
-        pinned_dist = _haversine_miles(current_lat, current_lng, pinned_job["lat"], pinned_job["lng"])
-        while flexible:
-            nearest_flex = min(
-                flexible,
-                key=lambda j: _haversine_miles(current_lat, current_lng, j["lat"], j["lng"]),
-            )
-            flex_dist = _haversine_miles(current_lat, current_lng, nearest_flex["lat"], nearest_flex["lng"])
-            # Only insert flexible job if it's on the way (closer than pinned)
-            if flex_dist < pinned_dist * 0.6:
-                total_dist += flex_dist
-                current_lat, current_lng = nearest_flex["lat"], nearest_flex["lng"]
-                ordered.append(nearest_flex)
-                flexible.remove(nearest_flex)
-                # Recalculate pinned distance from new position
-                pinned_dist = _haversine_miles(current_lat, current_lng, pinned_job["lat"], pinned_job["lng"])
-            else:
-                break
-
-        # Add the pinned job
-        dist = _haversine_miles(current_lat, current_lng, pinned_job["lat"], pinned_job["lng"])
-        total_dist += dist
-        current_lat, current_lng = pinned_job["lat"], pinned_job["lng"]
-        ordered.append(pinned_job)
-
-    # Append remaining flexible jobs via nearest-neighbor
-    while flexible:
-        nearest = min(
-            flexible,
-            key=lambda j: _haversine_miles(current_lat, current_lng, j["lat"], j["lng"]),
-        )
-        dist = _haversine_miles(current_lat, current_lng, nearest["lat"], nearest["lng"])
-        total_dist += dist
-        current_lat, current_lng = nearest["lat"], nearest["lng"]
-        ordered.append(nearest)
-        flexible.remove(nearest)
-
-    return ordered, total_dist
-
-
 def _address_to_approx_coords(address: str) -> tuple[float, float]:
     """
     Deterministic address-based approximation for San Marcos TX area.
@@ -1557,13 +1458,22 @@ class RouteOptimizeRequest(BaseModel):
     start_lat: Optional[float] = None
     start_lng: Optional[float] = None
     start_address: Optional[str] = "105 S Comanche St, San Marcos, TX 78666"
+    # Finish at an end depot (e.g. the technician's home); omit for an open route
+    end_lat: Optional[float] = None
+    end_lng: Optional[float] = None
+    start_time: Optional[str] = Field(None, description="Departure time HH:MM, default 08:00")
+    time_budget: float = Field(
+        0.5, gt=0, le=5, description="Seconds to spend improving the route (capped at ROUTE_OPTIMIZE_MAX_BUDGET)"
+    )
 
 
 class RouteOptimizeResponse(BaseModel):
     ordered_job_ids: list[str]
     total_distance_miles: float
     estimated_drive_minutes: int
-    waypoints: list[dict]  # [{job_id, address, lat, lng}]
+    waypoints: list[dict]  # [{job_id, address, lat, lng, eta, time_window_start, time_window_end}]
+    legs: list[dict] = []  # per-leg distance, drive time, ETA, wait and lateness
+    total_late_minutes: float = 0
 
 
 @router.post("/optimize-route", response_model=RouteOptimizeResponse)
@@ -1573,17 +1483,21 @@ async def optimize_route(
     current_user: CurrentUser,
 ):
     """
-    Given a list of job IDs and a start location, return the jobs
-    reordered by nearest-neighbor haversine distance.
+    Given a list of job IDs and a start location, return the jobs in the
+    order that honours their time windows and then minimises drive time
+    (see app.services.geo.routing.plan_route).
 
     Input: { "job_ids": [...], "start_lat": 30.0, "start_lng": -97.0 }
     OR: { "job_ids": [...], "start_address": "123 Main St, San Marcos TX" }
+    Optional: "end_lat"/"end_lng" to finish at a depot, "start_time": "07:30"
 
     Output: {
         "ordered_job_ids": [...],
         "total_distance_miles": 47.3,
-        "estimated_drive_minutes": 68,
-        "waypoints": [{"job_id": ..., "address": ..., "lat": ..., "lng": ...}]
+        "estimated_drive_minutes": 95,
+        "waypoints": [{"job_id": ..., "address": ..., "lat": ..., "lng": ..., "eta": "08:42", ...}],
+        "legs": [{"stop_id": ..., "distance_miles": ..., "eta": ..., "late_minutes": ...}],
+        "total_late_minutes": 0
     }
     """
     if not request.job_ids:
@@ -1591,6 +1505,19 @@ async def optimize_route(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="job_ids must not be empty",
         )
+    if (request.end_lat is None) != (request.end_lng is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_lat and end_lng must be given together",
+        )
+    depart_minute = 8 * 60
+    if request.start_time is not None:
+        depart_minute = minutes_of_day(request.start_time)
+        if depart_minute is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_time must be HH:MM",
+            )
 
     # Determine start coordinates
     if request.start_lat is not None and request.start_lng is not None:
@@ -1654,14 +1581,34 @@ async def optimize_route(
             "lat": lat,
             "lng": lng,
             "time_window_start": wo.time_window_start,
+            "time_window_end": wo.time_window_end,
+            "service_minutes": (wo.estimated_duration_hours or 1) * 60,
         })
 
-    # Run nearest-neighbor optimization
-    ordered_jobs, total_distance = _nearest_neighbor_route(jobs, start_lat, start_lng)
-
-    # Estimate drive time: assume average 35 mph for rural/suburban Texas
-    estimated_drive_minutes = int(round(total_distance / 35 * 60))
+    stops = [
+        RouteStop.with_window(
+            j["job_id"],
+            j["lat"],
+            j["lng"],
+            j["time_window_start"],
+            j["time_window_end"],
+            service_minutes=j["service_minutes"],
+        )
+        for j in jobs
+    ]
+    end = (request.end_lat, request.end_lng) if request.end_lat is not None else None
+    # CPU-bound search: off the event loop, and never longer than the server allows
+    plan = await asyncio.to_thread(
+        plan_route,
+        stops,
+        (start_lat, start_lng),
+        end,
+        depart_minute=depart_minute,
+        time_budget=min(request.time_budget, settings.ROUTE_OPTIMIZE_MAX_BUDGET),
+    )
 
+    ordered_jobs = [jobs[i] for i in plan.order]
+    legs = [leg.as_dict() for leg in plan.legs]
     ordered_job_ids = [j["job_id"] for j in ordered_jobs]
     waypoints = [
         {
@@ -1669,15 +1616,20 @@ async def optimize_route(
             "address": j["address"],
             "lat": j["lat"],
             "lng": j["lng"],
+            "eta": leg["eta"],
+            "time_window_start": str(j["time_window_start"])[:5] if j["time_window_start"] else None,
+            "time_window_end": str(j["time_window_end"])[:5] if j["time_window_end"] else None,
         }
-        for j in ordered_jobs
+        for j, leg in zip(ordered_jobs, legs)
     ]
 
     return RouteOptimizeResponse(
         ordered_job_ids=ordered_job_ids,
-        total_distance_miles=round(total_distance, 2),
-        estimated_drive_minutes=estimated_drive_minutes,
+        total_distance_miles=round(plan.distance_miles, 2),
+        estimated_drive_minutes=int(round(plan.drive_minutes)),
         waypoints=waypoints,
+        legs=legs,
+        total_late_minutes=round(plan.late_minutes, 1),
     )
 
 
@@ -1871,8 +1823,7 @@ async def create_work_order(
     )
 
     # Invalidate work order and dashboard caches
-    await get_cache_service().delete_pattern("workorders:*")
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("workorders", "dashboard")
 
     # Fetch customer for name population in response
     customer = None
@@ -2201,8 +2152,7 @@ async def update_work_order(
             logger.warning(f"Calendar cancel setup error: {e}")
 
     # Invalidate caches
-    await get_cache_service().delete_pattern("workorders:*")
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("workorders", "dashboard")
 
     # Fetch customer + billing customer for name population in response
     customer = None
@@ -2472,8 +2422,7 @@ async def delete_work_order(
 
         await db.delete(work_order)
         await db.commit()
-        await get_cache_service().delete_pattern("workorders:*")
-        await get_cache_service().delete_pattern("dashboard:*")
+        await get_cache_service().invalidate_tags("workorders", "dashboard")
     except HTTPException:
         raise
     except Exception as e:
@@ -2815,7 +2764,7 @@ async def generate_invoice_from_work_order(
     await db.refresh(invoice)
 
     # Invalidate caches
-    await get_cache_service().delete_pattern("dashboard:*")
+    await get_cache_service().invalidate_tags("dashboard")
 
     customer_name = None
     if customer:
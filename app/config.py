@@ -215,15 +215,58 @@ class Settings(BaseSettings):
     REDIS_URL: str | None = None
     RATE_LIMIT_REDIS_ENABLED: bool = True  # Use Redis when REDIS_URL is set
     RATE_LIMIT_BYPASS_IPS: str = ""  # Comma-separated IPs to bypass rate limiting (e.g., test runners)
+    PRINCIPAL_CACHE_TTL: int = 60  # Seconds auth lookups (user, entity, API token) are cached; 0 disables
+
+    # User activity log writer
+    ACTIVITY_LOG_BATCH_SIZE: int = 200  # Rows per multi-row INSERT
+    ACTIVITY_LOG_FLUSH_MS: int = 500  # Longest a buffered row waits before being written
+    ACTIVITY_LOG_QUEUE_SIZE: int = 10000  # Buffered rows; events beyond this are dropped and counted
+
+    # Outbound SMS dispatcher
+    SMS_SEND_RATE_PER_NUMBER: float = 1.0  # Messages/second per sender number (provider throughput cap)
+    SMS_MAX_ATTEMPTS: int = 4  # Sends per message, counting retries of 429/5xx/network errors
+    SMS_QUEUE_SIZE: int = 5000  # Waiting messages; further ones are recorded as failed and counted
+
+    # Real-time fan-out (WebSocket/SSE events, shared across workers through Redis when REDIS_URL is set)
+    WS_SEND_QUEUE_SIZE: int = 256  # Unsent messages per WebSocket before the client is evicted as too slow
+
+    # Outbound integration HTTP clients (pooled per upstream; see app.services.http_clients)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20  # Connections per upstream unless the upstream sets its own
+    HTTP_CLIENT_RETRIES: int = 2  # Retries of failed connections and 429/5xx answers to idempotent requests
+
+    # Startup schema setup (fingerprinted, single runner; see app.schema_setup)
+    SCHEMA_SETUP_ON_STARTUP: bool = True  # Run a stale schema setup at startup (else only python -m app.schema_setup)
+
+    # Scheduled jobs (one replica runs each fire; see app.services.job_scheduler)
+    JOB_RUN_RETENTION_DAYS: int = 30  # Days of job_runs history kept
+    SCHEDULER_TIMEZONE: str = "UTC"  # Timezone of cron() jobs that don't name one
+    JOB_SHUTDOWN_TIMEOUT: float = 30.0  # Seconds running jobs get to finish on shutdown before being cancelled
+
+    # Single-technician route optimization (POST /work-orders/optimize-route, /schedule-map/optimize-route)
+    ROUTE_OPTIMIZE_MAX_BUDGET: float = 1.0  # Upper bound on the seconds one request's search may run
+
+    # Day planner (multi-technician auto-dispatch)
+    DAY_PLANNER_TIME_LIMIT: float = 20.0  # Seconds the solver may search per plan
+    DAY_PLANNER_SHIFT_HOURS: float = 10.0  # Working day per technician, from 08:00
+    DAY_PLANNER_STALE_AFTER: float = 900.0  # Seconds before a plan still "planning" is treated as lost
 
     # OpenTelemetry (optional)
     OTEL_EXPORTER_OTLP_ENDPOINT: str | None = None
     OTEL_SERVICE_NAME: str = "react-crm-api"
 
+    # Prometheus metrics
+    METRICS_MAX_SERIES: int = 1000  # Label sets per metric; further label sets share one overflow series
+    METRICS_MULTIPROC_DIR: str | None = None  # Shared dir for per-worker snapshots (uvicorn --workers > 1)
+
     # AI Interaction Analyzer (Stage 3)
     AI_DAILY_BUDGET_USD: float = 25.00
     DANNIA_OUTBOUND_CAMPAIGN_ID: str = "email-openers-spring-2026"
     AI_BUDGET_ALERT_RECIPIENT: str = "willwalterburns@gmail.com"
+    AI_QUEUE_WORKERS: int = 8  # Analysis jobs run at once per process (see app.services.ai.queue)
+    AI_QUEUE_MAX_ATTEMPTS: int = 5  # Runs per job before it is dead-lettered
+    AI_QUEUE_LEASE_SECONDS: float = 300.0  # A claimed job whose worker stops renewing is re-claimed after this
+    AI_ANTHROPIC_CONCURRENCY: int = 4  # Anthropic calls in flight per process
+    AI_DEEPGRAM_CONCURRENCY: int = 2  # Deepgram transcriptions in flight per process
 
     @model_validator(mode="after")
     def validate_production_settings(self) -> "Settings":
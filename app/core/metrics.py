@@ -5,6 +5,31 @@ Provides metrics for monitoring:
 - HTTP request counts and latency
 - Database connection pool status
 - Business metrics (AI requests, etc.)
+- Cache hits/misses/evictions per namespace and tier
+- Activity log writer outcomes
+
+Design:
+- Every metric is a labelled family holding plain dicts keyed by label
+  tuples. Metrics are recorded from the event loop thread, so updates take
+  no lock; the GIL keeps the dicts consistent if a worker thread records too.
+- Histograms keep one list of per-bucket counts per series and find the
+  bucket with bisect instead of walking every bound.
+- Each family holds at most METRICS_MAX_SERIES label sets. Further label
+  sets are folded into one series whose labels are all "__overflow__", and
+  crm_metrics_overflow_total counts how often that happened.
+- HTTP metrics are labelled with the matched route template
+  (/api/v2/customers/{customer_id}), never the raw path.
+- With several uvicorn workers each process only sees its own requests.
+  When METRICS_MULTIPROC_DIR is set, every worker writes a snapshot of its
+  registry there (run_snapshot_exporter) and /metrics merges all of them:
+  counters and histograms are summed over every worker that ever wrote one,
+  gauges over live workers only. A worker folds its counters and histograms
+  into a shared archive file and deletes its snapshot on shutdown; at
+  startup snapshots left by workers that died without doing so are folded
+  in the same way, so the directory holds one file per live worker plus
+  the archive. Snapshots carry a boot token (random id plus process start
+  time), so a dead worker whose PID was reused (PID 1 after a container
+  restart, a new sibling worker) is still recognised as dead.
 
 Usage:
     from app.core.metrics import (
@@ -13,89 +38,152 @@ Usage:
     )
 """
 
-import time
-from typing import Optional
-from dataclasses import dataclass, field
-from collections import defaultdict
+import asyncio
+import json
+import logging
+import os
 import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no locking, archiving is best effort
+    fcntl = None
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_LABEL = "__overflow__"
+UNMATCHED_ROUTE = "__unmatched__"
+
+# Default buckets for HTTP request latency (in seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Outbound SMS: queueing behind a per-number rate limit plus retry backoff
+SMS_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# Scheduled jobs: quick polls to multi-minute syncs and reports
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+HTTP_CLIENT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_SNAPSHOT_PREFIX = "metrics-"
+# Counters and histograms of workers that exited (pid null, so its gauges never count)
+_ARCHIVE_NAME = f"{_SNAPSHOT_PREFIX}archive.json"
+# Held shared while merging snapshots, exclusively while folding one into the archive
+_LOCK_NAME = f"{_SNAPSHOT_PREFIX}lock"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
 
 
-@dataclass
-class MetricBucket:
-    """A single histogram bucket."""
+def _label_str(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
 
-    le: float  # Less than or equal
-    count: int = 0
 
+class _Family:
+    """Label-set bookkeeping shared by all metric types."""
 
-@dataclass
-class Histogram:
-    """Prometheus-style histogram."""
+    type_name = ""
 
-    name: str
-    help_text: str
-    buckets: list = field(default_factory=list)
-    sum_value: float = 0.0
-    count: int = 0
-    labels: dict = field(default_factory=dict)
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), max_series: Optional[int] = None):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._series: dict[tuple, Any] = {}
+        self._overflow_key = (OVERFLOW_LABEL,) * len(self.labelnames)
+        self.overflowed = 0
 
-    def __post_init__(self):
-        if not self.buckets:
-            # Default buckets for HTTP request latency (in seconds)
-            bucket_bounds = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
-            self.buckets = [MetricBucket(le=b) for b in bucket_bounds]
-            self.buckets.append(MetricBucket(le=float("inf")))  # +Inf bucket
+    def _key(self, labels: tuple) -> tuple:
+        """Series key for labels, or the overflow key once the family is full."""
+        if labels in self._series:
+            return labels
+        limit = self.max_series or settings.METRICS_MAX_SERIES
+        if len(self._series) >= limit and self.labelnames:
+            self.overflowed += 1
+            return self._overflow_key
+        return labels
 
-    def observe(self, value: float):
-        """Record an observation."""
-        self.sum_value += value
-        self.count += 1
-        for bucket in self.buckets:
-            if value <= bucket.le:
-                bucket.count += 1
+    def series(self) -> dict[tuple, Any]:
+        return self._series
 
+    def clear(self) -> None:
+        self._series.clear()
+        self.overflowed = 0
 
-@dataclass
-class Counter:
-    """Prometheus-style counter."""
 
-    name: str
-    help_text: str
-    value: float = 0.0
-    labels: dict = field(default_factory=dict)
+class Counter(_Family):
+    """Prometheus-style counter family."""
 
-    def inc(self, amount: float = 1.0):
-        """Increment the counter."""
-        self.value += amount
+    type_name = "counter"
 
+    def inc(self, amount: float = 1.0, labels: tuple = ()) -> None:
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0.0) + amount
 
-@dataclass
-class Gauge:
-    """Prometheus-style gauge."""
+    def value(self, labels: tuple = ()) -> float:
+        return self._series.get(labels, 0.0)
 
-    name: str
-    help_text: str
-    value: float = 0.0
-    labels: dict = field(default_factory=dict)
 
-    def set(self, value: float):
-        """Set the gauge value."""
-        self.value = value
+class Gauge(_Family):
+    """Prometheus-style gauge family."""
 
-    def inc(self, amount: float = 1.0):
-        """Increment the gauge."""
-        self.value += amount
+    type_name = "gauge"
+
+    def set(self, value: float, labels: tuple = ()) -> None:
+        self._series[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, labels: tuple = ()) -> None:
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, labels: tuple = ()) -> None:
+        self.inc(-amount, labels)
+
+    def value(self, labels: tuple = ()) -> float:
+        return self._series.get(labels, 0.0)
+
+
+class Histogram(_Family):
+    """
+    Prometheus-style histogram family.
+
+    A series is [bucket_counts, sum] where bucket_counts[i] counts
+    observations in (bounds[i-1], bounds[i]] and the last slot is +Inf.
+    Cumulative counts are only computed when rendering.
+    """
 
-    def dec(self, amount: float = 1.0):
-        """Decrement the gauge."""
-        self.value -= amount
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS, **kwargs
+    ):
+        super().__init__(name, help_text, labelnames, **kwargs)
+        self.bounds = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.bounds) + 1), 0.0]
+        series[0][bisect_left(self.bounds, value)] += 1
+        series[1] += value
 
 
 class MetricsRegistry:
     """
     Central registry for all metrics.
 
-    Thread-safe singleton pattern for collecting metrics across the application.
+    Singleton per process; see the module docstring for threading and
+    multi-worker behaviour.
     """
 
     _instance = None
@@ -111,111 +199,354 @@ class MetricsRegistry:
 
     def _initialize(self):
         """Initialize all metrics."""
-        self._metrics_lock = threading.Lock()
-
         # HTTP metrics
-        self.http_requests_total = defaultdict(
-            lambda: Counter(name="http_requests_total", help_text="Total number of HTTP requests")
+        self.http_requests_total = Counter(
+            "http_requests_total", "Total number of HTTP requests", ("method", "status", "path")
         )
-        self.http_request_duration = defaultdict(
-            lambda: Histogram(name="http_request_duration_seconds", help_text="HTTP request duration in seconds")
+        self.http_request_duration = Histogram(
+            "http_request_duration_seconds", "HTTP request duration in seconds", ("method", "path")
         )
         self.http_requests_in_flight = Gauge(
-            name="http_requests_in_flight", help_text="Number of HTTP requests currently being processed"
+            "http_requests_in_flight", "Number of HTTP requests currently being processed"
         )
 
         # Database metrics
-        self.db_pool_size = Gauge(name="db_pool_connections_total", help_text="Total database pool connections")
-        self.db_pool_available = Gauge(
-            name="db_pool_connections_available", help_text="Available database pool connections"
-        )
+        self.db_pool_size = Gauge("db_pool_connections_total", "Total database pool connections")
+        self.db_pool_available = Gauge("db_pool_connections_available", "Available database pool connections")
 
         # Business metrics
-        self.ai_requests_total = defaultdict(
-            lambda: Counter(name="crm_ai_requests_total", help_text="Total AI/ML API requests")
+        self.ai_requests_total = Counter("crm_ai_requests_total", "Total AI/ML API requests", ("type", "status"))
+        self.cache_hits = Counter("crm_cache_hits_total", "Total cache hits", ("namespace", "tier"))
+        self.cache_misses = Counter("crm_cache_misses_total", "Total cache misses", ("namespace",))
+        self.cache_evictions = Counter(
+            "crm_cache_evictions_total", "Total L1 cache capacity evictions", ("namespace",)
+        )
+        self.cache_coalesced = Counter(
+            "crm_cache_coalesced_total", "Total cache misses that waited on an in-flight load", ("namespace",)
+        )
+        self.activity_events = Counter("crm_activity_events_total", "Activity log events by outcome", ("outcome",))
+        self.sms_queue_depth = Gauge("crm_sms_queue_depth", "Outbound SMS waiting to be sent")
+        self.sms_messages = Counter("crm_sms_messages_total", "Outbound SMS by outcome", ("outcome",))
+        self.pubsub_messages = Counter(
+            "crm_pubsub_messages_total", "Cross-worker real-time messages by direction", ("direction",)
+        )
+        self.ws_evictions = Counter("crm_ws_evictions_total", "WebSocket consumers evicted for falling behind")
+        self.sms_latency = Histogram(
+            "crm_sms_send_latency_seconds", "Outbound SMS time from enqueue to final outcome", buckets=SMS_BUCKETS
+        )
+        self.job_runs = Counter("crm_job_runs_total", "Scheduled job fires by outcome", ("job", "status"))
+        self.job_duration = Histogram(
+            "crm_job_duration_seconds", "Scheduled job run duration", ("job",), buckets=JOB_BUCKETS
+        )
+        self.ai_queue_depth = Gauge("crm_ai_queue_depth", "AI analysis jobs waiting to run")
+        self.ai_queue_oldest = Gauge("crm_ai_queue_oldest_seconds", "Age of the oldest waiting AI analysis job")
+        self.ai_jobs = Counter("crm_ai_jobs_total", "AI analysis jobs by outcome", ("outcome",))
+        self.http_client_requests = Counter(
+            "crm_http_client_requests_total", "Outbound integration requests by upstream and outcome",
+            ("upstream", "outcome"),
+        )
+        self.http_client_duration = Histogram(
+            "crm_http_client_duration_seconds", "Outbound integration time to response headers", ("upstream",),
+            buckets=HTTP_CLIENT_BUCKETS,
+        )
+        self.http_client_retries = Counter(
+            "crm_http_client_retries_total", "Outbound integration requests retried", ("upstream",)
         )
-        self.cache_hits = Counter(name="crm_cache_hits_total", help_text="Total cache hits")
-        self.cache_misses = Counter(name="crm_cache_misses_total", help_text="Total cache misses")
 
         # Error metrics
-        self.errors_total = defaultdict(lambda: Counter(name="crm_errors_total", help_text="Total errors by type"))
+        self.errors_total = Counter("crm_errors_total", "Total errors by type", ("type",))
+
+        self.families: list[_Family] = [
+            self.http_requests_total,
+            self.http_request_duration,
+            self.http_requests_in_flight,
+            self.db_pool_size,
+            self.db_pool_available,
+            self.ai_requests_total,
+            self.cache_hits,
+            self.cache_misses,
+            self.cache_evictions,
+            self.cache_coalesced,
+            self.activity_events,
+            self.sms_queue_depth,
+            self.sms_messages,
+            self.sms_latency,
+            self.pubsub_messages,
+            self.ws_evictions,
+            self.job_runs,
+            self.job_duration,
+            self.ai_queue_depth,
+            self.ai_queue_oldest,
+            self.ai_jobs,
+            self.http_client_requests,
+            self.http_client_duration,
+            self.http_client_retries,
+            self.errors_total,
+        ]
+        # Snapshot file this process last wrote
+        self._snapshot_target: Optional[Path] = None
+
+    # -- Snapshots ------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """This process's series as plain JSON-able data."""
+        families = {
+            family.name: [[list(labels), value] for labels, value in list(family.series().items())]
+            for family in self.families
+        }
+        overflow = {family.name: family.overflowed for family in self.families if family.overflowed}
+        return {"pid": os.getpid(), "boot": _boot_token(), "families": families, "overflow": overflow}
+
+    def write_snapshot(self, directory: Optional[str] = None) -> None:
+        """Atomically replace this worker's snapshot file in directory."""
+        directory = directory or settings.METRICS_MULTIPROC_DIR
+        if not directory:
+            return
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        target = path / f"{_SNAPSHOT_PREFIX}{os.getpid()}.json"
+        if target != self._snapshot_target:
+            # A file already at our path was left by an earlier process with this PID
+            data = _read_snapshot(target) if target.exists() else None
+            if data is not None and not _snapshot_live(data):
+                self.archive_snapshots(directory, [target])
+            self._snapshot_target = target
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, target)
+
+    def merged_snapshots(self, directory: str) -> tuple[dict[str, dict[tuple, Any]], dict[str, int]]:
+        """Series of every worker's snapshot in directory, merged."""
+        self.write_snapshot(directory)
+        gauges = {family.name for family in self.families if isinstance(family, Gauge)}
+        merged: dict[str, dict[tuple, Any]] = {family.name: {} for family in self.families}
+        overflow: dict[str, int] = {}
+
+        with _snapshot_lock(Path(directory), exclusive=False):
+            for file in Path(directory).glob(f"{_SNAPSHOT_PREFIX}*.json"):
+                data = _read_snapshot(file)
+                if data is None:
+                    continue
+                skip = set() if _snapshot_live(data) else gauges
+                _merge_snapshot(merged, overflow, data, skip)
+        return merged, overflow
+
+    def archive_snapshots(self, directory: str, files: list[Path]) -> None:
+        """Fold the counters and histograms of snapshot files into the archive, then delete them."""
+        path = Path(directory)
+        gauges = {family.name for family in self.families if isinstance(family, Gauge)}
+        with _snapshot_lock(path, exclusive=True):
+            archive = path / _ARCHIVE_NAME
+            merged: dict[str, dict] = {}
+            overflow: dict[str, int] = {}
+            for file in [archive, *files]:
+                data = _read_snapshot(file) if file.exists() else None
+                if data is not None:
+                    _merge_snapshot(merged, overflow, data, gauges)
+            families = {
+                name: [[list(labels), value] for labels, value in series.items()] for name, series in merged.items()
+            }
+            tmp = archive.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"pid": None, "families": families, "overflow": overflow}))
+            os.replace(tmp, archive)
+            for file in files:
+                file.unlink(missing_ok=True)
+
+    def prune_snapshots(self, directory: Optional[str] = None) -> int:
+        """Archive the snapshots of workers that are no longer running; returns how many."""
+        directory = directory or settings.METRICS_MULTIPROC_DIR
+        if not directory or not Path(directory).is_dir():
+            return 0
+        dead = []
+        for file in Path(directory).glob(f"{_SNAPSHOT_PREFIX}*.json"):
+            if file.name == _ARCHIVE_NAME:
+                continue
+            data = _read_snapshot(file)
+            if data is None or not _snapshot_live(data):
+                dead.append(file)
+        if dead:
+            self.archive_snapshots(directory, dead)
+        return len(dead)
+
+    def retire_snapshot(self, directory: Optional[str] = None) -> None:
+        """Write this worker's final snapshot, fold it into the archive and delete it (shutdown)."""
+        directory = directory or settings.METRICS_MULTIPROC_DIR
+        if not directory:
+            return
+        self.write_snapshot(directory)
+        self.archive_snapshots(directory, [Path(directory) / f"{_SNAPSHOT_PREFIX}{os.getpid()}.json"])
+
+    # -- Exposition -------------------------------------------------------------
 
     def format_prometheus(self) -> str:
         """Format all metrics in Prometheus text format."""
-        lines = []
+        directory = settings.METRICS_MULTIPROC_DIR
+        if directory:
+            series_by_name, overflow = self.merged_snapshots(directory)
+        else:
+            series_by_name = {family.name: dict(family.series()) for family in self.families}
+            overflow = {family.name: family.overflowed for family in self.families if family.overflowed}
 
-        with self._metrics_lock:
-            # HTTP requests total
-            lines.append("# HELP http_requests_total Total number of HTTP requests")
-            lines.append("# TYPE http_requests_total counter")
-            for labels, counter in self.http_requests_total.items():
-                method, status, path = labels
-                lines.append(
-                    f'http_requests_total{{method="{method}",status="{status}",path="{path}"}} {counter.value}'
-                )
-
-            # HTTP request duration
-            lines.append("")
-            lines.append("# HELP http_request_duration_seconds HTTP request duration in seconds")
-            lines.append("# TYPE http_request_duration_seconds histogram")
-            for labels, histogram in self.http_request_duration.items():
-                method, path = labels
-                for bucket in histogram.buckets:
-                    le_str = "+Inf" if bucket.le == float("inf") else str(bucket.le)
-                    lines.append(
-                        f'http_request_duration_seconds_bucket{{method="{method}",path="{path}",le="{le_str}"}} {bucket.count}'
-                    )
-                lines.append(
-                    f'http_request_duration_seconds_sum{{method="{method}",path="{path}"}} {histogram.sum_value}'
-                )
-                lines.append(
-                    f'http_request_duration_seconds_count{{method="{method}",path="{path}"}} {histogram.count}'
-                )
-
-            # HTTP in flight
-            lines.append("")
-            lines.append("# HELP http_requests_in_flight Number of HTTP requests currently being processed")
-            lines.append("# TYPE http_requests_in_flight gauge")
-            lines.append(f"http_requests_in_flight {self.http_requests_in_flight.value}")
-
-            # Database pool
-            lines.append("")
-            lines.append("# HELP db_pool_connections_total Total database pool connections")
-            lines.append("# TYPE db_pool_connections_total gauge")
-            lines.append(f"db_pool_connections_total {self.db_pool_size.value}")
-            lines.append("")
-            lines.append("# HELP db_pool_connections_available Available database pool connections")
-            lines.append("# TYPE db_pool_connections_available gauge")
-            lines.append(f"db_pool_connections_available {self.db_pool_available.value}")
-
-            # AI requests
-            lines.append("")
-            lines.append("# HELP crm_ai_requests_total Total AI/ML API requests")
-            lines.append("# TYPE crm_ai_requests_total counter")
-            for labels, counter in self.ai_requests_total.items():
-                ai_type, status = labels
-                lines.append(f'crm_ai_requests_total{{type="{ai_type}",status="{status}"}} {counter.value}')
-
-            # Cache metrics
-            lines.append("")
-            lines.append("# HELP crm_cache_hits_total Total cache hits")
-            lines.append("# TYPE crm_cache_hits_total counter")
-            lines.append(f"crm_cache_hits_total {self.cache_hits.value}")
-            lines.append("")
-            lines.append("# HELP crm_cache_misses_total Total cache misses")
-            lines.append("# TYPE crm_cache_misses_total counter")
-            lines.append(f"crm_cache_misses_total {self.cache_misses.value}")
-
-            # Error metrics
-            lines.append("")
-            lines.append("# HELP crm_errors_total Total errors by type")
-            lines.append("# TYPE crm_errors_total counter")
-            for labels, counter in self.errors_total.items():
-                (error_type,) = labels
-                lines.append(f'crm_errors_total{{type="{error_type}"}} {counter.value}')
+        lines = []
+        for family in self.families:
+            if lines:
+                lines.append("")
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.type_name}")
+            series = series_by_name.get(family.name, {})
+            if not family.labelnames and not series:
+                series = {(): [[0] * (len(family.bounds) + 1), 0.0] if isinstance(family, Histogram) else 0.0}
+            for labels, value in series.items():
+                if isinstance(family, Histogram):
+                    lines.extend(_format_histogram(family, labels, value))
+                else:
+                    lines.append(f"{family.name}{_label_str(family.labelnames, labels)} {value}")
+
+        lines.append("")
+        lines.append("# HELP crm_metrics_overflow_total Observations folded into a metric's overflow series")
+        lines.append("# TYPE crm_metrics_overflow_total counter")
+        for name, count in overflow.items():
+            lines.append(f'crm_metrics_overflow_total{{metric="{name}"}} {count}')
 
         return "\n".join(lines)
 
+    def reset(self) -> None:
+        """Drop every series (tests)."""
+        for family in self.families:
+            family.clear()
+
+
+def _format_histogram(family: Histogram, labels: tuple, value: list) -> list[str]:
+    counts, total = value
+    lines = []
+    cumulative = 0
+    for bound, count in zip(family.bounds + (float("inf"),), counts):
+        cumulative += count
+        le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+        lines.append(f"{family.name}_bucket{_label_str(family.labelnames, labels, le)} {cumulative}")
+    label_str = _label_str(family.labelnames, labels)
+    lines.append(f"{family.name}_sum{label_str} {total}")
+    lines.append(f"{family.name}_count{label_str} {cumulative}")
+    return lines
+
+
+def _read_snapshot(file: Path) -> Optional[dict]:
+    try:
+        return json.loads(file.read_text())
+    except (OSError, ValueError) as e:
+        logger.debug(f"Skipping unreadable metrics snapshot {file.name}: {e}")
+        return None
+
+
+def _merge_snapshot(merged: dict, overflow: dict, data: dict, skip: set) -> None:
+    """Add a snapshot's series to merged (families missing from merged are added unless in skip)."""
+    for name, series in data.get("families", {}).items():
+        if name in skip:
+            continue
+        target = merged.setdefault(name, {})
+        for labels, value in series:
+            key = tuple(labels)
+            if isinstance(value, list):
+                current = target.get(key)
+                if current is None:
+                    target[key] = [list(value[0]), value[1]]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+            else:
+                target[key] = target.get(key, 0.0) + value
+    for name, count in data.get("overflow", {}).items():
+        overflow[name] = overflow.get(name, 0) + count
+
+
+@contextmanager
+def _snapshot_lock(directory: Path, exclusive: bool):
+    if fcntl is None or not directory.is_dir():
+        yield
+        return
+    with open(directory / _LOCK_NAME, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+_boot: Optional[tuple[int, dict]] = None
+
+
+def _boot_token() -> dict:
+    """Identifies this process across PID reuse: a random id and the process start time."""
+    global _boot
+    pid = os.getpid()
+    if _boot is None or _boot[0] != pid:  # First call, or a child forked after it
+        _boot = (pid, {"id": uuid.uuid4().hex, "started": _process_started(pid)})
+    return _boot[1]
+
+
+def _process_started(pid: int) -> Optional[int]:
+    """Start time of pid in clock ticks since boot, from /proc; None where unavailable."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        # Fields after the parenthesised command name; starttime is field 22
+        return int(stat.rsplit(")", 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _snapshot_live(data: dict) -> bool:
+    """Whether the process that wrote a snapshot is still running (not just its PID)."""
+    pid, boot = data.get("pid"), data.get("boot")
+    if not isinstance(boot, dict) or not _pid_alive(pid):
+        return False
+    if pid == os.getpid():
+        return boot.get("id") == _boot_token()["id"]
+    started = _process_started(pid)
+    return started is None or started == boot.get("started")
+
+
+def _pid_alive(pid: Any) -> bool:
+    if not isinstance(pid, int):
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+async def run_snapshot_exporter(interval: float = 5.0) -> None:
+    """
+    Write this worker's snapshot to METRICS_MULTIPROC_DIR every interval
+    seconds so any worker can serve a complete /metrics. Snapshots of dead
+    workers are archived first; on cancellation this worker's own snapshot
+    is archived and removed.
+    """
+    try:
+        _registry.prune_snapshots()
+    except OSError as e:
+        logger.warning(f"Failed to prune metrics snapshots: {e}")
+    try:
+        while True:
+            _write_snapshot_quietly()
+            await asyncio.sleep(interval)
+    finally:
+        try:
+            _registry.retire_snapshot()
+        except OSError as e:
+            logger.warning(f"Failed to archive metrics snapshot: {e}")
+
+
+def _write_snapshot_quietly() -> None:
+    try:
+        _registry.write_snapshot()
+    except OSError as e:
+        logger.warning(f"Failed to write metrics snapshot: {e}")
+
 
 # Global registry instance
 _registry = MetricsRegistry()
@@ -226,6 +557,17 @@ def get_registry() -> MetricsRegistry:
     return _registry
 
 
+def route_label(scope: dict) -> str:
+    """
+    Path label for a request: the template of the route that matched
+    (set in scope by the router), or a fixed label for unmatched requests.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
 def track_request_start():
     """Track start of HTTP request."""
     _registry.http_requests_in_flight.inc()
@@ -233,66 +575,104 @@ def track_request_start():
 
 
 def track_request_end(start_time: float, method: str, path: str, status_code: int):
-    """Track end of HTTP request."""
+    """Track end of HTTP request. path should be a route template (see route_label)."""
     duration = time.time() - start_time
-
-    # Normalize path to avoid cardinality explosion
-    # Remove IDs and keep only the route pattern
-    normalized_path = _normalize_path(path)
-
-    with _registry._metrics_lock:
-        _registry.http_requests_in_flight.dec()
-        _registry.http_requests_total[(method, str(status_code), normalized_path)].inc()
-        _registry.http_request_duration[(method, normalized_path)].observe(duration)
+    _registry.http_requests_in_flight.dec()
+    _registry.http_requests_total.inc(labels=(method, str(status_code), path))
+    _registry.http_request_duration.observe(duration, (method, path))
 
 
 def track_ai_request(ai_type: str, success: bool = True):
     """Track AI/ML API request."""
     status = "success" if success else "error"
-    with _registry._metrics_lock:
-        _registry.ai_requests_total[(ai_type, status)].inc()
+    _registry.ai_requests_total.inc(labels=(ai_type, status))
+
+
+def track_cache_hit(namespace: str = "default", tier: str = "l2"):
+    """Track cache hit by namespace and tier ("l1" in-process, "l2" Redis)."""
+    _registry.cache_hits.inc(labels=(namespace, tier))
+
+
+def track_cache_miss(namespace: str = "default"):
+    """Track cache miss by namespace."""
+    _registry.cache_misses.inc(labels=(namespace,))
+
+
+def track_cache_eviction(namespace: str = "default", count: int = 1):
+    """Track L1 entries evicted for capacity."""
+    _registry.cache_evictions.inc(count, labels=(namespace,))
+
+
+def track_cache_coalesced(namespace: str = "default"):
+    """Track a cache miss served by another caller's in-flight load."""
+    _registry.cache_coalesced.inc(labels=(namespace,))
+
+
+def track_activity_events(outcome: str, count: int = 1):
+    """Track activity log events ("written", "dropped" or "failed")."""
+    _registry.activity_events.inc(count, labels=(outcome,))
+
+
+def track_sms_queue_depth(depth: int):
+    """Track outbound SMS waiting to be sent."""
+    _registry.sms_queue_depth.set(depth)
+
+
+def track_sms_messages(outcome: str, count: int = 1):
+    """Track outbound SMS ("sent", "retried", "failed" or "dropped")."""
+    _registry.sms_messages.inc(count, labels=(outcome,))
 
 
-def track_cache_hit():
-    """Track cache hit."""
-    with _registry._metrics_lock:
-        _registry.cache_hits.inc()
+def track_sms_latency(seconds: float):
+    """Track the time from enqueueing an SMS to its final outcome."""
+    _registry.sms_latency.observe(seconds)
 
 
-def track_cache_miss():
-    """Track cache miss."""
-    with _registry._metrics_lock:
-        _registry.cache_misses.inc()
+def track_pubsub_message(direction: str):
+    """Track a cross-worker real-time message ("published" or "received")."""
+    _registry.pubsub_messages.inc(labels=(direction,))
+
+
+def track_ws_eviction():
+    """Track a WebSocket consumer evicted because its send queue was full."""
+    _registry.ws_evictions.inc()
+
+
+def track_job_run(job: str, status: str, duration: Optional[float] = None):
+    """Track a scheduled job fire ("succeeded", "failed", "skipped" or "missed") and its run time."""
+    _registry.job_runs.inc(labels=(job, status))
+    if duration is not None:
+        _registry.job_duration.observe(duration, labels=(job,))
+
+
+def track_ai_queue(depth: int, oldest_seconds: float):
+    """Track AI analysis jobs waiting to run and how long the oldest has waited."""
+    _registry.ai_queue_depth.set(depth)
+    _registry.ai_queue_oldest.set(oldest_seconds)
+
+
+def track_ai_job(outcome: str):
+    """Track an AI analysis job ("done", "retried", "deferred", "reclaimed" or "dead")."""
+    _registry.ai_jobs.inc(labels=(outcome,))
+
+
+def track_http_client_request(upstream: str, outcome: str, duration: float):
+    """Track an outbound integration request ("2xx".."5xx" or "error") and its time to response headers."""
+    _registry.http_client_requests.inc(labels=(upstream, outcome))
+    _registry.http_client_duration.observe(duration, labels=(upstream,))
+
+
+def track_http_client_retry(upstream: str):
+    """Track an outbound integration request being retried."""
+    _registry.http_client_retries.inc(labels=(upstream,))
 
 
 def track_error(error_type: str):
     """Track error by type."""
-    with _registry._metrics_lock:
-        _registry.errors_total[(error_type,)].inc()
+    _registry.errors_total.inc(labels=(error_type,))
 
 
 def track_db_pool(total: int, available: int):
     """Update database pool metrics."""
-    with _registry._metrics_lock:
-        _registry.db_pool_size.set(total)
-        _registry.db_pool_available.set(available)
-
-
-def _normalize_path(path: str) -> str:
-    """
-    Normalize path to prevent high cardinality.
-
-    Replaces numeric IDs with :id placeholder.
-    Examples:
-        /api/v2/customers/123 -> /api/v2/customers/:id
-        /api/v2/work-orders/456/photos -> /api/v2/work-orders/:id/photos
-    """
-    parts = path.split("/")
-    normalized = []
-    for part in parts:
-        # Check if part looks like an ID (numeric or UUID-like)
-        if part.isdigit() or (len(part) >= 8 and "-" in part):
-            normalized.append(":id")
-        else:
-            normalized.append(part)
-    return "/".join(normalized)
+    _registry.db_pool_size.set(total)
+    _registry.db_pool_available.set(available)
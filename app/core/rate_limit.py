@@ -2,237 +2,458 @@
 Public API Rate Limiting Module
 
 Provides sliding window rate limiting for public API endpoints.
-Supports in-memory storage with optional Redis backend for distributed deployments.
+
+The limiter is asyncio-native:
+- Redis holds a sliding-window log per key (sorted set of hit timestamps);
+  one Lua script trims, counts and records hits atomically in a single
+  round trip.
+- A per-key lease lets each worker admit a small share of a client's
+  remaining quota without asking Redis while the client is well under its
+  limit. Hits admitted this way are recorded in Redis in a batch on the
+  key's next round trip, or by a background flush once the lease expires
+  (and on close()), so they still count on other workers.
+- A circuit breaker stops calling Redis after repeated failures; while it
+  is open (or with no Redis configured) each worker enforces the limits
+  with local token buckets.
 """
 
-import time
+import asyncio
 import hashlib
 import logging
-from collections import defaultdict
-from typing import Dict, Optional, Tuple, Protocol
-from dataclasses import dataclass, field
+import math
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
 from fastapi import HTTPException, status, Request
-from datetime import datetime
-from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimiterBackend(ABC):
-    """Abstract base class for rate limiter backends."""
+# KEYS[1]: window key
+# ARGV: now, window_seconds, limit, pending hits to record, member id
+# Returns: {allowed (0/1), count in window, unix time a slot frees up}
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local pending = tonumber(ARGV[4])
+local member = ARGV[5]
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+
+for i = 1, pending do
+    redis.call('ZADD', key, now, member .. ':' .. i)
+end
+count = count + pending
+
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, member)
+    count = count + 1
+    allowed = 1
+end
+redis.call('EXPIRE', key, math.ceil(window))
+
+local reset = now + window
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window
+end
+return {allowed, count, math.ceil(reset)}
+"""
 
-    @abstractmethod
-    def check_and_increment(
-        self,
-        key: str,
-        limit: int,
-        window_seconds: int,
-    ) -> Tuple[bool, int, int]:
-        """
-        Check rate limit and increment counter atomically.
 
-        Returns:
-            Tuple of (allowed, remaining, reset_time)
-        """
-        pass
+class CircuitState(IntEnum):
+    """Circuit breaker states."""
 
+    CLOSED = 0  # Normal operation
+    OPEN = 1  # Failing, use local buckets
+    HALF_OPEN = 2  # Testing recovery
 
-class RedisRateLimiterBackend(RateLimiterBackend):
-    """
-    Redis-backed rate limiter using sorted sets for sliding window.
 
-    Provides distributed rate limiting for horizontal scaling.
-    Uses Redis sorted sets with timestamps as scores for sliding window.
-    """
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit check."""
 
-    def __init__(self, redis_client, fail_closed: bool = False):
-        """
-        Initialize Redis rate limiter.
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_at: int  # Unix time at which the window frees a slot
 
-        Args:
-            redis_client: Async Redis client instance
-            fail_closed: If True, raise exception when Redis unavailable
-        """
-        self.redis = redis_client
-        self.fail_closed = fail_closed
+    @property
+    def retry_after(self) -> int:
+        return max(1, self.reset_at - int(time.time()))
 
-    def check_and_increment(
-        self,
-        key: str,
-        limit: int,
-        window_seconds: int,
-    ) -> Tuple[bool, int, int]:
-        """
-        Check rate limit using Redis sliding window.
 
-        Uses MULTI/EXEC for atomic operations:
-        1. Remove old entries outside window
-        2. Add current request with timestamp
-        3. Count entries in window
-        4. Set TTL on key
+@dataclass
+class TokenBucket:
+    """Token bucket refilled continuously at limit/window tokens per second."""
 
-        Returns:
-            Tuple of (allowed, remaining, reset_time)
-        """
-        import redis as sync_redis
+    capacity: float
+    refill_per_second: float
+    tokens: float
+    updated_at: float
 
-        now = time.time()
-        window_start = now - window_seconds
+    @classmethod
+    def for_limit(cls, limit: int, window_seconds: int) -> "TokenBucket":
+        return cls(limit, limit / window_seconds, float(limit), time.monotonic())
 
-        # Use pipeline for atomic operations
-        pipe = self.redis.pipeline()
-        pipe.zremrangebyscore(key, 0, window_start)  # Remove old entries
-        pipe.zadd(key, {f"{now}:{id(now)}": now})  # Add current request
-        pipe.zcard(key)  # Count requests in window
-        pipe.expire(key, window_seconds)  # Set TTL for cleanup
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
 
-        try:
-            results = pipe.execute()
-            count = results[2]  # zcard result
+    def result(self, limit: int, allowed: bool) -> RateLimitResult:
+        missing = 0 if self.tokens >= 1 else 1 - self.tokens
+        reset_at = math.ceil(time.time() + missing / self.refill_per_second)
+        return RateLimitResult(allowed, limit, int(self.tokens), reset_at)
 
-            allowed = count <= limit
-            remaining = max(0, limit - count)
-            reset_time = int(now + window_seconds)
 
-            return allowed, remaining, reset_time
-        except Exception as e:
-            logger.error(f"Redis rate limit error: {e}")
-            if self.fail_closed:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail={
-                        "error": "rate_limit_unavailable",
-                        "message": "Rate limiting service temporarily unavailable",
-                    },
-                )
-            # Fail open - allow request if Redis is unavailable
-            return True, limit, int(now + window_seconds)
+@dataclass
+class _Lease:
+    """Share of a key's remaining quota this worker may admit on its own."""
+
+    tokens: int
+    expires_at: float
+    remaining: int
+    reset_at: int
+    window_seconds: int
+    pending: int = 0  # Hits admitted locally, not yet recorded in Redis
 
-    async def check_and_increment_async(
+
+class AsyncRateLimiter:
+    """
+    Sliding-window rate limiter backed by Redis with local pre-check and fallback.
+
+    Args:
+        redis_client: redis.asyncio client, or None for local buckets only
+        fail_closed: Reject requests (503) instead of using local buckets
+            when Redis is unavailable
+        lease_share: Fraction of the remaining quota a worker may admit
+            without a Redis round trip
+        lease_min_remaining: Only lease while at least this fraction of the
+            limit remains ("well under the limit")
+        lease_seconds: How long a lease is valid
+        max_keys: Bound on keys tracked locally (least recently used dropped)
+        failure_threshold: Redis failures before the circuit opens
+        recovery_timeout: Seconds before retrying Redis after the circuit opens
+    """
+
+    def __init__(
         self,
-        key: str,
-        limit: int,
-        window_seconds: int,
-    ) -> Tuple[bool, int, int]:
+        redis_client=None,
+        fail_closed: bool = False,
+        lease_share: float = 0.1,
+        lease_min_remaining: float = 0.5,
+        lease_seconds: float = 1.0,
+        max_keys: int = 10000,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 30,
+    ):
+        self.redis = redis_client
+        self.fail_closed = fail_closed
+        self.lease_share = lease_share
+        self.lease_min_remaining = lease_min_remaining
+        self.lease_seconds = lease_seconds
+        self.max_keys = max_keys
+
+        self._script = redis_client.register_script(SLIDING_WINDOW_LUA) if redis_client is not None else None
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._last: OrderedDict[str, RateLimitResult] = OrderedDict()
+
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._circuit_state = CircuitState.CLOSED
+        self._failure_count = 0
+        self._last_failure_time = 0.0
+
+        # Leases dropped with hits still to record, flushed by the flush task
+        self._retired: list[tuple[str, _Lease]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self._local_hits = 0
+        self._redis_calls = 0
+        self._fallback_hits = 0
+
+        if self._script is not None:
+            _limiters.add(self)
+
+    def _remember(self, store: OrderedDict, key: str, value) -> list:
+        """Store value as the most recent entry; returns the (key, value) pairs evicted."""
+        store[key] = value
+        store.move_to_end(key)
+        evicted = []
+        while len(store) > self.max_keys:
+            evicted.append(store.popitem(last=False))
+        return evicted
+
+    def _check_circuit(self) -> bool:
+        """Check if circuit allows Redis calls."""
+        if self._circuit_state == CircuitState.OPEN:
+            if time.time() - self._last_failure_time >= self._recovery_timeout:
+                self._circuit_state = CircuitState.HALF_OPEN
+                logger.info("Rate limit circuit breaker entering half-open state")
+                return True
+            return False
+        return True
+
+    def _record_success(self) -> None:
+        if self._circuit_state == CircuitState.HALF_OPEN:
+            logger.info("Rate limit circuit breaker closed (recovered)")
+        self._circuit_state = CircuitState.CLOSED
+        self._failure_count = 0
+
+    def _record_failure(self) -> None:
+        self._failure_count += 1
+        self._last_failure_time = time.time()
+        if self._circuit_state == CircuitState.HALF_OPEN or self._failure_count >= self._failure_threshold:
+            if self._circuit_state != CircuitState.OPEN:
+                logger.warning(f"Rate limit circuit breaker opened after {self._failure_count} failures")
+            self._circuit_state = CircuitState.OPEN
+
+    def _check_local(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.capacity != limit:
+            bucket = TokenBucket.for_limit(limit, window_seconds)
+        self._remember(self._buckets, key, bucket)
+        return bucket.result(limit, bucket.take())
+
+    def _take_lease(self, key: str, limit: int) -> Optional[RateLimitResult]:
+        lease = self._leases.get(key)
+        if lease is None or lease.tokens <= 0 or lease.expires_at <= time.monotonic():
+            return None
+        lease.tokens -= 1
+        lease.pending += 1
+        self._local_hits += 1
+        return RateLimitResult(True, limit, max(0, lease.remaining - lease.pending), lease.reset_at)
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
         """
-        Async version of check_and_increment for async Redis clients.
+        Record one request against key and report whether it is allowed.
 
-        Uses MULTI/EXEC for atomic operations.
+        Raises:
+            HTTPException 503 if Redis is unavailable and fail_closed is set
         """
-        now = time.time()
-        window_start = now - window_seconds
+        if self._script is None:
+            result = self._check_local(key, limit, window_seconds)
+        else:
+            result = self._take_lease(key, limit)
+            if result is None:
+                result = await self._hit_redis(key, limit, window_seconds)
+        self._remember(self._last, key, result)
+        return result
+
+    async def _hit_redis(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        if self._check_circuit():
+            lease = self._leases.pop(key, None)
+            pending = lease.pending if lease else 0
+            try:
+                self._redis_calls += 1
+                allowed, count, reset_at = await self._script(
+                    keys=[key],
+                    args=[f"{time.time():.6f}", window_seconds, limit, pending, uuid.uuid4().hex],
+                )
+                self._record_success()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis rate limit error: {e}")
+                self._record_failure()
+                if lease is not None and lease.pending:
+                    self._requeue(key, lease)
+                    self._start_flush_task()
+            else:
+                remaining = max(0, limit - int(count))
+                if allowed and remaining >= limit * self.lease_min_remaining:
+                    evicted = self._remember(
+                        self._leases,
+                        key,
+                        _Lease(
+                            tokens=int(remaining * self.lease_share),
+                            expires_at=time.monotonic() + self.lease_seconds,
+                            remaining=remaining,
+                            reset_at=int(reset_at),
+                            window_seconds=window_seconds,
+                        ),
+                    )
+                    self._retired.extend((k, old) for k, old in evicted if old.pending)
+                    self._start_flush_task()
+                return RateLimitResult(bool(allowed), limit, remaining, int(reset_at))
+
+        if self.fail_closed:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "error": "rate_limit_unavailable",
+                    "message": "Rate limiting service temporarily unavailable",
+                },
+            )
+        self._fallback_hits += 1
+        return self._check_local(key, limit, window_seconds)
+
+    def _start_flush_task(self) -> None:
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Record expired leases' pending hits; runs while this worker holds leases."""
+        while self._leases or self._retired:
+            await asyncio.sleep(self.lease_seconds)
+            await self.flush()
 
+    async def flush(self, expired_only: bool = True) -> None:
+        """
+        Record hits admitted under leases in Redis (those of expired leases
+        only, unless expired_only is False) and drop those leases.
+        """
+        now = time.monotonic()
+        due, self._retired = self._retired, []
+        for key, lease in list(self._leases.items()):
+            if not expired_only or lease.expires_at <= now:
+                del self._leases[key]
+                if lease.pending:
+                    due.append((key, lease))
+        for key, lease in due:
+            await self._record_pending(key, lease)
+
+    async def _record_pending(self, key: str, lease: _Lease) -> None:
+        # limit 0: the script records the pending hits without admitting a new one
+        if not self._check_circuit():
+            self._requeue(key, lease)
+            return
         try:
-            # Use pipeline for atomic operations
-            pipe = self.redis.pipeline()
-            pipe.zremrangebyscore(key, 0, window_start)
-            pipe.zadd(key, {f"{now}:{id(now)}": now})
-            pipe.zcard(key)
-            pipe.expire(key, window_seconds)
+            self._redis_calls += 1
+            await self._script(
+                keys=[key],
+                args=[f"{time.time():.6f}", lease.window_seconds, 0, lease.pending, uuid.uuid4().hex],
+            )
+            self._record_success()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to record {lease.pending} leased rate limit hits for {key}, will retry: {e}")
+            self._record_failure()
+            self._requeue(key, lease)
+
+    def _requeue(self, key: str, lease: _Lease) -> None:
+        """Keep hits Redis did not take for the next flush, while they still fall inside the window."""
+        if time.monotonic() - lease.expires_at < lease.window_seconds:
+            self._retired.append((key, lease))
+        else:
+            logger.debug(f"Dropping {lease.pending} leased hits for {key}: outside the window")
+
+    async def close(self) -> None:
+        """Stop the flush task and record every lease's pending hits."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush(expired_only=False)
+        if self._retired:
+            hits = sum(lease.pending for _, lease in self._retired)
+            logger.warning(f"Redis unavailable at shutdown, {hits} leased rate limit hits were not recorded")
+
+    def last_result(self, key: str) -> Optional[RateLimitResult]:
+        """Most recent result for key in this worker, if any."""
+        return self._last.get(key)
+
+    def reset(self, prefix: str = "") -> None:
+        """Forget local state (leases, buckets, results) for keys starting with prefix."""
+        for store in (self._leases, self._buckets, self._last):
+            for key in [k for k in store if k.startswith(prefix)]:
+                del store[key]
+
+    async def delete(self, *keys: str) -> None:
+        """Remove keys' windows from Redis and local state."""
+        for key in keys:
+            self.reset(key)
+        if self.redis is not None and keys and self._check_circuit():
+            try:
+                await self.redis.delete(*keys)
+                self._record_success()
+            except Exception as e:
+                logger.warning(f"Failed to delete rate limit keys: {e}")
+                self._record_failure()
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics."""
+        return {
+            "backend": "redis" if self._script is not None else "local",
+            "circuit_state": self._circuit_state.name,
+            "failure_count": self._failure_count,
+            "local_hits": self._local_hits,
+            "redis_calls": self._redis_calls,
+            "fallback_hits": self._fallback_hits,
+            "tracked_keys": len(self._last),
+        }
 
-            results = await pipe.execute()
-            count = results[2]
 
-            allowed = count <= limit
-            remaining = max(0, limit - count)
-            reset_time = int(now + window_seconds)
+# Redis-backed limiters in this process, closed on shutdown
+_limiters: "weakref.WeakSet[AsyncRateLimiter]" = weakref.WeakSet()
 
-            return allowed, remaining, reset_time
-        except Exception as e:
-            logger.error(f"Redis rate limit error: {e}")
-            if self.fail_closed:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail={
-                        "error": "rate_limit_unavailable",
-                        "message": "Rate limiting service temporarily unavailable",
-                    },
-                )
-            return True, limit, int(now + window_seconds)
 
+async def close_rate_limiters() -> None:
+    """Record the pending leased hits of every Redis-backed limiter (app shutdown)."""
+    for limiter in list(_limiters):
+        await limiter.close()
 
-@dataclass
-class SlidingWindow:
-    """Sliding window counter for rate limiting."""
 
-    current_count: int = 0
-    previous_count: int = 0
-    current_window_start: float = field(default_factory=time.time)
-    window_size_seconds: int = 60
+def _rate_limit_exceeded(result: RateLimitResult, period: str) -> HTTPException:
+    retry_after = result.retry_after
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "error": "rate_limit_exceeded",
+            "message": f"Rate limit exceeded: {result.limit} requests per {period}",
+            "retry_after": retry_after,
+        },
+        headers={
+            "Retry-After": str(retry_after),
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(result.reset_at),
+        },
+    )
 
 
 class PublicAPIRateLimiter:
     """
     Sliding window rate limiter for public API.
 
-    Uses a sliding window algorithm that provides smoother rate limiting
-    compared to fixed window counters.
-
-    For production deployments, consider implementing Redis backend
-    for distributed rate limiting across multiple instances.
+    Applies a per-minute and a per-hour window to each client. Distributed
+    across workers when a Redis client is configured (see AsyncRateLimiter).
     """
 
     def __init__(
         self,
         default_requests_per_minute: int = 100,
         default_requests_per_hour: int = 1000,
-        redis_client=None,  # Optional Redis client for distributed limiting
+        redis_client=None,  # Optional redis.asyncio client for distributed limiting
         fail_closed: bool = False,  # If True, reject requests when rate limiting unavailable
     ):
         self.default_requests_per_minute = default_requests_per_minute
         self.default_requests_per_hour = default_requests_per_hour
         self.redis_client = redis_client
         self.fail_closed = fail_closed
+        self.limiter = AsyncRateLimiter(redis_client, fail_closed=fail_closed)
 
-        # In-memory storage: client_id -> (minute_window, hour_window)
-        self._minute_windows: Dict[str, SlidingWindow] = defaultdict(lambda: SlidingWindow(window_size_seconds=60))
-        self._hour_windows: Dict[str, SlidingWindow] = defaultdict(lambda: SlidingWindow(window_size_seconds=3600))
-
-    def _get_sliding_window_count(self, window: SlidingWindow) -> float:
-        """
-        Calculate the sliding window count.
-
-        Uses weighted average between current and previous window
-        to provide smooth rate limiting.
-        """
-        now = time.time()
-        window_size = window.window_size_seconds
-
-        # Check if we need to rotate windows
-        elapsed = now - window.current_window_start
-        if elapsed >= window_size:
-            # Move to new window
-            windows_passed = int(elapsed / window_size)
-            if windows_passed == 1:
-                window.previous_count = window.current_count
-            else:
-                window.previous_count = 0
-            window.current_count = 0
-            window.current_window_start = now - (elapsed % window_size)
-            elapsed = elapsed % window_size
-
-        # Calculate weighted count using sliding window
-        weight = elapsed / window_size
-        return window.previous_count * (1 - weight) + window.current_count
-
-    def _increment_window(self, window: SlidingWindow) -> None:
-        """Increment the current window counter."""
-        now = time.time()
-        elapsed = now - window.current_window_start
-
-        # Rotate window if needed
-        if elapsed >= window.window_size_seconds:
-            windows_passed = int(elapsed / window.window_size_seconds)
-            if windows_passed == 1:
-                window.previous_count = window.current_count
-            else:
-                window.previous_count = 0
-            window.current_count = 0
-            window.current_window_start = now - (elapsed % window.window_size_seconds)
-
-        window.current_count += 1
-
-    def check_rate_limit(
+    async def check_rate_limit(
         self,
         client_id: str,
         rate_limit_per_minute: Optional[int] = None,
@@ -255,133 +476,17 @@ class PublicAPIRateLimiter:
         minute_limit = rate_limit_per_minute or self.default_requests_per_minute
         hour_limit = rate_limit_per_hour or self.default_requests_per_hour
 
-        # Use Redis backend if available
-        if self.redis_client is not None:
-            return self._check_rate_limit_redis(client_id, minute_limit, hour_limit)
-
-        # Fall back to in-memory rate limiting
-        return self._check_rate_limit_memory(client_id, minute_limit, hour_limit)
-
-    def _check_rate_limit_redis(
-        self,
-        client_id: str,
-        minute_limit: int,
-        hour_limit: int,
-    ) -> Tuple[int, int]:
-        """Check rate limit using Redis backend."""
-        redis_backend = RedisRateLimiterBackend(self.redis_client, fail_closed=self.fail_closed)
-
-        # Check minute limit
-        minute_key = f"ratelimit:{client_id}:minute"
-        minute_allowed, minute_remaining, minute_reset = redis_backend.check_and_increment(
-            minute_key, minute_limit, 60
-        )
-
-        if not minute_allowed:
-            retry_after = minute_reset - int(time.time())
+        minute = await self.limiter.hit(f"ratelimit:{client_id}:minute", minute_limit, 60)
+        if not minute.allowed:
             logger.warning(f"Rate limit exceeded for client {client_id}: minute limit {minute_limit}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "error": "rate_limit_exceeded",
-                    "message": f"Rate limit exceeded: {minute_limit} requests per minute",
-                    "retry_after": max(1, retry_after),
-                },
-                headers={
-                    "Retry-After": str(max(1, retry_after)),
-                    "X-RateLimit-Limit": str(minute_limit),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(minute_reset),
-                },
-            )
-
-        # Check hour limit
-        hour_key = f"ratelimit:{client_id}:hour"
-        hour_allowed, hour_remaining, hour_reset = redis_backend.check_and_increment(
-            hour_key, hour_limit, 3600
-        )
+            raise _rate_limit_exceeded(minute, "minute")
 
-        if not hour_allowed:
-            retry_after = hour_reset - int(time.time())
+        hour = await self.limiter.hit(f"ratelimit:{client_id}:hour", hour_limit, 3600)
+        if not hour.allowed:
             logger.warning(f"Rate limit exceeded for client {client_id}: hour limit {hour_limit}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "error": "rate_limit_exceeded",
-                    "message": f"Rate limit exceeded: {hour_limit} requests per hour",
-                    "retry_after": max(1, retry_after),
-                },
-                headers={
-                    "Retry-After": str(max(1, retry_after)),
-                    "X-RateLimit-Limit": str(hour_limit),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(hour_reset),
-                },
-            )
-
-        return minute_remaining, hour_remaining
-
-    def _check_rate_limit_memory(
-        self,
-        client_id: str,
-        minute_limit: int,
-        hour_limit: int,
-    ) -> Tuple[int, int]:
-        """Check rate limit using in-memory backend."""
-        minute_window = self._minute_windows[client_id]
-        hour_window = self._hour_windows[client_id]
-
-        # Get current counts using sliding window
-        minute_count = self._get_sliding_window_count(minute_window)
-        hour_count = self._get_sliding_window_count(hour_window)
-
-        # Check minute limit
-        if minute_count >= minute_limit:
-            retry_after = 60 - (time.time() - minute_window.current_window_start)
-            logger.warning(f"Rate limit exceeded for client {client_id}: {minute_count:.0f}/{minute_limit} per minute")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "error": "rate_limit_exceeded",
-                    "message": f"Rate limit exceeded: {minute_limit} requests per minute",
-                    "retry_after": int(retry_after),
-                },
-                headers={
-                    "Retry-After": str(int(retry_after)),
-                    "X-RateLimit-Limit": str(minute_limit),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(time.time() + retry_after)),
-                },
-            )
+            raise _rate_limit_exceeded(hour, "hour")
 
-        # Check hour limit
-        if hour_count >= hour_limit:
-            retry_after = 3600 - (time.time() - hour_window.current_window_start)
-            logger.warning(f"Rate limit exceeded for client {client_id}: {hour_count:.0f}/{hour_limit} per hour")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "error": "rate_limit_exceeded",
-                    "message": f"Rate limit exceeded: {hour_limit} requests per hour",
-                    "retry_after": int(retry_after),
-                },
-                headers={
-                    "Retry-After": str(int(retry_after)),
-                    "X-RateLimit-Limit": str(hour_limit),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(time.time() + retry_after)),
-                },
-            )
-
-        # Increment counters
-        self._increment_window(minute_window)
-        self._increment_window(hour_window)
-
-        # Calculate remaining
-        remaining_minute = max(0, int(minute_limit - minute_count - 1))
-        remaining_hour = max(0, int(hour_limit - hour_count - 1))
-
-        return remaining_minute, remaining_hour
+        return minute.remaining, hour.remaining
 
     def get_rate_limit_headers(
         self,
@@ -399,28 +504,23 @@ class PublicAPIRateLimiter:
             Dict of rate limit headers
         """
         minute_limit = rate_limit_per_minute or self.default_requests_per_minute
-        minute_window = self._minute_windows.get(client_id)
+        last = self.limiter.last_result(f"ratelimit:{client_id}:minute")
 
-        if not minute_window:
+        if not last:
             return {
                 "X-RateLimit-Limit": str(minute_limit),
                 "X-RateLimit-Remaining": str(minute_limit),
             }
 
-        current_count = self._get_sliding_window_count(minute_window)
-        remaining = max(0, int(minute_limit - current_count))
-        reset_time = int(minute_window.current_window_start + 60)
-
         return {
             "X-RateLimit-Limit": str(minute_limit),
-            "X-RateLimit-Remaining": str(remaining),
-            "X-RateLimit-Reset": str(reset_time),
+            "X-RateLimit-Remaining": str(last.remaining),
+            "X-RateLimit-Reset": str(last.reset_at),
         }
 
     def reset_client(self, client_id: str) -> None:
-        """Reset rate limits for a client (admin function)."""
-        self._minute_windows.pop(client_id, None)
-        self._hour_windows.pop(client_id, None)
+        """Reset this worker's rate limit state for a client (admin function)."""
+        self.limiter.reset(f"ratelimit:{client_id}:")
         logger.info(f"Rate limits reset for client {client_id}")
 
 
@@ -429,8 +529,13 @@ _public_api_rate_limiter: Optional[PublicAPIRateLimiter] = None
 _redis_client = None
 
 
-def _get_redis_client():
-    """Get or create Redis client for rate limiting."""
+def get_rate_limit_redis():
+    """Get or create the shared redis.asyncio client for rate limiting.
+
+    Returns None when Redis rate limiting is disabled or unavailable. The
+    client connects lazily; connection failures are handled by the
+    limiter's circuit breaker.
+    """
     global _redis_client
     if _redis_client is not None:
         return _redis_client
@@ -441,7 +546,7 @@ def _get_redis_client():
         return None
 
     try:
-        import redis
+        import redis.asyncio as redis
 
         _redis_client = redis.from_url(
             settings.REDIS_URL,
@@ -449,15 +554,13 @@ def _get_redis_client():
             socket_connect_timeout=2,
             socket_timeout=2,
         )
-        # Test connection
-        _redis_client.ping()
         logger.info("Redis rate limiting enabled")
         return _redis_client
     except ImportError:
         logger.warning("Redis package not installed, falling back to in-memory rate limiting")
         return None
     except Exception as e:
-        logger.warning(f"Failed to connect to Redis for rate limiting: {e}. Falling back to in-memory.")
+        logger.warning(f"Failed to create Redis client for rate limiting: {e}. Falling back to in-memory.")
         return None
 
 
@@ -469,7 +572,7 @@ def get_public_api_rate_limiter() -> PublicAPIRateLimiter:
     """
     global _public_api_rate_limiter
     if _public_api_rate_limiter is None:
-        redis_client = _get_redis_client()
+        redis_client = get_rate_limit_redis()
         _public_api_rate_limiter = PublicAPIRateLimiter(redis_client=redis_client)
     return _public_api_rate_limiter
 
@@ -478,13 +581,12 @@ def reset_rate_limits() -> dict:
     """Reset all in-memory rate limit state. Used by admin endpoint."""
     global _public_api_rate_limiter
     if _public_api_rate_limiter is not None:
-        _public_api_rate_limiter._minute_windows.clear()
-        _public_api_rate_limiter._hour_windows.clear()
+        _public_api_rate_limiter.limiter.reset()
         return {"status": "reset", "message": "All rate limit windows cleared"}
     return {"status": "no_limiter", "message": "No rate limiter instance to reset"}
 
 
-def rate_limit_by_ip(request: Request, requests_per_minute: int = 60) -> None:
+async def rate_limit_by_ip(request: Request, requests_per_minute: int = 60) -> None:
     """
     Rate limit by IP address for unauthenticated endpoints.
 
@@ -509,7 +611,7 @@ def rate_limit_by_ip(request: Request, requests_per_minute: int = 60) -> None:
     ip_hash = hashlib.sha256(client_ip.encode()).hexdigest()[:16]
 
     rate_limiter = get_public_api_rate_limiter()
-    rate_limiter.check_rate_limit(
+    await rate_limiter.check_rate_limit(
         client_id=f"ip:{ip_hash}",
         rate_limit_per_minute=requests_per_minute,
         rate_limit_per_hour=requests_per_minute * 10,
@@ -4,27 +4,26 @@ Queries `hr_employee_certifications` for certs expiring in exactly 30, 7, or
 1 days and sends an SMS to the owning technician (gated on phone + consent).
 Never raises; per-cert failures are logged.
 
-Scheduled from the FastAPI lifespan at 07:00 daily via APScheduler.  Runs
-safely in a standalone test harness too via the sync `run_once_for_today`
-coroutine.
+Scheduled at 07:00 daily by app.services.job_scheduler when the HR module
+is enabled.  Runs safely in a standalone test harness too via the sync
+`run_once_for_today` coroutine.
 """
 import logging
 from datetime import date, timedelta
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session_maker
+from app.hr.feature_flag import hr_module_enabled
 from app.hr.employees.models import HrEmployeeCertification
 from app.hr.shared.audit import write_audit
 from app.models.technician import Technician
+from app.services.job_scheduler import cron, scheduled_job
 
 
 logger = logging.getLogger(__name__)
 
-_scheduler: AsyncIOScheduler | None = None
-
 # Days out from today.  Matches spec §13.4 — 30 / 7 / 1.
 _WINDOWS = [30, 7, 1]
 
@@ -72,6 +71,7 @@ async def _notify_cert(
     return {"cert_id": str(cert.id), "status": status, "days": days}
 
 
+@scheduled_job("hr_cert_expiry", cron(hour=7, minute=0), enabled=hr_module_enabled, misfire="run_once")
 async def run_once_for_today(
     db: AsyncSession | None = None,
 ) -> list[dict]:
@@ -108,27 +108,3 @@ async def run_once_for_today(
         await _work(db)
 
     return results
-
-
-def start_cert_expiry_scheduler() -> None:
-    global _scheduler
-    if _scheduler is not None:
-        return
-    _scheduler = AsyncIOScheduler()
-    _scheduler.add_job(
-        run_once_for_today,
-        "cron",
-        hour=7,
-        minute=0,
-        id="hr_cert_expiry",
-        replace_existing=True,
-    )
-    _scheduler.start()
-    logger.info("HR cert-expiry scheduler started (daily at 07:00)")
-
-
-def stop_cert_expiry_scheduler() -> None:
-    global _scheduler
-    if _scheduler:
-        _scheduler.shutdown(wait=False)
-        _scheduler = None
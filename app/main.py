@@ -12,7 +12,6 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 import traceback
@@ -27,6 +26,7 @@ from app.middleware.metrics import MetricsMiddleware
 from app.middleware.cache_headers import CacheHeadersMiddleware
 from app.middleware.timing import ServerTimingMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.middleware.proxy_headers import ProxyHeadersMiddleware
 from app.api.public.router import public_router
 from app.webhooks.twilio import twilio_router
 from app.webhooks.ringcentral import ringcentral_webhook_router
@@ -37,36 +37,12 @@ from app.api.v2.outbound_agent import media_ws_router as outbound_agent_ws_route
 from app.api.v2.ai_interactions import router as ai_interactions_router
 from app.api.v2.ai_insights import router as ai_insights_router
 from app.config import settings
-from app.database import init_db
+from app.schema_setup import ensure_schema, ensure_live_chat_tables
 from app.api.v2.ringcentral import start_auto_sync, stop_auto_sync
-from app.tasks.reminder_scheduler import start_reminder_scheduler, stop_reminder_scheduler
-from app.tasks.calendar_sync import start_calendar_sync, stop_calendar_sync
-from app.tasks.email_poller import start_email_poller, stop_email_poller
-from app.tasks.campaign_scheduler import start_campaign_scheduler, stop_campaign_scheduler
-from app.tasks.bookings_sync import start_bookings_sync, stop_bookings_sync
-from app.tasks.forms_sync import start_forms_sync, stop_forms_sync
-# followup_scheduler and auto_dispatch don't have start/stop functions yet
-# from app.tasks.followup_scheduler import start_followup_scheduler, stop_followup_scheduler
-# from app.tasks.auto_dispatch import start_auto_dispatch, stop_auto_dispatch
-from app.tasks.marketing_report import start_marketing_report_scheduler, stop_marketing_report_scheduler
-from app.tasks.ai_strategy_scheduler import (
-    start_ai_strategy_scheduler,
-    stop_ai_strategy_scheduler,
-)
-from app.tasks.ai_rescore_scheduler import (
-    start_ai_rescore_scheduler,
-    stop_ai_rescore_scheduler,
-)
-from app.tasks.ai_budget_scheduler import (
-    start_ai_budget_scheduler,
-    stop_ai_budget_scheduler,
-)
-from app.tasks.ai_rc_poll_scheduler import (
-    start_ai_rc_poll_scheduler,
-    stop_ai_rc_poll_scheduler,
-)
+# followup_scheduler has no jobs registered yet (see app.services.job_scheduler.JOB_MODULES)
+from app.services.job_scheduler import get_job_scheduler
 
-# Import all models to register them with SQLAlchemy metadata before init_db()
+# Import all models to register them with SQLAlchemy metadata before ensure_schema()
 from app.models import (
     # Core models
     Customer,
@@ -180,1349 +156,192 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class ProxyHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to trust X-Forwarded-* headers from reverse proxies like Railway.
-
-    This fixes the issue where FastAPI's trailing slash redirect (307) generates
-    HTTP URLs instead of HTTPS when behind a reverse proxy.
-    """
-
-    async def dispatch(self, request: Request, call_next):
-        # Trust X-Forwarded-Proto header from Railway's edge proxy
-        forwarded_proto = request.headers.get("x-forwarded-proto")
-        if forwarded_proto:
-            # Update the scope to reflect the actual client protocol
-            request.scope["scheme"] = forwarded_proto
-        return await call_next(request)
-
-
-async def ensure_work_order_photos_table():
-    """Ensure work_order_photos table exists.
-
-    Creates the table if it doesn't exist. This is a runtime fix for
-    the migration that may have failed silently.
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    async with async_session_maker() as session:
-        try:
-            # Check if table exists
-            result = await session.execute(
-                text(
-                    """SELECT EXISTS (
-                    SELECT 1 FROM information_schema.tables
-                    WHERE table_name = 'work_order_photos'
-                )"""
-                )
-            )
-            table_exists = result.scalar()
-
-            if not table_exists:
-                logger.info("Creating missing work_order_photos table...")
-                await session.execute(
-                    text("""
-                    CREATE TABLE work_order_photos (
-                        id VARCHAR(36) PRIMARY KEY,
-                        work_order_id VARCHAR(36) NOT NULL REFERENCES work_orders(id) ON DELETE CASCADE,
-                        photo_type VARCHAR(50) NOT NULL,
-                        data TEXT NOT NULL,
-                        thumbnail TEXT,
-                        timestamp TIMESTAMPTZ NOT NULL,
-                        device_info VARCHAR(255),
-                        gps_lat FLOAT,
-                        gps_lng FLOAT,
-                        gps_accuracy FLOAT,
-                        created_at TIMESTAMPTZ DEFAULT NOW(),
-                        updated_at TIMESTAMPTZ
-                    )
-                """)
-                )
-                await session.execute(
-                    text(
-                        "CREATE INDEX IF NOT EXISTS ix_work_order_photos_work_order_id ON work_order_photos(work_order_id)"
-                    )
-                )
-                await session.commit()
-                logger.info("Created work_order_photos table successfully")
-            else:
-                logger.debug("work_order_photos table already exists")
-
-        except Exception as e:
-            logger.warning(f"Could not ensure work_order_photos table: {type(e).__name__}: {e}")
-
-
-async def ensure_pay_rate_columns():
-    """Ensure technician_pay_rates table has required columns.
-
-    This is a runtime fix for missing database columns that should have been
-    added by migration 025. Runs on startup to ensure columns exist.
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    async with async_session_maker() as session:
-        try:
-            # Check if pay_type column exists
-            result = await session.execute(
-                text(
-                    """SELECT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'technician_pay_rates' AND column_name = 'pay_type'
-                )"""
-                )
-            )
-            pay_type_exists = result.scalar()
-
-            if not pay_type_exists:
-                logger.info("Adding missing pay_type column to technician_pay_rates...")
-                await session.execute(
-                    text("ALTER TABLE technician_pay_rates ADD COLUMN pay_type VARCHAR(20) DEFAULT 'hourly' NOT NULL")
-                )
-                await session.commit()
-                logger.info("Added pay_type column successfully")
-
-            # Check if salary_amount column exists
-            result = await session.execute(
-                text(
-                    """SELECT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'technician_pay_rates' AND column_name = 'salary_amount'
-                )"""
-                )
-            )
-            salary_exists = result.scalar()
-
-            if not salary_exists:
-                logger.info("Adding missing salary_amount column to technician_pay_rates...")
-                await session.execute(text("ALTER TABLE technician_pay_rates ADD COLUMN salary_amount FLOAT"))
-                await session.commit()
-                logger.info("Added salary_amount column successfully")
-
-            # Check if hourly_rate needs to be made nullable
-            result = await session.execute(
-                text(
-                    """SELECT is_nullable FROM information_schema.columns
-                   WHERE table_name = 'technician_pay_rates' AND column_name = 'hourly_rate'"""
-                )
-            )
-            row = result.fetchone()
-            if row and row[0] == "NO":
-                logger.info("Making hourly_rate column nullable...")
-                await session.execute(text("ALTER TABLE technician_pay_rates ALTER COLUMN hourly_rate DROP NOT NULL"))
-                await session.commit()
-                logger.info("Made hourly_rate nullable successfully")
-
-        except Exception as e:
-            logger.warning(f"Could not ensure pay_rate columns: {type(e).__name__}: {e}")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events."""
+    # Startup
+    logger.info("Starting React CRM API...")
+    logger.info(f"Environment: {settings.ENVIRONMENT}")
 
+    # Initialize Sentry for error tracking
+    init_sentry()
+    # SECURITY: Don't log full database URL, just prefix
+    if settings.DATABASE_URL:
+        logger.info(f"Database URL prefix: {settings.DATABASE_URL[:30]}...")
+    try:
+        # create_all + ensure_* safety nets, skipped when the stored schema fingerprint is current
+        await ensure_schema()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        # SECURITY: Don't log full exception details which may contain credentials
+        logger.error(f"Database initialization failed: {type(e).__name__}")
+        logger.warning("App starting without database - some features may not work")
 
-async def ensure_messages_columns():
-    """Ensure messages table has required columns.
+    # Start RingCentral auto-sync background task
+    try:
+        start_auto_sync()
+        logger.info("RingCentral auto-sync started")
+    except Exception as e:
+        logger.warning(f"Failed to start RingCentral auto-sync: {e}")
 
-    This is a runtime fix for missing database columns that should have been
-    added by migration 036. Runs on startup to ensure columns exist.
+    # Start IoT MQTT bridge (gated by IOT_MQTT_ENABLED env var)
+    try:
+        from app.services.iot.mqtt_bridge import start_bridge as start_iot_bridge
+        await start_iot_bridge()
+    except Exception as e:
+        logger.warning(f"Failed to start IoT MQTT bridge: {e}")
 
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
+    # Start Samsara feed poller background task
+    try:
+        from app.api.v2.samsara import start_feed_poller, stop_feed_poller
+        start_feed_poller()
+        logger.info("Samsara feed poller started")
+    except Exception as e:
+        logger.warning(f"Failed to start Samsara feed poller: {e}")
 
-    async with async_session_maker() as session:
-        try:
-            # Check if type column exists
-            result = await session.execute(
-                text(
-                    """SELECT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'messages' AND column_name = 'type'
-                )"""
-                )
-            )
-            type_exists = result.scalar()
+    # Background task watchdog — restarts crashed tasks every 5 minutes
+    import asyncio
 
-            # Make legacy message_type VARCHAR column nullable if it exists
-            # (the ENUM 'type' column from migration 036 is the canonical column)
+    async def _watchdog():
+        while True:
+            await asyncio.sleep(300)
+            # Check RingCentral sync
             try:
-                await session.execute(
-                    text("ALTER TABLE messages ALTER COLUMN message_type DROP NOT NULL")
-                )
-                await session.commit()
-            except Exception:
-                await session.rollback()
-
-            if not type_exists:
-                logger.info("Adding missing columns to messages table...")
-
-                # Create enum types if they don't exist
-                await session.execute(
-                    text("""
-                        DO $$ BEGIN
-                            CREATE TYPE messagetype AS ENUM ('sms', 'email', 'call', 'note');
-                        EXCEPTION
-                            WHEN duplicate_object THEN null;
-                        END $$;
-                    """)
-                )
-                await session.execute(
-                    text("""
-                        DO $$ BEGIN
-                            CREATE TYPE messagedirection AS ENUM ('inbound', 'outbound');
-                        EXCEPTION
-                            WHEN duplicate_object THEN null;
-                        END $$;
-                    """)
-                )
-                await session.execute(
-                    text("""
-                        DO $$ BEGIN
-                            CREATE TYPE messagestatus AS ENUM ('pending', 'queued', 'sent', 'delivered', 'failed', 'received');
-                        EXCEPTION
-                            WHEN duplicate_object THEN null;
-                        END $$;
-                    """)
-                )
-
-                # Add type column
-                await session.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS type messagetype"))
-                await session.execute(text("UPDATE messages SET type = 'sms' WHERE type IS NULL"))
-                await session.execute(text("ALTER TABLE messages ALTER COLUMN type SET NOT NULL"))
-
-                # Add direction column
-                await session.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS direction messagedirection"))
-                await session.execute(text("UPDATE messages SET direction = 'outbound' WHERE direction IS NULL"))
-                await session.execute(text("ALTER TABLE messages ALTER COLUMN direction SET NOT NULL"))
-
-                # Add status column
-                await session.execute(
-                    text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS status messagestatus DEFAULT 'sent'")
-                )
-
-                # Add other columns
-                await session.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS subject VARCHAR(255)"))
-                await session.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS from_address VARCHAR(255)"))
-                await session.execute(
-                    text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS source VARCHAR(20) DEFAULT 'react'")
-                )
-                await session.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS sent_at TIMESTAMPTZ"))
-                await session.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS delivered_at TIMESTAMPTZ"))
-                await session.execute(text("ALTER TABLE messages ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ"))
-
-                await session.commit()
-                logger.info("Added missing columns to messages table successfully")
-            else:
-                logger.debug("messages table already has required columns")
+                from app.api.v2.ringcentral import _sync_task
+                if _sync_task and _sync_task.done():
+                    logger.warning("Watchdog: RingCentral sync task died — restarting")
+                    start_auto_sync()
+            except Exception as e:
+                logger.debug(f"Watchdog RingCentral check failed: {e}")
+            # Check Samsara feed poller
+            try:
+                from app.api.v2.samsara import _feed_poller_task, start_feed_poller as restart_samsara
+                if _feed_poller_task and _feed_poller_task.done():
+                    logger.warning("Watchdog: Samsara feed poller died — restarting")
+                    restart_samsara()
+            except Exception as e:
+                logger.debug(f"Watchdog Samsara check failed: {e}")
+            # Check scheduled job loops
+            try:
+                restarted = get_job_scheduler().ensure_running()
+                if restarted:
+                    logger.warning(f"Watchdog: job loops died — restarted {', '.join(restarted)}")
+            except Exception as e:
+                logger.debug(f"Watchdog scheduler check failed: {e}")
 
-        except Exception as e:
-            logger.warning(f"Could not ensure messages columns: {type(e).__name__}: {e}")
+    _watchdog_task = asyncio.create_task(_watchdog())
 
+    # Batched user activity log writer (drained on shutdown)
+    from app.services.activity_tracker import activity_sink
+    activity_sink.start()
 
-async def ensure_email_templates_table():
-    """
-    Ensure email_templates table exists.
+    # Cross-worker pub/sub for WebSocket/SSE events (Redis when REDIS_URL is set)
+    from app.services.pubsub import get_pubsub
+    try:
+        await get_pubsub().start()
+    except Exception as e:
+        logger.warning(f"Real-time pub/sub unavailable, events stay on this worker: {e}")
 
-    This table was added by migration 037. Runs on startup to ensure table exists.
+    # Outbound SMS dispatcher (rate-limited sends, drained on shutdown)
+    from app.services.sms_dispatcher import get_sms_dispatcher
+    get_sms_dispatcher().start()
 
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
+    # Scheduled jobs (reminders, MS365 syncs, reports, AI schedulers, ...): declared
+    # with @scheduled_job in their modules; each fire runs on one replica
+    try:
+        get_job_scheduler().start()
+    except Exception as e:
+        logger.warning(f"Failed to start job scheduler: {e}")
 
-    async with async_session_maker() as session:
-        try:
-            # Check if table exists
-            result = await session.execute(
-                text(
-                    """SELECT EXISTS (
-                    SELECT FROM information_schema.tables
-                    WHERE table_name = 'email_templates'
-                )"""
-                )
-            )
-            exists = result.scalar()
+    # AI Interaction Analyzer job queue (persisted in ai_jobs; unfinished jobs resume after a restart)
+    from app.services.ai.queue import get_ai_queue
+    get_ai_queue().start()
 
-            if not exists:
-                logger.info("Creating email_templates table...")
-                await session.execute(
-                    text(
-                        """
-                    CREATE TABLE IF NOT EXISTS email_templates (
-                        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                        name VARCHAR(255) NOT NULL,
-                        subject VARCHAR(255) NOT NULL,
-                        body_html TEXT NOT NULL,
-                        body_text TEXT,
-                        variables JSONB,
-                        category VARCHAR(50),
-                        is_active BOOLEAN DEFAULT TRUE,
-                        created_by INTEGER,
-                        created_at TIMESTAMPTZ DEFAULT NOW(),
-                        updated_at TIMESTAMPTZ
-                    )
-                """
-                    )
-                )
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_email_templates_category ON email_templates(category)")
-                )
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_email_templates_is_active ON email_templates(is_active)")
-                )
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_email_templates_name ON email_templates(name)")
-                )
-                await session.commit()
-                logger.info("email_templates table created successfully")
-            else:
-                logger.info("email_templates table already exists")
+    # Per-worker metrics snapshots, merged by /metrics under multiple workers
+    _metrics_exporter_task = None
+    if settings.METRICS_MULTIPROC_DIR:
+        from app.core.metrics import run_snapshot_exporter
+        _metrics_exporter_task = asyncio.create_task(run_snapshot_exporter())
 
-        except Exception as e:
-            logger.warning(f"Could not ensure email_templates table: {type(e).__name__}: {e}")
+    # Pre-warm database connection pool for faster first request
+    logger.info("Pre-warming database connections...")
+    try:
+        from sqlalchemy import text
+        from app.database import async_session_maker
 
+        async with async_session_maker() as session:
+            await session.execute(text("SELECT 1"))
+        logger.info("Database connection pool warmed successfully")
+    except Exception as e:
+        logger.warning(f"Database warmup failed (non-fatal): {e}")
 
-async def ensure_work_order_number_column():
-    """
-    Ensure work_orders table has work_order_number column and backfill existing rows.
+    # Pre-warm Redis connection if available
+    logger.info("Pre-warming Redis connection...")
+    try:
+        from app.services.cache_service import cache_service
 
-    This column provides human-readable work order numbers in WO-NNNNNN format.
+        await cache_service.set("warmup:ping", "ok", ttl=60)
+        result = await cache_service.get("warmup:ping")
+        if result == "ok":
+            logger.info("Redis connection warmed successfully (set+get verified)")
+        else:
+            logger.info("Redis connection warmed (set succeeded, get returned %s)", result)
+    except Exception as e:
+        logger.debug(f"Redis warmup skipped: {e}")
 
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
+    yield
 
-    async with async_session_maker() as session:
+    # Shutdown
+    logger.info("Shutting down React CRM API...")
+    _watchdog_task.cancel()
+    try:
+        await activity_sink.stop()
+    except Exception as e:
+        logger.warning(f"Activity log flush failed: {e}")
+    stop_auto_sync()
+    try:
+        await get_job_scheduler().stop()
+    except Exception as e:
+        logger.warning(f"Job scheduler shutdown failed: {e}")
+    try:
+        await get_ai_queue().stop()
+    except Exception as e:
+        logger.warning(f"AI job queue shutdown failed: {e}")
+    try:
+        from app.services.iot.mqtt_bridge import stop_bridge as stop_iot_bridge
+        await stop_iot_bridge()
+    except Exception:
+        pass
+    try:
+        await get_sms_dispatcher().stop()
+    except Exception as e:
+        logger.warning(f"SMS dispatcher drain failed: {e}")
+    try:
+        await get_pubsub().stop()
+    except Exception:
+        pass
+    try:
+        from app.core.rate_limit import close_rate_limiters
+        await close_rate_limiters()
+    except Exception as e:
+        logger.warning(f"Rate limit flush failed: {e}")
+    try:
+        stop_feed_poller()
+    except Exception:
+        pass
+    # Outbound integration connection pools, last: the drains above may still send
+    try:
+        from app.services.http_clients import get_http_clients
+        await get_http_clients().aclose()
+    except Exception as e:
+        logger.debug(f"HTTP client pool close failed: {e}")
+    # Last, so the archived metrics snapshot includes what the drains above recorded
+    if _metrics_exporter_task:
+        _metrics_exporter_task.cancel()
         try:
-            # Check if column exists
-            result = await session.execute(
-                text(
-                    """SELECT column_name FROM information_schema.columns
-                    WHERE table_name = 'work_orders' AND column_name = 'work_order_number'"""
-                )
-            )
-            exists = result.fetchone()
-
-            if not exists:
-                logger.info("Adding work_order_number column to work_orders table...")
-                await session.execute(
-                    text("ALTER TABLE work_orders ADD COLUMN work_order_number VARCHAR(20)")
-                )
-                await session.commit()
-                logger.info("Added work_orders.work_order_number column")
-
-                # Backfill existing work orders with sequential numbers
-                logger.info("Backfilling work order numbers...")
-                await session.execute(
-                    text("""
-                        WITH numbered AS (
-                            SELECT id, ROW_NUMBER() OVER (ORDER BY created_at NULLS LAST, id) as rn
-                            FROM work_orders
-                            WHERE work_order_number IS NULL
-                        )
-                        UPDATE work_orders wo
-                        SET work_order_number = 'WO-' || LPAD(n.rn::text, 6, '0')
-                        FROM numbered n
-                        WHERE wo.id = n.id
-                    """)
-                )
-                await session.commit()
-                logger.info("Backfilled work order numbers")
-
-                # Add unique constraint and index
-                try:
-                    await session.execute(
-                        text("CREATE UNIQUE INDEX IF NOT EXISTS ix_work_orders_number ON work_orders(work_order_number)")
-                    )
-                    await session.commit()
-                except Exception:
-                    pass  # Index may conflict, that's okay
-
-            logger.info("Work order number column verified")
-
-        except Exception as e:
-            logger.warning(f"Could not ensure work_order_number column: {type(e).__name__}: {e}")
-
-
-async def ensure_is_admin_column():
-    """
-    Ensure api_users table has is_admin column.
-
-    This column is needed for RBAC admin role detection.
-    Added by migration 043 but may not have run on Railway.
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    async with async_session_maker() as session:
-        try:
-            # Check if is_admin column exists
-            result = await session.execute(
-                text(
-                    """SELECT EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_name = 'api_users' AND column_name = 'is_admin'
-                )"""
-                )
-            )
-            column_exists = result.scalar()
-
-            if not column_exists:
-                logger.info("Adding missing is_admin column to api_users...")
-                await session.execute(
-                    text("ALTER TABLE api_users ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT false")
-                )
-                # Promote will@macseptic.com to admin
-                await session.execute(
-                    text("UPDATE api_users SET is_admin = true WHERE email = 'will@macseptic.com'")
-                )
-                await session.commit()
-                logger.info("Added is_admin column and promoted admin user")
-            else:
-                logger.debug("is_admin column already exists")
-
-        except Exception as e:
-            logger.warning(f"Could not ensure is_admin column: {type(e).__name__}: {e}")
-
-
-async def ensure_commissions_columns():
-    """
-    Ensure commissions table has auto-calculation columns.
-
-    These columns are needed for auto-commission creation on work order completion.
-    Added by migration 026/039 but may not have run on Railway.
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    async with async_session_maker() as session:
-        try:
-            # Check if commissions table exists first
-            table_check = await session.execute(
-                text("""SELECT EXISTS (
-                    SELECT 1 FROM information_schema.tables
-                    WHERE table_name = 'commissions'
-                )""")
-            )
-            if not table_check.scalar():
-                logger.info("Commissions table does not exist, skipping column ensures")
-                return
-
-            # Check which columns exist
-            result = await session.execute(
-                text(
-                    """SELECT column_name FROM information_schema.columns
-                    WHERE table_name = 'commissions'"""
-                )
-            )
-            existing_columns = {row[0] for row in result}
-
-            # Columns to ensure exist
-            columns_to_add = [
-                ("dump_site_id", "UUID"),
-                ("job_type", "VARCHAR(50)"),
-                ("gallons_pumped", "INTEGER"),
-                ("dump_fee_per_gallon", "FLOAT"),
-                ("dump_fee_amount", "FLOAT"),
-                ("commissionable_amount", "FLOAT"),
-            ]
-
-            for col_name, col_type in columns_to_add:
-                if col_name not in existing_columns:
-                    logger.info(f"Adding column commissions.{col_name}...")
-                    await session.execute(
-                        text(f"ALTER TABLE commissions ADD COLUMN {col_name} {col_type}")
-                    )
-                    logger.info(f"Added commissions.{col_name}")
-
-            await session.commit()
-
-            # Create index on job_type if not exists
-            try:
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_commissions_job_type ON commissions(job_type)")
-                )
-                await session.commit()
-            except Exception:
-                pass  # Index may already exist
-
-            logger.info("Commissions table columns verified")
-
-        except Exception as e:
-            logger.warning(f"Could not ensure commissions columns: {type(e).__name__}: {e}")
-
-
-async def ensure_work_order_audit_columns():
-    """Ensure work_orders has audit trail columns and audit log table exists (migration 068).
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    async with async_session_maker() as session:
-        try:
-            # Add audit columns to work_orders if missing
-            # FIX (2026-02-26): Replaced f-string interpolation in information_schema
-            # query with bound parameters. Although the values come from a hard-coded
-            # list (not user input), defense-in-depth requires parameterized queries.
-            # The ALTER TABLE DDL still uses f-strings because DDL does not support
-            # bind parameters for column names/types, but the values are hard-coded.
-            for col, col_type, default in [
-                ("created_by", "VARCHAR(100)", None),
-                ("updated_by", "VARCHAR(100)", None),
-                ("source", "VARCHAR(50)", "'crm'"),
-            ]:
-                result = await session.execute(
-                    text("SELECT 1 FROM information_schema.columns WHERE table_name = :table AND column_name = :col"),
-                    {"table": "work_orders", "col": col},
-                )
-                if not result.scalar():
-                    default_clause = f" DEFAULT {default}" if default else ""
-                    await session.execute(text(f"ALTER TABLE work_orders ADD COLUMN {col} {col_type}{default_clause}"))
-                    logger.info(f"Added work_orders.{col} column")
-
-            # Fix created_at/updated_at to have proper defaults
-            await session.execute(text(
-                "ALTER TABLE work_orders ALTER COLUMN created_at SET DEFAULT NOW()"
-            ))
-            await session.execute(text(
-                "ALTER TABLE work_orders ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC'"
-            ))
-
-            # Backfill NULL created_at
-            await session.execute(text(
-                "UPDATE work_orders SET created_at = scheduled_date::timestamp WHERE created_at IS NULL AND scheduled_date IS NOT NULL"
-            ))
-            await session.execute(text(
-                "UPDATE work_orders SET created_at = NOW() WHERE created_at IS NULL"
-            ))
-            await session.execute(text(
-                "UPDATE work_orders SET source = 'crm' WHERE source IS NULL"
-            ))
-
-            # Create audit log table if missing
-            result = await session.execute(text(
-                "SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='work_order_audit_log')"
-            ))
-            if not result.scalar():
-                logger.info("Creating work_order_audit_log table...")
-                await session.execute(text("""
-                    CREATE TABLE work_order_audit_log (
-                        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                        work_order_id UUID NOT NULL REFERENCES work_orders(id) ON DELETE CASCADE,
-                        action VARCHAR(30) NOT NULL,
-                        description TEXT,
-                        user_email VARCHAR(100),
-                        user_name VARCHAR(200),
-                        source VARCHAR(50),
-                        ip_address VARCHAR(45),
-                        user_agent VARCHAR(500),
-                        changes JSONB,
-                        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-                    )
-                """))
-                await session.execute(text("CREATE INDEX IF NOT EXISTS ix_wo_audit_work_order_id ON work_order_audit_log(work_order_id)"))
-                await session.execute(text("CREATE INDEX IF NOT EXISTS ix_wo_audit_action ON work_order_audit_log(action)"))
-                await session.execute(text("CREATE INDEX IF NOT EXISTS ix_wo_audit_created_at ON work_order_audit_log(created_at)"))
-                logger.info("work_order_audit_log table created")
-
-            await session.commit()
-            logger.info("Work order audit columns ensured")
-        except Exception as e:
-            await session.rollback()
-            logger.warning(f"Could not ensure work order audit columns: {type(e).__name__}: {e}")
-
-
-async def ensure_user_activity_table():
-    """Ensure user_activity_log table exists (migration 069).
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    async with async_session_maker() as session:
-        try:
-            result = await session.execute(text(
-                "SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='user_activity_log')"
-            ))
-            if not result.scalar():
-                logger.info("Creating user_activity_log table...")
-                await session.execute(text("""
-                    CREATE TABLE user_activity_log (
-                        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                        user_id INTEGER,
-                        user_email VARCHAR(100),
-                        user_name VARCHAR(200),
-                        category VARCHAR(30) NOT NULL,
-                        action VARCHAR(50) NOT NULL,
-                        description TEXT,
-                        ip_address VARCHAR(45),
-                        user_agent VARCHAR(500),
-                        source VARCHAR(50),
-                        resource_type VARCHAR(50),
-                        resource_id VARCHAR(100),
-                        endpoint VARCHAR(200),
-                        http_method VARCHAR(10),
-                        status_code INTEGER,
-                        response_time_ms INTEGER,
-                        session_id VARCHAR(50),
-                        entity_id VARCHAR(100),
-                        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-                    )
-                """))
-                await session.execute(text("CREATE INDEX ix_ual_user_id ON user_activity_log(user_id)"))
-                await session.execute(text("CREATE INDEX ix_ual_category ON user_activity_log(category)"))
-                await session.execute(text("CREATE INDEX ix_ual_action ON user_activity_log(action)"))
-                await session.execute(text("CREATE INDEX ix_ual_created_at ON user_activity_log(created_at)"))
-                await session.execute(text("CREATE INDEX ix_ual_user_created ON user_activity_log(user_id, created_at)"))
-                await session.execute(text("CREATE INDEX ix_ual_category_created ON user_activity_log(category, created_at)"))
-                logger.info("user_activity_log table created")
-            await session.commit()
-        except Exception as e:
-            await session.rollback()
-            logger.warning(f"Could not ensure user_activity_log table: {type(e).__name__}: {e}")
-
-
-async def ensure_missing_indexes():
-    """Ensure critical indexes exist (migration 070). Idempotent.
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    indexes = [
-        ("ix_customers_entity_id", "customers", "entity_id"),
-        ("ix_work_orders_entity_id", "work_orders", "entity_id"),
-        ("ix_payments_entity_id", "payments", "entity_id"),
-        ("ix_invoices_entity_id", "invoices", "entity_id"),
-        ("ix_technicians_entity_id", "technicians", "entity_id"),
-        ("ix_payments_invoice_id", "payments", "invoice_id"),
-        ("ix_work_orders_customer_id", "work_orders", "customer_id"),
-        ("ix_time_entries_payroll_period", "time_entries", "payroll_period_id"),
-    ]
-    async with async_session_maker() as session:
-        try:
-            for idx_name, table, column in indexes:
-                await session.execute(text(
-                    f"CREATE INDEX IF NOT EXISTS {idx_name} ON {table}({column})"
-                ))
-            await session.execute(text(
-                "CREATE INDEX IF NOT EXISTS ix_work_orders_scheduled_date_status "
-                "ON work_orders(scheduled_date, status)"
-            ))
-            # GIN trigram index for customer search
-            await session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
-            await session.execute(text(
-                "CREATE INDEX IF NOT EXISTS ix_customers_name_trgm "
-                "ON customers USING gin ((first_name || ' ' || last_name) gin_trgm_ops)"
-            ))
-            await session.commit()
-            logger.info("Missing indexes ensured (migration 077)")
-        except Exception as e:
-            await session.rollback()
-            logger.warning(f"Could not ensure indexes: {type(e).__name__}: {e}")
-
-
-async def ensure_ms365_columns():
-    """Ensure MS365 integration columns exist (migrations 072-075).
-
-    NOTE: Safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    # (table, column, type, extra)
-    columns = [
-        ("api_users", "microsoft_id", "VARCHAR(255) UNIQUE", "072"),
-        ("api_users", "microsoft_email", "VARCHAR(255)", "072"),
-        ("work_orders", "outlook_event_id", "VARCHAR(255)", "073"),
-        ("technicians", "microsoft_user_id", "VARCHAR(255)", "073"),
-        ("technicians", "microsoft_email", "VARCHAR(255)", "073"),
-        ("work_orders", "sharepoint_item_id", "VARCHAR(255)", "074"),
-        ("customers", "sharepoint_folder_url", "VARCHAR(500)", "074"),
-        ("work_orders", "ms_booking_appointment_id", "VARCHAR(255)", "078"),
-        ("work_orders", "booking_source", "VARCHAR(50)", "078"),
-        ("work_orders", "outlook_shared_event_id", "VARCHAR(255)", "084"),
-    ]
-
-    async with async_session_maker() as session:
-        try:
-            # FIX (2026-02-26): Replaced f-string in information_schema query
-            # with bound parameters. DDL (ALTER TABLE) still uses f-strings
-            # because SQL DDL does not support bind params for identifiers,
-            # but the values come from the hard-coded list above.
-            for table, column, col_type, migration in columns:
-                result = await session.execute(
-                    text(
-                        "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
-                        "WHERE table_name = :table AND column_name = :col)"
-                    ),
-                    {"table": table, "col": column},
-                )
-                if not result.scalar():
-                    logger.info(f"Adding {table}.{column} (migration {migration})...")
-                    await session.execute(text(
-                        f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"
-                    ))
-
-            # Ensure inbound_emails table (migration 075)
-            result = await session.execute(text(
-                "SELECT EXISTS (SELECT 1 FROM information_schema.tables "
-                "WHERE table_name='inbound_emails')"
-            ))
-            if not result.scalar():
-                logger.info("Creating inbound_emails table (migration 075)...")
-                await session.execute(text("""
-                    CREATE TABLE inbound_emails (
-                        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                        message_id VARCHAR(500) UNIQUE NOT NULL,
-                        sender_email VARCHAR(255) NOT NULL,
-                        sender_name VARCHAR(255),
-                        subject VARCHAR(500),
-                        body_preview TEXT,
-                        received_at TIMESTAMP WITH TIME ZONE NOT NULL,
-                        customer_id UUID REFERENCES customers(id) ON DELETE SET NULL,
-                        action_taken VARCHAR(50) DEFAULT 'none',
-                        entity_id UUID,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                    )
-                """))
-                await session.execute(text(
-                    "CREATE INDEX IF NOT EXISTS idx_inbound_emails_sender ON inbound_emails(sender_email)"
-                ))
-                await session.execute(text(
-                    "CREATE INDEX IF NOT EXISTS idx_inbound_emails_received ON inbound_emails(received_at DESC)"
-                ))
-
-            await session.commit()
-            logger.info("MS365 columns and tables ensured")
-        except Exception as e:
-            await session.rollback()
-            logger.warning(f"Could not ensure MS365 columns: {type(e).__name__}: {e}")
-
-
-async def ensure_call_logs_nullable():
-    """Make legacy NOT NULL columns nullable so quick-log can insert without RingCentral data."""
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    # Columns that may have NOT NULL in the DB but aren't set by the quick-log endpoint
-    cols_to_fix = [
-        "rc_call_id", "from_number", "to_number", "from_name", "to_name",
-        "start_time", "end_time", "status", "result", "reason",
-    ]
-
-    async with async_session_maker() as session:
-        try:
-            result = await session.execute(text(
-                "SELECT column_name FROM information_schema.columns "
-                "WHERE table_name = 'call_logs' AND is_nullable = 'NO' "
-                "AND column_name != 'id' AND column_name != 'user_id'"
-            ))
-            not_null_cols = [r[0] for r in result.fetchall()]
-            fixed = []
-            for col in not_null_cols:
-                await session.execute(text(
-                    f"ALTER TABLE call_logs ALTER COLUMN \"{col}\" DROP NOT NULL"
-                ))
-                fixed.append(col)
-            if fixed:
-                await session.commit()
-                logger.info(f"Made call_logs columns nullable: {fixed}")
-            else:
-                logger.info("All call_logs columns already nullable")
-        except Exception as e:
-            await session.rollback()
-            logger.warning(f"Could not fix call_logs nullable: {type(e).__name__}: {e}")
-
-
-async def ensure_billing_customer_id():
-    """Ensure work_orders table has billing_customer_id column (migration 093)."""
-    from sqlalchemy import text
-    from app.database import async_session_maker
-    async with async_session_maker() as session:
-        try:
-            result = await session.execute(text(
-                "SELECT column_name FROM information_schema.columns "
-                "WHERE table_name = 'work_orders' AND column_name = 'billing_customer_id'"
-            ))
-            if not result.fetchone():
-                await session.execute(text(
-                    "ALTER TABLE work_orders ADD COLUMN billing_customer_id UUID REFERENCES customers(id) ON DELETE SET NULL"
-                ))
-                await session.execute(text(
-                    "CREATE INDEX IF NOT EXISTS ix_work_orders_billing_customer_id ON work_orders(billing_customer_id)"
-                ))
-                await session.commit()
-                logger.info("Added billing_customer_id column to work_orders")
-        except Exception as e:
-            logger.warning(f"Could not ensure billing_customer_id column: {type(e).__name__}: {e}")
-
-
-async def ensure_county_column():
-    """Ensure customers table has county column (migration 094)."""
-    from sqlalchemy import text
-    from app.database import async_session_maker
-    async with async_session_maker() as session:
-        try:
-            result = await session.execute(text(
-                "SELECT column_name FROM information_schema.columns "
-                "WHERE table_name = 'customers' AND column_name = 'county'"
-            ))
-            if not result.fetchone():
-                await session.execute(text(
-                    "ALTER TABLE customers ADD COLUMN county VARCHAR(100)"
-                ))
-                await session.commit()
-                logger.info("Added county column to customers")
-        except Exception as e:
-            logger.warning(f"Could not ensure county column: {type(e).__name__}: {e}")
-
-
-async def ensure_fk_on_delete():
-    """Fix FK constraints that may lack ON DELETE SET NULL/CASCADE.
-
-    Migration 082 was supposed to set these but may have failed silently.
-    This is idempotent — skips constraints that already have the correct behavior.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    fk_fixes = [
-        # (table, constraint_name, column, references_table, on_delete)
-        ("bookings", "bookings_work_order_id_fkey", "work_order_id", "work_orders", "SET NULL"),
-        ("invoices", "invoices_work_order_id_fkey", "work_order_id", "work_orders", "SET NULL"),
-        ("payments", "payments_work_order_id_fkey", "work_order_id", "work_orders", "SET NULL"),
-        ("tickets", "tickets_work_order_id_fkey", "work_order_id", "work_orders", "SET NULL"),
-        ("quotes", "quotes_converted_to_work_order_id_fkey", "converted_to_work_order_id", "work_orders", "SET NULL"),
-    ]
-
-    async with async_session_maker() as session:
-        try:
-            for table, constraint, column, ref_table, on_delete in fk_fixes:
-                # Check if constraint exists and what its delete rule is
-                result = await session.execute(
-                    text(
-                        "SELECT confdeltype FROM pg_constraint "
-                        "WHERE conname = :cname AND conrelid = cast(:tbl AS regclass)"
-                    ),
-                    {"cname": constraint, "tbl": table},
-                )
-                row = result.first()
-                if row is None:
-                    continue  # Constraint doesn't exist, skip
-                # 'a' = NO ACTION, 'r' = RESTRICT, 'n' = SET NULL, 'c' = CASCADE
-                if row[0] in ('n', 'c'):
-                    continue  # Already correct
-                logger.info(f"Fixing FK {constraint}: current={row[0]}, target={on_delete}")
-                await session.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}"))
-                await session.execute(text(
-                    f"ALTER TABLE {table} ADD CONSTRAINT {constraint} "
-                    f"FOREIGN KEY ({column}) REFERENCES {ref_table}(id) ON DELETE {on_delete}"
-                ))
-            await session.commit()
-            logger.info("FK ON DELETE constraints ensured")
-        except Exception as e:
-            await session.rollback()
-            logger.warning(f"Could not fix FK constraints: {type(e).__name__}: {e}")
-
-
-async def ensure_mfa_tables():
-    """
-    Ensure MFA tables exist for authentication.
-
-    These tables are needed for the User.mfa_settings relationship.
-    Added by migration 038 but may not have run on Railway.
-
-    NOTE: Migrated to Alembic 071. Kept as safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker
-
-    async with async_session_maker() as session:
-        try:
-            # Check if user_mfa_settings table exists
-            result = await session.execute(
-                text(
-                    """SELECT EXISTS (
-                    SELECT 1 FROM information_schema.tables
-                    WHERE table_name = 'user_mfa_settings'
-                )"""
-                )
-            )
-            table_exists = result.scalar()
-
-            if not table_exists:
-                logger.info("Creating MFA tables (migration 038 may not have run)...")
-
-                # Create user_mfa_settings table
-                await session.execute(
-                    text("""
-                    CREATE TABLE IF NOT EXISTS user_mfa_settings (
-                        id SERIAL PRIMARY KEY,
-                        user_id INTEGER NOT NULL UNIQUE REFERENCES api_users(id),
-                        totp_secret VARCHAR(32),
-                        totp_enabled BOOLEAN DEFAULT FALSE,
-                        totp_verified BOOLEAN DEFAULT FALSE,
-                        mfa_enabled BOOLEAN DEFAULT FALSE,
-                        mfa_enforced BOOLEAN DEFAULT FALSE,
-                        backup_codes_count INTEGER DEFAULT 0,
-                        backup_codes_generated_at TIMESTAMPTZ,
-                        created_at TIMESTAMPTZ DEFAULT NOW(),
-                        updated_at TIMESTAMPTZ,
-                        last_used_at TIMESTAMPTZ
-                    )
-                """)
-                )
-
-                # Create user_backup_codes table
-                await session.execute(
-                    text("""
-                    CREATE TABLE IF NOT EXISTS user_backup_codes (
-                        id SERIAL PRIMARY KEY,
-                        user_id INTEGER NOT NULL REFERENCES api_users(id),
-                        mfa_settings_id INTEGER NOT NULL REFERENCES user_mfa_settings(id),
-                        code_hash VARCHAR(255) NOT NULL,
-                        used BOOLEAN DEFAULT FALSE,
-                        used_at TIMESTAMPTZ,
-                        created_at TIMESTAMPTZ DEFAULT NOW()
-                    )
-                """)
-                )
-
-                # Create mfa_sessions table
-                await session.execute(
-                    text("""
-                    CREATE TABLE IF NOT EXISTS mfa_sessions (
-                        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                        user_id INTEGER NOT NULL REFERENCES api_users(id),
-                        session_token_hash VARCHAR(255) NOT NULL UNIQUE,
-                        challenge_type VARCHAR(20) DEFAULT 'totp',
-                        attempts INTEGER DEFAULT 0,
-                        max_attempts INTEGER DEFAULT 3,
-                        expires_at TIMESTAMPTZ NOT NULL,
-                        verified_at TIMESTAMPTZ,
-                        created_at TIMESTAMPTZ DEFAULT NOW()
-                    )
-                """)
-                )
-
-                # Create indexes
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_user_mfa_settings_user_id ON user_mfa_settings(user_id)")
-                )
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_user_backup_codes_user_id ON user_backup_codes(user_id)")
-                )
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_mfa_sessions_user_id ON mfa_sessions(user_id)")
-                )
-                await session.execute(
-                    text("CREATE INDEX IF NOT EXISTS ix_mfa_sessions_expires_at ON mfa_sessions(expires_at)")
-                )
-
-                await session.commit()
-                logger.info("MFA tables created successfully")
-            else:
-                logger.debug("MFA tables already exist")
-
-        except Exception as e:
-            logger.warning(f"Could not ensure MFA tables: {type(e).__name__}: {e}")
-
-
-async def ensure_chat_message_type():
-    """Ensure 'chat' value exists in messagetype PostgreSQL ENUM (migration 089)."""
-    try:
-        async with async_session_maker() as session:
-            from sqlalchemy import text
-            result = await session.execute(
-                text("SELECT unnest(enum_range(NULL::messagetype))::text AS val")
-            )
-            values = [row[0] for row in result.all()]
-            if "chat" not in values:
-                await session.execute(text("ALTER TYPE messagetype ADD VALUE IF NOT EXISTS 'chat'"))
-                await session.commit()
-                logger.info("Added 'chat' to messagetype enum")
-            else:
-                logger.debug("messagetype enum already has 'chat'")
-    except Exception as e:
-        logger.warning(f"Could not ensure chat message type: {type(e).__name__}: {e}")
-
-
-async def ensure_live_chat_tables():
-    """Ensure chat_conversations and chat_messages tables exist (migration 090).
-
-    Creates the tables if they don't exist. Safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker as _asm
-
-    async with _asm() as session:
-        try:
-            await session.execute(text("""
-                CREATE TABLE IF NOT EXISTS chat_conversations (
-                    id UUID PRIMARY KEY,
-                    visitor_name VARCHAR(255),
-                    visitor_email VARCHAR(255),
-                    visitor_phone VARCHAR(50),
-                    customer_id UUID REFERENCES customers(id) ON DELETE SET NULL,
-                    status VARCHAR(20) DEFAULT 'active',
-                    assigned_user_id INTEGER REFERENCES api_users(id),
-                    meta JSON,
-                    created_at TIMESTAMPTZ DEFAULT now(),
-                    updated_at TIMESTAMPTZ,
-                    closed_at TIMESTAMPTZ
-                )
-            """))
-            await session.execute(text("""
-                CREATE TABLE IF NOT EXISTS chat_messages (
-                    id UUID PRIMARY KEY,
-                    conversation_id UUID NOT NULL REFERENCES chat_conversations(id) ON DELETE CASCADE,
-                    sender_type VARCHAR(20) NOT NULL,
-                    sender_name VARCHAR(255),
-                    content TEXT NOT NULL,
-                    created_at TIMESTAMPTZ DEFAULT now()
-                )
-            """))
-            await session.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_chat_messages_conversation_id
-                ON chat_messages (conversation_id)
-            """))
-            await session.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_chat_conversations_status
-                ON chat_conversations (status)
-            """))
-            await session.commit()
-            logger.info("Live chat tables ensured")
-        except Exception as e:
-            logger.warning(f"Could not ensure live chat tables: {type(e).__name__}: {e}")
-
-
-async def ensure_documents_table():
-    """Ensure documents table exists (migration 088).
-
-    Creates the table if it doesn't exist. Safety net for deployments that skip migrations.
-    """
-    from sqlalchemy import text
-    from app.database import async_session_maker as _asm
-
-    async with _asm() as session:
-        try:
-            await session.execute(text("""
-                CREATE TABLE IF NOT EXISTS documents (
-                    id UUID PRIMARY KEY,
-                    entity_id UUID NOT NULL,
-                    document_type VARCHAR(50) NOT NULL,
-                    reference_id UUID,
-                    reference_number VARCHAR(100),
-                    customer_id UUID REFERENCES customers(id),
-                    file_name VARCHAR(255),
-                    file_size INTEGER,
-                    pdf_data BYTEA,
-                    status VARCHAR(30) DEFAULT 'draft',
-                    sent_at TIMESTAMPTZ,
-                    sent_to VARCHAR(255),
-                    viewed_at TIMESTAMPTZ,
-                    created_by UUID,
-                    created_at TIMESTAMPTZ DEFAULT now()
-                )
-            """))
-            await session.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_documents_entity_type
-                ON documents (entity_id, document_type)
-            """))
-            await session.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_documents_customer
-                ON documents (customer_id)
-            """))
-            await session.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_documents_reference
-                ON documents (reference_id)
-            """))
-            await session.commit()
-            logger.info("Documents table ensured")
-        except Exception as e:
-            logger.warning(f"Could not ensure documents table: {type(e).__name__}: {e}")
-
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan events."""
-    # Startup
-    logger.info("Starting React CRM API...")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-
-    # Initialize Sentry for error tracking
-    init_sentry()
-    # SECURITY: Don't log full database URL, just prefix
-    if settings.DATABASE_URL:
-        logger.info(f"Database URL prefix: {settings.DATABASE_URL[:30]}...")
-    try:
-        await init_db()
-        logger.info("Database initialized successfully")
-
-        # Ensure pay_rate columns exist (fix for migration 025 not running)
-        await ensure_pay_rate_columns()
-
-        # Ensure work_order_photos table exists (fix for migration 032 not running)
-        await ensure_work_order_photos_table()
-
-        # Ensure messages columns exist (fix for migration 036 not running)
-        await ensure_messages_columns()
-
-        # Ensure email_templates table exists (fix for migration 037 not running)
-        await ensure_email_templates_table()
-
-        # Ensure commissions table has auto-calc columns (fix for migration 039 not running)
-        await ensure_commissions_columns()
-
-        # Ensure work_orders table has work_order_number column
-        await ensure_work_order_number_column()
-
-        # Ensure api_users table has is_admin column (fix for migration 043 not running)
-        await ensure_is_admin_column()
-
-        # Ensure MFA tables exist (fix for migration 038 not running)
-        await ensure_mfa_tables()
-
-        await ensure_work_order_audit_columns()
-        await ensure_user_activity_table()
-        await ensure_missing_indexes()
-
-        # Ensure MS365 integration columns exist (migrations 072-075)
-        await ensure_ms365_columns()
-
-        # Make call_logs.rc_call_id nullable for quick-log
-        await ensure_call_logs_nullable()
-
-        # Ensure 'chat' exists in messagetype enum (migration 089)
-        await ensure_chat_message_type()
-
-        # Ensure live chat tables exist (migration 090)
-        await ensure_live_chat_tables()
-
-        # Ensure documents table exists (migration 088)
-        await ensure_documents_table()
-
-        # Fix FK constraints that may lack ON DELETE behavior (migration 082 may have failed)
-        await ensure_fk_on_delete()
-
-        # Ensure billing_customer_id column exists on work_orders (migration 093)
-        await ensure_billing_customer_id()
-
-        # Ensure county column exists on customers (migration 094)
-        await ensure_county_column()
-    except Exception as e:
-        # SECURITY: Don't log full exception details which may contain credentials
-        logger.error(f"Database initialization failed: {type(e).__name__}")
-        logger.warning("App starting without database - some features may not work")
-
-    # Start RingCentral auto-sync background task
-    try:
-        start_auto_sync()
-        logger.info("RingCentral auto-sync started")
-    except Exception as e:
-        logger.warning(f"Failed to start RingCentral auto-sync: {e}")
-
-    # Start service reminder scheduler
-    try:
-        start_reminder_scheduler()
-        logger.info("Service reminder scheduler started")
-    except Exception as e:
-        logger.warning(f"Failed to start reminder scheduler: {e}")
-
-    # Start IoT MQTT bridge (gated by IOT_MQTT_ENABLED env var)
-    try:
-        from app.services.iot.mqtt_bridge import start_bridge as start_iot_bridge
-        await start_iot_bridge()
-    except Exception as e:
-        logger.warning(f"Failed to start IoT MQTT bridge: {e}")
-
-    # Start Samsara feed poller background task
-    try:
-        from app.api.v2.samsara import start_feed_poller, stop_feed_poller
-        start_feed_poller()
-        logger.info("Samsara feed poller started")
-    except Exception as e:
-        logger.warning(f"Failed to start Samsara feed poller: {e}")
-
-    # Start MS365 calendar sync scheduler
-    try:
-        start_calendar_sync()
-    except Exception as e:
-        logger.warning(f"Failed to start calendar sync: {e}")
-
-    # Start MS365 email poller
-    try:
-        start_email_poller()
-        start_campaign_scheduler()
-    except Exception as e:
-        logger.warning(f"Failed to start email poller: {e}")
-
-    # Start MS365 bookings sync
-    try:
-        start_bookings_sync()
-    except Exception as e:
-        logger.warning(f"Failed to start bookings sync: {e}")
-
-    # Start MS Forms inspection sync
-    try:
-        start_forms_sync()
-    except Exception as e:
-        logger.warning(f"Failed to start forms sync: {e}")
-
-    # Start marketing daily report scheduler (7 AM)
-    try:
-        start_marketing_report_scheduler()
-    except Exception as e:
-        logger.warning(f"Failed to start marketing report scheduler: {e}")
-
-    # AI Interaction Analyzer — Stage 5 schedulers
-    try:
-        start_ai_strategy_scheduler()
-    except Exception as e:
-        logger.warning(f"Failed to start AI strategy scheduler: {e}")
-    try:
-        start_ai_rescore_scheduler()
-    except Exception as e:
-        logger.warning(f"Failed to start AI rescore scheduler: {e}")
-    try:
-        start_ai_budget_scheduler()
-    except Exception as e:
-        logger.warning(f"Failed to start AI budget scheduler: {e}")
-    try:
-        start_ai_rc_poll_scheduler()
-    except Exception as e:
-        logger.warning(f"Failed to start AI RC poll scheduler: {e}")
-
-    # HR cert-expiry daily SMS scheduler (gated by HR_MODULE_ENABLED).
-    try:
-        from app.hr.feature_flag import hr_module_enabled
-        if hr_module_enabled():
-            from app.hr.shared.cert_expiry_job import start_cert_expiry_scheduler
-            start_cert_expiry_scheduler()
-    except Exception as e:
-        logger.warning(f"Failed to start HR cert-expiry scheduler: {e}")
-
-    # Background task watchdog — restarts crashed tasks every 5 minutes
-
-    # Follow-up scheduler and auto-dispatch — TODO: add start/stop functions
-    # try:
-    #     start_followup_scheduler()
-    # except Exception as e:
-    #     logger.warning(f"Failed to start follow-up scheduler: {e}")
-    # try:
-    #     start_auto_dispatch()
-    # except Exception as e:
-    #     logger.warning(f"Failed to start auto-dispatch scheduler: {e}")
-    import asyncio
-
-    async def _watchdog():
-        while True:
-            await asyncio.sleep(300)
-            # Check RingCentral sync
-            try:
-                from app.api.v2.ringcentral import _sync_task
-                if _sync_task and _sync_task.done():
-                    logger.warning("Watchdog: RingCentral sync task died — restarting")
-                    start_auto_sync()
-            except Exception as e:
-                logger.debug(f"Watchdog RingCentral check failed: {e}")
-            # Check Samsara feed poller
-            try:
-                from app.api.v2.samsara import _feed_poller_task, start_feed_poller as restart_samsara
-                if _feed_poller_task and _feed_poller_task.done():
-                    logger.warning("Watchdog: Samsara feed poller died — restarting")
-                    restart_samsara()
-            except Exception as e:
-                logger.debug(f"Watchdog Samsara check failed: {e}")
-            # Check APScheduler
-            try:
-                from app.tasks.reminder_scheduler import scheduler as _sched
-                if _sched and not _sched.running:
-                    logger.warning("Watchdog: Reminder scheduler stopped — restarting")
-                    _sched.start()
-            except Exception as e:
-                logger.debug(f"Watchdog scheduler check failed: {e}")
-
-    _watchdog_task = asyncio.create_task(_watchdog())
-
-    # Pre-warm database connection pool for faster first request
-    logger.info("Pre-warming database connections...")
-    try:
-        from sqlalchemy import text
-        from app.database import async_session_maker
-
-        async with async_session_maker() as session:
-            await session.execute(text("SELECT 1"))
-        logger.info("Database connection pool warmed successfully")
-    except Exception as e:
-        logger.warning(f"Database warmup failed (non-fatal): {e}")
-
-    # Pre-warm Redis connection if available
-    logger.info("Pre-warming Redis connection...")
-    try:
-        from app.services.cache_service import cache_service
-
-        await cache_service.set("warmup:ping", "ok", ttl=60)
-        result = await cache_service.get("warmup:ping")
-        if result == "ok":
-            logger.info("Redis connection warmed successfully (set+get verified)")
-        else:
-            logger.info("Redis connection warmed (set succeeded, get returned %s)", result)
-    except Exception as e:
-        logger.debug(f"Redis warmup skipped: {e}")
-
-    yield
-
-    # Shutdown
-    logger.info("Shutting down React CRM API...")
-    _watchdog_task.cancel()
-    stop_auto_sync()
-    stop_reminder_scheduler()
-    try:
-        from app.services.iot.mqtt_bridge import stop_bridge as stop_iot_bridge
-        await stop_iot_bridge()
-    except Exception:
-        pass
-    try:
-        stop_feed_poller()
-    except Exception:
-        pass
-    stop_calendar_sync()
-    stop_email_poller()
-    stop_campaign_scheduler()
-    stop_bookings_sync()
-    stop_forms_sync()
-    stop_marketing_report_scheduler()
-    try:
-        stop_ai_strategy_scheduler()
-    except Exception:
-        pass
-    try:
-        stop_ai_rescore_scheduler()
-    except Exception:
-        pass
-    try:
-        stop_ai_budget_scheduler()
-    except Exception:
-        pass
-    try:
-        stop_ai_rc_poll_scheduler()
-    except Exception:
-        pass
-    # stop_followup_scheduler()
-    # stop_auto_dispatch()
+            await _metrics_exporter_task
+        except asyncio.CancelledError:
+            pass
 
 
 # SECURITY: Conditionally enable docs based on settings
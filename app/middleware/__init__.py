@@ -7,12 +7,19 @@ Provides request processing middleware for:
 - Prometheus metrics collection
 - Cache-Control headers for browser caching
 - Server-Timing headers for performance debugging
+- Security headers, proxy scheme rewriting and activity tracking
+
+All of them are pure ASGI middleware: they only touch the response on
+http.response.start and pass body messages straight through, so streaming
+responses (SSE) are not buffered or re-wrapped in extra tasks.
 """
 
 from .correlation import CorrelationIdMiddleware, correlation_id_ctx, request_id_ctx
 from .metrics import MetricsMiddleware
 from .cache_headers import CacheHeadersMiddleware
 from .timing import ServerTimingMiddleware
+from .security_headers import SecurityHeadersMiddleware
+from .proxy_headers import ProxyHeadersMiddleware
 
 __all__ = [
     "CorrelationIdMiddleware",
@@ -21,4 +28,6 @@ __all__ = [
     "MetricsMiddleware",
     "CacheHeadersMiddleware",
     "ServerTimingMiddleware",
+    "SecurityHeadersMiddleware",
+    "ProxyHeadersMiddleware",
 ]
@@ -2,18 +2,18 @@
 Activity Tracking Middleware — logs authenticated API requests.
 
 Performance notes:
-- Logging happens AFTER the response is sent (fire-and-forget via asyncio.create_task)
+- Logging happens AFTER the response is sent (rows are buffered and batch-written
+  by activity_tracker.activity_sink)
 - Skips health/metrics/auth-me and static endpoints
 - Only logs authenticated requests (has JWT session cookie or Bearer token)
-- Adds ~0ms latency to requests (async background task)
+- Pure ASGI: untracked requests pass straight through, tracked ones only
+  observe the status on http.response.start
 """
-import asyncio
 import logging
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.services.activity_tracker import (
     log_activity,
@@ -28,27 +28,49 @@ logger = logging.getLogger(__name__)
 # Skip GET list endpoints to reduce noise — focus on actions
 TRACKED_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
 
+# Determine action from method
+ACTION_MAP = {
+    "POST": "create",
+    "PATCH": "update",
+    "PUT": "update",
+    "DELETE": "delete",
+}
 
-class ActivityTrackingMiddleware(BaseHTTPMiddleware):
-    """Lightweight middleware that logs user actions asynchronously."""
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        path = request.url.path
-        method = request.method
+class ActivityTrackingMiddleware:
+    """Lightweight middleware that logs user actions asynchronously."""
 
-        # Quick bail for endpoints we don't care about
-        if not should_track_endpoint(path):
-            return await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Quick bail for endpoints we don't care about.
         # Only track mutating requests + important GETs
         # (GET tracking would be too noisy for a CRM with constant polling)
-        if method not in TRACKED_METHODS:
-            return await call_next(request)
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in TRACKED_METHODS
+            or not should_track_endpoint(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
 
         start_time = time.time()
-        response = await call_next(request)
-        elapsed_ms = int((time.time() - start_time) * 1000)
+        status_code = 500
+        elapsed_ms = 0
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code, elapsed_ms
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = int((time.time() - start_time) * 1000)
+            await send(message)
 
+        await self.app(scope, receive, send_with_status)
+        self._log(Request(scope), status_code, elapsed_ms)
+
+    @staticmethod
+    def _log(request: Request, status_code: int, elapsed_ms: int) -> None:
         # Only log if there's a user (authenticated request)
         # We check for the session cookie or auth header
         has_auth = (
@@ -56,7 +78,10 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
             or request.headers.get("authorization", "").startswith("Bearer ")
         )
         if not has_auth:
-            return response
+            return
+
+        path = request.url.path
+        method = request.method
 
         # Extract user info from request state (set by auth dependency)
         # We can't always get this from middleware, so we use what's available
@@ -77,40 +102,29 @@ class ActivityTrackingMiddleware(BaseHTTPMiddleware):
         ip = get_client_ip(request)
         ua = (request.headers.get("user-agent", ""))[:500]
 
-        # Determine action from method
-        action_map = {
-            "POST": "create",
-            "PATCH": "update",
-            "PUT": "update",
-            "DELETE": "delete",
-        }
-        action = action_map.get(method, "api_call")
+        action = ACTION_MAP.get(method, "api_call")
 
         # Build description
         desc = f"{method} {path}"
-        if response.status_code >= 400:
-            desc += f" → {response.status_code}"
-
-        # Fire and forget — don't await, don't slow down the response
-        asyncio.create_task(
-            log_activity(
-                category="action",
-                action=action,
-                description=desc,
-                user_id=user_id,
-                user_email=user_email,
-                ip_address=ip,
-                user_agent=ua,
-                source=source,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                endpoint=path[:200],
-                http_method=method,
-                status_code=response.status_code,
-                response_time_ms=elapsed_ms,
-                session_id=session_id,
-                entity_id=entity_id,
-            )
+        if status_code >= 400:
+            desc += f" → {status_code}"
+
+        # Fire and forget — only enqueues, doesn't slow down the response
+        log_activity(
+            category="action",
+            action=action,
+            description=desc,
+            user_id=user_id,
+            user_email=user_email,
+            ip_address=ip,
+            user_agent=ua,
+            source=source,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            endpoint=path[:200],
+            http_method=method,
+            status_code=status_code,
+            response_time_ms=elapsed_ms,
+            session_id=session_id,
+            entity_id=entity_id,
         )
-
-        return response
@@ -6,13 +6,13 @@ browser caching and reduce unnecessary requests.
 """
 
 import re
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from typing import Callable, List, Tuple
+from typing import List, Optional, Pattern, Tuple
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class CacheHeadersMiddleware(BaseHTTPMiddleware):
+
+class CacheHeadersMiddleware:
     """
     Middleware that adds Cache-Control headers based on endpoint patterns.
 
@@ -20,6 +20,10 @@ class CacheHeadersMiddleware(BaseHTTPMiddleware):
     - Public, read-only endpoints: Cache aggressively with stale-while-revalidate
     - Authenticated endpoints: Private caching only
     - Write operations (POST/PUT/DELETE): No caching
+
+    Patterns are compiled once and the Cache-Control value for a path is
+    chosen before the endpoint runs; the header is set on
+    http.response.start, so streaming bodies pass through untouched.
     """
 
     # Endpoints safe to cache publicly (no auth required, read-only)
@@ -42,40 +46,48 @@ class CacheHeadersMiddleware(BaseHTTPMiddleware):
         (r"^/api/v2/marketing-hub/tasks$", 60),  # 1 minute
     ]
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-
-        # Skip cache headers for error responses
-        if response.status_code >= 400:
-            return response
-
-        # Skip cache headers for write operations - explicitly no-store
-        if request.method not in ("GET", "HEAD", "OPTIONS"):
-            response.headers["Cache-Control"] = "no-store"
-            return response
-
-        path = request.url.path
-
-        # Check public cacheable endpoints
-        for pattern, max_age in self.PUBLIC_CACHEABLE:
-            if re.match(pattern, path):
-                # Public caching with stale-while-revalidate for better UX
-                response.headers["Cache-Control"] = (
-                    f"public, max-age={max_age}, stale-while-revalidate={max_age * 2}"
-                )
-                return response
-
-        # Check private cacheable endpoints
-        for pattern, max_age in self.PRIVATE_CACHEABLE:
-            if re.match(pattern, path):
-                response.headers["Cache-Control"] = (
-                    f"private, max-age={max_age}, stale-while-revalidate={max_age}"
-                )
-                return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # (compiled pattern, Cache-Control value), public rules first
+        self._rules: List[Tuple[Pattern[str], str]] = [
+            # Public caching with stale-while-revalidate for better UX
+            (re.compile(pattern), f"public, max-age={max_age}, stale-while-revalidate={max_age * 2}")
+            for pattern, max_age in self.PUBLIC_CACHEABLE
+        ] + [
+            (re.compile(pattern), f"private, max-age={max_age}, stale-while-revalidate={max_age}")
+            for pattern, max_age in self.PRIVATE_CACHEABLE
+        ]
+
+    def cache_control_for(self, method: str, path: str) -> Optional[str]:
+        """Cache-Control value for a successful response, or None to leave it unset."""
+        # Write operations - explicitly no-store
+        if method not in ("GET", "HEAD", "OPTIONS"):
+            return "no-store"
+
+        for pattern, value in self._rules:
+            if pattern.match(path):
+                return value
 
         # Default: private, no-cache for other API endpoints
         # This still allows conditional requests with ETags
         if path.startswith("/api/"):
-            response.headers["Cache-Control"] = "private, no-cache"
+            return "private, no-cache"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cache_control = self.cache_control_for(scope["method"], scope["path"])
+        if cache_control is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_control(message: Message) -> None:
+            # Skip cache headers for error responses
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message)["Cache-Control"] = cache_control
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_cache_control)
@@ -18,11 +18,9 @@ Usage:
 import uuid
 import logging
 from contextvars import ContextVar
-from typing import Callable
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +35,7 @@ def generate_id() -> str:
     return str(uuid.uuid4())[:12]
 
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
+class CorrelationIdMiddleware:
     """
     Middleware that extracts/generates correlation IDs for request tracing.
 
@@ -48,33 +46,44 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
     Also adds these IDs to response headers for client-side correlation.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+
         # Extract correlation ID from request headers or generate new one
-        correlation_id = request.headers.get("X-Correlation-ID")
-        if not correlation_id:
-            correlation_id = generate_id()
+        correlation_id = headers.get("X-Correlation-ID") or generate_id()
 
         # Extract request ID from headers or generate new one
-        request_id = request.headers.get("X-Request-ID")
-        if not request_id:
-            request_id = generate_id()
+        request_id = headers.get("X-Request-ID") or generate_id()
 
         # Set context variables for use throughout the request lifecycle
-        correlation_id_ctx.set(correlation_id)
-        request_id_ctx.set(request_id)
+        correlation_token = correlation_id_ctx.set(correlation_id)
+        request_token = request_id_ctx.set(request_id)
 
         # Store in request state for easy access in route handlers
-        request.state.correlation_id = correlation_id
-        request.state.request_id = request_id
-
-        # Process the request
-        response = await call_next(request)
-
-        # Add correlation headers to response for client-side debugging
-        response.headers["X-Correlation-ID"] = correlation_id
-        response.headers["X-Request-ID"] = request_id
-
-        return response
+        state = scope.setdefault("state", {})
+        state["correlation_id"] = correlation_id
+        state["request_id"] = request_id
+
+        async def send_with_ids(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add correlation headers to response for client-side debugging
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Correlation-ID"] = correlation_id
+                response_headers["X-Request-ID"] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_ids)
+        finally:
+            correlation_id_ctx.reset(correlation_token)
+            request_id_ctx.reset(request_token)
 
 
 def get_correlation_id() -> str:
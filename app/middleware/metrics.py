@@ -4,25 +4,25 @@ Metrics collection middleware.
 Automatically tracks HTTP request metrics for Prometheus.
 """
 
-import time
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from typing import Callable
 
-from app.core.metrics import track_request_start, track_request_end
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import route_label, track_request_start, track_request_end
 
 logger = logging.getLogger(__name__)
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+class MetricsMiddleware:
     """
     Middleware that automatically tracks HTTP request metrics.
 
     Collects:
-    - Request count by method, status, and path
-    - Request duration histogram
+    - Request count by method, status, and route template (the matched
+      route's path, e.g. /api/v2/customers/{customer_id}, so IDs, slugs and
+      unknown URLs cannot create new series)
+    - Request duration histogram (time until the response headers are sent,
+      so long-lived streams do not skew it)
     - In-flight request count
     """
 
@@ -33,25 +33,33 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         "/favicon.ico",
     }
 
-    async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
-        path = request.url.path
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
 
         # Skip metrics collection for excluded paths
-        if path in self.EXCLUDED_PATHS:
-            return await call_next(request)
+        if scope["type"] != "http" or path in self.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
 
         # Track request start
         start_time = track_request_start()
+        method = scope["method"]
+        tracked = False
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal tracked
+            if message["type"] == "http.response.start" and not tracked:
+                tracked = True
+                track_request_end(start_time, method, route_label(scope), message["status"])
+            await send(message)
 
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-        except Exception as e:
-            # Track failed requests as 500
-            status_code = 500
-            raise
+            await self.app(scope, receive, send_with_metrics)
         finally:
-            # Track request end
-            track_request_end(start_time=start_time, method=request.method, path=path, status_code=status_code)
-
-        return response
+            # Failed before a response was started: track as 500
+            if not tracked:
+                tracked = True
+                track_request_end(start_time, method, route_label(scope), 500)
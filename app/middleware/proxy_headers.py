@@ -0,0 +1,24 @@
+"""
+Proxy headers middleware.
+
+Trusts X-Forwarded-Proto from reverse proxies like Railway's edge so that
+FastAPI's trailing slash redirects (307) use HTTPS instead of HTTP.
+"""
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ProxyHeadersMiddleware:
+    """Rewrite the request scheme from X-Forwarded-Proto."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            forwarded_proto = Headers(scope=scope).get("x-forwarded-proto")
+            if forwarded_proto:
+                # Update the scope to reflect the actual client protocol
+                scope["scheme"] = forwarded_proto
+        await self.app(scope, receive, send)
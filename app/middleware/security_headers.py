@@ -9,69 +9,76 @@ Adds the following headers to all responses:
 - Permissions-Policy: Restricts browser feature access
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all HTTP responses."""
+class SecurityHeadersMiddleware:
+    """Add security headers to all HTTP responses (pure ASGI, headers only)."""
 
     # Paths that serve HTML content rendered inside the CRM's iframe previews.
     # These get frame-ancestors set to the CRM origin instead of 'none'.
     IFRAME_ALLOWED_PATHS = ("/api/v2/documents/", "/api/v2/reference-docs/")
     IFRAME_ALLOWED_ORIGIN = "https://react.ecbtx.com"
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        path = request.url.path
-        is_iframe_preview = (
-            path.endswith("/html")
-            and any(path.startswith(p) for p in self.IFRAME_ALLOWED_PATHS)
-        )
-
-        if is_iframe_preview:
-            response.headers["X-Frame-Options"] = f"ALLOW-FROM {self.IFRAME_ALLOWED_ORIGIN}"
-        else:
-            response.headers["X-Frame-Options"] = "DENY"
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Force HTTPS for 1 year (Railway handles TLS termination)
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains; preload"
-        )
-
-        # Control referrer leakage — send origin only on cross-origin requests
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Restrict browser features — disable camera, mic, geolocation, payment
-        # for the API itself (frontend controls its own Permissions-Policy)
-        response.headers["Permissions-Policy"] = (
-            "camera=(), microphone=(), geolocation=(), payment=()"
-        )
+        common = {
+            # Prevent MIME type sniffing
+            "X-Content-Type-Options": "nosniff",
+            # Force HTTPS for 1 year (Railway handles TLS termination)
+            "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
+            # Control referrer leakage — send origin only on cross-origin requests
+            "Referrer-Policy": "strict-origin-when-cross-origin",
+            # Restrict browser features — disable camera, mic, geolocation, payment
+            # for the API itself (frontend controls its own Permissions-Policy)
+            "Permissions-Policy": "camera=(), microphone=(), geolocation=(), payment=()",
+        }
 
         # Content-Security-Policy for API responses
         # Restrictive since this is an API server, not serving HTML pages.
         # default-src 'none' blocks everything except what's explicitly allowed.
-        if is_iframe_preview:
-            # HTML preview endpoints need relaxed CSP so the CRM can iframe them
-            # and the HTML content can use inline styles/scripts it ships with.
-            response.headers["Content-Security-Policy"] = (
+        self._api_headers = {
+            "X-Frame-Options": "DENY",
+            **common,
+            "Content-Security-Policy": (
+                "default-src 'none'; "
+                "frame-ancestors 'none'; "
+                "base-uri 'none'; "
+                "form-action 'none'"
+            ),
+        }
+
+        # HTML preview endpoints need relaxed CSP so the CRM can iframe them
+        # and the HTML content can use inline styles/scripts it ships with.
+        self._iframe_headers = {
+            "X-Frame-Options": f"ALLOW-FROM {self.IFRAME_ALLOWED_ORIGIN}",
+            **common,
+            "Content-Security-Policy": (
                 "default-src 'self'; "
                 f"frame-ancestors {self.IFRAME_ALLOWED_ORIGIN}; "
                 "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
                 "img-src 'self' data: https:; "
                 "font-src 'self' https://fonts.gstatic.com"
-            )
-        else:
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'none'; "
-                "frame-ancestors 'none'; "
-                "base-uri 'none'; "
-                "form-action 'none'"
-            )
+            ),
+        }
+
+    def _is_iframe_preview(self, path: str) -> bool:
+        return path.endswith("/html") and path.startswith(self.IFRAME_ALLOWED_PATHS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        extra = self._iframe_headers if self._is_iframe_preview(scope["path"]) else self._api_headers
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in extra.items():
+                    headers[name] = value
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_security_headers)
@@ -6,33 +6,44 @@ enabling performance analysis in browser DevTools.
 """
 
 import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from typing import Callable
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class ServerTimingMiddleware(BaseHTTPMiddleware):
+
+class ServerTimingMiddleware:
     """
     Add Server-Timing header for performance debugging.
 
     This header is visible in browser DevTools Network tab under "Timing"
     and helps identify backend processing time vs network latency.
+
+    Pure ASGI: the time is taken when the response headers are sent, so
+    streaming bodies pass through untouched.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.perf_counter()
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
 
-        # Calculate processing time in milliseconds
-        process_time_ms = (time.perf_counter() - start_time) * 1000
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate processing time in milliseconds
+                process_time_ms = (time.perf_counter() - start_time) * 1000
+                headers = MutableHeaders(scope=message)
 
-        # Server-Timing header - visible in browser DevTools
-        # Format: metric;dur=duration;desc="description"
-        response.headers["Server-Timing"] = f"total;dur={process_time_ms:.1f};desc=\"Server Processing\""
+                # Server-Timing header - visible in browser DevTools
+                # Format: metric;dur=duration;desc="description"
+                headers["Server-Timing"] = f"total;dur={process_time_ms:.1f};desc=\"Server Processing\""
 
-        # X-Response-Time header - simpler format for logging/monitoring
-        response.headers["X-Response-Time"] = f"{process_time_ms:.1f}ms"
+                # X-Response-Time header - simpler format for logging/monitoring
+                headers["X-Response-Time"] = f"{process_time_ms:.1f}ms"
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_timing)
@@ -92,6 +92,7 @@ from app.models.septic_permit import (
     PermitVersion,
     PermitDuplicate,
     PermitImportBatch,
+    PermitCustomerMatchKey,
 )
 
 # Book & Pay Bookings
@@ -143,6 +144,16 @@ from app.models.social_integrations import SocialIntegration, SocialReview
 
 # Work Order Audit Log
 from app.models.work_order_audit import WorkOrderAuditLog
+# Day planner proposals
+from app.models.dispatch_plan import DispatchPlan
+# Shared geocode cache
+from app.models.geocode_cache import GeocodeCache
+# Scheduled job run history
+from app.models.job_run import JobRun
+# Durable AI analysis queue
+from app.models.ai_job import AIJob
+# Startup schema setup fingerprint
+from app.models.schema_state import SchemaState
 # Workflow Automation Engine
 from app.models.workflow_automation import WorkflowAutomation, WorkflowExecution
 # Custom Report Builder
@@ -320,6 +331,7 @@ __all__ = [
     "PermitVersion",
     "PermitDuplicate",
     "PermitImportBatch",
+    "PermitCustomerMatchKey",
     # Book & Pay Bookings
     "Booking",
     # Service Intervals (Recurring Services)
@@ -362,6 +374,16 @@ __all__ = [
     "SocialReview",
     # Work Order Audit Log
     "WorkOrderAuditLog",
+    # Day planner proposals
+    "DispatchPlan",
+    # Shared geocode cache
+    "GeocodeCache",
+    # Scheduled job run history
+    "JobRun",
+    # Durable AI analysis queue
+    "AIJob",
+    # Startup schema setup fingerprint
+    "SchemaState",
     # Workflow Automation Engine
     "WorkflowAutomation",
     "WorkflowExecution",
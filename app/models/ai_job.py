@@ -0,0 +1,37 @@
+"""
+AI Job — one queued AI Interaction Analyzer run for a source row.
+
+Written by app.services.ai.queue. The unique idempotency_key
+("<channel>:<source_id>") keeps one job per interaction; re-enqueueing
+a finished job queues it again. Workers claim queued rows with
+SELECT ... FOR UPDATE SKIP LOCKED and hold a lease (locked_until) while
+running, so a job whose worker died is claimed again once the lease
+lapses. Jobs that fail AI_QUEUE_MAX_ATTEMPTS times are left as "dead".
+"""
+import uuid
+
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class AIJob(Base):
+    __tablename__ = "ai_jobs"
+    __table_args__ = (Index("ix_ai_jobs_status_run_after", "status", "run_after"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    idempotency_key = Column(String(100), nullable=False, unique=True)
+    source_id = Column(UUID(as_uuid=True), nullable=False)
+    channel = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<AIJob {self.idempotency_key} {self.status} attempts={self.attempts}>"
@@ -1,9 +1,10 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, Date, Numeric, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.ext.hybrid import hybrid_property
 from app.database import Base
+from app.utils.phone_normalization import phone_last10
 import uuid
 import uuid as uuid_module
 
@@ -19,6 +20,8 @@ class Customer(Base):
     last_name = Column(String(100))
     email = Column(String(255), index=True)
     phone = Column(String(20))
+    # US 10-digit form of phone, kept in sync by _sync_phone_last10 (caller-ID lookups)
+    phone_last10 = Column(String(10), index=True)
 
     # Address
     address_line1 = Column(String(255))
@@ -118,6 +121,11 @@ class Customer(Base):
         overlaps="parent",
     )
 
+    @validates("phone")
+    def _sync_phone_last10(self, key, value):
+        self.phone_last10 = phone_last10(value) or None
+        return value
+
     def __repr__(self):
         return f"<Customer {self.first_name} {self.last_name}>"
 
@@ -0,0 +1,39 @@
+"""
+Dispatch Plan — a proposed assignment of one day's unassigned jobs to technicians.
+
+Written by the day planner (app.services.day_planner) and applied to the
+work orders only when a dispatcher accepts it.
+"""
+from sqlalchemy import Column, String, DateTime, Date, Float, Text, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+import uuid
+
+
+class DispatchPlan(Base):
+    __tablename__ = "dispatch_plans"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    plan_date = Column(Date, nullable=False, index=True)
+
+    # planning, proposed, accepted, superseded, failed
+    status = Column(String(20), nullable=False, default="planning", index=True)
+    time_limit_seconds = Column(Float, nullable=True)
+
+    # [{"work_order_id", "technician_id", "technician_name", "sequence", "eta", "departure"}, ...]
+    assignments = Column(JSON, nullable=True)
+    # [{"work_order_id", "reason"}, ...]
+    unassigned = Column(JSON, nullable=True)
+    # Totals and per-technician miles / duration / job counts
+    summary = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_by = Column(String(100), nullable=True)  # User email, or "auto_dispatch"
+    accepted_by = Column(String(100), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    accepted_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<DispatchPlan {self.plan_date} {self.status}>"
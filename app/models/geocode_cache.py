@@ -0,0 +1,25 @@
+"""
+Geocode Cache — address -> coordinates, shared by every geocoding caller.
+
+Keyed by compute_address_hash (normalized street + locality + state), the
+same hash septic permits carry, so a permit and a customer at one address
+share an entry. A row without coordinates records a lookup that found
+nothing; those are retried once they age out (see geocoding_service).
+"""
+from sqlalchemy import Column, String, DateTime, Float, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    address_hash = Column(String(64), primary_key=True)
+    query = Column(Text, nullable=False)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    provider = Column(String(20), nullable=False, default="nominatim")  # nominatim, census, permit
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<GeocodeCache {self.address_hash[:12]} {self.latitude},{self.longitude}>"
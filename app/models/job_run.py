@@ -0,0 +1,32 @@
+"""
+Job Run — one row per fire of a scheduled background job.
+
+Written by the job scheduler (app.services.job_scheduler). The unique
+(job_name, scheduled_for) pair is what makes a fire run once across
+replicas: every replica tries to insert the row and only the one that
+succeeds runs the job. Rows also record skipped (overlapping) and missed
+(late) fires, durations and errors.
+"""
+import uuid
+
+from sqlalchemy import Column, String, DateTime, Float, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class JobRun(Base):
+    __tablename__ = "job_runs"
+    __table_args__ = (UniqueConstraint("job_name", "scheduled_for", name="uq_job_runs_job_fire"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_name = Column(String(100), nullable=False)
+    scheduled_for = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), nullable=False)  # running, succeeded, failed, skipped, missed
+    replica = Column(String(100), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<JobRun {self.job_name} {self.scheduled_for} {self.status}>"
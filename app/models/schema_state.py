@@ -0,0 +1,22 @@
+"""
+Schema State — the fingerprint of the last completed startup schema setup.
+
+Written by app.schema_setup after create_all and every ensure_* step have
+run cleanly. Startup compares the stored fingerprint with the one computed
+from the code and skips all DDL when they match.
+"""
+from sqlalchemy import Column, String, DateTime, Float
+from app.database import Base
+
+
+class SchemaState(Base):
+    __tablename__ = "schema_state"
+
+    name = Column(String(50), primary_key=True)  # "app"
+    fingerprint = Column(String(64), nullable=False)
+    applied_by = Column(String(100), nullable=True)
+    applied_at = Column(DateTime(timezone=True), nullable=False)
+    duration_seconds = Column(Float, nullable=True)
+
+    def __repr__(self):
+        return f"<SchemaState {self.name} {self.fingerprint[:12]}>"
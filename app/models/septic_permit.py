@@ -424,3 +424,32 @@ class PermitImportBatch(Base):
 
     def __repr__(self):
         return f"<PermitImportBatch(id={self.id}, source={self.source_name}, status={self.status})>"
+
+
+# ===== CUSTOMER MATCH KEYS =====
+
+
+class PermitCustomerMatchKey(Base):
+    """
+    Precomputed normalized match keys for a customer, used by the permit linker.
+
+    Rows are stamped with the customer's updated_at/created_at at the time the
+    keys were computed, so a batch run can reuse them until the customer changes.
+    """
+
+    __tablename__ = "permit_customer_match_keys"
+
+    customer_id = Column(
+        UUID(as_uuid=True), ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True
+    )
+    address_key = Column(Text, nullable=True, index=True)  # normalize_address(address_line1)
+    phone_key = Column(String(10), nullable=True, index=True)  # 10-digit US phone
+    city_key = Column(String(100), nullable=True, index=True)  # Uppercased city
+    name_key = Column(String(255), nullable=True)  # Uppercased "first last"
+
+    # Customer updated_at (or created_at) the keys were computed from
+    source_updated_at = Column(DateTime, nullable=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<PermitCustomerMatchKey(customer_id={self.customer_id})>"
@@ -1,10 +1,10 @@
-import re
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime, date
 from typing import Optional, Literal
 from decimal import Decimal
 
 from app.schemas.types import UUIDStr
+from app.utils.phone_normalization import format_us_phone, phone_digits
 
 # Valid prospect stage values
 PROSPECT_STAGE_VALUES = Literal[
@@ -12,16 +12,6 @@ PROSPECT_STAGE_VALUES = Literal[
 ]
 
 
-def _normalize_phone(phone: str) -> str:
-    """Normalize phone number to (XXX) XXX-XXXX format for US numbers."""
-    digits = re.sub(r"\D", "", phone)
-    if len(digits) == 11 and digits[0] == "1":
-        digits = digits[1:]
-    if len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-    return phone  # Return as-is if not a standard US number
-
-
 class CustomerBase(BaseModel):
     """Base customer schema."""
 
@@ -127,12 +117,12 @@ class CustomerBase(BaseModel):
             stripped = v.strip()
             if stripped == "":
                 return None
-            digits = re.sub(r"\D", "", stripped)
+            digits = phone_digits(stripped)
             if len(digits) not in (10, 11):
                 raise ValueError(
                     f"Phone number must have 10 or 11 digits, got {len(digits)}"
                 )
-            return _normalize_phone(stripped)
+            return format_us_phone(stripped)
         return v
 
 
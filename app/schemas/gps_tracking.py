@@ -279,8 +279,9 @@ class PublicTrackingInfo(BaseModel):
     # Location and ETA (if enabled)
     technician_latitude: Optional[float] = None
     technician_longitude: Optional[float] = None
-    destination_latitude: float
-    destination_longitude: float
+    # None when the service address has not been geocoded (no ETA either)
+    destination_latitude: Optional[float] = None
+    destination_longitude: Optional[float] = None
 
     # ETA details
     eta_minutes: Optional[int] = None
@@ -137,6 +137,32 @@ class BudgetSummary(BaseModel):
     paused: bool
 
 
+# ---------------------------------------------------------------------------
+# Analysis job queue (inspection of queued / dead jobs).
+# ---------------------------------------------------------------------------
+class AIJobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUIDStr
+    idempotency_key: str
+    source_id: UUIDStr
+    channel: str
+    status: Literal["queued", "running", "done", "dead"]
+    attempts: int
+    run_after: datetime
+    locked_by: Optional[str] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class AIQueueSummary(BaseModel):
+    """Returned by GET /api/v2/ai/queue/jobs."""
+
+    counts: dict[str, int]
+    jobs: list[AIJobRead]
+
+
 __all__ = [
     "ActionItemRead",
     "ActionItemUpdate",
@@ -145,4 +171,6 @@ __all__ = [
     "InteractionRead",
     "HotLeadItem",
     "BudgetSummary",
+    "AIJobRead",
+    "AIQueueSummary",
 ]
@@ -1,18 +1,8 @@
-import re
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 
 from app.schemas.types import UUIDStr
-
-
-def _normalize_phone(phone: str) -> str:
-    """Normalize phone number to (XXX) XXX-XXXX format for US numbers."""
-    digits = re.sub(r"\D", "", phone)
-    if len(digits) == 11 and digits[0] == "1":
-        digits = digits[1:]
-    if len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-    return phone  # Return as-is if not a standard US number
+from app.utils.phone_normalization import format_us_phone, phone_digits
 
 
 class TechnicianBase(BaseModel):
@@ -74,12 +64,12 @@ class TechnicianBase(BaseModel):
             stripped = v.strip()
             if stripped == "":
                 return None
-            digits = re.sub(r"\D", "", stripped)
+            digits = phone_digits(stripped)
             if len(digits) not in (10, 11):
                 raise ValueError(
                     f"Phone number must have 10 or 11 digits, got {len(digits)}"
                 )
-            return _normalize_phone(stripped)
+            return format_us_phone(stripped)
         return v
 
 
@@ -147,12 +137,12 @@ class TechnicianUpdate(BaseModel):
             stripped = v.strip()
             if stripped == "":
                 return None
-            digits = re.sub(r"\D", "", stripped)
+            digits = phone_digits(stripped)
             if len(digits) not in (10, 11):
                 raise ValueError(
                     f"Phone number must have 10 or 11 digits, got {len(digits)}"
                 )
-            return _normalize_phone(stripped)
+            return format_us_phone(stripped)
         return v
 
 
@@ -1,21 +1,30 @@
 """
-User Activity Tracker — async, fire-and-forget activity logging.
+User Activity Tracker — buffered, batched activity logging.
 
 Performance design:
-- Uses background tasks (won't slow down API responses)
-- Batches inserts when possible
+- log_activity() only enqueues the row; it never awaits the database
+- A single background writer drains the queue with multi-row INSERTs,
+  every ACTIVITY_LOG_BATCH_SIZE rows or ACTIVITY_LOG_FLUSH_MS, whichever
+  comes first (one pool checkout and one commit per batch)
+- The queue is bounded: when it is full new events are dropped and counted
+  (crm_activity_events_total{outcome="dropped"}) rather than slowing requests
+- The lifespan shutdown hook flushes whatever is still buffered
 - Skips noisy endpoints (health, metrics, static)
 - Auto-prunes records older than 90 days
 """
+import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Callable, Optional
 
-from sqlalchemy import text
+from sqlalchemy import insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.core.metrics import track_activity_events
 from app.database import async_session_maker
+from app.models.user_activity import UserActivityLog
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +45,140 @@ SKIP_PREFIXES = (
 )
 
 
-async def log_activity(
+class ActivitySink:
+    """Bounded queue of activity rows drained by one batching writer task."""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue: Optional[int] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self.batch_size = batch_size or settings.ACTIVITY_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.ACTIVITY_LOG_FLUSH_MS / 1000
+        self.max_queue = max_queue or settings.ACTIVITY_LOG_QUEUE_SIZE
+        self._session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.stats = {"written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the writer on the running loop (no-op if already running)."""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        if self._queue is None or loop is not self._loop:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._loop = loop
+        self._closing = False
+        self._task = loop.create_task(self._run(), name="activity-log-writer")
+
+    def record(self, row: dict[str, Any]) -> bool:
+        """
+        Buffer one row for the writer. Never blocks; returns False if the row
+        was dropped because the queue is full or the sink has been stopped.
+        """
+        if self._closing:
+            return self._drop()
+        if not self.running:
+            try:
+                self.start()
+            except RuntimeError:  # no running event loop
+                return self._drop()
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            return self._drop()
+        return True
+
+    async def flush(self) -> None:
+        """Wait until every buffered row has been written (or has failed)."""
+        if self.running:
+            await self._queue.join()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting rows, write what is buffered, then stop the writer."""
+        self._closing = True
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logger.warning("Activity log writer did not drain within %.0fs; %d rows lost", timeout, self._queue.qsize())
+
+    def _drop(self) -> bool:
+        self.stats["dropped"] += 1
+        track_activity_events("dropped")
+        return False
+
+    async def _run(self) -> None:
+        while not (self._closing and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                await self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _collect(self) -> list[dict[str, Any]]:
+        """Up to batch_size rows, waiting at most flush_interval after the first."""
+        try:
+            first = self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            if self._closing:
+                return []
+            try:
+                # Idle: wake up every flush_interval to notice stop()
+                first = await asyncio.wait_for(self._queue.get(), self.flush_interval)
+            except asyncio.TimeoutError:
+                return []
+
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if self._closing or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        factory = self._session_factory or async_session_maker
+        try:
+            async with factory() as db:
+                await db.execute(insert(UserActivityLog.__table__).values(batch))
+                await db.commit()
+        except Exception as e:
+            # Never let activity logging break the app
+            self.stats["failed"] += len(batch)
+            track_activity_events("failed", len(batch))
+            logger.debug(f"Activity log insert of {len(batch)} rows failed (non-critical): {e}")
+            return
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        track_activity_events("written", len(batch))
+
+
+activity_sink = ActivitySink()
+
+
+def log_activity(
     *,
     category: str,
     action: str,
@@ -56,47 +198,30 @@ async def log_activity(
     session_id: Optional[str] = None,
     entity_id: Optional[str] = None,
 ) -> None:
-    """Log a user activity event. Fire-and-forget — errors are swallowed."""
-    try:
-        async with async_session_maker() as db:
-            await db.execute(
-                text("""
-                    INSERT INTO user_activity_log
-                    (id, user_id, user_email, user_name, category, action, description,
-                     ip_address, user_agent, source, resource_type, resource_id,
-                     endpoint, http_method, status_code, response_time_ms,
-                     session_id, entity_id, created_at)
-                    VALUES
-                    (:id, :user_id, :user_email, :user_name, :category, :action, :description,
-                     :ip_address, :user_agent, :source, :resource_type, :resource_id,
-                     :endpoint, :http_method, :status_code, :response_time_ms,
-                     :session_id, :entity_id, NOW())
-                """),
-                {
-                    "id": str(uuid.uuid4()),
-                    "user_id": user_id,
-                    "user_email": user_email,
-                    "user_name": user_name,
-                    "category": category,
-                    "action": action,
-                    "description": description,
-                    "ip_address": ip_address,
-                    "user_agent": user_agent,
-                    "source": source,
-                    "resource_type": resource_type,
-                    "resource_id": resource_id,
-                    "endpoint": endpoint,
-                    "http_method": http_method,
-                    "status_code": status_code,
-                    "response_time_ms": response_time_ms,
-                    "session_id": session_id,
-                    "entity_id": entity_id,
-                },
-            )
-            await db.commit()
-    except Exception as e:
-        # Never let activity logging break the app
-        logger.debug(f"Activity log insert failed (non-critical): {e}")
+    """Log a user activity event. Fire-and-forget — buffered and written in batches."""
+    activity_sink.record(
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "user_email": user_email,
+            "user_name": user_name,
+            "category": category,
+            "action": action,
+            "description": description,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "source": source,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "endpoint": endpoint,
+            "http_method": http_method,
+            "status_code": status_code,
+            "response_time_ms": response_time_ms,
+            "session_id": session_id,
+            "entity_id": entity_id,
+            "created_at": datetime.now(timezone.utc),
+        }
+    )
 
 
 def get_client_ip(request) -> str:
@@ -22,8 +22,6 @@ from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any
 
-from anthropic import AsyncAnthropic
-
 from app.services.ai.pricing import compute_cost_usd
 from app.services.ai.prompts import (
     REPLY_SYSTEM_V1,
@@ -101,6 +99,9 @@ class AnthropicClient:
             raise ValueError(
                 "ANTHROPIC_API_KEY is required. Set it via Railway env vars."
             )
+        # The SDK's generated types take ~0.5s to import: loaded with the first client
+        from anthropic import AsyncAnthropic
+
         self._client = AsyncAnthropic(api_key=api_key)
 
     # -- public methods -----------------------------------------------------
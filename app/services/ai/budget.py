@@ -29,6 +29,10 @@ DAILY_BUDGET_USD_DEFAULT = Decimal("25.00")
 _alert_state: dict[str, str | None] = {"last_alert_date": None}
 
 
+class BudgetPaused(Exception):
+    """Raised by the worker (when asked to) if the cap stopped an analysis; the queue retries it later."""
+
+
 def _today_utc_start() -> datetime:
     """Return the UTC midnight of 'today' as a tz-aware datetime."""
     now = datetime.now(timezone.utc)
@@ -120,6 +124,7 @@ def reset_alert_state_for_tests() -> None:
 
 __all__ = [
     "DAILY_BUDGET_USD_DEFAULT",
+    "BudgetPaused",
     "get_cap_usd",
     "get_today_spend_usd",
     "is_paused",
@@ -1,44 +1,423 @@
-"""Fan-out queue for the AI Interaction Analyzer.
+"""Durable job queue for the AI Interaction Analyzer.
 
 Stage 2 webhooks/pollers call ``enqueue_interaction_analysis(source_id, channel)``
-with the just-written source row's ID. We schedule the worker on the asyncio
-event loop and return immediately so the caller (webhook handler / poller)
-isn't blocked by transcription + Anthropic + DB writes.
+with the just-written source row's ID. That writes an ``ai_jobs`` row and
+returns; a fixed pool of workers in each process runs the pipeline
+(``app.services.ai.worker.process_interaction``):
 
-The worker itself is in ``app.services.ai.worker.process_interaction``.
-This module is intentionally thin so it can be safely imported from any
-context (request handler, background task, scheduler).
+- One job per interaction: the row's idempotency key is
+  ``"<channel>:<source_id>"``. Enqueueing a job that is queued or running is
+  a no-op; enqueueing a finished (done/dead) one queues it again
+- Workers claim the oldest due row with ``SELECT ... FOR UPDATE SKIP LOCKED``
+  and hold a lease (``locked_until``) renewed while the job runs. A job whose
+  worker died (restart, crash) is claimed again once its lease lapses; a
+  graceful shutdown hands its in-flight jobs straight back
+- AI_QUEUE_WORKERS jobs run at once per process, and provider calls are capped
+  separately (AI_ANTHROPIC_CONCURRENCY, AI_DEEPGRAM_CONCURRENCY) through
+  ``provider_slot``
+- No job is claimed while the daily AI budget is spent
+- Failures are retried with exponential backoff and full jitter; after
+  AI_QUEUE_MAX_ATTEMPTS runs a job is left "dead" for inspection
+  (GET /ai/queue/jobs?status=dead) and can be re-queued by hand
+- Metrics: crm_ai_queue_depth, crm_ai_queue_oldest_seconds,
+  crm_ai_jobs_total{outcome}
 """
 from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
 from uuid import UUID
 
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.metrics import track_ai_job, track_ai_queue
+from app.database import async_session_maker
+from app.models.ai_job import AIJob
+from app.services.ai import budget as budget_module
+
 logger = logging.getLogger(__name__)
 
+RETRY_BASE_SECONDS = 30.0
+RETRY_MAX_SECONDS = 3600.0
+# Idle workers look for due jobs this often (an enqueue in this process wakes them at once)
+POLL_SECONDS = 5.0
+# A spent budget is re-checked this often
+BUDGET_RECHECK_SECONDS = 60.0
+# A job the budget stopped mid-run is tried again this much later, without using an attempt
+BUDGET_DEFER_SECONDS = 600.0
 
-async def enqueue_interaction_analysis(source_id: UUID, channel: str) -> None:
-    """Schedule the worker to run on the source row. Idempotent.
+Handler = Callable[[UUID, str], Awaitable[None]]
 
-    We use ``asyncio.create_task`` so callers (webhooks, pollers) return
-    immediately. The worker is wrapped in ``_run_worker_safely`` so a
-    crash in the pipeline never escapes to the caller's event loop.
-    """
-    asyncio.create_task(_run_worker_safely(source_id, channel))
+_PROVIDER_LIMITS = {
+    "anthropic": lambda: settings.AI_ANTHROPIC_CONCURRENCY,
+    "deepgram": lambda: settings.AI_DEEPGRAM_CONCURRENCY,
+}
+_provider_slots: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def provider_slot(provider: str) -> asyncio.Semaphore:
+    """The semaphore capping this process's concurrent calls to provider ("anthropic", "deepgram")."""
+    loop = asyncio.get_running_loop()
+    held = _provider_slots.get(provider)
+    if held is None or held[0] is not loop:
+        held = (loop, asyncio.Semaphore(_PROVIDER_LIMITS[provider]()))
+        _provider_slots[provider] = held
+    return held[1]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@lru_cache(maxsize=None)
+def _enqueue_statement(dialect: str):
+    """The idempotent enqueue, built once per dialect so its compiled form is cached."""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(AIJob)
+    return stmt.on_conflict_do_update(
+        index_elements=[AIJob.idempotency_key],
+        set_={
+            "status": "queued",
+            "attempts": 0,
+            "run_after": stmt.excluded.run_after,
+            "locked_by": None,
+            "locked_until": None,
+            "last_error": None,
+            "finished_at": None,
+        },
+        where=AIJob.status.in_(("done", "dead")),
+    )
+
+
+def _claimable(now: datetime):
+    """Due queued jobs, and running jobs whose worker stopped renewing the lease."""
+    return or_(
+        and_(AIJob.status == "queued", AIJob.run_after <= now),
+        and_(AIJob.status == "running", AIJob.locked_until < now),
+    )
+
+
+class AIJobQueue:
+    """A fixed pool of workers running ai_jobs rows for this process."""
+
+    def __init__(
+        self,
+        handler: Optional[Handler] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        retry_base: float = RETRY_BASE_SECONDS,
+        poll_seconds: float = POLL_SECONDS,
+        budget_paused: Optional[Callable[[], Awaitable[bool]]] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self._handler = handler
+        self.workers = workers or settings.AI_QUEUE_WORKERS
+        self.max_attempts = max_attempts or settings.AI_QUEUE_MAX_ATTEMPTS
+        self.lease_seconds = lease_seconds or settings.AI_QUEUE_LEASE_SECONDS
+        self.retry_base = retry_base
+        self.poll_seconds = poll_seconds
+        self._budget_paused = budget_paused
+        self._session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: list[asyncio.Task] = []
+        self._inflight: dict[UUID, AIJob] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._budget_checked = -BUDGET_RECHECK_SECONDS
+        self._budget_spent = False
+        self._closing = False
+        self.stats = {"done": 0, "retried": 0, "deferred": 0, "reclaimed": 0, "dead": 0}
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        """Start the workers and the lease keeper on the running loop (no-op if already running)."""
+        if self.running:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(), name=f"ai-queue-{n}") for n in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._keep_leases(), name="ai-queue-leases"))
+        logger.info(f"AI job queue started on {self.worker_id} with {self.workers} workers")
+
+    def wake(self) -> None:
+        """Have idle workers look for due jobs now."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop claiming; running jobs get `timeout` seconds, then go back to the queue unfinished."""
+        if not self._tasks:
+            return
+        self._closing = True
+        self.wake()
+        workers, keeper = self._tasks[:-1], self._tasks[-1]
+        _, pending = await asyncio.wait(workers, timeout=timeout)
+        for task in [*pending, keeper]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._inflight:
+            await self._release(list(self._inflight.values()))
+            self._inflight.clear()
+
+    # -- Workers ------------------------------------------------------------
+
+    async def _work(self) -> None:
+        while not self._closing:
+            # Cleared before looking, so an enqueue that commits after the look still wakes this worker
+            self._wakeup.clear()
+            try:
+                job = None if await self._paused() else await self._claim()
+            except Exception as e:
+                logger.warning(f"AI job claim failed: {e}")
+                job = None
+            if job is None:
+                await self._idle()
+            elif job.attempts > self.max_attempts:
+                # Its worker was lost on every attempt (crash, OOM, restart mid-job)
+                await self._finish(job, "dead", error=f"worker lost the job {self.max_attempts} times")
+            else:
+                await self._run(job)
 
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+        except asyncio.TimeoutError:
+            pass
 
-async def _run_worker_safely(source_id: UUID, channel: str) -> None:
-    """Run the worker, swallowing exceptions so they don't sink the event loop."""
-    try:
+    async def _run(self, job: AIJob) -> None:
+        self._inflight[job.id] = job
+        try:
+            await self._handle(job)
+        except budget_module.BudgetPaused:
+            self._budget_spent, self._budget_checked = True, asyncio.get_running_loop().time()
+            await self._finish(job, "queued", delay=BUDGET_DEFER_SECONDS, refund=True)
+        except Exception as e:
+            if job.attempts >= self.max_attempts:
+                await self._finish(job, "dead", error=repr(e))
+            else:
+                delay = random.uniform(0, min(RETRY_MAX_SECONDS, self.retry_base * 2 ** (job.attempts - 1)))
+                await self._finish(job, "queued", error=repr(e), delay=delay)
+        else:
+            await self._finish(job, "done")
+        # Not reached when cancelled: stop() hands a cancelled job back to the queue
+        self._inflight.pop(job.id, None)
+
+    async def _handle(self, job: AIJob) -> None:
+        if self._handler is not None:
+            await self._handler(job.source_id, job.channel)
+            return
         # Local import to avoid circular dep: worker -> queue -> worker.
         from app.services.ai.worker import process_interaction
 
-        await process_interaction(source_id, channel)
-    except Exception:  # noqa: BLE001 — dead-letter is logged inside the worker
-        logger.exception(
-            "Interaction worker crashed for %s:%s", channel, source_id
+        await process_interaction(job.source_id, job.channel, reraise=True)
+
+    async def _paused(self) -> bool:
+        """True while the daily AI budget is spent (checked at most every BUDGET_RECHECK_SECONDS)."""
+        now = asyncio.get_running_loop().time()
+        if now - self._budget_checked >= BUDGET_RECHECK_SECONDS:
+            self._budget_checked = now
+            if self._budget_paused is not None:
+                self._budget_spent = await self._budget_paused()
+            else:
+                async with self._sessions() as db:
+                    self._budget_spent, _ = await budget_module.is_paused(db)
+        return self._budget_spent
+
+    # -- Rows ---------------------------------------------------------------
+
+    def _sessions(self) -> AsyncSession:
+        return (self._session_factory or async_session_maker)()
+
+    async def _claim(self) -> Optional[AIJob]:
+        """Lease the oldest due job to this worker; None if there is none."""
+        now = _now()
+        async with self._sessions() as db:
+            candidate = (
+                await db.execute(
+                    select(AIJob.id, AIJob.status)
+                    .where(_claimable(now))
+                    .order_by(AIJob.run_after)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+            ).first()
+            if candidate is None:
+                return None
+            # Conditional on still being claimable: on databases without row locks another worker may have won
+            claimed = (
+                await db.execute(
+                    update(AIJob)
+                    .where(AIJob.id == candidate.id, _claimable(now))
+                    .values(
+                        status="running",
+                        attempts=AIJob.attempts + 1,
+                        locked_by=self.worker_id,
+                        locked_until=now + timedelta(seconds=self.lease_seconds),
+                    )
+                    .returning(AIJob.id, AIJob.source_id, AIJob.channel, AIJob.attempts)
+                    .execution_options(synchronize_session=False)
+                )
+            ).first()
+            await db.commit()
+        if claimed is None:
+            return None
+        if candidate.status == "running":
+            self.stats["reclaimed"] += 1
+            track_ai_job("reclaimed")
+            logger.warning(f"Re-claimed AI job {claimed.id} after its lease lapsed (attempt {claimed.attempts})")
+        return AIJob(id=claimed.id, source_id=claimed.source_id, channel=claimed.channel, attempts=claimed.attempts)
+
+    async def _finish(
+        self,
+        job: AIJob,
+        status: str,
+        error: Optional[str] = None,
+        delay: float = 0.0,
+        refund: bool = False,
+    ) -> None:
+        """Record the outcome, provided this worker still holds the job's lease."""
+        now = _now()
+        values = {"status": status, "locked_by": None, "locked_until": None}
+        if status == "queued":
+            values["run_after"] = now + timedelta(seconds=delay)
+        else:
+            values["finished_at"] = now
+        if error is not None:
+            values["last_error"] = error[:2000]
+        if refund:
+            values["attempts"] = AIJob.attempts - 1
+        try:
+            async with self._sessions() as db:
+                result = await db.execute(
+                    update(AIJob)
+                    .where(AIJob.id == job.id, AIJob.locked_by == self.worker_id, AIJob.attempts == job.attempts)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Could not record AI job {job.id} as {status}: {e}")
+            return
+        if result.rowcount == 0:
+            logger.warning(f"AI job {job.id} was re-claimed elsewhere before it finished here")
+            return
+        outcome = {"queued": "deferred" if refund else "retried"}.get(status, status)
+        self.stats[outcome] += 1
+        track_ai_job(outcome)
+        if status == "dead":
+            logger.error(f"AI job {job.id} ({job.channel}) dead after {job.attempts} attempts: {error}")
+
+    async def _release(self, jobs: list[AIJob]) -> None:
+        """Hand unfinished jobs back to the queue at shutdown; the interrupted run doesn't count."""
+        async with self._sessions() as db:
+            await db.execute(
+                update(AIJob)
+                .where(AIJob.id.in_([job.id for job in jobs]), AIJob.locked_by == self.worker_id)
+                .values(status="queued", run_after=_now(), locked_by=None, locked_until=None,
+                        attempts=AIJob.attempts - 1)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        logger.info(f"Returned {len(jobs)} unfinished AI jobs to the queue")
+
+    async def _keep_leases(self) -> None:
+        """Renew the leases of running jobs and publish queue depth and age."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                now = _now()
+                async with self._sessions() as db:
+                    if self._inflight:
+                        await db.execute(
+                            update(AIJob)
+                            .where(AIJob.id.in_(list(self._inflight)), AIJob.locked_by == self.worker_id)
+                            .values(locked_until=now + timedelta(seconds=self.lease_seconds))
+                            .execution_options(synchronize_session=False)
+                        )
+                        await db.commit()
+                    depth, oldest = (
+                        await db.execute(
+                            select(func.count(), func.min(AIJob.created_at)).where(AIJob.status == "queued")
+                        )
+                    ).one()
+                track_ai_queue(depth, (now - _utc(oldest)).total_seconds() if oldest else 0.0)
+            except Exception as e:
+                logger.warning(f"AI job lease renewal failed: {e}")
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+
+_queue: Optional[AIJobQueue] = None
+
+
+def get_ai_queue() -> AIJobQueue:
+    """Get or create this process's AI job queue."""
+    global _queue
+    if _queue is None:
+        _queue = AIJobQueue()
+    return _queue
+
+
+async def enqueue_interaction_analysis(source_id: UUID, channel: str) -> None:
+    """Queue analysis of the source row. Idempotent per interaction.
+
+    The job is persisted before this returns, so it survives a restart; the
+    caller is never blocked on transcription, Anthropic or the worker's writes.
+    """
+    channel = (channel or "").lower()
+    queue = get_ai_queue()
+    async with queue._sessions() as db:
+        await db.execute(
+            _enqueue_statement(db.get_bind().dialect.name),
+            {
+                "id": uuid.uuid4(),
+                "idempotency_key": f"{channel}:{source_id}",
+                "source_id": source_id,
+                "channel": channel,
+                "status": "queued",
+                "attempts": 0,
+                "run_after": _now(),
+            },
         )
+        await db.commit()
+    queue.wake()
+
+
+async def retry_dead_job(db: AsyncSession, job: AIJob) -> AIJob:
+    """Put a dead job back in the queue with a fresh set of attempts."""
+    job.status = "queued"
+    job.attempts = 0
+    job.run_after = _now()
+    job.finished_at = None
+    await db.commit()
+    get_ai_queue().wake()
+    return job
 
 
-__all__ = ["enqueue_interaction_analysis"]
+__all__ = [
+    "AIJobQueue",
+    "enqueue_interaction_analysis",
+    "get_ai_queue",
+    "provider_slot",
+    "retry_dead_job",
+]
@@ -26,7 +26,8 @@ Idempotent at the source-row level: a CustomerInteraction row keyed by
 
 Retry: Anthropic 429s and 529s are retried with exponential backoff
 (2s/4s/8s, max 3 attempts). On final failure an InteractionAnalysisRun
-with status="error" is persisted.
+with status="error" is persisted. Anthropic and Deepgram calls each hold a
+``provider_slot`` so the queue's workers share per-provider concurrency caps.
 """
 from __future__ import annotations
 
@@ -74,6 +75,7 @@ from app.services.ai.prompts import (
     render_reply_user_message,
     render_triage_user_message,
 )
+from app.services.ai.queue import provider_slot
 from app.services.ms365_email_service import MS365EmailService
 
 logger = logging.getLogger(__name__)
@@ -91,12 +93,14 @@ RETRY_BASE_DELAY_SECONDS = 2.0
 # ---------------------------------------------------------------------------
 # Public entry point
 # ---------------------------------------------------------------------------
-async def process_interaction(source_id: UUID, channel: str) -> None:
+async def process_interaction(source_id: UUID, channel: str, *, reraise: bool = False) -> None:
     """Main worker entry. Pulls source row, runs analysis, persists results.
 
     Idempotent: re-running on a recently-analyzed CustomerInteraction is a no-op.
-    Errors are logged + dead-lettered into ``interaction_analysis_runs``;
-    they never bubble back to the caller.
+    Errors are logged + recorded in ``interaction_analysis_runs``; they never
+    bubble back to the caller unless ``reraise`` is set (the job queue does,
+    to retry and dead-letter failed runs; a spent budget raises
+    ``budget.BudgetPaused``).
     """
     channel = (channel or "").lower()
     logger.info(
@@ -139,6 +143,8 @@ async def process_interaction(source_id: UUID, channel: str) -> None:
                     await budget_module.alert_will(today_spend, cap)
                 except Exception:  # noqa: BLE001
                     logger.exception("Budget alert email failed")
+                if reraise:
+                    raise budget_module.BudgetPaused(f"spend {today_spend} reached cap {cap}")
                 return
 
             # 4. Optional transcription (call/voicemail with audio) -------
@@ -153,6 +159,8 @@ async def process_interaction(source_id: UUID, channel: str) -> None:
             except Exception as exc:  # noqa: BLE001
                 await _record_run_error(db, interaction, "triage", TRIAGE_MODEL, TRIAGE_VERSION, exc)
                 await db.commit()
+                if reraise:
+                    raise
                 return
 
             await _persist_triage(db, interaction, triage)
@@ -206,6 +214,8 @@ async def process_interaction(source_id: UUID, channel: str) -> None:
                 score,
                 triage_data.get("intent"),
             )
+        except budget_module.BudgetPaused:
+            raise
         except Exception:  # noqa: BLE001
             logger.exception(
                 "AI worker fatal error channel=%s source_id=%s",
@@ -216,6 +226,8 @@ async def process_interaction(source_id: UUID, channel: str) -> None:
                 await db.rollback()
             except Exception:  # noqa: BLE001
                 pass
+            if reraise:
+                raise
 
 
 # ---------------------------------------------------------------------------
@@ -456,7 +468,8 @@ async def _maybe_transcribe(
 
     try:
         client = DeepgramTranscriptionClient(settings.DEEPGRAM_API_KEY)
-        result: TranscriptResult = await client.transcribe_url(interaction.content_uri)
+        async with provider_slot("deepgram"):
+            result: TranscriptResult = await client.transcribe_url(interaction.content_uri)
     except Exception:  # noqa: BLE001
         logger.exception(
             "Deepgram transcription failed for interaction %s", interaction.id
@@ -524,7 +537,8 @@ def _build_triage_payload(
 async def _call_triage_once(payload: dict[str, Any]) -> TriageResult:
     client = AnthropicClient(settings.ANTHROPIC_API_KEY)
     user_msg = render_triage_user_message(payload)
-    return await client.call_triage(user_msg)
+    async with provider_slot("anthropic"):
+        return await client.call_triage(user_msg)
 
 
 async def _call_reply_once(
@@ -532,7 +546,8 @@ async def _call_reply_once(
 ) -> ReplyResult:
     client = AnthropicClient(settings.ANTHROPIC_API_KEY)
     user_msg = render_reply_user_message(payload, triage_analysis)
-    return await client.call_reply(user_msg)
+    async with provider_slot("anthropic"):
+        return await client.call_reply(user_msg)
 
 
 async def _with_retry(
@@ -23,6 +23,8 @@ import os
 import uuid
 
 from app.config import settings
+from app.services.cache_service import cache_service
+from app.services.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -82,22 +84,17 @@ class AIGateway:
         self._client: Optional[httpx.AsyncClient] = None
 
     async def get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client with auth headers."""
+        """Get the pooled HTTP client for the AI server, with auth headers."""
         if self._client is None or self._client.is_closed:
             headers = {}
             if self.config.api_key:
                 headers["Authorization"] = f"Bearer {self.config.api_key}"
-            self._client = httpx.AsyncClient(
-                base_url=self.config.base_url,
-                timeout=self.config.timeout,
-                headers=headers,
-            )
+            self._client = get_http_client("local_ai", base_url=self.config.base_url, headers=headers)
         return self._client
 
     async def close(self):
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        """Release the HTTP client (its pooled connections are closed at shutdown)."""
+        self._client = None
 
     async def health_check(self) -> Dict[str, Any]:
         """Check if AI server is healthy."""
@@ -120,16 +117,18 @@ class AIGateway:
 
     # --- Provider routing for configurable AI providers ---
 
-    _provider_cache: Dict[str, Any] = {}
-    _provider_cache_time: float = 0
+    _PROVIDER_CACHE_KEY = "ai_gateway:provider_config"
     _CACHE_TTL: float = 300.0  # 5 minutes
 
     async def _get_provider_config(self) -> Optional[Any]:
         """Get cached provider config from DB. Returns AIProviderConfig or None."""
-        now = _time.time()
-        if now - self._provider_cache_time < self._CACHE_TTL and "config" in self._provider_cache:
-            return self._provider_cache.get("config")
+        # Cached as a 1-tuple so "no provider configured" is cached too
+        entry = await cache_service.get_or_load(
+            self._PROVIDER_CACHE_KEY, self._load_provider_config, ttl=int(self._CACHE_TTL)
+        )
+        return entry[0] if entry else None
 
+    async def _load_provider_config(self) -> Optional[tuple]:
         try:
             from app.database import async_session_maker
             from app.models.ai_provider_config import AIProviderConfig
@@ -143,18 +142,14 @@ class AIGateway:
                         AIProviderConfig.is_primary == True,
                     )
                 )
-                config = result.scalar_one_or_none()
-                self._provider_cache["config"] = config
-                self._provider_cache_time = now
-                return config
+                return (result.scalar_one_or_none(),)
         except Exception as e:
             logger.debug(f"Provider config lookup failed: {e}")
             return None
 
     def invalidate_provider_cache(self):
         """Clear the provider config cache (call after connect/disconnect)."""
-        self._provider_cache.clear()
-        self._provider_cache_time = 0
+        cache_service.invalidate_local(self._PROVIDER_CACHE_KEY)
 
     async def _should_use_claude(self, feature: str = "chat") -> bool:
         """Check if Claude should be used for a given feature."""
@@ -200,54 +195,54 @@ class AIGateway:
 
         start = _time.time()
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                content = ""
-                if "content" in data and len(data["content"]) > 0:
-                    content = data["content"][0].get("text", "")
-
-                usage = data.get("usage", {})
-                duration_ms = int((_time.time() - start) * 1000)
-
-                logger.info(f"Claude primary response: model={model}, tokens={usage}, {duration_ms}ms")
-
-                # Log usage asynchronously
-                await self._log_usage("anthropic", model, feature, usage, duration_ms)
-
-                # Update last_used_at
-                try:
-                    from app.database import async_session_maker
-                    from app.models.ai_provider_config import AIProviderConfig
-                    from sqlalchemy import select
-                    from datetime import datetime, timezone
-
-                    async with async_session_maker() as db:
-                        result = await db.execute(
-                            select(AIProviderConfig).where(AIProviderConfig.provider == "anthropic")
-                        )
-                        cfg = result.scalar_one_or_none()
-                        if cfg:
-                            cfg.last_used_at = datetime.now(timezone.utc)
-                            await db.commit()
-                except Exception:
-                    pass  # Non-critical
-
-                return {
-                    "content": content,
-                    "usage": usage,
-                    "model": model,
-                }
+            client = get_http_client("anthropic")
+            response = await client.post(
+                "https://api.anthropic.com/v1/messages",
+                headers={
+                    "x-api-key": api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                json=payload,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            content = ""
+            if "content" in data and len(data["content"]) > 0:
+                content = data["content"][0].get("text", "")
+
+            usage = data.get("usage", {})
+            duration_ms = int((_time.time() - start) * 1000)
+
+            logger.info(f"Claude primary response: model={model}, tokens={usage}, {duration_ms}ms")
+
+            # Log usage asynchronously
+            await self._log_usage("anthropic", model, feature, usage, duration_ms)
+
+            # Update last_used_at
+            try:
+                from app.database import async_session_maker
+                from app.models.ai_provider_config import AIProviderConfig
+                from sqlalchemy import select
+                from datetime import datetime, timezone
+
+                async with async_session_maker() as db:
+                    result = await db.execute(
+                        select(AIProviderConfig).where(AIProviderConfig.provider == "anthropic")
+                    )
+                    cfg = result.scalar_one_or_none()
+                    if cfg:
+                        cfg.last_used_at = datetime.now(timezone.utc)
+                        await db.commit()
+            except Exception:
+                pass  # Non-critical
+
+            return {
+                "content": content,
+                "usage": usage,
+                "model": model,
+            }
         except Exception as e:
             duration_ms = int((_time.time() - start) * 1000)
             logger.warning(f"Claude primary failed ({e}), falling back to Ollama")
@@ -381,31 +376,31 @@ class AIGateway:
             if system_prompt:
                 messages = [{"role": "system", "content": system_prompt}] + messages
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {openai_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "gpt-4o-mini",  # Fast and cheap
-                        "messages": messages,
-                        "max_tokens": max_tokens,
-                        "temperature": temperature,
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client("openai")
+            response = await client.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {openai_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "model": "gpt-4o-mini",  # Fast and cheap
+                    "messages": messages,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
 
-                content = data["choices"][0]["message"]["content"]
-                logger.info("Successfully used OpenAI fallback")
+            content = data["choices"][0]["message"]["content"]
+            logger.info("Successfully used OpenAI fallback")
 
-                return {
-                    "content": content,
-                    "usage": data.get("usage", {}),
-                    "model": "gpt-4o-mini (fallback)",
-                }
+            return {
+                "content": content,
+                "usage": data.get("usage", {}),
+                "model": "gpt-4o-mini (fallback)",
+            }
         except Exception as e:
             logger.error(f"OpenAI fallback error: {e}")
             # Try Anthropic as final fallback
@@ -447,31 +442,31 @@ class AIGateway:
             if effective_system:
                 payload["system"] = effective_system
 
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": anthropic_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client("anthropic")
+            response = await client.post(
+                "https://api.anthropic.com/v1/messages",
+                headers={
+                    "x-api-key": anthropic_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                json=payload,
+            )
+            response.raise_for_status()
+            data = response.json()
 
-                # Extract content from Anthropic response
-                content = ""
-                if "content" in data and len(data["content"]) > 0:
-                    content = data["content"][0].get("text", "")
+            # Extract content from Anthropic response
+            content = ""
+            if "content" in data and len(data["content"]) > 0:
+                content = data["content"][0].get("text", "")
 
-                logger.info("Successfully used Anthropic fallback")
+            logger.info("Successfully used Anthropic fallback")
 
-                return {
-                    "content": content,
-                    "usage": data.get("usage", {}),
-                    "model": "claude-sonnet-4-6 (fallback)",
-                }
+            return {
+                "content": content,
+                "usage": data.get("usage", {}),
+                "model": "claude-sonnet-4-6 (fallback)",
+            }
         except Exception as e:
             logger.error(f"Anthropic fallback error: {e}")
             return {
@@ -536,23 +531,23 @@ class AIGateway:
         """
         try:
             # Use separate Whisper client (different from Ollama)
-            async with httpx.AsyncClient(timeout=self.config.timeout) as whisper_client:
-                logger.info(f"Transcribing audio from URL: {audio_url[:80]}...")
+            whisper_client = get_http_client("local_ai")
+            logger.info(f"Transcribing audio from URL: {audio_url[:80]}...")
 
-                # Use /transcribe_url endpoint with query parameters
-                response = await whisper_client.post(
-                    f"{self.config.whisper_url}/transcribe_url", params={"url": audio_url, "language": language}
-                )
-                response.raise_for_status()
+            # Use /transcribe_url endpoint with query parameters
+            response = await whisper_client.post(
+                f"{self.config.whisper_url}/transcribe_url", params={"url": audio_url, "language": language}
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                text = data.get("text", "")
-                logger.info(f"Transcription complete, length: {len(text)} chars")
-                return {
-                    "text": text,
-                    "language": data.get("language", language),
-                    "duration": data.get("duration"),
-                }
+            data = response.json()
+            text = data.get("text", "")
+            logger.info(f"Transcription complete, length: {len(text)} chars")
+            return {
+                "text": text,
+                "language": data.get("language", language),
+                "duration": data.get("duration"),
+            }
         except httpx.ConnectError as e:
             logger.warning(f"Whisper server unavailable: {e}")
             return {"text": "", "error": "connection_failed"}
@@ -580,24 +575,24 @@ class AIGateway:
             Dict with 'text' key containing transcription
         """
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as whisper_client:
-                logger.info(f"Transcribing {len(audio_data)} bytes of audio...")
+            whisper_client = get_http_client("local_ai")
+            logger.info(f"Transcribing {len(audio_data)} bytes of audio...")
 
-                # Use multipart file upload to /transcribe endpoint
-                files = {"file": (filename, audio_data, "audio/mpeg")}
-                response = await whisper_client.post(
-                    f"{self.config.whisper_url}/transcribe", files=files, params={"language": language}
-                )
-                response.raise_for_status()
+            # Use multipart file upload to /transcribe endpoint
+            files = {"file": (filename, audio_data, "audio/mpeg")}
+            response = await whisper_client.post(
+                f"{self.config.whisper_url}/transcribe", files=files, params={"language": language}
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                text = data.get("text", "")
-                logger.info(f"Transcription complete, length: {len(text)} chars")
-                return {
-                    "text": text,
-                    "language": data.get("language", language),
-                    "duration": data.get("duration"),
-                }
+            data = response.json()
+            text = data.get("text", "")
+            logger.info(f"Transcription complete, length: {len(text)} chars")
+            return {
+                "text": text,
+                "language": data.get("language", language),
+                "duration": data.get("duration"),
+            }
         except (httpx.ConnectError, httpx.ConnectTimeout) as e:
             logger.warning(f"Whisper server unavailable: {e} — falling back to Google STT")
             return await self._google_stt_fallback(audio_data, language)
@@ -0,0 +1,236 @@
+"""
+Serialization codecs for CacheService payloads stored in Redis.
+
+Codecs:
+- json: stdlib json, non-JSON types stringified (the historical format)
+- orjson: same data model as json, several times faster (needs orjson)
+- msgpack: compact binary; datetime, date, time, Decimal and UUID values
+  come back as the same types instead of strings (needs msgpack)
+
+Wire format:
+    Uncompressed json payloads are plain JSON text, byte-for-byte what the
+    cache wrote before codecs existed, so old and new workers can read each
+    other's entries. Every other payload starts with a 4-byte header:
+
+        MAGIC (0x00) | FORMAT_VERSION | codec id | flags
+
+    JSON text never starts with a NUL byte, so the two cannot be confused.
+    Flag bit 0 marks a zlib-compressed body. Payloads with an unknown format
+    version or codec id, or whose codec library is not installed on this
+    worker, raise CodecError and the caller treats them as a miss.
+
+Usage:
+    from app.services.cache_codecs import get_codec, encode, decode
+
+    raw = encode(rows, get_codec("msgpack"), compress_min_bytes=8192)
+    rows = decode(raw)
+"""
+
+import datetime as dt
+import json
+import logging
+import uuid
+import zlib
+from decimal import Decimal
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x00
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+FLAG_ZLIB = 0x01
+ZLIB_LEVEL = 1  # Cache payloads favour speed over ratio
+
+DEFAULT_CODEC = "json"
+
+
+class CodecError(ValueError):
+    """A cached payload could not be decoded by this worker."""
+
+
+class JsonCodec:
+    """stdlib json; the format every cache entry used before codecs."""
+
+    name = "json"
+    codec_id = 0
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """orjson: JSON data model, faster encode/decode."""
+
+    name = "orjson"
+    codec_id = 1
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, default=str, option=self._options)
+
+    def decode(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+# msgpack extension type codes
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_TIME = 3
+_EXT_DECIMAL = 4
+_EXT_UUID = 5
+
+
+class MsgpackCodec:
+    """msgpack with extension types so temporal, Decimal and UUID values round-trip."""
+
+    name = "msgpack"
+    codec_id = 2
+
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def _default(self, obj: Any) -> Any:
+        ext = self._msgpack.ExtType
+        # datetime before date: datetime is a date subclass
+        if isinstance(obj, dt.datetime):
+            return ext(_EXT_DATETIME, obj.isoformat().encode())
+        if isinstance(obj, dt.date):
+            return ext(_EXT_DATE, obj.isoformat().encode())
+        if isinstance(obj, dt.time):
+            return ext(_EXT_TIME, obj.isoformat().encode())
+        if isinstance(obj, Decimal):
+            return ext(_EXT_DECIMAL, str(obj).encode())
+        if isinstance(obj, uuid.UUID):
+            return ext(_EXT_UUID, obj.bytes)
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        return str(obj)
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> Any:
+        if code == _EXT_DATETIME:
+            return dt.datetime.fromisoformat(data.decode())
+        if code == _EXT_DATE:
+            return dt.date.fromisoformat(data.decode())
+        if code == _EXT_TIME:
+            return dt.time.fromisoformat(data.decode())
+        if code == _EXT_DECIMAL:
+            return Decimal(data.decode())
+        if code == _EXT_UUID:
+            return uuid.UUID(bytes=data)
+        raise CodecError(f"Unknown msgpack extension type {code}")
+
+    def encode(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, default=self._default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+
+_CODEC_CLASSES = {cls.name: cls for cls in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+_CODEC_IDS = {cls.codec_id: cls.name for cls in _CODEC_CLASSES.values()}
+_codecs: dict[str, Any] = {}
+_warned: set[str] = set()
+
+
+def _load(name: str) -> Optional[Any]:
+    """Instantiate a codec once; None if its library is not installed."""
+    if name not in _codecs:
+        try:
+            _codecs[name] = _CODEC_CLASSES[name]()
+        except ImportError:
+            _codecs[name] = None
+    return _codecs[name]
+
+
+def get_codec(name: str) -> Any:
+    """
+    Codec by name, falling back to json if its library is not installed.
+
+    Raises:
+        ValueError: If the codec name is unknown
+    """
+    if name not in _CODEC_CLASSES:
+        raise ValueError(f"Unknown cache codec: {name}")
+    codec = _load(name)
+    if codec is None:
+        if name not in _warned:
+            _warned.add(name)
+            logger.warning(f"Cache codec '{name}' unavailable (package not installed), using json")
+        return _load(DEFAULT_CODEC)
+    return codec
+
+
+def available_codecs() -> list[str]:
+    """Names of codecs whose libraries are installed."""
+    return [name for name in _CODEC_CLASSES if _load(name) is not None]
+
+
+def encode(value: Any, codec: Any, compress_min_bytes: int = 0) -> bytes:
+    """
+    Serialize value for Redis.
+
+    Args:
+        value: Value to store
+        codec: Codec from get_codec()
+        compress_min_bytes: zlib-compress bodies at least this large (0 disables)
+    """
+    body = codec.encode(value)
+    flags = 0
+    if compress_min_bytes and len(body) >= compress_min_bytes:
+        body = zlib.compress(body, ZLIB_LEVEL)
+        flags |= FLAG_ZLIB
+    if codec.codec_id == JsonCodec.codec_id and not flags:
+        return body
+    return bytes((MAGIC, FORMAT_VERSION, codec.codec_id, flags)) + body
+
+
+def decode(raw: Any) -> Any:
+    """
+    Deserialize a payload written by encode() or by the pre-codec cache.
+
+    Headerless payloads are parsed as JSON; text that is not JSON is
+    returned as a string, as the cache always did.
+
+    Raises:
+        CodecError: If the payload cannot be decoded by this worker
+    """
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+
+    if not raw or raw[0] != MAGIC:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw.decode("utf-8", errors="replace")
+
+    if len(raw) < HEADER_SIZE:
+        raise CodecError("Truncated cache payload header")
+    version, codec_id, flags = raw[1], raw[2], raw[3]
+    if version != FORMAT_VERSION:
+        raise CodecError(f"Unsupported cache payload version {version}")
+    name = _CODEC_IDS.get(codec_id)
+    codec = _load(name) if name else None
+    if codec is None:
+        raise CodecError(f"Cache codec id {codec_id} not available")
+
+    body = raw[HEADER_SIZE:]
+    try:
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        return codec.decode(body)
+    except CodecError:
+        raise
+    except Exception as e:
+        raise CodecError(f"Corrupt {name} cache payload: {e}") from e
@@ -1,11 +1,15 @@
 """
-Redis cache service with circuit breaker pattern.
+Two-tier cache service: in-process L1 in front of Redis, with circuit breaker.
 
 Provides distributed caching for API responses with:
 - Automatic fallback when Redis is unavailable
 - TTL presets for different data types
 - Key namespacing by domain
 - Circuit breaker to prevent cascade failures
+- Tag-based invalidation via per-tag generation counters
+- Optional bounded LRU/TTL L1 per worker, configured per namespace
+- Single-flight loading: concurrent misses on one key run the loader once
+- Per-namespace payload codec (json, orjson, msgpack) with optional compression
 
 Usage:
     from app.services.cache_service import cache_service
@@ -14,24 +18,102 @@ Usage:
     await cache_service.set("customers:123", customer_data, ttl=TTL_MEDIUM)
     customer = await cache_service.get("customers:123")
 
+    # Tag entries, then invalidate every entry carrying a tag in O(1)
+    await cache_service.set(key, rows, ttl=TTL_SHORT, tags=["workorders", f"customer:{cid}"])
+    await cache_service.invalidate_tags("workorders", "dashboard")
+
+    # Load through the cache; concurrent callers share one loader call
+    weather = await cache_service.get_or_load(f"weather:{lat}:{lon}", fetch, ttl=600)
+
     # Decorator for endpoint caching
     @cached(ttl=TTL_SHORT, key_prefix="customers")
     async def get_customers(page: int):
         ...
+
+Namespaces:
+    A key's namespace is the part before the first ":". Namespaces listed in
+    NAMESPACES (or registered with configure_namespace()) get an L1 in front of
+    Redis; "local" namespaces never touch Redis at all, which suits per-worker
+    data such as OAuth tokens or ORM objects. L1 entries are dropped in this
+    worker on delete/invalidate_tags; other workers see the change once their
+    L1 TTL runs out, so L1 TTLs are kept short for shared data. Values held in
+    L1 are shared between callers and must be treated as read-only.
+
+    A namespace also picks the codec its Redis payloads are written with (see
+    app.services.cache_codecs). Entries are decoded by the codec recorded in
+    their header, so changing a namespace's codec never breaks existing keys.
+
+Tag invalidation:
+    Every tag has a generation counter stored in Redis under "cache:tag:<tag>".
+    A tagged entry is stored together with the generations of its tags at write
+    time; on read the current generations are fetched (one MGET) and the entry
+    is treated as a miss if any of them moved on. Invalidating a tag is a single
+    INCR, so no keyspace scan is needed; stale entries simply age out via TTL.
+    A missing counter (never created, or evicted) also counts as stale, and new
+    counters start at a time-based value so they never repeat old generations.
+
+    get_or_load reads the generations before calling the loader, so an
+    invalidation that lands while the value is being loaded leaves the entry
+    stale instead of stamping the old value with the new generation. Tags
+    computed from the loaded value are only known afterwards; for those,
+    invalidate_tags also bumps a global counter, and a load that overlaps any
+    invalidation (in this worker or another) is returned but not cached.
 """
 
-import json
+import asyncio
+import fnmatch
 import logging
 import time
-from typing import Any, Optional, Callable, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Iterable, Optional, Callable, TypeVar, Union
 from functools import wraps
 from enum import IntEnum
 
+from app.core.metrics import track_cache_coalesced, track_cache_eviction, track_cache_hit, track_cache_miss
+from app.services.cache_codecs import DEFAULT_CODEC, CodecError, decode, encode, get_codec
+
 logger = logging.getLogger(__name__)
 
 # Type variable for generic return types
 T = TypeVar("T")
 
+# Redis key prefix for tag generation counters
+TAG_KEY_PREFIX = "cache:tag:"
+
+# Counter bumped by every invalidate_tags call, stored like a tag generation
+_ANY_TAG = "__any__"
+
+# Envelope marker for tagged entries
+_TAGS_FIELD = "__cache_tags__"
+_VALUE_FIELD = "value"
+
+DEFAULT_NAMESPACE = "default"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def _normalize_tags(tags: Optional[Iterable[str]]) -> list[str]:
+    """De-duplicate tags while keeping order, dropping empty ones."""
+    if not tags:
+        return []
+    return list(dict.fromkeys(str(t) for t in tags if t))
+
+
+def _text(value: Any) -> Optional[str]:
+    """Redis replies are bytes; tag generations are compared as text."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return None if value is None else str(value)
+
+
+def namespace_of(key: str) -> str:
+    """Namespace of a cache key: everything before the first ':'."""
+    head, sep, _ = key.partition(":")
+    return head if sep and head else DEFAULT_NAMESPACE
+
 
 class TTL(IntEnum):
     """Cache TTL presets in seconds."""
@@ -50,9 +132,160 @@ class CircuitState(IntEnum):
     HALF_OPEN = 2  # Testing recovery
 
 
+@dataclass(frozen=True)
+class NamespaceConfig:
+    """
+    Caching policy for one key namespace.
+
+    Attributes:
+        l1_ttl: Max seconds an entry lives in the per-worker L1 (0 disables L1)
+        max_entries: L1 capacity; least recently used entries are evicted
+        local: Keep entries in L1 only and never read or write Redis
+        codec: Serialization for Redis payloads ("json", "orjson", "msgpack")
+        compress_min_bytes: zlib-compress payloads at least this large (0 disables)
+    """
+
+    l1_ttl: float = 0
+    max_entries: int = 1000
+    local: bool = False
+    codec: str = DEFAULT_CODEC
+    compress_min_bytes: int = 0
+
+
+# Namespaces with an L1. Anything not listed here is Redis-only, which keeps
+# read-your-writes across workers for list endpoints and one-shot keys (OTP).
+NAMESPACES: dict[str, NamespaceConfig] = {
+    # Aggregated dashboards tolerate a few seconds of per-worker staleness
+    "dashboard": NamespaceConfig(l1_ttl=10, max_entries=100),
+    "executive": NamespaceConfig(l1_ttl=30, max_entries=200, codec="orjson", compress_min_bytes=16384),
+    "analytics": NamespaceConfig(l1_ttl=30, max_entries=500),
+    "fin": NamespaceConfig(l1_ttl=30, max_entries=500),
+    # Map clusters per (day, zoom, viewport), invalidated per day (app.services.geo.sources)
+    "schedule_map": NamespaceConfig(l1_ttl=10, max_entries=500),
+    # Large JSON-shaped payloads: orjson, compressed above 16 KiB
+    # (see scripts/benchmarks/bench_cache_codecs.py)
+    "workorders": NamespaceConfig(codec="orjson", compress_min_bytes=16384),
+    "inspection_forms": NamespaceConfig(codec="orjson", compress_min_bytes=16384),
+    # Per-worker caches of third-party API results and credentials
+    "google_ads": NamespaceConfig(l1_ttl=TTL.LONG, max_entries=200, local=True),
+    "ga4": NamespaceConfig(l1_ttl=TTL.LONG, max_entries=200, local=True),
+    "weather": NamespaceConfig(l1_ttl=600, max_entries=2000, local=True),
+    "pagespeed": NamespaceConfig(l1_ttl=300, max_entries=100, local=True),
+    "ms365": NamespaceConfig(l1_ttl=TTL.LONG, max_entries=10, local=True),
+    "ai_gateway": NamespaceConfig(l1_ttl=300, max_entries=10, local=True),
+    # Spatial indexes (app.services.geo.sources) hold NumPy arrays; rebuilt per worker
+    "geo": NamespaceConfig(l1_ttl=30, max_entries=50, local=True),
+    # Arrival estimates pushed by the GPS pipeline (app.services.eta_service); polled by tracking links
+    "eta": NamespaceConfig(l1_ttl=5, max_entries=5000),
+    # Auth snapshots (app.services.principal_cache): read on every request.
+    # msgpack keeps datetime/UUID column types intact for rebuilding ORM rows.
+    "principal": NamespaceConfig(l1_ttl=5, max_entries=5000, codec="msgpack"),
+}
+
+
+@dataclass
+class NamespaceStats:
+    """Hit/miss/eviction counters for one namespace."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    loads: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        hits = self.l1_hits + self.l2_hits
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups * 100, 2) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+        }
+
+
+class LocalCache:
+    """Bounded LRU with per-entry expiry, holding one namespace's L1 entries."""
+
+    def __init__(self, namespace: str, max_entries: int, stats: NamespaceStats):
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._stats = stats
+        # key -> (value, expires_at, tags)
+        self._entries: OrderedDict[str, tuple[Any, float, frozenset]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl, frozenset(tags))
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        if evicted:
+            self._stats.evictions += evicted
+            track_cache_eviction(self._namespace, evicted)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def drop_tags(self, tags: Iterable[str]) -> int:
+        tag_set = set(tags)
+        stale = [k for k, (_, _, entry_tags) in self._entries.items() if entry_tags & tag_set]
+        for k in stale:
+            del self._entries[k]
+        return len(stale)
+
+    def drop_matching(self, pattern: str) -> int:
+        stale = [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]
+        for k in stale:
+            del self._entries[k]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@dataclass
+class _Namespace:
+    name: str
+    config: NamespaceConfig
+    stats: NamespaceStats = field(default_factory=NamespaceStats)
+    l1: Optional[LocalCache] = None
+    inflight: dict[str, asyncio.Future] = field(default_factory=dict)
+    codec: Any = None
+
+    def __post_init__(self):
+        self.codec = get_codec(self.config.codec)
+        if self.config.l1_ttl > 0:
+            self.l1 = LocalCache(self.name, self.config.max_entries, self.stats)
+
+
 class CacheService:
     """
-    Redis cache service with circuit breaker pattern.
+    Two-tier cache: optional per-namespace L1 in front of Redis.
 
     Handles cache operations with automatic fallback when Redis is unavailable.
     Uses circuit breaker to prevent cascade failures.
@@ -63,6 +296,7 @@ class CacheService:
         redis_url: Optional[str] = None,
         failure_threshold: int = 5,
         recovery_timeout: int = 30,
+        namespaces: Optional[dict[str, NamespaceConfig]] = None,
     ):
         """
         Initialize cache service.
@@ -71,6 +305,7 @@ class CacheService:
             redis_url: Redis connection URL (e.g., redis://localhost:6379)
             failure_threshold: Number of failures before opening circuit
             recovery_timeout: Seconds to wait before testing recovery
+            namespaces: Per-namespace policies (defaults to NAMESPACES)
         """
         self._redis_url = redis_url
         self._client = None
@@ -85,6 +320,30 @@ class CacheService:
         # Track metrics
         self._hits = 0
         self._misses = 0
+        self._stale = 0
+        self._invalidations = 0
+        self._decode_errors = 0
+
+        # Tags invalidated in this worker while loads were running: tag -> sequence
+        # number of its last invalidation (cleared once no load is in flight)
+        self._invalidation_seq = 0
+        self._invalidated_during_loads: dict[str, int] = {}
+        self._loads_in_flight = 0
+
+        self._namespaces: dict[str, _Namespace] = {}
+        for name, config in (NAMESPACES if namespaces is None else namespaces).items():
+            self.configure_namespace(name, config)
+
+    def configure_namespace(self, name: str, config: NamespaceConfig) -> None:
+        """Set the caching policy for a namespace, discarding its L1 contents."""
+        self._namespaces[name] = _Namespace(name, config)
+
+    def _namespace(self, key: str) -> _Namespace:
+        name = namespace_of(key)
+        ns = self._namespaces.get(name)
+        if ns is None:
+            ns = self._namespaces[name] = _Namespace(name, NamespaceConfig())
+        return ns
 
     async def _get_client(self):
         """Get or create Redis client."""
@@ -97,8 +356,8 @@ class CacheService:
 
                 self._client = redis.from_url(
                     self._redis_url,
-                    encoding="utf-8",
-                    decode_responses=True,
+                    # Payloads may be binary (see cache_codecs)
+                    decode_responses=False,
                 )
             except ImportError:
                 logger.warning("redis package not installed, caching disabled")
@@ -144,9 +403,66 @@ class CacheService:
             self._circuit_state = CircuitState.OPEN
             logger.warning(f"Cache circuit breaker opened after {self._failure_count} failures")
 
+    def _record_hit(self, ns: _Namespace, tier: str):
+        self._hits += 1
+        if tier == "l1":
+            ns.stats.l1_hits += 1
+        else:
+            ns.stats.l2_hits += 1
+        track_cache_hit(ns.name, tier)
+
+    def _record_miss(self, ns: _Namespace):
+        self._misses += 1
+        ns.stats.misses += 1
+        track_cache_miss(ns.name)
+
+    async def _redis_get(self, key: str) -> tuple[bool, Any, list[str]]:
+        """Read and validate an entry from Redis. Returns (found, value, tags)."""
+        if not self._check_circuit():
+            return False, None, []
+
+        client = await self._get_client()
+        if not client:
+            return False, None, []
+
+        try:
+            value = await client.get(key)
+            if value is None:
+                # A successful Redis operation (hit or miss) resets the circuit breaker
+                self._record_success()
+                return False, None, []
+
+            try:
+                decoded = decode(value)
+            except CodecError as e:
+                # Written by a newer deploy or with a codec missing here; not a Redis fault
+                logger.debug(f"Cache decode error for {key}: {e}")
+                self._record_success()
+                self._decode_errors += 1
+                return False, None, []
+
+            tags: list[str] = []
+            if isinstance(decoded, dict) and _TAGS_FIELD in decoded:
+                stamped = decoded[_TAGS_FIELD]
+                if stamped:
+                    current = await client.mget([_tag_key(t) for t in stamped])
+                    if any(cur is None or _text(cur) != str(gen) for cur, gen in zip(current, stamped.values())):
+                        self._record_success()
+                        self._stale += 1
+                        return False, None, []
+                    tags = list(stamped)
+                decoded = decoded.get(_VALUE_FIELD)
+
+            self._record_success()
+            return True, decoded, tags
+        except Exception as e:
+            logger.debug(f"Cache get error for {key}: {e}")
+            self._record_failure()
+            return False, None, []
+
     async def get(self, key: str) -> Optional[Any]:
         """
-        Get value from cache.
+        Get value from cache, checking the namespace's L1 before Redis.
 
         Args:
             key: Cache key
@@ -154,47 +470,59 @@ class CacheService:
         Returns:
             Cached value or None if not found/error
         """
-        if not self._check_circuit():
-            return None
+        ns = self._namespace(key)
 
-        client = await self._get_client()
-        if not client:
-            return None
+        if ns.l1 is not None:
+            found, value = ns.l1.get(key)
+            if found:
+                self._record_hit(ns, "l1")
+                return value
 
-        try:
-            value = await client.get(key)
-            # A successful Redis operation (hit or miss) resets the circuit breaker
-            self._record_success()
-            if value is not None:
-                self._hits += 1
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    return value
-            self._misses += 1
+        if ns.config.local:
+            self._record_miss(ns)
             return None
-        except Exception as e:
-            logger.debug(f"Cache get error for {key}: {e}")
-            self._record_failure()
+
+        found, value, tags = await self._redis_get(key)
+        if not found:
+            self._record_miss(ns)
             return None
 
+        self._record_hit(ns, "l2")
+        if ns.l1 is not None:
+            ns.l1.set(key, value, ns.config.l1_ttl, tags)
+        return value
+
     async def set(
         self,
         key: str,
         value: Any,
         ttl: int = TTL.MEDIUM,
+        tags: Optional[Iterable[str]] = None,
+        generations: Optional[list[str]] = None,
     ) -> bool:
         """
         Set value in cache.
 
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
+            value: Value to cache (serialized for Redis with the namespace's codec)
             ttl: Time to live in seconds
+            tags: Logical tags (e.g. "workorders", "customer:<id>"); the entry
+                is dropped when any of them is passed to invalidate_tags()
+            generations: Generations of the tags read before the value was
+                produced (see get_or_load); read now if omitted
 
         Returns:
             True if successful, False otherwise
         """
+        ns = self._namespace(key)
+        tag_list = _normalize_tags(tags)
+
+        if ns.l1 is not None:
+            ns.l1.set(key, value, min(ttl, ns.config.l1_ttl), tag_list)
+            if ns.config.local:
+                return True
+
         if not self._check_circuit():
             return False
 
@@ -203,7 +531,11 @@ class CacheService:
             return False
 
         try:
-            serialized = json.dumps(value, default=str)
+            if tag_list:
+                if generations is None or len(generations) != len(tag_list):
+                    generations = await self._current_generations(client, tag_list)
+                value = {_TAGS_FIELD: dict(zip(tag_list, generations)), _VALUE_FIELD: value}
+            serialized = encode(value, ns.codec, ns.config.compress_min_bytes)
             await client.setex(key, ttl, serialized)
             self._record_success()
             return True
@@ -212,6 +544,114 @@ class CacheService:
             self._record_failure()
             return False
 
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Union[int, Callable[[Any], int]] = TTL.MEDIUM,
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]], None] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, loading and caching it on a miss.
+
+        Concurrent misses on the same key in this worker share one loader call
+        (single-flight); the others wait for its result or its exception. A
+        None result is returned but not cached, and neither is a result whose
+        tags were invalidated while it was loading.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument coroutine function producing the value
+            ttl: Time to live in seconds, or a function of the loaded value
+                returning it (for values carrying their own expiry, e.g. tokens)
+            tags: Tags for the cached entry (see set()), or a function of the
+                loaded value returning them
+        """
+        while True:
+            value = await self.get(key)
+            if value is not None:
+                return value
+
+            ns = self._namespace(key)
+            pending = ns.inflight.get(key)
+            if pending is not None:
+                ns.stats.coalesced += 1
+                track_cache_coalesced(ns.name)
+                try:
+                    return await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    if not pending.cancelled():
+                        raise
+                    # The leading caller was cancelled; try again ourselves
+                    continue
+
+            future = asyncio.get_running_loop().create_future()
+            ns.inflight[key] = future
+            ns.stats.loads += 1
+            load_seq = self._invalidation_seq
+            self._loads_in_flight += 1
+            try:
+                # Static tags: stamp the entry with the generations from before the load.
+                # Tags from the value: note the global invalidation counter instead.
+                generations = any_before = None
+                if callable(tags):
+                    any_before = await self._snapshot_generations(ns, [_ANY_TAG])
+                elif tags is not None:
+                    tags = _normalize_tags(tags)
+                    generations = await self._snapshot_generations(ns, tags)
+                value = await loader()
+                if value is not None:
+                    tag_list = _normalize_tags(tags(value) if callable(tags) else tags)
+                    if self._invalidated_since(load_seq, tag_list) or (
+                        tag_list
+                        and any_before is not None
+                        and await self._snapshot_generations(ns, [_ANY_TAG]) != any_before
+                    ):
+                        logger.debug(f"Not caching {key}: its tags were invalidated while it loaded")
+                    else:
+                        await self.set(
+                            key,
+                            value,
+                            ttl=ttl(value) if callable(ttl) else ttl,
+                            tags=tag_list,
+                            generations=generations,
+                        )
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # Mark retrieved so an unawaited future does not log a warning
+                future.exception()
+                raise
+            else:
+                future.set_result(value)
+                return value
+            finally:
+                if ns.inflight.get(key) is future:
+                    del ns.inflight[key]
+                self._loads_in_flight -= 1
+                if not self._loads_in_flight:
+                    self._invalidated_during_loads.clear()
+
+    async def _snapshot_generations(self, ns: _Namespace, tags: list[str]) -> Optional[list[str]]:
+        """Current generations of tags for a later set(), or None if Redis is not used or unavailable."""
+        if not tags or ns.config.local or not self._check_circuit():
+            return None
+        client = await self._get_client()
+        if not client:
+            return None
+        try:
+            return await self._current_generations(client, tags)
+        except Exception as e:
+            logger.debug(f"Cache generation read error for {tags}: {e}")
+            self._record_failure()
+            return None
+
+    def _invalidated_since(self, seq: int, tags: list[str]) -> bool:
+        """True if any of the tags was invalidated in this worker after sequence number seq."""
+        return any(self._invalidated_during_loads.get(tag, 0) > seq for tag in tags)
+
     async def delete(self, key: str) -> bool:
         """
         Delete value from cache.
@@ -222,6 +662,12 @@ class CacheService:
         Returns:
             True if successful, False otherwise
         """
+        ns = self._namespace(key)
+        if ns.l1 is not None:
+            ns.l1.delete(key)
+            if ns.config.local:
+                return True
+
         if not self._check_circuit():
             return False
 
@@ -238,33 +684,132 @@ class CacheService:
             self._record_failure()
             return False
 
+    def invalidate_local(self, *keys: str) -> None:
+        """Drop keys from this worker's L1 only (safe to call from sync code)."""
+        for key in keys:
+            ns = self._namespace(key)
+            if ns.l1 is not None:
+                ns.l1.delete(key)
+
+    def invalidate_local_tags(self, *tags: str) -> None:
+        """Drop entries carrying any of the tags from this worker's L1 only (sync-safe)."""
+        tag_list = _normalize_tags(tags)
+        self._invalidation_seq += 1
+        if self._loads_in_flight:
+            for tag in tag_list:
+                self._invalidated_during_loads[tag] = self._invalidation_seq
+        for ns in self._namespaces.values():
+            if ns.l1 is not None:
+                ns.l1.drop_tags(tag_list)
+
+    async def _current_generations(self, client, tags: list[str]) -> list[str]:
+        """
+        Current generation of each tag, creating missing counters.
+
+        New counters start at the current time in microseconds so a counter that
+        was evicted and recreated cannot repeat a generation stamped on an old
+        entry.
+        """
+        keys = [_tag_key(t) for t in tags]
+        seed = int(time.time() * 1_000_000)
+        pipe = client.pipeline(transaction=False)
+        for k in keys:
+            pipe.set(k, seed, nx=True)
+        pipe.mget(keys)
+        results = await pipe.execute()
+        return [_text(g) for g in results[-1]]
+
+    async def invalidate_tags(self, *tags: str) -> bool:
+        """
+        Invalidate every entry stored with any of the given tags.
+
+        Drops matching L1 entries in this worker and bumps each tag's
+        generation counter in Redis (one INCR per tag plus one for the global
+        counter, pipelined); entries stamped with an older generation read as
+        misses from now on.
+
+        Args:
+            tags: Tags to invalidate (e.g. "workorders", "customer:<id>")
+
+        Returns:
+            True if successful, False otherwise
+        """
+        tag_list = _normalize_tags(tags)
+        if not tag_list:
+            return True
+
+        self.invalidate_local_tags(*tag_list)
+
+        if not self._check_circuit():
+            return False
+
+        client = await self._get_client()
+        if not client:
+            return False
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for tag in tag_list:
+                pipe.incr(_tag_key(tag))
+            pipe.incr(_tag_key(_ANY_TAG))
+            await pipe.execute()
+            self._record_success()
+            self._invalidations += len(tag_list)
+            return True
+        except Exception as e:
+            logger.debug(f"Cache invalidate_tags error for {tag_list}: {e}")
+            self._record_failure()
+            return False
+
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching pattern.
 
+        Walks the keyspace incrementally with SCAN rather than KEYS, so Redis is
+        not blocked, but it is still O(keyspace). Prefer tags and
+        invalidate_tags() for anything on a request path.
+
         Args:
             pattern: Key pattern with wildcards (e.g., "customers:*")
 
         Returns:
             Number of keys deleted
         """
+        deleted = 0
+        for ns in self._namespaces.values():
+            if ns.l1 is not None:
+                dropped = ns.l1.drop_matching(pattern)
+                if ns.config.local:
+                    deleted += dropped
+
         if not self._check_circuit():
-            return 0
+            return deleted
 
         client = await self._get_client()
         if not client:
-            return 0
+            return deleted
 
         try:
-            keys = await client.keys(pattern)
-            if keys:
-                await client.delete(*keys)
+            batch: list[str] = []
+            async for key in client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await client.delete(*batch)
             self._record_success()
-            return len(keys) if keys else 0
+            return deleted
         except Exception as e:
             logger.debug(f"Cache delete_pattern error for {pattern}: {e}")
             self._record_failure()
-            return 0
+            return deleted
+
+    def clear_local(self) -> None:
+        """Empty every L1 in this worker."""
+        for ns in self._namespaces.values():
+            if ns.l1 is not None:
+                ns.l1.clear()
 
     def get_stats(self) -> dict:
         """Get cache statistics."""
@@ -275,8 +820,15 @@ class CacheService:
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": round(hit_rate, 2),
+            "stale": self._stale,
+            "tag_invalidations": self._invalidations,
+            "decode_errors": self._decode_errors,
             "circuit_state": self._circuit_state.name,
             "failure_count": self._failure_count,
+            "namespaces": {
+                name: {**ns.stats.as_dict(), "l1_entries": len(ns.l1) if ns.l1 is not None else 0}
+                for name, ns in sorted(self._namespaces.items())
+            },
         }
 
     @property
@@ -308,17 +860,23 @@ def cached(
     ttl: int = TTL.MEDIUM,
     key_prefix: str = "",
     key_builder: Optional[Callable[..., str]] = None,
+    tags: Union[Iterable[str], Callable[..., Iterable[str]], None] = None,
 ):
     """
     Decorator for caching function results.
 
+    Concurrent calls that miss on the same key run the function once.
+
     Args:
         ttl: Cache TTL in seconds
         key_prefix: Prefix for cache keys
         key_builder: Custom function to build cache key from args
+        tags: Tags for the cached entry, or a function building them from the
+            call's args (for per-record tags such as "customer:<id>")
 
     Example:
-        @cached(ttl=TTL.SHORT, key_prefix="customers")
+        @cached(ttl=TTL.SHORT, key_prefix="customers",
+                tags=lambda customer_id: ["customers", f"customer:{customer_id}"])
         async def get_customer(customer_id: int):
             ...
     """
@@ -338,15 +896,8 @@ def cached(
                 parts = [key_prefix, func.__name__, arg_str, kwarg_str]
                 key = ":".join(p for p in parts if p)
 
-            # Try to get from cache
-            cached_value = await service.get(key)
-            if cached_value is not None:
-                return cached_value
-
-            # Call function and cache result
-            result = await func(*args, **kwargs)
-            await service.set(key, result, ttl=ttl)
-            return result
+            entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+            return await service.get_or_load(key, lambda: func(*args, **kwargs), ttl=ttl, tags=entry_tags)
 
         return wrapper
 
@@ -1,47 +1,65 @@
 """
 WebSocket connection manager for real-time call transcription.
-Routes transcript data from Google STT to connected frontend clients.
+Routes transcript data from Google STT to connected frontend clients,
+on whichever worker they are connected to.
 """
 
 import asyncio
 import json
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import WebSocket
 
+from app.services.pubsub import BufferedSocket, PubSub, get_pubsub
+
 logger = logging.getLogger(__name__)
 
+# Pub/sub topic for transcript entries and call events
+TOPIC = "transcript"
+
 
 class TranscriptWSManager:
     """
     Manages WebSocket connections keyed by call_sid.
     Multiple frontend tabs can subscribe to the same call's transcript.
+
+    The audio stream for a call may land on a different worker than the
+    browsers watching it, so messages go through the pub/sub hub and each
+    worker fans them out to its own sockets for that call.
     """
 
-    def __init__(self):
-        # call_sid -> set of connected WebSockets
-        self._connections: dict[str, set[WebSocket]] = {}
+    def __init__(self, pubsub: Optional[PubSub] = None):
+        # call_sid -> send queue per connected WebSocket
+        self._connections: dict[str, dict[WebSocket, BufferedSocket]] = {}
         self._lock = asyncio.Lock()
+        self._pubsub = pubsub or get_pubsub()
+        self._pubsub.subscribe(TOPIC, self.deliver)
 
     async def connect(self, call_sid: str, ws: WebSocket):
         """Register a frontend WebSocket for a specific call."""
         async with self._lock:
-            if call_sid not in self._connections:
-                self._connections[call_sid] = set()
-            self._connections[call_sid].add(ws)
-        logger.info(f"Transcript WS connected for call {call_sid} (total: {len(self._connections.get(call_sid, set()))})")
+            conns = self._connections.setdefault(call_sid, {})
+            conns[ws] = BufferedSocket(ws, on_close=lambda sender: self._discard(call_sid, sender.websocket))
+        logger.info(f"Transcript WS connected for call {call_sid} (total: {len(self._connections.get(call_sid, {}))})")
 
     async def disconnect(self, call_sid: str, ws: WebSocket):
         """Remove a frontend WebSocket."""
         async with self._lock:
-            conns = self._connections.get(call_sid)
-            if conns:
-                conns.discard(ws)
-                if not conns:
-                    del self._connections[call_sid]
+            self._discard(call_sid, ws)
         logger.info(f"Transcript WS disconnected for call {call_sid}")
 
+    def _discard(self, call_sid: str, ws: WebSocket) -> None:
+        conns = self._connections.get(call_sid)
+        if not conns:
+            return
+        sender = conns.pop(ws, None)
+        if sender is not None:
+            sender.close()
+        if not conns:
+            del self._connections[call_sid]
+
     async def broadcast_transcript(
         self,
         call_sid: str,
@@ -60,47 +78,20 @@ class TranscriptWSManager:
             "isFinal": is_final,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         })
-
-        async with self._lock:
-            conns = self._connections.get(call_sid)
-            if not conns:
-                return
-            # Copy so we can release lock before I/O
-            conns_snapshot = list(conns)
-
-        dead: list[WebSocket] = []
-        for ws in conns_snapshot:
-            try:
-                await ws.send_text(message)
-            except Exception:
-                dead.append(ws)
-
-        if dead:
-            async with self._lock:
-                conns = self._connections.get(call_sid)
-                if conns:
-                    for ws in dead:
-                        conns.discard(ws)
-                    if not conns:
-                        del self._connections[call_sid]
+        await self._pubsub.publish(TOPIC, message, {"call": call_sid})
 
     async def broadcast_event(self, call_sid: str, event_type: str, data: dict) -> None:
         """Broadcast an arbitrary JSON event to all listeners for a call."""
-        async with self._lock:
-            connections = self._connections.get(call_sid, set()).copy()
-
         message = json.dumps({"type": event_type, "data": data})
-        disconnected = set()
-        for ws in connections:
-            try:
-                await ws.send_text(message)
-            except Exception:
-                disconnected.add(ws)
-
-        if disconnected:
-            async with self._lock:
-                for ws in disconnected:
-                    self._connections.get(call_sid, set()).discard(ws)
+        await self._pubsub.publish(TOPIC, message, {"call": call_sid})
+
+    def deliver(self, message: str, meta: dict) -> int:
+        """Queue a serialized message for this worker's listeners on a call (pub/sub handler)."""
+        sent = 0
+        for sender in list(self._connections.get(meta.get("call"), {}).values()):
+            if sender.offer(message):
+                sent += 1
+        return sent
 
     def has_listeners(self, call_sid: str) -> bool:
         return bool(self._connections.get(call_sid))
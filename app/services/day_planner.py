@@ -0,0 +1,321 @@
+"""
+Day planner — proposes assignments of a day's unassigned jobs to technicians.
+
+Loads the unassigned work orders for a date and the active technicians, runs
+the multi-technician solver (app.services.geo.vrp.plan_day) in a worker
+thread so the event loop keeps serving requests, and stores the result as a
+DispatchPlan with status "proposed". Nothing is assigned until a dispatcher
+accepts the plan (accept_day_plan), at which point jobs that were assigned
+by hand in the meantime are left alone.
+
+Rules, matching dispatch_service.recommend_technicians:
+- a job needs a technician whose skills include its job_type; technicians
+  with no skills listed can take anything
+- technicians start and finish at their home coordinates
+- the shift (DAY_PLANNER_SHIFT_HOURS from 08:00) is reduced by the hours of
+  jobs already assigned to the technician that day
+
+A plan runs in the process that created it. If that worker restarts mid-run
+the row stays "planning"; the next create_day_plan() marks such rows failed
+once they are older than DAY_PLANNER_STALE_AFTER.
+
+Usage:
+    plan = await create_day_plan(db, day, created_by=user.email)
+    start_day_plan(plan.id)                    # background, from a request
+    plan = await run_day_plan(plan.id)         # inline, from a scheduled task
+    result = await accept_day_plan(db, plan, accepted_by=user.email)
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.customer import Customer
+from app.models.dispatch_plan import DispatchPlan
+from app.models.technician import Technician
+from app.models.work_order import WorkOrder
+from app.services.cache_service import get_cache_service
+from app.services.geo import DayPlan, PlanTechnician, RouteStop, clock, plan_day
+
+logger = logging.getLogger(__name__)
+
+PLANNABLE_STATUSES = ("pending", "scheduled")
+DEFAULT_JOB_HOURS = 1.0
+
+_plan_tasks: set[asyncio.Task] = set()
+
+
+async def create_day_plan(
+    db: AsyncSession,
+    day: date,
+    time_limit: Optional[float] = None,
+    created_by: Optional[str] = None,
+) -> DispatchPlan:
+    """Record a plan in "planning" state; run_day_plan() or start_day_plan() fills it in."""
+    await fail_stale_plans(db)
+    plan = DispatchPlan(
+        plan_date=day,
+        status="planning",
+        time_limit_seconds=time_limit or settings.DAY_PLANNER_TIME_LIMIT,
+        created_by=created_by,
+    )
+    db.add(plan)
+    await db.commit()
+    await db.refresh(plan)
+    return plan
+
+
+async def fail_stale_plans(db: AsyncSession) -> int:
+    """Mark plans stuck in "planning" (their worker died) as failed. Does not commit."""
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.DAY_PLANNER_STALE_AFTER)
+    result = await db.execute(
+        select(DispatchPlan).where(DispatchPlan.status == "planning", DispatchPlan.created_at < cutoff)
+    )
+    stale = result.scalars().all()
+    for plan in stale:
+        plan.status = "failed"
+        plan.error = "Planning did not finish (worker restarted or stopped)"
+        plan.completed_at = now
+    if stale:
+        logger.warning(f"Marked {len(stale)} stale day plan(s) as failed")
+    return len(stale)
+
+
+def start_day_plan(plan_id: uuid.UUID) -> asyncio.Task:
+    """Run the plan in the background on the running loop."""
+    task = asyncio.get_running_loop().create_task(run_day_plan(plan_id), name=f"day-plan-{plan_id}")
+    _plan_tasks.add(task)
+    task.add_done_callback(_plan_tasks.discard)
+    return task
+
+
+async def run_day_plan(plan_id: uuid.UUID, session_maker=async_session_maker) -> Optional[DispatchPlan]:
+    """Solve a "planning" plan in its own session and store the proposal (or the error)."""
+    async with session_maker() as db:
+        plan = await db.get(DispatchPlan, plan_id)
+        if plan is None:
+            return None
+        try:
+            await _solve(db, plan)
+        except Exception as e:
+            logger.exception(f"Day plan {plan_id} failed")
+            await db.rollback()
+            plan = await db.get(DispatchPlan, plan_id)
+            plan.status = "failed"
+            plan.error = str(e)[:2000]
+            plan.completed_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(plan)
+        return plan
+
+
+async def _solve(db: AsyncSession, plan: DispatchPlan) -> None:
+    jobs = await _load_jobs(db, plan.plan_date)
+    technicians, names = await _load_technicians(db, plan.plan_date)
+
+    located = [job for job in jobs if job["stop"] is not None]
+    unassigned = [{"work_order_id": job["id"], "reason": "no coordinates"} for job in jobs if job["stop"] is None]
+    if located and technicians:
+        day = await asyncio.to_thread(
+            plan_day,
+            [job["stop"] for job in located],
+            technicians,
+            plan.time_limit_seconds or settings.DAY_PLANNER_TIME_LIMIT,
+        )
+    else:
+        day = DayPlan(
+            routes={},
+            unassigned=[job["id"] for job in located],
+            distance_miles=0.0,
+            drive_minutes=0.0,
+            duration_minutes={},
+        )
+    reason = "no technician with the skill, time window or shift capacity" if technicians else "no technicians"
+    unassigned += [{"work_order_id": job_id, "reason": reason} for job_id in day.unassigned]
+
+    plan.assignments = [
+        {
+            "work_order_id": stop.id,
+            "technician_id": tech_id,
+            "technician_name": names[tech_id],
+            "sequence": position + 1,
+            "eta": leg["eta"],
+            "departure": leg["departure"],
+        }
+        for tech_id, route in day.routes.items()
+        for position, (stop, leg) in enumerate(zip(route.stops, (leg.as_dict() for leg in route.legs)))
+    ]
+    plan.unassigned = unassigned
+    plan.summary = {
+        "job_count": len(jobs),
+        "technician_count": len(technicians),
+        "assigned_count": len(plan.assignments),
+        "unassigned_count": len(unassigned),
+        "total_distance_miles": round(day.distance_miles, 1),
+        "total_drive_minutes": round(day.drive_minutes),
+        "search_moves": day.moves,
+        "time_limit_reached": day.exhausted_budget,
+        "technicians": [
+            {
+                "technician_id": tech_id,
+                "technician_name": names[tech_id],
+                "job_count": len(route.stops),
+                "distance_miles": round(route.distance_miles, 1),
+                "duration_minutes": round(day.duration_minutes[tech_id]),
+                "finish": clock(route.finish_minute),
+            }
+            for tech_id, route in day.routes.items()
+        ],
+    }
+    plan.status = "proposed"
+    plan.completed_at = datetime.now(timezone.utc)
+
+    # A newer proposal replaces older ones for the same day
+    earlier = await db.execute(
+        select(DispatchPlan).where(
+            DispatchPlan.plan_date == plan.plan_date,
+            DispatchPlan.status == "proposed",
+            DispatchPlan.id != plan.id,
+        )
+    )
+    for old in earlier.scalars().all():
+        old.status = "superseded"
+    logger.info(
+        f"Day plan {plan.id} for {plan.plan_date}: {len(plan.assignments)} assigned, "
+        f"{len(unassigned)} unassigned, {day.distance_miles:.1f} mi"
+    )
+
+
+async def _load_jobs(db: AsyncSession, day: date) -> list[dict]:
+    """Unassigned plannable work orders for the day, each with a RouteStop (None if it has no coordinates)."""
+    result = await db.execute(
+        select(
+            WorkOrder.id,
+            WorkOrder.job_type,
+            WorkOrder.time_window_start,
+            WorkOrder.time_window_end,
+            WorkOrder.estimated_duration_hours,
+            WorkOrder.service_latitude,
+            WorkOrder.service_longitude,
+            Customer.latitude,
+            Customer.longitude,
+        )
+        .outerjoin(Customer, WorkOrder.customer_id == Customer.id)
+        .where(
+            and_(
+                WorkOrder.scheduled_date == day,
+                WorkOrder.technician_id.is_(None),
+                WorkOrder.status.in_(PLANNABLE_STATUSES),
+            )
+        )
+        .order_by(WorkOrder.id)
+    )
+    jobs = []
+    for row in result.all():
+        if row.service_latitude is not None and row.service_longitude is not None:
+            lat, lng = row.service_latitude, row.service_longitude
+        else:
+            lat, lng = row.latitude, row.longitude
+        stop = None
+        if lat is not None and lng is not None:
+            stop = RouteStop.with_window(
+                str(row.id),
+                float(lat),
+                float(lng),
+                row.time_window_start,
+                row.time_window_end,
+                service_minutes=(row.estimated_duration_hours or DEFAULT_JOB_HOURS) * 60,
+                skill=row.job_type,
+            )
+        jobs.append({"id": str(row.id), "stop": stop})
+    return jobs
+
+
+async def _load_technicians(db: AsyncSession, day: date) -> tuple[list[PlanTechnician], dict[str, str]]:
+    """Active technicians with a home location, their shifts net of work already assigned that day."""
+    booked = (
+        select(
+            WorkOrder.technician_id,
+            func.sum(func.coalesce(WorkOrder.estimated_duration_hours, DEFAULT_JOB_HOURS)).label("hours"),
+        )
+        .where(WorkOrder.scheduled_date == day, WorkOrder.technician_id.isnot(None))
+        .group_by(WorkOrder.technician_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Technician, booked.c.hours)
+        .outerjoin(booked, booked.c.technician_id == Technician.id)
+        .where(
+            Technician.is_active == True,  # noqa: E712
+            Technician.home_latitude.isnot(None),
+            Technician.home_longitude.isnot(None),
+            or_(booked.c.hours.is_(None), booked.c.hours < settings.DAY_PLANNER_SHIFT_HOURS),
+        )
+        .order_by(Technician.id)
+    )
+    technicians, names = [], {}
+    for tech, hours in result.all():
+        skills = tech.skills or []
+        if isinstance(skills, str):
+            skills = [s.strip() for s in skills.split(",") if s.strip()]
+        tech_id = str(tech.id)
+        technicians.append(
+            PlanTechnician(
+                tech_id,
+                float(tech.home_latitude),
+                float(tech.home_longitude),
+                skills=frozenset(skills),
+                shift_minutes=(settings.DAY_PLANNER_SHIFT_HOURS - float(hours or 0)) * 60,
+            )
+        )
+        names[tech_id] = f"{tech.first_name or ''} {tech.last_name or ''}".strip()
+    return technicians, names
+
+
+async def accept_day_plan(db: AsyncSession, plan: DispatchPlan, accepted_by: Optional[str] = None) -> dict:
+    """
+    Apply a proposed plan to its work orders.
+
+    Jobs that were assigned, rescheduled or moved out of a plannable status
+    since the plan was made are skipped and reported.
+    """
+    if plan.status != "proposed":
+        raise ValueError(f"Plan is {plan.status}, only proposed plans can be accepted")
+
+    ids = [uuid.UUID(a["work_order_id"]) for a in plan.assignments or []]
+    result = await db.execute(select(WorkOrder).where(WorkOrder.id.in_(ids))) if ids else None
+    work_orders = {str(wo.id): wo for wo in result.scalars().all()} if result is not None else {}
+
+    applied, skipped = [], []
+    for assignment in plan.assignments or []:
+        wo = work_orders.get(assignment["work_order_id"])
+        if (
+            wo is None
+            or wo.technician_id is not None
+            or wo.scheduled_date != plan.plan_date
+            or wo.status not in PLANNABLE_STATUSES
+        ):
+            skipped.append(assignment["work_order_id"])
+            continue
+        wo.technician_id = uuid.UUID(assignment["technician_id"])
+        wo.assigned_technician = assignment["technician_name"]
+        wo.status = "scheduled"
+        wo.updated_by = accepted_by
+        applied.append(assignment["work_order_id"])
+
+    plan.status = "accepted"
+    plan.accepted_by = accepted_by
+    plan.accepted_at = datetime.now(timezone.utc)
+    await db.commit()
+    await get_cache_service().invalidate_tags("workorders", "dashboard")
+
+    logger.info(f"Day plan {plan.id} accepted by {accepted_by}: {len(applied)} assigned, {len(skipped)} skipped")
+    return {"plan_id": str(plan.id), "assigned": applied, "skipped": skipped}
@@ -13,6 +13,8 @@ import logging
 from typing import Optional, Dict, Any
 import httpx
 
+from app.services.http_clients import get_http_client
+
 logger = logging.getLogger(__name__)
 
 # Brevo API endpoint
@@ -155,13 +157,13 @@ class EmailService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    BREVO_API_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=60.0,
-                )
+            client = get_http_client("brevo")
+            response = await client.post(
+                BREVO_API_URL,
+                json=payload,
+                headers=headers,
+                timeout=60.0,
+            )
 
             if response.status_code in (200, 201):
                 result = response.json()
@@ -265,13 +267,13 @@ class EmailService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    BREVO_API_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=30.0,
-                )
+            client = get_http_client("brevo")
+            response = await client.post(
+                BREVO_API_URL,
+                json=payload,
+                headers=headers,
+                timeout=30.0,
+            )
 
             if response.status_code in (200, 201):
                 result = response.json()
@@ -0,0 +1,255 @@
+"""
+ETA engine — arrival estimates for work orders with an assigned technician.
+
+An estimate is the straight-line miles from the technician's current
+position (app.services.technician_state: fresh GPS, then Samsara, then
+home) to the job, driven at the technician's reported speed when it is
+plausible or else a speed for the distance band, times a time-of-day
+traffic factor. These are the rules GPSTrackingService.calculate_eta used.
+
+Estimates are cached per work order under "eta:<work_order_id>" (shared
+across workers through Redis) and kept current by pushes, not by readers:
+- gps_ingest calls update_for_positions() after each committed batch
+- a technician's en-route jobs are re-estimated when they have moved more
+  than MOVE_THRESHOLD_MILES since the last estimate, or it is older than
+  MAX_AGE_SECONDS
+- each new estimate is cached and broadcast as an "eta_updated" WebSocket
+  event
+
+get_eta() returns the cached estimate, computing one on a miss;
+cached_eta() never computes, so customers polling a public tracking link
+only ever read the cache.
+
+Usage:
+    eta = await get_eta(db, work_order_id)            # dict, or None
+    eta = await cached_eta(work_order_id)             # dict, or None
+"""
+
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.customer import Customer
+from app.models.technician import Technician
+from app.models.work_order import WorkOrder
+from app.services.cache_service import get_cache_service
+from app.services.geo import haversine_miles
+from app.services.technician_state import get_technician_state
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+# Speeds by distance band when the technician's own speed is missing or implausible (mph)
+DEFAULT_CITY_SPEED = 25
+DEFAULT_RURAL_SPEED = 45
+DEFAULT_HIGHWAY_SPEED = 55
+
+MOVE_THRESHOLD_MILES = 0.25
+MAX_AGE_SECONDS = 120
+# Estimates outlive a few missed GPS batches, not a day
+CACHE_TTL_SECONDS = 30 * 60
+JOBS_TTL = 15
+
+EN_ROUTE_STATUSES = ("enroute",)
+
+# Trust in the origin position
+CONFIDENCE = {"gps": 0.85, "samsara": 0.85, "home": 0.5}
+
+
+def estimate_duration(distance_miles: float, current_speed: Optional[float]) -> int:
+    """Travel minutes for a distance (at least 1)."""
+    if current_speed and 5 < current_speed < 80:
+        speed = current_speed
+    elif distance_miles < 5:
+        speed = DEFAULT_CITY_SPEED
+    elif distance_miles < 20:
+        speed = DEFAULT_RURAL_SPEED
+    else:
+        speed = DEFAULT_HIGHWAY_SPEED
+    return max(1, int(distance_miles / speed * 60))
+
+
+def traffic_factor(at: Optional[datetime] = None) -> float:
+    """
+    Multiplier for travel time by hour of day (UTC, rush hours in Central Time).
+    1.0 = normal, 1.4 = rush hour.
+    """
+    hour = (at or datetime.utcnow()).hour
+    morning_rush = 13 <= hour <= 15  # 7-9 AM CT
+    evening_rush = hour >= 22 or hour <= 1  # 4-7 PM CT
+    if morning_rush or evening_rush:
+        return 1.4
+    if 15 <= hour <= 22:  # Daytime
+        return 1.1
+    return 1.0
+
+
+def eta_key(work_order_id: Any) -> str:
+    return f"eta:{work_order_id}"
+
+
+class ETAEngine:
+    def __init__(self):
+        # technician id -> [job dicts] for en-route work orders
+        self._jobs: dict[str, list[dict]] = {}
+        self._jobs_loaded = 0.0
+        # work order id -> (origin lat, origin lng, monotonic time) of the last estimate made here
+        self._last: dict[str, tuple[float, float, float]] = {}
+
+    async def update_for_positions(self, db: AsyncSession, positions: Iterable[tuple]) -> list[dict]:
+        """
+        Re-estimate en-route jobs of technicians that reported (technician_id, lat, lng, speed).
+
+        Returns the estimates that changed (they are cached and broadcast).
+        """
+        jobs = await self._enroute_jobs(db)
+        now = time.monotonic()
+        updated = []
+        for tech_id, lat, lng, speed in positions:
+            for job in jobs.get(str(tech_id), ()):
+                last = self._last.get(job["work_order_id"])
+                if (
+                    last is not None
+                    and now - last[2] < MAX_AGE_SECONDS
+                    and haversine_miles(last[0], last[1], lat, lng) < MOVE_THRESHOLD_MILES
+                ):
+                    continue
+                updated.append(await self._publish(job, lat, lng, "gps", speed))
+        return updated
+
+    async def estimate(self, db: AsyncSession, work_order_id: Any) -> Optional[dict]:
+        """Compute, cache and broadcast a fresh estimate for one work order."""
+        job = await _load_job(db, work_order_id)
+        if job is None:
+            return None
+        state = get_technician_state()
+        await state.refresh(db)
+        location = state.location_of(job["technician_id"])
+        if location is None:
+            return None
+        lat, lng, source, speed = location
+        return await self._publish(job, lat, lng, source, speed)
+
+    async def _publish(self, job: dict, lat: float, lng: float, source: str, speed: Optional[float]) -> dict:
+        eta = _estimate(job, lat, lng, source, speed)
+        self._last[job["work_order_id"]] = (lat, lng, time.monotonic())
+        await get_cache_service().set(eta_key(job["work_order_id"]), eta, ttl=CACHE_TTL_SECONDS)
+        try:
+            await manager.broadcast_event(event_type="eta_updated", data=eta)
+        except Exception as e:
+            logger.warning(f"Failed to broadcast ETA update: {e}")
+        return eta
+
+    async def _enroute_jobs(self, db: AsyncSession) -> dict[str, list[dict]]:
+        now = time.monotonic()
+        if now - self._jobs_loaded > JOBS_TTL:
+            jobs: dict[str, list[dict]] = {}
+            for job in await _load_jobs(db, WorkOrder.status.in_(EN_ROUTE_STATUSES)):
+                jobs.setdefault(job["technician_id"], []).append(job)
+            self._jobs, self._jobs_loaded = jobs, now
+            # Forget jobs that are no longer en route
+            active = {job["work_order_id"] for tech_jobs in jobs.values() for job in tech_jobs}
+            self._last = {wo_id: last for wo_id, last in self._last.items() if wo_id in active}
+        return self._jobs
+
+
+def _estimate(job: dict, lat: float, lng: float, source: str, speed: Optional[float]) -> dict:
+    """ETAResponse-shaped estimate (datetimes as ISO strings so it caches as JSON)."""
+    now = datetime.utcnow()
+    miles = haversine_miles(lat, lng, job["lat"], job["lng"])
+    duration = estimate_duration(miles, speed)
+    factor = traffic_factor(now)
+    adjusted = int(duration * factor)
+    return {
+        "work_order_id": job["work_order_id"],
+        "technician_id": job["technician_id"],
+        "technician_name": job["technician_name"],
+        "technician_latitude": lat,
+        "technician_longitude": lng,
+        "destination_latitude": job["lat"],
+        "destination_longitude": job["lng"],
+        "distance_miles": round(miles, 2),
+        "duration_minutes": duration,
+        "traffic_factor": factor,
+        "adjusted_duration_minutes": adjusted,
+        "estimated_arrival": (now + timedelta(minutes=adjusted)).isoformat(),
+        "confidence": CONFIDENCE[source],
+        "calculation_source": f"internal:{source}",
+        "calculated_at": now.isoformat(),
+    }
+
+
+async def _load_jobs(db: AsyncSession, *criteria) -> list[dict]:
+    """Assigned work orders with a destination (service coordinates, else the customer's)."""
+    result = await db.execute(
+        select(
+            WorkOrder.id,
+            WorkOrder.technician_id,
+            WorkOrder.service_latitude,
+            WorkOrder.service_longitude,
+            Customer.latitude,
+            Customer.longitude,
+            Technician.first_name,
+            Technician.last_name,
+        )
+        .join(Technician, WorkOrder.technician_id == Technician.id)
+        .outerjoin(Customer, WorkOrder.customer_id == Customer.id)
+        .where(*criteria)
+    )
+    jobs = []
+    for row in result.all():
+        if row.service_latitude is not None and row.service_longitude is not None:
+            lat, lng = row.service_latitude, row.service_longitude
+        else:
+            lat, lng = row.latitude, row.longitude
+        if lat is None or lng is None:
+            continue
+        jobs.append({
+            "work_order_id": str(row.id),
+            "technician_id": str(row.technician_id),
+            "technician_name": f"{row.first_name or ''} {row.last_name or ''}".strip() or "Unknown",
+            "lat": float(lat),
+            "lng": float(lng),
+        })
+    return jobs
+
+
+async def _load_job(db: AsyncSession, work_order_id: Any) -> Optional[dict]:
+    try:
+        wo_id = work_order_id if isinstance(work_order_id, uuid.UUID) else uuid.UUID(str(work_order_id))
+    except ValueError:
+        return None
+    jobs = await _load_jobs(db, WorkOrder.id == wo_id)
+    return jobs[0] if jobs else None
+
+
+_engine: Optional[ETAEngine] = None
+
+
+def get_eta_engine() -> ETAEngine:
+    """Get or create this worker's ETA engine."""
+    global _engine
+    if _engine is None:
+        _engine = ETAEngine()
+    return _engine
+
+
+async def cached_eta(work_order_id: Any) -> Optional[dict]:
+    """The cached estimate for a work order, without computing one."""
+    return await get_cache_service().get(eta_key(work_order_id))
+
+
+async def get_eta(db: AsyncSession, work_order_id: Any, recalculate: bool = False) -> Optional[dict]:
+    """The cached estimate, computed (once per worker for concurrent callers) on a miss or when asked."""
+    if recalculate:
+        return await get_eta_engine().estimate(db, work_order_id)
+    return await get_cache_service().get_or_load(
+        eta_key(work_order_id),
+        lambda: get_eta_engine().estimate(db, work_order_id),
+        ttl=CACHE_TTL_SECONDS,
+    )
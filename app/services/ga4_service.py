@@ -19,6 +19,7 @@ from typing import Optional
 import httpx
 
 from app.config import settings
+from app.services.cache_service import cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,7 @@ GA4_DATA_API_URL = "https://analyticsdata.googleapis.com/v1beta"
 GOOGLE_OAUTH_TOKEN_URL = "https://oauth2.googleapis.com/token"
 
 # Cache TTLs (seconds)
+CACHE_NAMESPACE = "ga4"
 CACHE_TTL_TRAFFIC = 900       # 15 minutes
 CACHE_TTL_SOURCES = 900       # 15 minutes
 CACHE_TTL_PAGES = 900         # 15 minutes
@@ -48,9 +50,6 @@ class GA4Service:
         self._access_token: Optional[str] = None
         self._token_expires_at: float = 0
 
-        # In-memory cache
-        self._cache: dict[str, tuple[float, object]] = {}
-
     def is_configured(self) -> bool:
         """Check if GA4 credentials are present."""
         return bool(
@@ -81,17 +80,13 @@ class GA4Service:
             self._token_expires_at = time.time() + data.get("expires_in", 3600)
             return self._access_token
 
-    def _get_cache(self, key: str, ttl: int) -> Optional[object]:
+    async def _get_cache(self, key: str) -> Optional[object]:
         """Get cached value if still valid."""
-        if key in self._cache:
-            cached_at, value = self._cache[key]
-            if time.time() - cached_at < ttl:
-                return value
-        return None
+        return await cache_service.get(f"{CACHE_NAMESPACE}:{key}")
 
-    def _set_cache(self, key: str, value: object):
+    async def _set_cache(self, key: str, value: object, ttl: int):
         """Set cache value."""
-        self._cache[key] = (time.time(), value)
+        await cache_service.set(f"{CACHE_NAMESPACE}:{key}", value, ttl=ttl)
 
     async def _run_report(self, body: dict) -> dict:
         """Execute a GA4 Data API runReport request."""
@@ -131,7 +126,7 @@ class GA4Service:
         Also returns day-by-day breakdown.
         """
         cache_key = f"traffic_{days}"
-        cached = self._get_cache(cache_key, CACHE_TTL_TRAFFIC)
+        cached = await self._get_cache(cache_key)
         if cached:
             return cached
 
@@ -220,7 +215,7 @@ class GA4Service:
                 "daily": daily,
             }
 
-            self._set_cache(cache_key, result)
+            await self._set_cache(cache_key, result, ttl=CACHE_TTL_TRAFFIC)
             return result
         except Exception as e:
             logger.error("GA4 get_traffic_summary failed: %s", str(e))
@@ -229,7 +224,7 @@ class GA4Service:
     async def get_traffic_sources(self, days: int = 7) -> dict:
         """Get traffic by source/medium."""
         cache_key = f"sources_{days}"
-        cached = self._get_cache(cache_key, CACHE_TTL_SOURCES)
+        cached = await self._get_cache(cache_key)
         if cached:
             return cached
 
@@ -271,7 +266,7 @@ class GA4Service:
                 })
 
             result = {"period_days": days, "sources": sources}
-            self._set_cache(cache_key, result)
+            await self._set_cache(cache_key, result, ttl=CACHE_TTL_SOURCES)
             return result
         except Exception as e:
             logger.error("GA4 get_traffic_sources failed: %s", str(e))
@@ -280,7 +275,7 @@ class GA4Service:
     async def get_top_pages(self, days: int = 7, limit: int = 20) -> dict:
         """Get top pages by pageviews."""
         cache_key = f"pages_{days}_{limit}"
-        cached = self._get_cache(cache_key, CACHE_TTL_PAGES)
+        cached = await self._get_cache(cache_key)
         if cached:
             return cached
 
@@ -314,7 +309,7 @@ class GA4Service:
                 })
 
             result = {"period_days": days, "pages": pages}
-            self._set_cache(cache_key, result)
+            await self._set_cache(cache_key, result, ttl=CACHE_TTL_PAGES)
             return result
         except Exception as e:
             logger.error("GA4 get_top_pages failed: %s", str(e))
@@ -323,7 +318,7 @@ class GA4Service:
     async def get_device_breakdown(self, days: int = 7) -> dict:
         """Get traffic by device category."""
         cache_key = f"devices_{days}"
-        cached = self._get_cache(cache_key, CACHE_TTL_DEVICES)
+        cached = await self._get_cache(cache_key)
         if cached:
             return cached
 
@@ -356,7 +351,7 @@ class GA4Service:
                 })
 
             result = {"period_days": days, "devices": devices}
-            self._set_cache(cache_key, result)
+            await self._set_cache(cache_key, result, ttl=CACHE_TTL_DEVICES)
             return result
         except Exception as e:
             logger.error("GA4 get_device_breakdown failed: %s", str(e))
@@ -365,7 +360,7 @@ class GA4Service:
     async def get_geo_breakdown(self, days: int = 7) -> dict:
         """Get traffic by region/city (focus on Texas)."""
         cache_key = f"geo_{days}"
-        cached = self._get_cache(cache_key, CACHE_TTL_GEO)
+        cached = await self._get_cache(cache_key)
         if cached:
             return cached
 
@@ -401,7 +396,7 @@ class GA4Service:
                 })
 
             result = {"period_days": days, "locations": locations}
-            self._set_cache(cache_key, result)
+            await self._set_cache(cache_key, result, ttl=CACHE_TTL_GEO)
             return result
         except Exception as e:
             logger.error("GA4 get_geo_breakdown failed: %s", str(e))
@@ -409,7 +404,7 @@ class GA4Service:
 
     async def get_realtime(self) -> dict:
         """Get real-time active users."""
-        cached = self._get_cache("realtime", CACHE_TTL_REALTIME)
+        cached = await self._get_cache("realtime")
         if cached:
             return cached
 
@@ -435,7 +430,7 @@ class GA4Service:
                 "by_device": by_device,
                 "timestamp": datetime.utcnow().isoformat(),
             }
-            self._set_cache("realtime", result)
+            await self._set_cache("realtime", result, ttl=CACHE_TTL_REALTIME)
             return result
         except Exception as e:
             logger.error("GA4 get_realtime failed: %s", str(e))
@@ -447,7 +442,7 @@ class GA4Service:
         E.g., last 7 days vs the 7 days before that.
         """
         cache_key = f"comparison_{days}"
-        cached = self._get_cache(cache_key, CACHE_TTL_TRAFFIC)
+        cached = await self._get_cache(cache_key)
         if cached:
             return cached
 
@@ -515,7 +510,7 @@ class GA4Service:
                 "previous_period": previous,
                 "changes": changes,
             }
-            self._set_cache(cache_key, result)
+            await self._set_cache(cache_key, result, ttl=CACHE_TTL_TRAFFIC)
             return result
         except Exception as e:
             logger.error("GA4 get_comparison failed: %s", str(e))
@@ -0,0 +1,61 @@
+"""Geo services: vectorized great-circle distances, grid spatial indexes, geofences, clustering and routing."""
+
+from app.services.geo.cluster import Cluster, cluster_radius_for_zoom, grid_clusters
+from app.services.geo.distance import (
+    EARTH_RADIUS_MILES,
+    METERS_PER_MILE,
+    bounding_box,
+    distance_matrix,
+    haversine_miles,
+    haversine_pairs,
+    haversine_to_many,
+)
+from app.services.geo.fences import Fence, FenceSet
+from app.services.geo.index import GeoIndex
+from app.services.geo.routing import (
+    AVERAGE_SPEED_MPH,
+    RouteLeg,
+    RoutePlan,
+    RouteStop,
+    clock,
+    minutes_of_day,
+    nearest_neighbor_order,
+    plan_route,
+    route_length,
+    schedule_route,
+)
+from app.services.geo.vrp import DayPlan, PlanTechnician, plan_day
+from app.services.geo.sources import ACTIVE_JOB_STATUSES, job_clusters, job_index, workorder_date_tag
+
+__all__ = [
+    "ACTIVE_JOB_STATUSES",
+    "AVERAGE_SPEED_MPH",
+    "Cluster",
+    "DayPlan",
+    "EARTH_RADIUS_MILES",
+    "Fence",
+    "FenceSet",
+    "GeoIndex",
+    "METERS_PER_MILE",
+    "PlanTechnician",
+    "RouteLeg",
+    "RoutePlan",
+    "RouteStop",
+    "bounding_box",
+    "clock",
+    "cluster_radius_for_zoom",
+    "distance_matrix",
+    "grid_clusters",
+    "haversine_miles",
+    "haversine_pairs",
+    "haversine_to_many",
+    "job_clusters",
+    "job_index",
+    "minutes_of_day",
+    "nearest_neighbor_order",
+    "plan_day",
+    "plan_route",
+    "route_length",
+    "schedule_route",
+    "workorder_date_tag",
+]
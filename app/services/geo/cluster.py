@@ -0,0 +1,92 @@
+"""
+Grid clustering of map points.
+
+Points are bucketed into cells roughly radius_miles on a side. The most
+populated cell not yet taken then seeds a cluster, which absorbs the free
+cells in its 3x3 neighbourhood whose centroid lies within radius_miles of the
+seed's centroid. The work is linear in the number of points plus the number
+of occupied cells, and seeding from the busiest cells keeps clusters centred
+on where the jobs are.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.geo.distance import EARTH_RADIUS_MILES, MILES_PER_DEGREE, Coords, haversine_miles
+
+# Web-map tiles are 256 px wide; at zoom z the equator spans 256 * 2**z pixels
+EQUATOR_MILES = 2 * math.pi * EARTH_RADIUS_MILES
+TILE_PIXELS = 256
+# Cluster radius on screen, in pixels
+CLUSTER_PIXEL_RADIUS = 60
+
+
+@dataclass
+class Cluster:
+    """A group of points: positions into the clustered arrays and their centroid."""
+
+    members: np.ndarray
+    center_lat: float
+    center_lng: float
+
+
+def cluster_radius_for_zoom(zoom: float, lat: float, pixels: int = CLUSTER_PIXEL_RADIUS) -> float:
+    """Miles spanned by `pixels` screen pixels at a web-map zoom level and latitude."""
+    return pixels * EQUATOR_MILES * math.cos(math.radians(lat)) / (TILE_PIXELS * 2**zoom)
+
+
+def grid_clusters(lats: Coords, lngs: Coords, radius_miles: float) -> list[Cluster]:
+    """Cluster points so each cluster's cells lie within radius_miles of its seed; largest first."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    if not lats.size:
+        return []
+    if radius_miles <= 0:
+        return [Cluster(np.array([i]), float(lats[i]), float(lngs[i])) for i in range(lats.size)]
+
+    cell_lat = radius_miles / MILES_PER_DEGREE
+    cell_lng = cell_lat / max(math.cos(math.radians(float(np.abs(lats).max()))), 1e-6)
+    keys = np.stack(
+        (np.floor(lats / cell_lat).astype(np.int64), np.floor(lngs / cell_lng).astype(np.int64)),
+        axis=1,
+    )
+    cells, cell_of_point = np.unique(keys, axis=0, return_inverse=True)
+    cell_of_point = cell_of_point.reshape(-1)
+    counts = np.bincount(cell_of_point)
+    sum_lat = np.bincount(cell_of_point, weights=lats)
+    sum_lng = np.bincount(cell_of_point, weights=lngs)
+    cell_index = {(int(r), int(c)): i for i, (r, c) in enumerate(cells.tolist())}
+
+    owner = np.full(len(cells), -1, dtype=np.int64)
+    seeds = []
+    # Busiest cells first; ties by cell position so the result is deterministic
+    for seed in np.lexsort((cells[:, 1], cells[:, 0], -counts)).tolist():
+        if owner[seed] >= 0:
+            continue
+        owner[seed] = len(seeds)
+        seeds.append(seed)
+        seed_lat = sum_lat[seed] / counts[seed]
+        seed_lng = sum_lng[seed] / counts[seed]
+        row, col = cells[seed]
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                other = cell_index.get((int(row) + dr, int(col) + dc))
+                if other is None or owner[other] >= 0:
+                    continue
+                other_lat = sum_lat[other] / counts[other]
+                other_lng = sum_lng[other] / counts[other]
+                if haversine_miles(seed_lat, seed_lng, other_lat, other_lng) <= radius_miles:
+                    owner[other] = owner[seed]
+
+    point_owner = owner[cell_of_point]
+    size = np.bincount(point_owner, minlength=len(seeds))
+    center_lat = np.bincount(point_owner, weights=lats, minlength=len(seeds)) / size
+    center_lng = np.bincount(point_owner, weights=lngs, minlength=len(seeds)) / size
+    order = np.argsort(point_owner, kind="stable")
+    members = np.split(order, np.cumsum(size)[:-1])
+
+    clusters = [Cluster(members[k], float(center_lat[k]), float(center_lng[k])) for k in range(len(seeds))]
+    clusters.sort(key=lambda cl: -len(cl.members))
+    return clusters
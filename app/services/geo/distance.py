@@ -0,0 +1,98 @@
+"""
+Great-circle distances, scalar and vectorized.
+
+All distances are in miles on a spherical Earth (mean radius 3958.8 mi),
+which is well inside the error of geocoded service addresses.
+"""
+
+import math
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+METERS_PER_MILE = 1609.344
+# Length of one degree of latitude; a degree of longitude is this times cos(lat)
+MILES_PER_DEGREE = EARTH_RADIUS_MILES * math.pi / 180
+
+Coords = Union[Sequence[float], np.ndarray]
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Distance between two points in miles."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _haversine(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Broadcasting haversine over arrays of degrees."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_to_many(lat: float, lng: float, lats: Coords, lngs: Coords) -> np.ndarray:
+    """Distances in miles from one point to each of many points."""
+    return _haversine(
+        np.float64(lat),
+        np.float64(lng),
+        np.asarray(lats, dtype=np.float64),
+        np.asarray(lngs, dtype=np.float64),
+    )
+
+
+def haversine_pairs(lats: Coords, lngs: Coords, other_lats: Coords, other_lngs: Coords) -> np.ndarray:
+    """Miles between point i of one set and point i of another (NaN where a coordinate is missing)."""
+    return _haversine(
+        np.asarray(lats, dtype=np.float64),
+        np.asarray(lngs, dtype=np.float64),
+        np.asarray(other_lats, dtype=np.float64),
+        np.asarray(other_lngs, dtype=np.float64),
+    )
+
+
+def distance_matrix(
+    lats: Coords,
+    lngs: Coords,
+    other_lats: Optional[Coords] = None,
+    other_lngs: Optional[Coords] = None,
+) -> np.ndarray:
+    """
+    Pairwise distances in miles, shape (len(lats), len(other_lats)).
+
+    With only one set of points the matrix is square and symmetric. Memory
+    grows with n * m, so this is meant for route-sized sets (hundreds of
+    stops); use GeoIndex to search thousands of points.
+    """
+    a_lat = np.asarray(lats, dtype=np.float64)
+    a_lng = np.asarray(lngs, dtype=np.float64)
+    if other_lats is None:
+        b_lat, b_lng = a_lat, a_lng
+    else:
+        b_lat = np.asarray(other_lats, dtype=np.float64)
+        b_lng = np.asarray(other_lngs, dtype=np.float64)
+    return _haversine(a_lat[:, None], a_lng[:, None], b_lat[None, :], b_lng[None, :])
+
+
+def bounding_box(lat: float, lng: float, radius_miles: float) -> tuple[float, float, float, float]:
+    """
+    (min_lat, min_lng, max_lat, max_lng) enclosing every point within radius_miles.
+
+    The longitude span is taken at the box edge nearest a pole, where a degree
+    of longitude is shortest. Near the poles the box covers all longitudes.
+    Boxes crossing the antimeridian are not split; none of our markets do.
+    """
+    dlat = radius_miles / MILES_PER_DEGREE
+    min_lat = max(lat - dlat, -90.0)
+    max_lat = min(lat + dlat, 90.0)
+    cos_edge = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_edge < 1e-6:
+        return min_lat, -180.0, max_lat, 180.0
+    dlng = min(radius_miles / (MILES_PER_DEGREE * cos_edge), 180.0)
+    return min_lat, lng - dlng, max_lat, lng + dlng
@@ -0,0 +1,93 @@
+"""
+Point-in-geofence tests for batches of points.
+
+A FenceSet holds circles (center + radius in meters) and polygons ([lat, lng]
+vertices) with their bounding boxes. contains() first compares every point
+with every box, then runs the exact test only on the candidates: haversine
+for circles, ray casting for polygons (the same rule as
+GPSTrackingService._point_in_polygon, so both agree on edge cases).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from app.services.geo.distance import METERS_PER_MILE, Coords, _haversine, bounding_box
+
+
+@dataclass
+class Fence:
+    """A circle (lat, lng, radius_meters) or a polygon; item is returned with matches."""
+
+    id: Any
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    radius_meters: Optional[float] = None
+    polygon: Optional[Sequence[Sequence[float]]] = None
+    item: Any = None
+
+    @property
+    def is_circle(self) -> bool:
+        return bool(self.radius_meters) and self.lat is not None and self.lng is not None
+
+
+class FenceSet:
+    """
+    Immutable set of fences. Fences that are neither a valid circle nor a
+    polygon of at least three vertices are dropped, like the single-point
+    check that treats them as never containing anything.
+
+    Usage:
+        fences = FenceSet([Fence("yard", 35.6, -87.0, radius_meters=150)])
+        inside = fences.contains(lats, lngs)   # bool, (points, fences)
+    """
+
+    def __init__(self, fences: Sequence[Fence]):
+        self.fences = [f for f in fences if f.is_circle or (f.polygon and len(f.polygon) >= 3)]
+        boxes = np.empty((len(self.fences), 4), dtype=np.float64)
+        self._polygons: dict[int, np.ndarray] = {}
+        for i, fence in enumerate(self.fences):
+            if fence.is_circle:
+                boxes[i] = bounding_box(fence.lat, fence.lng, fence.radius_meters / METERS_PER_MILE)
+            else:
+                vertices = np.asarray(fence.polygon, dtype=np.float64)
+                self._polygons[i] = vertices
+                boxes[i] = (vertices[:, 0].min(), vertices[:, 1].min(), vertices[:, 0].max(), vertices[:, 1].max())
+        self._min_lat, self._min_lng, self._max_lat, self._max_lng = boxes.T
+
+    def __len__(self) -> int:
+        return len(self.fences)
+
+    def contains(self, lats: Coords, lngs: Coords) -> np.ndarray:
+        """Boolean matrix: [p, f] is True when point p lies in fence f."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        inside = (
+            (lats[:, None] >= self._min_lat)
+            & (lats[:, None] <= self._max_lat)
+            & (lngs[:, None] >= self._min_lng)
+            & (lngs[:, None] <= self._max_lng)
+        )
+        for f in np.flatnonzero(inside.any(axis=0)).tolist():
+            points = np.flatnonzero(inside[:, f])
+            fence = self.fences[f]
+            if fence.is_circle:
+                meters = _haversine(lats[points], lngs[points], fence.lat, fence.lng) * METERS_PER_MILE
+                inside[points, f] = meters <= fence.radius_meters
+            else:
+                inside[points, f] = _in_polygon(lats[points], lngs[points], self._polygons[f])
+        return inside
+
+
+def _in_polygon(lats: np.ndarray, lngs: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+    """Ray casting over [lat, lng] vertices, one edge at a time across all points."""
+    inside = np.zeros(len(lats), dtype=bool)
+    xj, yj = vertices[-1]
+    for xi, yi in vertices.tolist():
+        crosses = (yi > lngs) != (yj > lngs)
+        if yj != yi:
+            crosses &= lats < (xj - xi) * (lngs - yi) / (yj - yi) + xi
+        inside ^= crosses
+        xj, yj = xi, yi
+    return inside
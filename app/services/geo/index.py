@@ -0,0 +1,170 @@
+"""
+Grid spatial index over points with attached payloads.
+
+Points are bucketed into square lat/lng cells and stored sorted by cell, so
+each cell is a contiguous slice. A query only computes distances for points
+in the cells overlapping its bounding box, which keeps radius, k-nearest and
+bounding-box lookups proportional to the neighbourhood instead of the whole
+data set. Indexes are immutable: rebuild one when the points change (see
+app.services.geo.sources for the cached builders).
+"""
+
+import math
+from itertools import product
+from typing import Any, Generic, Iterable, Mapping, Optional, Sequence, TypeVar
+
+import numpy as np
+
+from app.services.geo.distance import (
+    EARTH_RADIUS_MILES,
+    MILES_PER_DEGREE,
+    Coords,
+    bounding_box,
+    haversine_to_many,
+)
+
+T = TypeVar("T")
+
+DEFAULT_CELL_MILES = 5.0
+# Half the Earth's circumference: a radius that covers every point
+_MAX_RADIUS_MILES = math.pi * EARTH_RADIUS_MILES
+
+
+class GeoIndex(Generic[T]):
+    """
+    Immutable grid index of (lat, lng) points, each carrying an item.
+
+    Points with a missing (NaN) coordinate are dropped at build time.
+
+    Usage:
+        index = GeoIndex.from_records(jobs, lat_key="lat", lng_key="lng")
+        for job, miles in index.within_radius(35.61, -87.03, 30):
+            ...
+    """
+
+    def __init__(
+        self,
+        lats: Coords,
+        lngs: Coords,
+        items: Optional[Sequence[T]] = None,
+        cell_miles: float = DEFAULT_CELL_MILES,
+    ):
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        if lats.shape != lngs.shape or lats.ndim != 1:
+            raise ValueError("lats and lngs must be 1-D arrays of the same length")
+        if items is None:
+            items = range(len(lats))
+        elif len(items) != len(lats):
+            raise ValueError("items must have one entry per point")
+        if cell_miles <= 0:
+            raise ValueError("cell_miles must be positive")
+
+        keep = np.flatnonzero(np.isfinite(lats) & np.isfinite(lngs))
+        self.cell_miles = cell_miles
+        self._cell_deg = cell_miles / MILES_PER_DEGREE
+
+        rows = np.floor(lats[keep] / self._cell_deg).astype(np.int64)
+        cols = np.floor(lngs[keep] / self._cell_deg).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        keep, rows, cols = keep[order], rows[order], cols[order]
+
+        self.lats = lats[keep]
+        self.lngs = lngs[keep]
+        self.items: list[T] = [items[i] for i in keep.tolist()]
+
+        # Cell -> (start, end) slice of the sorted points
+        self._cells: dict[tuple[int, int], tuple[int, int]] = {}
+        if keep.size:
+            edges = np.flatnonzero((np.diff(rows) != 0) | (np.diff(cols) != 0)) + 1
+            starts = np.concatenate(([0], edges)).tolist()
+            ends = np.concatenate((edges, [keep.size])).tolist()
+            for start, end in zip(starts, ends):
+                self._cells[(int(rows[start]), int(cols[start]))] = (start, end)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        lat_key: str = "lat",
+        lng_key: str = "lng",
+        cell_miles: float = DEFAULT_CELL_MILES,
+    ) -> "GeoIndex[Mapping[str, Any]]":
+        """Index dict-like records by two of their keys; records without coordinates are skipped."""
+        records = list(records)
+        lats = [_coord(r.get(lat_key)) for r in records]
+        lngs = [_coord(r.get(lng_key)) for r in records]
+        return cls(lats, lngs, records, cell_miles=cell_miles)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def cell_count(self) -> int:
+        """Number of occupied grid cells."""
+        return len(self._cells)
+
+    def _candidates(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> np.ndarray:
+        """Positions of the points in every cell overlapping the box (a superset of the box)."""
+        r0, r1 = math.floor(min_lat / self._cell_deg), math.floor(max_lat / self._cell_deg)
+        c0, c1 = math.floor(min_lng / self._cell_deg), math.floor(max_lng / self._cell_deg)
+
+        # Walk whichever is smaller: the cells under the box or the occupied cells
+        if (r1 - r0 + 1) * (c1 - c0 + 1) <= len(self._cells):
+            cells = self._cells
+            spans = [cells[k] for k in product(range(r0, r1 + 1), range(c0, c1 + 1)) if k in cells]
+        else:
+            spans = [span for (r, c), span in self._cells.items() if r0 <= r <= r1 and c0 <= c <= c1]
+
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in spans])
+
+    def within_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> list[T]:
+        """Items whose point lies inside the box (edges inclusive)."""
+        idx = self._candidates(min_lat, min_lng, max_lat, max_lng)
+        lats, lngs = self.lats[idx], self.lngs[idx]
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)
+        return [self.items[i] for i in idx[inside].tolist()]
+
+    def within_radius(self, lat: float, lng: float, radius_miles: float) -> list[tuple[T, float]]:
+        """(item, miles) for every point within radius_miles, nearest first."""
+        if radius_miles < 0:
+            return []
+        idx = self._candidates(*bounding_box(lat, lng, radius_miles))
+        if not idx.size:
+            return []
+        miles = haversine_to_many(lat, lng, self.lats[idx], self.lngs[idx])
+        inside = miles <= radius_miles
+        idx, miles = idx[inside], miles[inside]
+        order = np.argsort(miles, kind="stable")
+        return [(self.items[i], d) for i, d in zip(idx[order].tolist(), miles[order].tolist())]
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        max_miles: Optional[float] = None,
+    ) -> list[tuple[T, float]]:
+        """
+        The k nearest (item, miles), nearest first, optionally no further than max_miles.
+
+        Searches a radius of one cell and doubles it until k points are found,
+        so the cost depends on how far the k-th neighbour is, not on len(self).
+        """
+        if k <= 0 or not self.items:
+            return []
+        limit = _MAX_RADIUS_MILES if max_miles is None else max_miles
+        radius = self.cell_miles
+        while True:
+            radius = min(radius, limit)
+            found = self.within_radius(lat, lng, radius)
+            if len(found) >= k or radius >= limit:
+                return found[:k]
+            radius *= 2
+
+
+def _coord(value: Any) -> float:
+    """Numeric coordinate, NaN for missing ones (Decimal columns and None included)."""
+    return math.nan if value is None else float(value)
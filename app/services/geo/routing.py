@@ -0,0 +1,439 @@
+"""
+Stop ordering over precomputed distance matrices.
+
+nearest_neighbor_order() is the greedy baseline. plan_route() builds one
+technician's route for a day: a start depot, an optional end depot, service
+times and time windows. It seeds with nearest neighbour (and, when there are
+windows, with the stops sorted by window), improves the best seed with 2-opt
+segment reversals and Or-opt segment moves until no move helps or the time
+budget runs out, and returns per-leg ETAs.
+
+The objective is minutes late first (through a large penalty), then the
+route's duration from departure to arrival at the end: driving plus waiting
+for windows to open, since service time is fixed. Without windows that is
+plain distance. An open route (no end depot) ends at its last stop.
+"""
+
+import time as _time
+from dataclasses import dataclass
+from datetime import time
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from app.services.geo.distance import distance_matrix
+
+# Average road speed for drive-time estimates (about 2 minutes per mile)
+AVERAGE_SPEED_MPH = 30.0
+# Length of a window given only its start (customers are quoted two hours)
+DEFAULT_WINDOW_MINUTES = 120
+DEFAULT_TIME_BUDGET = 0.5
+DEFAULT_DEPART_MINUTE = 8 * 60
+
+# Cost of one minute late, in minutes of route duration
+_LATE_PENALTY = 1000.0
+_EPS = 1e-9
+_OR_OPT_SEGMENTS = (1, 2, 3)
+# Candidate moves re-timed per step when there are windows
+_MAX_TRIALS = 400
+
+
+def nearest_neighbor_order(matrix: np.ndarray, start: int = 0) -> list[int]:
+    """
+    Greedy tour from node `start` over a square distance matrix.
+
+    Returns every other node in visiting order; ties go to the lowest index.
+    """
+    n = matrix.shape[0]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    order = []
+    current = start
+    for _ in range(n - 1):
+        current = int(np.argmin(np.where(visited, np.inf, matrix[current])))
+        visited[current] = True
+        order.append(current)
+    return order
+
+
+def route_length(matrix: np.ndarray, order: Sequence[int], start: int = 0) -> float:
+    """Total distance of visiting `order` after `start`."""
+    stops = np.asarray([start, *order], dtype=np.int64)
+    return float(matrix[stops[:-1], stops[1:]].sum())
+
+
+def minutes_of_day(value: Any) -> Optional[float]:
+    """Minutes after midnight of a time or "HH:MM[:SS]" string; None if missing or unparseable."""
+    if value is None:
+        return None
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute + value.second / 60
+    if isinstance(value, str):
+        try:
+            parts = value.split(":")
+            return int(parts[0]) * 60 + int(parts[1])
+        except (ValueError, IndexError):
+            return None
+    return None
+
+
+def clock(minute: float) -> str:
+    """HH:MM for minutes after midnight (hours run past 24 for overnight routes)."""
+    total = int(round(minute))
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+@dataclass
+class RouteStop:
+    """
+    A stop to visit. Window bounds are minutes after midnight; None means
+    unbounded. skill is what the day planner (geo.vrp) requires of the
+    technician, usually the job type.
+    """
+
+    id: str
+    lat: float
+    lng: float
+    service_minutes: float = 0.0
+    window_start: Optional[float] = None
+    window_end: Optional[float] = None
+    skill: Optional[str] = None
+
+    @classmethod
+    def with_window(cls, id: str, lat: float, lng: float, start: Any, end: Any = None, **kwargs) -> "RouteStop":
+        """Stop with a window from time/"HH:MM" bounds; a start alone opens a DEFAULT_WINDOW_MINUTES window."""
+        window_start = minutes_of_day(start)
+        window_end = minutes_of_day(end)
+        if window_end is None and window_start is not None:
+            window_end = window_start + DEFAULT_WINDOW_MINUTES
+        return cls(id, lat, lng, window_start=window_start, window_end=window_end, **kwargs)
+
+
+@dataclass
+class RouteLeg:
+    """Driving to one stop (stop_id None for the end depot) and the times there."""
+
+    stop_id: Optional[str]
+    distance_miles: float
+    drive_minutes: float
+    arrival_minute: float
+    wait_minutes: float
+    late_minutes: float
+    departure_minute: float
+
+    def as_dict(self) -> dict:
+        return {
+            "stop_id": self.stop_id,
+            "distance_miles": round(self.distance_miles, 2),
+            "drive_minutes": round(self.drive_minutes, 1),
+            "eta": clock(self.arrival_minute),
+            "wait_minutes": round(self.wait_minutes, 1),
+            "late_minutes": round(self.late_minutes, 1),
+            "departure": clock(self.departure_minute),
+        }
+
+
+@dataclass
+class RoutePlan:
+    """An ordered route with its legs; order holds positions into the planned stops."""
+
+    order: list[int]
+    stops: list[RouteStop]
+    legs: list[RouteLeg]
+    distance_miles: float
+    drive_minutes: float
+    late_minutes: float
+    finish_minute: float
+    seed_distance_miles: float = 0.0
+    moves: int = 0
+    exhausted_budget: bool = False
+
+
+def plan_route(
+    stops: Sequence[RouteStop],
+    start: tuple[float, float],
+    end: Optional[tuple[float, float]] = None,
+    depart_minute: float = DEFAULT_DEPART_MINUTE,
+    speed_mph: float = AVERAGE_SPEED_MPH,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    matrix: Optional[np.ndarray] = None,
+) -> RoutePlan:
+    """
+    Order stops from the start depot (and to the end depot, if any).
+
+    Args:
+        stops: Stops to visit
+        start: (lat, lng) the technician leaves from
+        end: (lat, lng) the technician finishes at; None for an open route
+        depart_minute: Departure from the start, in minutes after midnight
+        speed_mph: Average speed for drive times
+        time_budget: Seconds to spend improving the seed route
+        matrix: Precomputed miles between [start, *stops] plus end when given
+    """
+    return _router(stops, start, end, depart_minute, speed_mph, matrix).solve(time_budget)
+
+
+def schedule_route(
+    stops: Sequence[RouteStop],
+    start: tuple[float, float],
+    end: Optional[tuple[float, float]] = None,
+    depart_minute: float = DEFAULT_DEPART_MINUTE,
+    speed_mph: float = AVERAGE_SPEED_MPH,
+    matrix: Optional[np.ndarray] = None,
+) -> RoutePlan:
+    """Legs and ETAs for visiting stops in the given order (arguments as for plan_route)."""
+    router = _router(stops, start, end, depart_minute, speed_mph, matrix)
+    order = list(range(1, len(router.stops) + 1))
+    return router._plan(order, router.distance(order), exhausted=False)
+
+
+def _router(stops, start, end, depart_minute, speed_mph, matrix) -> "_Router":
+    stops = list(stops)
+    if matrix is None:
+        points = [start, *((s.lat, s.lng) for s in stops), *([end] if end is not None else [])]
+        matrix = distance_matrix([p[0] for p in points], [p[1] for p in points])
+    return _Router(stops, matrix, end is not None, depart_minute, 60.0 / speed_mph)
+
+
+class _Router:
+    """
+    Local search over node orders. Node 0 is the start, node i + 1 is
+    stops[i], and the last node is the end depot (a zero-distance dummy
+    for open routes).
+    """
+
+    def __init__(
+        self,
+        stops: list[RouteStop],
+        matrix: np.ndarray,
+        has_end: bool,
+        depart_minute: float,
+        minutes_per_mile: float,
+    ):
+        n = len(stops)
+        self.stops = stops
+        self.has_end = has_end
+        if not has_end:
+            padded = np.zeros((n + 2, n + 2))
+            padded[: n + 1, : n + 1] = matrix
+            matrix = padded
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        # Nested lists for cost(), which walks the route one scalar at a time
+        self.rows = self.matrix.tolist()
+        self.end = n + 1
+        self.depart = depart_minute
+        self.minutes_per_mile = minutes_per_mile
+        self.window_start = [None, *(s.window_start for s in stops), None]
+        self.window_end = [None, *(s.window_end for s in stops), None]
+        self.service = [0.0, *(s.service_minutes for s in stops), 0.0]
+        self.windowed = any(s.window_start is not None or s.window_end is not None for s in stops)
+        self.moves = 0
+
+    def cost(self, order: list[int]) -> tuple[float, float]:
+        """(objective, minutes late) of visiting order."""
+        m = self.rows
+        t = self.depart
+        late = 0.0
+        prev = 0
+        for node in order:
+            t += m[prev][node] * self.minutes_per_mile
+            ws = self.window_start[node]
+            if ws is not None and t < ws:
+                t = ws
+            we = self.window_end[node]
+            if we is not None and t > we:
+                late += t - we
+            t += self.service[node]
+            prev = node
+        t += m[prev][self.end] * self.minutes_per_mile
+        return late * _LATE_PENALTY + (t - self.depart), late
+
+    def solve(self, time_budget: float) -> RoutePlan:
+        deadline = _time.perf_counter() + time_budget
+        n = len(self.stops)
+        seed = nearest_neighbor_order(self.matrix[: n + 1, : n + 1])
+        seed_distance = self.distance(seed)
+
+        candidates = [seed]
+        if self.windowed:
+            candidates += [self._window_seed(seed), self._urgent_neighbor_seed()]
+        order = min(candidates, key=lambda o: self.cost(o)[0])
+        current = self.cost(order)[0]
+
+        exhausted = False
+        while True:
+            if _time.perf_counter() >= deadline:
+                exhausted = True
+                break
+            step = self._two_opt(order, current, deadline) or self._or_opt(order, current, deadline)
+            if step is None:
+                break
+            order, current = step
+            self.moves += 1
+
+        return self._plan(order, seed_distance, exhausted)
+
+    def _window_seed(self, seed: list[int]) -> list[int]:
+        """Windowed stops by window, then each free stop (in seed order) at its cheapest position."""
+        order = sorted(
+            (node for node in seed if self.window_start[node] is not None or self.window_end[node] is not None),
+            key=lambda node: self.window_start[node] if self.window_start[node] is not None else self.window_end[node],
+        )
+        matrix = self.matrix
+        for node in seed:
+            if self.window_start[node] is not None or self.window_end[node] is not None:
+                continue
+            p = np.asarray([0, *order, self.end])
+            delta = matrix[p[:-1], node] + matrix[node, p[1:]] - matrix[p[:-1], p[1:]]
+            order.insert(int(np.argmin(delta)), node)
+        return order
+
+    def _urgent_neighbor_seed(self) -> list[int]:
+        """Nearest neighbour in time: next is the stop soonest ready to serve, weighted by its window's slack."""
+        n = len(self.stops)
+        nodes = np.arange(1, n + 1)
+        ws = np.asarray([v if v is not None else -np.inf for v in self.window_start[1 : n + 1]])
+        we = np.asarray([v if v is not None else np.inf for v in self.window_end[1 : n + 1]])
+        horizon = float(np.max(np.where(np.isfinite(we), we, -np.inf), initial=self.depart))
+        visited = np.zeros(n, dtype=bool)
+        order = []
+        t, prev = self.depart, 0
+        for _ in range(n):
+            arrival = t + self.matrix[prev, nodes] * self.minutes_per_mile
+            ready = np.maximum(arrival, ws)
+            slack = np.clip(np.minimum(we, horizon) - ready, 0.0, None)
+            score = np.where(visited, np.inf, (ready - t) + 0.5 * slack)
+            k = int(np.argmin(score))
+            visited[k] = True
+            order.append(k + 1)
+            t = ready[k] + self.service[k + 1]
+            prev = k + 1
+        return order
+
+    def distance(self, order: list[int]) -> float:
+        return route_length(self.matrix, [*order, self.end])
+
+    def _accept(self, moves, current: float, deadline: float):
+        """First move (best distance saving first) that lowers the objective, among the first _MAX_TRIALS."""
+        for trial, (_delta, build) in enumerate(moves):
+            if trial >= _MAX_TRIALS or _time.perf_counter() >= deadline:
+                return None
+            order = build()
+            cost = self.cost(order)[0]
+            if cost < current - _EPS:
+                return order, cost
+        return None
+
+    def _two_opt(self, order: list[int], current: float, deadline: float):
+        """Reverse order[i:j] where that shortens the route."""
+        m = len(order)
+        if m < 2:
+            return None
+        p = np.asarray([0, *order, self.end])
+        a, b = p[:-1], p[1:]
+        edge = self.matrix[a, b]
+        delta = self.matrix[np.ix_(a, a)] + self.matrix[np.ix_(b, b)] - edge[:, None] - edge[None, :]
+        # Move (i, j) swaps edges i and j, reversing p[i+1..j]; j == i + 1 is a no-op
+        delta[np.tril_indices(m + 1, 1)] = np.inf
+
+        def reversal(i: int, j: int):
+            return lambda: order[:i] + order[i:j][::-1] + order[j:]
+
+        if not self.windowed:
+            i, j = np.unravel_index(int(np.argmin(delta)), delta.shape)
+            if delta[i, j] >= -_EPS:
+                return None
+            new = reversal(int(i), int(j))()
+            return new, self.cost(new)[0]
+
+        improving = np.argwhere(delta < -_EPS)
+        ranked = improving[np.argsort(delta[improving[:, 0], improving[:, 1]], kind="stable")]
+        return self._accept(((delta[i, j], reversal(int(i), int(j))) for i, j in ranked), current, deadline)
+
+    def _or_opt(self, order: list[int], current: float, deadline: float):
+        """Move a run of up to three stops to another position."""
+        m = len(order)
+        if m < 2:
+            return None
+        matrix = self.matrix
+        p = np.asarray([0, *order, self.end])
+        # With windows a longer route can still be better (less waiting or
+        # lateness), so while late, single-stop moves are tried regardless
+        late = self.windowed and self.cost(order)[1] > 0
+        best = None
+        moves = []
+        for length in _OR_OPT_SEGMENTS:
+            for i in range(m - length + 1):
+                first, last = p[i + 1], p[i + length]
+                prev, nxt = p[i], p[i + length + 1]
+                gain = matrix[prev, first] + matrix[last, nxt] - matrix[prev, nxt]
+                rest = np.concatenate((p[: i + 1], p[i + length + 1 :]))
+                delta = matrix[rest[:-1], first] + matrix[last, rest[1:]] - matrix[rest[:-1], rest[1:]] - gain
+                delta[i] = np.inf  # its current position
+                if not self.windowed:
+                    k = int(np.argmin(delta))
+                    if best is None or delta[k] < best[0]:
+                        best = (float(delta[k]), i, length, k)
+                    continue
+                ks = np.flatnonzero(delta < np.inf) if late and length == 1 else np.flatnonzero(delta < -_EPS)
+                moves.extend((float(delta[k]), i, length, k) for k in ks.tolist())
+
+        def relocation(i: int, length: int, k: int):
+            def build():
+                rest = order[:i] + order[i + length :]
+                return rest[:k] + order[i : i + length] + rest[k:]
+
+            return build
+
+        if not self.windowed:
+            if best is None or best[0] >= -_EPS:
+                return None
+            new = relocation(*best[1:])()
+            return new, self.cost(new)[0]
+
+        moves.sort()
+        return self._accept(((d, relocation(i, length, k)) for d, i, length, k in moves), current, deadline)
+
+    def _plan(self, order: list[int], seed_distance: float, exhausted: bool) -> RoutePlan:
+        matrix = self.matrix
+        legs = []
+        t = self.depart
+        prev = 0
+        total_late = 0.0
+        drive_total = 0.0
+        for node in [*order, self.end] if self.has_end else order:
+            miles = float(matrix[prev, node])
+            drive = miles * self.minutes_per_mile
+            arrival = t + drive
+            ws, we = self.window_start[node], self.window_end[node]
+            wait = max(0.0, ws - arrival) if ws is not None else 0.0
+            start_service = arrival + wait
+            late = max(0.0, start_service - we) if we is not None else 0.0
+            t = start_service + self.service[node]
+            legs.append(
+                RouteLeg(
+                    stop_id=self.stops[node - 1].id if node != self.end else None,
+                    distance_miles=miles,
+                    drive_minutes=drive,
+                    arrival_minute=arrival,
+                    wait_minutes=wait,
+                    late_minutes=late,
+                    departure_minute=t,
+                )
+            )
+            total_late += late
+            drive_total += drive
+            prev = node
+
+        return RoutePlan(
+            order=[node - 1 for node in order],
+            stops=[self.stops[node - 1] for node in order],
+            legs=legs,
+            distance_miles=sum(leg.distance_miles for leg in legs),
+            drive_minutes=drive_total,
+            late_minutes=total_late,
+            finish_minute=t,
+            seed_distance_miles=seed_distance,
+            moves=self.moves,
+            exhausted_budget=exhausted,
+        )
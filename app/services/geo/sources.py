@@ -0,0 +1,267 @@
+"""
+Cached spatial indexes and map clusters built from the database.
+
+Entries:
+    geo:jobs:<start>:<end>:<statuses>          GeoIndex of located work orders
+    schedule_map:clusters:<day>:<scale>:<bbox> clusters for one day and viewport
+
+Indexes live in CacheService's local "geo" namespace: they hold NumPy arrays
+and are rebuilt per worker, so they never go through Redis. Cluster results
+are plain JSON and shared through Redis.
+
+Invalidation:
+    Every entry is tagged with the days it covers (workorder_date_tag) as
+    well as "workorders", and indexes also with "customers". ORM writes to
+    a WorkOrder are collected per session and the tags of its old and new
+    scheduled_date are invalidated after commit (the same pattern as
+    principal_cache), so editing one day's jobs leaves other days cached.
+    Raw SQL updates bypass the ORM events and are picked up when entries
+    expire (GEO_INDEX_TTL, CLUSTER_CACHE_TTL).
+
+Usage:
+    from app.services.geo import job_clusters, job_index
+
+    index = await job_index(db, monday, sunday)
+    nearby = index.within_radius(lat, lng, 30)
+    clusters = await job_clusters(db, today, zoom=11, bbox=(35.4, -87.3, 35.9, -86.7))
+"""
+
+import asyncio
+import math
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import and_, event, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.models.customer import Customer
+from app.models.work_order import WorkOrder
+from app.services.cache_service import TTL, get_cache_service
+from app.services.geo.cluster import cluster_radius_for_zoom, grid_clusters
+from app.services.geo.index import GeoIndex
+
+GEO_INDEX_TTL = 30
+CLUSTER_CACHE_TTL = TTL.SHORT
+
+# (min_lat, min_lng, max_lat, max_lng)
+BBox = tuple[float, float, float, float]
+
+ACTIVE_JOB_STATUSES = (
+    "scheduled",
+    "in_progress",
+    "pending",
+    "dispatched",
+    "confirmed",
+    "enroute",
+    "on_site",
+)
+
+
+async def job_index(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    statuses: Iterable[str] = ACTIVE_JOB_STATUSES,
+) -> GeoIndex[dict]:
+    """
+    Index of work orders scheduled between start and end (inclusive) in the given statuses.
+
+    A job is placed at its service coordinates, or at its customer's when
+    the work order has none; jobs with neither are left out. Items are
+    plain dicts (see _load_jobs).
+    """
+    statuses = tuple(sorted(set(statuses)))
+    key = f"geo:jobs:{start.isoformat()}:{end.isoformat()}:{','.join(statuses)}"
+    days = (start + timedelta(days=i) for i in range((end - start).days + 1))
+    return await get_cache_service().get_or_load(
+        key,
+        lambda: _load_jobs(db, start, end, statuses),
+        ttl=GEO_INDEX_TTL,
+        tags=("workorders", "customers", *map(workorder_date_tag, days)),
+    )
+
+
+async def _load_jobs(db: AsyncSession, start: date, end: date, statuses: tuple[str, ...]) -> GeoIndex[dict]:
+    result = await db.execute(
+        select(
+            WorkOrder.id,
+            WorkOrder.status,
+            WorkOrder.job_type,
+            WorkOrder.scheduled_date,
+            WorkOrder.service_latitude,
+            WorkOrder.service_longitude,
+            Customer.first_name,
+            Customer.last_name,
+            Customer.address_line1,
+            Customer.city,
+            Customer.state,
+            Customer.latitude,
+            Customer.longitude,
+        )
+        .outerjoin(Customer, WorkOrder.customer_id == Customer.id)
+        .where(
+            and_(
+                WorkOrder.scheduled_date >= start,
+                WorkOrder.scheduled_date <= end,
+                WorkOrder.status.in_(statuses),
+                or_(
+                    and_(WorkOrder.service_latitude.isnot(None), WorkOrder.service_longitude.isnot(None)),
+                    and_(Customer.latitude.isnot(None), Customer.longitude.isnot(None)),
+                ),
+            )
+        )
+    )
+
+    jobs = []
+    for row in result.all():
+        if row.service_latitude is not None and row.service_longitude is not None:
+            lat, lng = float(row.service_latitude), float(row.service_longitude)
+        else:
+            lat, lng = float(row.latitude), float(row.longitude)
+        jobs.append(
+            {
+                "id": str(row.id),
+                "customer_name": f"{row.first_name} {row.last_name}" if row.first_name is not None else None,
+                "address": f"{row.address_line1 or ''}, {row.city or ''}, {row.state or ''}".strip(", "),
+                "lat": lat,
+                "lng": lng,
+                "scheduled_date": str(row.scheduled_date) if row.scheduled_date else None,
+                "status": row.status,
+                "job_type": row.job_type,
+            }
+        )
+    return GeoIndex.from_records(jobs)
+
+
+async def job_clusters(
+    db: AsyncSession,
+    day: date,
+    radius_miles: float = 5.0,
+    zoom: Optional[float] = None,
+    bbox: Optional[BBox] = None,
+) -> dict:
+    """
+    Clusters of the located work orders scheduled on `day` (see geo.cluster).
+
+    With a zoom level the radius follows the map scale instead of
+    radius_miles. A bbox limits the jobs to a viewport; it is widened to a
+    quarter-tile grid (0.01 degree without a zoom) so that small pans reuse
+    the cached result.
+    """
+    if bbox is not None:
+        step = 90 / 2**zoom if zoom is not None else 0.01
+        bbox = _snap_bbox(bbox, step)
+    scale = f"z{zoom:g}" if zoom is not None else f"r{radius_miles:g}"
+    area = ",".join(f"{v:g}" for v in bbox) if bbox is not None else "all"
+    return await get_cache_service().get_or_load(
+        f"schedule_map:clusters:{day.isoformat()}:{scale}:{area}",
+        lambda: _load_clusters(db, day, radius_miles, zoom, bbox),
+        ttl=CLUSTER_CACHE_TTL,
+        tags=("workorders", workorder_date_tag(day)),
+    )
+
+
+def _snap_bbox(bbox: BBox, step: float) -> BBox:
+    """Grow the box outward to multiples of step degrees."""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    return (
+        max(math.floor(min_lat / step) * step, -90.0),
+        max(math.floor(min_lng / step) * step, -180.0),
+        min(math.ceil(max_lat / step) * step, 90.0),
+        min(math.ceil(max_lng / step) * step, 180.0),
+    )
+
+
+async def _load_clusters(
+    db: AsyncSession,
+    day: date,
+    radius_miles: float,
+    zoom: Optional[float],
+    bbox: Optional[BBox],
+) -> dict:
+    query = select(WorkOrder.id, WorkOrder.service_latitude, WorkOrder.service_longitude).where(
+        WorkOrder.scheduled_date == day,
+        WorkOrder.service_latitude.isnot(None),
+        WorkOrder.service_longitude.isnot(None),
+    )
+    if bbox is not None:
+        min_lat, min_lng, max_lat, max_lng = bbox
+        query = query.where(
+            WorkOrder.service_latitude.between(min_lat, max_lat),
+            WorkOrder.service_longitude.between(min_lng, max_lng),
+        )
+    rows = (await db.execute(query)).all()
+
+    ids = [str(row.id) for row in rows]
+    lats = [float(row.service_latitude) for row in rows]
+    lngs = [float(row.service_longitude) for row in rows]
+    if zoom is not None:
+        ref_lat = (bbox[0] + bbox[2]) / 2 if bbox is not None else (sum(lats) / len(lats) if lats else 0.0)
+        radius_miles = cluster_radius_for_zoom(zoom, ref_lat)
+
+    return {
+        "radius_miles": round(radius_miles, 3),
+        "clusters": [
+            {
+                "center_latitude": cluster.center_lat,
+                "center_longitude": cluster.center_lng,
+                "job_count": len(cluster.members),
+                "job_ids": [ids[i] for i in cluster.members.tolist()],
+            }
+            for cluster in grid_clusters(lats, lngs, radius_miles)
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Invalidation on ORM writes
+# ---------------------------------------------------------------------------
+
+_SESSION_INFO_KEY = "geo_workorder_tags"
+_invalidation_tasks: set[asyncio.Task] = set()
+
+
+def workorder_date_tag(day: Any) -> str:
+    """Cache tag for everything derived from the work orders scheduled on one day."""
+    return f"workorders:date:{str(day)[:10]}"
+
+
+def _invalidate(*tags: str) -> None:
+    """Drop tagged entries here at once; bump the Redis generations on the running loop, if any."""
+    cache = get_cache_service()
+    cache.invalidate_local_tags(*tags)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(cache.invalidate_tags(*tags))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(WorkOrder, "after_insert")
+@event.listens_for(WorkOrder, "after_update")
+@event.listens_for(WorkOrder, "after_delete")
+def _work_order_written(mapper, connection, target):
+    history = inspect(target).attrs.scheduled_date.history
+    tags = {workorder_date_tag(day) for day in (*history.added, *history.unchanged, *history.deleted) if day}
+    if not tags:
+        return
+    session = object_session(target)
+    if session is None:
+        _invalidate(*tags)
+        return
+    session.info.setdefault(_SESSION_INFO_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    tags = session.info.pop(_SESSION_INFO_KEY, None)
+    if tags:
+        _invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -0,0 +1,382 @@
+"""
+Day planning across technicians: a capacitated vehicle routing problem with
+skills and time windows.
+
+plan_day() assigns every stop it can to one technician's closed route (home,
+stops, home) and orders each route. Constraints are hard: a technician only
+gets stops whose skill they have (technicians without skills take anything),
+every window is met and each route fits its shift. Stops that fit nowhere
+are returned as unassigned for a dispatcher.
+
+Construction is regret insertion: the stop whose best technician beats its
+second best by the widest margin is placed first, at its cheapest feasible
+position. Local search then relocates single stops to other routes, swaps
+stops between routes and re-orders changed routes with plan_route(), until
+nothing improves or the time limit is reached.
+
+The objective is total drive minutes plus BALANCE_WEIGHT times the summed
+deviation of route durations from their mean, so a slightly longer drive
+can buy a much more even day.
+"""
+
+import time as _time
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.services.geo.distance import distance_matrix
+from app.services.geo.routing import (
+    AVERAGE_SPEED_MPH,
+    DEFAULT_DEPART_MINUTE,
+    RoutePlan,
+    RouteStop,
+    plan_route,
+    schedule_route,
+)
+
+DEFAULT_SHIFT_MINUTES = 10 * 60
+DEFAULT_TIME_LIMIT = 10.0
+# Drive minutes one minute of route-duration imbalance is worth
+BALANCE_WEIGHT = 0.5
+
+_EPS = 1e-6
+# Seconds plan_route() may spend re-ordering one changed route
+_POLISH_BUDGET = 0.05
+
+
+@dataclass
+class PlanTechnician:
+    """A technician available for the day, starting and finishing at (lat, lng)."""
+
+    id: str
+    lat: float
+    lng: float
+    skills: frozenset = frozenset()
+    shift_start: float = DEFAULT_DEPART_MINUTE
+    shift_minutes: float = DEFAULT_SHIFT_MINUTES
+
+    def can_do(self, stop: RouteStop) -> bool:
+        return not self.skills or stop.skill is None or stop.skill in self.skills
+
+
+@dataclass
+class DayPlan:
+    """Routes keyed by technician id (technicians without stops are left out) and the stops nobody could take."""
+
+    routes: dict[str, RoutePlan]
+    unassigned: list[str]
+    distance_miles: float
+    drive_minutes: float
+    duration_minutes: dict[str, float]
+    moves: int = 0
+    exhausted_budget: bool = False
+
+
+def plan_day(
+    stops: Sequence[RouteStop],
+    technicians: Sequence[PlanTechnician],
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    speed_mph: float = AVERAGE_SPEED_MPH,
+    balance_weight: float = BALANCE_WEIGHT,
+) -> DayPlan:
+    """
+    Assign and order stops across technicians.
+
+    Args:
+        stops: Jobs for the day; skill, windows and service_minutes are honoured
+        technicians: Who is working, from where, with which skills and shift
+        time_limit: Seconds for construction plus local search
+        speed_mph: Average speed for drive times
+        balance_weight: Drive minutes worth one minute of duration imbalance
+    """
+    return _DayPlanner(list(stops), list(technicians), speed_mph, balance_weight).solve(time_limit)
+
+
+class _DayPlanner:
+    """
+    Nodes 0..T-1 are the technicians' homes, node T + j is stops[j]; a route
+    is the list of stop indices (j) one technician visits.
+    """
+
+    def __init__(
+        self,
+        stops: list[RouteStop],
+        technicians: list[PlanTechnician],
+        speed_mph: float,
+        balance_weight: float,
+    ):
+        self.stops = stops
+        self.techs = technicians
+        self.minutes_per_mile = 60.0 / speed_mph
+        self.balance_weight = balance_weight
+        points = [*((t.lat, t.lng) for t in technicians), *((s.lat, s.lng) for s in stops)]
+        self.matrix = distance_matrix([p[0] for p in points], [p[1] for p in points])
+        self.rows = self.matrix.tolist()
+        self.offset = len(technicians)
+        self.eligible = [[t.can_do(s) for t in technicians] for s in stops]
+        self.routes: list[list[int]] = [[] for _ in technicians]
+        # (drive minutes, duration) per route, kept in step with self.routes
+        self.totals = [(0.0, 0.0) for _ in technicians]
+        self.moves = 0
+
+    # -- evaluation ---------------------------------------------------------
+
+    def simulate(self, t: int, route: list[int]) -> Optional[tuple[float, float]]:
+        """(drive minutes, duration) of technician t driving route; None if it breaks a window or the shift."""
+        tech = self.techs[t]
+        rows = self.rows
+        clock = tech.shift_start
+        miles = 0.0
+        prev = t
+        for j in route:
+            node = self.offset + j
+            leg = rows[prev][node]
+            miles += leg
+            clock += leg * self.minutes_per_mile
+            stop = self.stops[j]
+            if stop.window_start is not None and clock < stop.window_start:
+                clock = stop.window_start
+            if stop.window_end is not None and clock > stop.window_end + _EPS:
+                return None
+            clock += stop.service_minutes
+            prev = node
+        leg = rows[prev][t]
+        miles += leg
+        clock += leg * self.minutes_per_mile
+        duration = clock - tech.shift_start
+        if duration > tech.shift_minutes + _EPS:
+            return None
+        return miles * self.minutes_per_mile, duration
+
+    def objective(self, totals: Sequence[tuple[float, float]]) -> float:
+        drive = sum(d for d, _ in totals)
+        durations = np.asarray([dur for _, dur in totals])
+        return drive + self.balance_weight * float(np.abs(durations - durations.mean()).sum())
+
+    def best_insertion(self, t: int, j: int, route: Optional[list[int]] = None):
+        """
+        Cheapest feasible (route, totals) with stop j inserted into
+        technician t's route, or None. Positions are tried cheapest first
+        by distance, so the first feasible one is kept.
+        """
+        route = self.routes[t] if route is None else route
+        node = self.offset + j
+        p = np.asarray([t, *(self.offset + k for k in route), t])
+        delta = self.matrix[p[:-1], node] + self.matrix[node, p[1:]] - self.matrix[p[:-1], p[1:]]
+        for pos in np.argsort(delta, kind="stable").tolist():
+            candidate = route[:pos] + [j] + route[pos:]
+            totals = self.simulate(t, candidate)
+            if totals is not None:
+                return candidate, totals
+        return None
+
+    # -- search -------------------------------------------------------------
+
+    def solve(self, time_limit: float) -> DayPlan:
+        deadline = _time.perf_counter() + time_limit
+        unassigned = self.construct(deadline)
+        exhausted = _time.perf_counter() >= deadline
+        while not exhausted:
+            improved = self.relocate(deadline) or self.swap(deadline)
+            if unassigned and improved:
+                unassigned = [j for j in unassigned if not self.insert_anywhere(j)]
+            exhausted = _time.perf_counter() >= deadline
+            if not improved:
+                break
+        return self.result(unassigned, exhausted)
+
+    def construct(self, deadline: float) -> list[int]:
+        """Regret-2 insertion; returns the stops that fit no route."""
+        n, techs = len(self.stops), len(self.techs)
+        # Insertion cost (increase in drive minutes plus the shift share it
+        # uses beyond an even split) per (stop, technician); inf if infeasible
+        fair_share = sum(s.service_minutes for s in self.stops) / max(techs, 1)
+        cost = np.full((n, techs), np.inf)
+        options: dict[tuple[int, int], tuple[list[int], tuple[float, float]]] = {}
+
+        def price(j: int, t: int) -> None:
+            cost[j, t] = np.inf
+            options.pop((j, t), None)
+            if not self.eligible[j][t]:
+                return
+            found = self.best_insertion(t, j)
+            if found is None:
+                return
+            options[(j, t)] = found
+            drive, duration = found[1]
+            over = max(0.0, duration - fair_share)
+            cost[j, t] = drive - self.totals[t][0] + self.balance_weight * over
+
+        for j in range(n):
+            for t in range(techs):
+                price(j, t)
+
+        open_stops = set(range(n))
+        while open_stops:
+            rows = sorted(open_stops)
+            block = cost[rows]
+            feasible = np.isfinite(block).any(axis=1)
+            if not feasible.any():
+                break
+            ranked = np.sort(block, axis=1)
+            second = ranked[:, 1] if techs > 1 else np.full(len(rows), np.inf)
+            # Stops with a single option first, then by regret, then cheapest
+            regret = np.full(len(rows), np.inf)
+            both = np.isfinite(second)
+            regret[both] = second[both] - ranked[both, 0]
+            regret[~feasible] = -np.inf
+            pick = int(np.lexsort((ranked[:, 0], -regret))[0])
+            j = rows[pick]
+            t = int(np.argmin(cost[j]))
+            self.routes[t], self.totals[t] = options[(j, t)]
+            open_stops.discard(j)
+            if _time.perf_counter() >= deadline:
+                # Out of time: place the rest greedily without re-pricing
+                for k in sorted(open_stops, key=lambda k: float(cost[k].min())):
+                    if self.insert_anywhere(k):
+                        open_stops.discard(k)
+                break
+            for k in open_stops:
+                price(k, t)
+        return sorted(open_stops)
+
+    def insert_anywhere(self, j: int) -> bool:
+        """Put stop j where it raises the objective least; False if no route can take it."""
+        best = None
+        for t in range(len(self.techs)):
+            if not self.eligible[j][t]:
+                continue
+            found = self.best_insertion(t, j)
+            if found is None:
+                continue
+            totals = list(self.totals)
+            totals[t] = found[1]
+            score = self.objective(totals)
+            if best is None or score < best[0]:
+                best = (score, t, found)
+        if best is None:
+            return False
+        _, t, (route, totals) = best
+        self.routes[t], self.totals[t] = route, totals
+        return True
+
+    def relocate(self, deadline: float) -> bool:
+        """Move single stops to the other route where the objective drops most; True if any moved."""
+        improved = False
+        current = self.objective(self.totals)
+        for a in range(len(self.techs)):
+            for j in list(self.routes[a]):
+                if _time.perf_counter() >= deadline:
+                    return improved
+                if j not in self.routes[a]:
+                    continue
+                shorter = [k for k in self.routes[a] if k != j]
+                source = self.simulate(a, shorter)
+                if source is None:
+                    continue
+                best = None
+                for b in range(len(self.techs)):
+                    if b == a or not self.eligible[j][b]:
+                        continue
+                    found = self.best_insertion(b, j)
+                    if found is None:
+                        continue
+                    totals = list(self.totals)
+                    totals[a], totals[b] = source, found[1]
+                    score = self.objective(totals)
+                    if score < current - _EPS and (best is None or score < best[0]):
+                        best = (score, b, found)
+                if best is None:
+                    continue
+                current, b, (route, totals) = best
+                self.routes[a], self.totals[a] = shorter, source
+                self.routes[b], self.totals[b] = route, totals
+                self.polish(a, deadline)
+                self.polish(b, deadline)
+                current = self.objective(self.totals)
+                self.moves += 1
+                improved = True
+        return improved
+
+    def swap(self, deadline: float) -> bool:
+        """Exchange one stop each between two routes where that lowers the objective; True if any swapped."""
+        current = self.objective(self.totals)
+        techs = len(self.techs)
+        for a in range(techs):
+            for b in range(a + 1, techs):
+                for j in self.routes[a]:
+                    if not self.eligible[j][b]:
+                        continue
+                    for k in self.routes[b]:
+                        if _time.perf_counter() >= deadline:
+                            return False
+                        if not self.eligible[k][a]:
+                            continue
+                        into_a = self.best_insertion(a, k, [x for x in self.routes[a] if x != j])
+                        if into_a is None:
+                            continue
+                        into_b = self.best_insertion(b, j, [x for x in self.routes[b] if x != k])
+                        if into_b is None:
+                            continue
+                        totals = list(self.totals)
+                        totals[a], totals[b] = into_a[1], into_b[1]
+                        if self.objective(totals) < current - _EPS:
+                            self.routes[a], self.totals[a] = into_a
+                            self.routes[b], self.totals[b] = into_b
+                            self.polish(a, deadline)
+                            self.polish(b, deadline)
+                            self.moves += 1
+                            return True
+        return False
+
+    def polish(self, t: int, deadline: float) -> None:
+        """Re-order technician t's route with plan_route() if that shortens it."""
+        route = self.routes[t]
+        if len(route) < 3:
+            return
+        budget = min(_POLISH_BUDGET, deadline - _time.perf_counter())
+        if budget <= 0:
+            return
+        tech = self.techs[t]
+        nodes = [t, *(self.offset + j for j in route), t]
+        plan = plan_route(
+            [self.stops[j] for j in route],
+            (tech.lat, tech.lng),
+            (tech.lat, tech.lng),
+            depart_minute=tech.shift_start,
+            time_budget=budget,
+            matrix=self.matrix[np.ix_(nodes, nodes)],
+            speed_mph=60.0 / self.minutes_per_mile,
+        )
+        reordered = [route[i] for i in plan.order]
+        totals = self.simulate(t, reordered)
+        if totals is not None and totals[0] < self.totals[t][0] - _EPS:
+            self.routes[t], self.totals[t] = reordered, totals
+
+    def result(self, unassigned: list[int], exhausted: bool) -> DayPlan:
+        routes = {}
+        durations = {}
+        for t, route in enumerate(self.routes):
+            if not route:
+                continue
+            tech = self.techs[t]
+            nodes = [t, *(self.offset + j for j in route), t]
+            routes[tech.id] = schedule_route(
+                [self.stops[j] for j in route],
+                (tech.lat, tech.lng),
+                (tech.lat, tech.lng),
+                depart_minute=tech.shift_start,
+                speed_mph=60.0 / self.minutes_per_mile,
+                matrix=self.matrix[np.ix_(nodes, nodes)],
+            )
+            durations[tech.id] = self.totals[t][1]
+        return DayPlan(
+            routes=routes,
+            unassigned=[self.stops[j].id for j in unassigned],
+            distance_miles=sum(r.distance_miles for r in routes.values()),
+            drive_minutes=sum(r.drive_minutes for r in routes.values()),
+            duration_minutes=durations,
+            moves=self.moves,
+            exhausted_budget=exhausted,
+        )
@@ -1,16 +1,300 @@
-"""Geocoding service: free Nominatim address -> lat/lng lookups.
+"""Geocoding service: address -> lat/lng through a shared cache.
 
-Used by customer create/update to auto-populate coordinates when an address
-is set but lat/lng are not. Best-effort: returns None on any error.
+Every caller (customer create/update, live call transcripts, bulk
+backfills) goes through one Geocoder per worker:
+
+- an in-memory LRU of recent answers
+- the geocode_cache table, keyed by compute_address_hash (normalized
+  street + county or city + state), so answers survive restarts and are
+  shared with other workers and with septic permits at the same address
+- Nominatim (free, OSM), only on a miss, through a token bucket that keeps
+  this worker within Nominatim's 1 request/second policy; concurrent
+  lookups of one address share a single request
+
+Lookups that find nothing are cached too and retried after MISS_RETRY_DAYS.
+Best-effort throughout: errors are logged and return None so a customer
+save never fails on geocoding.
+
+Usage:
+    coords = await geocode_address("1205 Hampshire Pike", "Columbia", "TN")
+    found = await get_geocoder().geocode_many([address_request(...), ...])  # backfills
 """
+import asyncio
 import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Optional
+
 import httpx
+from sqlalchemy import or_, select
+
+from app.core.rate_limit import TokenBucket
+from app.database import async_session_maker
+from app.models.geocode_cache import GeocodeCache
+from app.services.http_clients import get_http_client
+from app.utils.address_normalization import compute_address_hash, normalize_address, normalize_county, normalize_state
 
 logger = logging.getLogger(__name__)
 
 NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
 NOMINATIM_HEADERS = {"User-Agent": "MacServicePlatform/1.0 (will@macseptic.com)"}
-TIMEOUT_SEC = 5.0
+
+# Nominatim usage policy: at most 1 request per second
+REQUESTS_PER_SECOND = 1.0
+LRU_SIZE = 10_000
+MISS_RETRY_DAYS = 30
+BULK_WORKERS = 4
+# Cache rows written per commit during geocode_many
+BULK_FLUSH = 50
+
+Coords = tuple[float, float]
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class GeocodeRequest:
+    """One lookup: cache key, Nominatim query text, and extra Nominatim parameters."""
+
+    key: str
+    query: str
+    params: tuple[tuple[str, str], ...] = ()
+
+
+def address_key(
+    address_line1: Optional[str],
+    state: Optional[str],
+    county: Optional[str] = None,
+    city: Optional[str] = None,
+) -> Optional[str]:
+    """Cache key for a street address: county when known (matches permits), else city."""
+    locality = normalize_county(county) if county else (city or "").strip().upper()
+    return compute_address_hash(normalize_address(address_line1), locality, normalize_state(state) or state)
+
+
+def address_request(
+    address_line1: Optional[str],
+    city: Optional[str],
+    state: Optional[str],
+    postal_code: Optional[str] = None,
+    county: Optional[str] = None,
+) -> Optional[GeocodeRequest]:
+    """The lookup for a street address, or None when the address is incomplete."""
+    if not (address_line1 and city and state):
+        return None
+    parts = [address_line1, city, state]
+    if postal_code:
+        parts.append(postal_code)
+    query = ", ".join(p.strip() for p in parts if p)
+    return GeocodeRequest(address_key(address_line1, state, county=county, city=city), query)
+
+
+class Geocoder:
+    """LRU -> geocode_cache -> rate-limited Nominatim, for one worker."""
+
+    def __init__(self, session_factory=None, requests_per_second: float = REQUESTS_PER_SECOND,
+                 lru_size: int = LRU_SIZE):
+        self._sessions = session_factory or async_session_maker
+        self._bucket = TokenBucket(1, requests_per_second, 1.0, time.monotonic())
+        self._bucket_lock = asyncio.Lock()
+        self._lru: OrderedDict[str, Optional[Coords]] = OrderedDict()
+        self._lru_size = lru_size
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def geocode(self, request: GeocodeRequest) -> Optional[Coords]:
+        """Coordinates for one lookup, from cache when possible."""
+        hit = self._lru_get(request.key)
+        if hit is not _MISSING:
+            return hit
+        task = self._inflight.get(request.key)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve(request))
+            self._inflight[request.key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(request.key, None))
+        coords = await asyncio.shield(task)
+        return None if coords is _MISSING else coords
+
+    async def geocode_many(self, requests: Iterable[Optional[GeocodeRequest]],
+                           workers: int = BULK_WORKERS) -> dict[str, Optional[Coords]]:
+        """
+        Resolve many lookups (keyed by request key) for backfills.
+
+        Cached answers come from one query; misses are fetched by `workers`
+        tasks sharing this worker's rate limit and written back in batches.
+        """
+        pending = {r.key: r for r in requests if r is not None and r.key}
+        found: dict[str, Optional[Coords]] = {}
+        for key in list(pending):
+            hit = self._lru_get(key)
+            if hit is not _MISSING:
+                found[key] = hit
+                del pending[key]
+        for key, coords in (await self._load(list(pending))).items():
+            found[key] = coords
+            del pending[key]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for request in pending.values():
+            queue.put_nowait(request)
+        fetched: list[tuple[GeocodeRequest, Optional[Coords]]] = []
+
+        async def worker():
+            while not queue.empty():
+                request = queue.get_nowait()
+                coords = await self._fetch(request)
+                found[request.key] = None if coords is _MISSING else coords
+                fetched.append((request, coords))
+                if len(fetched) >= BULK_FLUSH:
+                    batch = fetched[:]
+                    fetched.clear()
+                    await self._store(batch)
+
+        await asyncio.gather(*(worker() for _ in range(min(workers, len(pending)))))
+        await self._store(fetched)
+        return found
+
+    async def cached(self, keys: Iterable[str]) -> dict[str, Coords]:
+        """Known coordinates for cache keys, without any network lookups."""
+        keys = [k for k in keys if k]
+        found, unknown = {}, []
+        for key in keys:
+            hit = self._lru_get(key)
+            if hit is _MISSING:
+                unknown.append(key)
+            elif hit is not None:
+                found[key] = hit
+        loaded = await self._load(unknown)
+        found.update({k: v for k, v in loaded.items() if v is not None})
+        return found
+
+    async def remember(self, entries: Iterable[tuple[str, str, Coords]], provider: str) -> None:
+        """Record coordinates found elsewhere, as (key, query, (lat, lng))."""
+        entries = [(GeocodeRequest(key, query), coords) for key, query, coords in entries if key]
+        await self._store(entries, provider=provider)
+
+    async def close(self) -> None:
+        # The pooled connections are closed with the other HTTP clients at shutdown
+        self._client = None
+
+    async def _resolve(self, request: GeocodeRequest) -> Optional[Coords]:
+        loaded = await self._load([request.key])
+        if request.key in loaded:
+            return loaded[request.key]
+        coords = await self._fetch(request)
+        await self._store([(request, coords)])
+        return coords
+
+    async def _fetch(self, request: GeocodeRequest) -> Optional[Coords]:
+        """Ask Nominatim, within the rate limit. None when nothing matched or the call failed."""
+        await self._wait_for_token()
+        if self._client is None:
+            self._client = get_http_client("nominatim", headers=NOMINATIM_HEADERS)
+        try:
+            r = await self._client.get(
+                NOMINATIM_URL, params={"q": request.query, "format": "json", "limit": 1, **dict(request.params)}
+            )
+            if r.status_code != 200:
+                logger.warning(f"Geocode HTTP {r.status_code} for {request.query!r}")
+                return _MISSING
+            rows = r.json()
+            return (float(rows[0]["lat"]), float(rows[0]["lon"])) if rows else None
+        except Exception as e:
+            logger.warning(f"Geocode failed for {request.query!r}: {e}")
+            return _MISSING
+
+    async def _wait_for_token(self) -> None:
+        async with self._bucket_lock:
+            while not self._bucket.take():
+                await asyncio.sleep((1 - self._bucket.tokens) / self._bucket.refill_per_second)
+
+    async def _load(self, keys: list[str]) -> dict[str, Optional[Coords]]:
+        """Cached rows for keys (misses older than MISS_RETRY_DAYS are ignored)."""
+        if not keys:
+            return {}
+        retry_before = datetime.now(timezone.utc) - timedelta(days=MISS_RETRY_DAYS)
+        try:
+            async with self._sessions() as db:
+                result = await db.execute(
+                    select(GeocodeCache.address_hash, GeocodeCache.latitude, GeocodeCache.longitude).where(
+                        GeocodeCache.address_hash.in_(keys),
+                        or_(GeocodeCache.latitude.isnot(None), GeocodeCache.created_at >= retry_before),
+                    )
+                )
+                rows = result.all()
+        except Exception as e:
+            logger.warning(f"Geocode cache read failed: {e}")
+            return {}
+        loaded = {}
+        for key, lat, lng in rows:
+            coords = (lat, lng) if lat is not None and lng is not None else None
+            self._lru_put(key, coords)
+            loaded[key] = coords
+        return loaded
+
+    async def _store(self, results: list[tuple[GeocodeRequest, Optional[Coords]]], provider: str = "nominatim") -> None:
+        # Failed calls (_MISSING) are neither cached nor remembered
+        rows = {}
+        for request, coords in results:
+            if coords is _MISSING:
+                continue
+            self._lru_put(request.key, coords)
+            rows[request.key] = {
+                "address_hash": request.key,
+                "query": request.query,
+                "latitude": coords[0] if coords else None,
+                "longitude": coords[1] if coords else None,
+                "provider": provider,
+                "created_at": datetime.now(timezone.utc),
+            }
+        if not rows:
+            return
+        try:
+            async with self._sessions() as db:
+                await db.execute(_upsert_statement(db.get_bind().dialect.name), list(rows.values()))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Geocode cache write failed: {e}")
+
+    def _lru_get(self, key: str):
+        if key not in self._lru:
+            return _MISSING
+        self._lru.move_to_end(key)
+        return self._lru[key]
+
+    def _lru_put(self, key: str, coords: Optional[Coords]) -> None:
+        self._lru[key] = coords
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._lru_size:
+            self._lru.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def _upsert_statement(dialect: str):
+    """The cache upsert, built once per dialect so its compiled form is cached."""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(GeocodeCache)
+    return stmt.on_conflict_do_update(
+        index_elements=[GeocodeCache.address_hash],
+        set_={name: stmt.excluded[name] for name in ("query", "latitude", "longitude", "provider", "created_at")},
+    )
+
+
+_geocoder: Optional[Geocoder] = None
+
+
+def get_geocoder() -> Geocoder:
+    """Get or create this worker's geocoder."""
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = Geocoder()
+    return _geocoder
 
 
 async def geocode_address(
@@ -18,33 +302,14 @@ async def geocode_address(
     city: str | None,
     state: str | None,
     postal_code: str | None = None,
+    county: str | None = None,
 ) -> tuple[float, float] | None:
     """Geocode a single address. Returns (lat, lng) or None on failure.
 
     Best-effort: any HTTP / parse / network error returns None silently
     (caller should log if useful) so we never break a customer save flow.
     """
-    if not (address_line1 and city and state):
+    request = address_request(address_line1, city, state, postal_code, county)
+    if request is None:
         return None
-
-    parts = [address_line1, city, state]
-    if postal_code:
-        parts.append(postal_code)
-    query = ", ".join(p.strip() for p in parts if p)
-
-    try:
-        async with httpx.AsyncClient(timeout=TIMEOUT_SEC) as client:
-            r = await client.get(
-                NOMINATIM_URL,
-                params={"q": query, "format": "json", "limit": 1},
-                headers=NOMINATIM_HEADERS,
-            )
-            if r.status_code != 200:
-                logger.warning(f"Geocode HTTP {r.status_code} for {query!r}")
-                return None
-            rows = r.json()
-            if rows:
-                return float(rows[0]["lat"]), float(rows[0]["lon"])
-    except Exception as e:
-        logger.warning(f"Geocode failed for {query!r}: {e}")
-    return None
+    return await get_geocoder().geocode(request)
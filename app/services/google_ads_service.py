@@ -3,13 +3,12 @@ Google Ads API Service
 
 Integrates with Google Ads REST API v20 for campaign performance data
 and offline conversion uploads (Enhanced Conversions for Leads).
-Uses httpx for async HTTP, OAuth2 token refresh, and in-memory caching.
+Uses httpx for async HTTP, OAuth2 token refresh, and the shared cache layer.
 
 Basic Access: 15,000 operations/day limit.
 """
 
 import hashlib
-import re
 import time
 import logging
 from datetime import datetime, timedelta
@@ -18,6 +17,9 @@ from typing import Optional
 import httpx
 
 from app.config import settings
+from app.services.cache_service import cache_service
+from app.services.http_clients import get_http_client
+from app.utils.phone_normalization import to_e164
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,9 @@ GOOGLE_ADS_API_VERSION = "v20"
 GOOGLE_ADS_BASE_URL = f"https://googleads.googleapis.com/{GOOGLE_ADS_API_VERSION}"
 GOOGLE_OAUTH_TOKEN_URL = "https://oauth2.googleapis.com/token"
 
+# Cache namespace (per-worker L1, see app.services.cache_service.NAMESPACES)
+CACHE_NAMESPACE = "google_ads"
+
 # Cache TTLs (seconds)
 CACHE_TTL_METRICS = 900  # 15 minutes
 CACHE_TTL_CAMPAIGNS = 900  # 15 minutes
@@ -52,9 +57,6 @@ class GoogleAdsService:
         self._access_token: Optional[str] = None
         self._token_expires_at: float = 0
 
-        # In-memory cache
-        self._cache: dict[str, tuple[float, object]] = {}
-
         # Daily operation counter
         self._daily_ops: int = 0
         self._daily_ops_date: str = ""
@@ -93,17 +95,13 @@ class GoogleAdsService:
             self._daily_ops_date = today
         self._daily_ops += 1
 
-    def _get_cached(self, key: str, ttl: int) -> Optional[object]:
-        """Get value from cache if not expired."""
-        if key in self._cache:
-            cached_time, value = self._cache[key]
-            if time.time() - cached_time < ttl:
-                return value
-        return None
+    async def _get_cached(self, key: str) -> Optional[object]:
+        """Get value from the per-worker cache if not expired."""
+        return await cache_service.get(f"{CACHE_NAMESPACE}:{key}")
 
-    def _set_cache(self, key: str, value: object):
-        """Store value in cache."""
-        self._cache[key] = (time.time(), value)
+    async def _set_cache(self, key: str, value: object, ttl: int):
+        """Store value in the per-worker cache."""
+        await cache_service.set(f"{CACHE_NAMESPACE}:{key}", value, ttl=ttl)
 
     async def _refresh_access_token(self) -> Optional[str]:
         """Refresh OAuth2 access token using refresh token."""
@@ -111,31 +109,31 @@ class GoogleAdsService:
             return self._access_token
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    GOOGLE_OAUTH_TOKEN_URL,
-                    data={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "refresh_token": self.refresh_token,
-                        "grant_type": "refresh_token",
-                    },
+            client = get_http_client("google_ads")
+            response = await client.post(
+                GOOGLE_OAUTH_TOKEN_URL,
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "refresh_token": self.refresh_token,
+                    "grant_type": "refresh_token",
+                },
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    "Google Ads OAuth token refresh failed: %s %s",
+                    response.status_code,
+                    response.text[:200],
                 )
+                return None
 
-                if response.status_code != 200:
-                    logger.error(
-                        "Google Ads OAuth token refresh failed: %s %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return None
-
-                data = response.json()
-                self._access_token = data["access_token"]
-                # Refresh 60 seconds before actual expiry
-                self._token_expires_at = time.time() + data.get("expires_in", 3600) - 60
-                logger.info("Google Ads OAuth token refreshed successfully")
-                return self._access_token
+            data = response.json()
+            self._access_token = data["access_token"]
+            # Refresh 60 seconds before actual expiry
+            self._token_expires_at = time.time() + data.get("expires_in", 3600) - 60
+            logger.info("Google Ads OAuth token refreshed successfully")
+            return self._access_token
 
         except Exception as e:
             logger.error("Google Ads OAuth token refresh error: %s", str(e))
@@ -169,38 +167,38 @@ class GoogleAdsService:
         url = f"{GOOGLE_ADS_BASE_URL}/customers/{customer_id}/googleAds:search"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json={"query": query},
-                )
-
-                self._increment_ops()
-
-                if response.status_code == 401:
-                    # Token might have expired, clear and retry once
-                    self._access_token = None
-                    self._token_expires_at = 0
-                    access_token = await self._refresh_access_token()
-                    if access_token:
-                        response = await client.post(
-                            url,
-                            headers=self._get_headers(access_token),
-                            json={"query": query},
-                        )
-                        self._increment_ops()
-
-                if response.status_code != 200:
-                    logger.error(
-                        "Google Ads API query failed: %s %s",
-                        response.status_code,
-                        response.text[:1000],
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json={"query": query},
+            )
+
+            self._increment_ops()
+
+            if response.status_code == 401:
+                # Token might have expired, clear and retry once
+                self._access_token = None
+                self._token_expires_at = 0
+                access_token = await self._refresh_access_token()
+                if access_token:
+                    response = await client.post(
+                        url,
+                        headers=self._get_headers(access_token),
+                        json={"query": query},
                     )
-                    return None
+                    self._increment_ops()
 
-                data = response.json()
-                return data.get("results", [])
+            if response.status_code != 200:
+                logger.error(
+                    "Google Ads API query failed: %s %s",
+                    response.status_code,
+                    response.text[:1000],
+                )
+                return None
+
+            data = response.json()
+            return data.get("results", [])
 
         except httpx.TimeoutException:
             logger.error("Google Ads API query timed out")
@@ -212,7 +210,7 @@ class GoogleAdsService:
     async def get_account_info(self) -> Optional[dict]:
         """Get Google Ads account information."""
         cache_key = "account_info"
-        cached = self._get_cached(cache_key, CACHE_TTL_STATUS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -240,7 +238,7 @@ class GoogleAdsService:
             "currency": customer.get("currencyCode", "USD"),
             "timezone": customer.get("timeZone", "America/Chicago"),
         }
-        self._set_cache(cache_key, info)
+        await self._set_cache(cache_key, info, ttl=CACHE_TTL_STATUS)
         return info
 
     def _date_range_clause(self, days: int) -> str:
@@ -264,7 +262,7 @@ class GoogleAdsService:
     async def get_performance_metrics(self, days: int = 30) -> Optional[dict]:
         """Get account-level performance metrics."""
         cache_key = f"metrics_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -308,13 +306,13 @@ class GoogleAdsService:
             "ctr": round(ctr, 4),
             "cpa": round(cpa, 2),
         }
-        self._set_cache(cache_key, metrics)
+        await self._set_cache(cache_key, metrics, ttl=CACHE_TTL_METRICS)
         return metrics
 
     async def get_campaigns(self, days: int = 30) -> Optional[list]:
         """Get campaign-level performance data."""
         cache_key = f"campaigns_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_CAMPAIGNS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -353,13 +351,13 @@ class GoogleAdsService:
                 "conversions": round(float(m.get("conversions", 0)), 1),
             })
 
-        self._set_cache(cache_key, campaigns)
+        await self._set_cache(cache_key, campaigns, ttl=CACHE_TTL_CAMPAIGNS)
         return campaigns
 
     async def get_ad_groups(self, days: int = 0) -> Optional[list]:
         """Get ad group level performance data."""
         cache_key = f"ad_groups_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_CAMPAIGNS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -409,13 +407,13 @@ class GoogleAdsService:
                 "cpa": round(cost / conversions, 2) if conversions > 0 else None,
             })
 
-        self._set_cache(cache_key, ad_groups)
+        await self._set_cache(cache_key, ad_groups, ttl=CACHE_TTL_CAMPAIGNS)
         return ad_groups
 
     async def get_search_terms(self, days: int = 7) -> Optional[list]:
         """Get search terms that triggered ads."""
         cache_key = f"search_terms_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_CAMPAIGNS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -455,13 +453,13 @@ class GoogleAdsService:
                 "cpa": round(cost / conversions, 2) if conversions > 0 else None,
             })
 
-        self._set_cache(cache_key, terms)
+        await self._set_cache(cache_key, terms, ttl=CACHE_TTL_CAMPAIGNS)
         return terms
 
     async def get_recommendations(self) -> Optional[list]:
         """Get optimization recommendations from Google Ads."""
         cache_key = "recommendations"
-        cached = self._get_cached(cache_key, CACHE_TTL_RECOMMENDATIONS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -529,7 +527,7 @@ class GoogleAdsService:
                 "impact": impact_text or None,
             })
 
-        self._set_cache(cache_key, recommendations)
+        await self._set_cache(cache_key, recommendations, ttl=CACHE_TTL_RECOMMENDATIONS)
         return recommendations
 
     async def get_full_performance(self, days: int = 30) -> dict:
@@ -559,7 +557,7 @@ class GoogleAdsService:
     async def get_daily_breakdown(self, days: int = 14, campaign_filter: str | None = None) -> Optional[list]:
         """Get daily performance breakdown by campaign. Essential for diagnosing trends."""
         cache_key = f"daily_breakdown_{days}_{campaign_filter}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -608,13 +606,13 @@ class GoogleAdsService:
                 "cpa": round(cost / conversions, 2) if conversions > 0 else None,
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def get_impression_share(self, days: int = 7) -> Optional[list]:
         """Get Search impression share metrics by campaign. Diagnoses visibility issues."""
         cache_key = f"impression_share_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -661,13 +659,13 @@ class GoogleAdsService:
                 "avg_cpc": round(int(m.get("averageCpc", 0)) / 1_000_000, 2),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def get_call_metrics(self, days: int = 14) -> Optional[list]:
         """Get phone call metrics from campaigns and ad groups."""
         cache_key = f"call_metrics_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -713,13 +711,13 @@ class GoogleAdsService:
                 "cost": round(int(m.get("costMicros", 0)) / 1_000_000, 2),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def get_ad_position_metrics(self, days: int = 7) -> Optional[list]:
         """Get ad position metrics — absolute top %, top %, and competitive positioning."""
         cache_key = f"ad_position_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -769,13 +767,13 @@ class GoogleAdsService:
                 "cost": round(int(m.get("costMicros", 0)) / 1_000_000, 2),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def get_auction_insights(self, days: int = 7, campaign_id: str | None = None) -> Optional[list]:
         """Get auction insights — competitor overlap, position above, outranking share."""
         cache_key = f"auction_insights_{days}_{campaign_id}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -813,7 +811,7 @@ class GoogleAdsService:
                 "outranking_share": m.get("auctionInsightSearchOutrankingShare"),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def _get_competitive_fallback(self, days: int = 7) -> list:
@@ -823,7 +821,7 @@ class GoogleAdsService:
     async def get_keyword_performance(self, days: int = 7, campaign_filter: str | None = None) -> Optional[list]:
         """Get keyword-level performance with CPC and position data."""
         cache_key = f"keyword_perf_{days}_{campaign_filter}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -886,13 +884,13 @@ class GoogleAdsService:
                 "cpa": round(cost_micros / 1_000_000 / conversions, 2) if conversions > 0 else None,
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def get_change_history(self, days: int = 14) -> Optional[list]:
         """Get account change history — shows all edits to campaigns, ads, assets, etc."""
         cache_key = f"change_history_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -935,13 +933,13 @@ class GoogleAdsService:
                 "new_resource": ce.get("newResource", {}),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def get_ad_copy(self, campaign_filter: str | None = None) -> Optional[list]:
         """Get current ad copy (RSA headlines/descriptions) by campaign."""
         cache_key = f"ad_copy_{campaign_filter}"
-        cached = self._get_cached(cache_key, CACHE_TTL_CAMPAIGNS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -996,13 +994,13 @@ class GoogleAdsService:
                 "final_urls": ad.get("finalUrls", []),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_CAMPAIGNS)
         return rows
 
     async def get_call_assets(self) -> Optional[list]:
         """Get call extension/asset details across campaigns."""
         cache_key = "call_assets"
-        cached = self._get_cached(cache_key, CACHE_TTL_CAMPAIGNS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -1041,7 +1039,7 @@ class GoogleAdsService:
                 "field_type": ca.get("fieldType", ""),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_CAMPAIGNS)
         return rows
 
     # ─── Nashville-Specific Methods ──────────────────────────────────────
@@ -1049,7 +1047,7 @@ class GoogleAdsService:
     async def get_nashville_today(self) -> Optional[dict]:
         """Get today's real-time metrics for Nashville campaigns only."""
         cache_key = "nashville_today"
-        cached = self._get_cached(cache_key, 300)  # 5 min cache for real-time
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -1122,13 +1120,13 @@ class GoogleAdsService:
             },
             "campaigns": campaigns,
         }
-        self._set_cache(cache_key, result)
+        await self._set_cache(cache_key, result, ttl=300)  # 5 min cache for real-time
         return result
 
     async def get_nashville_hourly(self) -> Optional[list]:
         """Get hourly spend/performance breakdown for Nashville campaigns today."""
         cache_key = "nashville_hourly"
-        cached = self._get_cached(cache_key, 300)  # 5 min cache
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -1169,13 +1167,13 @@ class GoogleAdsService:
             entry["conversions"] = round(entry["conversions"], 1)
             rows.append(entry)
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=300)  # 5 min cache
         return rows
 
     async def get_nashville_budgets(self) -> Optional[list]:
         """Get Nashville campaign budget information."""
         cache_key = "nashville_budgets"
-        cached = self._get_cached(cache_key, 600)  # 10 min cache
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -1218,13 +1216,13 @@ class GoogleAdsService:
                 "conversions": round(float(m.get("conversions", 0)), 1),
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=600)  # 10 min cache
         return rows
 
     async def get_nashville_search_terms(self, days: int = 1) -> Optional[list]:
         """Get search terms for Nashville campaigns only."""
         cache_key = f"nashville_search_terms_{days}"
-        cached = self._get_cached(cache_key, 300)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -1265,13 +1263,13 @@ class GoogleAdsService:
                 "cpa": round(cost / conversions, 2) if conversions > 0 else None,
             })
 
-        self._set_cache(cache_key, terms)
+        await self._set_cache(cache_key, terms, ttl=300)
         return terms
 
     async def get_nashville_keywords(self, days: int = 7) -> Optional[list]:
         """Get keyword-level performance for Nashville campaigns."""
         cache_key = f"nashville_keywords_{days}"
-        cached = self._get_cached(cache_key, CACHE_TTL_METRICS)
+        cached = await self._get_cached(cache_key)
         if cached is not None:
             return cached
 
@@ -1325,7 +1323,7 @@ class GoogleAdsService:
                 "cpa": round(cost_micros / 1_000_000 / conversions, 2) if conversions > 0 else None,
             })
 
-        self._set_cache(cache_key, rows)
+        await self._set_cache(cache_key, rows, ttl=CACHE_TTL_METRICS)
         return rows
 
     async def update_campaign_budget(self, campaign_name: str, new_daily_budget: float) -> dict:
@@ -1390,31 +1388,30 @@ class GoogleAdsService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    mutate_url,
-                    headers=self._get_headers(access_token),
-                    json=payload,
-                )
-                self._increment_ops()
+            client = get_http_client("google_ads")
+            response = await client.post(
+                mutate_url,
+                headers=self._get_headers(access_token),
+                json=payload,
+            )
+            self._increment_ops()
+
+            if response.status_code in (200, 201):
+                # Clear budget cache so next query shows new value
+                cache_service.invalidate_local(f"{CACHE_NAMESPACE}:nashville_budgets")
 
-                if response.status_code in (200, 201):
-                    # Clear budget cache so next query shows new value
-                    if "nashville_budgets" in self._cache:
-                        del self._cache["nashville_budgets"]
-
-                    return {
-                        "success": True,
-                        "campaign": campaign_name,
-                        "old_budget": round(old_budget, 2),
-                        "new_budget": round(new_daily_budget, 2),
-                        "change": round(new_daily_budget - old_budget, 2),
-                        "change_pct": round(((new_daily_budget - old_budget) / old_budget) * 100, 1) if old_budget > 0 else 0,
-                    }
-                else:
-                    error_text = response.text[:500]
-                    logger.error("Budget update failed: %s %s", response.status_code, error_text)
-                    return {"success": False, "error": error_text, "status_code": response.status_code}
+                return {
+                    "success": True,
+                    "campaign": campaign_name,
+                    "old_budget": round(old_budget, 2),
+                    "new_budget": round(new_daily_budget, 2),
+                    "change": round(new_daily_budget - old_budget, 2),
+                    "change_pct": round(((new_daily_budget - old_budget) / old_budget) * 100, 1) if old_budget > 0 else 0,
+                }
+            else:
+                error_text = response.text[:500]
+                logger.error("Budget update failed: %s %s", response.status_code, error_text)
+                return {"success": False, "error": error_text, "status_code": response.status_code}
 
         except Exception as e:
             logger.error("Budget update error: %s", str(e))
@@ -1444,14 +1441,6 @@ class GoogleAdsService:
 
     # ─── Offline Conversion Upload (Enhanced Conversions for Leads) ────
 
-    @staticmethod
-    def _normalize_phone(phone: str) -> str:
-        """Normalize phone to E.164 format for hashing."""
-        digits = re.sub(r"[^\d]", "", phone)
-        if len(digits) == 10:
-            digits = "1" + digits
-        return f"+{digits}"
-
     @staticmethod
     def _normalize_email(email: str) -> str:
         """Normalize email: lowercase, strip whitespace."""
@@ -1515,18 +1504,18 @@ class GoogleAdsService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json=payload,
-                )
-                self._increment_ops()
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json=payload,
+            )
+            self._increment_ops()
 
-                if response.status_code not in (200, 201):
-                    return {"success": False, "error": response.text[:500], "status_code": response.status_code}
+            if response.status_code not in (200, 201):
+                return {"success": False, "error": response.text[:500], "status_code": response.status_code}
 
-                return {"success": True, "data": response.json()}
+            return {"success": True, "data": response.json()}
 
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -1569,36 +1558,36 @@ class GoogleAdsService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json=payload,
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json=payload,
+            )
+            self._increment_ops()
+
+            if response.status_code not in (200, 201):
+                logger.error(
+                    "Failed to create conversion action: %s %s",
+                    response.status_code,
+                    response.text[:1000],
                 )
-                self._increment_ops()
-
-                if response.status_code not in (200, 201):
-                    logger.error(
-                        "Failed to create conversion action: %s %s",
-                        response.status_code,
-                        response.text[:1000],
-                    )
-                    return {"error": response.text[:500], "status_code": response.status_code}
-
-                data = response.json()
-                results = data.get("results", [])
-                if results:
-                    resource_name = results[0].get("resourceName", "")
-                    # Extract the ID from the resource name
-                    action_id = resource_name.split("/")[-1] if resource_name else None
-                    logger.info("Created offline conversion action: %s (ID: %s)", resource_name, action_id)
-                    return {
-                        "resource_name": resource_name,
-                        "conversion_action_id": action_id,
-                        "name": name,
-                        "message": f"Set GOOGLE_ADS_CONVERSION_ACTION_ID={action_id} in Railway env vars",
-                    }
-                return {"error": "No results returned", "data": data}
+                return {"error": response.text[:500], "status_code": response.status_code}
+
+            data = response.json()
+            results = data.get("results", [])
+            if results:
+                resource_name = results[0].get("resourceName", "")
+                # Extract the ID from the resource name
+                action_id = resource_name.split("/")[-1] if resource_name else None
+                logger.info("Created offline conversion action: %s (ID: %s)", resource_name, action_id)
+                return {
+                    "resource_name": resource_name,
+                    "conversion_action_id": action_id,
+                    "name": name,
+                    "message": f"Set GOOGLE_ADS_CONVERSION_ACTION_ID={action_id} in Railway env vars",
+                }
+            return {"error": "No results returned", "data": data}
 
         except Exception as e:
             logger.error("Error creating conversion action: %s", str(e))
@@ -1672,10 +1661,9 @@ class GoogleAdsService:
 
         # Build user identifiers (hashed PII)
         user_identifiers = []
-        if phone:
-            normalized = self._normalize_phone(phone)
+        if phone and to_e164(phone):
             user_identifiers.append({
-                "hashedPhoneNumber": self._sha256_hash(normalized)
+                "hashedPhoneNumber": self._sha256_hash(to_e164(phone))
             })
         if email:
             normalized = self._normalize_email(email)
@@ -1710,44 +1698,44 @@ class GoogleAdsService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json=payload,
-                )
-                self._increment_ops()
-
-                if response.status_code not in (200, 201):
-                    error_text = response.text[:1000]
-                    logger.error("Offline conversion upload failed: %s %s", response.status_code, error_text)
-                    return {"success": False, "error": error_text, "status_code": response.status_code}
-
-                data = response.json()
-                partial_errors = data.get("partialFailureError")
-                if partial_errors:
-                    logger.warning("Partial failure in conversion upload: %s", partial_errors)
-                    return {
-                        "success": False,
-                        "error": "Partial failure",
-                        "details": partial_errors,
-                        "results": data.get("results", []),
-                    }
-
-                results = data.get("results", [])
-                logger.info(
-                    "Offline conversion uploaded: value=$%.2f, order_id=%s, identifiers=%d",
-                    conversion_value,
-                    order_id,
-                    len(user_identifiers),
-                )
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json=payload,
+            )
+            self._increment_ops()
+
+            if response.status_code not in (200, 201):
+                error_text = response.text[:1000]
+                logger.error("Offline conversion upload failed: %s %s", response.status_code, error_text)
+                return {"success": False, "error": error_text, "status_code": response.status_code}
+
+            data = response.json()
+            partial_errors = data.get("partialFailureError")
+            if partial_errors:
+                logger.warning("Partial failure in conversion upload: %s", partial_errors)
                 return {
-                    "success": True,
-                    "results": results,
-                    "conversion_value": conversion_value,
-                    "order_id": order_id,
+                    "success": False,
+                    "error": "Partial failure",
+                    "details": partial_errors,
+                    "results": data.get("results", []),
                 }
 
+            results = data.get("results", [])
+            logger.info(
+                "Offline conversion uploaded: value=$%.2f, order_id=%s, identifiers=%d",
+                conversion_value,
+                order_id,
+                len(user_identifiers),
+            )
+            return {
+                "success": True,
+                "results": results,
+                "conversion_value": conversion_value,
+                "order_id": order_id,
+            }
+
         except Exception as e:
             logger.error("Offline conversion upload error: %s", str(e))
             return {"success": False, "error": str(e)}
@@ -1786,9 +1774,8 @@ class GoogleAdsService:
                 continue
 
             user_identifiers = []
-            if phone:
-                normalized = self._normalize_phone(phone)
-                user_identifiers.append({"hashedPhoneNumber": self._sha256_hash(normalized)})
+            if phone and to_e164(phone):
+                user_identifiers.append({"hashedPhoneNumber": self._sha256_hash(to_e164(phone))})
             if email:
                 normalized = self._normalize_email(email)
                 user_identifiers.append({"hashedEmail": self._sha256_hash(normalized)})
@@ -1825,24 +1812,24 @@ class GoogleAdsService:
             payload = {"conversions": chunk, "partialFailure": True}
 
             try:
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    response = await client.post(
-                        url,
-                        headers=self._get_headers(access_token),
-                        json=payload,
-                    )
-                    self._increment_ops()
+                client = get_http_client("google_ads")
+                response = await client.post(
+                    url,
+                    headers=self._get_headers(access_token),
+                    json=payload,
+                )
+                self._increment_ops()
 
-                    if response.status_code not in (200, 201):
-                        errors.append({"chunk": chunk_start, "error": response.text[:500]})
-                        continue
+                if response.status_code not in (200, 201):
+                    errors.append({"chunk": chunk_start, "error": response.text[:500]})
+                    continue
 
-                    data = response.json()
-                    partial_errors = data.get("partialFailureError")
-                    if partial_errors:
-                        errors.append({"chunk": chunk_start, "partial_errors": partial_errors})
+                data = response.json()
+                partial_errors = data.get("partialFailureError")
+                if partial_errors:
+                    errors.append({"chunk": chunk_start, "partial_errors": partial_errors})
 
-                    uploaded += len(chunk)
+                uploaded += len(chunk)
 
             except Exception as e:
                 errors.append({"chunk": chunk_start, "error": str(e)})
@@ -1930,28 +1917,28 @@ class GoogleAdsService:
             return {"success": False, "error": "No valid operations built"}
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json={"mutateOperations": operations},
-                )
-                self._increment_ops()
-
-                if response.status_code in (200, 201):
-                    result = response.json()
-                    results_list = result.get("mutateOperationResponses", [])
-                    return {
-                        "success": True,
-                        "applied_count": len(results_list),
-                        "keywords": [kw.get("keyword_text") for kw in keywords if kw.get("keyword_text", "").strip()],
-                        "campaigns_affected": len(campaigns),
-                        "campaign_filter": campaign_filter,
-                    }
-                else:
-                    error_text = response.text[:500]
-                    logger.error("Failed to apply negative keywords: %s %s", response.status_code, error_text)
-                    return {"success": False, "error": error_text, "status_code": response.status_code}
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json={"mutateOperations": operations},
+            )
+            self._increment_ops()
+
+            if response.status_code in (200, 201):
+                result = response.json()
+                results_list = result.get("mutateOperationResponses", [])
+                return {
+                    "success": True,
+                    "applied_count": len(results_list),
+                    "keywords": [kw.get("keyword_text") for kw in keywords if kw.get("keyword_text", "").strip()],
+                    "campaigns_affected": len(campaigns),
+                    "campaign_filter": campaign_filter,
+                }
+            else:
+                error_text = response.text[:500]
+                logger.error("Failed to apply negative keywords: %s %s", response.status_code, error_text)
+                return {"success": False, "error": error_text, "status_code": response.status_code}
 
         except Exception as e:
             logger.error("Negative keyword application error: %s", str(e))
@@ -2051,38 +2038,38 @@ class GoogleAdsService:
             return {"success": False, "error": "No valid operations built"}
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json={"mutateOperations": operations},
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json={"mutateOperations": operations},
+            )
+            self._increment_ops()
+
+            if response.status_code in (200, 201):
+                result = response.json()
+                results_list = result.get("mutateOperationResponses", [])
+                return {
+                    "success": True,
+                    "applied_count": len(results_list),
+                    "campaigns_affected": len(campaigns),
+                    "ip_count": len(ips),
+                    "errors": [],
+                }
+            else:
+                error_text = response.text[:1000]
+                logger.error(
+                    "Failed to apply IP block negatives: %s %s",
+                    response.status_code,
+                    error_text,
                 )
-                self._increment_ops()
-
-                if response.status_code in (200, 201):
-                    result = response.json()
-                    results_list = result.get("mutateOperationResponses", [])
-                    return {
-                        "success": True,
-                        "applied_count": len(results_list),
-                        "campaigns_affected": len(campaigns),
-                        "ip_count": len(ips),
-                        "errors": [],
-                    }
-                else:
-                    error_text = response.text[:1000]
-                    logger.error(
-                        "Failed to apply IP block negatives: %s %s",
-                        response.status_code,
-                        error_text,
-                    )
-                    return {
-                        "success": False,
-                        "applied_count": 0,
-                        "campaigns_affected": len(campaigns),
-                        "errors": [error_text],
-                        "status_code": response.status_code,
-                    }
+                return {
+                    "success": False,
+                    "applied_count": 0,
+                    "campaigns_affected": len(campaigns),
+                    "errors": [error_text],
+                    "status_code": response.status_code,
+                }
 
         except Exception as e:
             logger.error("IP block application error: %s", str(e))
@@ -2158,27 +2145,27 @@ class GoogleAdsService:
         ]
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json={"mutateOperations": operations},
-                )
-                self._increment_ops()
-
-                if response.status_code in (200, 201):
-                    result = response.json()
-                    removed = len(result.get("mutateOperationResponses", []))
-                    return {
-                        "success": True,
-                        "removed_count": removed,
-                        "keywords": [kw.get("keyword_text") for kw in keywords],
-                        "campaign_filter": campaign_filter,
-                    }
-                else:
-                    error_text = response.text[:500]
-                    logger.error("Failed to remove negative keywords: %s %s", response.status_code, error_text)
-                    return {"success": False, "error": error_text}
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json={"mutateOperations": operations},
+            )
+            self._increment_ops()
+
+            if response.status_code in (200, 201):
+                result = response.json()
+                removed = len(result.get("mutateOperationResponses", []))
+                return {
+                    "success": True,
+                    "removed_count": removed,
+                    "keywords": [kw.get("keyword_text") for kw in keywords],
+                    "campaign_filter": campaign_filter,
+                }
+            else:
+                error_text = response.text[:500]
+                logger.error("Failed to remove negative keywords: %s %s", response.status_code, error_text)
+                return {"success": False, "error": error_text}
 
         except Exception as e:
             logger.error("Remove negative keywords error: %s", str(e))
@@ -2248,34 +2235,34 @@ class GoogleAdsService:
             })
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json={"mutateOperations": operations},
-                )
-                self._increment_ops()
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json={"mutateOperations": operations},
+            )
+            self._increment_ops()
+
+            if response.status_code in (200, 201):
+                result = response.json()
+                responses = result.get("mutateOperationResponses", [])
+                # First response is the ad group creation
+                ad_group_rn = None
+                if responses:
+                    ag_result = responses[0].get("adGroupResult", {})
+                    ad_group_rn = ag_result.get("resourceName")
 
-                if response.status_code in (200, 201):
-                    result = response.json()
-                    responses = result.get("mutateOperationResponses", [])
-                    # First response is the ad group creation
-                    ad_group_rn = None
-                    if responses:
-                        ag_result = responses[0].get("adGroupResult", {})
-                        ad_group_rn = ag_result.get("resourceName")
-
-                    return {
-                        "success": True,
-                        "ad_group_resource_name": ad_group_rn,
-                        "ad_group_name": ad_group_name,
-                        "campaign_id": campaign_id,
-                        "keywords_added": len(operations) - 1,
-                    }
-                else:
-                    error_text = response.text[:500]
-                    logger.error("Failed to create ad group: %s %s", response.status_code, error_text)
-                    return {"success": False, "error": error_text, "status_code": response.status_code}
+                return {
+                    "success": True,
+                    "ad_group_resource_name": ad_group_rn,
+                    "ad_group_name": ad_group_name,
+                    "campaign_id": campaign_id,
+                    "keywords_added": len(operations) - 1,
+                }
+            else:
+                error_text = response.text[:500]
+                logger.error("Failed to create ad group: %s %s", response.status_code, error_text)
+                return {"success": False, "error": error_text, "status_code": response.status_code}
 
         except Exception as e:
             logger.error("Ad group creation error: %s", str(e))
@@ -2353,18 +2340,18 @@ class GoogleAdsService:
         # Execute removals if any
         if remove_operations:
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.post(
-                        url,
-                        headers=self._get_headers(access_token),
-                        json={"mutateOperations": remove_operations},
-                    )
-                    self._increment_ops()
-                    if response.status_code in (200, 201):
-                        removed_count = len(response.json().get("mutateOperationResponses", []))
-                        logger.info("Removed %d existing ad schedule criteria", removed_count)
-                    else:
-                        logger.warning("Remove ad schedule failed: %s", response.text[:300])
+                client = get_http_client("google_ads")
+                response = await client.post(
+                    url,
+                    headers=self._get_headers(access_token),
+                    json={"mutateOperations": remove_operations},
+                )
+                self._increment_ops()
+                if response.status_code in (200, 201):
+                    removed_count = len(response.json().get("mutateOperationResponses", []))
+                    logger.info("Removed %d existing ad schedule criteria", removed_count)
+                else:
+                    logger.warning("Remove ad schedule failed: %s", response.text[:300])
             except Exception as e:
                 logger.warning("Remove ad schedule error (continuing): %s", str(e))
 
@@ -2405,28 +2392,28 @@ class GoogleAdsService:
             }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(access_token),
-                    json={"mutateOperations": create_operations},
-                )
-                self._increment_ops()
-
-                if response.status_code in (200, 201):
-                    result = response.json()
-                    applied = len(result.get("mutateOperationResponses", []))
-                    return {
-                        "success": True,
-                        "removed_count": removed_count,
-                        "applied_count": applied,
-                        "campaigns_affected": len(campaigns),
-                        "schedule_entries": len(schedule),
-                    }
-                else:
-                    error_text = response.text[:500]
-                    logger.error("Failed to set ad schedule: %s %s", response.status_code, error_text)
-                    return {"success": False, "error": error_text, "status_code": response.status_code}
+            client = get_http_client("google_ads")
+            response = await client.post(
+                url,
+                headers=self._get_headers(access_token),
+                json={"mutateOperations": create_operations},
+            )
+            self._increment_ops()
+
+            if response.status_code in (200, 201):
+                result = response.json()
+                applied = len(result.get("mutateOperationResponses", []))
+                return {
+                    "success": True,
+                    "removed_count": removed_count,
+                    "applied_count": applied,
+                    "campaigns_affected": len(campaigns),
+                    "schedule_entries": len(schedule),
+                }
+            else:
+                error_text = response.text[:500]
+                logger.error("Failed to set ad schedule: %s %s", response.status_code, error_text)
+                return {"success": False, "error": error_text, "status_code": response.status_code}
 
         except Exception as e:
             logger.error("Ad schedule bid modifier error: %s", str(e))
@@ -0,0 +1,400 @@
+"""
+GPS ingest — batched location updates from the mobile app.
+
+ingest_locations() takes any number of points for any number of technicians
+and, in one transaction:
+- writes every point to location_history with one multi-row INSERT, with
+  the miles from the technician's previous point and the running total for
+  the day
+- upserts the latest point per technician into technician_locations with
+  one INSERT ... ON CONFLICT (an older point never overwrites a newer one)
+- evaluates geofence entry/exit for every point against an in-memory
+  FenceSet and records the GeofenceEvent rows with one INSERT
+After the commit the technicians' new positions go to the technician state
+snapshot and the ETA engine (which re-estimates their en-route jobs).
+
+State kept per worker:
+    fences      active geofences, rebuilt after ORM writes to Geofence or
+                every FENCES_TTL seconds
+    tracks      per technician: last point, day total and the fences it is
+                inside. Seeded from location_history and the last
+                GeofenceEvent per fence the first time a technician is seen,
+                and again after TRACK_TTL seconds without points (another
+                worker may have taken the points in between).
+
+Usage:
+    result = await ingest_locations(db, [(technician_id, location), ...])
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_, event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.models.gps_tracking import Geofence, GeofenceAction, GeofenceEvent, LocationHistory, TechnicianLocation
+from app.schemas.gps_tracking import LocationUpdate
+from app.services.eta_service import get_eta_engine
+from app.services.geo import Fence, FenceSet, haversine_pairs
+from app.services.technician_state import get_technician_state
+
+logger = logging.getLogger(__name__)
+
+FENCES_TTL = 300
+TRACK_TTL = 120
+
+
+@dataclass
+class Track:
+    """What this worker knows about one technician's movement."""
+
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    day: Optional[Any] = None
+    cumulative: float = 0.0
+    inside: set = field(default_factory=set)
+    seen: float = 0.0
+
+
+class GPSIngest:
+    def __init__(self):
+        self.fences: Optional[FenceSet] = None
+        self._fences_loaded = 0.0
+        self.tracks: dict[uuid.UUID, Track] = {}
+
+    def invalidate_fences(self) -> None:
+        self.fences = None
+
+    async def ingest(self, db: AsyncSession, points: Iterable[tuple[Any, LocationUpdate]]) -> dict:
+        """Write a batch of (technician_id, location) points and return the geofence events it caused."""
+        rows = sorted(
+            ((_uuid(tech_id), _naive_utc(loc.captured_at), loc) for tech_id, loc in points),
+            key=lambda row: (str(row[0]), row[1]),
+        )
+        if not rows:
+            return {"processed": 0, "technicians": 0, "geofence_events": []}
+
+        tech_ids = [row[0] for row in rows]
+        lats = np.fromiter((row[2].latitude for row in rows), dtype=np.float64, count=len(rows))
+        lngs = np.fromiter((row[2].longitude for row in rows), dtype=np.float64, count=len(rows))
+        # Slices of the sorted batch, one per technician
+        starts = [0] + [i for i in range(1, len(rows)) if tech_ids[i] != tech_ids[i - 1]]
+        groups = list(zip(starts, starts[1:] + [len(rows)]))
+
+        now = time.monotonic()
+        batch_techs = {tech_ids[a] for a, _ in groups}
+        stale = [tech for tech in batch_techs if tech not in self.tracks or now - self.tracks[tech].seen > TRACK_TTL]
+        fences = await self._fence_set(db)
+        # Work on copies so a failed write leaves the tracks as they were
+        tracks = {tech: Track(**vars(self.tracks[tech])) for tech in batch_techs - set(stale)}
+        tracks.update(await self._seed_tracks(db, stale, fences))
+
+        # Miles from each point's predecessor (the track's last point for the first of a group)
+        prev_lat, prev_lng = np.roll(lats, 1), np.roll(lngs, 1)
+        for a, _ in groups:
+            track = tracks.get(tech_ids[a])
+            prev_lat[a] = track.lat if track and track.lat is not None else np.nan
+            prev_lng[a] = track.lng if track and track.lng is not None else np.nan
+        miles = np.nan_to_num(haversine_pairs(prev_lat, prev_lng, lats, lngs)).tolist()
+
+        inside = fences.contains(lats, lngs) if len(fences) else None
+        fence_ids = [fence.id for fence in fences.fences]
+        columns = {fence_id: f for f, fence_id in enumerate(fence_ids)}
+
+        history, events, latest = [], [], []
+        for a, b in groups:
+            tech = tech_ids[a]
+            track = tracks.setdefault(tech, Track())
+            for i in range(a, b):
+                _, captured_at, loc = rows[i]
+                if track.day != captured_at.date():
+                    track.day, track.cumulative = captured_at.date(), 0.0
+                track.cumulative += miles[i]
+                history.append({
+                    "id": uuid.uuid4(),
+                    "technician_id": tech,
+                    "work_order_id": _uuid(loc.work_order_id),
+                    "latitude": loc.latitude,
+                    "longitude": loc.longitude,
+                    "accuracy": loc.accuracy,
+                    "speed": loc.speed,
+                    "heading": loc.heading,
+                    "distance_from_previous": miles[i],
+                    "cumulative_distance": track.cumulative,
+                    "captured_at": captured_at,
+                    "status": loc.current_status,
+                })
+            track.lat, track.lng = float(lats[b - 1]), float(lngs[b - 1])
+            track.seen = now
+            latest.append(rows[b - 1])
+
+            if inside is None:
+                track.inside = set()
+                continue
+            before = np.zeros(len(fence_ids), dtype=bool)
+            before[[columns[fence_id] for fence_id in track.inside if fence_id in columns]] = True
+            states = np.vstack([before, inside[a:b]])
+            for row, f in zip(*np.nonzero(states[1:] != states[:-1])):
+                events.append(self._event(fences.fences[f], tech, rows[a + row], bool(states[row + 1, f])))
+            track.inside = {fence_ids[f] for f in np.flatnonzero(states[-1]).tolist()}
+
+        try:
+            await db.execute(insert(LocationHistory), history)
+            await db.execute(_upsert_statement(db.get_bind().dialect.name), _latest_rows(latest))
+            if events:
+                await db.execute(insert(GeofenceEvent), events)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        self.tracks.update(tracks)
+        state = get_technician_state()
+        for tech, captured_at, loc in latest:
+            state.record_gps(tech, loc.latitude, loc.longitude, captured_at=captured_at, speed=loc.speed)
+        try:
+            await get_eta_engine().update_for_positions(
+                db, [(tech, loc.latitude, loc.longitude, loc.speed) for tech, _, loc in latest]
+            )
+        except Exception as e:
+            logger.warning(f"ETA update after GPS ingest failed: {e}")
+
+        return {
+            "processed": len(rows),
+            "technicians": len(groups),
+            "geofence_events": [
+                {
+                    "geofence_id": str(e["geofence_id"]),
+                    "technician_id": str(e["technician_id"]),
+                    "event_type": e["event_type"],
+                    "action": e["action_triggered"].value if e["action_triggered"] else None,
+                    "occurred_at": e["occurred_at"].isoformat(),
+                }
+                for e in events
+            ],
+        }
+
+    def _event(self, fence: Fence, tech: uuid.UUID, row: tuple, entered: bool) -> dict:
+        geofence = fence.item
+        event_type = "entry" if entered else "exit"
+        action = geofence["entry_action"] if entered else geofence["exit_action"]
+        _, captured_at, loc = row
+        return {
+            "id": uuid.uuid4(),
+            "geofence_id": fence.id,
+            "technician_id": tech,
+            "work_order_id": _uuid(loc.work_order_id),
+            "event_type": event_type,
+            "latitude": loc.latitude,
+            "longitude": loc.longitude,
+            "action_triggered": action,
+            "action_result": "success",
+            "action_details": _action_details(action, geofence, captured_at),
+            "occurred_at": captured_at,
+        }
+
+    # -- loading ------------------------------------------------------------
+
+    async def _fence_set(self, db: AsyncSession) -> FenceSet:
+        now = time.monotonic()
+        if self.fences is None or now - self._fences_loaded > FENCES_TTL:
+            result = await db.execute(select(Geofence).where(Geofence.is_active == True))  # noqa: E712
+            self.fences = FenceSet([
+                Fence(
+                    gf.id,
+                    gf.center_latitude,
+                    gf.center_longitude,
+                    radius_meters=gf.radius_meters,
+                    polygon=gf.polygon_coordinates,
+                    item={
+                        "entry_action": gf.entry_action,
+                        "exit_action": gf.exit_action,
+                        "customer_id": gf.customer_id,
+                        "work_order_id": gf.work_order_id,
+                    },
+                )
+                for gf in result.scalars().all()
+            ])
+            self._fences_loaded = now
+        return self.fences
+
+    async def _seed_tracks(self, db: AsyncSession, tech_ids: Sequence[uuid.UUID], fences: FenceSet) -> dict:
+        """Last point, today's total and geofence state for technicians this worker hasn't seen lately."""
+        if not tech_ids:
+            return {}
+        tracks = {tech: Track() for tech in tech_ids}
+
+        last = (
+            select(LocationHistory.technician_id, func.max(LocationHistory.captured_at).label("captured_at"))
+            .where(LocationHistory.technician_id.in_(tech_ids))
+            .group_by(LocationHistory.technician_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(
+                LocationHistory.technician_id,
+                LocationHistory.latitude,
+                LocationHistory.longitude,
+                LocationHistory.cumulative_distance,
+                LocationHistory.captured_at,
+            ).join(
+                last,
+                and_(
+                    LocationHistory.technician_id == last.c.technician_id,
+                    LocationHistory.captured_at == last.c.captured_at,
+                ),
+            )
+        )
+        for row in result.all():
+            track = tracks[row.technician_id]
+            track.lat, track.lng = row.latitude, row.longitude
+            track.day, track.cumulative = row.captured_at.date(), row.cumulative_distance or 0.0
+
+        if len(fences):
+            latest = (
+                select(
+                    GeofenceEvent.technician_id,
+                    GeofenceEvent.geofence_id,
+                    func.max(GeofenceEvent.occurred_at).label("occurred_at"),
+                )
+                .where(GeofenceEvent.technician_id.in_(tech_ids))
+                .group_by(GeofenceEvent.technician_id, GeofenceEvent.geofence_id)
+                .subquery()
+            )
+            result = await db.execute(
+                select(GeofenceEvent.technician_id, GeofenceEvent.geofence_id).join(
+                    latest,
+                    and_(
+                        GeofenceEvent.technician_id == latest.c.technician_id,
+                        GeofenceEvent.geofence_id == latest.c.geofence_id,
+                        GeofenceEvent.occurred_at == latest.c.occurred_at,
+                    ),
+                ).where(GeofenceEvent.event_type == "entry")
+            )
+            for row in result.all():
+                tracks[row.technician_id].inside.add(row.geofence_id)
+        return tracks
+
+
+def _latest_rows(latest: list[tuple]) -> list[dict]:
+    """INSERT ... ON CONFLICT (technician_id) rows for the newest point of each technician."""
+    received_at = datetime.utcnow()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "technician_id": tech,
+            "latitude": loc.latitude,
+            "longitude": loc.longitude,
+            "accuracy": loc.accuracy,
+            "speed": loc.speed,
+            "heading": loc.heading,
+            "is_online": True,
+            "battery_level": loc.battery_level,
+            "captured_at": captured_at,
+            "received_at": received_at,
+            "current_status": "available",
+        }
+        for tech, captured_at, loc in latest
+    ]
+
+
+@lru_cache(maxsize=None)
+def _upsert_statement(dialect: str):
+    """The latest-position upsert, built once per dialect so its compiled form is cached."""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(TechnicianLocation)
+    # Same columns the single-point endpoint has always refreshed; status is left to the job flow
+    updated = ("latitude", "longitude", "accuracy", "speed", "heading", "is_online", "battery_level", "captured_at",
+               "received_at")
+    return stmt.on_conflict_do_update(
+        index_elements=[TechnicianLocation.technician_id],
+        set_={name: stmt.excluded[name] for name in updated},
+        where=TechnicianLocation.captured_at <= stmt.excluded.captured_at,
+    )
+
+
+def _action_details(action: Optional[GeofenceAction], geofence: dict, at: datetime) -> dict:
+    """What a geofence action did; mirrors the placeholders in GPSTrackingService."""
+    if action == GeofenceAction.CLOCK_IN:
+        return {"action": "clock_in", "timestamp": at.isoformat()}
+    if action == GeofenceAction.CLOCK_OUT:
+        return {"action": "clock_out", "timestamp": at.isoformat()}
+    if action == GeofenceAction.NOTIFY_CUSTOMER:
+        customer_id = geofence["customer_id"]
+        return {"notification_sent": True, "customer_id": str(customer_id) if customer_id else None}
+    if action == GeofenceAction.START_JOB:
+        work_order_id = geofence["work_order_id"]
+        return {"job_started": True, "work_order_id": str(work_order_id) if work_order_id else None}
+    return {}
+
+
+def _uuid(value: Any) -> Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """captured_at columns are naive UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+_ingest: Optional[GPSIngest] = None
+
+
+def get_gps_ingest() -> GPSIngest:
+    """Get or create this worker's ingest pipeline."""
+    global _ingest
+    if _ingest is None:
+        _ingest = GPSIngest()
+    return _ingest
+
+
+async def ingest_locations(db: AsyncSession, points: Iterable[tuple[Any, LocationUpdate]]) -> dict:
+    """Ingest (technician_id, location) points; see GPSIngest.ingest."""
+    return await get_gps_ingest().ingest(db, points)
+
+
+# ---------------------------------------------------------------------------
+# Rebuild the fence set after geofence changes
+# ---------------------------------------------------------------------------
+
+_SESSION_INFO_KEY = "gps_ingest_fences_changed"
+
+
+@event.listens_for(Geofence, "after_insert")
+@event.listens_for(Geofence, "after_update")
+@event.listens_for(Geofence, "after_delete")
+def _geofence_written(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        get_gps_ingest().invalidate_fences()
+        return
+    session.info[_SESSION_INFO_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    if session.info.pop(_SESSION_INFO_KEY, False):
+        get_gps_ingest().invalidate_fences()
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -7,7 +7,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Tuple
-import math
 import secrets
 
 from app.models.gps_tracking import (
@@ -31,19 +30,13 @@ from app.schemas.gps_tracking import (
     DispatchMapTechnician,
     DispatchMapWorkOrder,
 )
+from app.services.eta_service import estimate_duration, traffic_factor
+from app.services.geo import METERS_PER_MILE, haversine_miles
 
 
 class GPSTrackingService:
     """Service for GPS tracking operations"""
 
-    # Earth radius in miles for distance calculations
-    EARTH_RADIUS_MILES = 3959
-
-    # Default speeds for ETA estimation (mph)
-    DEFAULT_CITY_SPEED = 25
-    DEFAULT_HIGHWAY_SPEED = 55
-    DEFAULT_RURAL_SPEED = 45
-
     # Stale location threshold (minutes)
     STALE_THRESHOLD_MINUTES = 5
 
@@ -62,7 +55,7 @@ class GPSTrackingService:
         if current:
             # Calculate distance from previous location
             prev_lat, prev_lng = current.latitude, current.longitude
-            distance = self._calculate_distance(prev_lat, prev_lng, location.latitude, location.longitude)
+            distance = haversine_miles(prev_lat, prev_lng, location.latitude, location.longitude)
 
             # Update existing record
             current.latitude = location.latitude
@@ -374,7 +367,7 @@ class GPSTrackingService:
         dest_lng = customer.longitude if hasattr(customer, "longitude") and customer.longitude else -96.0
 
         # Calculate distance
-        distance_miles = self._calculate_distance(tech_location.latitude, tech_location.longitude, dest_lat, dest_lng)
+        distance_miles = haversine_miles(tech_location.latitude, tech_location.longitude, dest_lat, dest_lng)
 
         # Estimate duration based on distance and time of day
         base_duration = self._estimate_duration(distance_miles, tech_location.speed)
@@ -446,36 +439,14 @@ class GPSTrackingService:
 
     def _estimate_duration(self, distance_miles: float, current_speed: Optional[float]) -> int:
         """Estimate travel duration in minutes"""
-        # Use current speed if available and reasonable
-        if current_speed and 5 < current_speed < 80:
-            estimated_speed = current_speed
-        elif distance_miles < 5:
-            estimated_speed = self.DEFAULT_CITY_SPEED
-        elif distance_miles < 20:
-            estimated_speed = self.DEFAULT_RURAL_SPEED
-        else:
-            estimated_speed = self.DEFAULT_HIGHWAY_SPEED
-
-        duration_hours = distance_miles / estimated_speed
-        return max(1, int(duration_hours * 60))
+        return estimate_duration(distance_miles, current_speed)
 
     def _get_traffic_factor(self) -> float:
         """
         Get traffic factor based on time of day
         1.0 = normal, 1.5 = 50% longer due to traffic
         """
-        hour = datetime.utcnow().hour
-
-        # Rush hour periods (adjusted for UTC - assuming Central Time)
-        morning_rush = 13 <= hour <= 15  # 7-9 AM CT
-        evening_rush = 22 <= hour <= 24 or 0 <= hour <= 1  # 4-7 PM CT
-
-        if morning_rush or evening_rush:
-            return 1.4
-        elif 15 <= hour <= 22:  # Daytime
-            return 1.1
-        else:  # Night
-            return 1.0
+        return traffic_factor()
 
     # ==================== Geofencing ====================
 
@@ -516,8 +487,8 @@ class GPSTrackingService:
         if geofence.radius_meters:
             # Circle geofence
             distance_meters = (
-                self._calculate_distance(lat, lng, geofence.center_latitude, geofence.center_longitude) * 1609.34
-            )  # Convert miles to meters
+                haversine_miles(lat, lng, geofence.center_latitude, geofence.center_longitude) * METERS_PER_MILE
+            )
 
             return distance_meters <= geofence.radius_meters
 
@@ -752,23 +723,6 @@ class GPSTrackingService:
         else:
             return "scheduled", "Your service is scheduled. We'll notify you when your technician is on the way."
 
-    # ==================== Utility Methods ====================
-
-    def _calculate_distance(self, lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-        """
-        Calculate distance between two coordinates using Haversine formula
-        Returns distance in miles
-        """
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lng = math.radians(lng2 - lng1)
-
-        a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        return self.EARTH_RADIUS_MILES * c
-
 
 # ==================== Geofence CRUD Operations ====================
 
@@ -0,0 +1,244 @@
+"""
+Shared, pooled HTTP clients for outbound integrations, one connection pool per upstream.
+
+Opening an httpx.AsyncClient per call pays TCP+TLS setup on every request
+and never reuses a connection. Here:
+
+- Each upstream (UPSTREAMS) gets one connection pool, kept alive for the
+  life of the worker and closed at shutdown (lifespan calls aclose())
+- Per-upstream connection limits and timeouts, and HTTP/2 where the
+  upstream benefits and the optional h2 package is installed
+- Retries with exponential backoff and full jitter: connection failures for
+  any request (nothing was sent), and timeouts, dropped connections and
+  429/502/503/504 answers for idempotent methods only; Retry-After is
+  honored. The final answer or error is returned to the caller unchanged
+- Metrics: crm_http_client_requests_total{upstream,outcome},
+  crm_http_client_duration_seconds{upstream} (time to response headers),
+  crm_http_client_retries_total{upstream}
+- Tests: get_http_clients().mount(transport) sends every upstream through
+  one transport, e.g. httpx.MockTransport(handler) or
+  httpx.ASGITransport(app=mock_server), so nothing touches the network
+
+Usage:
+    client = get_http_client("sendgrid")
+    resp = await client.post(f"{BASE_URL}/mail/send", json=payload, headers=headers)
+
+    # Default base URL and headers (clients with the same options are shared)
+    client = get_http_client("ringcentral", base_url=config.server_url)
+"""
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+from app.core.metrics import track_http_client_request, track_http_client_retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 10.0
+# Nothing reached the upstream: safe to resend whatever the method
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# The request may have been processed: resend only idempotent methods
+_INTERRUPTED_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """Connection and retry policy for one outbound integration."""
+
+    name: str
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    max_connections: Optional[int] = None  # HTTP_CLIENT_MAX_CONNECTIONS
+    max_keepalive: Optional[int] = None  # half of max_connections
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    retries: Optional[int] = None  # HTTP_CLIENT_RETRIES
+
+
+UPSTREAMS: dict[str, Upstream] = {
+    upstream.name: upstream
+    for upstream in (
+        Upstream("anthropic", timeout=120.0, http2=True),
+        Upstream("openai", timeout=60.0, http2=True),
+        # Self-hosted Ollama/Whisper: often offline, so fail fast instead of retrying
+        Upstream("local_ai", timeout=300.0, retries=0),
+        Upstream("brevo", timeout=15.0),
+        Upstream("sendgrid", timeout=15.0),
+        Upstream("quickbooks", timeout=30.0),
+        Upstream("ms_graph", timeout=30.0, http2=True, max_connections=50),
+        Upstream("google_ads", timeout=30.0, http2=True),
+        Upstream("open_meteo", timeout=10.0),
+        # Nominatim's usage policy: the geocoder rate-limits and records misses itself
+        Upstream("nominatim", timeout=5.0, max_connections=2, retries=0),
+        Upstream("samsara", timeout=30.0),
+        Upstream("ringcentral", timeout=30.0),
+        Upstream("twilio", timeout=30.0),
+        Upstream("cartesia", timeout=10.0),
+    )
+}
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _UpstreamTransport(httpx.AsyncBaseTransport):
+    """Retries and metrics around an upstream's shared connection pool."""
+
+    def __init__(self, upstream: Upstream, pool: httpx.AsyncBaseTransport):
+        self.upstream = upstream
+        self.retries = settings.HTTP_CLIENT_RETRIES if upstream.retries is None else upstream.retries
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        name = self.upstream.name
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await self._pool.handle_async_request(request)
+            except httpx.TransportError as e:
+                track_http_client_request(name, "error", time.perf_counter() - started)
+                retry = isinstance(e, _UNSENT_ERRORS) or (
+                    isinstance(e, _INTERRUPTED_ERRORS) and request.method in IDEMPOTENT_METHODS
+                )
+                if not retry or attempt >= self.retries:
+                    raise
+                wait = None
+                reason = type(e).__name__
+            else:
+                track_http_client_request(name, f"{response.status_code // 100}xx", time.perf_counter() - started)
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or request.method not in IDEMPOTENT_METHODS
+                    or attempt >= self.retries
+                ):
+                    return response
+                wait = _retry_after(response)
+                reason = f"HTTP {response.status_code}"
+                await response.aclose()
+            attempt += 1
+            if wait is None:
+                wait = random.uniform(0, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            wait = min(wait, RETRY_MAX_SECONDS)
+            track_http_client_retry(name)
+            logger.info(f"{name}: {reason} on {request.method} {request.url.path}, retry {attempt} in {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    async def aclose(self) -> None:
+        # The pool is shared by every client of the upstream; the registry closes it
+        pass
+
+
+class HTTPClients:
+    """This worker's upstream connection pools and the clients built on them."""
+
+    def __init__(self, upstreams: Optional[dict[str, Upstream]] = None):
+        self.upstreams = UPSTREAMS if upstreams is None else upstreams
+        self._pools: dict[str, httpx.AsyncBaseTransport] = {}
+        self._clients: dict[tuple, httpx.AsyncClient] = {}
+        self._mounted: Optional[httpx.AsyncBaseTransport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def client(self, upstream: str, base_url: str = "", headers: Optional[dict[str, str]] = None) -> httpx.AsyncClient:
+        """The shared client for upstream (one per base_url/headers combination, all on one pool)."""
+        self._check_loop()
+        key = (upstream, base_url, tuple(sorted((headers or {}).items())))
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            policy = self.upstreams.get(upstream) or Upstream(upstream)
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                headers=headers,
+                timeout=httpx.Timeout(policy.timeout, connect=policy.connect_timeout),
+                transport=_UpstreamTransport(policy, self._pool(policy)),
+            )
+            self._clients[key] = client
+        return client
+
+    def mount(self, transport: Optional[httpx.AsyncBaseTransport]) -> None:
+        """Send every upstream's requests through transport (tests); None restores real connections."""
+        self._mounted = transport
+        self._clients.clear()
+        self._pools.clear()
+
+    async def aclose(self) -> None:
+        """Close every pool (lifespan shutdown); clients asked for afterwards open new ones."""
+        pools, self._pools, self._clients = list(self._pools.values()), {}, {}
+        for pool in pools:
+            try:
+                await pool.aclose()
+            except Exception as e:
+                logger.debug(f"HTTP pool close failed: {e}")
+
+    def _pool(self, policy: Upstream) -> httpx.AsyncBaseTransport:
+        if self._mounted is not None:
+            return self._mounted
+        pool = self._pools.get(policy.name)
+        if pool is None:
+            max_connections = policy.max_connections or settings.HTTP_CLIENT_MAX_CONNECTIONS
+            pool = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=policy.max_keepalive or max(1, max_connections // 2),
+                    keepalive_expiry=policy.keepalive_expiry,
+                ),
+                http2=policy.http2 and HTTP2_AVAILABLE,
+            )
+            self._pools[policy.name] = pool
+        return pool
+
+    def _check_loop(self) -> None:
+        # Pooled connections belong to the event loop that opened them
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if loop is not self._loop:
+            if self._loop is not None:
+                self._clients.clear()
+                self._pools.clear()
+            self._loop = loop
+
+
+_clients: Optional[HTTPClients] = None
+
+
+def get_http_clients() -> HTTPClients:
+    """Get or create this worker's HTTP client registry."""
+    global _clients
+    if _clients is None:
+        _clients = HTTPClients()
+    return _clients
+
+
+def get_http_client(upstream: str, base_url: str = "", headers: Optional[dict[str, str]] = None) -> httpx.AsyncClient:
+    """The shared, pooled client for an upstream (see UPSTREAMS)."""
+    return get_http_clients().client(upstream, base_url=base_url, headers=headers)
@@ -1,6 +1,6 @@
 """IoT alert dispatch — creates IoTAlert rows, sends SMS, broadcasts WebSocket events.
 
-Reuses existing Twilio SMS pipeline (Message rows + APScheduler send loop) and
+Reuses the outbound SMS dispatcher (Message rows sent after commit) and the
 WebSocket broadcast manager — no new comms plumbing.
 """
 import logging
@@ -14,6 +14,7 @@ from app.models.iot import IoTAlert, IoTDevice
 from app.models.customer import Customer
 from app.models.technician import Technician
 from app.services.iot.rule_engine import RuleHit
+from app.services.sms_dispatcher import enqueue_sms
 from app.services.websocket_manager import manager as ws_manager
 
 logger = logging.getLogger(__name__)
@@ -37,30 +38,19 @@ async def _get_homeowner_phone(db: AsyncSession, device: IoTDevice) -> str | Non
     return getattr(customer, "phone", None) if customer else None
 
 
-async def _send_sms(
+def _send_sms(
     db: AsyncSession,
     to_phone: str,
     body: str,
+    customer_id: uuid.UUID | None = None,
 ) -> None:
-    """Enqueue an SMS via the existing Message + APScheduler + Twilio pipeline.
+    """Queue an SMS through the outbound dispatcher.
 
-    The APScheduler job that handles outbound SMS picks up rows where
-    direction='outbound', message_type='sms', status='pending'.
+    The Message row is written with this session and the text goes out once
+    the caller commits, so a rolled-back alert never pages anyone.
     """
     try:
-        from app.models.message import Message
-
-        msg = Message(
-            id=uuid.uuid4(),
-            direction="outbound",
-            message_type="sms",
-            from_number=None,
-            to_number=to_phone,
-            content=body,
-            status="pending",
-            created_at=datetime.now(timezone.utc),
-        )
-        db.add(msg)
+        enqueue_sms(to_phone, body, db=db, customer_id=customer_id)
     except Exception as e:
         logger.warning("Failed to enqueue IoT SMS to %s: %s", to_phone, e)
 
@@ -112,15 +102,16 @@ async def dispatch_rule_hits(
             await _get_homeowner_phone(db, device) if notify_homeowner else None
         )
         if notify_homeowner and homeowner_phone:
-            await _send_sms(
+            _send_sms(
                 db,
                 homeowner_phone,
                 f"MAC Septic alert for your system: {hit.message}",
+                customer_id=device.customer_id,
             )
 
         if notify_oncall:
             for tech_phone in await _get_oncall_phone(db):
-                await _send_sms(
+                _send_sms(
                     db,
                     tech_phone,
                     f"[IoT {hit.rule.severity.upper()}] {device.serial}: {hit.message}",
@@ -0,0 +1,487 @@
+"""
+Scheduled background jobs: declared once, run by one replica per fire.
+
+Every replica (and every uvicorn worker) runs the same scheduler, so without
+coordination each job would fire once per process. Here:
+
+- Jobs register declaratively with @scheduled_job(name, trigger, ...) next to
+  the coroutine they run; JOB_MODULES lists the modules that declare jobs
+- Fire times come from APScheduler triggers: cron(), a CronTrigger in
+  SCHEDULER_TIMEZONE unless it names a zone, or every() for intervals,
+  anchored to a fixed instant; either way all replicas compute the same
+  times whatever their local timezone
+- Each fire is claimed by inserting its job_runs row. The unique
+  (job_name, scheduled_for) pair lets exactly one replica win, and the row
+  becomes the run history (status, replica, duration, error)
+- max_instances caps concurrent runs of a job cluster-wide through leases:
+  Postgres advisory locks, a Redis lease when the database isn't Postgres and
+  REDIS_URL is set, otherwise in-process. A fire that finds every slot taken
+  (the previous run is still going) is recorded "skipped"
+- Misfire policy: fires that passed while a loop was stalled are coalesced
+  into one. A fire starting more than misfire_grace seconds late is recorded
+  "missed" (misfire="skip") or still run (misfire="run_once"); with
+  "run_once" a fire missed while no replica was up runs once at startup
+- Metrics: crm_job_runs_total{job,status}, crm_job_duration_seconds{job}
+
+Usage:
+    @scheduled_job("bookings_sync", every(minutes=10), enabled=MS365BookingsService.is_configured)
+    async def sync_bookings(): ...
+
+    get_job_scheduler().start()   # lifespan; await get_job_scheduler().stop() on shutdown
+"""
+import asyncio
+import hashlib
+import importlib
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.metrics import track_job_run
+from app.database import async_session_maker, engine
+from app.models.job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+# Modules whose @scheduled_job declarations make up the schedule
+JOB_MODULES = (
+    "app.services.job_scheduler",
+    "app.tasks.reminder_scheduler",
+    "app.tasks.campaign_scheduler",
+    "app.tasks.auto_dispatch",
+    "app.tasks.email_poller",
+    "app.tasks.bookings_sync",
+    "app.tasks.calendar_sync",
+    "app.tasks.forms_sync",
+    "app.tasks.marketing_report",
+    "app.tasks.ai_strategy_scheduler",
+    "app.tasks.ai_rescore_scheduler",
+    "app.tasks.ai_budget_scheduler",
+    "app.tasks.ai_rc_poll_scheduler",
+    "app.hr.shared.cert_expiry_job",
+)
+MISFIRE_POLICIES = ("skip", "run_once")
+LEASE_PREFIX = "crm:job:"
+# Redis leases expire this long after a replica dies; a live holder renews every third of it
+LEASE_TTL_SECONDS = 60.0
+# Interval jobs count from a fixed instant so every replica computes the same fire times
+INTERVAL_ANCHOR = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Job:
+    """A scheduled coroutine and its cluster-wide policy."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    trigger: BaseTrigger
+    description: str = ""
+    max_instances: int = 1  # Concurrent runs across all replicas
+    misfire: str = "skip"  # "skip" or "run_once" (see module docstring)
+    misfire_grace: float = 60.0  # Seconds a fire may start late and still run
+    enabled: Optional[Callable[[], bool]] = None  # Checked once at start; False leaves the job unscheduled
+
+    def __post_init__(self):
+        if self.misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"Job {self.name}: misfire must be one of {MISFIRE_POLICIES}")
+        if self.max_instances < 1:
+            raise ValueError(f"Job {self.name}: max_instances must be at least 1")
+
+
+JOBS: dict[str, Job] = {}
+
+
+def scheduled_job(name: str, trigger: BaseTrigger, **options) -> Callable:
+    """Register the decorated coroutine function as job `name` (options are Job fields)."""
+
+    def register(func):
+        JOBS[name] = Job(name, func, trigger, **options)
+        return func
+
+    return register
+
+
+def every(**interval) -> IntervalTrigger:
+    """An interval trigger (IntervalTrigger keywords) whose fire times agree across replicas."""
+    return IntervalTrigger(**interval, start_date=INTERVAL_ANCHOR, timezone=timezone.utc)
+
+
+def cron(**fields) -> CronTrigger:
+    """A cron trigger (CronTrigger keywords) in SCHEDULER_TIMEZONE unless fields give a timezone."""
+    fields.setdefault("timezone", settings.SCHEDULER_TIMEZONE)
+    return CronTrigger(**fields)
+
+
+def load_jobs() -> dict[str, Job]:
+    """Import every job module so its declarations are registered."""
+    for module in JOB_MODULES:
+        importlib.import_module(module)
+    return JOBS
+
+
+def _lock_id(key: str) -> int:
+    """A stable signed 64-bit advisory lock id for a lease key."""
+    return int.from_bytes(hashlib.blake2b(f"{LEASE_PREFIX}{key}".encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class MemoryLeases:
+    """Leases held in this process (single worker, tests)."""
+
+    def __init__(self):
+        self._held: set[str] = set()
+
+    async def acquire(self, key: str) -> Optional[Any]:
+        if key in self._held:
+            return None
+        self._held.add(key)
+        return key
+
+    async def release(self, lease: Any) -> None:
+        self._held.discard(lease)
+
+
+class AdvisoryLeases:
+    """
+    Postgres session advisory locks, each held on its own pooled connection
+    for the length of the run. The lock lives and dies with the connection,
+    so a replica that crashes mid-run releases it.
+    """
+
+    def __init__(self, bind):
+        self._engine = bind
+
+    async def acquire(self, key: str) -> Optional[Any]:
+        conn = await self._engine.connect()
+        try:
+            # Autocommit: the connection sits idle while the job runs, never "idle in transaction"
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            locked = (await conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": _lock_id(key)})).scalar()
+        except Exception:
+            await conn.close()
+            raise
+        if not locked:
+            await conn.close()
+            return None
+        return conn, key
+
+    async def release(self, lease: Any) -> None:
+        conn, key = lease
+        try:
+            await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _lock_id(key)})
+        except Exception as e:
+            logger.warning(f"Advisory unlock for job lease {key} failed, dropping its connection: {e}")
+            await conn.invalidate()
+        finally:
+            await conn.close()
+
+
+class RedisLeases:
+    """Redis leases (SET NX PX) renewed while the job runs."""
+
+    _RENEW = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) end return 0"
+    _RELEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url, decode_responses=True, socket_connect_timeout=2)
+
+    async def acquire(self, key: str) -> Optional[Any]:
+        token = uuid.uuid4().hex
+        ttl_ms = int(LEASE_TTL_SECONDS * 1000)
+        if not await self._client.set(f"{LEASE_PREFIX}{key}", token, nx=True, px=ttl_ms):
+            return None
+        return key, token, asyncio.create_task(self._renew(key, token, ttl_ms))
+
+    async def release(self, lease: Any) -> None:
+        key, token, renewer = lease
+        renewer.cancel()
+        try:
+            await self._client.eval(self._RELEASE, 1, f"{LEASE_PREFIX}{key}", token)
+        except Exception as e:
+            logger.warning(f"Releasing job lease {key} failed (it expires on its own): {e}")
+
+    async def _renew(self, key: str, token: str, ttl_ms: int) -> None:
+        while True:
+            await asyncio.sleep(LEASE_TTL_SECONDS / 3)
+            try:
+                await self._client.eval(self._RENEW, 1, f"{LEASE_PREFIX}{key}", token, ttl_ms)
+            except Exception as e:
+                logger.warning(f"Renewing job lease {key} failed: {e}")
+
+
+def _default_leases():
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLeases(engine)
+    if settings.REDIS_URL:
+        try:
+            return RedisLeases(settings.REDIS_URL)
+        except ImportError:
+            logger.warning("redis package not installed, job concurrency limits apply per worker only")
+    return MemoryLeases()
+
+
+@lru_cache(maxsize=None)
+def _claim_statement(dialect: str):
+    """The fire claim, built once per dialect so its compiled form is cached."""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(JobRun).on_conflict_do_nothing(index_elements=[JobRun.job_name, JobRun.scheduled_for])
+    return stmt.returning(JobRun.id)
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+class JobScheduler:
+    """One loop per enabled job on every replica; the job_runs claim picks who runs each fire."""
+
+    def __init__(
+        self,
+        jobs: Optional[dict[str, Job]] = None,
+        leases=None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        replica: Optional[str] = None,
+    ):
+        self._jobs = jobs
+        self._leases = leases
+        self._session_factory = session_factory
+        self.replica = replica or f"{socket.gethostname()}:{os.getpid()}"
+        self._loops: dict[str, asyncio.Task] = {}
+        self._runs: set[asyncio.Task] = set()
+        self._next_fire: dict[str, datetime] = {}
+        self.running = False
+
+    @property
+    def jobs(self) -> dict[str, Job]:
+        return JOBS if self._jobs is None else self._jobs
+
+    def start(self) -> None:
+        """Start a loop for every enabled job (the registry is loaded on first start)."""
+        if self.running:
+            return
+        if self._jobs is None:
+            load_jobs()
+        if self._leases is None:
+            self._leases = _default_leases()
+        self.running = True
+        for job in self.jobs.values():
+            if job.enabled is not None and not job.enabled():
+                logger.info(f"Job {job.name} disabled (not configured)")
+                continue
+            self._spawn(job)
+        logger.info(f"Job scheduler started on {self.replica}: {', '.join(sorted(self._loops)) or 'no jobs'}")
+
+    def ensure_running(self) -> list[str]:
+        """Restart job loops that died; returns their names."""
+        if not self.running:
+            return []
+        dead = [name for name, task in self._loops.items() if task.done()]
+        for name in dead:
+            self._spawn(self.jobs[name])
+        return dead
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop scheduling; running jobs get `timeout` seconds to finish before being cancelled."""
+        if not self.running:
+            return
+        self.running = False
+        for task in self._loops.values():
+            task.cancel()
+        self._loops.clear()
+        self._next_fire.clear()
+        if self._runs:
+            _, pending = await asyncio.wait(
+                set(self._runs), timeout=settings.JOB_SHUTDOWN_TIMEOUT if timeout is None else timeout
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    def status(self) -> list[dict]:
+        """Each registered job with its trigger, policy and next fire on this replica."""
+        return [
+            {
+                "id": job.name,
+                "name": job.description or job.name,
+                "trigger": str(job.trigger),
+                "scheduled": job.name in self._loops,
+                "next_run": self._next_fire[job.name].isoformat() if job.name in self._next_fire else None,
+                "max_instances": job.max_instances,
+                "misfire": job.misfire,
+            }
+            for job in self.jobs.values()
+        ]
+
+    def _spawn(self, job: Job) -> None:
+        self._loops[job.name] = asyncio.create_task(self._loop(job), name=f"job-{job.name}")
+
+    def _sessions(self) -> AsyncSession:
+        return (self._session_factory or async_session_maker)()
+
+    async def _loop(self, job: Job) -> None:
+        previous = await self._missed_fire(job) if job.misfire == "run_once" else None
+        if previous is not None:
+            logger.info(f"Job {job.name} missed its {previous:%Y-%m-%d %H:%M} fire; running it once")
+            self._dispatch(job, previous, late=0.0)
+        while True:
+            now = datetime.now(timezone.utc)
+            fire = job.trigger.get_next_fire_time(previous, now)
+            if fire is None:
+                self._next_fire.pop(job.name, None)
+                return
+            self._next_fire[job.name] = fire
+            await asyncio.sleep(max((fire - now).total_seconds(), 0.0))
+            now = datetime.now(timezone.utc)
+            # Fires that passed while this loop was stalled collapse into the latest one
+            following = job.trigger.get_next_fire_time(fire, now)
+            while following is not None and following <= now:
+                fire, following = following, job.trigger.get_next_fire_time(following, now)
+            self._dispatch(job, fire, late=(now - fire).total_seconds())
+            previous = fire
+
+    def _dispatch(self, job: Job, fire: datetime, late: float) -> None:
+        task = asyncio.create_task(self._run(job, _utc(fire), late))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+
+    async def _run(self, job: Job, fire: datetime, late: float) -> None:
+        if late > job.misfire_grace and job.misfire == "skip":
+            if await self._claim(job, fire, "missed"):
+                logger.warning(f"Job {job.name} missed its {fire:%H:%M:%S} fire ({late:.0f}s late)")
+                track_job_run(job.name, "missed")
+            return
+        run_id = await self._claim(job, fire, "running")
+        if run_id is None:
+            return
+        lease = await self._acquire(job)
+        if lease is None:
+            await self._finish(run_id, "skipped", error="previous run still in progress")
+            track_job_run(job.name, "skipped")
+            return
+        started = time.monotonic()
+        status, error = "succeeded", None
+        try:
+            await job.func()
+        except asyncio.CancelledError:
+            status, error = "failed", "cancelled at shutdown"
+            raise
+        except Exception as e:
+            status, error = "failed", f"{type(e).__name__}: {e}"
+            logger.exception(f"Job {job.name} failed")
+        finally:
+            duration = time.monotonic() - started
+            try:
+                await self._leases.release(lease)
+            except Exception as e:
+                logger.warning(f"Releasing the lease for job {job.name} failed: {e}")
+            await self._finish(run_id, status, duration, error)
+            track_job_run(job.name, status, duration)
+
+    async def _acquire(self, job: Job) -> Optional[Any]:
+        for slot in range(job.max_instances):
+            try:
+                lease = await self._leases.acquire(f"{job.name}:{slot}")
+            except Exception as e:
+                logger.warning(f"Job {job.name} could not take a lease: {e}")
+                return None
+            if lease is not None:
+                return lease
+        return None
+
+    async def _claim(self, job: Job, fire: datetime, status: str) -> Optional[uuid.UUID]:
+        """Insert this fire's job_runs row; its id if this replica won the fire, else None."""
+        try:
+            async with self._sessions() as db:
+                result = await db.execute(
+                    _claim_statement(db.get_bind().dialect.name),
+                    {
+                        "id": uuid.uuid4(),
+                        "job_name": job.name,
+                        "scheduled_for": fire,
+                        "status": status,
+                        "replica": self.replica,
+                        "started_at": datetime.now(timezone.utc) if status == "running" else None,
+                    },
+                )
+                run_id = result.scalar()
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Job {job.name} could not claim its {fire:%Y-%m-%d %H:%M:%S} fire: {e}")
+            return None
+        return run_id
+
+    async def _finish(
+        self, run_id: uuid.UUID, status: str, duration: Optional[float] = None, error: Optional[str] = None
+    ) -> None:
+        try:
+            async with self._sessions() as db:
+                await db.execute(
+                    update(JobRun)
+                    .where(JobRun.id == run_id)
+                    .values(
+                        status=status,
+                        finished_at=datetime.now(timezone.utc),
+                        duration_seconds=duration,
+                        error=error[:2000] if error else None,
+                    )
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Recording job run {run_id} as {status} failed: {e}")
+
+    async def _missed_fire(self, job: Job) -> Optional[datetime]:
+        """The latest fire that passed since the job last fired on any replica (None if it never has)."""
+        try:
+            async with self._sessions() as db:
+                last = (
+                    await db.execute(select(func.max(JobRun.scheduled_for)).where(JobRun.job_name == job.name))
+                ).scalar()
+        except Exception as e:
+            logger.warning(f"Job {job.name} could not read its run history: {e}")
+            return None
+        if last is None:
+            return None
+        now = datetime.now(timezone.utc)
+        missed = None
+        fire = job.trigger.get_next_fire_time(_utc(last), now)
+        while fire is not None and fire <= now:
+            missed, fire = fire, job.trigger.get_next_fire_time(fire, now)
+        return missed
+
+
+@scheduled_job("job_runs_prune", cron(hour=3, minute=30), description="Prune scheduled job run history")
+async def prune_job_runs() -> None:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_RUN_RETENTION_DAYS)
+    async with async_session_maker() as db:
+        result = await db.execute(delete(JobRun).where(JobRun.scheduled_for < cutoff))
+        await db.commit()
+    logger.info(f"Pruned {result.rowcount} job runs older than {settings.JOB_RUN_RETENTION_DAYS} days")
+
+
+_scheduler: Optional[JobScheduler] = None
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Get or create this worker's job scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
@@ -2,17 +2,18 @@
 Location extraction from call transcripts.
 
 Parses transcript text for addresses, city names, and street references.
-Geocodes via local city lookup (instant) or Nominatim (free, OSM).
+Geocodes via local city lookup (instant) or the shared geocoder
+(app.services.geocoding_service: cache, then rate-limited Nominatim).
 Determines service zone and estimates drive time.
 Deduplicates to avoid flooding the frontend with repeated events.
 """
 
 import re
-import math
 import logging
-import httpx
 from typing import Optional
 
+from app.services.geo import haversine_miles as haversine_distance
+from app.services.geocoding_service import GeocodeRequest, address_key, get_geocoder
 from app.services.market_config import (
     lookup_city,
     get_zone,
@@ -28,10 +29,6 @@ BASE_LNG = -87.0353
 # Dedup threshold: must be >0.5 miles apart to count as a new location
 DEDUP_DISTANCE_MILES = 0.5
 
-# Nominatim base URL (free, OSM-based geocoding)
-NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
-NOMINATIM_HEADERS = {"User-Agent": "MacServicePlatform/1.0"}
-
 # Regex patterns
 ADDRESS_PATTERN = re.compile(
     r"(\d{1,5})\s+"                              # house number
@@ -53,21 +50,6 @@ SERVICE_QUESTION_PATTERN = re.compile(
 )
 
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two points in miles."""
-    R = 3959  # Earth radius in miles
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(delta_lat / 2) ** 2
-        + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-    )
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
-
-
 def estimate_drive_minutes(distance_miles: float) -> int:
     """Estimate drive time at 35 mph average."""
     return round(distance_miles / 35.0 * 60)
@@ -79,7 +61,7 @@ class LocationExtractor:
 
     Usage:
         extractor = LocationExtractor(call_sid="CA123", market_slug="nashville")
-        result = extractor.extract_location_from_text("I'm in Spring Hill")
+        result = await extractor.extract_location_from_text("I'm in Spring Hill")
         if result:
             # broadcast to frontend
     """
@@ -90,7 +72,7 @@ class LocationExtractor:
         self.market = get_market_by_slug(market_slug)
         self.last_location: Optional[dict] = None
 
-    def extract_location_from_text(self, text: str) -> Optional[dict]:
+    async def extract_location_from_text(self, text: str) -> Optional[dict]:
         """
         Parse transcript text for location signals. Returns location dict or None.
 
@@ -117,7 +99,7 @@ class LocationExtractor:
                 }
             else:
                 # Address without city — try geocoding the street in market context
-                result = self._geocode_address(address_text)
+                result = await self._geocode_address(address_text)
                 if result:
                     result["confidence"] = 0.8
             if result:
@@ -129,7 +111,7 @@ class LocationExtractor:
             street = street_match.group(1).strip()
             suffix = street_match.group(2)
             address_text = f"{street} {suffix}".title()
-            result = self._geocode_address(address_text)
+            result = await self._geocode_address(address_text)
             if result:
                 result["confidence"] = 0.8
                 return self._dedup_and_enrich(result, text)
@@ -184,35 +166,28 @@ class LocationExtractor:
             }
         return None
 
-    def _geocode_address(self, address_text: str) -> Optional[dict]:
-        """Geocode an address via Nominatim. Synchronous fallback for transcript parsing."""
+    async def _geocode_address(self, address_text: str) -> Optional[dict]:
+        """Geocode a street mention within this market's area."""
         if not self.market:
             return None
         center = self.market["center"]
-        try:
-            with httpx.Client(timeout=3.0) as client:
-                resp = client.get(
-                    NOMINATIM_URL,
-                    params={
-                        "q": f"{address_text}, {self.market['name']}",
-                        "format": "json",
-                        "limit": 1,
-                        "viewbox": f"{center['lng']-1},{center['lat']+1},{center['lng']+1},{center['lat']-1}",
-                        "bounded": 1,
-                    },
-                    headers=NOMINATIM_HEADERS,
-                )
-                if resp.status_code == 200 and resp.json():
-                    data = resp.json()[0]
-                    return {
-                        "lat": float(data["lat"]),
-                        "lng": float(data["lon"]),
-                        "address_text": address_text,
-                        "source": "transcript",
-                    }
-        except Exception as e:
-            logger.warning("Nominatim geocode failed for '%s': %s", address_text, e)
-        return None
+        request = GeocodeRequest(
+            key=address_key(address_text, None, city=self.market_slug),
+            query=f"{address_text}, {self.market['name']}",
+            params=(
+                ("viewbox", f"{center['lng']-1},{center['lat']+1},{center['lng']+1},{center['lat']-1}"),
+                ("bounded", "1"),
+            ),
+        )
+        coords = await get_geocoder().geocode(request)
+        if coords is None:
+            return None
+        return {
+            "lat": coords[0],
+            "lng": coords[1],
+            "address_text": address_text,
+            "source": "transcript",
+        }
 
     def _dedup_and_enrich(self, result: dict, transcript_text: str) -> Optional[dict]:
         """Check dedup, add zone + drive time, update last_location."""
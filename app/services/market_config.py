@@ -190,3 +190,24 @@ def get_zone(lat: float, lng: float, market_slug: str) -> str:
     if polygons.get("extended") and point_in_polygon(lat, lng, polygons["extended"]):
         return "extended"
     return "outside"
+
+
+# Half-size (degrees) of the box around a market center when it has no service polygons
+MARKET_BOX_DEGREES = 1.0
+
+
+def market_bbox(market_slug: str) -> Optional[tuple[float, float, float, float]]:
+    """
+    (min_lat, min_lng, max_lat, max_lng) covering a market: its service polygons,
+    or a box around its center. None for unknown markets.
+    """
+    market = MARKETS.get(market_slug)
+    if not market:
+        return None
+    points = [p for polygon in (market.get("polygons") or {}).values() for p in polygon]
+    if not points:
+        lat, lng = market["center"]["lat"], market["center"]["lng"]
+        return (lat - MARKET_BOX_DEGREES, lng - MARKET_BOX_DEGREES, lat + MARKET_BOX_DEGREES, lng + MARKET_BOX_DEGREES)
+    lats = [p[0] for p in points]
+    lngs = [p[1] for p in points]
+    return (min(lats), min(lngs), max(lats), max(lngs))
@@ -4,16 +4,17 @@ Microsoft 365 Base Service
 Provides shared token acquisition (client_credentials flow) for all MS Graph API calls.
 """
 
-import httpx
 import time
 import logging
 
 from app.config import settings
+from app.services.cache_service import cache_service
+from app.services.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
-# Module-level token cache
-_token_cache: dict = {"access_token": None, "expires_at": 0}
+# Per-worker token cache key (see app.services.cache_service.NAMESPACES)
+_TOKEN_CACHE_KEY = "ms365:app_token"
 
 
 class MS365BaseService:
@@ -28,75 +29,84 @@ class MS365BaseService:
 
     @classmethod
     async def get_app_token(cls) -> str:
-        """Get an application-level access token using client_credentials flow (cached)."""
-        if _token_cache["access_token"] and time.time() < _token_cache["expires_at"] - 60:
-            return _token_cache["access_token"]
+        """Get an application-level access token using client_credentials flow (cached).
+
+        Concurrent callers on an expired token share a single token request.
+        """
+        token = await cache_service.get_or_load(
+            _TOKEN_CACHE_KEY,
+            cls._fetch_app_token,
+            # Refresh a minute before Microsoft expires the token
+            ttl=lambda t: max(t["expires_in"] - 60, 1),
+        )
+        return token["access_token"]
 
+    @classmethod
+    async def _fetch_app_token(cls) -> dict:
         token_url = cls.TOKEN_URL_TEMPLATE.format(tenant_id=settings.MS365_TENANT_ID)
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(token_url, data={
-                "client_id": settings.MS365_CLIENT_ID,
-                "client_secret": settings.MS365_CLIENT_SECRET,
-                "scope": "https://graph.microsoft.com/.default",
-                "grant_type": "client_credentials",
-            })
-            resp.raise_for_status()
-            data = resp.json()
-
-        _token_cache["access_token"] = data["access_token"]
-        _token_cache["expires_at"] = time.time() + data.get("expires_in", 3600)
-        logger.info("MS365 app token acquired (expires in %ds)", data.get("expires_in", 3600))
-        return data["access_token"]
+        client = get_http_client("ms_graph")
+        resp = await client.post(token_url, data={
+            "client_id": settings.MS365_CLIENT_ID,
+            "client_secret": settings.MS365_CLIENT_SECRET,
+            "scope": "https://graph.microsoft.com/.default",
+            "grant_type": "client_credentials",
+        })
+        resp.raise_for_status()
+        data = resp.json()
+
+        expires_in = data.get("expires_in", 3600)
+        logger.info("MS365 app token acquired (expires in %ds)", expires_in)
+        return {"access_token": data["access_token"], "expires_in": expires_in}
 
     @classmethod
     async def graph_get(cls, path: str, token: str | None = None) -> dict:
         """Make an authenticated GET request to MS Graph."""
         if not token:
             token = await cls.get_app_token()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{cls.GRAPH_BASE}{path}",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client("ms_graph")
+        resp = await client.get(
+            f"{cls.GRAPH_BASE}{path}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     @classmethod
     async def graph_post(cls, path: str, json_data: dict, token: str | None = None) -> dict:
         """Make an authenticated POST request to MS Graph."""
         if not token:
             token = await cls.get_app_token()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{cls.GRAPH_BASE}{path}",
-                json=json_data,
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client("ms_graph")
+        resp = await client.post(
+            f"{cls.GRAPH_BASE}{path}",
+            json=json_data,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     @classmethod
     async def graph_patch(cls, path: str, json_data: dict, token: str | None = None) -> dict:
         """Make an authenticated PATCH request to MS Graph."""
         if not token:
             token = await cls.get_app_token()
-        async with httpx.AsyncClient() as client:
-            resp = await client.patch(
-                f"{cls.GRAPH_BASE}{path}",
-                json=json_data,
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client("ms_graph")
+        resp = await client.patch(
+            f"{cls.GRAPH_BASE}{path}",
+            json=json_data,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     @classmethod
     async def graph_delete(cls, path: str, token: str | None = None) -> None:
         """Make an authenticated DELETE request to MS Graph."""
         if not token:
             token = await cls.get_app_token()
-        async with httpx.AsyncClient() as client:
-            resp = await client.delete(
-                f"{cls.GRAPH_BASE}{path}",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
+        client = get_http_client("ms_graph")
+        resp = await client.delete(
+            f"{cls.GRAPH_BASE}{path}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp.raise_for_status()
@@ -20,13 +20,14 @@ from datetime import datetime, timedelta, date
 from typing import Optional, Any
 from uuid import UUID
 
-import httpx
 from sqlalchemy import select, func
 
 from app.config import settings
 from app.database import async_session_maker
 from app.models.work_order import WorkOrder
 from app.models.ai_agent import AgentTask
+from app.services.http_clients import get_http_client
+from app.utils.phone_normalization import to_e164
 
 # Sentinel agent_id for tasks created by the outbound calling agent
 _OUTBOUND_AGENT_UUID = uuid.UUID("00000000-0000-0000-0000-000000000001")
@@ -313,22 +314,23 @@ Previous Service: {p.get('last_service_date', 'None on file')}
         working_messages = list(self.conversation)
 
         for _round in range(3):  # max 3 tool-use rounds to prevent infinite loops
-            async with httpx.AsyncClient(timeout=15) as client:
-                resp = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": settings.ANTHROPIC_API_KEY,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-haiku-4-5-20251001",
-                        "max_tokens": 300,
-                        "system": system,
-                        "messages": working_messages,
-                        "tools": AGENT_TOOLS,
-                    },
-                )
+            client = get_http_client("anthropic")
+            resp = await client.post(
+                "https://api.anthropic.com/v1/messages",
+                timeout=15,  # a caller is waiting on the line
+                headers={
+                    "x-api-key": settings.ANTHROPIC_API_KEY,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                json={
+                    "model": "claude-haiku-4-5-20251001",
+                    "max_tokens": 300,
+                    "system": system,
+                    "messages": working_messages,
+                    "tools": AGENT_TOOLS,
+                },
+            )
 
             if resp.status_code != 200:
                 logger.error(f"Claude API error: {resp.status_code} {resp.text[:200]}")
@@ -635,21 +637,21 @@ Previous Service: {p.get('last_service_date', 'None on file')}
             return {"ok": False, "error": "No from-number configured for outbound agent SMS"}
 
         raw_to = self.prospect.get("phone", "")
-        to_number = self._normalize_phone(raw_to)
+        to_number = to_e164(raw_to)
         if not to_number:
             return {"ok": False, "error": f"Invalid or missing prospect phone: {raw_to!r}"}
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.post(
-                    f"https://api.twilio.com/2010-04-01/Accounts/{settings.TWILIO_ACCOUNT_SID}/Messages.json",
-                    auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
-                    data={
-                        "From": from_number,
-                        "To": to_number,
-                        "Body": message_body,
-                    },
-                )
+            client = get_http_client("twilio")
+            resp = await client.post(
+                f"https://api.twilio.com/2010-04-01/Accounts/{settings.TWILIO_ACCOUNT_SID}/Messages.json",
+                auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN),
+                data={
+                    "From": from_number,
+                    "To": to_number,
+                    "Body": message_body,
+                },
+            )
 
             if resp.status_code in (200, 201):
                 sid = resp.json().get("sid", "")
@@ -663,25 +665,6 @@ Previous Service: {p.get('last_service_date', 'None on file')}
             logger.exception(f"[Agent:{self.call_sid[:8]}] send_followup_sms error: {exc}")
             return {"ok": False, "error": str(exc)}
 
-    @staticmethod
-    def _normalize_phone(raw: str) -> str:
-        """Normalize a phone number to E.164 format (+1XXXXXXXXXX for US numbers)."""
-        if not raw:
-            return ""
-        # Strip everything except digits and leading +
-        digits = "".join(c for c in raw if c.isdigit())
-        if not digits:
-            return ""
-        if raw.startswith("+"):
-            # Already has country code — keep as-is
-            return "+" + digits
-        if len(digits) == 10:
-            return "+1" + digits
-        if len(digits) == 11 and digits.startswith("1"):
-            return "+" + digits
-        # Return best-effort
-        return "+" + digits
-
     def get_summary(self) -> dict:
         """Get call summary for logging."""
         return {
@@ -5,19 +5,26 @@ Matches septic permits to CRM customers using:
 1. Exact normalized address match
 2. Phone number match
 3. Fuzzy name + city match
+
+Single permits go through find_customer_for_permit(). Batch runs build a
+CustomerMatchIndex once (address / phone dicts plus a city-partitioned name
+index) so each permit is matched without touching the database.
 """
 
 import hashlib
 import logging
 import re
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Iterable, Optional
+from uuid import UUID
 
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, delete, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.customer import Customer
-from app.models.septic_permit import SepticPermit
+from app.models.septic_permit import SepticPermit, PermitCustomerMatchKey
+from app.utils.phone_normalization import phone_last10
 
 logger = logging.getLogger(__name__)
 
@@ -69,17 +76,6 @@ def normalize_address(address: str | None) -> str:
     return addr.strip()
 
 
-def normalize_phone(phone: str | None) -> str:
-    """Extract digits from phone number for comparison."""
-    if not phone:
-        return ""
-    digits = re.sub(r'\D', '', phone)
-    # Ensure 10-digit US format
-    if len(digits) == 11 and digits.startswith("1"):
-        digits = digits[1:]
-    return digits if len(digits) == 10 else ""
-
-
 def name_similarity(name1: str, name2: str) -> float:
     """Simple Levenshtein-based similarity ratio (0-1)."""
     if not name1 or not name2:
@@ -89,10 +85,37 @@ def name_similarity(name1: str, name2: str) -> float:
     if n1 == n2:
         return 1.0
     # Use sequence matcher for fuzzy comparison
-    from difflib import SequenceMatcher
     return SequenceMatcher(None, n1, n2).ratio()
 
 
+NAME_MATCH_THRESHOLD = 0.85
+NAME_HIGH_CONFIDENCE = 0.95
+
+_KEY_CHUNK_SIZE = 1000
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def customer_name_key(first_name: str | None, last_name: str | None) -> str:
+    """Uppercased "first last" name used for fuzzy matching."""
+    return f"{first_name or ''} {last_name or ''}".strip().upper()
+
+
+def city_key(city: str | None) -> str:
+    """Uppercased city used to partition the name index."""
+    return (city or "").upper().strip()
+
+
+def permit_phone(permit) -> str:
+    """Normalized owner phone for a permit (column first, then raw_data)."""
+    phone = phone_last10(getattr(permit, "owner_phone", None))
+    if not phone and permit.raw_data and isinstance(permit.raw_data, dict):
+        phone = phone_last10(permit.raw_data.get("owner_phone"))
+    return phone
+
+
 async def find_customer_for_permit(
     db: AsyncSession,
     permit: SepticPermit,
@@ -123,10 +146,8 @@ async def find_customer_for_permit(
                     )
 
     # Strategy 2: Phone match
-    permit_phone = ""
-    if permit.raw_data and isinstance(permit.raw_data, dict):
-        permit_phone = normalize_phone(permit.raw_data.get("owner_phone"))
-    if permit_phone:
+    owner_phone = permit_phone(permit)
+    if owner_phone:
         result = await db.execute(
             select(Customer).where(
                 Customer.is_active == True,
@@ -135,13 +156,13 @@ async def find_customer_for_permit(
         )
         customers = result.scalars().all()
         for cust in customers:
-            cust_phone = normalize_phone(cust.phone)
-            if cust_phone and cust_phone == permit_phone:
+            cust_phone = phone_last10(cust.phone)
+            if cust_phone and cust_phone == owner_phone:
                 return MatchResult(
                     customer_id=str(cust.id),
                     confidence="high",
                     match_method="phone",
-                    details=f"Phone match: {permit_phone}",
+                    details=f"Phone match: {owner_phone}",
                 )
 
     # Strategy 3: Name + city fuzzy match
@@ -164,10 +185,10 @@ async def find_customer_for_permit(
                 best_score = score
                 best_match = cust
 
-        if best_match and best_score >= 0.85:
+        if best_match and best_score >= NAME_MATCH_THRESHOLD:
             return MatchResult(
                 customer_id=str(best_match.id),
-                confidence="medium" if best_score < 0.95 else "high",
+                confidence="medium" if best_score < NAME_HIGH_CONFIDENCE else "high",
                 match_method="name_city",
                 details=f"Name similarity: {best_score:.0%} in {permit_city}",
             )
@@ -175,18 +196,302 @@ async def find_customer_for_permit(
     return None
 
 
+@dataclass
+class CustomerKeys:
+    """Normalized match keys for a single customer."""
+    customer_id: str
+    address_key: str = ""
+    phone_key: str = ""
+    city_key: str = ""
+    name_key: str = ""
+
+
+def _name_bigrams(name: str) -> list[tuple[str, int]]:
+    """Bigrams tagged with their occurrence number, so set overlap == multiset overlap."""
+    seen: dict[str, int] = {}
+    grams = []
+    for i in range(len(name) - 1):
+        gram = name[i:i + 2]
+        occurrence = seen.get(gram, 0)
+        seen[gram] = occurrence + 1
+        grams.append((gram, occurrence))
+    return grams
+
+
+@dataclass
+class _CityNames:
+    """Customer names in one city plus a bigram inverted index over them."""
+    names: list[tuple[str, str]] = field(default_factory=list)
+    lengths: list[int] = field(default_factory=list)
+    postings: dict[tuple[str, int], list[int]] = field(default_factory=dict)
+
+    def add(self, name: str, customer_id: str) -> None:
+        idx = len(self.names)
+        self.names.append((name, customer_id))
+        self.lengths.append(len(name))
+        for gram in _name_bigrams(name):
+            self.postings.setdefault(gram, []).append(idx)
+
+    def candidates(self, name: str) -> Iterable[int]:
+        """
+        Indexes of names that could reach NAME_MATCH_THRESHOLD, in insertion order.
+
+        ratio() >= t bounds the indel distance d between the strings by
+        (1 - t) * (len_a + len_b), and d edits destroy at most 2d bigrams of
+        either string (q-gram count filter), so a match must share at least
+        max(len_a, len_b) - 1 - 2d tagged bigrams. That bound is smallest
+        when len_b == len_a; if it is not positive there every name is scanned.
+        """
+        t = NAME_MATCH_THRESHOLD
+        la = len(name)
+        # Admissible lengths (2 * min / sum >= t) and the shared-bigram floor for each
+        required = {
+            lb: max(la, lb) - 1 - 2 * int((1 - t) * (la + lb) + 1e-9)
+            for lb in range(int(la * t / (2 - t)), int(la * (2 - t) / t + 1e-9) + 1)
+        }
+        if required.get(la, 0) <= 0:
+            return range(len(self.names))
+
+        hits: dict[int, int] = {}
+        for gram in _name_bigrams(name):
+            for idx in self.postings.get(gram, ()):
+                hits[idx] = hits.get(idx, 0) + 1
+        lengths = self.lengths
+        return sorted(
+            idx for idx, count in hits.items()
+            if count >= required.get(lengths[idx], la)
+        )
+
+
+@dataclass
+class CustomerMatchIndex:
+    """
+    In-memory lookup tables for matching many permits in one pass.
+
+    - by_address: normalized address -> customer id
+    - by_phone:   10-digit phone -> customer id
+    - by_city:    city -> names + bigram index for fuzzy name matching
+    - exact_names: (city, name) -> customer id, short-circuits the fuzzy scan
+
+    The first customer seen for a key wins, mirroring the first-row-wins
+    behaviour of find_customer_for_permit().
+    """
+    by_address: dict[str, str] = field(default_factory=dict)
+    by_phone: dict[str, str] = field(default_factory=dict)
+    by_city: dict[str, _CityNames] = field(default_factory=dict)
+    exact_names: dict[tuple[str, str], str] = field(default_factory=dict)
+    size: int = 0
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[CustomerKeys]) -> "CustomerMatchIndex":
+        index = cls()
+        for k in keys:
+            index.add(k)
+        return index
+
+    def add(self, k: CustomerKeys) -> None:
+        self.size += 1
+        if k.address_key:
+            self.by_address.setdefault(k.address_key, k.customer_id)
+        if k.phone_key:
+            self.by_phone.setdefault(k.phone_key, k.customer_id)
+        if k.city_key and k.name_key:
+            self.by_city.setdefault(k.city_key, _CityNames()).add(k.name_key, k.customer_id)
+            self.exact_names.setdefault((k.city_key, k.name_key), k.customer_id)
+
+    def match(self, permit) -> Optional[MatchResult]:
+        """Match a permit (ORM row or any object with the permit attributes)."""
+        # Strategy 1: Exact address match
+        normalized = normalize_address(permit.address_normalized or permit.address)
+        if normalized:
+            customer_id = self.by_address.get(normalized)
+            if customer_id:
+                return MatchResult(
+                    customer_id=customer_id,
+                    confidence="high",
+                    match_method="address",
+                    details=f"Exact address match: {normalized}",
+                )
+
+        # Strategy 2: Phone match
+        phone = permit_phone(permit)
+        if phone:
+            customer_id = self.by_phone.get(phone)
+            if customer_id:
+                return MatchResult(
+                    customer_id=customer_id,
+                    confidence="high",
+                    match_method="phone",
+                    details=f"Phone match: {phone}",
+                )
+
+        # Strategy 3: Name + city fuzzy match
+        if permit.owner_name and permit.city:
+            permit_city = city_key(permit.city)
+            customer_id, score = self._best_name_match(permit_city, permit.owner_name.upper().strip())
+            if customer_id and score >= NAME_MATCH_THRESHOLD:
+                return MatchResult(
+                    customer_id=customer_id,
+                    confidence="medium" if score < NAME_HIGH_CONFIDENCE else "high",
+                    match_method="name_city",
+                    details=f"Name similarity: {score:.0%} in {permit_city}",
+                )
+
+        return None
+
+    def _best_name_match(self, city: str, name: str) -> tuple[Optional[str], float]:
+        """Best-scoring customer name in a city, pruned by ratio upper bounds."""
+        if not name:
+            return None, 0.0
+        exact = self.exact_names.get((city, name))
+        if exact:
+            return exact, 1.0
+        bucket = self.by_city.get(city)
+        if bucket is None:
+            return None, 0.0
+
+        best_id: Optional[str] = None
+        best_score = 0.0
+        # quick_ratio() is symmetric, so bound with the permit name as the
+        # cached second sequence and only score survivors in the original
+        # (permit, customer) orientation used by name_similarity().
+        bound = SequenceMatcher(None, "", name)
+        name_len = len(name)
+        for idx in bucket.candidates(name):
+            cust_name, cust_id = bucket.names[idx]
+            # ratio() <= 2*min(len)/sum(len); skip candidates that cannot reach
+            # the threshold or beat the current best.
+            floor = max(best_score, NAME_MATCH_THRESHOLD - 1e-9)
+            total = name_len + len(cust_name)
+            if 2.0 * min(name_len, len(cust_name)) / total <= floor:
+                continue
+            bound.set_seq1(cust_name)
+            if bound.quick_ratio() <= floor:
+                continue
+            score = SequenceMatcher(None, name, cust_name).ratio()
+            if score > best_score:
+                best_score = score
+                best_id = cust_id
+        return best_id, best_score
+
+
+def _customer_keys_from_row(row) -> CustomerKeys:
+    return CustomerKeys(
+        customer_id=str(row.id),
+        address_key=normalize_address(row.address_line1),
+        phone_key=phone_last10(row.phone),
+        city_key=city_key(row.city),
+        name_key=customer_name_key(row.first_name, row.last_name),
+    )
+
+
+async def build_customer_match_index(
+    db: AsyncSession,
+    persist_keys: bool = False,
+) -> CustomerMatchIndex:
+    """
+    Build a CustomerMatchIndex over all active customers in one query.
+
+    Args:
+        db: Database session
+        persist_keys: Reuse rows from permit_customer_match_keys when the
+            customer has not changed since they were computed, and write
+            recomputed keys back (caller commits)
+    """
+    stamp = func.coalesce(Customer.updated_at, Customer.created_at)
+    columns = [
+        Customer.id,
+        Customer.first_name,
+        Customer.last_name,
+        Customer.phone,
+        Customer.address_line1,
+        Customer.city,
+        stamp.label("stamp"),
+    ]
+    stmt = select(*columns).where(Customer.is_active == True)
+    if persist_keys:
+        stmt = stmt.add_columns(
+            PermitCustomerMatchKey.customer_id.label("key_customer_id"),
+            PermitCustomerMatchKey.address_key,
+            PermitCustomerMatchKey.phone_key,
+            PermitCustomerMatchKey.city_key,
+            PermitCustomerMatchKey.name_key,
+            PermitCustomerMatchKey.source_updated_at,
+        ).outerjoin(PermitCustomerMatchKey, PermitCustomerMatchKey.customer_id == Customer.id)
+
+    result = await db.execute(stmt)
+
+    index = CustomerMatchIndex()
+    stale: list[tuple[CustomerKeys, object]] = []
+    reused = 0
+    for row in result:
+        persisted = persist_keys and row.key_customer_id is not None
+        if persisted and row.source_updated_at == row.stamp:
+            keys = CustomerKeys(
+                customer_id=str(row.id),
+                address_key=row.address_key or "",
+                phone_key=row.phone_key or "",
+                city_key=row.city_key or "",
+                name_key=row.name_key or "",
+            )
+            reused += 1
+        else:
+            keys = _customer_keys_from_row(row)
+            if persist_keys:
+                stale.append((keys, row.stamp))
+        index.add(keys)
+
+    if persist_keys and stale:
+        await _persist_customer_keys(db, stale)
+
+    logger.info(
+        f"Built customer match index: {index.size} customers "
+        f"({reused} reused keys, {len(stale)} persisted)"
+    )
+    return index
+
+
+async def _persist_customer_keys(db: AsyncSession, stale: list[tuple[CustomerKeys, object]]) -> None:
+    """Replace persisted match keys for the given customers (chunked)."""
+    for i in range(0, len(stale), _KEY_CHUNK_SIZE):
+        chunk = stale[i:i + _KEY_CHUNK_SIZE]
+        ids = [_as_uuid(k.customer_id) for k, _ in chunk]
+        await db.execute(delete(PermitCustomerMatchKey).where(PermitCustomerMatchKey.customer_id.in_(ids)))
+        await db.execute(
+            insert(PermitCustomerMatchKey),
+            [
+                {
+                    "customer_id": cid,
+                    "address_key": k.address_key or None,
+                    "phone_key": k.phone_key or None,
+                    "city_key": k.city_key or None,
+                    "name_key": k.name_key or None,
+                    "source_updated_at": stamp,
+                }
+                for cid, (k, stamp) in zip(ids, chunk)
+            ],
+        )
+
+
 async def batch_link_permits(
     db: AsyncSession,
     limit: int = 1000,
     auto_link_only: bool = True,
+    persist_keys: bool = False,
 ) -> dict:
     """
     Run auto-linking on unlinked permits.
 
+    Customers are loaded and normalized once into a CustomerMatchIndex, then
+    every permit is matched in memory and the links are written with a single
+    bulk UPDATE.
+
     Args:
         db: Database session
         limit: Max permits to process
         auto_link_only: If True, only link high-confidence matches
+        persist_keys: Reuse and store normalized customer keys in
+            permit_customer_match_keys so later runs start warm
 
     Returns:
         Stats dict with linked/skipped/failed counts
@@ -199,26 +504,37 @@ async def batch_link_permits(
         "errors": 0,
     }
 
-    # Get unlinked permits
+    index = await build_customer_match_index(db, persist_keys=persist_keys)
+
+    # Get unlinked permits (only the columns the matcher reads)
     result = await db.execute(
-        select(SepticPermit).where(
+        select(
+            SepticPermit.id,
+            SepticPermit.address,
+            SepticPermit.address_normalized,
+            SepticPermit.owner_name,
+            SepticPermit.owner_phone,
+            SepticPermit.city,
+            SepticPermit.raw_data,
+        ).where(
             SepticPermit.customer_id.is_(None),
             SepticPermit.is_active == True,
         ).limit(limit)
     )
-    permits = result.scalars().all()
+    permits = result.all()
 
+    links: list[dict] = []
     for permit in permits:
         stats["processed"] += 1
         try:
-            match = await find_customer_for_permit(db, permit)
+            match = index.match(permit)
             if match:
                 if match.confidence == "high":
-                    permit.customer_id = match.customer_id
+                    links.append({"id": permit.id, "customer_id": _as_uuid(match.customer_id)})
                     stats["linked_high"] += 1
                     logger.info(f"Linked permit {permit.id} → customer {match.customer_id} ({match.match_method})")
                 elif not auto_link_only and match.confidence == "medium":
-                    permit.customer_id = match.customer_id
+                    links.append({"id": permit.id, "customer_id": _as_uuid(match.customer_id)})
                     stats["linked_medium"] += 1
                     logger.info(f"Linked permit {permit.id} → customer {match.customer_id} (medium: {match.match_method})")
                 else:
@@ -229,5 +545,8 @@ async def batch_link_permits(
             stats["errors"] += 1
             logger.error(f"Error linking permit {permit.id}: {e}")
 
+    for i in range(0, len(links), _KEY_CHUNK_SIZE):
+        await db.execute(update(SepticPermit), links[i:i + _KEY_CHUNK_SIZE])
+
     await db.commit()
     return stats
@@ -0,0 +1,194 @@
+"""
+Phone identity service: resolve an inbound phone number to a customer.
+
+Every webhook and poller that needs "who is calling/texting?" goes through
+here. Numbers are reduced to their US 10-digit form (customers.phone_last10,
+btree-indexed), so a lookup is a single indexed probe regardless of how the
+number was formatted on either side.
+
+Results are held in a small per-process LRU. Entries are dropped when a
+customer's phone changes or the customer is deleted in this process (ORM
+session events, applied after commit), and expire after a TTL so writes made
+by other workers or raw SQL are picked up within a few minutes.
+
+Usage:
+    from app.services.phone_identity import phone_identity
+
+    customer = await phone_identity.resolve_customer(db, "+16155550100")
+    customer_id = await phone_identity.resolve_customer_id(db, from_number)
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.models.customer import Customer
+from app.utils.phone_normalization import phone_last10
+
+logger = logging.getLogger(__name__)
+
+# Cached customer ids live longer than cached "no customer" results so that a
+# newly created customer on another worker is picked up quickly.
+HIT_TTL_SECONDS = 300
+MISS_TTL_SECONDS = 60
+DEFAULT_MAX_ENTRIES = 10_000
+
+_SESSION_INFO_KEY = "phone_identity_dirty"
+
+
+class PhoneIdentityService:
+    """Caller-ID resolution backed by customers.phone_last10 and an LRU."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        hit_ttl: int = HIT_TTL_SECONDS,
+        miss_ttl: int = MISS_TTL_SECONDS,
+    ):
+        self._max_entries = max_entries
+        self._hit_ttl = hit_ttl
+        self._miss_ttl = miss_ttl
+        # last10 -> (customer_id or None, expires_at)
+        self._entries: OrderedDict[str, tuple[Optional[UUID], float]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def _get_cached(self, key: str) -> tuple[bool, Optional[UUID]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        customer_id, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, customer_id
+
+    def _store(self, key: str, customer_id: Optional[UUID]) -> None:
+        ttl = self._hit_ttl if customer_id is not None else self._miss_ttl
+        self._entries[key] = (customer_id, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def resolve_customer_id(self, db: AsyncSession, phone: Optional[str]) -> Optional[UUID]:
+        """Customer id for a phone number in any format, or None."""
+        key = phone_last10(phone)
+        if not key:
+            return None
+
+        found, customer_id = self._get_cached(key)
+        if found:
+            self._hits += 1
+            return customer_id
+
+        self._misses += 1
+        result = await db.execute(
+            select(Customer.id)
+            .where(Customer.phone_last10 == key)
+            .order_by(Customer.created_at.asc())
+            .limit(1)
+        )
+        customer_id = result.scalar_one_or_none()
+        self._store(key, customer_id)
+        return customer_id
+
+    async def resolve_customer(self, db: AsyncSession, phone: Optional[str]) -> Optional[Customer]:
+        """Customer row for a phone number in any format, or None."""
+        key = phone_last10(phone)
+        if not key:
+            return None
+
+        found, customer_id = self._get_cached(key)
+        if found:
+            self._hits += 1
+            if customer_id is None:
+                return None
+            customer = await db.get(Customer, customer_id)
+            if customer is not None:
+                return customer
+            # Deleted behind our back; fall through to a fresh lookup
+            self._entries.pop(key, None)
+        else:
+            self._misses += 1
+
+        result = await db.execute(
+            select(Customer)
+            .where(Customer.phone_last10 == key)
+            .order_by(Customer.created_at.asc())
+            .limit(1)
+        )
+        customer = result.scalar_one_or_none()
+        self._store(key, customer.id if customer else None)
+        return customer
+
+    def invalidate(self, *phones: Optional[str]) -> None:
+        """Drop cached lookups for the given phone numbers."""
+        for phone in phones:
+            key = phone_last10(phone)
+            if key:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        total = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total * 100, 2) if total else 0.0,
+        }
+
+
+phone_identity = PhoneIdentityService()
+
+
+# ---------------------------------------------------------------------------
+# Invalidation on customer writes
+# ---------------------------------------------------------------------------
+
+
+def _mark_dirty(target: Customer, *phones: Optional[str]) -> None:
+    session = object_session(target)
+    if session is None:
+        phone_identity.invalidate(*phones)
+        return
+    session.info.setdefault(_SESSION_INFO_KEY, set()).update(p for p in phones if p)
+
+
+@event.listens_for(Customer, "after_insert")
+def _customer_inserted(mapper, connection, target):
+    # A cached miss for this number must not outlive the insert
+    _mark_dirty(target, target.phone)
+
+
+@event.listens_for(Customer, "after_update")
+def _customer_updated(mapper, connection, target):
+    history = inspect(target).attrs.phone.history
+    if history.has_changes():
+        _mark_dirty(target, *(history.deleted or ()), *(history.added or ()))
+
+
+@event.listens_for(Customer, "after_delete")
+def _customer_deleted(mapper, connection, target):
+    _mark_dirty(target, target.phone)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    dirty = session.info.pop(_SESSION_INFO_KEY, None)
+    if dirty:
+        phone_identity.invalidate(*dirty)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -0,0 +1,363 @@
+"""
+Authenticated-principal cache.
+
+get_current_user, get_entity_context and get_current_api_client run on every
+authenticated request and used to cost one to four queries before the
+endpoint did any work. This module keeps column snapshots of the rows they
+need in CacheService's "principal" namespace (short per-worker L1, Redis
+behind it) and rebuilds ORM instances from them. Rebuilt instances are merged
+into the request's session without a SELECT, so endpoints can still modify
+and commit the current user as before.
+
+Entries (<v> is a hash of the snapshotted columns):
+    principal:user:<v>:<id>           User columns except hashed_password
+    principal:entities:<v>            every CompanyEntity (one row per LLC)
+    principal:api_token:<v>:<sha256>  APIToken and its APIClient, without secrets
+
+Invalidation:
+    ORM writes to these models are collected per session and their tags are
+    invalidated after commit (the same pattern as phone_identity). A tag's
+    generation acts as the principal's version: deactivating a user, changing
+    a role, revoking a token or editing an entity takes effect immediately in
+    this worker and on other workers within the namespace's L1 TTL, also when
+    it commits while another request is loading the same principal (see
+    CacheService.get_or_load). Raw SQL
+    and bulk UPDATEs bypass the ORM events and are picked up when the entry
+    expires after PRINCIPAL_CACHE_TTL seconds (0 disables the cache).
+
+Usage:
+    from app.services.principal_cache import principal_cache
+
+    user = await principal_cache.get_user(db, user_id)
+    entity = await principal_cache.resolve_entity(db, header_id, user.default_entity_id)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+import zlib
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.config import settings
+from app.models.company_entity import CompanyEntity
+from app.models.oauth import APIClient, APIToken
+from app.models.user import User
+from app.services.cache_service import get_cache_service
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M")
+
+# Secrets never leave the database
+_EXCLUDED_COLUMNS = {
+    User: frozenset({"hashed_password"}),
+    APIClient: frozenset({"client_secret_hash"}),
+    APIToken: frozenset({"refresh_token_hash"}),
+    CompanyEntity: frozenset(),
+}
+
+
+def _columns_version(*models: type) -> str:
+    """
+    Short hash of the snapshotted columns. It is part of every key, so a
+    worker never restores a snapshot written for a different schema (e.g.
+    during a rolling deploy that adds a column).
+    """
+    names = ",".join(
+        f"{model.__tablename__}.{attr.key}"
+        for model in models
+        for attr in inspect(model).column_attrs
+        if attr.key not in _EXCLUDED_COLUMNS[model]
+    )
+    return format(zlib.crc32(names.encode()), "08x")
+
+
+USER_KEY = f"principal:user:{_columns_version(User)}:{{}}"
+ENTITIES_KEY = f"principal:entities:{_columns_version(CompanyEntity)}"
+API_TOKEN_KEY = f"principal:api_token:{_columns_version(APIToken, APIClient)}:{{}}"
+
+ENTITIES_TAG = "principal:entities"
+
+# Bookkeeping columns whose changes do not affect authentication
+_IGNORED_CHANGES = frozenset({"last_used_at", "updated_at"})
+
+# last_used_at is written at most this often per token
+TOUCH_INTERVAL_SECONDS = 60
+_MAX_TOUCHED = 10_000
+
+_SESSION_INFO_KEY = "principal_cache_tags"
+
+
+def user_tag(user_id: Any) -> str:
+    return f"principal:user:{user_id}"
+
+
+def api_client_tag(client_pk: Any) -> str:
+    return f"principal:api_client:{client_pk}"
+
+
+def api_token_tag(token_pk: Any) -> str:
+    return f"principal:api_token:{token_pk}"
+
+
+def snapshot(obj: Any) -> dict:
+    """Column values of an ORM instance, minus secret columns."""
+    excluded = _EXCLUDED_COLUMNS.get(type(obj), frozenset())
+    return {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(obj).mapper.column_attrs
+        if attr.key not in excluded
+    }
+
+
+def restore(model: type[M], data: dict) -> M:
+    """
+    Detached instance rebuilt from a snapshot, as if it had just been loaded.
+
+    Excluded columns are left expired; touching them on an attached instance
+    loads them from the database.
+    """
+    obj = model(**data)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _parse_uuid(value: Any) -> Optional[uuid.UUID]:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class PrincipalCache:
+    """Snapshots of the users, entities and API tokens that authenticate requests."""
+
+    def __init__(self, touch_interval: float = TOUCH_INTERVAL_SECONDS):
+        self._touch_interval = touch_interval
+        # token id -> monotonic time of the last last_used_at write
+        self._touched: dict[int, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def ttl(self) -> int:
+        return settings.PRINCIPAL_CACHE_TTL
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Union[list[str], Callable[[Any], list[str]]],
+        ttl: Optional[Callable[[Any], int]] = None,
+    ) -> Any:
+        if self.ttl <= 0:
+            return await loader()
+        return await get_cache_service().get_or_load(key, loader, ttl=ttl or self.ttl, tags=tags)
+
+    # -- Users ---------------------------------------------------------------
+
+    async def get_user(self, db: AsyncSession, user_id: int) -> Optional[User]:
+        """User by id, attached to db; None if no such user."""
+
+        async def load():
+            result = await db.execute(select(User).where(User.id == user_id))
+            user = result.scalar_one_or_none()
+            return snapshot(user) if user else None
+
+        data = await self._load(USER_KEY.format(user_id), load, [user_tag(user_id)])
+        if data is None:
+            return None
+        return await db.merge(restore(User, data), load=False)
+
+    # -- Company entities ----------------------------------------------------
+
+    async def resolve_entity(
+        self,
+        db: AsyncSession,
+        entity_id: Optional[str],
+        default_entity_id: Any = None,
+    ) -> Optional[CompanyEntity]:
+        """
+        Entity for a request: the active entity named by entity_id, else the
+        user's default entity, else the system default; None if there are no
+        entities yet.
+        """
+
+        async def load():
+            result = await db.execute(select(CompanyEntity))
+            return [snapshot(e) for e in result.scalars().all()]
+
+        rows = await self._load(ENTITIES_KEY, load, [ENTITIES_TAG])
+        by_id = {_parse_uuid(row["id"]): row for row in rows}
+
+        row = None
+        requested = _parse_uuid(entity_id) if entity_id else None
+        if requested is not None and by_id.get(requested, {}).get("is_active"):
+            row = by_id[requested]
+        if row is None and default_entity_id:
+            row = by_id.get(_parse_uuid(default_entity_id))
+        if row is None:
+            row = next((r for r in rows if r.get("is_default")), None)
+        if row is None:
+            return None
+        return await db.merge(restore(CompanyEntity, row), load=False)
+
+    # -- Public API tokens ---------------------------------------------------
+
+    async def get_api_token(
+        self, db: AsyncSession, token_hash: str
+    ) -> tuple[Optional[APIToken], Optional[APIClient]]:
+        """
+        Token by hash and its client (attached to db).
+
+        Returns (None, None) for an unknown token and (token, None) if the
+        client no longer exists. The token is detached; validity must still
+        be checked by the caller since cached tokens can expire.
+        """
+
+        async def load():
+            result = await db.execute(select(APIToken).where(APIToken.token_hash == token_hash))
+            token = result.scalar_one_or_none()
+            if token is None:
+                return None
+            result = await db.execute(select(APIClient).where(APIClient.id == token.client_id))
+            client = result.scalar_one_or_none()
+            return {"token": snapshot(token), "client": snapshot(client) if client else None}
+
+        def tags(value):
+            token = value["token"]
+            return [api_token_tag(token["id"]), api_client_tag(token["client_id"])]
+
+        def ttl(value):
+            remaining = (value["token"]["expires_at"] - datetime.utcnow()).total_seconds()
+            return max(1, min(self.ttl, int(remaining)))
+
+        data = await self._load(API_TOKEN_KEY.format(token_hash), load, tags, ttl)
+        if data is None:
+            return None, None
+        token = restore(APIToken, data["token"])
+        if data["client"] is None:
+            return token, None
+        return token, await db.merge(restore(APIClient, data["client"]), load=False)
+
+    async def touch_api_token(self, db: AsyncSession, token: APIToken, client: APIClient) -> None:
+        """Record token and client use, at most once per touch interval per token."""
+        now = time.monotonic()
+        if now - self._touched.get(token.id, float("-inf")) < self._touch_interval:
+            return
+        if len(self._touched) >= _MAX_TOUCHED:
+            self._touched.clear()
+        self._touched[token.id] = now
+
+        used_at = datetime.utcnow()
+        await db.execute(update(APIToken).where(APIToken.id == token.id).values(last_used_at=used_at))
+        await db.execute(update(APIClient).where(APIClient.id == client.id).values(last_used_at=used_at))
+        await db.commit()
+
+    # -- Invalidation --------------------------------------------------------
+
+    def invalidate(self, *tags: str) -> None:
+        """
+        Invalidate principal tags; safe to call from sync code.
+
+        This worker's L1 is cleared at once; the Redis generation bump is
+        scheduled on the running loop, if any.
+        """
+        if not tags:
+            return
+        cache = get_cache_service()
+        cache.invalidate_local_tags(*tags)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(cache.invalidate_tags(*tags))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def clear(self) -> None:
+        self._touched.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+# ---------------------------------------------------------------------------
+# Invalidation on ORM writes
+# ---------------------------------------------------------------------------
+
+
+def _mark_dirty(target: Any, *tags: str) -> None:
+    session = object_session(target)
+    if session is None:
+        principal_cache.invalidate(*tags)
+        return
+    session.info.setdefault(_SESSION_INFO_KEY, set()).update(tags)
+
+
+def _auth_columns_changed(target: Any) -> bool:
+    state = inspect(target)
+    return any(
+        state.attrs[attr.key].history.has_changes()
+        for attr in state.mapper.column_attrs
+        if attr.key not in _IGNORED_CHANGES
+    )
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    if _auth_columns_changed(target):
+        _mark_dirty(target, user_tag(target.id))
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _mark_dirty(target, user_tag(target.id))
+
+
+@event.listens_for(CompanyEntity, "after_insert")
+@event.listens_for(CompanyEntity, "after_update")
+@event.listens_for(CompanyEntity, "after_delete")
+def _entity_written(mapper, connection, target):
+    _mark_dirty(target, ENTITIES_TAG)
+
+
+@event.listens_for(APIClient, "after_update")
+def _api_client_updated(mapper, connection, target):
+    if _auth_columns_changed(target):
+        _mark_dirty(target, api_client_tag(target.id))
+
+
+@event.listens_for(APIClient, "after_delete")
+def _api_client_deleted(mapper, connection, target):
+    _mark_dirty(target, api_client_tag(target.id))
+
+
+@event.listens_for(APIToken, "after_update")
+def _api_token_updated(mapper, connection, target):
+    if _auth_columns_changed(target):
+        _mark_dirty(target, api_token_tag(target.id))
+
+
+@event.listens_for(APIToken, "after_delete")
+def _api_token_deleted(mapper, connection, target):
+    _mark_dirty(target, api_token_tag(target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    tags = session.info.pop(_SESSION_INFO_KEY, None)
+    if tags:
+        principal_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_INFO_KEY, None)
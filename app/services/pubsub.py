@@ -0,0 +1,245 @@
+"""
+Cross-worker pub/sub for real-time fan-out (WebSocket and SSE clients).
+
+Each uvicorn worker (and replica) holds its own sockets, so an event raised
+on one worker has to reach clients connected to the others:
+
+- publish(topic, text, meta) delivers to this worker's handlers at once and
+  forwards the message through a broker to every other worker
+- the broker is Redis pub/sub when REDIS_URL is set (one pattern
+  subscription per worker); without Redis, or in tests, MemoryBroker
+- a message is serialized once by the publisher; receiving workers split the
+  envelope once and hand the same text to all their sockets
+- BufferedSocket gives each connection a bounded send queue drained by its
+  own writer task, so one slow client never delays the others; a client
+  whose queue overflows is evicted (crm_ws_evictions_total)
+
+Envelope on the wire: "<origin worker>\\n<meta json>\\n<text>".
+
+Usage:
+    get_pubsub().subscribe("ws", manager.deliver)   # handler(text, meta) -> sockets reached
+    await get_pubsub().publish("ws", json.dumps(message), {"users": [7]})
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Callable, Optional
+
+from fastapi import WebSocket
+
+from app.config import settings
+from app.core.metrics import track_pubsub_message, track_ws_eviction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "crm:rt:"
+RECONNECT_MAX_SECONDS = 30.0
+# Close code for evicted consumers: "try again later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+Handler = Callable[[str, dict], Optional[int]]
+BrokerCallback = Callable[[str, str], None]
+
+
+class MemoryBroker:
+    """In-process broker: every started hub hears every message (tests, single worker)."""
+
+    def __init__(self):
+        self._callbacks: list[BrokerCallback] = []
+
+    async def start(self, callback: BrokerCallback) -> None:
+        self._callbacks.append(callback)
+
+    async def stop(self, callback: BrokerCallback) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    async def publish(self, channel: str, data: str) -> None:
+        loop = asyncio.get_running_loop()
+        for callback in list(self._callbacks):
+            loop.call_soon(callback, channel, data)
+
+
+class RedisBroker:
+    """Redis pub/sub: one pattern subscription per worker, reconnecting with backoff."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url, decode_responses=True, socket_connect_timeout=2)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, callback: BrokerCallback) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen(callback), name="pubsub-listener")
+
+    async def stop(self, callback: BrokerCallback) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self._client.aclose()
+
+    async def publish(self, channel: str, data: str) -> None:
+        try:
+            await self._client.publish(channel, data)
+        except Exception as e:
+            logger.warning(f"Pub/sub publish to {channel} failed: {e}")
+
+    async def _listen(self, callback: BrokerCallback) -> None:
+        delay = 1.0
+        while True:
+            try:
+                async with self._client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    delay = 1.0
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            callback(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Pub/sub listener lost Redis ({e}); reconnecting in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+
+class PubSub:
+    """Topic handlers on this worker plus the broker that links the workers."""
+
+    def __init__(self, broker=None):
+        self.broker = broker
+        self.origin = uuid.uuid4().hex[:12]
+        self._handlers: dict[str, list[Handler]] = {}
+        self._started = False
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        """Call handler(text, meta) for every message on topic, from any worker."""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def start(self) -> None:
+        """Connect to the broker (Redis when REDIS_URL is set; otherwise this worker only)."""
+        if self._started:
+            return
+        if self.broker is None and settings.REDIS_URL:
+            try:
+                self.broker = RedisBroker(settings.REDIS_URL)
+            except ImportError:
+                logger.warning("redis package not installed, real-time events stay on this worker")
+        if self.broker is not None:
+            await self.broker.start(self._on_message)
+            self._started = True
+
+    async def stop(self) -> None:
+        if self._started:
+            self._started = False
+            await self.broker.stop(self._on_message)
+
+    async def publish(self, topic: str, text: str, meta: Optional[dict] = None, local: bool = True) -> int:
+        """
+        Send text to topic on every worker. Returns the sockets reached on this
+        worker; local=False skips this worker's handlers (the caller already
+        delivered locally).
+        """
+        meta = meta or {}
+        delivered = self._deliver(topic, text, meta) if local else 0
+        if self._started:
+            await self.broker.publish(f"{CHANNEL_PREFIX}{topic}", f"{self.origin}\n{json.dumps(meta)}\n{text}")
+            track_pubsub_message("published")
+        return delivered
+
+    def _on_message(self, channel: str, data: str) -> None:
+        try:
+            origin, meta, text = data.split("\n", 2)
+            if origin == self.origin:
+                return
+            track_pubsub_message("received")
+            self._deliver(channel[len(CHANNEL_PREFIX):], text, json.loads(meta))
+        except Exception as e:
+            logger.warning(f"Bad pub/sub message on {channel}: {e}")
+
+    def _deliver(self, topic: str, text: str, meta: dict) -> int:
+        delivered = 0
+        for handler in self._handlers.get(topic, ()):
+            try:
+                delivered += handler(text, meta) or 0
+            except Exception as e:
+                logger.warning(f"Pub/sub handler for {topic} failed: {e}")
+        return delivered
+
+
+class BufferedSocket:
+    """
+    A WebSocket with a bounded send queue drained by its own writer task.
+
+    offer() never awaits: fan-out to thousands of sockets is a loop of queue
+    puts. A socket whose queue is full is evicted (closed and reported to
+    on_close) instead of buffering without limit.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_close: Optional[Callable[["BufferedSocket"], Any]] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.websocket = websocket
+        self._on_close = on_close
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue or settings.WS_SEND_QUEUE_SIZE)
+        self._writer = asyncio.create_task(self._write())
+        self.closed = False
+
+    def offer(self, text: str) -> bool:
+        """Queue text for this socket; False if the socket is closed or was just evicted."""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(text)
+        except asyncio.QueueFull:
+            track_ws_eviction()
+            logger.warning(f"Evicting slow WebSocket consumer ({self._queue.qsize()} messages behind)")
+            self._close(SLOW_CONSUMER_CLOSE_CODE, "Too slow")
+            return False
+        return True
+
+    def close(self) -> None:
+        """Stop sending (the connection itself is closed by its endpoint)."""
+        self.closed = True
+        self._writer.cancel()
+
+    async def _write(self) -> None:
+        while True:
+            text = await self._queue.get()
+            try:
+                await self.websocket.send_text(text)
+            except Exception:
+                self._close(None)
+                return
+
+    def _close(self, code: Optional[int], reason: str = "") -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._writer.cancel()
+        if code is not None:
+            asyncio.create_task(_close_quietly(self.websocket, code, reason))
+        if self._on_close is not None:
+            self._on_close(self)
+
+
+async def _close_quietly(websocket: WebSocket, code: int, reason: str) -> None:
+    try:
+        await websocket.close(code=code, reason=reason)
+    except Exception:
+        pass
+
+
+_pubsub: Optional[PubSub] = None
+
+
+def get_pubsub() -> PubSub:
+    """Get or create this worker's pub/sub hub."""
+    global _pubsub
+    if _pubsub is None:
+        _pubsub = PubSub()
+    return _pubsub
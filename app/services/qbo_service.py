@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.qbo_oauth import QBOOAuthToken
+from app.services.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +27,9 @@ QBO_SANDBOX_API_BASE = "https://sandbox-quickbooks.api.intuit.com/v3"
 class QBOService:
     """QuickBooks Online API client with automatic token refresh."""
 
-    def __init__(self):
-        self._client = httpx.AsyncClient(timeout=30.0)
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        return get_http_client("quickbooks")
 
     async def _get_token(self, db: AsyncSession, entity_id=None) -> Optional[QBOOAuthToken]:
         """Get active QBO OAuth token from DB, optionally scoped by entity_id."""
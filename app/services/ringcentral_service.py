@@ -17,6 +17,8 @@ from datetime import datetime, timedelta
 import json
 
 from app.config import settings
+from app.services.http_clients import get_http_client
+from app.utils.phone_normalization import phone_digits, to_e164
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,7 @@ class SMSResponse:
     body: str
     from_number: str = ""
     error: str | None = None
+    status_code: int | None = None  # Provider HTTP status of a failed send, None for network errors
 
 
 class RingCentralConfig(BaseModel):
@@ -67,31 +70,15 @@ class RingCentralService:
         """Get the TCR-approved SMS from-number."""
         return settings.RINGCENTRAL_SMS_FROM_NUMBER
 
-    @staticmethod
-    def _format_phone(phone: str) -> str:
-        """Format phone number to E.164 format."""
-        digits = "".join(c for c in phone if c.isdigit())
-        if len(digits) == 10:
-            return f"+1{digits}"
-        elif len(digits) == 11 and digits.startswith("1"):
-            return f"+{digits}"
-        elif phone.startswith("+"):
-            return phone
-        return f"+{digits}"
-
     async def get_client(self) -> httpx.AsyncClient:
-        """Get HTTP client with auth headers."""
+        """Get the pooled HTTP client for the RingCentral API."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                base_url=self.config.server_url,
-                timeout=30.0,
-            )
+            self._client = get_http_client("ringcentral", base_url=self.config.server_url)
         return self._client
 
     async def close(self):
-        """Close HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        """Release the HTTP client (its pooled connections are closed at shutdown)."""
+        self._client = None
 
     async def get_access_token(self) -> Optional[str]:
         """Get or refresh OAuth access token."""
@@ -240,7 +227,7 @@ class RingCentralService:
                 return pn.get("phoneNumber")
         return None
 
-    async def send_sms(self, to: str, body: str) -> SMSResponse:
+    async def send_sms(self, to: str, body: str, from_number: Optional[str] = None) -> SMSResponse:
         """Send an SMS message via RingCentral.
 
         Uses the standard SMS endpoint with a number that has SmsSender capability.
@@ -249,6 +236,7 @@ class RingCentralService:
         Args:
             to: Destination phone number
             body: SMS message body
+            from_number: Sending number (defaults to the configured SMS number)
 
         Returns:
             SMSResponse with message details
@@ -256,10 +244,10 @@ class RingCentralService:
         if not self.is_configured:
             raise Exception("RingCentral not configured")
 
-        to_formatted = self._format_phone(to)
+        to_formatted = to_e164(to)
 
-        # Use configured from-number first, or auto-detect SmsSender number
-        from_number = self.phone_number
+        # Use the requested or configured from-number first, or auto-detect SmsSender number
+        from_number = from_number or self.phone_number
         if not from_number:
             from_number = await self._get_sms_sender_number()
         if not from_number:
@@ -309,6 +297,7 @@ class RingCentralService:
                 body=body,
                 from_number=from_number,
                 error=str(error_msg),
+                status_code=result.get("status_code"),
             )
 
         msg_id = str(result.get("id", ""))
@@ -340,7 +329,7 @@ class RingCentralService:
             Call session information
         """
         # Normalize from_number - extract digits only
-        from_digits = "".join(c for c in from_number if c.isdigit())
+        from_digits = phone_digits(from_number)
 
         # Detect extension (1-5 digits) vs phone number (6+ digits)
         from_field = None  # Will be set below or left None for default
@@ -415,13 +404,7 @@ class RingCentralService:
                 from_field = {"phoneNumber": from_digits}
 
         # Format to_number with country code
-        to_digits = "".join(c for c in to_number if c.isdigit())
-        if len(to_digits) == 10:
-            to_formatted = f"+1{to_digits}"
-        elif len(to_digits) == 11 and to_digits.startswith("1"):
-            to_formatted = f"+{to_digits}"
-        else:
-            to_formatted = to_digits
+        to_formatted = to_e164(to_number) or phone_digits(to_number)
 
         data = {
             "to": {"phoneNumber": to_formatted},
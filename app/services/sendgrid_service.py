@@ -9,7 +9,7 @@ import logging
 from typing import Optional
 from datetime import date, timedelta
 
-import httpx
+from app.services.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -49,28 +49,28 @@ async def send_email(
         "content": [{"type": "text/html", "value": html_content}],
     }
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            resp = await client.post(
-                f"{BASE_URL}/mail/send",
-                json=payload,
-                headers=headers,
-            )
-            if resp.status_code == 202:
-                return {
-                    "success": True,
-                    "message_id": resp.headers.get("X-Message-Id"),
-                    "error": None,
-                }
-            logger.warning(f"SendGrid error {resp.status_code}: {resp.text[:200]}")
+    client = get_http_client("sendgrid")
+    try:
+        resp = await client.post(
+            f"{BASE_URL}/mail/send",
+            json=payload,
+            headers=headers,
+        )
+        if resp.status_code == 202:
             return {
-                "success": False,
-                "message_id": None,
-                "error": f"SendGrid HTTP {resp.status_code}",
+                "success": True,
+                "message_id": resp.headers.get("X-Message-Id"),
+                "error": None,
             }
-        except Exception as e:
-            logger.warning(f"SendGrid send_email failed: {e}")
-            return {"success": False, "message_id": None, "error": str(e)}
+        logger.warning(f"SendGrid error {resp.status_code}: {resp.text[:200]}")
+        return {
+            "success": False,
+            "message_id": None,
+            "error": f"SendGrid HTTP {resp.status_code}",
+        }
+    except Exception as e:
+        logger.warning(f"SendGrid send_email failed: {e}")
+        return {"success": False, "message_id": None, "error": str(e)}
 
 
 async def get_stats(days: int = 7) -> dict:
@@ -85,36 +85,36 @@ async def get_stats(days: int = 7) -> dict:
     start_date = (date.today() - timedelta(days=days)).isoformat()
     headers = {"Authorization": f"Bearer {SENDGRID_API_KEY}"}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(
-                f"{BASE_URL}/stats",
-                params={"start_date": start_date, "aggregated_by": "day"},
-                headers=headers,
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                totals: dict[str, int] = {
-                    "requests": 0,
-                    "delivered": 0,
-                    "opens": 0,
-                    "clicks": 0,
-                    "bounces": 0,
-                }
-                for day in data:
-                    for stat in day.get("stats", []):
-                        m = stat.get("metrics", {})
-                        for k in totals:
-                            totals[k] += m.get(k, 0)
-                return {"configured": True, "days": days, **totals}
-
-            return {
-                "configured": True,
-                "error": f"SendGrid Stats API returned {resp.status_code}",
+    client = get_http_client("sendgrid")
+    try:
+        resp = await client.get(
+            f"{BASE_URL}/stats",
+            params={"start_date": start_date, "aggregated_by": "day"},
+            headers=headers,
+        )
+        if resp.status_code == 200:
+            data = resp.json()
+            totals: dict[str, int] = {
+                "requests": 0,
+                "delivered": 0,
+                "opens": 0,
+                "clicks": 0,
+                "bounces": 0,
             }
-        except Exception as e:
-            logger.warning(f"SendGrid get_stats failed: {e}")
-            return {"configured": True, "error": str(e)}
+            for day in data:
+                for stat in day.get("stats", []):
+                    m = stat.get("metrics", {})
+                    for k in totals:
+                        totals[k] += m.get(k, 0)
+            return {"configured": True, "days": days, **totals}
+
+        return {
+            "configured": True,
+            "error": f"SendGrid Stats API returned {resp.status_code}",
+        }
+    except Exception as e:
+        logger.warning(f"SendGrid get_stats failed: {e}")
+        return {"configured": True, "error": str(e)}
 
 
 # Module-level namespace so callers can do `from ... import sendgrid_service`
@@ -0,0 +1,391 @@
+"""
+Outbound SMS dispatcher: callers enqueue, one background dispatcher sends.
+
+Performance design:
+- enqueue_sms() never awaits the provider. With a session, the messages row
+  is written as "queued" in the caller's transaction and the SMS is handed to
+  the dispatcher only after that transaction commits (dropped on rollback)
+- One lane per sender number, each held to SMS_SEND_RATE_PER_NUMBER by a
+  token bucket (carrier/provider throughput caps are per number); sends in
+  a lane overlap, so a slow provider response doesn't stall the lane
+- Sends go through the provider's shared async HTTP client (sms_service)
+- Network errors, 429 and 5xx answers are retried up to SMS_MAX_ATTEMPTS with
+  exponential backoff and full jitter; other failures are final
+- Outcomes are written to messages in bulk (one upsert per batch) by a
+  single writer task
+- Bounded: beyond SMS_QUEUE_SIZE waiting messages new ones are recorded as
+  failed and counted (crm_sms_messages_total{outcome="dropped"})
+- Metrics: crm_sms_queue_depth, crm_sms_messages_total{outcome},
+  crm_sms_send_latency_seconds (enqueue to final outcome)
+
+Usage:
+    from app.services.sms_dispatcher import enqueue_sms
+    enqueue_sms(customer.phone, "Your technician is on the way", db=db, customer_id=customer.id)
+    await db.commit()  # the SMS is dispatched once this commits
+"""
+import asyncio
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.metrics import track_sms_latency, track_sms_messages, track_sms_queue_depth
+from app.core.rate_limit import TokenBucket
+from app.database import async_session_maker
+from app.models.message import Message
+from app.services.sms_service import sms_service
+
+logger = logging.getLogger(__name__)
+
+# Provider answers worth retrying; anything else (bad number, opted out) is final
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 60.0
+# Sends in flight per sender number
+LANE_CONCURRENCY = 4
+# Outcome rows per upsert, and the longest an outcome waits to be written
+RESULT_BATCH_SIZE = 100
+RESULT_FLUSH_SECONDS = 1.0
+
+_SESSION_INFO_KEY = "sms_dispatcher.pending"
+
+Transport = Callable[["OutboundSMS"], Awaitable[Any]]
+
+
+@dataclass
+class OutboundSMS:
+    """One queued text message; id is its messages row id."""
+
+    to: str
+    body: str
+    from_number: Optional[str] = None
+    customer_id: Optional[uuid.UUID] = None
+    work_order_id: Optional[uuid.UUID] = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class _Lane:
+    """Messages waiting to go out from one sender number."""
+
+    def __init__(self, rate: float):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.bucket = TokenBucket(1, rate, 1.0, time.monotonic())
+        self.slots = asyncio.Semaphore(LANE_CONCURRENCY)
+        self.task: Optional[asyncio.Task] = None
+
+
+class SMSDispatcher:
+    """Per-sender rate-limited SMS sender with retries and batched status writes."""
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        rate_per_number: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        retry_base: float = RETRY_BASE_SECONDS,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self._transport = transport
+        self.rate_per_number = rate_per_number or settings.SMS_SEND_RATE_PER_NUMBER
+        self.max_attempts = max_attempts or settings.SMS_MAX_ATTEMPTS
+        self.max_queue = max_queue or settings.SMS_QUEUE_SIZE
+        self.retry_base = retry_base
+        self._session_factory = session_factory
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lanes: dict[str, _Lane] = {}
+        self._waiting = 0  # queued or backing off, not yet handed to the provider
+        self._pending = 0  # accepted and without a final outcome
+        self._idle: Optional[asyncio.Event] = None
+        self._results: list[dict[str, Any]] = []
+        self._results_ready: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._sends: set[asyncio.Task] = set()
+        self._retries: dict[uuid.UUID, tuple[asyncio.TimerHandle, OutboundSMS]] = {}
+        self._closing = False
+        self.stats = {"sent": 0, "failed": 0, "retried": 0, "dropped": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be sent (queued or backing off before a retry)."""
+        return self._waiting
+
+    def start(self) -> None:
+        """Start the result writer on the running loop (no-op if already running)."""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._lanes = {}
+            self._idle = asyncio.Event()
+            self._idle.set()
+            self._results_ready = asyncio.Event()
+        self._closing = False
+        self._writer = loop.create_task(self._write_results(), name="sms-status-writer")
+
+    def enqueue(self, sms: OutboundSMS) -> bool:
+        """
+        Hand a message to the dispatcher. Never blocks; returns False (and
+        records the message as failed) when the queue is full or stopped.
+        """
+        if not self._closing and not self.running:
+            try:
+                self.start()
+            except RuntimeError:  # no running event loop
+                logger.warning(f"SMS to {sms.to} not sent: no event loop")
+                return False
+        if self._closing or self._waiting >= self.max_queue:
+            self.stats["dropped"] += 1
+            track_sms_messages("dropped")
+            self._record(sms, "failed", error="SMS dispatcher stopped" if self._closing else "SMS queue full")
+            return False
+        self._pending += 1
+        self._idle.clear()
+        self._push(sms)
+        return True
+
+    async def flush(self) -> None:
+        """Wait until every accepted message has a final outcome written to messages."""
+        if self._idle is None:
+            return
+        await self._idle.wait()
+        await self._write_batch()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting messages, finish (or give up on) the queue, write outcomes."""
+        self._closing = True
+        if not self.running:
+            return
+        # Messages backing off get their last attempt now rather than after shutdown
+        for handle, sms in list(self._retries.values()):
+            handle.cancel()
+            self._retry(sms)
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("SMS dispatcher did not drain within %.0fs; %d messages left queued", timeout, self._waiting)
+        for lane in self._lanes.values():
+            if lane.task is not None:
+                lane.task.cancel()
+        for task in list(self._sends):
+            task.cancel()
+        self._writer.cancel()
+        await self._write_batch()
+
+    # -- Sending ----------------------------------------------------------------
+
+    def _push(self, sms: OutboundSMS) -> None:
+        sender = sms.from_number or ""
+        lane = self._lanes.get(sender)
+        if lane is None:
+            lane = self._lanes[sender] = _Lane(self.rate_per_number)
+        if lane.task is None or lane.task.done():
+            lane.task = self._loop.create_task(self._run_lane(lane), name=f"sms-lane-{sender or 'default'}")
+        lane.queue.put_nowait(sms)
+        self._waiting += 1
+        track_sms_queue_depth(self._waiting)
+
+    async def _run_lane(self, lane: _Lane) -> None:
+        while True:
+            sms = await lane.queue.get()
+            await lane.slots.acquire()
+            while not lane.bucket.take():
+                await asyncio.sleep((1 - lane.bucket.tokens) / lane.bucket.refill_per_second)
+            self._waiting -= 1
+            track_sms_queue_depth(self._waiting)
+            task = self._loop.create_task(self._deliver(sms))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+            task.add_done_callback(lambda _: lane.slots.release())
+
+    async def _deliver(self, sms: OutboundSMS) -> None:
+        sms.attempts += 1
+        retryable, response, error = False, None, None
+        if self._transport is None and not sms_service.is_configured:
+            # Retrying won't configure the provider
+            error = "SMS service not configured"
+        else:
+            try:
+                response = await (self._transport or _provider_send)(sms)
+            except Exception as e:
+                retryable, error = True, str(e)
+            else:
+                if getattr(response, "status", "") == "failed":
+                    code = getattr(response, "status_code", None)
+                    retryable = code is None or code in RETRY_STATUS_CODES
+                    error = getattr(response, "error", None) or "send failed"
+
+        if error is None:
+            self.stats["sent"] += 1
+            track_sms_messages("sent")
+            self._finish(
+                sms, "sent", external_id=getattr(response, "sid", None) or None,
+                from_number=getattr(response, "from_number", None) or sms.from_number,
+            )
+        elif retryable and sms.attempts < self.max_attempts and not self._closing:
+            # Full jitter: spread retries from many messages over the whole window
+            delay = random.uniform(0, min(RETRY_MAX_SECONDS, self.retry_base * 2 ** (sms.attempts - 1)))
+            self.stats["retried"] += 1
+            track_sms_messages("retried")
+            logger.info(f"SMS to {sms.to} failed ({error}); retry {sms.attempts} in {delay:.1f}s")
+            self._waiting += 1
+            self._retries[sms.id] = (self._loop.call_later(delay, self._retry, sms), sms)
+        else:
+            self.stats["failed"] += 1
+            track_sms_messages("failed")
+            logger.warning(f"SMS to {sms.to} failed after {sms.attempts} attempt(s): {error}")
+            self._finish(sms, "failed", error=error)
+
+    def _retry(self, sms: OutboundSMS) -> None:
+        self._retries.pop(sms.id, None)
+        self._waiting -= 1
+        self._push(sms)
+
+    def _finish(self, sms: OutboundSMS, status: str, **values: Any) -> None:
+        track_sms_latency(time.monotonic() - sms.enqueued_at)
+        self._record(sms, status, **values)
+        self._pending -= 1
+        if self._pending == 0:
+            self._idle.set()
+
+    # -- Status writes ----------------------------------------------------------
+
+    def _record(self, sms: OutboundSMS, status: str, external_id: Optional[str] = None,
+                from_number: Optional[str] = None, error: Optional[str] = None) -> None:
+        now = datetime.now(timezone.utc)
+        self._results.append({
+            "id": sms.id,
+            "customer_id": sms.customer_id,
+            "work_order_id": sms.work_order_id,
+            "type": "sms",
+            "direction": "outbound",
+            "status": status,
+            "from_number": from_number or sms.from_number,
+            "to_number": sms.to,
+            "content": sms.body,
+            "external_id": external_id,
+            "error_message": error,
+            "sent_at": now if status == "sent" else None,
+            "created_at": now,
+            "updated_at": now,
+        })
+        if self._results_ready is not None and len(self._results) >= RESULT_BATCH_SIZE:
+            self._results_ready.set()
+
+    async def _write_results(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._results_ready.wait(), RESULT_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._results_ready.clear()
+            await self._write_batch()
+
+    async def _write_batch(self) -> None:
+        while self._results:
+            batch, self._results = self._results[:RESULT_BATCH_SIZE], self._results[RESULT_BATCH_SIZE:]
+            factory = self._session_factory or async_session_maker
+            try:
+                async with factory() as db:
+                    await db.execute(_upsert_statement(db.get_bind().dialect.name), batch)
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"SMS status write of {len(batch)} rows failed: {e}")
+
+
+async def _provider_send(sms: OutboundSMS) -> Any:
+    return await sms_service.send_sms(sms.to, sms.body, from_number=sms.from_number)
+
+
+@lru_cache(maxsize=None)
+def _upsert_statement(dialect: str):
+    """Insert-or-update of messages rows, built once per dialect so its compiled form is cached."""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(Message.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[Message.__table__.c.id],
+        set_={
+            name: stmt.excluded[name]
+            for name in ("status", "from_number", "external_id", "error_message", "sent_at", "updated_at")
+        },
+    )
+
+
+_dispatcher: Optional[SMSDispatcher] = None
+
+
+def get_sms_dispatcher() -> SMSDispatcher:
+    """Get or create this worker's SMS dispatcher."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = SMSDispatcher()
+    return _dispatcher
+
+
+def enqueue_sms(
+    to: str,
+    body: str,
+    *,
+    db: Optional[AsyncSession] = None,
+    customer_id: Optional[uuid.UUID] = None,
+    work_order_id: Optional[uuid.UUID] = None,
+    from_number: Optional[str] = None,
+) -> uuid.UUID:
+    """
+    Queue an outbound SMS and return its messages row id.
+
+    With db, the row is added as "queued" to that session and the message is
+    dispatched after the session commits; without db it is dispatched now
+    and its row is written with the outcome.
+    """
+    sms = OutboundSMS(to, body, from_number=from_number, customer_id=customer_id, work_order_id=work_order_id)
+    if db is None:
+        get_sms_dispatcher().enqueue(sms)
+        return sms.id
+    db.add(Message(
+        id=sms.id,
+        customer_id=customer_id,
+        work_order_id=work_order_id,
+        message_type="sms",
+        direction="outbound",
+        status="queued",
+        from_number=from_number,
+        to_number=to,
+        content=body,
+    ))
+    db.info.setdefault(_SESSION_INFO_KEY, []).append(sms)
+    return sms.id
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    queued = session.info.pop(_SESSION_INFO_KEY, None)
+    if queued:
+        dispatcher = get_sms_dispatcher()
+        for sms in queued:
+            dispatcher.enqueue(sms)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -36,12 +36,13 @@ class SMSService:
         """Whether the SMS backend (RingCentral) is ready."""
         return self._rc.is_configured and bool(self._rc.phone_number)
 
-    async def send_sms(self, to: str, body: str) -> Any:
+    async def send_sms(self, to: str, body: str, from_number: str | None = None) -> Any:
         """Send an SMS message.
 
         Args:
             to: Destination phone number (any format — will be normalized)
             body: Message body text
+            from_number: Sending number (defaults to the TCR-approved number)
 
         Returns:
             SMSResponse (has .sid, .status, .to, .body, .error attributes)
@@ -55,7 +56,7 @@ class SMSService:
                 "RINGCENTRAL_CLIENT_SECRET, RINGCENTRAL_JWT_TOKEN, and "
                 "RINGCENTRAL_SMS_FROM_NUMBER"
             )
-        return await self._rc.send_sms(to, body)
+        return await self._rc.send_sms(to, body, from_number=from_number)
 
 
 class MockSMSService(SMSService):
@@ -72,13 +73,13 @@ class MockSMSService(SMSService):
     def is_configured(self) -> bool:
         return True
 
-    async def send_sms(self, to: str, body: str) -> SMSResponse:
+    async def send_sms(self, to: str, body: str, from_number: str | None = None) -> SMSResponse:
         msg = SMSResponse(
             sid=f"MOCK-{'0' * 20}",
             status="Queued",
             to=to,
             body=body,
-            from_number=self.phone_number,
+            from_number=from_number or self.phone_number,
         )
         self._sent_messages.append({"to": to, "body": body, "sid": msg.sid})
         logger.info(f"Mock SMS sent to {to}")
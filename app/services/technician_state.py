@@ -0,0 +1,448 @@
+"""
+Technician state snapshot for dispatch recommendations.
+
+recommend_technicians used to run five queries per work order (the job,
+every active technician, recent GPS, home locations and a GROUP BY of the
+day's workload) and walk the Samsara vehicle store. This module keeps that
+state in memory per worker and updates it as it changes, so a
+recommendation is one work-order query plus vectorized scoring.
+
+Parts and how they stay current:
+    roster      active technicians: name, phone, skills, home, assigned
+                vehicle. Reloaded every ROSTER_TTL seconds and after ORM
+                writes to Technician.
+    gps         last fix per technician. Updated from TechnicianLocation ORM
+                writes after commit and from record_gps() (the raw-SQL GPS
+                endpoints call it); re-read from technician_locations every
+                POSITIONS_TTL seconds to pick up other workers' updates.
+                Fixes older than GPS_FRESH_SECONDS are ignored.
+    vehicles    Samsara positions, pushed by the feed poller through
+                record_vehicles() and matched to technicians by
+                assigned_vehicle (vehicle name or id).
+    workload    per date: open and active job counts per technician. Loaded
+                with one GROUP BY per date, then adjusted from WorkOrder ORM
+                writes after commit (old and new technician, date and
+                status). Raw SQL writes call invalidate_workload() or are
+                picked up after WORKLOAD_TTL seconds.
+
+Position priority matches the old lookup: fresh GPS, then Samsara, then home.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.models.gps_tracking import TechnicianLocation
+from app.models.technician import Technician
+from app.models.work_order import WorkOrder
+
+logger = logging.getLogger(__name__)
+
+ROSTER_TTL = 300
+POSITIONS_TTL = 15
+WORKLOAD_TTL = 60
+GPS_FRESH_SECONDS = 30 * 60
+
+CLOSED_STATUSES = ("completed", "canceled")
+ACTIVE_STATUSES = ("enroute", "on_site", "in_progress")
+
+# Position sources, in priority order
+SOURCES = ("gps", "samsara", "home")
+
+
+@dataclass
+class Roster:
+    """Active technicians in a fixed order; arrays are aligned with ids."""
+
+    ids: list[str]
+    names: list[str]
+    phones: list[Optional[str]]
+    skills: list[list[str]]
+    home_lat: np.ndarray
+    home_lng: np.ndarray
+    # Lower-cased assigned_vehicle -> position in ids
+    vehicles: dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.index = {tech_id: i for i, tech_id in enumerate(self.ids)}
+
+
+@dataclass
+class Positions:
+    """Where each roster technician is (NaN if unknown), the source and reported status."""
+
+    lat: np.ndarray
+    lng: np.ndarray
+    source: list[Optional[str]]
+    status: list[Optional[str]]
+
+
+class TechnicianState:
+    def __init__(self):
+        self.roster: Optional[Roster] = None
+        self._roster_loaded = 0.0
+        self._roster_stale = False
+        # technician id -> (lat, lng, status, captured_at epoch seconds, speed mph)
+        self.gps: dict[str, tuple[float, float, Optional[str], float, Optional[float]]] = {}
+        self._gps_loaded = 0.0
+        # vehicle id -> (name, lat, lng, status)
+        self.vehicles: dict[str, tuple[str, float, float, str]] = {}
+        # date -> (loaded at, {tech key: [open jobs, active jobs]})
+        self.workload: dict[date, tuple[float, dict[str, list[int]]]] = {}
+
+    # -- loading ------------------------------------------------------------
+
+    async def refresh(self, db: AsyncSession, dates: Iterable[date] = ()) -> None:
+        """Reload whichever parts are stale (or missing) for the given dates."""
+        now = time.monotonic()
+        if self.roster is None or self._roster_stale or now - self._roster_loaded > ROSTER_TTL:
+            # Cleared first: an invalidation while the load runs marks the new roster stale again
+            self._roster_stale = False
+            self.roster = await self._load_roster(db)
+            self._roster_loaded = now
+        if now - self._gps_loaded > POSITIONS_TTL:
+            await self._load_gps(db)
+            self._gps_loaded = now
+        for day in set(dates):
+            cached = self.workload.get(day)
+            if cached is None or now - cached[0] > WORKLOAD_TTL:
+                self.workload[day] = (now, await self._load_workload(db, day))
+
+    async def _load_roster(self, db: AsyncSession) -> Roster:
+        result = await db.execute(
+            select(
+                Technician.id,
+                Technician.first_name,
+                Technician.last_name,
+                Technician.phone,
+                Technician.skills,
+                Technician.home_latitude,
+                Technician.home_longitude,
+                Technician.assigned_vehicle,
+            ).where(Technician.is_active == True)  # noqa: E712
+        )
+        rows = result.all()
+        skills = []
+        for row in rows:
+            tech_skills = row.skills or []
+            if isinstance(tech_skills, str):
+                tech_skills = [s.strip() for s in tech_skills.split(",") if s.strip()]
+            skills.append(list(tech_skills))
+        return Roster(
+            ids=[str(row.id) for row in rows],
+            names=[f"{row.first_name or ''} {row.last_name or ''}".strip() for row in rows],
+            phones=[row.phone for row in rows],
+            skills=skills,
+            home_lat=np.asarray([_float(row.home_latitude) for row in rows], dtype=np.float64),
+            home_lng=np.asarray([_float(row.home_longitude) for row in rows], dtype=np.float64),
+            vehicles={row.assigned_vehicle.strip().lower(): i for i, row in enumerate(rows) if row.assigned_vehicle},
+        )
+
+    async def _load_gps(self, db: AsyncSession) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=GPS_FRESH_SECONDS)
+        try:
+            result = await db.execute(
+                select(
+                    TechnicianLocation.technician_id,
+                    TechnicianLocation.latitude,
+                    TechnicianLocation.longitude,
+                    TechnicianLocation.current_status,
+                    TechnicianLocation.captured_at,
+                    TechnicianLocation.speed,
+                ).where(TechnicianLocation.captured_at > cutoff)
+            )
+        except Exception:
+            logger.debug("technician_locations query failed", exc_info=True)
+            return
+        for row in result.all():
+            self.record_gps(
+                row.technician_id, row.latitude, row.longitude, row.current_status, row.captured_at, row.speed
+            )
+
+    async def _load_workload(self, db: AsyncSession, day: date) -> dict[str, list[int]]:
+        result = await db.execute(
+            select(
+                WorkOrder.technician_id,
+                WorkOrder.assigned_technician,
+                func.count().label("open_jobs"),
+                func.sum(case((WorkOrder.status.in_(ACTIVE_STATUSES), 1), else_=0)).label("active_jobs"),
+            )
+            .where(WorkOrder.scheduled_date == day, WorkOrder.status.notin_(CLOSED_STATUSES))
+            .group_by(WorkOrder.technician_id, WorkOrder.assigned_technician)
+        )
+        counts: dict[str, list[int]] = {}
+        for row in result.all():
+            key = _tech_key(row.technician_id, row.assigned_technician)
+            if key is None:
+                continue
+            entry = counts.setdefault(key, [0, 0])
+            entry[0] += int(row.open_jobs)
+            entry[1] += int(row.active_jobs or 0)
+        return counts
+
+    # -- incremental updates ------------------------------------------------
+
+    def record_gps(
+        self,
+        technician_id: Any,
+        lat: Any,
+        lng: Any,
+        status: Optional[str] = None,
+        captured_at: Optional[datetime] = None,
+        speed: Optional[float] = None,
+    ) -> None:
+        """A GPS fix; an older fix than the one held is ignored, status None keeps the held status."""
+        if lat is None or lng is None:
+            return
+        if captured_at is None:
+            stamp = time.time()
+        elif captured_at.tzinfo is None:
+            stamp = captured_at.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            stamp = captured_at.timestamp()
+        tech_id = str(technician_id)
+        held = self.gps.get(tech_id)
+        if held is not None and held[3] > stamp:
+            return
+        if status is None and held is not None:
+            status = held[2]
+        self.gps[tech_id] = (float(lat), float(lng), status, stamp, speed)
+
+    def record_vehicles(self, vehicles: Iterable[Any], replace: bool = False) -> None:
+        """Samsara vehicles (objects with id, name, status and location.lat/lng); replace=True for a full fetch."""
+        if replace:
+            self.vehicles.clear()
+        for vehicle in vehicles:
+            location = getattr(vehicle, "location", None)
+            if location is None or not location.lat or not location.lng:
+                continue
+            self.vehicles[vehicle.id] = (vehicle.name or "", float(location.lat), float(location.lng), vehicle.status)
+
+    def invalidate_workload(self, day: Optional[date] = None) -> None:
+        """Drop the workload of one date (all dates if None); it is reloaded on next use."""
+        if day is None:
+            self.workload.clear()
+        else:
+            self.workload.pop(day, None)
+
+    def invalidate_roster(self) -> None:
+        """Mark the roster stale; the current one keeps serving until refresh() replaces it."""
+        self._roster_stale = True
+
+    def apply_work_order_change(self, old: Optional[tuple], new: Optional[tuple]) -> None:
+        """Move one job's count from its old (tech key, date, status) to its new one."""
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            key, day, status = state
+            cached = self.workload.get(day)
+            if cached is None or key is None or status in CLOSED_STATUSES:
+                continue
+            entry = cached[1].setdefault(key, [0, 0])
+            entry[0] = max(0, entry[0] + sign)
+            if status in ACTIVE_STATUSES:
+                entry[1] = max(0, entry[1] + sign)
+
+    # -- reading ------------------------------------------------------------
+
+    def positions(self) -> Positions:
+        """Current position of each roster technician: fresh GPS, else Samsara, else home."""
+        roster = self.roster
+        n = len(roster.ids)
+        lat = roster.home_lat.copy()
+        lng = roster.home_lng.copy()
+        source: list[Optional[str]] = ["home" if not np.isnan(lat[i]) else None for i in range(n)]
+        status: list[Optional[str]] = ["unknown" if source[i] else None for i in range(n)]
+
+        for vehicle_id, (name, v_lat, v_lng, v_status) in self.vehicles.items():
+            i = roster.vehicles.get(name.strip().lower(), roster.vehicles.get(vehicle_id.lower()))
+            if i is None or v_status == "offline":
+                continue
+            lat[i], lng[i], source[i], status[i] = v_lat, v_lng, "samsara", v_status
+
+        cutoff = time.time() - GPS_FRESH_SECONDS
+        for tech_id, (g_lat, g_lng, g_status, stamp, _) in self.gps.items():
+            i = roster.index.get(tech_id)
+            if i is None or stamp < cutoff:
+                continue
+            lat[i], lng[i], source[i], status[i] = g_lat, g_lng, "gps", g_status
+        return Positions(lat, lng, source, status)
+
+    def location_of(self, technician_id: Any) -> Optional[tuple[float, float, str, Optional[float]]]:
+        """(lat, lng, source, speed) of one technician, with the same priority as positions()."""
+        tech_id = str(technician_id)
+        fix = self.gps.get(tech_id)
+        if fix is not None and fix[3] >= time.time() - GPS_FRESH_SECONDS:
+            return fix[0], fix[1], "gps", fix[4]
+        roster = self.roster
+        i = roster.index.get(tech_id) if roster is not None else None
+        if i is None:
+            return None
+        for vehicle_id, (name, v_lat, v_lng, v_status) in self.vehicles.items():
+            owner = roster.vehicles.get(name.strip().lower(), roster.vehicles.get(vehicle_id.lower()))
+            if owner == i and v_status != "offline":
+                return v_lat, v_lng, "samsara", None
+        if np.isnan(roster.home_lat[i]) or np.isnan(roster.home_lng[i]):
+            return None
+        return float(roster.home_lat[i]), float(roster.home_lng[i]), "home", None
+
+    def workload_for(self, day: date) -> tuple[np.ndarray, np.ndarray]:
+        """(open jobs, active jobs) per roster technician on a date, by id or by name."""
+        roster = self.roster
+        counts = self.workload.get(day, (0.0, {}))[1]
+        scheduled = np.zeros(len(roster.ids), dtype=np.int64)
+        active = np.zeros(len(roster.ids), dtype=np.int64)
+        for i, (tech_id, name) in enumerate(zip(roster.ids, roster.names)):
+            entry = counts.get(tech_id) or counts.get(name)
+            if entry:
+                scheduled[i], active[i] = entry
+        return scheduled, active
+
+
+def _float(value: Any) -> float:
+    return float(value) if value is not None else np.nan
+
+
+def _tech_key(technician_id: Any, assigned_technician: Optional[str]) -> Optional[str]:
+    if technician_id is not None:
+        return str(technician_id)
+    return assigned_technician or None
+
+
+_state: Optional[TechnicianState] = None
+
+
+def get_technician_state() -> TechnicianState:
+    """Get or create this worker's technician state."""
+    global _state
+    if _state is None:
+        _state = TechnicianState()
+    return _state
+
+
+# ---------------------------------------------------------------------------
+# Incremental updates from ORM writes
+# ---------------------------------------------------------------------------
+
+_SESSION_INFO_KEY = "technician_state_changes"
+_WORK_ORDER_FIELDS = ("technician_id", "assigned_technician", "scheduled_date", "status")
+
+
+def _queue(target: Any, change: tuple) -> None:
+    session = object_session(target)
+    if session is None:
+        _apply([change])
+        return
+    session.info.setdefault(_SESSION_INFO_KEY, []).append(change)
+
+
+def _apply(changes: list[tuple]) -> None:
+    state = get_technician_state()
+    for change in changes:
+        kind = change[0]
+        if kind == "gps":
+            state.record_gps(*change[1:])
+        elif kind == "work_order":
+            state.apply_work_order_change(*change[1:])
+        elif kind == "workload":
+            state.invalidate_workload(change[1])
+        elif kind == "roster":
+            state.invalidate_roster()
+
+
+def _work_order_states(target: Any, inserted: bool, deleted: bool) -> Optional[tuple]:
+    """(old, new) (tech key, date, status) of a written work order; None if an old value is unknown."""
+    attrs = inspect(target).attrs
+    old, new = {}, {}
+    for name in _WORK_ORDER_FIELDS:
+        history = getattr(attrs, name).history
+        if not history.added and not history.unchanged and not history.deleted and not inserted:
+            return None  # not loaded
+        current = history.added[0] if history.added else (history.unchanged[0] if history.unchanged else None)
+        if history.deleted:
+            previous = history.deleted[0]
+        elif not history.added:
+            previous = current
+        elif inserted:
+            previous = None
+        else:
+            return None  # changed, and the old value was never loaded
+        old[name], new[name] = previous, current
+
+    def state(values: dict) -> Optional[tuple]:
+        if values["scheduled_date"] is None:
+            return None
+        return (
+            _tech_key(values["technician_id"], values["assigned_technician"]),
+            values["scheduled_date"],
+            values["status"],
+        )
+
+    return (None if inserted else state(old)), (None if deleted else state(new))
+
+
+def _work_order_written(target: Any, inserted: bool = False, deleted: bool = False) -> None:
+    states = _work_order_states(target, inserted, deleted)
+    if states is None:
+        # Without the old values the counts can't be moved; reload every cached date
+        _queue(target, ("workload", None))
+        return
+    _queue(target, ("work_order", *states))
+
+
+@event.listens_for(WorkOrder, "after_insert")
+def _work_order_inserted(mapper, connection, target):
+    _work_order_written(target, inserted=True)
+
+
+@event.listens_for(WorkOrder, "after_update")
+def _work_order_updated(mapper, connection, target):
+    _work_order_written(target)
+
+
+@event.listens_for(WorkOrder, "after_delete")
+def _work_order_deleted(mapper, connection, target):
+    _work_order_written(target, deleted=True)
+
+
+@event.listens_for(TechnicianLocation, "after_insert")
+@event.listens_for(TechnicianLocation, "after_update")
+def _location_written(mapper, connection, target):
+    _queue(
+        target,
+        (
+            "gps",
+            target.technician_id,
+            target.latitude,
+            target.longitude,
+            target.current_status,
+            target.captured_at,
+            target.speed,
+        ),
+    )
+
+
+@event.listens_for(Technician, "after_insert")
+@event.listens_for(Technician, "after_update")
+@event.listens_for(Technician, "after_delete")
+def _technician_written(mapper, connection, target):
+    _queue(target, ("roster",))
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    changes = session.info.pop(_SESSION_INFO_KEY, None)
+    if changes:
+        _apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -10,6 +10,7 @@ Features:
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 from app.config import settings
+from app.utils.phone_normalization import phone_digits, to_e164
 import logging
 from typing import Optional, Dict, Any
 
@@ -29,6 +30,18 @@ class TwilioService:
         else:
             self.client = None
             logger.warning("Twilio credentials not configured")
+        # Non-blocking client for message sends, created on first use (needs a running loop)
+        self._async_client: Optional[Client] = None
+
+    @property
+    def async_client(self) -> Client:
+        """Twilio client over a pooled aiohttp session, for *_async calls."""
+        if self._async_client is None:
+            # aiohttp comes with it: imported on first use, not at startup
+            from twilio.http.async_http_client import AsyncTwilioHttpClient
+
+            self._async_client = Client(self.account_sid, self.auth_token, http_client=AsyncTwilioHttpClient())
+        return self._async_client
 
     @property
     def is_configured(self) -> bool:
@@ -105,9 +118,9 @@ class TwilioService:
 
         Returns dict: {from_number, market, reason} so the caller can log/show what was picked.
         """
-        to_formatted = self._format_phone(to_number)
+        to_formatted = to_e164(to_number)
         # E.164 looks like +1NPANXXXXXX — area code is digits 2..5
-        digits = "".join(c for c in to_formatted if c.isdigit())
+        digits = phone_digits(to_formatted)
         area_code = digits[1:4] if len(digits) >= 11 and digits.startswith("1") else digits[:3]
 
         override = (market_override or "").strip().upper() or None
@@ -193,7 +206,7 @@ class TwilioService:
             return {"error": "Twilio not configured", "configured": False}
 
         try:
-            to_formatted = self._format_phone(to_number)
+            to_formatted = to_e164(to_number)
             picker_reason = "explicit-from-number"
             picked_market = None
             if from_number:
@@ -308,27 +321,14 @@ class TwilioService:
             logger.error(f"Failed to get Twilio recordings: {e.msg}")
             return {"error": e.msg, "items": []}
 
-    def _format_phone(self, phone: str) -> str:
-        """Format phone number to E.164 format."""
-        digits = "".join(c for c in phone if c.isdigit())
-
-        if len(digits) == 10:
-            return f"+1{digits}"
-        elif len(digits) == 11 and digits.startswith("1"):
-            return f"+{digits}"
-        elif phone.startswith("+"):
-            return phone
-        else:
-            return f"+{digits}"
-
     async def send_sms(self, to: str, body: str) -> dict:
         """Send an SMS message via Twilio."""
         if not self.client:
             raise Exception("Twilio client not configured")
 
         try:
-            to_formatted = self._format_phone(to)
-            message = self.client.messages.create(
+            to_formatted = to_e164(to)
+            message = await self.async_client.messages.create_async(
                 to=to_formatted,
                 from_=self.phone_number,
                 body=body,
@@ -345,7 +345,7 @@ class TwilioService:
             raise Exception("Twilio client not configured")
 
         try:
-            message = self.client.messages(message_sid).fetch()
+            message = await self.async_client.messages(message_sid).fetch_async()
             return {
                 "sid": message.sid,
                 "status": message.status,
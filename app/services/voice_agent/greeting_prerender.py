@@ -7,9 +7,8 @@ AMD has confirmed the answerer is human.
 """
 import logging
 
-import httpx
-
 from app.config import settings
+from app.services.http_clients import get_http_client
 
 
 logger = logging.getLogger(__name__)
@@ -42,25 +41,25 @@ async def prerender_greeting(call_sid: str, prospect: dict, quote: dict) -> None
 
     text = render_text(prospect, quote)
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(
-                "https://api.cartesia.ai/tts/bytes",
-                headers={
-                    "X-API-Key": settings.CARTESIA_API_KEY,
-                    "Cartesia-Version": "2024-11-13",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model_id": "sonic-3",
-                    "transcript": text,
-                    "voice": {"mode": "id", "id": settings.CARTESIA_VOICE_ID},
-                    "output_format": {
-                        "container": "raw",
-                        "encoding": "pcm_mulaw",
-                        "sample_rate": 8000,
-                    },
+        client = get_http_client("cartesia")
+        resp = await client.post(
+            "https://api.cartesia.ai/tts/bytes",
+            headers={
+                "X-API-Key": settings.CARTESIA_API_KEY,
+                "Cartesia-Version": "2024-11-13",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model_id": "sonic-3",
+                "transcript": text,
+                "voice": {"mode": "id", "id": settings.CARTESIA_VOICE_ID},
+                "output_format": {
+                    "container": "raw",
+                    "encoding": "pcm_mulaw",
+                    "sample_rate": 8000,
                 },
-            )
+            },
+        )
         if resp.status_code != 200:
             logger.error(
                 f"[Prerender:{call_sid[:8]}] Cartesia returned "
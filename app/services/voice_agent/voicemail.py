@@ -5,9 +5,8 @@ to Twilio and hangs up. No LLM in the loop — voicemail content is fixed.
 """
 import logging
 
-import httpx
-
 from app.config import settings
+from app.services.http_clients import get_http_client
 
 
 logger = logging.getLogger(__name__)
@@ -35,25 +34,25 @@ async def synthesize_voicemail_audio(prospect: dict, quote: dict) -> bytes | Non
         return None
     text = render_text(prospect, quote)
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(
-                "https://api.cartesia.ai/tts/bytes",
-                headers={
-                    "X-API-Key": settings.CARTESIA_API_KEY,
-                    "Cartesia-Version": "2024-11-13",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model_id": "sonic-3",
-                    "transcript": text,
-                    "voice": {"mode": "id", "id": settings.CARTESIA_VOICE_ID},
-                    "output_format": {
-                        "container": "raw",
-                        "encoding": "pcm_mulaw",
-                        "sample_rate": 8000,
-                    },
+        client = get_http_client("cartesia")
+        resp = await client.post(
+            "https://api.cartesia.ai/tts/bytes",
+            headers={
+                "X-API-Key": settings.CARTESIA_API_KEY,
+                "Cartesia-Version": "2024-11-13",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model_id": "sonic-3",
+                "transcript": text,
+                "voice": {"mode": "id", "id": settings.CARTESIA_VOICE_ID},
+                "output_format": {
+                    "container": "raw",
+                    "encoding": "pcm_mulaw",
+                    "sample_rate": 8000,
                 },
-            )
+            },
+        )
     except Exception as exc:
         logger.exception(f"[Voicemail] Cartesia request failed: {exc}")
         return None
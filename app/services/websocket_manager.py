@@ -7,6 +7,10 @@ Supports:
 - Sending to specific users
 - Sending to users by role
 - Connection heartbeat tracking
+
+Messages go through the pub/sub hub (app.services.pubsub), so an event
+raised on any worker reaches clients connected to every worker. Each
+connection has a bounded send queue; slow clients are evicted.
 """
 
 from fastapi import WebSocket
@@ -16,8 +20,13 @@ import logging
 import asyncio
 import json
 
+from app.services.pubsub import BufferedSocket, PubSub, get_pubsub
+
 logger = logging.getLogger(__name__)
 
+# Pub/sub topic for CRM events
+TOPIC = "ws"
+
 
 class ConnectionManager:
     """
@@ -27,7 +36,7 @@ class ConnectionManager:
     and maintains heartbeat timestamps for connection health monitoring.
     """
 
-    def __init__(self):
+    def __init__(self, pubsub: Optional[PubSub] = None):
         # Maps user_id to set of WebSocket connections (supports multiple tabs/devices)
         self._connections: Dict[int, Set[WebSocket]] = {}
         # Maps WebSocket to user_id for reverse lookup
@@ -36,8 +45,12 @@ class ConnectionManager:
         self._user_roles: Dict[int, str] = {}
         # Heartbeat tracking: WebSocket -> last ping timestamp
         self._heartbeats: Dict[WebSocket, datetime] = {}
+        # Per-connection send queues
+        self._senders: Dict[WebSocket, BufferedSocket] = {}
         # Lock for thread-safe operations
         self._lock = asyncio.Lock()
+        self._pubsub = pubsub or get_pubsub()
+        self._pubsub.subscribe(TOPIC, self.deliver)
 
     async def connect(self, websocket: WebSocket, user_id: int, user_role: Optional[str] = None) -> None:
         """
@@ -58,6 +71,9 @@ class ConnectionManager:
             self._connections[user_id].add(websocket)
             self._websocket_to_user[websocket] = user_id
             self._heartbeats[websocket] = datetime.utcnow()
+            self._senders[websocket] = BufferedSocket(
+                websocket, on_close=lambda sender: self.disconnect(sender.websocket, user_id)
+            )
 
             if user_role:
                 self._user_roles[user_id] = user_role
@@ -83,6 +99,9 @@ class ConnectionManager:
 
         self._websocket_to_user.pop(websocket, None)
         self._heartbeats.pop(websocket, None)
+        sender = self._senders.pop(websocket, None)
+        if sender is not None:
+            sender.close()
 
         logger.info(f"WebSocket disconnected: user_id={user_id}, total_connections={self.total_connections}")
 
@@ -102,78 +121,42 @@ class ConnectionManager:
 
     async def send_to_user(self, user_id: int, message: dict) -> int:
         """
-        Send a message to all connections for a specific user.
+        Send a message to all connections for a specific user, on every worker.
 
         Args:
             user_id: The target user's ID
             message: The message dict to send
 
         Returns:
-            Number of connections the message was sent to
+            Number of connections on this worker the message was queued for
         """
-        if user_id not in self._connections:
-            return 0
-
-        sent_count = 0
-        dead_connections = []
-
-        for websocket in self._connections[user_id]:
-            try:
-                await websocket.send_json(message)
-                sent_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to send to user {user_id}: {e}")
-                dead_connections.append(websocket)
-
-        # Clean up dead connections
-        for ws in dead_connections:
-            self.disconnect(ws, user_id)
-
-        return sent_count
+        return await self._publish(message, {"users": [user_id]})
 
     async def send_to_role(self, role: str, message: dict) -> int:
         """
-        Send a message to all users with a specific role.
+        Send a message to all users with a specific role, on every worker.
 
         Args:
             role: The target role (e.g., 'admin', 'technician', 'manager')
             message: The message dict to send
 
         Returns:
-            Number of users the message was sent to
+            Number of connections on this worker the message was queued for
         """
-        target_users = [user_id for user_id, user_role in self._user_roles.items() if user_role == role]
-
-        sent_count = 0
-        for user_id in target_users:
-            count = await self.send_to_user(user_id, message)
-            if count > 0:
-                sent_count += 1
-
-        return sent_count
+        return await self._publish(message, {"role": role})
 
     async def broadcast(self, message: dict, exclude_user: Optional[int] = None) -> int:
         """
-        Broadcast a message to all connected clients.
+        Broadcast a message to all connected clients, on every worker.
 
         Args:
             message: The message dict to send
             exclude_user: Optional user_id to exclude from broadcast
 
         Returns:
-            Number of connections the message was sent to
+            Number of connections on this worker the message was queued for
         """
-        sent_count = 0
-
-        for user_id in list(self._connections.keys()):
-            if exclude_user and user_id == exclude_user:
-                continue
-
-            count = await self.send_to_user(user_id, message)
-            sent_count += count
-
-        logger.debug(f"Broadcast sent to {sent_count} connections")
-        return sent_count
+        return await self._publish(message, {"exclude": exclude_user})
 
     async def broadcast_event(
         self,
@@ -194,7 +177,7 @@ class ConnectionManager:
             exclude_user: Optional user to exclude
 
         Returns:
-            Number of connections the message was sent to
+            Number of connections on this worker the message was queued for
         """
         message = {
             "type": event_type,
@@ -203,19 +186,40 @@ class ConnectionManager:
         }
 
         if target_users:
-            sent_count = 0
-            for user_id in target_users:
-                if exclude_user and user_id == exclude_user:
-                    continue
-                count = await self.send_to_user(user_id, message)
-                sent_count += count
-            return sent_count
+            return await self._publish(message, {"users": sorted(target_users), "exclude": exclude_user})
 
         if target_role:
             return await self.send_to_role(target_role, message)
 
         return await self.broadcast(message, exclude_user=exclude_user)
 
+    async def _publish(self, message: dict, targets: dict) -> int:
+        # Serialized once here; every worker hands the same text to its sockets
+        text = json.dumps(message, default=str)
+        return await self._pubsub.publish(TOPIC, text, targets)
+
+    def deliver(self, text: str, targets: dict) -> int:
+        """Queue a serialized message for this worker's matching connections (pub/sub handler)."""
+        if targets.get("users") is not None:
+            user_ids = targets["users"]
+        elif targets.get("role"):
+            user_ids = [user_id for user_id, role in self._user_roles.items() if role == targets["role"]]
+        else:
+            user_ids = list(self._connections)
+
+        exclude = targets.get("exclude")
+        sent_count = 0
+        for user_id in user_ids:
+            if exclude and user_id == exclude:
+                continue
+            for websocket in list(self._connections.get(user_id, ())):
+                sender = self._senders.get(websocket)
+                if sender is not None and sender.offer(text):
+                    sent_count += 1
+
+        logger.debug(f"Message queued for {sent_count} connections")
+        return sent_count
+
     async def check_stale_connections(self, timeout_seconds: int = 120) -> int:
         """
         Check for and clean up stale connections.
@@ -6,17 +6,23 @@ executes actions, and logs execution steps.
 """
 import logging
 from datetime import datetime, timedelta
-from uuid import uuid4
+from uuid import UUID, uuid4
 from typing import Any
 
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.workflow_automation import WorkflowAutomation, WorkflowExecution
+from app.services.sms_dispatcher import enqueue_sms
+from app.services.sms_service import sms_service
 
 logger = logging.getLogger(__name__)
 
 
+# Context entry telling action handlers whether to act for real
+DRY_RUN_KEY = "_dry_run"
+
+
 # -- Template variable resolution --
 
 def resolve_template(template: str, context: dict[str, Any]) -> str:
@@ -99,7 +105,15 @@ CONDITION_EVALUATORS = {
 
 async def _send_sms(config: dict, context: dict) -> dict:
     message = resolve_template(config.get("message", ""), context)
-    return {"action": "send_sms", "to": context.get("customer_phone", "N/A"), "message": message, "simulated": True}
+    to = context.get("customer_phone")
+    if context.get(DRY_RUN_KEY, True) or not to or not sms_service.is_configured:
+        return {"action": "send_sms", "to": to or "N/A", "message": message, "simulated": True}
+    try:
+        customer_id = UUID(str(context.get("customer_id")))
+    except ValueError:
+        customer_id = None
+    message_id = enqueue_sms(to, message, customer_id=customer_id)
+    return {"action": "send_sms", "to": to, "message": message, "queued": True, "message_id": str(message_id)}
 
 
 async def _send_email(config: dict, context: dict) -> dict:
@@ -179,7 +193,7 @@ async def execute_workflow(
 
     adj = _build_adjacency(nodes, edges)
     node_map = _nodes_by_id(nodes)
-    context = {**trigger_data}
+    context = {**trigger_data, DRY_RUN_KEY: dry_run}
     steps = []
     current_ids = [nodes[0]["id"]]  # Start with first node (trigger)
 
@@ -10,9 +10,7 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import func, select
 
@@ -20,22 +18,15 @@ from app.config import settings
 from app.database import async_session_maker
 from app.models.customer_interaction import InteractionAnalysisRun
 from app.services.email_service import EmailService
+from app.services.job_scheduler import scheduled_job
 
 logger = logging.getLogger(__name__)
 
 
-scheduler: Optional[AsyncIOScheduler] = None
 ALERT_THRESHOLD_USD_DEFAULT = Decimal("5.00")
 _last_alert_date: dict[str, str | None] = {"date": None}
 
 
-def get_scheduler() -> AsyncIOScheduler:
-    global scheduler
-    if scheduler is None:
-        scheduler = AsyncIOScheduler()
-    return scheduler
-
-
 def _alert_threshold_usd() -> Decimal:
     raw = getattr(settings, "AI_DAILY_ALERT_USD", None)
     if raw is None:
@@ -46,6 +37,12 @@ def _alert_threshold_usd() -> Decimal:
         return ALERT_THRESHOLD_USD_DEFAULT
 
 
+@scheduled_job(
+    "ai_budget_daily",
+    CronTrigger(hour=0, minute=5, timezone="UTC"),
+    description="AI daily spend report",
+    misfire="run_once",
+)
 async def report_yesterday_spend() -> None:
     """Job target: report yesterday's AI spend to Will if over threshold."""
     today_utc = datetime.now(timezone.utc).replace(
@@ -111,38 +108,11 @@ async def report_yesterday_spend() -> None:
         logger.exception("ai_budget: email send failed")
 
 
-def start_ai_budget_scheduler() -> None:
-    sched = get_scheduler()
-    sched.add_job(
-        report_yesterday_spend,
-        CronTrigger(
-            hour=0,
-            minute=5,
-            timezone="UTC",
-        ),
-        id="ai_budget_daily",
-        name="AI daily spend report",
-        replace_existing=True,
-    )
-    if not sched.running:
-        sched.start()
-        logger.info("ai_budget_scheduler started — daily 00:05 UTC")
-
-
-def stop_ai_budget_scheduler() -> None:
-    global scheduler
-    if scheduler and scheduler.running:
-        scheduler.shutdown(wait=False)
-        logger.info("ai_budget_scheduler stopped")
-
-
 def reset_alert_state_for_tests() -> None:
     _last_alert_date["date"] = None
 
 
 __all__ = [
-    "start_ai_budget_scheduler",
-    "stop_ai_budget_scheduler",
     "report_yesterday_spend",
     "reset_alert_state_for_tests",
 ]
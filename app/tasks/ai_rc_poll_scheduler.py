@@ -12,10 +12,8 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy import select
 
 from app.database import async_session_maker
@@ -23,21 +21,15 @@ from app.models.call_log import CallLog
 from app.models.customer_interaction import CustomerInteraction
 from app.services.ai.queue import enqueue_interaction_analysis
 from app.services.ringcentral_service import RingCentralService
+from app.services.job_scheduler import every, scheduled_job
 
 logger = logging.getLogger(__name__)
 
 
-scheduler: Optional[AsyncIOScheduler] = None
 POLL_LOOKBACK_MINUTES = 90
 
 
-def get_scheduler() -> AsyncIOScheduler:
-    global scheduler
-    if scheduler is None:
-        scheduler = AsyncIOScheduler()
-    return scheduler
-
-
+@scheduled_job("ai_rc_poll_hourly", every(hours=1), description="AI RC missed-recording poll")
 async def poll_missed_recordings() -> None:
     """Job target: backstop dropped RC recording webhooks."""
     rc = RingCentralService()
@@ -121,29 +113,6 @@ async def poll_missed_recordings() -> None:
     )
 
 
-def start_ai_rc_poll_scheduler() -> None:
-    sched = get_scheduler()
-    sched.add_job(
-        poll_missed_recordings,
-        IntervalTrigger(hours=1),
-        id="ai_rc_poll_hourly",
-        name="AI RC missed-recording poll",
-        replace_existing=True,
-    )
-    if not sched.running:
-        sched.start()
-        logger.info("ai_rc_poll_scheduler started — every 1h")
-
-
-def stop_ai_rc_poll_scheduler() -> None:
-    global scheduler
-    if scheduler and scheduler.running:
-        scheduler.shutdown(wait=False)
-        logger.info("ai_rc_poll_scheduler stopped")
-
-
 __all__ = [
-    "start_ai_rc_poll_scheduler",
-    "stop_ai_rc_poll_scheduler",
     "poll_missed_recordings",
 ]
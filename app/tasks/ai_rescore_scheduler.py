@@ -14,30 +14,27 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import select
 
 from app.database import async_session_maker
 from app.models.customer_interaction import CustomerInteraction
+from app.services.job_scheduler import scheduled_job
 
 logger = logging.getLogger(__name__)
 
 
-scheduler: Optional[AsyncIOScheduler] = None
 HOT_THRESHOLD = 70
 STALE_HOURS = 24
 
 
-def get_scheduler() -> AsyncIOScheduler:
-    global scheduler
-    if scheduler is None:
-        scheduler = AsyncIOScheduler()
-    return scheduler
-
-
+@scheduled_job(
+    "ai_rescore_daily",
+    CronTrigger(hour=8, minute=0, timezone="America/Chicago"),
+    description="AI daily hot-lead re-score",
+    misfire="run_once",
+)
 async def rescore_stale_hot_leads() -> None:
     """Job target: bump priority on stale (>24h, no follow-up) hot leads."""
     cutoff = datetime.now(timezone.utc) - timedelta(hours=STALE_HOURS)
@@ -92,33 +89,6 @@ async def rescore_stale_hot_leads() -> None:
     logger.info("ai_rescore: completed — %d hot leads bumped", bumped)
 
 
-def start_ai_rescore_scheduler() -> None:
-    sched = get_scheduler()
-    sched.add_job(
-        rescore_stale_hot_leads,
-        CronTrigger(
-            hour=8,
-            minute=0,
-            timezone="America/Chicago",
-        ),
-        id="ai_rescore_daily",
-        name="AI daily hot-lead re-score",
-        replace_existing=True,
-    )
-    if not sched.running:
-        sched.start()
-        logger.info("ai_rescore_scheduler started — daily 08:00 America/Chicago")
-
-
-def stop_ai_rescore_scheduler() -> None:
-    global scheduler
-    if scheduler and scheduler.running:
-        scheduler.shutdown(wait=False)
-        logger.info("ai_rescore_scheduler stopped")
-
-
 __all__ = [
-    "start_ai_rescore_scheduler",
-    "stop_ai_rescore_scheduler",
     "rescore_stale_hot_leads",
 ]
@@ -1,35 +1,30 @@
 """Weekly AI Strategist scheduler — Sunday 06:00 America/Chicago.
 
 Runs `app.services.ai.strategy.run_weekly_strategy()` for the previous
-calendar week and emails Will a summary on success. Runs in the same
-APScheduler instance pattern as `app.tasks.reminder_scheduler`.
+calendar week and emails Will a summary on success. Registered with
+`app.services.job_scheduler`, so one replica runs it each week.
 """
 from __future__ import annotations
 
 import logging
-from typing import Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.config import settings
 from app.database import async_session_maker
 from app.services.ai.strategy import previous_iso_week, run_weekly_strategy
 from app.services.email_service import EmailService
+from app.services.job_scheduler import scheduled_job
 
 logger = logging.getLogger(__name__)
 
 
-scheduler: Optional[AsyncIOScheduler] = None
-
-
-def get_scheduler() -> AsyncIOScheduler:
-    global scheduler
-    if scheduler is None:
-        scheduler = AsyncIOScheduler()
-    return scheduler
-
-
+@scheduled_job(
+    "ai_strategy_weekly",
+    CronTrigger(day_of_week="sun", hour=6, minute=0, timezone="America/Chicago"),
+    description="AI weekly strategist (Opus 4.7)",
+    misfire="run_once",
+)
 async def run_strategy_and_email() -> None:
     """Job target: regenerate previous week's insight, then email Will."""
     iso_week = previous_iso_week()
@@ -78,39 +73,6 @@ async def run_strategy_and_email() -> None:
         logger.exception("ai_strategy_scheduler: email send failed")
 
 
-def start_ai_strategy_scheduler() -> None:
-    """Register the Sunday 06:00 America/Chicago job."""
-    sched = get_scheduler()
-
-    sched.add_job(
-        run_strategy_and_email,
-        CronTrigger(
-            day_of_week="sun",
-            hour=6,
-            minute=0,
-            timezone="America/Chicago",
-        ),
-        id="ai_strategy_weekly",
-        name="AI weekly strategist (Opus 4.7)",
-        replace_existing=True,
-    )
-
-    if not sched.running:
-        sched.start()
-        logger.info(
-            "ai_strategy_scheduler started — Sundays 06:00 America/Chicago"
-        )
-
-
-def stop_ai_strategy_scheduler() -> None:
-    global scheduler
-    if scheduler and scheduler.running:
-        scheduler.shutdown(wait=False)
-        logger.info("ai_strategy_scheduler stopped")
-
-
 __all__ = [
-    "start_ai_strategy_scheduler",
-    "stop_ai_strategy_scheduler",
     "run_strategy_and_email",
 ]
@@ -1,18 +1,34 @@
-"""Overnight auto-dispatch and unassigned job alerts."""
+"""Overnight auto-dispatch and unassigned job alerts.
 
-from datetime import datetime, date, timedelta
+Every evening at 18:00 America/Chicago the day planner proposes an
+assignment of tomorrow's unassigned jobs (app.services.day_planner);
+dispatchers review and accept it under /dispatch/day-plans.
+"""
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
 import logging
 
+from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.database import async_session_maker
 from app.models.work_order import WorkOrder
 from app.models.technician import Technician
+from app.services.day_planner import create_day_plan, run_day_plan
+from app.services.job_scheduler import scheduled_job
 
 logger = logging.getLogger(__name__)
 
+# Dates here are business days. The host clock runs in UTC, where it is
+# already the next day when the 18:00 Chicago job fires.
+CHICAGO_TZ = ZoneInfo("America/Chicago")
+
+
+def _business_today() -> date:
+    return datetime.now(CHICAGO_TZ).date()
+
 
 async def get_available_technicians(db: AsyncSession, target_date: date) -> list:
     """Get technicians sorted by fewest assignments on target_date."""
@@ -24,7 +40,7 @@ async def get_available_technicians(db: AsyncSession, target_date: date) -> list
         .outerjoin(
             WorkOrder,
             and_(
-                WorkOrder.assigned_technician_id == Technician.id,
+                WorkOrder.technician_id == Technician.id,
                 func.date(WorkOrder.scheduled_date) == target_date,
             ),
         )
@@ -35,52 +51,40 @@ async def get_available_technicians(db: AsyncSession, target_date: date) -> list
     return result.all()
 
 
+# A plan proposed well after 18:00 would still target "tomorrow"; late fires are skipped
+@scheduled_job(
+    "auto_dispatch_day_plan",
+    CronTrigger(hour=18, minute=0, timezone=CHICAGO_TZ),
+    description="Auto-dispatch day plan for tomorrow",
+    misfire_grace=3600,
+)
 async def auto_dispatch_unassigned():
-    """Assign unassigned jobs for tomorrow using round-robin by workload."""
+    """Propose a day plan for tomorrow's unassigned jobs and alert about any it could not place."""
+    tomorrow = _business_today() + timedelta(days=1)
     async with async_session_maker() as db:
-        tomorrow = date.today() + timedelta(days=1)
-
-        # Find unassigned WOs scheduled for tomorrow
-        unassigned = await db.execute(
-            select(WorkOrder).where(
-                and_(
-                    WorkOrder.assigned_technician_id.is_(None),
-                    func.date(WorkOrder.scheduled_date) == tomorrow,
-                    WorkOrder.status.in_(["pending", "scheduled"]),
-                )
-            )
-        )
-        jobs = unassigned.scalars().all()
-
-        if not jobs:
-            logger.info("No unassigned jobs for tomorrow")
-            return {"assigned": 0, "unassigned": 0}
-
-        techs = await get_available_technicians(db, tomorrow)
-        if not techs:
-            logger.warning(f"{len(jobs)} unassigned jobs but no available technicians")
-            await _send_unassigned_alert(len(jobs), tomorrow)
-            return {"assigned": 0, "unassigned": len(jobs)}
-
-        assigned_count = 0
-        for i, job in enumerate(jobs):
-            tech, _ = techs[i % len(techs)]
-            job.assigned_technician_id = tech.id
-            job.assigned_technician = f"{tech.first_name} {tech.last_name}"
-            job.status = "scheduled"
-            assigned_count += 1
-            logger.info(f"Auto-dispatched WO {job.id} to {tech.first_name} {tech.last_name}")
-
-        await db.commit()
-        logger.info(f"Auto-dispatch complete: {assigned_count} assigned for {tomorrow}")
-        return {"assigned": assigned_count, "unassigned": 0}
+        plan = await create_day_plan(db, tomorrow, created_by="auto_dispatch")
+
+    plan = await run_day_plan(plan.id)
+    if plan is None or plan.status != "proposed":
+        logger.error(f"Auto-dispatch planning failed for {tomorrow}: {plan.error if plan else 'plan missing'}")
+        return {"plan_id": str(plan.id) if plan else None, "proposed": 0, "unassigned": 0}
+
+    summary = plan.summary or {}
+    unassigned = summary.get("unassigned_count", 0)
+    if unassigned:
+        await _send_unassigned_alert(unassigned, tomorrow)
+    logger.info(
+        f"Auto-dispatch proposed plan {plan.id} for {tomorrow}: "
+        f"{summary.get('assigned_count', 0)} jobs, {unassigned} unassigned"
+    )
+    return {"plan_id": str(plan.id), "proposed": summary.get("assigned_count", 0), "unassigned": unassigned}
 
 
 async def _send_unassigned_alert(count: int, target_date: date):
     """Send SMS alert about unassigned jobs."""
     try:
         from app.services.sms_service import send_sms
-        from app.core.config import settings
+        from app.config import settings
         admin_phone = getattr(settings, "ADMIN_PHONE", None)
         if admin_phone:
             await send_sms(
@@ -94,20 +98,21 @@ async def _send_unassigned_alert(count: int, target_date: date):
 
 async def check_unassigned_alerts():
     """Check for unassigned jobs in the next 48 hours and alert."""
+    today = _business_today()
     async with async_session_maker() as db:
-        cutoff = date.today() + timedelta(days=2)
+        cutoff = today + timedelta(days=2)
         result = await db.execute(
             select(func.count()).select_from(WorkOrder).where(
                 and_(
-                    WorkOrder.assigned_technician_id.is_(None),
+                    WorkOrder.technician_id.is_(None),
                     func.date(WorkOrder.scheduled_date) <= cutoff,
-                    func.date(WorkOrder.scheduled_date) >= date.today(),
+                    func.date(WorkOrder.scheduled_date) >= today,
                     WorkOrder.status.in_(["pending", "scheduled"]),
                 )
             )
         )
         count = result.scalar() or 0
         if count > 0:
-            await _send_unassigned_alert(count, date.today())
+            await _send_unassigned_alert(count, today)
             logger.warning(f"{count} unassigned jobs in next 48 hours")
         return {"unassigned_count": count}
@@ -8,12 +8,12 @@ and sync them to CRM work orders.
 import logging
 import uuid
 from datetime import date, timedelta, time as dt_time
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import select
 
 from app.services.ms365_bookings_service import MS365BookingsService
 from app.database import async_session_maker
 from app.models.technician import Technician
+from app.services.job_scheduler import every, scheduled_job
 
 logger = logging.getLogger(__name__)
 
@@ -69,9 +69,8 @@ async def assign_technician_by_region(db, service_address: str) -> uuid.UUID | N
     tech = result.scalar_one_or_none()
     return tech.id if tech else None
 
-_scheduler: AsyncIOScheduler | None = None
-
 
+@scheduled_job("bookings_sync", every(minutes=10), enabled=MS365BookingsService.is_configured)
 async def sync_bookings():
     """Poll Microsoft Bookings and sync appointments to work orders."""
     if not MS365BookingsService.is_configured():
@@ -233,25 +232,3 @@ async def sync_bookings():
 
     except Exception as e:
         logger.error("Bookings sync error: %s", e)
-
-
-def start_bookings_sync():
-    """Start the bookings sync scheduler."""
-    global _scheduler
-    if not MS365BookingsService.is_configured():
-        logger.info("Bookings sync disabled: MS365 Bookings not configured")
-        return
-
-    _scheduler = AsyncIOScheduler()
-    _scheduler.add_job(sync_bookings, "interval", minutes=10, id="bookings_sync")
-    _scheduler.start()
-    logger.info("Bookings sync scheduler started (every 10 min)")
-
-
-def stop_bookings_sync():
-    """Stop the bookings sync scheduler."""
-    global _scheduler
-    if _scheduler:
-        _scheduler.shutdown(wait=False)
-        _scheduler = None
-        logger.info("Bookings sync scheduler stopped")
@@ -3,26 +3,24 @@
 Checks for campaigns with status='draft' and scheduled_at <= now(),
 then triggers sending via the same flow as manual sends.
 
-Runs every 5 minutes via APScheduler.
+Runs every 5 minutes via the job scheduler (app.services.job_scheduler).
 """
 
 import logging
 from datetime import datetime
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-
 from app.database import async_session_maker
 from app.models.marketing import MarketingCampaign, EmailTemplate
 from app.models.customer import Customer
 from app.services.email_service import EmailService
 from app.services.sendgrid_service import sendgrid_service
+from app.services.job_scheduler import every, scheduled_job
 from sqlalchemy import select, and_
 
 logger = logging.getLogger(__name__)
 
-_scheduler: AsyncIOScheduler | None = None
-
 
+@scheduled_job("campaign_scheduler", every(minutes=5), description="Send scheduled email campaigns")
 async def process_scheduled_campaigns():
     """Find and send campaigns that are due."""
     async with async_session_maker() as db:
@@ -158,25 +156,3 @@ async def process_scheduled_campaigns():
                 logger.error("Error processing campaign %s: %s", campaign.id, e, exc_info=True)
                 campaign.status = "failed"
                 await db.commit()
-
-
-def start_campaign_scheduler():
-    """Start the campaign scheduler."""
-    global _scheduler
-    _scheduler = AsyncIOScheduler()
-    _scheduler.add_job(
-        process_scheduled_campaigns,
-        "interval",
-        minutes=5,
-        id="campaign_scheduler",
-    )
-    _scheduler.start()
-    logger.info("Campaign scheduler started (every 5 minutes)")
-
-
-def stop_campaign_scheduler():
-    """Stop the campaign scheduler."""
-    global _scheduler
-    if _scheduler and _scheduler.running:
-        _scheduler.shutdown(wait=False)
-        logger.info("Campaign scheduler stopped")
@@ -5,20 +5,18 @@ Runs every 5 minutes to fetch unread emails from monitored mailbox,
 match to customers, and create leads/service requests.
 """
 
-import asyncio
 import logging
 from datetime import datetime
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import select
 
 from app.services.ms365_email_service import MS365EmailService
 from app.database import async_session_maker
+from app.services.job_scheduler import every, scheduled_job
 
 logger = logging.getLogger(__name__)
 
-_scheduler: AsyncIOScheduler | None = None
-
 
+@scheduled_job("email_poller", every(minutes=5), enabled=MS365EmailService.is_configured)
 async def poll_inbound_emails():
     """Fetch unread emails, match customers, log to inbound_emails table."""
     if not MS365EmailService.is_configured():
@@ -82,14 +80,12 @@ async def poll_inbound_emails():
             await db.commit()
 
         # Enqueue analysis AFTER commit so the row is durable when the worker
-        # tries to fetch it. Fire-and-forget via asyncio.create_task because
-        # the poller runs from APScheduler outside a FastAPI request, so
-        # request-scoped BackgroundTasks isn't available here.
+        # tries to fetch it. Enqueueing only inserts the job row (the analysis
+        # runs on the AI queue's worker), so it is awaited here and a failure
+        # is logged per email instead of being lost in an unawaited task.
         for inbound_id in new_inbound_ids:
             try:
-                asyncio.create_task(
-                    enqueue_interaction_analysis(inbound_id, "email")
-                )
+                await enqueue_interaction_analysis(inbound_id, "email")
             except Exception as enqueue_err:
                 logger.error(
                     "Email poller: failed to enqueue analysis for %s: %s",
@@ -99,25 +95,3 @@ async def poll_inbound_emails():
 
     except Exception as e:
         logger.error("Email poller error: %s", e)
-
-
-def start_email_poller():
-    """Start the email poller scheduler."""
-    global _scheduler
-    if not MS365EmailService.is_configured():
-        logger.info("Email poller disabled: MS365 mailbox not configured")
-        return
-
-    _scheduler = AsyncIOScheduler()
-    _scheduler.add_job(poll_inbound_emails, "interval", minutes=5, id="email_poller")
-    _scheduler.start()
-    logger.info("Email poller started (every 5 min)")
-
-
-def stop_email_poller():
-    """Stop the email poller scheduler."""
-    global _scheduler
-    if _scheduler:
-        _scheduler.shutdown(wait=False)
-        _scheduler = None
-        logger.info("Email poller stopped")
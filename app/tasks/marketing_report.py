@@ -1,7 +1,7 @@
 """
 Daily Marketing Report Generator
 
-Runs at 7 AM daily via APScheduler.
+Runs at 7 AM daily via the job scheduler (app.services.job_scheduler).
 Pulls Google Ads + GA4 data, computes deltas, flags anomalies.
 Saves to marketing_daily_reports table.
 """
@@ -10,22 +10,20 @@ import asyncio
 import logging
 from datetime import datetime, date, timedelta
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-
 from app.database import async_session_maker
 from app.models.marketing import MarketingDailyReport
 from app.services.google_ads_service import get_google_ads_service
 from app.services.ga4_service import get_ga4_service
+from app.services.job_scheduler import cron, scheduled_job
 
 logger = logging.getLogger(__name__)
 
-_scheduler: AsyncIOScheduler | None = None
-
 # Anomaly thresholds
 CPA_SPIKE_THRESHOLD = 0.50  # 50% increase
 SPEND_OVER_BUDGET_THRESHOLD = 0.20  # 20% over daily budget
 
 
+@scheduled_job("marketing_daily_report", cron(hour=7, minute=0), misfire="run_once")
 async def generate_daily_report():
     """Generate and save the daily marketing report."""
     logger.info("Starting daily marketing report generation...")
@@ -188,31 +186,3 @@ async def _send_alert_email(summary: str, alerts: list):
         )
     except Exception as e:
         logger.warning("SendGrid marketing email failed: %s", e)
-
-
-def start_marketing_report_scheduler():
-    """Start the daily marketing report scheduler (7 AM)."""
-    global _scheduler
-    if _scheduler is not None:
-        return
-
-    _scheduler = AsyncIOScheduler()
-    _scheduler.add_job(
-        generate_daily_report,
-        "cron",
-        hour=7,
-        minute=0,
-        id="marketing_daily_report",
-        replace_existing=True,
-    )
-    _scheduler.start()
-    logger.info("Marketing report scheduler started (daily at 7:00 AM)")
-
-
-def stop_marketing_report_scheduler():
-    """Stop the marketing report scheduler."""
-    global _scheduler
-    if _scheduler:
-        _scheduler.shutdown(wait=False)
-        _scheduler = None
-        logger.info("Marketing report scheduler stopped")
@@ -7,34 +7,24 @@ at configured intervals (e.g., 30, 14, 7 days before due date).
 
 import logging
 from datetime import datetime, date, timedelta
-from typing import Optional
 import uuid
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session_maker
 from app.models.service_interval import CustomerServiceSchedule, ServiceInterval, ServiceReminder
 from app.models.customer import Customer
+from app.services.sms_dispatcher import enqueue_sms
 from app.services.sms_service import sms_service as sms_svc
 from app.services.email_service import EmailService
+from app.services.job_scheduler import cron, scheduled_job
 
 logger = logging.getLogger(__name__)
 
-# Global scheduler instance
-scheduler: Optional[AsyncIOScheduler] = None
-
-
-def get_scheduler() -> AsyncIOScheduler:
-    """Get or create the scheduler instance."""
-    global scheduler
-    if scheduler is None:
-        scheduler = AsyncIOScheduler()
-    return scheduler
-
-
+@scheduled_job(
+    "service_reminders", cron(hour=8, minute=0), description="Send service reminders", misfire="run_once"
+)
 async def check_and_send_reminders():
     """
     Main job: Check all service schedules and send reminders for those due soon.
@@ -183,18 +173,19 @@ Best regards,
 MAC Septic Services Team
 """
 
-    # Send SMS if customer has phone
+    # Queue SMS if customer has phone (sent by the dispatcher once this run commits)
     sms_sent = False
     sms_message_id = None
     if customer.phone:
         try:
             if sms_svc.is_configured:
-                sms_response = await sms_svc.send_sms(to=customer.phone, body=message_body)
+                sms_message_id = enqueue_sms(
+                    customer.phone, message_body, db=db, customer_id=schedule.customer_id
+                )
                 sms_sent = True
-                sms_message_id = getattr(sms_response, "sid", None)
-                logger.info(f"SMS reminder sent to {customer.phone[-4:]} for schedule {schedule.id}")
+                logger.info(f"SMS reminder queued to {customer.phone[-4:]} for schedule {schedule.id}")
         except Exception as e:
-            logger.error(f"Failed to send SMS reminder: {e}")
+            logger.error(f"Failed to queue SMS reminder: {e}")
 
     # Send email if customer has email
     email_sent = False
@@ -225,6 +216,7 @@ MAC Septic Services Team
             days_before_due=days_until,
             status="sent",
             sent_at=now,
+            message_id=sms_message_id,
         )
         db.add(sms_reminder)
 
@@ -247,6 +239,13 @@ MAC Septic Services Team
         logger.info(f"Reminders sent for schedule {schedule.id}: SMS={sms_sent}, Email={email_sent}")
 
 
+# Daily at 6 AM, before reminders go out
+@scheduled_job(
+    "update_schedule_statuses",
+    cron(hour=6, minute=0),
+    description="Update schedule statuses",
+    misfire="run_once",
+)
 async def update_schedule_statuses():
     """
     Background job to update schedule statuses based on due dates.
@@ -290,48 +289,6 @@ async def update_schedule_statuses():
         logger.error(f"Error updating schedule statuses: {e}", exc_info=True)
 
 
-def start_reminder_scheduler():
-    """Start the reminder scheduler with all configured jobs."""
-    global scheduler
-
-    scheduler = get_scheduler()
-
-    # Add job to send reminders daily at 8 AM
-    scheduler.add_job(
-        check_and_send_reminders,
-        CronTrigger(hour=8, minute=0),
-        id="service_reminders",
-        name="Send service reminders",
-        replace_existing=True,
-    )
-
-    # Add job to update statuses daily at 6 AM (before reminders)
-    scheduler.add_job(
-        update_schedule_statuses,
-        CronTrigger(hour=6, minute=0),
-        id="update_schedule_statuses",
-        name="Update schedule statuses",
-        replace_existing=True,
-    )
-
-    # Start the scheduler
-    if not scheduler.running:
-        scheduler.start()
-        logger.info("Service reminder scheduler started")
-        logger.info("Jobs scheduled:")
-        for job in scheduler.get_jobs():
-            logger.info(f"  - {job.name}: {job.trigger}")
-
-
-def stop_reminder_scheduler():
-    """Stop the reminder scheduler."""
-    global scheduler
-
-    if scheduler and scheduler.running:
-        scheduler.shutdown(wait=False)
-        logger.info("Service reminder scheduler stopped")
-
-
 async def run_reminders_now():
     """Manually trigger reminder check (for testing/admin use)."""
     logger.info("Manual reminder check triggered")
@@ -0,0 +1,58 @@
+"""
+Phone number normalization utilities.
+
+Single source of truth for the US phone formats used across the CRM:
+
+- US 10-digit key: the identity key stored in customers.phone_last10 and used
+  to match callers, texters and permit owners to customers
+- E.164 (+1XXXXXXXXXX): what Twilio and RingCentral send and expect
+- display format ((XXX) XXX-XXXX): how phones are stored on customer records
+"""
+
+from typing import Optional
+
+
+def phone_digits(raw: Optional[str]) -> str:
+    """Strip everything except digits."""
+    return "".join(c for c in (raw or "") if c.isdigit())
+
+
+def phone_last10(raw: Optional[str]) -> str:
+    """
+    Identity key for a US phone number: its 10-digit national number.
+
+    Formatting and a leading "1" country code are dropped, so
+    "+1 (615) 555-0100", "16155550100" and "615.555.0100" all map to
+    "6155550100". Anything else (too few digits, an extension, a non-US
+    number) returns "" rather than a truncated key that could match an
+    unrelated customer.
+    """
+    digits = phone_digits(raw)
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else ""
+
+
+def to_e164(raw: Optional[str]) -> str:
+    """
+    Format a number as E.164 for Twilio/RingCentral: US numbers as
+    +1XXXXXXXXXX, numbers written with another "+<country code>" kept as
+    dialed. Returns "" if it is not a full number.
+    """
+    raw = (raw or "").strip()
+    digits = phone_digits(raw)
+    if len(digits) == 10 or (len(digits) == 11 and digits.startswith("1")):
+        return f"+1{digits[-10:]}"
+    if raw.startswith("+") and 8 <= len(digits) <= 15:
+        return f"+{digits}"
+    return ""
+
+
+def format_us_phone(raw: Optional[str]) -> str:
+    """Normalize to (XXX) XXX-XXXX for 10/11-digit US numbers, else return raw unchanged."""
+    digits = phone_digits(raw)
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    if len(digits) == 10:
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+    return raw or ""
@@ -8,7 +8,7 @@ Handles:
 """
 
 from fastapi import APIRouter, Request, Response
-from sqlalchemy import select, or_
+from sqlalchemy import select
 import logging
 import uuid
 from datetime import datetime, timezone
@@ -19,6 +19,7 @@ from app.models.customer import Customer
 from app.models.call_log import CallLog
 from app.config import settings
 from app.services.websocket_manager import manager
+from app.services.phone_identity import phone_identity
 from app.services.ai.queue import enqueue_interaction_analysis
 
 logger = logging.getLogger(__name__)
@@ -26,22 +27,6 @@ logger = logging.getLogger(__name__)
 ringcentral_webhook_router = APIRouter()
 
 
-def _last10(raw: str) -> str:
-    """Strip non-digits, return last 10 digits (for phone matching)."""
-    digits = "".join(c for c in (raw or "") if c.isdigit())
-    return digits[-10:] if len(digits) >= 10 else digits
-
-
-def _normalize_phone(raw: str) -> str:
-    """Normalize +1XXXXXXXXXX to (XXX) XXX-XXXX for DB lookup."""
-    digits = "".join(c for c in (raw or "") if c.isdigit())
-    if len(digits) == 11 and digits.startswith("1"):
-        digits = digits[1:]
-    if len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-    return raw or ""
-
-
 @ringcentral_webhook_router.post("/sms")
 async def handle_ringcentral_sms(request: Request):
     """Handle RingCentral webhook events for SMS.
@@ -127,17 +112,9 @@ async def handle_ringcentral_sms(request: Request):
         )
         return {"status": "ok", "routed_to_chat": True, **chat_result}
 
-    normalized = _normalize_phone(from_number)
-
     async with async_session_maker() as db:
         # Look up customer by phone number
-        customer = None
-        result = await db.execute(
-            select(Customer).where(
-                or_(Customer.phone == normalized, Customer.phone == from_number)
-            ).limit(1)
-        )
-        customer = result.scalar_one_or_none()
+        customer = await phone_identity.resolve_customer(db, from_number)
 
         # Create inbound message record
         incoming = Message(
@@ -308,17 +285,9 @@ async def handle_ringcentral_call_recording(request: Request):
 
     # Identify the phone number to match a customer with
     match_number = caller_number if direction == "inbound" else called_number
-    match_last10 = _last10(match_number)
 
     async with async_session_maker() as db:
-        customer_id = None
-        if match_last10:
-            # Find any customer whose phone (after last-10 normalization) matches
-            cust_result = await db.execute(select(Customer.id, Customer.phone))
-            for cid, cphone in cust_result.all():
-                if _last10(cphone or "") == match_last10:
-                    customer_id = cid
-                    break
+        customer_id = await phone_identity.resolve_customer_id(db, match_number)
 
         # Idempotent upsert keyed by ringcentral_call_id.
         existing_result = await db.execute(
@@ -8,7 +8,7 @@ SECURITY:
 """
 
 from fastapi import APIRouter, Request, HTTPException, Response, Depends, BackgroundTasks
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import httpx
@@ -25,6 +25,8 @@ from app.config import settings
 from app.security.twilio_validator import validate_twilio_signature
 from app.services.ai.queue import enqueue_interaction_analysis
 from app.services.websocket_manager import manager
+from app.services.phone_identity import phone_identity
+from app.utils.phone_normalization import format_us_phone
 
 logger = logging.getLogger(__name__)
 
@@ -72,8 +74,9 @@ async def handle_incoming_sms(
             logger.info("Processing React reply", extra={"customer_id": last_message.customer_id})
 
             # Create incoming message record
+            customer_id = last_message.customer_id or await phone_identity.resolve_customer_id(db, from_number)
             incoming = Message(
-                customer_id=last_message.customer_id,
+                customer_id=customer_id,
                 message_type=MessageType.sms,
                 direction="inbound",
                 status=MessageStatus.received,
@@ -199,16 +202,6 @@ async def handle_status_callback(
     return {"status": "ok"}
 
 
-def _normalize_phone(raw: str) -> str:
-    """Normalize +1XXXXXXXXXX to (XXX) XXX-XXXX for DB lookup."""
-    digits = "".join(c for c in (raw or "") if c.isdigit())
-    if len(digits) == 11 and digits.startswith("1"):
-        digits = digits[1:]
-    if len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-    return raw or ""
-
-
 @twilio_router.post("/voice")
 async def handle_incoming_voice(
     request: Request,
@@ -231,21 +224,13 @@ async def handle_incoming_voice(
 
     logger.info("Incoming voice call", extra={"call_sid": call_sid, "from_suffix": from_number[-4:] if from_number else None})
 
-    normalized = _normalize_phone(from_number)
-
     async with async_session_maker() as db:
         # Look up customer by phone
-        customer = None
         customer_data = None
         last_service_data = None
         open_wo_data = []
 
-        result = await db.execute(
-            select(Customer).where(
-                or_(Customer.phone == normalized, Customer.phone == from_number)
-            ).limit(1)
-        )
-        customer = result.scalar_one_or_none()
+        customer = await phone_identity.resolve_customer(db, from_number)
 
         if customer:
             customer_data = {
@@ -311,7 +296,7 @@ async def handle_incoming_voice(
     ws_payload = {
         "call_sid": call_sid,
         "caller_number": from_number,
-        "caller_display": normalized,
+        "caller_display": format_us_phone(from_number),
         "customer": customer_data,
         "last_service": last_service_data,
         "open_work_orders": open_wo_data,
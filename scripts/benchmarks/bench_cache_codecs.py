@@ -0,0 +1,168 @@
+"""Benchmark: CacheService payload codecs (json, orjson, msgpack, +/- zlib).
+
+Encodes and decodes representative cached payloads with every installed codec
+and reports encode/decode time and stored size:
+
+- workorders: a 200-row work-order list page (as cached by list_work_orders)
+- executive: an executive dashboard blob (KPIs, trends, leaderboard)
+- inspection_forms: the cached MS Forms upload (~3k rows x 40 columns)
+
+Stored size is the payload length; with --redis-url each payload is also
+written to Redis and MEMORY USAGE is reported for it.
+
+Usage:
+    python scripts/benchmarks/bench_cache_codecs.py [--repeat 20] [--redis-url redis://localhost:6379]
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import sys
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./benchmark.db")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from app.services.cache_codecs import available_codecs, decode, encode, get_codec  # noqa: E402
+
+COMPRESS_MIN_BYTES = 16384
+STATUSES = ["draft", "scheduled", "confirmed", "enroute", "in_progress", "completed", "canceled"]
+JOB_TYPES = ["pumping", "inspection", "repair", "installation", "maintenance", "grease_trap"]
+CITIES = ["Austin", "Round Rock", "Georgetown", "Cedar Park", "San Marcos", "Nashville", "Franklin"]
+
+
+def make_work_order_page(n: int, rng: random.Random) -> dict:
+    base = dt.datetime(2026, 3, 1, 8, 0)
+    items = []
+    for i in range(n):
+        start = base + dt.timedelta(hours=rng.randrange(2000))
+        items.append({
+            "id": str(uuid.uuid4()),
+            "work_order_number": f"WO-{100000 + i}",
+            "customer_id": str(uuid.uuid4()),
+            "customer_name": f"Customer {rng.randrange(10**5)}",
+            "status": rng.choice(STATUSES),
+            "job_type": rng.choice(JOB_TYPES),
+            "priority": rng.choice(["low", "normal", "high", "urgent"]),
+            "scheduled_date": start.date(),
+            "time_window_start": start.time(),
+            "time_window_end": (start + dt.timedelta(hours=2)).time(),
+            "assigned_technician": f"Tech {rng.randrange(40)}",
+            "technician_id": str(uuid.uuid4()),
+            "service_address_line1": f"{rng.randrange(1, 9999)} County Road {rng.randrange(1, 400)}",
+            "service_city": rng.choice(CITIES),
+            "service_state": "TX",
+            "service_latitude": 30 + rng.random(),
+            "service_longitude": -97 - rng.random(),
+            "estimated_duration_hours": rng.choice([1.0, 1.5, 2.0, 3.0]),
+            "total_amount": Decimal(f"{rng.randrange(150, 2500)}.{rng.randrange(100):02d}"),
+            "checklist": [{"item": f"Step {k}", "done": rng.random() < 0.5} for k in range(6)],
+            "notes": "Gate code 1234; dog in back yard." if rng.random() < 0.3 else None,
+            "created_at": start - dt.timedelta(days=3),
+            "updated_at": start - dt.timedelta(hours=5),
+        })
+    return {"items": items, "total": n * 25, "page": 1, "page_size": n}
+
+
+def make_executive_blob(rng: random.Random) -> dict:
+    days = [dt.date(2026, 1, 1) + dt.timedelta(days=d) for d in range(365)]
+    return {
+        "kpis": {k: Decimal(f"{rng.randrange(10**6)}.{rng.randrange(100):02d}") for k in (
+            "revenue_mtd", "revenue_ytd", "avg_ticket", "ar_outstanding", "gross_margin",
+        )},
+        "revenue_trend": [{"date": d, "revenue": rng.randrange(2000, 40000), "jobs": rng.randrange(5, 80)} for d in days],
+        "service_mix": [{"job_type": j, "count": rng.randrange(1000), "revenue": rng.random() * 10**5} for j in JOB_TYPES],
+        "tech_leaderboard": [
+            {"technician_id": str(uuid.uuid4()), "name": f"Tech {i}", "jobs": rng.randrange(300),
+             "revenue": rng.random() * 10**5, "rating": round(3 + rng.random() * 2, 2)}
+            for i in range(40)
+        ],
+        "generated_at": dt.datetime(2026, 10, 16, 12, 0),
+    }
+
+
+def make_inspection_rows(n: int, rng: random.Random) -> dict:
+    headers = [f"Question {i}" for i in range(40)]
+    answers = ["Yes", "No", "N/A", "Pass", "Fail", "Needs follow-up", "Tank pumped within 3 years"]
+    rows = []
+    for i in range(n):
+        row = [str(i), f"2026-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+               f"Customer {rng.randrange(10**5)}", f"{rng.randrange(1, 9999)} Brush Creek Road, Fairview, TN"]
+        row += [rng.choice(answers) for _ in range(len(headers) - len(row))]
+        rows.append(row)
+    return {"headers": headers, "rows": rows}
+
+
+def time_it(fn, repeat: int) -> float:
+    """Best-of-repeat seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+async def redis_memory(redis_url: str, payloads: dict[str, bytes]) -> dict[str, int]:
+    import redis.asyncio as redis
+
+    client = redis.from_url(redis_url, decode_responses=False)
+    usage = {}
+    try:
+        for label, raw in payloads.items():
+            key = f"bench:codec:{label}"
+            await client.set(key, raw, ex=60)
+            usage[label] = await client.memory_usage(key) or 0
+            await client.delete(key)
+    finally:
+        await client.aclose()
+    return usage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    payloads = {
+        "workorders": make_work_order_page(200, rng),
+        "executive": make_executive_blob(rng),
+        "inspection_forms": make_inspection_rows(3000, rng),
+    }
+    codecs = available_codecs()
+    print(f"codecs installed: {', '.join(codecs)}   (best of {args.repeat})")
+
+    for name, value in payloads.items():
+        print(f"\n{name}")
+        print(f"  {'codec':<16}{'encode ms':>11}{'decode ms':>11}{'bytes':>11}{'redis bytes':>13}")
+        encoded = {}
+        rows = []
+        for codec_name in codecs:
+            codec = get_codec(codec_name)
+            for compress in (0, COMPRESS_MIN_BYTES):
+                label = codec_name + ("+zlib" if compress else "")
+                raw = encode(value, codec, compress)
+                enc_s = time_it(lambda: encode(value, codec, compress), args.repeat)
+                dec_s = time_it(lambda: decode(raw), args.repeat)
+                encoded[label] = raw
+                rows.append((label, enc_s, dec_s, len(raw)))
+
+        memory = asyncio.run(redis_memory(args.redis_url, encoded)) if args.redis_url else {}
+        for label, enc_s, dec_s, size in rows:
+            mem = f"{memory[label]:>13,}" if label in memory else f"{'-':>13}"
+            print(f"  {label:<16}{enc_s * 1000:>11.2f}{dec_s * 1000:>11.2f}{size:>11,}{mem}")
+
+
+if __name__ == "__main__":
+    main()
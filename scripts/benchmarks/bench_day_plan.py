@@ -0,0 +1,117 @@
+"""Benchmark: multi-technician day planner vs round-robin assignment.
+
+Synthetic days: technicians living around the service area and jobs in a
+few towns, some with two-hour windows and a skill only part of the crew
+has. "round-robin" is what auto_dispatch did (job i to technician
+i % techs), each route then ordered by plan_route() so the comparison is
+about assignment, not ordering. "planned" is plan_day() with --limit
+seconds.
+
+Columns: total miles, spread of route durations (max - min, minutes),
+minutes late, skill mismatches and minutes past the end of shift
+(round-robin ignores all three), unassigned jobs and planner runtime.
+
+Usage:
+    python scripts/benchmarks/bench_day_plan.py [--days 3] [--limit 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from app.services.geo import PlanTechnician, RouteStop, plan_day, plan_route  # noqa: E402
+
+CENTER = (35.6145, -87.0353)
+TOWNS = [(0.0, 0.0), (0.35, 0.3), (-0.3, 0.4), (0.25, -0.45), (-0.4, -0.3)]
+JOB_TYPES = ["pumping", "pumping", "pumping", "inspection", "repair"]
+
+
+def make_day(rng, jobs, techs):
+    crew = []
+    for i in range(techs):
+        town = TOWNS[i % len(TOWNS)]
+        skills = frozenset({"pumping", "inspection"} | ({"repair"} if i % 3 == 0 else set()))
+        crew.append(
+            PlanTechnician(
+                f"tech-{i}",
+                CENTER[0] + town[0] + rng.uniform(-0.05, 0.05),
+                CENTER[1] + town[1] + rng.uniform(-0.05, 0.05),
+                skills=skills,
+            )
+        )
+    stops = []
+    for j in range(jobs):
+        town = rng.choice(TOWNS)
+        stop = RouteStop(
+            f"job-{j}",
+            CENTER[0] + town[0] + rng.gauss(0, 0.06),
+            CENTER[1] + town[1] + rng.gauss(0, 0.06),
+            service_minutes=rng.choice((30, 45, 60)),
+            skill=rng.choice(JOB_TYPES),
+        )
+        if rng.random() < 0.3:
+            stop.window_start = rng.choice((8, 10, 12, 14)) * 60
+            stop.window_end = stop.window_start + 120
+        stops.append(stop)
+    return stops, crew
+
+
+def round_robin(stops, crew):
+    miles, late, mismatches, overtime, durations = 0.0, 0.0, 0, 0.0, []
+    for i, tech in enumerate(crew):
+        mine = stops[i :: len(crew)]
+        mismatches += sum(not tech.can_do(s) for s in mine)
+        plan = plan_route(mine, (tech.lat, tech.lng), (tech.lat, tech.lng), depart_minute=tech.shift_start)
+        miles += plan.distance_miles
+        late += plan.late_minutes
+        durations.append(plan.finish_minute - tech.shift_start)
+        overtime += max(0.0, durations[-1] - tech.shift_minutes)
+    return miles, max(durations) - min(durations), late, mismatches, overtime
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--limit", type=float, default=5.0)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    print(f"mean of {args.days} days, planner limit {args.limit}s")
+    print(
+        f"  {'day':<14}{'method':<13}{'miles':>8}{'spread':>8}{'late':>8}"
+        f"{'skill':>7}{'over':>7}{'unasg':>7}{'ms':>8}"
+    )
+    for jobs, techs in ((20, 3), (60, 8), (120, 15)):
+        rr_rows, plan_rows = [], []
+        for _ in range(args.days):
+            stops, crew = make_day(rng, jobs, techs)
+            rr_rows.append(round_robin(stops, crew))
+            t0 = time.perf_counter()
+            day = plan_day(stops, crew, time_limit=args.limit)
+            elapsed = (time.perf_counter() - t0) * 1000
+            spread = max(day.duration_minutes.values()) - min(
+                [*day.duration_minutes.values(), *([0.0] if len(day.routes) < techs else [])]
+            )
+            late = sum(r.late_minutes for r in day.routes.values())
+            plan_rows.append((day.distance_miles, spread, late, 0, 0, len(day.unassigned), elapsed))
+        label = f"{jobs} jobs/{techs}"
+        rr = [sum(col) / len(rr_rows) for col in zip(*rr_rows)]
+        pl = [sum(col) / len(plan_rows) for col in zip(*plan_rows)]
+        rows = (("round-robin", rr, "0", ""), ("planned", pl, f"{pl[5]:.1f}", f"{pl[6]:.0f}"))
+        for name, row, unassigned, ms in rows:
+            print(
+                f"  {label if name == 'round-robin' else '':<14}{name:<13}{row[0]:>8.1f}{row[1]:>8.0f}{row[2]:>8.0f}"
+                f"{row[3]:>7.1f}{row[4]:>7.0f}{unassigned:>7}{ms:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark: spatial queries, routing and clustering, scalar haversine loops vs app.services.geo.
+
+Jobs are scattered over a ~200 x 200 mile service area. For each query type
+the "loop" column is what the endpoints used to do (a Python haversine per
+job, then filter/sort) and the "index" column is GeoIndex. Index build time
+is reported separately since the index is cached between requests.
+
+Usage:
+    python scripts/benchmarks/bench_geo.py [--jobs 10000] [--queries 500]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from app.services.geo import (  # noqa: E402
+    GeoIndex,
+    distance_matrix,
+    grid_clusters,
+    haversine_miles,
+    nearest_neighbor_order,
+)
+
+CENTER = (35.6145, -87.0353)
+
+
+def loop_radius(jobs, lat, lng, radius):
+    found = []
+    for job in jobs:
+        d = haversine_miles(lat, lng, job["lat"], job["lng"])
+        if d <= radius:
+            found.append((job, d))
+    found.sort(key=lambda x: x[1])
+    return found
+
+
+def loop_nearest(jobs, lat, lng, k):
+    return sorted(((job, haversine_miles(lat, lng, job["lat"], job["lng"])) for job in jobs), key=lambda x: x[1])[:k]
+
+
+def loop_bbox(jobs, min_lat, min_lng, max_lat, max_lng):
+    return [j for j in jobs if min_lat <= j["lat"] <= max_lat and min_lng <= j["lng"] <= max_lng]
+
+
+def loop_route(stops, start):
+    route, remaining, current = [], list(stops), start
+    while remaining:
+        nearest = min(remaining, key=lambda s: haversine_miles(current["lat"], current["lng"], s["lat"], s["lng"]))
+        route.append(nearest)
+        remaining.remove(nearest)
+        current = nearest
+    return route
+
+
+def matrix_route(stops, start):
+    points = [start, *stops]
+    matrix = distance_matrix([p["lat"] for p in points], [p["lng"] for p in points])
+    return [points[i] for i in nearest_neighbor_order(matrix)]
+
+
+def greedy_clusters(jobs, radius):
+    """The schedule_map clustering this replaced: O(n^2) haversine calls."""
+    clusters, used = [], set()
+    for job in jobs:
+        if job["id"] in used:
+            continue
+        members = [job["id"]]
+        used.add(job["id"])
+        for other in jobs:
+            if other["id"] in used:
+                continue
+            if haversine_miles(job["lat"], job["lng"], other["lat"], other["lng"]) <= radius:
+                members.append(other["id"])
+                used.add(other["id"])
+        clusters.append(members)
+    return clusters
+
+
+def timed(fn, args_list):
+    t0 = time.perf_counter()
+    results = [fn(*args) for args in args_list]
+    return (time.perf_counter() - t0) / len(args_list) * 1000, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    jobs = [
+        {"id": i, "lat": CENTER[0] + rng.uniform(-1.4, 1.4), "lng": CENTER[1] + rng.uniform(-1.8, 1.8)}
+        for i in range(args.jobs)
+    ]
+    points = [(CENTER[0] + rng.uniform(-1.4, 1.4), CENTER[1] + rng.uniform(-1.8, 1.8)) for _ in range(args.queries)]
+
+    t0 = time.perf_counter()
+    index = GeoIndex.from_records(jobs)
+    build_ms = (time.perf_counter() - t0) * 1000
+    print(f"{args.jobs} jobs, {args.queries} queries each; index build {build_ms:.1f} ms ({index.cell_count} cells)")
+    print(f"  {'query':<24}{'loop ms':>10}{'index ms':>10}{'speedup':>9}")
+
+    def report(name, loop_fn, index_fn, args_list, same):
+        loop_ms, expected = timed(loop_fn, args_list)
+        index_ms, got = timed(index_fn, args_list)
+        assert all(same(a, b) for a, b in zip(expected, got)), f"{name}: results differ"
+        print(f"  {name:<24}{loop_ms:>10.3f}{index_ms:>10.3f}{loop_ms / index_ms:>8.0f}x")
+
+    def ids(rows):
+        return [row[0]["id"] for row in rows]
+
+    for radius in (5, 30):
+        report(
+            f"radius {radius} mi",
+            lambda lat, lng: loop_radius(jobs, lat, lng, radius),
+            lambda lat, lng: index.within_radius(lat, lng, radius),
+            points,
+            lambda a, b: ids(a) == ids(b),
+        )
+    report(
+        "10 nearest",
+        lambda lat, lng: loop_nearest(jobs, lat, lng, 10),
+        lambda lat, lng: index.nearest(lat, lng, k=10),
+        points,
+        lambda a, b: ids(a) == ids(b),
+    )
+    boxes = [(lat - 0.1, lng - 0.1, lat + 0.1, lng + 0.1) for lat, lng in points]
+    report(
+        "bbox 0.2 deg",
+        lambda *box: loop_bbox(jobs, *box),
+        lambda *box: index.within_bbox(*box),
+        boxes,
+        lambda a, b: sorted(j["id"] for j in a) == sorted(j["id"] for j in b),
+    )
+
+    print(f"  {'nearest-neighbor route':<24}{'loop ms':>10}{'matrix ms':>10}{'speedup':>9}")
+    for n in (10, 50, 200):
+        routes = [(rng.sample(jobs, n), {"lat": CENTER[0], "lng": CENTER[1]}) for _ in range(max(1, 2000 // n))]
+        loop_ms, expected = timed(loop_route, routes)
+        matrix_ms, got = timed(matrix_route, routes)
+        assert all([s["id"] for s in a] == [s["id"] for s in b] for a, b in zip(expected, got))
+        print(f"  {f'{n} stops':<24}{loop_ms:>10.3f}{matrix_ms:>10.3f}{loop_ms / matrix_ms:>8.0f}x")
+
+    print(f"  {'clusters, 5 mi radius':<34}{'greedy ms':>10}{'grid ms':>10}{'speedup':>9}")
+    for n in (500, 2000):
+        day = jobs[:n]
+        greedy_ms, greedy = timed(lambda: greedy_clusters(day, 5), [()])
+        grid_ms, grid = timed(lambda: grid_clusters([j["lat"] for j in day], [j["lng"] for j in day], 5), [()])
+        label = f"{n} jobs ({len(greedy[0])} -> {len(grid[0])} clusters)"
+        print(f"  {label:<34}{greedy_ms:>10.1f}{grid_ms:>10.1f}{greedy_ms / grid_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Benchmark: batched GPS ingest vs the per-point paths it replaces.
+
+Synthetic batches: technicians driving around the service area, one point
+every 30 s, against a set of circle and polygon geofences (customer sites
+and yards). Runs on in-memory SQLite, so absolute numbers are a floor for
+what Postgres (one round trip per statement) would show; the ratios are
+the point.
+
+Rows:
+  per-point upsert    what /gps/location/batch did: one INSERT ... ON
+                      CONFLICT per point, no history, no geofences
+  per-point fences    GPSTrackingService's geofence check: every fence
+                      tested in Python for every point (its per-fence
+                      last-event query is left out, which flatters it)
+  ingest_locations    history + latest position + geofence events, all
+                      points in one transaction
+
+Usage:
+    python scripts/benchmarks/bench_gps_ingest.py [--techs 50] [--points 100] [--fences 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models.gps_tracking import (  # noqa: E402
+    Geofence,
+    GeofenceEvent,
+    GeofenceType,
+    LocationHistory,
+    TechnicianLocation,
+)
+from app.models.technician import Technician  # noqa: E402
+from app.schemas.gps_tracking import LocationUpdate  # noqa: E402
+from app.services.gps_ingest import GPSIngest  # noqa: E402
+from app.services.gps_tracking_service import GPSTrackingService  # noqa: E402
+
+CENTER = (35.6145, -87.0353)
+START = datetime(2026, 3, 2, 8, 0)
+
+UPSERT = text("""
+    INSERT INTO technician_locations
+        (id, technician_id, latitude, longitude, accuracy, speed, heading,
+         is_online, battery_level, captured_at, received_at, current_status)
+    VALUES
+        (:id, :tech_id, :lat, :lng, :accuracy, :speed, :heading,
+         1, :battery, :captured_at, CURRENT_TIMESTAMP, 'available')
+    ON CONFLICT (technician_id) DO UPDATE SET
+        latitude = excluded.latitude,
+        longitude = excluded.longitude,
+        accuracy = excluded.accuracy,
+        speed = excluded.speed,
+        heading = excluded.heading,
+        is_online = 1,
+        battery_level = excluded.battery_level,
+        captured_at = excluded.captured_at,
+        received_at = CURRENT_TIMESTAMP
+""")
+
+
+def make_fences(rng, n):
+    fences = []
+    for i in range(n):
+        lat, lng = CENTER[0] + rng.uniform(-0.4, 0.4), CENTER[1] + rng.uniform(-0.4, 0.4)
+        if i % 5:
+            fences.append(Geofence(
+                name=f"site-{i}", geofence_type=GeofenceType.CUSTOMER_SITE, center_latitude=lat,
+                center_longitude=lng, radius_meters=rng.choice((100, 200, 400)),
+            ))
+        else:
+            d = 0.004
+            fences.append(Geofence(
+                name=f"yard-{i}", geofence_type=GeofenceType.OFFICE,
+                polygon_coordinates=[[lat - d, lng - d], [lat - d, lng + d], [lat + d, lng + d], [lat + d, lng - d]],
+            ))
+    return fences
+
+
+def make_points(rng, techs, per_tech):
+    points = []
+    for _ in range(techs):
+        tech = uuid.uuid4()
+        lat, lng = CENTER[0] + rng.uniform(-0.4, 0.4), CENTER[1] + rng.uniform(-0.4, 0.4)
+        for i in range(per_tech):
+            lat += rng.gauss(0, 0.002)
+            lng += rng.gauss(0, 0.002)
+            points.append((tech, LocationUpdate(
+                latitude=lat, longitude=lng, speed=rng.uniform(0, 50), heading=rng.uniform(0, 360),
+                accuracy=5.0, battery_level=80, captured_at=START + timedelta(seconds=30 * i),
+            )))
+    return points
+
+
+async def fresh_sessions(fences):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    tables = [t.__table__ for t in (Technician, TechnicianLocation, LocationHistory, Geofence, GeofenceEvent)]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        db.add_all(fences)
+        await db.commit()
+    return engine, sessions
+
+
+async def per_point_upsert(points, fences):
+    engine, sessions = await fresh_sessions(fences)
+    t0 = time.perf_counter()
+    async with sessions() as db:
+        for tech, loc in points:
+            await db.execute(UPSERT, {
+                "id": uuid.uuid4().hex, "tech_id": tech.hex, "lat": loc.latitude, "lng": loc.longitude,
+                "accuracy": loc.accuracy, "speed": loc.speed, "heading": loc.heading,
+                "battery": loc.battery_level, "captured_at": loc.captured_at,
+            })
+        await db.commit()
+    elapsed = time.perf_counter() - t0
+    await engine.dispose()
+    return elapsed, "-"
+
+
+def per_point_fences(points, fences):
+    check = GPSTrackingService(db=None)
+    t0 = time.perf_counter()
+    hits = sum(
+        check._is_inside_geofence(loc.latitude, loc.longitude, fence) for _, loc in points for fence in fences
+    )
+    return time.perf_counter() - t0, f"{hits} inside"
+
+
+async def batched(points, fences, batch):
+    engine, sessions = await fresh_sessions(fences)
+    pipeline = GPSIngest()
+    events = 0
+    t0 = time.perf_counter()
+    async with sessions() as db:
+        for i in range(0, len(points), batch):
+            result = await pipeline.ingest(db, points[i : i + batch])
+            events += len(result["geofence_events"])
+    elapsed = time.perf_counter() - t0
+    async with sessions() as db:
+        history = (await db.execute(select(func.count()).select_from(LocationHistory))).scalar()
+    await engine.dispose()
+    return elapsed, f"{history} history, {events} events"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--techs", type=int, default=50)
+    parser.add_argument("--points", type=int, default=100, help="points per technician")
+    parser.add_argument("--fences", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    points = make_points(rng, args.techs, args.points)
+    # Batches arrive in time order, many technicians interleaved
+    points.sort(key=lambda p: p[1].captured_at)
+    fence_rows = make_fences(rng, args.fences)
+    print(f"{len(points)} points from {args.techs} technicians, {args.fences} geofences")
+    print(f"  {'path':<28}{'seconds':>9}{'points/s':>11}  notes")
+
+    rows = [("per-point upsert", *(await per_point_upsert(points, make_fences(random.Random(5), 0))))]
+    rows.append(("per-point fences (no DB)", *per_point_fences(points, fence_rows)))
+    for batch in (50, 500, len(points)):
+        fences = make_fences(random.Random(5), args.fences)
+        rows.append((f"ingest_locations x{batch}", *(await batched(points, fences, batch))))
+    for name, seconds, notes in rows:
+        print(f"  {name:<28}{seconds:>9.3f}{len(points) / seconds:>11,.0f}  {notes}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
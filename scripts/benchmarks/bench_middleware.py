@@ -0,0 +1,141 @@
+"""Load test: latency and throughput of the middleware stack, before vs after pure ASGI.
+
+Runs the production middleware order from app/main.py (security headers,
+activity tracking, server timing, cache headers, proxy headers, correlation
+ID, metrics) in front of two endpoints, with no database involved:
+
+- GET /ping                  tiny JSON body
+- GET /api/v2/work-orders    representative list page (100 rows of JSON)
+
+"before" wraps every layer in a pass-through BaseHTTPMiddleware, which adds
+the per-layer cost the old dispatch() implementations paid (a task group, a
+memory stream and a re-wrapped StreamingResponse per middleware) on top of
+the same header logic. "after" is the stack as shipped.
+
+Usage:
+    python scripts/benchmarks/bench_middleware.py [--requests 5000] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from fastapi import FastAPI  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.middleware import (  # noqa: E402
+    CacheHeadersMiddleware,
+    CorrelationIdMiddleware,
+    MetricsMiddleware,
+    ProxyHeadersMiddleware,
+    SecurityHeadersMiddleware,
+    ServerTimingMiddleware,
+)
+from app.middleware.activity import ActivityTrackingMiddleware  # noqa: E402
+
+# Innermost last, as added in app/main.py
+STACK = [
+    SecurityHeadersMiddleware,
+    ActivityTrackingMiddleware,
+    ServerTimingMiddleware,
+    CacheHeadersMiddleware,
+    ProxyHeadersMiddleware,
+    CorrelationIdMiddleware,
+    MetricsMiddleware,
+]
+
+ROWS = [
+    {
+        "id": f"wo-{i:05d}",
+        "customer_name": "Jane Customer",
+        "service_address": f"{i} Main St, Austin, TX",
+        "job_type": "pumping",
+        "status": "scheduled",
+        "scheduled_date": "2026-03-01",
+        "assigned_technician": "Tess Tech",
+        "total_amount": 325.0,
+    }
+    for i in range(100)
+]
+
+
+class _PassThrough(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/api/v2/work-orders")
+    async def work_orders():
+        return {"items": ROWS, "total": len(ROWS), "page": 1, "page_size": len(ROWS)}
+
+    for middleware in STACK:
+        app.add_middleware(middleware)
+        if legacy:
+            app.add_middleware(_PassThrough)
+    return app
+
+
+async def run(app, path, n, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with sem:
+                t0 = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - t0)
+                response.raise_for_status()
+
+        await asyncio.gather(*(one() for _ in range(min(n, 200))))  # warm-up
+        latencies.clear()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n)))
+        elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "rps": n / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main_async(args):
+    apps = {"before": build(legacy=True), "after": build(legacy=False)}
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}")
+    print(f"  {'endpoint':<22}{'stack':<8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for path in ("/ping", "/api/v2/work-orders"):
+        for label, app in apps.items():
+            r = await run(app, path, args.requests, args.concurrency)
+            print(f"  {path:<22}{label:<8}{r['rps']:>10.0f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}")
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
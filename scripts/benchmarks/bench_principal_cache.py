@@ -0,0 +1,149 @@
+"""Load test: database queries per authenticated request, principal cache off vs on.
+
+Drives the real auth dependencies through a small FastAPI app backed by a
+temporary SQLite database with only the auth tables:
+
+- GET /staff   CurrentUser + EntityCtx (internal API with X-Entity-ID header)
+- GET /public  PublicAPIClient (OAuth2 bearer token, public API)
+
+Every statement sent to the database is counted. Each scenario runs with
+PRINCIPAL_CACHE_TTL=0 (cache disabled, one lookup per dependency as before)
+and with the configured TTL. Without REDIS_URL only the per-worker L1 is used.
+
+Usage:
+    python scripts/benchmarks/bench_principal_cache.py [--requests 2000] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+# Always a throwaway SQLite file: the app's own engine and get_db are used
+# (dependency_overrides would add per-request dependency analysis)
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench_principal.db"
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from fastapi import FastAPI  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.api.deps import CurrentUser, EntityCtx, create_access_token  # noqa: E402
+from app.api.public.deps import PublicAPIClient, hash_token  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.core.rate_limit import reset_rate_limits  # noqa: E402
+from app.database import Base, async_session_maker, engine  # noqa: E402
+from app.models.company_entity import CompanyEntity  # noqa: E402
+from app.models.oauth import APIClient, APIToken  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.cache_service import get_cache_service  # noqa: E402
+
+TABLES = [CompanyEntity.__table__, User.__table__, APIClient.__table__, APIToken.__table__]
+
+
+async def build():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+
+    async with async_session_maker() as db:
+        entity = CompanyEntity(id=uuid.uuid4(), name="Mac Septic", short_code="MAC", is_default=True)
+        user = User(email="bench@example.com", hashed_password="x", is_active=True, default_entity_id=entity.id)
+        client = APIClient(
+            client_id="bench", client_secret_hash="x", name="Bench", scopes="read",
+            rate_limit_per_minute=10**9, rate_limit_per_hour=10**9,
+        )
+        db.add_all([entity, user, client])
+        await db.flush()
+        db.add(APIToken(
+            token_hash=hash_token("bench-token"), client_id=client.id, scopes="read",
+            expires_at=datetime.utcnow() + timedelta(hours=1),
+        ))
+        await db.commit()
+
+    queries = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: queries.append(a[2]))
+
+    app = FastAPI()
+
+    @app.get("/staff")
+    async def staff(user: CurrentUser, entity: EntityCtx):
+        return {"user": user.id, "entity": str(entity.id) if entity else None}
+
+    @app.get("/public")
+    async def public(client: PublicAPIClient):
+        return {"client": client.client_id}
+
+    staff_headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': str(user.id), 'email': user.email})}",
+        "X-Entity-ID": str(entity.id),
+    }
+    public_headers = {"Authorization": "Bearer bench-token"}
+    return app, queries, {"/staff": staff_headers, "/public": public_headers}
+
+
+async def run(app, queries, path, headers, n, concurrency):
+    get_cache_service().clear_local()
+    reset_rate_limits()
+    queries.clear()
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with sem:
+                t0 = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - t0)
+                response.raise_for_status()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n)))
+        elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "queries_per_request": len(queries) / n,
+        "rps": n / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main_async(args):
+    app, queries, scenarios = await build()
+    configured_ttl = settings.PRINCIPAL_CACHE_TTL or 60
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}")
+    print(f"  {'endpoint':<10}{'cache':<10}{'queries/req':>12}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    try:
+        for path, headers in scenarios.items():
+            for label, ttl in (("off", 0), (f"ttl={configured_ttl}", configured_ttl)):
+                settings.PRINCIPAL_CACHE_TTL = ttl
+                r = await run(app, queries, path, headers, args.requests, args.concurrency)
+                print(
+                    f"  {path:<10}{label:<10}{r['queries_per_request']:>12.3f}{r['rps']:>10.0f}"
+                    f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                )
+    finally:
+        settings.PRINCIPAL_CACHE_TTL = configured_ttl
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.disable(logging.INFO)  # per-query debug logs would dominate the timings
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
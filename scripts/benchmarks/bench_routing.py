@@ -0,0 +1,101 @@
+"""Benchmark: route optimizer (2-opt / Or-opt) vs the nearest-neighbor ordering it replaced.
+
+Synthetic days of 10, 50 and 200 stops scattered around a depot, each
+planned as a closed route (leave from and return to the depot). Two
+scenarios:
+
+- open:     no time windows; quality is total miles
+- windowed: a third of the stops carry a two-hour window spread over a
+            workday 20% longer than the nearest-neighbor tour; quality is minutes late, then
+            miles
+
+"nn" is the plain nearest-neighbor order the endpoints used, scored with the
+same schedule (so its lateness is visible); "opt" is plan_route() with the
+given time budget. Figures are means over --days random days.
+
+Usage:
+    python scripts/benchmarks/bench_routing.py [--days 5] [--budget 0.5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from app.services.geo import (  # noqa: E402
+    RouteStop,
+    distance_matrix,
+    nearest_neighbor_order,
+    plan_route,
+    schedule_route,
+)
+
+DEPOT = (35.6145, -87.0353)
+DEPART = 8 * 60
+
+
+def make_day(rng, n, windowed):
+    # Spread grows with the stop count, as bigger days cover more territory
+    spread = 0.15 + 0.002 * n
+    service = max(5, 360 // n)
+    stops = []
+    for i in range(n):
+        lat = DEPOT[0] + rng.uniform(-spread, spread)
+        lng = DEPOT[1] + rng.uniform(-spread, spread)
+        stops.append(RouteStop(str(i), lat, lng, service_minutes=service))
+    if windowed:
+        # Windows fall inside the day the nearest-neighbor tour would take, plus slack
+        day = (schedule_route(nearest_neighbor(stops), DEPOT, DEPOT, depart_minute=DEPART).finish_minute - DEPART) * 1.2
+        for stop in rng.sample(stops, n // 3):
+            stop.window_start = DEPART + rng.uniform(0, max(day - 120, 0))
+            stop.window_end = stop.window_start + 120
+    return stops
+
+
+def nearest_neighbor(stops):
+    points = [DEPOT, *((s.lat, s.lng) for s in stops)]
+    matrix = distance_matrix([p[0] for p in points], [p[1] for p in points])
+    return [stops[node - 1] for node in nearest_neighbor_order(matrix)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"mean of {args.days} days, time budget {args.budget}s")
+    print(
+        f"  {'scenario':<16}{'nn mi':>9}{'opt mi':>9}{'saved':>8}"
+        f"{'nn late':>9}{'opt late':>10}{'opt ms':>9}{'moves':>7}"
+    )
+    for windowed in (False, True):
+        for n in (10, 50, 200):
+            rows = []
+            for _ in range(args.days):
+                stops = make_day(rng, n, windowed)
+                nn = schedule_route(nearest_neighbor(stops), DEPOT, DEPOT, depart_minute=DEPART)
+                t0 = time.perf_counter()
+                plan = plan_route(stops, DEPOT, DEPOT, depart_minute=DEPART, time_budget=args.budget)
+                elapsed = (time.perf_counter() - t0) * 1000
+                rows.append(
+                    (nn.distance_miles, plan.distance_miles, nn.late_minutes, plan.late_minutes, elapsed, plan.moves)
+                )
+            nn_mi, opt_mi, nn_late, opt_late, ms, moves = (sum(col) / len(rows) for col in zip(*rows))
+            label = f"{'windowed' if windowed else 'open'} {n}"
+            print(
+                f"  {label:<16}{nn_mi:>9.1f}{opt_mi:>9.1f}{(1 - opt_mi / nn_mi) * 100:>7.1f}%"
+                f"{nn_late:>9.0f}{opt_late:>10.0f}{ms:>9.0f}{moves:>7.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
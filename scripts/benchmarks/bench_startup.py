@@ -0,0 +1,112 @@
+"""Benchmark: worker cold start, import phase and startup schema phase.
+
+import: wall time of `import app.main` in a fresh interpreter (median of
+--repeat runs), plus the slowest modules under it from -X importtime. Every
+uvicorn worker pays this before serving.
+
+schema: what the lifespan's ensure_schema() costs.
+
+- "current" is the fast path every worker takes once the schema is set up:
+  computing the fingerprint and reading schema_state (one SELECT)
+- "full setup" is what each worker used to run on every start, create_all
+  plus every ensure_* step. It needs Postgres (the steps query
+  information_schema and use Postgres DDL), so it is only measured when
+  --database-url points at one. Use a scratch database: it is modified
+
+Usage:
+    python scripts/benchmarks/bench_startup.py [--repeat 5] [--database-url postgresql+asyncpg://localhost/crm_bench]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-minimum-32-characters")
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+IMPORT_PROBE = "import time; t0 = time.perf_counter(); import app.main; print(time.perf_counter() - t0)"
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=os.environ, capture_output=True, text=True, check=True)
+
+
+def bench_import(repeat: int, top: int) -> None:
+    times = [float(_python("-c", IMPORT_PROBE).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+    print(f"import app.main: median {statistics.median(times):.2f}s, min {min(times):.2f}s ({repeat} runs)")
+
+    # -X importtime: "import time: self [us] | cumulative | <indent>name"; show app.main's children and theirs
+    rows = []
+    for line in _python("-X", "importtime", "-c", "import app.main").stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth in (1, 2):
+            rows.append((int(cumulative) / 1e6, name.strip()))
+    print("  slowest imports under app.main (cumulative):")
+    for seconds, name in sorted(rows, reverse=True)[:top]:
+        print(f"    {seconds:>6.2f}s  {name}")
+
+
+async def bench_schema(repeat: int) -> None:
+    import app.main  # noqa: F401  (registers every model, as the workers do)
+    from app.database import Base, engine
+    from app.models.schema_state import SchemaState
+    from app.schema_setup import ensure_schema, run_schema_setup, schema_fingerprint
+
+    postgres = engine.dialect.name == "postgresql"
+    print(f"schema ({engine.dialect.name}):")
+
+    t0 = time.perf_counter()
+    fingerprint = schema_fingerprint()
+    print(f"  fingerprint:        {(time.perf_counter() - t0) * 1000:>8.1f} ms")
+
+    if postgres:
+        t0 = time.perf_counter()
+        await run_schema_setup(force=True)
+        print(f"  full setup:         {(time.perf_counter() - t0) * 1000:>8.1f} ms  (create_all + every ensure_* step)")
+    else:
+        # Record the current fingerprint directly: create_all needs Postgres types
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[SchemaState.__table__])
+            state = {"name": "app", "fingerprint": fingerprint, "applied_at": datetime.now(timezone.utc)}
+            await conn.execute(SchemaState.__table__.insert().values(**state))
+
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        ran = await ensure_schema()
+        times.append(time.perf_counter() - t0)
+        assert not ran, "schema setup ran although the fingerprint was just recorded"
+    print(f"  current (skip DDL): {statistics.median(times) * 1000:>8.1f} ms  (median of {repeat})")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--database-url", help="Postgres scratch database for the full setup (default: temp SQLite)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{tmp}/bench_startup.db"
+        bench_import(args.repeat, args.top)
+        logging.disable(logging.WARNING)
+        asyncio.run(bench_schema(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 """One-shot geocoding backfill for work_orders + customers missing lat/lng.
 
-Reads addresses from prod via DATABASE_URL, geocodes via Nominatim (free, OSM),
-rate-limited to 1 req/sec per their TOS.
+Reads addresses from prod via DATABASE_URL and resolves them through the
+app's geocoder (app.services.geocoding_service): addresses already in
+geocode_cache are answered in one query, the rest go to Nominatim (free,
+OSM) from a small worker pool held to 1 req/sec per their TOS, and every
+answer is written back to the cache.
 
 Usage:
     DATABASE_URL=postgresql://... python scripts/geocode_backfill.py [--limit N] [--state SC]
@@ -9,26 +12,30 @@ Usage:
 import asyncio
 import os
 import sys
-import time
-from urllib.parse import quote_plus
+from pathlib import Path
 
-import httpx
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy import text
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-NOMINATIM = "https://nominatim.openstreetmap.org/search"
-HEADERS = {"User-Agent": "MacServicePlatform/1.0 (will@macseptic.com)"}
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
 
+from app.services.geocoding_service import Geocoder, address_request  # noqa: E402
 
-async def geocode(client: httpx.AsyncClient, addr: str) -> tuple[float, float] | None:
-    try:
-        r = await client.get(NOMINATIM, params={"q": addr, "format": "json", "limit": 1}, headers=HEADERS, timeout=10)
-        rows = r.json()
-        if rows:
-            return float(rows[0]["lat"]), float(rows[0]["lon"])
-    except Exception as e:
-        print(f"  geocode error: {e}", file=sys.stderr)
-    return None
+
+async def backfill(conn, geocoder: Geocoder, label: str, rows, update_sql: str) -> None:
+    """Geocode (id, line1, city, state, postal_code, county) rows and update the ones found."""
+    requests = {row[0]: address_request(*row[1:5], county=row[5]) for row in rows}
+    print(f"Geocoding {len(requests)} {label}...")
+    found = await geocoder.geocode_many(requests.values())
+    done = 0
+    for row_id, request in requests.items():
+        coords = found.get(request.key) if request else None
+        if coords:
+            await conn.execute(text(update_sql), {"lat": coords[0], "lng": coords[1], "id": row_id})
+            done += 1
+            print(f"  {str(row_id)[:8]}: {request.query} -> {coords[0]:.5f}, {coords[1]:.5f}")
+    await conn.commit()
+    print(f"Updated {done}/{len(requests)} {label}\n")
 
 
 async def main():
@@ -39,62 +46,45 @@ async def main():
     limit = int(next((sys.argv[i + 1] for i, a in enumerate(sys.argv) if a == "--limit"), "100"))
 
     engine = create_async_engine(db_url)
-    async with engine.connect() as conn, httpx.AsyncClient() as http:
-        # Work orders
-        wo_q = """
-        SELECT id, COALESCE(service_address_line1,'')||', '||COALESCE(service_city,'')||', '||COALESCE(service_state,'')||' '||COALESCE(service_postal_code,'') AS addr
-        FROM work_orders
-        WHERE (service_latitude IS NULL OR service_longitude IS NULL)
-          AND service_address_line1 IS NOT NULL AND service_state IS NOT NULL
-        """
-        if state:
-            wo_q += f" AND service_state='{state}'"
-        wo_q += f" LIMIT {limit}"
-
-        wos = (await conn.execute(text(wo_q))).fetchall()
-        print(f"Geocoding {len(wos)} work orders...")
-        wo_done = 0
-        for wo_id, addr in wos:
-            print(f"  WO {str(wo_id)[:8]}: {addr}")
-            coords = await geocode(http, addr)
-            if coords:
-                await conn.execute(
-                    text("UPDATE work_orders SET service_latitude=:lat, service_longitude=:lng WHERE id=:id"),
-                    {"lat": coords[0], "lng": coords[1], "id": wo_id},
-                )
-                wo_done += 1
-                print(f"    -> {coords[0]:.5f}, {coords[1]:.5f}")
-            time.sleep(1.1)  # Nominatim TOS: 1 req/sec
-        await conn.commit()
-        print(f"Updated {wo_done}/{len(wos)} work orders\n")
-
-        # Customers
-        cust_q = """
-        SELECT id, COALESCE(address_line1,'')||', '||COALESCE(city,'')||', '||COALESCE(state,'')||' '||COALESCE(postal_code,'') AS addr
-        FROM customers
-        WHERE (latitude IS NULL OR longitude IS NULL)
-          AND address_line1 IS NOT NULL AND state IS NOT NULL
-        """
-        if state:
-            cust_q += f" AND state='{state}'"
-        cust_q += f" LIMIT {limit}"
+    geocoder = Geocoder(session_factory=async_sessionmaker(engine, expire_on_commit=False))
+    try:
+        async with engine.connect() as conn:
+            # Work orders
+            wo_q = """
+            SELECT id, service_address_line1, service_city, service_state, service_postal_code, NULL
+            FROM work_orders
+            WHERE (service_latitude IS NULL OR service_longitude IS NULL)
+              AND service_address_line1 IS NOT NULL AND service_state IS NOT NULL
+            """
+            params = {"limit": limit}
+            if state:
+                wo_q += " AND service_state = :state"
+                params["state"] = state
+            wo_q += " LIMIT :limit"
+            wos = (await conn.execute(text(wo_q), params)).fetchall()
+            await backfill(
+                conn, geocoder, "work orders", wos,
+                "UPDATE work_orders SET service_latitude=:lat, service_longitude=:lng WHERE id=:id",
+            )
 
-        custs = (await conn.execute(text(cust_q))).fetchall()
-        print(f"Geocoding {len(custs)} customers...")
-        cust_done = 0
-        for cust_id, addr in custs:
-            print(f"  Cust {str(cust_id)[:8]}: {addr}")
-            coords = await geocode(http, addr)
-            if coords:
-                await conn.execute(
-                    text("UPDATE customers SET latitude=:lat, longitude=:lng WHERE id=:id"),
-                    {"lat": coords[0], "lng": coords[1], "id": cust_id},
-                )
-                cust_done += 1
-                print(f"    -> {coords[0]:.5f}, {coords[1]:.5f}")
-            time.sleep(1.1)
-        await conn.commit()
-        print(f"Updated {cust_done}/{len(custs)} customers")
+            # Customers
+            cust_q = """
+            SELECT id, address_line1, city, state, postal_code, county
+            FROM customers
+            WHERE (latitude IS NULL OR longitude IS NULL)
+              AND address_line1 IS NOT NULL AND state IS NOT NULL
+            """
+            if state:
+                cust_q += " AND state = :state"
+            cust_q += " LIMIT :limit"
+            custs = (await conn.execute(text(cust_q), params)).fetchall()
+            await backfill(
+                conn, geocoder, "customers", custs,
+                "UPDATE customers SET latitude=:lat, longitude=:lng WHERE id=:id",
+            )
+    finally:
+        await geocoder.close()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
@@ -218,10 +218,13 @@ def run_geocode_backlog(
 
     Paginates through the needs-geocoding endpoint in pages of 500,
     geocodes each batch, and sends updates. Re-logins on auth failures.
+    Permits whose address the CRM has already geocoded come back with
+    coordinates and are applied without calling the Census geocoder.
     """
     geocoder = CensusGeocoder()
     total_processed = 0
     updated = 0
+    reused = 0
     start_time = time.time()
 
     while total_processed < limit:
@@ -243,7 +246,12 @@ def run_geocode_backlog(
         for i, p in enumerate(permits):
             addr = p.get("address", "")
             state = p.get("state_code", "TX") or "TX"
-            result = geocoder.geocode(addr, state)
+            if p.get("latitude") is not None and p.get("longitude") is not None:
+                # The CRM already knows this address (geocode cache)
+                result = {"latitude": p["latitude"], "longitude": p["longitude"]}
+                reused += 1
+            else:
+                result = geocoder.geocode(addr, state)
 
             if result:
                 update: dict = {
@@ -293,6 +301,7 @@ def run_geocode_backlog(
 
     stats = geocoder.stats
     stats["updated"] = updated
+    stats["reused"] = reused
     print(f"\nGeocoding complete: {stats}")
     return stats
 
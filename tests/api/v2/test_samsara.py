@@ -0,0 +1,137 @@
+"""
+Tests for the Samsara SSE stream: snapshot, deltas, coalescing and area filters.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v2 import samsara
+from app.api.v2.samsara import Vehicle, VehicleLocation, _SSESubscriber, _parse_stream_filter
+from app.services.technician_state import TechnicianState
+
+COLUMBIA = (35.6145, -87.0353)
+SAN_MARCOS = (29.8833, -97.9414)
+
+
+@pytest.fixture(autouse=True)
+def clean_store(monkeypatch):
+    monkeypatch.setattr(samsara, "_vehicle_store", {})
+    monkeypatch.setattr(samsara, "_sse_clients", set())
+    state = TechnicianState()
+    monkeypatch.setattr(samsara, "get_technician_state", lambda: state)
+
+
+def _vehicle(vehicle_id, at=COLUMBIA, speed=30.0):
+    return Vehicle(
+        id=vehicle_id,
+        name=f"TRUCK {vehicle_id}",
+        location=VehicleLocation(lat=at[0], lng=at[1], heading=0, speed=speed, updated_at="2026-03-02T14:00:00Z"),
+        status="moving",
+    )
+
+
+def _feed(vehicle_id, at=COLUMBIA, speed=30.0):
+    return {
+        "id": vehicle_id,
+        "name": f"TRUCK {vehicle_id}",
+        "gps": [{
+            "time": datetime.now(timezone.utc).isoformat(), "latitude": at[0], "longitude": at[1],
+            "speedMilesPerHour": speed, "headingDegrees": 0,
+        }],
+    }
+
+
+def _event(message):
+    name, data = message.strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+class TestSubscriber:
+    def test_slow_client_gets_latest_position_per_vehicle(self):
+        subscriber = _SSESubscriber()
+        for lat in (35.0, 35.1, 35.2):
+            vehicle = _vehicle("1", at=(lat, COLUMBIA[1]))
+            subscriber.offer([(vehicle, vehicle.model_dump_json())], set())
+        other = _vehicle("2")
+        subscriber.offer([(other, other.model_dump_json())], set())
+
+        assert subscriber.wake.is_set()
+        name, data = _event(subscriber.drain())
+        assert name == "vehicles_delta"
+        assert [(v["id"], v["location"]["lat"]) for v in data["updated"]] == [("1", 35.2), ("2", COLUMBIA[0])]
+        assert data["removed"] == []
+        assert subscriber.drain() is None
+        assert not subscriber.wake.is_set()
+
+    def test_bbox_filters_and_reports_vehicles_leaving(self):
+        subscriber = _SSESubscriber(_parse_stream_filter(None, "nashville"))
+        local, texas = _vehicle("1"), _vehicle("2", at=SAN_MARCOS)
+
+        name, data = _event(subscriber.snapshot([local, texas]))
+        assert name == "vehicles"
+        assert [v["id"] for v in data] == ["1"]
+
+        subscriber.offer([(texas, texas.model_dump_json())], set())
+        assert subscriber.drain() is None
+
+        gone = _vehicle("1", at=SAN_MARCOS)
+        subscriber.offer([(gone, gone.model_dump_json())], set())
+        assert _event(subscriber.drain())[1] == {"updated": [], "removed": ["1"]}
+
+    def test_filter_parsing(self):
+        assert _parse_stream_filter(None, None) is None
+        assert _parse_stream_filter("35,-88,36,-86", None) == (35, -88, 36, -86)
+        for bbox, market in (("35,-88,36", None), ("36,-88,35,-86", None), (None, "atlantis")):
+            with pytest.raises(HTTPException) as exc:
+                _parse_stream_filter(bbox, market)
+            assert exc.value.status_code == 400
+
+
+class TestBroadcast:
+    async def test_feed_update_sends_only_changed_vehicles_serialized_once(self):
+        await samsara._process_feed_update([_feed("1"), _feed("2")])
+        first, second = _SSESubscriber(), _SSESubscriber()
+        samsara._sse_clients.update((first, second))
+        assert [v["id"] for v in _event(first.snapshot(list(samsara._vehicle_store.values())))[1]] == ["1", "2"]
+
+        await samsara._process_feed_update([_feed("2", at=(35.7, -87.0))])
+
+        assert list(first.updated) == list(second.updated) == ["2"]
+        assert first.updated["2"] is second.updated["2"]
+        assert _event(first.drain())[1]["updated"][0]["location"]["lat"] == 35.7
+
+    async def test_full_fetch_reports_removed_vehicles(self, monkeypatch):
+        await samsara._process_feed_update([_feed("1"), _feed("2")])
+        subscriber = _SSESubscriber()
+        subscriber.snapshot(list(samsara._vehicle_store.values()))
+        samsara._sse_clients.add(subscriber)
+
+        kept = samsara._vehicle_store["1"]
+
+        async def fetch():
+            return [kept]
+
+        monkeypatch.setattr(samsara, "fetch_vehicles_from_samsara", fetch)
+        await samsara._do_full_fetch()
+
+        assert _event(subscriber.drain())[1] == {"updated": [], "removed": ["2"]}
+
+    def test_changes_from_other_workers_reach_local_clients_once(self):
+        subscriber = _SSESubscriber()
+        subscriber.snapshot([])
+        samsara._sse_clients.add(subscriber)
+        moved = _vehicle("1", at=(35.7, -87.0))
+        published = f"[{moved.model_dump_json()}]"
+
+        samsara._apply_published_changes(published, {"removed": []})
+        assert samsara._vehicle_store["1"] == moved
+        assert _event(subscriber.drain())[1]["updated"][0]["location"]["lat"] == 35.7
+
+        # The same change again (this worker's own poller saw it too): nothing new to send
+        samsara._apply_published_changes(published, {"removed": []})
+        samsara._apply_published_changes("[]", {"removed": ["1"]})
+        assert _event(subscriber.drain())[1] == {"updated": [], "removed": ["1"]}
+        assert samsara._vehicle_store == {}
@@ -149,3 +149,23 @@ def technician_factory():
 def invoice_factory():
     """Factory for generating invoice test data."""
     return InvoiceFactory
+
+
+@pytest.fixture(autouse=True)
+def _clear_phone_identity_cache():
+    """Caller-ID lookups are cached per process; keep tests independent."""
+    from app.services.phone_identity import phone_identity
+
+    phone_identity.clear()
+    yield
+    phone_identity.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_local_cache():
+    """The in-process cache tier outlives a test's database; start each test empty."""
+    from app.services.cache_service import get_cache_service
+
+    get_cache_service().clear_local()
+    yield
+    get_cache_service().clear_local()
@@ -0,0 +1,227 @@
+"""
+Tests for the durable AI job queue: idempotent enqueue, lease re-claim after a crash, backoff, dead letters,
+budget deferral and per-provider concurrency.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from uuid import uuid4
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "test-anthropic-key")
+os.environ.setdefault("DEEPGRAM_API_KEY", "test-deepgram-key")
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import Base
+from app.models.ai_job import AIJob
+from app.services.ai import queue as queue_module
+from app.services.ai.budget import BudgetPaused
+from app.services.ai.queue import AIJobQueue, enqueue_interaction_analysis, provider_slot, retry_dead_job
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    # A file database with a connection per session: the workers must not share one connection's transaction
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'ai_jobs.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[AIJob.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _not_paused():
+    return False
+
+
+@pytest_asyncio.fixture
+async def pool(sessions, monkeypatch):
+    """Build queues over the test database; the first one built is the process queue enqueue() writes through."""
+    built = []
+
+    def make(handler, **kwargs):
+        kwargs.setdefault("workers", 2)
+        kwargs.setdefault("poll_seconds", 0.05)
+        kwargs.setdefault("retry_base", 0.01)
+        kwargs.setdefault("budget_paused", _not_paused)
+        instance = AIJobQueue(handler=handler, session_factory=sessions, worker_id=f"worker-{len(built)}", **kwargs)
+        if not built:
+            monkeypatch.setattr(queue_module, "_queue", instance)
+        built.append(instance)
+        return instance
+
+    yield make
+    for instance in built:
+        if instance._tasks:
+            instance._inflight.clear()
+            for task in instance._tasks:
+                task.cancel()
+            await asyncio.gather(*instance._tasks, return_exceptions=True)
+
+
+async def _jobs(sessions):
+    async with sessions() as db:
+        return list((await db.execute(select(AIJob).order_by(AIJob.created_at))).scalars())
+
+
+async def _until(condition, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not await _holds(condition):
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.02)
+
+
+async def _holds(condition):
+    result = condition()
+    return await result if asyncio.iscoroutine(result) else result
+
+
+def _status(sessions, status, count=1):
+    async def check():
+        return sum(job.status == status for job in await _jobs(sessions)) == count
+    return check
+
+
+class Handler:
+    """A job body that records its calls; fails while `failures` lasts, or blocks until released."""
+
+    def __init__(self, failures=0, block=False, error=RuntimeError("anthropic 529")):
+        self.failures = failures
+        self.error = error
+        self.calls = []
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        if not block:
+            self.release.set()
+
+    async def __call__(self, source_id, channel):
+        self.calls.append((source_id, channel))
+        self.started.set()
+        await self.release.wait()
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+
+
+class TestEnqueue:
+    async def test_one_job_per_interaction(self, sessions, pool):
+        queue = pool(Handler())
+        source_id = uuid4()
+
+        await enqueue_interaction_analysis(source_id, "SMS")
+        await enqueue_interaction_analysis(source_id, "sms")
+        [job] = await _jobs(sessions)
+        assert (job.idempotency_key, job.status, job.attempts) == (f"sms:{source_id}", "queued", 0)
+
+        queue.start()
+        await _until(_status(sessions, "done"))
+        await enqueue_interaction_analysis(source_id, "sms")
+        [again] = await _jobs(sessions)
+        assert (again.id, again.status, again.attempts, again.finished_at) == (job.id, "queued", 0, None)
+        await queue.stop()
+
+
+class TestWorkers:
+    async def test_job_of_a_killed_worker_is_reclaimed_exactly_once(self, sessions, pool):
+        stuck = Handler(block=True)
+        crashed = pool(stuck, lease_seconds=0.3)
+        crashed.start()
+        await enqueue_interaction_analysis(uuid4(), "call")
+        await asyncio.wait_for(stuck.started.wait(), 5)
+
+        # The process dies mid-job: its tasks stop without releasing anything
+        for task in crashed._tasks:
+            task.cancel()
+        await asyncio.gather(*crashed._tasks, return_exceptions=True)
+        [job] = await _jobs(sessions)
+        assert (job.status, job.locked_by, job.attempts) == ("running", "worker-0", 1)
+
+        survivors = [pool(Handler(), workers=3, lease_seconds=0.3) for _ in range(2)]
+        for survivor in survivors:
+            survivor.start()
+        await _until(_status(sessions, "done"))
+        await asyncio.sleep(0.5)  # longer than a lease: a double claim would have shown by now
+
+        assert sum(len(s._handler.calls) for s in survivors) == 1
+        assert sum(s.stats["reclaimed"] for s in survivors) == 1
+        [job] = await _jobs(sessions)
+        assert (job.status, job.attempts, job.locked_by) == ("done", 2, None)
+        for survivor in survivors:
+            await survivor.stop()
+
+    async def test_failures_back_off_then_dead_letter_and_can_be_retried(self, sessions, pool):
+        handler = Handler(failures=3)
+        queue = pool(handler, max_attempts=3)
+        queue.start()
+        await enqueue_interaction_analysis(uuid4(), "email")
+
+        await _until(_status(sessions, "dead"))
+        [job] = await _jobs(sessions)
+        assert (len(handler.calls), job.attempts) == (3, 3)
+        assert "anthropic 529" in job.last_error
+        assert queue.stats["retried"] == 2
+
+        handler.failures = 0
+        async with sessions() as db:
+            await retry_dead_job(db, await db.get(AIJob, job.id))
+        await _until(_status(sessions, "done"))
+        assert len(handler.calls) == 4
+        await queue.stop()
+
+    async def test_spent_budget_defers_without_using_an_attempt(self, sessions, pool):
+        handler = Handler(failures=1, error=BudgetPaused("cap reached"))
+        queue = pool(handler)
+        queue.start()
+        await enqueue_interaction_analysis(uuid4(), "voicemail")
+
+        await _until(lambda: queue.stats["deferred"] == 1)
+        [job] = await _jobs(sessions)
+        assert (job.status, job.attempts) == ("queued", 0)
+        assert job.run_after.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        # ...and nothing more is claimed until the budget is checked again
+        assert await queue._paused()
+        await queue.stop()
+
+    async def test_graceful_stop_hands_running_jobs_back(self, sessions, pool):
+        stuck = Handler(block=True)
+        queue = pool(stuck)
+        queue.start()
+        await enqueue_interaction_analysis(uuid4(), "chat")
+        await asyncio.wait_for(stuck.started.wait(), 5)
+
+        await queue.stop(timeout=0.05)
+
+        [job] = await _jobs(sessions)
+        assert (job.status, job.attempts, job.locked_by) == ("queued", 0, None)
+
+    async def test_provider_calls_are_capped_across_workers(self, sessions, pool, monkeypatch):
+        monkeypatch.setattr(settings, "AI_ANTHROPIC_CONCURRENCY", 2)
+        monkeypatch.setattr(queue_module, "_provider_slots", {})
+        in_flight, peak = 0, 0
+
+        async def analyze(source_id, channel):
+            nonlocal in_flight, peak
+            async with provider_slot("anthropic"):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+
+        queue = pool(analyze, workers=6)
+        for _ in range(6):
+            await enqueue_interaction_analysis(uuid4(), "sms")
+        queue.start()
+
+        await _until(_status(sessions, "done", count=6))
+        assert peak == 2
+        await queue.stop()
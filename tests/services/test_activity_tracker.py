@@ -0,0 +1,155 @@
+"""
+Tests for the batched activity log writer.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest_asyncio
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.user_activity import UserActivityLog
+from app.services import activity_tracker
+from app.services.activity_tracker import ActivitySink, log_activity
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    """Session factory over SQLite with only user_activity_log, plus an INSERT log."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[UserActivityLog.__table__])
+
+    inserts: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _log(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            inserts.append(statement)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    factory.inserts = inserts
+    yield factory
+    await engine.dispose()
+
+
+async def _count(sessions) -> int:
+    async with sessions() as db:
+        return (await db.execute(select(func.count()).select_from(UserActivityLog))).scalar_one()
+
+
+def _row() -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "category": "action",
+        "action": "create",
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+@pytest_asyncio.fixture
+async def make_sink(sessions):
+    sinks = []
+
+    def make(**kwargs):
+        kwargs.setdefault("flush_interval", 0.05)
+        sink = ActivitySink(session_factory=sessions, **kwargs)
+        sinks.append(sink)
+        return sink
+
+    yield make
+    for sink in sinks:
+        await sink.stop()
+
+
+class TestBatching:
+    async def test_rows_are_written_in_multi_row_inserts(self, sessions, make_sink):
+        sink = make_sink(batch_size=4)
+        for _ in range(10):
+            assert sink.record(_row())
+        await sink.stop()
+
+        assert await _count(sessions) == 10
+        assert len(sessions.inserts) == 3
+        assert sink.stats["batches"] == 3
+        assert sink.stats["written"] == 10
+
+    async def test_partial_batch_is_written_after_flush_interval(self, sessions, make_sink):
+        sink = make_sink(batch_size=100)
+        sink.record(_row())
+        await asyncio.sleep(0.2)
+
+        assert await _count(sessions) == 1
+        await sink.stop()
+
+    async def test_flush_waits_for_buffered_rows(self, sessions, make_sink):
+        sink = make_sink(flush_interval=0.05)
+        for _ in range(4):
+            sink.record(_row())
+        await sink.flush()
+        assert await _count(sessions) == 4
+
+
+class TestBackpressure:
+    async def test_full_queue_drops_and_counts(self, sessions, make_sink):
+        sink = make_sink(max_queue=2)
+        # The writer cannot run until we yield, so the queue fills up
+        assert sink.record(_row())
+        assert sink.record(_row())
+        assert not sink.record(_row())
+        await sink.stop()
+
+        assert sink.stats["dropped"] == 1
+        assert await _count(sessions) == 2
+
+    async def test_rows_after_stop_are_dropped(self, make_sink):
+        sink = make_sink()
+        sink.record(_row())
+        await sink.stop()
+        assert not sink.record(_row())
+        assert not sink.running
+
+    async def test_failed_write_is_counted_and_writer_survives(self, make_sink):
+        calls = 0
+
+        class BrokenSession:
+            async def __aenter__(self):
+                nonlocal calls
+                calls += 1
+                raise ConnectionError("database unavailable")
+
+            async def __aexit__(self, *exc):
+                return False
+
+        sink = make_sink()
+        sink._session_factory = BrokenSession
+        sink.record(_row())
+        await sink.flush()
+        sink.record(_row())
+        await sink.stop()
+
+        assert calls == 2
+        assert sink.stats["failed"] == 2
+
+
+class TestLogActivity:
+    async def test_enqueues_on_shared_sink(self, sessions, make_sink, monkeypatch):
+        sink = make_sink()
+        monkeypatch.setattr(activity_tracker, "activity_sink", sink)
+
+        log_activity(category="auth", action="login", user_id=7, user_email="tess@example.com")
+        await sink.stop()
+
+        async with sessions() as db:
+            row = (await db.execute(select(UserActivityLog))).scalar_one()
+        assert (row.category, row.action, row.user_id) == ("auth", "login", 7)
+        assert row.created_at is not None
+
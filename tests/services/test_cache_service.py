@@ -0,0 +1,414 @@
+"""
+Tests for CacheService: tag-based invalidation, the in-process L1 tier,
+single-flight loading and payload codecs.
+
+Uses a small in-memory stand-in for the redis.asyncio client that implements
+only the commands CacheService issues.
+"""
+
+import asyncio
+import datetime as dt
+import fnmatch
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.core.metrics import get_registry
+from app.services import cache_codecs
+from app.services.cache_codecs import CodecError
+from app.services.cache_service import CacheService, NamespaceConfig, TAG_KEY_PREFIX, cached
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._ops = []
+
+    def set(self, key, value, nx=False):
+        self._ops.append(("set", key, value, nx))
+
+    def mget(self, keys):
+        self._ops.append(("mget", keys))
+
+    def incr(self, key):
+        self._ops.append(("incr", key))
+
+    async def execute(self):
+        results = []
+        for op in self._ops:
+            if op[0] == "set":
+                _, key, value, nx = op
+                results.append(await self._redis.set(key, value, nx=nx))
+            elif op[0] == "mget":
+                results.append(await self._redis.mget(op[1]))
+            else:
+                results.append(await self._redis.incr(op[1]))
+        self._ops = []
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.commands: list[str] = []
+
+    async def get(self, key):
+        self.commands.append("GET")
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.commands.append("SETEX")
+        self.data[key] = value
+
+    async def set(self, key, value, nx=False):
+        self.commands.append("SET")
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    async def mget(self, keys):
+        self.commands.append("MGET")
+        return [self.data.get(k) for k in keys]
+
+    async def incr(self, key):
+        self.commands.append("INCR")
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = str(value)
+        return value
+
+    async def delete(self, *keys):
+        self.commands.append("DEL")
+        return sum(1 for k in keys if self.data.pop(k, None) is not None)
+
+    async def scan_iter(self, match=None, count=None):
+        self.commands.append("SCAN")
+        for key in list(self.data):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def keys(self, pattern):  # pragma: no cover - must not be called
+        raise AssertionError("KEYS must not be used")
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def service():
+    svc = CacheService(redis_url="redis://fake")
+    svc._client = FakeRedis()
+    return svc
+
+
+class TestTaggedEntries:
+    async def test_untagged_roundtrip(self, service):
+        assert await service.set("plain", {"a": 1})
+        assert await service.get("plain") == {"a": 1}
+
+    async def test_tagged_roundtrip(self, service):
+        await service.set("workorders:list:1", {"items": [1, 2]}, tags=["workorders"])
+        assert await service.get("workorders:list:1") == {"items": [1, 2]}
+
+    async def test_invalidate_tag_evicts_entries(self, service):
+        await service.set("workorders:list:1", [1], tags=["workorders"])
+        await service.set("workorders:list:2", [2], tags=["workorders", "customer:abc"])
+        await service.set("customers:list:1", [3], tags=["customers"])
+
+        assert await service.invalidate_tags("workorders")
+
+        assert await service.get("workorders:list:1") is None
+        assert await service.get("workorders:list:2") is None
+        assert await service.get("customers:list:1") == [3]
+        assert service.get_stats()["stale"] == 2
+
+    async def test_invalidate_one_of_several_tags(self, service):
+        await service.set("k", "v", tags=["workorders", "customer:abc"])
+        await service.invalidate_tags("customer:abc")
+        assert await service.get("k") is None
+
+    async def test_entries_written_after_invalidation_are_fresh(self, service):
+        await service.set("k", "old", tags=["dashboard"])
+        await service.invalidate_tags("dashboard")
+        await service.set("k", "new", tags=["dashboard"])
+        assert await service.get("k") == "new"
+
+    async def test_missing_generation_counter_is_stale(self, service):
+        await service.set("k", "v", tags=["dashboard"])
+        # Simulate Redis evicting the counter
+        del service._client.data[f"{TAG_KEY_PREFIX}dashboard"]
+        assert await service.get("k") is None
+
+    async def test_invalidate_is_constant_time(self, service):
+        for i in range(50):
+            await service.set(f"workorders:list:{i}", i, tags=["workorders"])
+        service._client.commands.clear()
+
+        await service.invalidate_tags("workorders", "dashboard")
+
+        # One INCR per tag plus the global invalidation counter
+        assert service._client.commands == ["INCR", "INCR", "INCR"]
+
+
+class TestDeletePattern:
+    async def test_uses_scan_not_keys(self, service):
+        await service.set("customers:list:1", 1)
+        await service.set("customers:list:2", 2)
+        await service.set("technicians:list:1", 3)
+
+        assert await service.delete_pattern("customers:*") == 2
+        assert await service.get("customers:list:1") is None
+        assert await service.get("technicians:list:1") == 3
+
+
+class TestCachedDecorator:
+    async def test_callable_tags(self, service, monkeypatch):
+        monkeypatch.setattr("app.services.cache_service.get_cache_service", lambda: service)
+        calls = []
+
+        @cached(key_prefix="customers", tags=lambda customer_id: ["customers", f"customer:{customer_id}"])
+        async def load(customer_id):
+            calls.append(customer_id)
+            return {"id": customer_id}
+
+        assert await load("abc") == {"id": "abc"}
+        assert await load("abc") == {"id": "abc"}
+        assert calls == ["abc"]
+
+        await service.invalidate_tags("customer:abc")
+        assert await load("abc") == {"id": "abc"}
+        assert calls == ["abc", "abc"]
+
+
+@pytest.fixture
+def tiered():
+    svc = CacheService(
+        redis_url="redis://fake",
+        namespaces={
+            "dash": NamespaceConfig(l1_ttl=30, max_entries=2),
+            "tokens": NamespaceConfig(l1_ttl=60, max_entries=10, local=True),
+        },
+    )
+    svc._client = FakeRedis()
+    return svc
+
+
+class TestLocalTier:
+    async def test_l1_serves_repeat_reads_without_redis(self, tiered):
+        await tiered.set("dash:a", {"n": 1})
+        tiered._client.commands.clear()
+
+        assert await tiered.get("dash:a") == {"n": 1}
+        assert tiered._client.commands == []
+        assert tiered.get_stats()["namespaces"]["dash"]["l1_hits"] == 1
+
+    async def test_redis_hit_populates_l1(self, tiered):
+        await tiered.set("dash:a", 1)
+        tiered.clear_local()
+
+        assert await tiered.get("dash:a") == 1
+        assert await tiered.get("dash:a") == 1
+        stats = tiered.get_stats()["namespaces"]["dash"]
+        assert (stats["l2_hits"], stats["l1_hits"]) == (1, 1)
+
+    async def test_lru_eviction_is_counted(self, tiered):
+        for key in ("dash:a", "dash:b", "dash:c"):
+            await tiered.set(key, key)
+        stats = tiered.get_stats()["namespaces"]["dash"]
+        assert stats["l1_entries"] == 2
+        assert stats["evictions"] == 1
+
+    async def test_local_namespace_never_touches_redis(self, tiered):
+        await tiered.set("tokens:ms", "secret")
+        assert await tiered.get("tokens:ms") == "secret"
+        await tiered.delete("tokens:ms")
+        assert await tiered.get("tokens:ms") is None
+        assert tiered._client.commands == []
+
+    async def test_local_namespace_works_without_redis(self):
+        svc = CacheService(namespaces={"tokens": NamespaceConfig(l1_ttl=60, local=True)})
+        await svc.set("tokens:ms", "secret")
+        assert await svc.get("tokens:ms") == "secret"
+
+    async def test_invalidate_tags_drops_l1_entries(self, tiered):
+        await tiered.set("dash:a", 1, tags=["dashboard"])
+        await tiered.invalidate_tags("dashboard")
+        assert await tiered.get("dash:a") is None
+
+    async def test_stats_exported_through_metrics(self, tiered):
+        await tiered.set("dash:metrics", 1)
+        await tiered.get("dash:metrics")
+        await tiered.get("dash:missing")
+
+        text = get_registry().format_prometheus()
+        assert 'crm_cache_hits_total{namespace="dash",tier="l1"}' in text
+        assert 'crm_cache_misses_total{namespace="dash"}' in text
+
+
+class TestSingleFlight:
+    async def test_concurrent_misses_run_loader_once(self, tiered):
+        calls = 0
+        release = asyncio.Event()
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"v": 42}
+
+        tasks = [asyncio.create_task(tiered.get_or_load("dash:slow", loader)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == [{"v": 42}] * 10
+        assert calls == 1
+        assert tiered.get_stats()["namespaces"]["dash"]["coalesced"] == 9
+
+    async def test_loader_error_reaches_all_waiters_and_is_not_cached(self, tiered):
+        release = asyncio.Event()
+
+        async def loader():
+            await release.wait()
+            raise RuntimeError("upstream down")
+
+        tasks = [asyncio.create_task(tiered.get_or_load("dash:err", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await tiered.get("dash:err") is None
+
+    async def test_ttl_from_loaded_value(self, tiered):
+        async def loader():
+            return {"token": "abc", "expires_in": 120}
+
+        await tiered.get_or_load("tokens:t", loader, ttl=lambda v: v["expires_in"] - 60)
+        assert await tiered.get("tokens:t") == {"token": "abc", "expires_in": 120}
+
+    async def test_tags_from_loaded_value(self, tiered):
+        async def loader():
+            return {"id": 7, "client_id": 3}
+
+        await tiered.get_or_load("dash:tok", loader, tags=lambda v: [f"client:{v['client_id']}"])
+        tiered.invalidate_local_tags("client:3")
+        assert tiered.get_stats()["namespaces"]["dash"]["l1_entries"] == 0
+        await tiered.invalidate_tags("client:3")
+        assert await tiered.get("dash:tok") is None
+
+    async def test_invalidation_by_another_worker_during_load_wins(self, service):
+        loading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def loader():
+            loading.set()
+            await release.wait()
+            return {"status": "active"}
+
+        await service.set("warm", 1, tags=["customer:1"])  # counter exists before the load
+        task = asyncio.create_task(service.get_or_load("customer:1", loader, tags=["customer:1"]))
+        await loading.wait()
+        # Another worker commits a change and bumps the generation after our loader read the row
+        await service._client.incr(f"{TAG_KEY_PREFIX}customer:1")
+        release.set()
+
+        assert await task == {"status": "active"}
+        assert await service.get("customer:1") is None
+
+    async def test_local_invalidation_during_load_is_not_cached(self, tiered):
+        loading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def loader():
+            loading.set()
+            await release.wait()
+            return {"id": 7, "client_id": 3}
+
+        task = asyncio.create_task(tiered.get_or_load("dash:tok", loader, tags=lambda v: [f"client:{v['client_id']}"]))
+        await loading.wait()
+        await tiered.invalidate_tags("client:3")
+        release.set()
+
+        assert await task == {"id": 7, "client_id": 3}
+        assert tiered.get_stats()["namespaces"]["dash"]["l1_entries"] == 0
+        assert await tiered.get("dash:tok") is None
+        assert tiered._invalidated_during_loads == {}
+
+    async def test_tags_from_value_invalidated_by_another_worker_during_load(self, service):
+        loading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def loader():
+            loading.set()
+            await release.wait()
+            return {"id": 7, "client_id": 3}
+
+        task = asyncio.create_task(service.get_or_load("tok", loader, tags=lambda v: [f"client:{v['client_id']}"]))
+        await loading.wait()
+        other = CacheService(redis_url="redis://fake")
+        other._client = service._client
+        await other.invalidate_tags("client:3")
+        release.set()
+
+        assert await task == {"id": 7, "client_id": 3}
+        assert await service.get("tok") is None
+
+
+@pytest.fixture
+def coded():
+    pytest.importorskip("msgpack")
+    svc = CacheService(
+        redis_url="redis://fake",
+        namespaces={
+            "rows": NamespaceConfig(codec="msgpack", compress_min_bytes=256),
+            "plain": NamespaceConfig(),
+        },
+    )
+    svc._client = FakeRedis()
+    return svc
+
+
+class TestCodecs:
+    async def test_json_namespace_writes_legacy_format(self, service):
+        await service.set("plain:a", {"a": 1})
+        assert json.loads(service._client.data["plain:a"]) == {"a": 1}
+
+    async def test_legacy_text_entries_still_read(self, service):
+        service._client.data["old:json"] = '{"a": [1, 2]}'
+        service._client.data["old:text"] = "not json"
+        assert await service.get("old:json") == {"a": [1, 2]}
+        assert await service.get("old:text") == "not json"
+
+    async def test_msgpack_preserves_types(self, coded):
+        value = {
+            "when": dt.datetime(2026, 3, 1, 9, 30),
+            "day": dt.date(2026, 3, 1),
+            "amount": Decimal("12.50"),
+            7: "int key",
+        }
+        await coded.set("rows:typed", value, tags=["workorders"])
+        assert await coded.get("rows:typed") == value
+
+    async def test_large_payload_is_compressed(self, coded):
+        rows = [["123 Main St", "Austin", "TX", "pass"]] * 200
+        await coded.set("rows:big", rows)
+        raw = coded._client.data["rows:big"]
+        assert raw[3] & cache_codecs.FLAG_ZLIB
+        assert len(raw) < len(json.dumps(rows))
+        assert await coded.get("rows:big") == rows
+
+    async def test_unreadable_payload_is_a_miss_not_a_failure(self, coded):
+        coded._client.data["rows:future"] = bytes((cache_codecs.MAGIC, 99, 2, 0)) + b"..."
+        assert await coded.get("rows:future") is None
+        stats = coded.get_stats()
+        assert stats["decode_errors"] == 1
+        assert stats["failure_count"] == 0
+
+    def test_unknown_codec_id_raises(self):
+        with pytest.raises(CodecError):
+            cache_codecs.decode(bytes((cache_codecs.MAGIC, cache_codecs.FORMAT_VERSION, 42, 0)))
+
+    def test_unknown_codec_name_rejected(self):
+        with pytest.raises(ValueError):
+            CacheService(namespaces={"x": NamespaceConfig(codec="pickle")})
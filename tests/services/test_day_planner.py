@@ -0,0 +1,222 @@
+"""
+Tests for the multi-technician day planner: the solver (geo.vrp) and the
+proposal / accept flow (services.day_planner).
+"""
+
+import random
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.customer import Customer
+from app.models.dispatch_plan import DispatchPlan
+from app.models.technician import Technician
+from app.models.work_order import WorkOrder
+from app.services.day_planner import accept_day_plan, create_day_plan, run_day_plan
+from app.services.geo import PlanTechnician, RouteStop, plan_day, plan_route
+
+WEST = (35.60, -87.40)
+EAST = (35.60, -86.70)
+
+
+def _town(rng, center, n, prefix, **kwargs):
+    return [
+        RouteStop(
+            f"{prefix}-{i}",
+            center[0] + rng.uniform(-0.05, 0.05),
+            center[1] + rng.uniform(-0.05, 0.05),
+            service_minutes=30,
+            **kwargs,
+        )
+        for i in range(n)
+    ]
+
+
+class TestPlanDay:
+    def test_jobs_go_to_the_nearby_technician(self):
+        rng = random.Random(3)
+        stops = _town(rng, WEST, 6, "west") + _town(rng, EAST, 6, "east")
+        rng.shuffle(stops)
+        crew = [PlanTechnician("w", *WEST), PlanTechnician("e", *EAST)]
+
+        day = plan_day(stops, crew, time_limit=2)
+
+        assert day.unassigned == []
+        assert {s.id.split("-")[0] for s in day.routes["w"].stops} == {"west"}
+        assert {s.id.split("-")[0] for s in day.routes["e"].stops} == {"east"}
+
+        # Round-robin (the old auto_dispatch) sends both technicians across the county
+        round_robin = sum(
+            plan_route(stops[i::2], (t.lat, t.lng), (t.lat, t.lng)).distance_miles for i, t in enumerate(crew)
+        )
+        assert day.distance_miles < round_robin / 2
+
+    def test_skills_are_required(self):
+        rng = random.Random(5)
+        stops = _town(rng, WEST, 3, "repair", skill="repair") + _town(rng, WEST, 3, "pump", skill="pumping")
+        crew = [
+            PlanTechnician("pumper", *WEST, skills=frozenset({"pumping"})),
+            PlanTechnician("anyone", *EAST),
+        ]
+
+        day = plan_day(stops, crew, time_limit=1)
+
+        assert day.unassigned == []
+        assert all(s.skill == "pumping" for s in day.routes["pumper"].stops)
+        assert {s.id for s in day.routes["anyone"].stops} >= {"repair-0", "repair-1", "repair-2"}
+
+    def test_windows_and_shift_are_hard_limits(self):
+        rng = random.Random(7)
+        stops = _town(rng, WEST, 8, "job")
+        for stop in stops:
+            stop.service_minutes = 60
+        stops[0].window_start, stops[0].window_end = 13 * 60, 14 * 60
+        crew = [PlanTechnician("solo", *WEST, shift_minutes=5 * 60)]
+
+        day = plan_day(stops, crew, time_limit=1)
+
+        route = day.routes["solo"]
+        assert len(route.stops) + len(day.unassigned) == 8
+        assert len(day.unassigned) >= 3  # eight hours of work in a five-hour shift
+        assert route.late_minutes == 0
+        assert day.duration_minutes["solo"] <= 5 * 60
+        assert route.finish_minute <= 8 * 60 + 5 * 60
+
+    def test_load_is_balanced(self):
+        rng = random.Random(9)
+        # Everything in one town between two technicians who live there
+        stops = _town(rng, WEST, 12, "job")
+        crew = [PlanTechnician("a", *WEST), PlanTechnician("b", WEST[0] + 0.01, WEST[1])]
+
+        day = plan_day(stops, crew, time_limit=2)
+
+        counts = sorted(len(route.stops) for route in day.routes.values())
+        assert counts[0] >= 5
+        durations = list(day.duration_minutes.values())
+        assert max(durations) - min(durations) < 60
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    """Session factory over SQLite with the tables the planner reads and writes."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tables = [Customer.__table__, Technician.__table__, WorkOrder.__table__, DispatchPlan.__table__]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestDayPlanner:
+    DAY = date(2026, 3, 2)
+
+    @pytest_asyncio.fixture
+    async def crew(self, sessions):
+        async with sessions() as db:
+            customer = Customer(id=uuid.uuid4(), first_name="Pat", last_name="Lee")
+            west = Technician(
+                id=uuid.uuid4(), first_name="Wes", last_name="T", home_latitude=WEST[0], home_longitude=WEST[1],
+                skills=["pumping"], is_active=True,
+            )
+            east = Technician(
+                id=uuid.uuid4(), first_name="Eve", last_name="S", home_latitude=EAST[0], home_longitude=EAST[1],
+                skills=["pumping", "repair"], is_active=True,
+            )
+            db.add_all([customer, west, east])
+            jobs = {}
+            for name, (lat, lng), job_type in [
+                ("west-1", (35.61, -87.39), "pumping"),
+                ("west-2", (35.59, -87.41), "pumping"),
+                ("west-repair", (35.60, -87.38), "repair"),
+                ("east-1", (35.61, -86.71), "pumping"),
+            ]:
+                wo = WorkOrder(
+                    id=uuid.uuid4(), customer_id=customer.id, job_type=job_type, status="pending",
+                    scheduled_date=self.DAY, service_latitude=lat, service_longitude=lng,
+                    estimated_duration_hours=1.0,
+                )
+                jobs[name] = wo
+            jobs["west-1"].time_window_start = time(9, 0)
+            jobs["nowhere"] = WorkOrder(
+                id=uuid.uuid4(), customer_id=customer.id, job_type="pumping", status="pending",
+                scheduled_date=self.DAY,
+            )
+            db.add_all(jobs.values())
+            await db.commit()
+        return {"west": str(west.id), "east": str(east.id), "jobs": {k: str(v.id) for k, v in jobs.items()}}
+
+    async def test_proposes_without_assigning(self, sessions, crew):
+        async with sessions() as db:
+            plan = await create_day_plan(db, self.DAY, time_limit=1, created_by="dispatcher@example.com")
+        plan = await run_day_plan(plan.id, session_maker=sessions)
+
+        assert plan.status == "proposed"
+        by_job = {a["work_order_id"]: a for a in plan.assignments}
+        jobs = crew["jobs"]
+        assert by_job[jobs["west-1"]]["technician_id"] == crew["west"]
+        assert by_job[jobs["west-2"]]["technician_id"] == crew["west"]
+        # Only the east technician can do repairs
+        assert by_job[jobs["west-repair"]]["technician_id"] == crew["east"]
+        assert plan.unassigned == [{"work_order_id": jobs["nowhere"], "reason": "no coordinates"}]
+        assert plan.summary["assigned_count"] == 4
+        # Arrives early, waits for the 09:00 window and works an hour
+        assert by_job[jobs["west-1"]]["departure"] == "10:00"
+
+        async with sessions() as db:
+            assigned = await db.execute(select(WorkOrder).where(WorkOrder.technician_id.isnot(None)))
+            assert assigned.scalars().all() == []
+
+    async def test_accept_assigns_and_skips_changed_jobs(self, sessions, crew):
+        async with sessions() as db:
+            first = await create_day_plan(db, self.DAY, time_limit=1)
+        first = await run_day_plan(first.id, session_maker=sessions)
+        async with sessions() as db:
+            plan = await create_day_plan(db, self.DAY, time_limit=1)
+        plan = await run_day_plan(plan.id, session_maker=sessions)
+
+        async with sessions() as db:
+            assert (await db.get(DispatchPlan, first.id)).status == "superseded"
+            # A dispatcher assigns one job by hand before the plan is accepted
+            by_hand = await db.get(WorkOrder, uuid.UUID(crew["jobs"]["east-1"]))
+            by_hand.technician_id = uuid.UUID(crew["west"])
+            await db.commit()
+
+            result = await accept_day_plan(db, await db.get(DispatchPlan, plan.id), accepted_by="lead@example.com")
+
+            assert result["skipped"] == [crew["jobs"]["east-1"]]
+            assert len(result["assigned"]) == 3
+            repair = await db.get(WorkOrder, uuid.UUID(crew["jobs"]["west-repair"]))
+            assert str(repair.technician_id) == crew["east"]
+            assert repair.assigned_technician == "Eve S"
+            assert repair.status == "scheduled"
+            assert (await db.get(WorkOrder, uuid.UUID(crew["jobs"]["east-1"]))).technician_id == uuid.UUID(crew["west"])
+
+            with pytest.raises(ValueError):
+                await accept_day_plan(db, await db.get(DispatchPlan, plan.id))
+
+    async def test_stale_planning_rows_are_failed_by_next_run(self, sessions, crew):
+        async with sessions() as db:
+            lost = DispatchPlan(
+                plan_date=self.DAY, status="planning",
+                created_at=datetime.now(timezone.utc) - timedelta(hours=1),
+            )
+            running = DispatchPlan(plan_date=self.DAY, status="planning", created_at=datetime.now(timezone.utc))
+            db.add_all([lost, running])
+            await db.commit()
+
+            await create_day_plan(db, self.DAY, time_limit=1)
+
+            assert (await db.get(DispatchPlan, lost.id)).status == "failed"
+            assert (await db.get(DispatchPlan, lost.id)).error
+            # A plan still within the TTL may be running in another worker
+            assert (await db.get(DispatchPlan, running.id)).status == "planning"
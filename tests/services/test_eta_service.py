@@ -0,0 +1,195 @@
+"""
+Tests for the ETA engine: estimates, push updates from GPS ingest, and the cache.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.customer import Customer
+from app.api.v2 import gps_tracking
+from app.models.gps_tracking import (
+    CustomerTrackingLink,
+    Geofence,
+    GeofenceEvent,
+    LocationHistory,
+    TechnicianLocation,
+)
+from app.models.technician import Technician
+from app.models.work_order import WorkOrder
+from app.schemas.gps_tracking import LocationUpdate
+from app.services import eta_service, gps_ingest, technician_state
+from app.services.eta_service import ETAEngine, cached_eta, estimate_duration, get_eta, traffic_factor
+from app.services.gps_ingest import GPSIngest, ingest_locations
+from app.services.technician_state import TechnicianState
+
+JOB = (35.6145, -87.0353)
+HOME = (35.70, -87.0353)
+
+
+@pytest_asyncio.fixture
+async def sessions(monkeypatch):
+    monkeypatch.setattr(eta_service, "_engine", ETAEngine())
+    monkeypatch.setattr(gps_ingest, "_ingest", GPSIngest())
+    monkeypatch.setattr(technician_state, "_state", TechnicianState())
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tables = [
+        Customer.__table__,
+        Technician.__table__,
+        WorkOrder.__table__,
+        TechnicianLocation.__table__,
+        LocationHistory.__table__,
+        Geofence.__table__,
+        GeofenceEvent.__table__,
+        CustomerTrackingLink.__table__,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def broadcasts(monkeypatch):
+    sent = []
+
+    async def broadcast_event(event_type, data, **kwargs):
+        sent.append((event_type, data))
+        return 1
+
+    monkeypatch.setattr(eta_service.manager, "broadcast_event", broadcast_event)
+    return sent
+
+
+@pytest_asyncio.fixture
+async def job(sessions):
+    async with sessions() as db:
+        customer = Customer(id=uuid.uuid4(), first_name="Pat", last_name="Lee", latitude=JOB[0], longitude=JOB[1])
+        tech = Technician(
+            id=uuid.uuid4(), first_name="Nia", last_name="R", home_latitude=HOME[0], home_longitude=HOME[1],
+            is_active=True,
+        )
+        wo = WorkOrder(
+            id=uuid.uuid4(), customer_id=customer.id, job_type="pumping", status="enroute",
+            scheduled_date=date.today(), technician_id=tech.id,
+        )
+        db.add_all([customer, tech, wo])
+        await db.commit()
+    return {"work_order_id": str(wo.id), "technician_id": tech.id}
+
+
+def _at(lat, lng, speed=None):
+    return LocationUpdate(latitude=lat, longitude=lng, speed=speed, captured_at=datetime.utcnow())
+
+
+class TestEstimates:
+    def test_duration_uses_plausible_speed_or_distance_band(self):
+        assert estimate_duration(10, 60) == 10
+        assert estimate_duration(10, 2) == int(10 / 45 * 60)
+        assert estimate_duration(2, None) == int(2 / 25 * 60)
+        assert estimate_duration(40, None) == int(40 / 55 * 60)
+        assert estimate_duration(0.01, None) == 1
+
+    def test_traffic_factor(self):
+        assert traffic_factor(datetime(2026, 3, 2, 14)) == 1.4
+        assert traffic_factor(datetime(2026, 3, 2, 18)) == 1.1
+        assert traffic_factor(datetime(2026, 3, 2, 8)) == 1.0
+
+
+class TestETAEngine:
+    async def test_gps_ingest_pushes_estimates(self, sessions, job, broadcasts):
+        tech = job["technician_id"]
+        async with sessions() as db:
+            await ingest_locations(db, [(tech, _at(JOB[0] + 0.1, JOB[1], speed=40))])
+
+        eta = await cached_eta(job["work_order_id"])
+        assert eta["distance_miles"] == pytest.approx(6.9, abs=0.05)
+        assert eta["duration_minutes"] == 10
+        assert eta["calculation_source"] == "internal:gps"
+        assert broadcasts == [("eta_updated", eta)]
+
+        # A few meters later: not worth a new estimate
+        async with sessions() as db:
+            await ingest_locations(db, [(tech, _at(JOB[0] + 0.0999, JOB[1], speed=40))])
+        assert len(broadcasts) == 1
+
+        # Half a mile closer: re-estimated
+        async with sessions() as db:
+            await ingest_locations(db, [(tech, _at(JOB[0] + 0.09, JOB[1], speed=40))])
+        assert len(broadcasts) == 2
+        assert (await cached_eta(job["work_order_id"]))["distance_miles"] == pytest.approx(6.2, abs=0.05)
+
+    async def test_get_eta_computes_once_on_a_miss(self, sessions, job, broadcasts):
+        assert await cached_eta(job["work_order_id"]) is None
+
+        async with sessions() as db:
+            first = await get_eta(db, job["work_order_id"])
+            again = await get_eta(db, job["work_order_id"])
+
+        # No GPS yet, so the estimate starts from the technician's home
+        assert first["calculation_source"] == "internal:home"
+        assert first["confidence"] == 0.5
+        assert again == first
+        assert len(broadcasts) == 1
+
+    async def test_unknown_or_unassigned_work_orders(self, sessions, job, broadcasts):
+        async with sessions() as db:
+            assert await get_eta(db, str(uuid.uuid4())) is None
+            assert await get_eta(db, "not-a-uuid") is None
+            wo = await db.get(WorkOrder, uuid.UUID(job["work_order_id"]))
+            wo.technician_id = None
+            await db.commit()
+            assert await get_eta(db, job["work_order_id"], recalculate=True) is None
+
+    async def test_eta_endpoint_uses_the_engine(self, sessions, job, broadcasts):
+        async with sessions() as db:
+            eta = await gps_tracking.get_eta(job["work_order_id"], recalculate=False, db=db, current_user=None)
+        assert eta["work_order_id"] == job["work_order_id"]
+
+
+class TestPublicTracking:
+    async def _link(self, db, job):
+        wo = await db.get(WorkOrder, uuid.UUID(job["work_order_id"]))
+        link = CustomerTrackingLink(
+            token="tok", work_order_id=wo.id, customer_id=wo.customer_id, technician_id=job["technician_id"],
+            expires_at=datetime.utcnow() + timedelta(hours=1),
+        )
+        db.add(link)
+        await db.commit()
+        return wo
+
+    async def test_shows_destination_and_pushed_eta(self, sessions, job, broadcasts, monkeypatch):
+        monkeypatch.setattr(gps_tracking, "rate_limit_by_ip", _no_rate_limit)
+        async with sessions() as db:
+            await self._link(db, job)
+            await ingest_locations(db, [(job["technician_id"], _at(JOB[0] + 0.1, JOB[1], speed=40))])
+            info = await gps_tracking.get_public_tracking(None, "tok", db)
+
+        assert (info.destination_latitude, info.destination_longitude) == pytest.approx(JOB)
+        assert info.eta_minutes is not None
+
+    async def test_no_destination_or_eta_when_not_geocoded(self, sessions, job, broadcasts, monkeypatch):
+        monkeypatch.setattr(gps_tracking, "rate_limit_by_ip", _no_rate_limit)
+        async with sessions() as db:
+            wo = await self._link(db, job)
+            customer = await db.get(Customer, wo.customer_id)
+            customer.latitude = customer.longitude = None
+            await db.commit()
+            info = await gps_tracking.get_public_tracking(None, "tok", db)
+
+        assert info.destination_latitude is None and info.destination_longitude is None
+        assert info.eta_minutes is None and info.distance_miles is None
+        assert info.status == "en_route"
+
+
+async def _no_rate_limit(request, requests_per_minute=None):
+    return None
@@ -0,0 +1,402 @@
+"""
+Tests for the geo engine: vectorized distances, the grid index, stop ordering and clustering.
+"""
+
+import random
+import threading
+import uuid
+from types import SimpleNamespace
+from datetime import date, time
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.work_order import WorkOrder
+from app.services.geo import (
+    Fence,
+    FenceSet,
+    GeoIndex,
+    RouteStop,
+    bounding_box,
+    cluster_radius_for_zoom,
+    distance_matrix,
+    grid_clusters,
+    haversine_miles,
+    haversine_pairs,
+    haversine_to_many,
+    job_clusters,
+    minutes_of_day,
+    nearest_neighbor_order,
+    plan_route,
+    route_length,
+    schedule_route,
+)
+
+NASHVILLE = (36.1627, -86.7816)
+COLUMBIA = (35.6145, -87.0353)
+
+
+def _points(n, seed=7, center=COLUMBIA, spread=1.5):
+    rng = random.Random(seed)
+    return [(center[0] + rng.uniform(-spread, spread), center[1] + rng.uniform(-spread, spread)) for _ in range(n)]
+
+
+class TestDistance:
+    def test_known_distance(self):
+        assert haversine_miles(*COLUMBIA, *NASHVILLE) == pytest.approx(40.45, abs=0.05)
+        assert haversine_miles(*COLUMBIA, *COLUMBIA) == 0.0
+
+    def test_vectorized_matches_scalar(self):
+        points = _points(50)
+        lats, lngs = zip(*points)
+        to_many = haversine_to_many(*NASHVILLE, lats, lngs)
+        matrix = distance_matrix(lats, lngs)
+
+        for i, (lat, lng) in enumerate(points):
+            assert to_many[i] == pytest.approx(haversine_miles(*NASHVILLE, lat, lng))
+            assert matrix[0, i] == pytest.approx(haversine_miles(*points[0], lat, lng))
+        assert matrix.shape == (50, 50)
+        np.testing.assert_allclose(matrix, matrix.T)
+
+    def test_pairs(self):
+        miles = haversine_pairs([COLUMBIA[0], np.nan], [COLUMBIA[1], 0.0], [NASHVILLE[0]] * 2, [NASHVILLE[1]] * 2)
+        assert miles[0] == pytest.approx(haversine_miles(*COLUMBIA, *NASHVILLE))
+        assert np.isnan(miles[1])
+
+    def test_rectangular_matrix(self):
+        matrix = distance_matrix([COLUMBIA[0]], [COLUMBIA[1]], [NASHVILLE[0], COLUMBIA[0]], [NASHVILLE[1], COLUMBIA[1]])
+        assert matrix.shape == (1, 2)
+        assert matrix[0, 1] == 0.0
+
+    @pytest.mark.parametrize("lat", [0.0, 45.0, 70.0, -60.0])
+    def test_bounding_box_contains_the_circle(self, lat):
+        lng, radius = -93.0, 50.0
+        min_lat, min_lng, max_lat, max_lng = bounding_box(lat, lng, radius)
+        # Points exactly `radius` away along every bearing (spherical destination formula)
+        delta = radius / 3958.8
+        phi, lam = np.radians(lat), np.radians(lng)
+        bearings = np.linspace(0, 2 * np.pi, 360)
+        phi2 = np.arcsin(np.sin(phi) * np.cos(delta) + np.cos(phi) * np.sin(delta) * np.cos(bearings))
+        lam2 = lam + np.arctan2(
+            np.sin(bearings) * np.sin(delta) * np.cos(phi), np.cos(delta) - np.sin(phi) * np.sin(phi2)
+        )
+        lats, lngs = np.degrees(phi2), np.degrees(lam2)
+        np.testing.assert_allclose(haversine_to_many(lat, lng, lats, lngs), radius)
+        assert np.all((lats >= min_lat - 1e-9) & (lats <= max_lat + 1e-9))
+        assert np.all((lngs >= min_lng - 1e-9) & (lngs <= max_lng + 1e-9))
+
+
+class TestGeoIndex:
+    @pytest.fixture
+    def points(self):
+        return _points(2000)
+
+    @pytest.fixture
+    def index(self, points):
+        lats, lngs = zip(*points)
+        return GeoIndex(lats, lngs, cell_miles=4.0)
+
+    def test_within_radius_matches_brute_force(self, points, index):
+        for lat, lng, radius in [(*COLUMBIA, 10), (*COLUMBIA, 0.5), (35.0, -86.0, 40), (40.0, -80.0, 5)]:
+            distances = [(haversine_miles(lat, lng, *p), i) for i, p in enumerate(points)]
+            expected = sorted((d, i) for d, i in distances if d <= radius)
+            found = index.within_radius(lat, lng, radius)
+            assert [i for i, _ in found] == [i for _, i in expected]
+            assert [d for _, d in found] == pytest.approx([d for d, _ in expected])
+
+    def test_nearest(self, points, index):
+        lat, lng = 35.9, -86.6
+        expected = sorted(range(len(points)), key=lambda i: haversine_miles(lat, lng, *points[i]))[:5]
+        assert [i for i, _ in index.nearest(lat, lng, k=5)] == expected
+
+        # Far from every point: the search keeps widening until it finds one
+        (item, miles), = index.nearest(0.0, 0.0)
+        assert item == min(range(len(points)), key=lambda i: haversine_miles(0.0, 0.0, *points[i]))
+        assert miles > 5000
+
+    def test_nearest_respects_max_miles(self, index):
+        assert index.nearest(0.0, 0.0, k=3, max_miles=100) == []
+        assert len(index.nearest(*COLUMBIA, k=len(index) + 10)) == len(index)
+
+    def test_within_bbox(self, points, index):
+        box = (35.5, -87.2, 35.8, -86.9)
+        expected = [
+            i for i, (lat, lng) in enumerate(points) if box[0] <= lat <= box[2] and box[1] <= lng <= box[3]
+        ]
+        assert sorted(index.within_bbox(*box)) == expected
+
+    def test_records_without_coordinates_are_skipped(self):
+        records = [
+            {"id": "a", "lat": 35.6, "lng": -87.0},
+            {"id": "b", "lat": None, "lng": -87.0},
+            {"id": "c", "lat": 35.7, "lng": -87.1},
+        ]
+        index = GeoIndex.from_records(records)
+        assert len(index) == 2
+        assert [r["id"] for r, _ in index.within_radius(35.6, -87.0, 20)] == ["a", "c"]
+
+    def test_empty_index(self):
+        index = GeoIndex([], [])
+        assert index.within_radius(*COLUMBIA, 100) == []
+        assert index.nearest(*COLUMBIA, k=3) == []
+        assert index.within_bbox(-90, -180, 90, 180) == []
+
+
+class TestFenceSet:
+    def test_matches_single_point_checks(self):
+        from app.services.gps_tracking_service import GPSTrackingService
+
+        square = [[35.60, -87.05], [35.60, -87.00], [35.65, -87.00], [35.65, -87.05]]
+        triangle = [[35.70, -87.10], [35.80, -87.10], [35.70, -86.95]]
+        fences = FenceSet([
+            Fence("yard", *COLUMBIA, radius_meters=2000),
+            Fence("square", polygon=square),
+            Fence("triangle", polygon=triangle),
+            Fence("broken", polygon=[[35.6, -87.0]]),
+        ])
+        assert [f.id for f in fences.fences] == ["yard", "square", "triangle"]
+
+        points = _points(3000, spread=0.2)
+        lats, lngs = zip(*points)
+        inside = fences.contains(lats, lngs)
+
+        check = GPSTrackingService(db=None)
+        yard = [haversine_miles(lat, lng, *COLUMBIA) * 1609.344 <= 2000 for lat, lng in points]
+        assert inside[:, 0].tolist() == yard
+        assert inside[:, 1].tolist() == [check._point_in_polygon(lat, lng, square) for lat, lng in points]
+        assert inside[:, 2].tolist() == [check._point_in_polygon(lat, lng, triangle) for lat, lng in points]
+        assert inside.any(axis=0).all()
+
+    def test_empty(self):
+        assert FenceSet([]).contains([35.6], [-87.0]).shape == (1, 0)
+
+
+class TestRouting:
+    def test_nearest_neighbor_order(self):
+        # Start at 0, stops strung out along a line in shuffled order
+        lats = [30.0, 30.3, 30.1, 30.4, 30.2]
+        matrix = distance_matrix(lats, [-97.0] * 5)
+        order = nearest_neighbor_order(matrix)
+        assert order == [2, 4, 1, 3]
+        assert route_length(matrix, order) == pytest.approx(haversine_miles(30.0, -97.0, 30.4, -97.0))
+
+    def test_improves_on_nearest_neighbor(self):
+        stops = [RouteStop(str(i), lat, lng) for i, (lat, lng) in enumerate(_points(60, spread=0.3))]
+        plan = plan_route(stops, COLUMBIA, COLUMBIA)
+
+        assert sorted(plan.order) == list(range(60))
+        assert plan.distance_miles < plan.seed_distance_miles
+        matrix = distance_matrix(*zip(COLUMBIA, *((s.lat, s.lng) for s in stops)))
+        assert plan.distance_miles < route_length(matrix, [*nearest_neighbor_order(matrix), 0])
+
+    def test_time_windows_respected(self):
+        # Nearest neighbour would take "late" first (0.7 mi away) and be hours early
+        stops = [
+            RouteStop.with_window("late", 30.01, -97.0, time(13, 0), service_minutes=30),
+            RouteStop.with_window("early", 30.5, -97.0, "09:00", "10:00", service_minutes=30),
+            RouteStop("on-the-way", 30.2, -97.0, service_minutes=30),
+            RouteStop("after", 29.7, -97.0, service_minutes=30),
+        ]
+        plan = plan_route(stops, (30.0, -97.0), depart_minute=8 * 60)
+
+        ids = [s.id for s in plan.stops]
+        assert ids.index("early") < ids.index("late")
+        assert plan.late_minutes == 0
+        early = plan.legs[ids.index("early")]
+        assert 9 * 60 <= early.arrival_minute + early.wait_minutes <= 10 * 60
+
+    def test_legs_and_end_depot(self):
+        stops = [RouteStop("a", 30.1, -97.0, service_minutes=20), RouteStop("b", 30.2, -97.0, service_minutes=20)]
+        plan = schedule_route(stops, (30.0, -97.0), (30.0, -97.0), depart_minute=7 * 60 + 30)
+
+        assert [leg.stop_id for leg in plan.legs] == ["a", "b", None]
+        assert plan.distance_miles == pytest.approx(2 * haversine_miles(30.0, -97.0, 30.2, -97.0))
+        # 30 mph: two minutes a mile
+        assert plan.drive_minutes == pytest.approx(plan.distance_miles * 2)
+        first, second, home = plan.legs
+        assert first.arrival_minute == pytest.approx(450 + first.drive_minutes)
+        assert second.arrival_minute == pytest.approx(first.departure_minute + second.drive_minutes)
+        assert first.departure_minute == pytest.approx(first.arrival_minute + 20)
+        assert plan.finish_minute == pytest.approx(home.arrival_minute)
+        assert first.as_dict()["eta"] == "07:44"
+
+    def test_window_parsing(self):
+        stop = RouteStop.with_window("x", 30.0, -97.0, "09:30")
+        assert (stop.window_start, stop.window_end) == (570, 690)
+        assert minutes_of_day(time(13, 15)) == 795
+        assert minutes_of_day("soon") is None
+        assert RouteStop.with_window("y", 30.0, -97.0, None).window_end is None
+
+
+class TestOptimizeRouteEndpoint:
+    async def test_search_runs_off_the_event_loop_with_a_capped_budget(self, monkeypatch):
+        from app.api.v2 import work_orders
+
+        calls = []
+
+        def recording_plan_route(*args, **kwargs):
+            calls.append((threading.current_thread() is threading.main_thread(), kwargs["time_budget"]))
+            return plan_route(*args, **kwargs)
+
+        monkeypatch.setattr(work_orders, "plan_route", recording_plan_route)
+        monkeypatch.setattr(work_orders.settings, "ROUTE_OPTIMIZE_MAX_BUDGET", 0.2)
+        order = SimpleNamespace(
+            id=uuid.uuid4(), service_latitude=30.1, service_longitude=-97.0, time_window_start=None,
+            time_window_end=None, estimated_duration_hours=1, service_address_line1="1 Main St", service_city="Austin",
+            service_state="TX", service_postal_code="78701",
+        )
+
+        class _Db:
+            async def execute(self, query):
+                return SimpleNamespace(all=lambda: [(order, None)])
+
+        request = work_orders.RouteOptimizeRequest(
+            job_ids=[str(order.id)], start_lat=30.0, start_lng=-97.0, time_budget=5
+        )
+        response = await work_orders.optimize_route(request, _Db(), None)
+
+        assert response.ordered_job_ids == [str(order.id)]
+        assert calls == [(False, 0.2)]
+
+
+class TestGridClusters:
+    def test_every_point_lands_in_one_cluster(self):
+        points = _points(3000, spread=1.0)
+        lats, lngs = zip(*points)
+        clusters = grid_clusters(lats, lngs, radius_miles=5)
+
+        members = np.concatenate([c.members for c in clusters])
+        assert sorted(members.tolist()) == list(range(len(points)))
+        assert [len(c.members) for c in clusters] == sorted((len(c.members) for c in clusters), reverse=True)
+        for cluster in clusters:
+            assert cluster.center_lat == pytest.approx(np.mean(np.asarray(lats)[cluster.members]))
+
+    def test_separate_groups_stay_apart(self):
+        town_a = [(35.60 + i * 0.001, -87.03) for i in range(5)]
+        town_b = [(36.16, -86.78 + i * 0.001) for i in range(3)]
+        lats, lngs = zip(*(town_a + town_b))
+        clusters = grid_clusters(lats, lngs, radius_miles=5)
+
+        assert [sorted(c.members.tolist()) for c in clusters] == [[0, 1, 2, 3, 4], [5, 6, 7]]
+        assert clusters[1].center_lat == pytest.approx(36.16)
+
+    def test_empty_and_zero_radius(self):
+        assert grid_clusters([], [], 5) == []
+        assert len(grid_clusters([35.0, 35.0], [-87.0, -87.0], 0)) == 2
+
+    def test_radius_shrinks_with_zoom(self):
+        assert cluster_radius_for_zoom(10, 35.6) == pytest.approx(2 * cluster_radius_for_zoom(11, 35.6))
+        # 60 px at zoom 10 near Columbia, TN is a bit under 5 miles
+        assert cluster_radius_for_zoom(10, 35.6) == pytest.approx(4.63, abs=0.01)
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    """Session factory over SQLite with only work_orders, plus a SELECT log."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[WorkOrder.__table__])
+
+    selects: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _log(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            selects.append(statement)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    factory.selects = selects
+    yield factory
+    await engine.dispose()
+
+
+class TestJobClusters:
+    DAY = date(2026, 3, 2)
+    OTHER_DAY = date(2026, 3, 3)
+
+    @pytest_asyncio.fixture
+    async def jobs(self, sessions):
+        rows = [
+            (self.DAY, 35.600, -87.030),
+            (self.DAY, 35.601, -87.031),
+            (self.DAY, 36.160, -86.780),
+            (self.OTHER_DAY, 35.600, -87.030),
+            (self.DAY, None, None),
+        ]
+        async with sessions() as db:
+            jobs = [
+                WorkOrder(
+                    id=uuid.uuid4(),
+                    customer_id=uuid.uuid4(),
+                    job_type="pumping",
+                    status="scheduled",
+                    scheduled_date=day,
+                    service_latitude=lat,
+                    service_longitude=lng,
+                )
+                for day, lat, lng in rows
+            ]
+            db.add_all(jobs)
+            await db.commit()
+        sessions.selects.clear()
+        return jobs
+
+    async def test_clusters_are_cached_per_day(self, sessions, jobs):
+        async with sessions() as db:
+            result = await job_clusters(db, self.DAY, radius_miles=5)
+            again = await job_clusters(db, self.DAY, radius_miles=5)
+
+        assert [c["job_count"] for c in result["clusters"]] == [2, 1]
+        assert set(result["clusters"][0]["job_ids"]) == {str(jobs[0].id), str(jobs[1].id)}
+        assert again == result
+        assert len(sessions.selects) == 1
+
+    async def test_write_invalidates_only_its_day(self, sessions, jobs):
+        async with sessions() as db:
+            await job_clusters(db, self.DAY, radius_miles=5)
+            await job_clusters(db, self.OTHER_DAY, radius_miles=5)
+
+            # Moving the far job next to the others merges the clusters for DAY only
+            job = await db.get(WorkOrder, jobs[2].id)
+            job.service_latitude, job.service_longitude = 35.602, -87.032
+            await db.commit()
+            sessions.selects.clear()
+
+            other = await job_clusters(db, self.OTHER_DAY, radius_miles=5)
+            assert sessions.selects == []
+            assert other["clusters"][0]["job_count"] == 1
+
+            result = await job_clusters(db, self.DAY, radius_miles=5)
+            assert [c["job_count"] for c in result["clusters"]] == [3]
+
+    async def test_rescheduling_invalidates_both_days(self, sessions, jobs):
+        async with sessions() as db:
+            await job_clusters(db, self.OTHER_DAY, radius_miles=5)
+
+            job = await db.get(WorkOrder, jobs[2].id)
+            job.scheduled_date = self.OTHER_DAY
+            await db.commit()
+
+            result = await job_clusters(db, self.OTHER_DAY, radius_miles=5)
+        assert sorted(c["job_count"] for c in result["clusters"]) == [1, 1]
+
+    async def test_zoom_and_viewport(self, sessions, jobs):
+        viewport = (35.51, -87.09, 35.69, -86.91)
+        async with sessions() as db:
+            result = await job_clusters(db, self.DAY, zoom=11, bbox=viewport)
+            # A small pan inside the same snapped viewport reuses the result
+            panned = await job_clusters(db, self.DAY, zoom=11, bbox=(35.512, -87.088, 35.692, -86.908))
+
+        assert result["radius_miles"] == pytest.approx(cluster_radius_for_zoom(11, 35.6), abs=0.01)
+        assert [c["job_count"] for c in result["clusters"]] == [2]
+        assert panned == result
+        assert len(sessions.selects) == 1
@@ -0,0 +1,133 @@
+"""
+Tests for the geocoder: LRU, persistent cache, single-flight and rate-limited bulk lookups.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.geocode_cache import GeocodeCache
+from app.services import geocoding_service
+from app.services.geocoding_service import Geocoder, address_request, geocode_address
+from app.utils.address_normalization import normalize_and_hash
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[GeocodeCache.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class Nominatim:
+    """Fake Nominatim: answers from a dict of query -> (lat, lng), recording every call."""
+
+    def __init__(self, places, status=200, delay=0.0):
+        self.places = places
+        self.status = status
+        self.delay = delay
+        self.queries = []
+
+    async def __call__(self, request):
+        query = request.url.params["q"]
+        self.queries.append(query)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return httpx.Response(self.status)
+        coords = self.places.get(query)
+        return httpx.Response(200, json=[{"lat": str(coords[0]), "lon": str(coords[1])}] if coords else [])
+
+
+def _geocoder(sessions, nominatim, requests_per_second=1000):
+    geocoder = Geocoder(session_factory=sessions, requests_per_second=requests_per_second)
+    geocoder._client = httpx.AsyncClient(transport=httpx.MockTransport(nominatim))
+    return geocoder
+
+
+HAMPSHIRE = ("1205 Hampshire Pike", "Columbia", "TN", "38401")
+HAMPSHIRE_QUERY = "1205 Hampshire Pike, Columbia, TN, 38401"
+
+
+class TestGeocoder:
+    async def test_lookups_are_cached_in_memory_and_in_the_database(self, sessions):
+        nominatim = Nominatim({HAMPSHIRE_QUERY: (35.63, -87.01)})
+        geocoder = _geocoder(sessions, nominatim)
+        request = address_request(*HAMPSHIRE)
+
+        assert await geocoder.geocode(request) == (35.63, -87.01)
+        assert await geocoder.geocode(request) == (35.63, -87.01)
+        assert len(nominatim.queries) == 1
+
+        # Another worker (empty LRU) reads the table instead of calling Nominatim
+        other = _geocoder(sessions, nominatim)
+        assert await other.geocode(address_request("1205 hampshire pike", "columbia", "Tennessee", "38401"))
+        assert len(nominatim.queries) == 1
+
+    async def test_misses_are_cached_but_failures_are_not(self, sessions):
+        nominatim = Nominatim({}, status=503)
+        geocoder = _geocoder(sessions, nominatim)
+        request = address_request(*HAMPSHIRE)
+
+        assert await geocoder.geocode(request) is None
+        nominatim.status = 200
+        assert await geocoder.geocode(request) is None
+        assert await geocoder.geocode(request) is None
+        assert len(nominatim.queries) == 2
+        async with sessions() as db:
+            row = (await db.execute(select(GeocodeCache))).scalar_one()
+            assert row.latitude is None
+
+    async def test_concurrent_lookups_share_one_request(self, sessions):
+        nominatim = Nominatim({HAMPSHIRE_QUERY: (35.63, -87.01)}, delay=0.02)
+        geocoder = _geocoder(sessions, nominatim)
+
+        results = await asyncio.gather(*(geocoder.geocode(address_request(*HAMPSHIRE)) for _ in range(5)))
+
+        assert results == [(35.63, -87.01)] * 5
+        assert len(nominatim.queries) == 1
+
+    async def test_bulk_lookups_reuse_the_cache_and_respect_the_rate_limit(self, sessions):
+        places = {f"{n} Main St, Columbia, TN": (35.6 + n / 1000, -87.0) for n in range(1, 8)}
+        nominatim = Nominatim(places)
+        geocoder = _geocoder(sessions, nominatim, requests_per_second=50)
+        await geocoder.geocode(address_request("1 Main St", "Columbia", "TN"))
+
+        requests = [address_request(f"{n} Main St", "Columbia", "TN") for n in range(1, 8)]
+        started = time.monotonic()
+        found = await geocoder.geocode_many(requests + requests[:2] + [None])
+        elapsed = time.monotonic() - started
+
+        assert [found[r.key] for r in requests] == [places[r.query] for r in requests]
+        assert len(nominatim.queries) == 7
+        # Six new lookups at 50/s: the first uses the banked token, the rest wait ~20 ms each
+        assert elapsed >= 0.08
+
+    async def test_customers_share_entries_with_permits(self, sessions, monkeypatch):
+        nominatim = Nominatim({})
+        geocoder = _geocoder(sessions, nominatim)
+        monkeypatch.setattr(geocoding_service, "_geocoder", geocoder)
+        permit_hash = normalize_and_hash("1205 Hampshire Pike", "Maury County", "TN")[3]
+        await geocoder.remember([(permit_hash, "1205 HAMPSHIRE PIKE", (35.63, -87.01))], provider="permit")
+
+        coords = await geocode_address("1205 Hampshire Pike", "Columbia", "TN", county="Maury")
+
+        assert coords == (35.63, -87.01)
+        assert nominatim.queries == []
+        assert await geocoder.cached([permit_hash, "unknown"]) == {permit_hash: (35.63, -87.01)}
+
+    async def test_incomplete_addresses_are_not_looked_up(self):
+        assert await geocode_address("1205 Hampshire Pike", None, "TN") is None
@@ -0,0 +1,170 @@
+"""
+Tests for the batched GPS ingest pipeline (history, latest position, geofences).
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.gps_tracking import (
+    Geofence,
+    GeofenceAction,
+    GeofenceEvent,
+    GeofenceType,
+    LocationHistory,
+    TechnicianLocation,
+)
+from app.models.technician import Technician
+from app.schemas.gps_tracking import LocationUpdate
+from app.services import gps_ingest, technician_state
+from app.services.gps_ingest import GPSIngest, ingest_locations
+from app.services.technician_state import TechnicianState
+
+YARD = (35.6145, -87.0353)
+START = datetime(2026, 3, 2, 14, 0)
+
+
+@pytest_asyncio.fixture
+async def sessions(monkeypatch):
+    monkeypatch.setattr(gps_ingest, "_ingest", GPSIngest())
+    monkeypatch.setattr(technician_state, "_state", TechnicianState())
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tables = [
+        Technician.__table__,
+        TechnicianLocation.__table__,
+        LocationHistory.__table__,
+        Geofence.__table__,
+        GeofenceEvent.__table__,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def yard(sessions):
+    async with sessions() as db:
+        fence = Geofence(
+            name="Yard", geofence_type=GeofenceType.OFFICE, center_latitude=YARD[0], center_longitude=YARD[1],
+            radius_meters=300, entry_action=GeofenceAction.CLOCK_IN, exit_action=GeofenceAction.CLOCK_OUT,
+        )
+        db.add(fence)
+        await db.commit()
+        return fence.id
+
+
+def _drive(minutes, lat_step=0.001, start=YARD):
+    """One point a minute heading north from the yard."""
+    return [
+        LocationUpdate(
+            latitude=start[0] + i * lat_step, longitude=start[1], captured_at=START + timedelta(minutes=i), speed=30,
+        )
+        for i in range(minutes)
+    ]
+
+
+class TestIngest:
+    async def test_history_latest_and_distance(self, sessions):
+        tech_a, tech_b = uuid.uuid4(), uuid.uuid4()
+        points = [(tech_a, p) for p in _drive(10)] + [(tech_b, p) for p in _drive(5, lat_step=-0.001)]
+
+        async with sessions() as db:
+            result = await ingest_locations(db, reversed(points))
+
+        assert result["processed"] == 15
+        assert result["technicians"] == 2
+        async with sessions() as db:
+            history = (
+                await db.execute(
+                    select(LocationHistory)
+                    .where(LocationHistory.technician_id == tech_a)
+                    .order_by(LocationHistory.captured_at)
+                )
+            ).scalars().all()
+            assert len(history) == 10
+            assert history[0].distance_from_previous == 0
+            assert history[1].distance_from_previous == pytest.approx(0.069, abs=0.001)
+            assert history[-1].cumulative_distance == pytest.approx(9 * 0.069, abs=0.01)
+
+            latest = await db.execute(select(TechnicianLocation).where(TechnicianLocation.technician_id == tech_a))
+            latest = latest.scalar_one()
+            assert latest.latitude == pytest.approx(YARD[0] + 0.009)
+            assert latest.captured_at == START + timedelta(minutes=9)
+        assert technician_state.get_technician_state().gps[str(tech_b)][0] == pytest.approx(YARD[0] - 0.004)
+
+    async def test_older_points_do_not_replace_the_latest(self, sessions):
+        tech = uuid.uuid4()
+        drive = _drive(10)
+        async with sessions() as db:
+            await ingest_locations(db, [(tech, p) for p in drive[5:]])
+            await ingest_locations(db, [(tech, p) for p in drive[:5]])  # offline points synced late
+
+            latest = (await db.execute(select(TechnicianLocation.captured_at))).scalar_one()
+            assert latest == START + timedelta(minutes=9)
+            assert (await db.execute(select(func.count()).select_from(LocationHistory))).scalar() == 10
+
+    async def test_geofence_entry_and_exit(self, sessions, yard):
+        tech = uuid.uuid4()
+        # Leaves the yard after ~3 minutes and comes back
+        out = _drive(8)
+        back = _drive(8, lat_step=-0.001, start=(YARD[0] + 0.008, YARD[1]))
+        for i, point in enumerate(back):
+            point.captured_at = START + timedelta(minutes=8 + i)
+
+        async with sessions() as db:
+            first = await ingest_locations(db, [(tech, p) for p in out])
+            second = await ingest_locations(db, [(tech, p) for p in back])
+
+        assert [(e["event_type"], e["action"]) for e in first["geofence_events"]] == [
+            ("entry", "clock_in"),
+            ("exit", "clock_out"),
+        ]
+        assert [e["event_type"] for e in second["geofence_events"]] == ["entry"]
+        async with sessions() as db:
+            events = (await db.execute(select(GeofenceEvent).order_by(GeofenceEvent.occurred_at))).scalars().all()
+            assert [e.event_type for e in events] == ["entry", "exit", "entry"]
+            assert events[1].occurred_at == START + timedelta(minutes=3)
+
+    async def test_state_is_seeded_from_the_database(self, sessions, yard, monkeypatch):
+        tech = uuid.uuid4()
+        async with sessions() as db:
+            await ingest_locations(db, [(tech, p) for p in _drive(2)])
+
+        # A different worker (fresh in-memory state) picks up the next points
+        monkeypatch.setattr(gps_ingest, "_ingest", GPSIngest())
+        later = _drive(6)[2:]
+        async with sessions() as db:
+            result = await ingest_locations(db, [(tech, p) for p in later])
+
+        assert [e["event_type"] for e in result["geofence_events"]] == ["exit"]
+        async with sessions() as db:
+            last = (
+                await db.execute(select(LocationHistory).order_by(LocationHistory.captured_at.desc()).limit(1))
+            ).scalar_one()
+            assert last.cumulative_distance == pytest.approx(5 * 0.069, abs=0.01)
+
+    async def test_new_geofences_are_picked_up(self, sessions):
+        tech = uuid.uuid4()
+        async with sessions() as db:
+            await ingest_locations(db, [(tech, p) for p in _drive(1)])
+            db.add(
+                Geofence(
+                    name="Yard", geofence_type=GeofenceType.OFFICE, center_latitude=YARD[0],
+                    center_longitude=YARD[1], radius_meters=300,
+                )
+            )
+            await db.commit()
+            result = await ingest_locations(db, [(tech, p) for p in _drive(2)[1:]])
+
+        assert [e["event_type"] for e in result["geofence_events"]] == ["entry"]
@@ -0,0 +1,116 @@
+"""
+Tests for the shared outbound HTTP clients: pooling per upstream, retry policy, metrics and the test transport hook.
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.metrics import get_registry
+from app.services import http_clients, sendgrid_service
+from app.services.http_clients import HTTPClients, get_http_client
+
+
+@pytest.fixture
+def registry():
+    registry = get_registry()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    instance = HTTPClients()
+    monkeypatch.setattr(http_clients, "_clients", instance)
+    monkeypatch.setattr(http_clients, "RETRY_BASE_SECONDS", 0.001)
+    return instance
+
+
+class Upstream:
+    """Fake upstream: answers each request from a script of status codes ("drop" fails the connection)."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        answer = self.script.pop(0) if self.script else 200
+        if answer == "drop":
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(answer, headers={"Retry-After": "0"} if answer == 429 else {})
+
+
+class TestHTTPClients:
+    async def test_clients_are_shared_per_upstream_and_options(self, clients):
+        sendgrid = get_http_client("sendgrid")
+        graph = get_http_client("ms_graph", base_url="https://graph.microsoft.com/v1.0")
+
+        assert get_http_client("sendgrid") is sendgrid
+        assert get_http_client("ms_graph", base_url="https://graph.microsoft.com/v1.0") is graph
+        assert sendgrid is not graph
+        assert sendgrid.timeout.read == 15.0
+        # Closing a client (old call sites did) leaves the upstream's pool open for the others
+        await graph.aclose()
+        assert get_http_client("ms_graph", base_url="https://graph.microsoft.com/v1.0") is not graph
+        assert set(clients._pools) == {"sendgrid", "ms_graph"}
+        await clients.aclose()
+        assert clients._pools == {}
+
+    async def test_idempotent_requests_retry_transient_failures(self, clients, registry):
+        upstream = Upstream(503, 429, 200)
+        clients.mount(httpx.MockTransport(upstream))
+
+        response = await get_http_client("samsara").get("https://api.samsara.com/fleet/vehicles")
+
+        assert response.status_code == 200
+        assert len(upstream.requests) == 3
+        assert registry.http_client_retries.series() == {("samsara",): 2}
+        assert registry.http_client_requests.series() == {
+            ("samsara", "5xx"): 1, ("samsara", "4xx"): 1, ("samsara", "2xx"): 1
+        }
+
+    async def test_posts_are_only_resent_when_nothing_was_sent(self, clients):
+        refused, overloaded = Upstream("drop", 202), Upstream(503, 202)
+        clients.mount(httpx.MockTransport(lambda request: (
+            refused if request.url.host == "refused.test" else overloaded
+        )(request)))
+        client = get_http_client("anthropic")
+
+        assert (await client.post("https://refused.test/v1/messages", json={})).status_code == 202
+        assert (await client.post("https://overloaded.test/v1/messages", json={})).status_code == 503
+        assert (len(refused.requests), len(overloaded.requests)) == (2, 1)
+
+    async def test_retries_stop_at_the_upstream_limit(self, clients, registry):
+        upstream = Upstream("drop", "drop", "drop", "drop")
+        clients.mount(httpx.MockTransport(upstream))
+
+        with pytest.raises(httpx.ConnectError):
+            await get_http_client("open_meteo").get("https://api.open-meteo.com/v1/forecast")
+        with pytest.raises(httpx.ConnectError):
+            await get_http_client("local_ai").get("http://ollama.test/api/tags")
+
+        # Two retries by default; the self-hosted AI server fails fast
+        assert len(upstream.requests) == 4
+        assert registry.http_client_requests.series() == {("open_meteo", "error"): 3, ("local_ai", "error"): 1}
+
+    async def test_integrations_run_against_a_local_mock_server(self, clients, monkeypatch):
+        mock = FastAPI()
+        received = []
+
+        @mock.post("/v3/mail/send")
+        async def mail_send(request: Request):
+            received.append((request.headers["authorization"], await request.json()))
+            return JSONResponse({}, status_code=202, headers={"X-Message-Id": "msg-1"})
+
+        clients.mount(httpx.ASGITransport(app=mock))
+        monkeypatch.setattr(sendgrid_service, "SENDGRID_API_KEY", "sg-test")
+
+        result = await sendgrid_service.send_email("pat@example.com", "Pat", "Pump-out reminder", "<p>Due</p>")
+
+        assert result == {"success": True, "message_id": "msg-1", "error": None}
+        [(auth, payload)] = received
+        assert auth == "Bearer sg-test"
+        assert payload["personalizations"][0]["to"] == [{"email": "pat@example.com", "name": "Pat"}]
@@ -0,0 +1,159 @@
+"""
+Tests for the job scheduler: one run per fire across replicas, overlap limits, misfire policy and run history.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import Base
+from app.models.job_run import JobRun
+from app.services.job_scheduler import JOBS, Job, JobScheduler, MemoryLeases, cron, every
+
+REPLICAS = 4
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    # A file database with a connection per session: replicas must not share one connection's transaction
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[JobRun.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def replicas(sessions):
+    """Start n schedulers over one database and one lease store, as separate replicas would be."""
+    started = []
+    leases = MemoryLeases()
+
+    def start(*jobs, count=REPLICAS):
+        for n in range(count):
+            scheduler = JobScheduler(
+                jobs={job.name: job for job in jobs}, leases=leases, session_factory=sessions, replica=f"replica-{n}"
+            )
+            scheduler.start()
+            started.append(scheduler)
+        return started
+
+    yield start
+    for scheduler in started:
+        await scheduler.stop(timeout=1.0)
+
+
+async def _runs(sessions, name):
+    async with sessions() as db:
+        rows = (await db.execute(select(JobRun).where(JobRun.job_name == name).order_by(JobRun.scheduled_for)))
+        return list(rows.scalars())
+
+
+class Counter:
+    """A job body that counts its runs and the most that were ever running at once."""
+
+    def __init__(self, duration=0.0):
+        self.duration = duration
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.running -= 1
+
+
+class TestJobScheduler:
+    async def test_each_fire_runs_once_across_replicas(self, sessions, replicas):
+        fast, slow = Counter(), Counter()
+        started = replicas(Job("fast", fast, every(seconds=0.1)), Job("slow", slow, every(seconds=0.25)))
+
+        await asyncio.sleep(0.8)
+        await asyncio.gather(*(scheduler.stop() for scheduler in started))
+
+        for name, counter in (("fast", fast), ("slow", slow)):
+            runs = await _runs(sessions, name)
+            assert len(runs) >= 2
+            assert counter.calls == len(runs)
+            assert {run.status for run in runs} == {"succeeded"}
+            gaps = {round((b.scheduled_for - a.scheduled_for).total_seconds(), 2) for a, b in zip(runs, runs[1:])}
+            assert gaps == {0.1 if name == "fast" else 0.25}
+        assert all(run.duration_seconds is not None for run in await _runs(sessions, "fast"))
+
+    @pytest.mark.parametrize("limit", [1, 2])
+    async def test_max_instances_holds_across_replicas(self, sessions, replicas, limit):
+        body = Counter(duration=0.25)
+        started = replicas(Job("report", body, every(seconds=0.1), max_instances=limit))
+
+        await asyncio.sleep(0.75)
+        await asyncio.gather(*(scheduler.stop() for scheduler in started))
+
+        assert body.peak == limit
+        statuses = [run.status for run in await _runs(sessions, "report")]
+        assert "skipped" in statuses
+        assert statuses.count("skipped") + body.calls == len(statuses)
+
+    async def test_late_fires_follow_the_misfire_policy(self, sessions):
+        skip, catch_up = Counter(), Counter()
+        scheduler = JobScheduler(jobs={}, leases=MemoryLeases(), session_factory=sessions)
+        fire = datetime(2026, 10, 17, 8, 0, tzinfo=timezone.utc)
+
+        poll = Job("poll", skip, every(minutes=5), misfire_grace=30)
+        daily = Job("daily", catch_up, every(days=1), misfire="run_once", misfire_grace=30)
+
+        await scheduler._run(poll, fire, late=45.0)
+        await scheduler._run(daily, fire, late=45.0)
+
+        assert (skip.calls, catch_up.calls) == (0, 1)
+        assert [run.status for run in await _runs(sessions, "poll")] == ["missed"]
+        assert [run.status for run in await _runs(sessions, "daily")] == ["succeeded"]
+
+    async def test_fire_missed_while_every_replica_was_down_runs_once(self, sessions, replicas):
+        now = datetime.now(timezone.utc)
+        last_hour = now.replace(minute=0, second=0, microsecond=0)
+        async with sessions() as db:
+            for name in ("hourly", "poll"):
+                db.add(JobRun(job_name=name, scheduled_for=last_hour - timedelta(hours=3), status="succeeded"))
+            await db.commit()
+        hourly, poll = Counter(), Counter()
+
+        replicas(Job("hourly", hourly, every(hours=1), misfire="run_once"), Job("poll", poll, every(hours=1)))
+        await asyncio.sleep(0.2)
+
+        assert (hourly.calls, poll.calls) == (1, 0)
+        runs = await _runs(sessions, "hourly")
+        assert [run.scheduled_for.replace(tzinfo=timezone.utc) for run in runs][-1] == last_hour
+
+    async def test_disabled_jobs_are_not_scheduled(self, sessions, replicas):
+        body = Counter()
+        [scheduler] = replicas(Job("bookings", body, every(seconds=0.05), enabled=lambda: False), count=1)
+
+        await asyncio.sleep(0.15)
+
+        assert body.calls == 0
+        assert scheduler.status()[0]["scheduled"] is False
+
+
+class TestTriggers:
+    def test_cron_uses_the_configured_timezone(self, monkeypatch):
+        monkeypatch.setattr(settings, "SCHEDULER_TIMEZONE", "America/Chicago")
+
+        assert str(cron(hour=3, minute=30).timezone) == "America/Chicago"
+        assert str(cron(hour=3, timezone="UTC").timezone) == "UTC"
+        # Declared at import, with the default
+        assert str(JOBS["job_runs_prune"].trigger.timezone) == "UTC"
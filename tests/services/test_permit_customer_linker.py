@@ -0,0 +1,189 @@
+"""
+Tests for the permit-to-customer linker.
+
+Covers the in-memory CustomerMatchIndex and batch_link_permits against a
+SQLite database holding only the tables the linker touches.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.customer import Customer
+from app.models.septic_permit import State, SepticPermit, PermitCustomerMatchKey
+from app.services.permit_customer_linker import (
+    CustomerKeys,
+    CustomerMatchIndex,
+    batch_link_permits,
+    name_similarity,
+)
+
+
+def _permit(**kwargs):
+    defaults = dict(
+        address=None,
+        address_normalized=None,
+        owner_name=None,
+        owner_phone=None,
+        city=None,
+        raw_data=None,
+    )
+    defaults.update(kwargs)
+    return SimpleNamespace(**defaults)
+
+
+class TestCustomerMatchIndex:
+    """Tests for the in-memory match index."""
+
+    def setup_method(self):
+        self.index = CustomerMatchIndex.from_keys([
+            CustomerKeys("c1", address_key="123 MAIN ST", phone_key="5125550100", city_key="AUSTIN", name_key="JOHN SMITH"),
+            CustomerKeys("c2", address_key="9 OAK LN", phone_key="5125550199", city_key="AUSTIN", name_key="JANE DOE"),
+            CustomerKeys("c3", city_key="DALLAS", name_key="JOHN SMITH"),
+        ])
+
+    def test_address_match_normalizes_permit_address(self):
+        match = self.index.match(_permit(address="123 Main Street"))
+        assert match.customer_id == "c1"
+        assert match.match_method == "address"
+        assert match.confidence == "high"
+
+    def test_phone_match_from_raw_data(self):
+        match = self.index.match(_permit(raw_data={"owner_phone": "+1 (512) 555-0199"}))
+        assert match.customer_id == "c2"
+        assert match.match_method == "phone"
+
+    def test_phone_match_from_owner_phone_column(self):
+        match = self.index.match(_permit(owner_phone="512.555.0100"))
+        assert match.customer_id == "c1"
+
+    def test_phone_with_extension_or_foreign_number_does_not_link(self):
+        # "5125550100 x199" would truncate to "5550100199"; "+44 ..." to an unrelated key
+        assert self.index.match(_permit(owner_phone="512-555-0100 x199")) is None
+        assert self.index.match(_permit(owner_phone="+44 512 555 0100")) is None
+
+    def test_name_match_is_partitioned_by_city(self):
+        match = self.index.match(_permit(owner_name="john smith", city="Dallas "))
+        assert match.customer_id == "c3"
+        assert match.confidence == "high"
+
+    def test_fuzzy_name_match_medium_confidence(self):
+        match = self.index.match(_permit(owner_name="Jane Doex", city="Austin"))
+        assert match.customer_id == "c2"
+        assert match.match_method == "name_city"
+        assert match.confidence == "medium"
+
+    def test_fuzzy_name_below_threshold_is_no_match(self):
+        assert self.index.match(_permit(owner_name="Robert Brown", city="Austin")) is None
+
+    def test_fuzzy_scan_agrees_with_name_similarity(self):
+        names = ["JON SMYTHE", "JOHN SMITHE", "JOHNNY SMITH", "J SMITH", "JOHN SMIT"]
+        index = CustomerMatchIndex.from_keys(
+            CustomerKeys(f"c{i}", city_key="WACO", name_key=n) for i, n in enumerate(names)
+        )
+        expected = max(range(len(names)), key=lambda i: (name_similarity("JOHN SMITHS", names[i]), -i))
+        match = index.match(_permit(owner_name="John Smiths", city="Waco"))
+        assert match.customer_id == f"c{expected}"
+
+    def test_first_customer_wins_on_duplicate_keys(self):
+        index = CustomerMatchIndex.from_keys([
+            CustomerKeys("first", address_key="1 A ST"),
+            CustomerKeys("second", address_key="1 A ST"),
+        ])
+        assert index.match(_permit(address="1 A St")).customer_id == "first"
+
+
+@pytest_asyncio.fixture
+async def linker_db():
+    """SQLite session with just the tables the linker reads and writes."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tables = [
+        Customer.__table__,
+        State.__table__,
+        SepticPermit.__table__,
+        PermitCustomerMatchKey.__table__,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        yield session
+
+    await engine.dispose()
+
+
+async def _seed(db: AsyncSession):
+    state = State(code="TX", name="Texas")
+    db.add(state)
+    await db.flush()
+
+    customer = Customer(
+        id=uuid.uuid4(),
+        first_name="John",
+        last_name="Smith",
+        phone="512-555-0100",
+        address_line1="123 Main Street",
+        city="Austin",
+        is_active=True,
+    )
+    db.add(customer)
+
+    now = datetime.now(timezone.utc)
+    linked = SepticPermit(
+        state_id=state.id, address="123 MAIN ST", city="Austin", scraped_at=now, is_active=True
+    )
+    unmatched = SepticPermit(
+        state_id=state.id, address="55 ELM RD", owner_name="Nobody", city="Austin", scraped_at=now, is_active=True
+    )
+    db.add_all([linked, unmatched])
+    await db.commit()
+    return customer, linked, unmatched
+
+
+class TestBatchLinkPermits:
+    """Tests for batch_link_permits."""
+
+    async def test_links_matches_in_bulk(self, linker_db: AsyncSession):
+        customer, linked, unmatched = await _seed(linker_db)
+
+        stats = await batch_link_permits(linker_db)
+
+        assert stats["processed"] == 2
+        assert stats["linked_high"] == 1
+        assert stats["skipped"] == 1
+
+        rows = dict((await linker_db.execute(select(SepticPermit.id, SepticPermit.customer_id))).all())
+        assert rows[linked.id] == customer.id
+        assert rows[unmatched.id] is None
+
+    async def test_persist_keys_writes_and_reuses_keys(self, linker_db: AsyncSession):
+        customer, _, _ = await _seed(linker_db)
+
+        await batch_link_permits(linker_db, persist_keys=True)
+
+        key = (await linker_db.execute(select(PermitCustomerMatchKey))).scalar_one()
+        assert key.customer_id == customer.id
+        assert key.address_key == "123 MAIN ST"
+        assert key.phone_key == "5125550100"
+        assert key.city_key == "AUSTIN"
+        assert key.name_key == "JOHN SMITH"
+
+        # Second run reuses the stored keys instead of rewriting them.
+        computed_at = key.computed_at
+        stats = await batch_link_permits(linker_db, persist_keys=True)
+        assert stats["processed"] == 1
+        linker_db.expire_all()
+        key = (await linker_db.execute(select(PermitCustomerMatchKey))).scalar_one()
+        assert key.computed_at == computed_at
@@ -0,0 +1,133 @@
+"""
+Tests for phone normalization and the caller-ID phone identity service.
+"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.customer import Customer
+from app.services.phone_identity import PhoneIdentityService, phone_identity
+from app.utils.phone_normalization import format_us_phone, phone_last10, to_e164
+
+
+class TestPhoneNormalization:
+    """Tests for the shared phone normalization helpers."""
+
+    @pytest.mark.parametrize(
+        "raw",
+        ["+16155550100", "16155550100", "(615) 555-0100", "615.555.0100", "615-555-0100"],
+    )
+    def test_last10_is_format_independent(self, raw):
+        assert phone_last10(raw) == "6155550100"
+
+    def test_last10_rejects_short_numbers(self):
+        assert phone_last10("555-0100") == ""
+        assert phone_last10(None) == ""
+
+    @pytest.mark.parametrize(
+        "raw",
+        ["512-555-0100 x123", "(512) 555-0100 ext. 45", "+44 20 7946 0958", "+52 55 1234 5678", "26155550100"],
+    )
+    def test_last10_rejects_extensions_and_non_us_numbers(self, raw):
+        # Truncating these to 10 digits would produce keys for unrelated US numbers
+        assert phone_last10(raw) == ""
+
+    def test_to_e164(self):
+        assert to_e164("(615) 555-0100") == "+16155550100"
+        assert to_e164("1-615-555-0100") == "+16155550100"
+        assert to_e164("+44 20 7946 0958") == "+442079460958"
+        assert to_e164("12345") == ""
+        assert to_e164("0044 20 7946 0958") == ""
+
+    def test_format_us_phone(self):
+        assert format_us_phone("+16155550100") == "(615) 555-0100"
+        assert format_us_phone("ext 12") == "ext 12"
+        assert format_us_phone(None) == ""
+
+    def test_customer_phone_last10_kept_in_sync(self):
+        customer = Customer(first_name="A", last_name="B", phone="+1 615 555 0100")
+        assert customer.phone_last10 == "6155550100"
+        customer.phone = "512-555-0100 x123"
+        assert customer.phone_last10 is None
+        customer.phone = None
+        assert customer.phone_last10 is None
+
+
+@pytest_asyncio.fixture
+async def customers_db():
+    """SQLite session with only the customers table."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Customer.__table__])
+
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        yield session
+
+    await engine.dispose()
+
+
+async def _add_customer(db: AsyncSession, phone: str) -> Customer:
+    customer = Customer(id=uuid.uuid4(), first_name="Pat", last_name="Caller", phone=phone)
+    db.add(customer)
+    await db.commit()
+    return customer
+
+
+class TestPhoneIdentityService:
+    """Tests for caller-ID resolution and cache invalidation."""
+
+    async def test_resolves_any_format(self, customers_db: AsyncSession):
+        customer = await _add_customer(customers_db, "(615) 555-0100")
+
+        assert await phone_identity.resolve_customer_id(customers_db, "+16155550100") == customer.id
+        resolved = await phone_identity.resolve_customer(customers_db, "615.555.0100")
+        assert resolved.id == customer.id
+
+    async def test_repeat_lookups_hit_cache(self, customers_db: AsyncSession):
+        service = PhoneIdentityService()
+        await _add_customer(customers_db, "(615) 555-0100")
+
+        await service.resolve_customer_id(customers_db, "+16155550100")
+        await service.resolve_customer_id(customers_db, "6155550100")
+
+        stats = service.get_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    async def test_unknown_number_returns_none(self, customers_db: AsyncSession):
+        assert await phone_identity.resolve_customer(customers_db, "+19995550000") is None
+        assert await phone_identity.resolve_customer_id(customers_db, "not a phone") is None
+
+    async def test_cached_miss_invalidated_by_customer_insert(self, customers_db: AsyncSession):
+        assert await phone_identity.resolve_customer_id(customers_db, "+16155550123") is None
+
+        customer = await _add_customer(customers_db, "615-555-0123")
+
+        assert await phone_identity.resolve_customer_id(customers_db, "+16155550123") == customer.id
+
+    async def test_phone_change_invalidates_old_and_new_numbers(self, customers_db: AsyncSession):
+        customer = await _add_customer(customers_db, "615-555-0100")
+        assert await phone_identity.resolve_customer_id(customers_db, "6155550100") == customer.id
+        assert await phone_identity.resolve_customer_id(customers_db, "6155550199") is None
+
+        customer.phone = "615-555-0199"
+        await customers_db.commit()
+
+        assert await phone_identity.resolve_customer_id(customers_db, "6155550100") is None
+        assert await phone_identity.resolve_customer_id(customers_db, "6155550199") == customer.id
+
+    async def test_lru_evicts_oldest(self, customers_db: AsyncSession):
+        service = PhoneIdentityService(max_entries=2)
+        for suffix in ("0001", "0002", "0003"):
+            await service.resolve_customer_id(customers_db, f"615555{suffix}")
+        assert service.get_stats()["entries"] == 2
@@ -0,0 +1,299 @@
+"""
+Tests for the authenticated-principal cache (users, entities, API tokens).
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.public.deps import hash_token
+from app.database import Base
+from app.models.company_entity import CompanyEntity
+from app.models.oauth import APIClient, APIToken
+from app.models.user import User
+from app.services.principal_cache import PrincipalCache, principal_cache
+
+TABLES = [CompanyEntity.__table__, User.__table__, APIClient.__table__, APIToken.__table__]
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    """Session factory over SQLite with only the auth tables, plus a query log."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+
+    queries: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _log(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    factory.queries = queries
+    yield factory
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def user(sessions):
+    async with sessions() as db:
+        user = User(email="tech@example.com", hashed_password="x", first_name="Tess", is_active=True)
+        db.add(user)
+        await db.commit()
+        return user
+
+
+async def _settle():
+    """Let scheduled Redis invalidations run."""
+    await asyncio.sleep(0)
+
+
+def _pause_after_first_query(db):
+    """Hold db's first query result until released, so a write can commit mid-load."""
+    read, release = asyncio.Event(), asyncio.Event()
+    execute = db.execute
+
+    async def paused(*args, **kwargs):
+        result = await execute(*args, **kwargs)
+        if not read.is_set():
+            read.set()
+            await release.wait()
+        return result
+
+    db.execute = paused
+    return read, release
+
+
+class TestUsers:
+    async def test_second_lookup_runs_no_queries(self, sessions, user):
+        async with sessions() as db:
+            first = await principal_cache.get_user(db, user.id)
+        sessions.queries.clear()
+
+        async with sessions() as db:
+            second = await principal_cache.get_user(db, user.id)
+
+        assert sessions.queries == []
+        assert second.id == first.id
+        assert second.email == "tech@example.com"
+
+    async def test_unknown_user(self, sessions):
+        async with sessions() as db:
+            assert await principal_cache.get_user(db, 999) is None
+
+    async def test_deactivation_invalidates(self, sessions, user):
+        async with sessions() as db:
+            await principal_cache.get_user(db, user.id)
+
+        async with sessions() as db:
+            row = (await db.execute(select(User).where(User.id == user.id))).scalar_one()
+            row.is_active = False
+            await db.commit()
+        await _settle()
+
+        async with sessions() as db:
+            assert (await principal_cache.get_user(db, user.id)).is_active is False
+
+    async def test_deactivation_during_load_is_not_cached(self, sessions, user):
+        async with sessions() as db:
+            read, release = _pause_after_first_query(db)
+            loading = asyncio.create_task(principal_cache.get_user(db, user.id))
+            await read.wait()
+
+            async with sessions() as writer:
+                row = await writer.get(User, user.id)
+                row.is_active = False
+                await writer.commit()
+            await _settle()
+            release.set()
+            assert (await loading).is_active is True  # this request read the row first
+
+        async with sessions() as db:
+            assert (await principal_cache.get_user(db, user.id)).is_active is False
+
+    async def test_cached_user_can_be_updated(self, sessions, user):
+        async with sessions() as db:
+            await principal_cache.get_user(db, user.id)
+
+        async with sessions() as db:
+            cached = await principal_cache.get_user(db, user.id)
+            cached.microsoft_email = "tess@contoso.com"
+            await db.commit()
+
+        async with sessions() as db:
+            row = (await db.execute(select(User).where(User.id == user.id))).scalar_one()
+            assert row.microsoft_email == "tess@contoso.com"
+            assert row.hashed_password == "x"
+            assert (await principal_cache.get_user(db, user.id)).microsoft_email == "tess@contoso.com"
+
+    async def test_password_hash_is_not_cached(self, sessions, user):
+        async with sessions() as db:
+            await principal_cache.get_user(db, user.id)
+
+        async with sessions() as db:
+            cached = await principal_cache.get_user(db, user.id)
+            assert "hashed_password" not in cached.__dict__
+
+    async def test_disabled_with_zero_ttl(self, sessions, user, monkeypatch):
+        monkeypatch.setattr("app.config.settings.PRINCIPAL_CACHE_TTL", 0)
+        async with sessions() as db:
+            await principal_cache.get_user(db, user.id)
+        sessions.queries.clear()
+
+        async with sessions() as db:
+            await principal_cache.get_user(db, user.id)
+        assert len(sessions.queries) == 1
+
+
+class TestEntities:
+    @pytest_asyncio.fixture
+    async def entities(self, sessions):
+        async with sessions() as db:
+            default = CompanyEntity(id=uuid.uuid4(), name="Mac Septic", short_code="MAC", is_default=True)
+            other = CompanyEntity(id=uuid.uuid4(), name="Nashville", short_code="NSH")
+            closed = CompanyEntity(id=uuid.uuid4(), name="Closed", short_code="OLD", is_active=False)
+            db.add_all([default, other, closed])
+            await db.commit()
+            return default, other, closed
+
+    async def test_resolution_order(self, sessions, entities):
+        default, other, closed = entities
+        async with sessions() as db:
+            assert (await principal_cache.resolve_entity(db, str(other.id))).id == other.id
+            assert (await principal_cache.resolve_entity(db, str(closed.id))).id == default.id
+            assert (await principal_cache.resolve_entity(db, "not-a-uuid", other.id)).id == other.id
+            assert (await principal_cache.resolve_entity(db, None)).id == default.id
+
+    async def test_one_query_for_all_lookups(self, sessions, entities):
+        default, other, _ = entities
+        sessions.queries.clear()
+        async with sessions() as db:
+            for _ in range(5):
+                await principal_cache.resolve_entity(db, str(other.id))
+                await principal_cache.resolve_entity(db, None, default.id)
+        assert len(sessions.queries) == 1
+
+    async def test_no_entities(self, sessions):
+        async with sessions() as db:
+            assert await principal_cache.resolve_entity(db, None) is None
+            assert await principal_cache.resolve_entity(db, None) is None
+        assert len(sessions.queries) == 1
+
+    async def test_entity_edit_invalidates(self, sessions, entities):
+        _, other, _ = entities
+        async with sessions() as db:
+            await principal_cache.resolve_entity(db, str(other.id))
+
+        async with sessions() as db:
+            row = await db.get(CompanyEntity, other.id)
+            row.is_active = False
+            await db.commit()
+        await _settle()
+
+        async with sessions() as db:
+            assert (await principal_cache.resolve_entity(db, str(other.id))).id != other.id
+
+
+class TestAPITokens:
+    @pytest_asyncio.fixture
+    async def token(self, sessions):
+        async with sessions() as db:
+            client = APIClient(client_id="c1", client_secret_hash="s", name="Partner", scopes="read")
+            db.add(client)
+            await db.flush()
+            token = APIToken(
+                token_hash=hash_token("tok"),
+                client_id=client.id,
+                scopes="read",
+                expires_at=datetime.utcnow() + timedelta(hours=1),
+            )
+            db.add(token)
+            await db.commit()
+            return token
+
+    async def test_cached_lookup(self, sessions, token):
+        async with sessions() as db:
+            await principal_cache.get_api_token(db, hash_token("tok"))
+        sessions.queries.clear()
+
+        async with sessions() as db:
+            cached, client = await principal_cache.get_api_token(db, hash_token("tok"))
+
+        assert sessions.queries == []
+        assert cached.is_valid
+        assert client.client_id == "c1"
+        assert "client_secret_hash" not in client.__dict__
+
+    async def test_unknown_token(self, sessions):
+        async with sessions() as db:
+            assert await principal_cache.get_api_token(db, hash_token("nope")) == (None, None)
+
+    async def test_revoke_invalidates(self, sessions, token):
+        async with sessions() as db:
+            await principal_cache.get_api_token(db, hash_token("tok"))
+
+        async with sessions() as db:
+            row = await db.get(APIToken, token.id)
+            row.is_revoked = True
+            await db.commit()
+        await _settle()
+
+        async with sessions() as db:
+            cached, _ = await principal_cache.get_api_token(db, hash_token("tok"))
+        assert not cached.is_valid
+
+    async def test_revoke_during_load_is_not_cached(self, sessions, token):
+        async with sessions() as db:
+            read, release = _pause_after_first_query(db)
+            loading = asyncio.create_task(principal_cache.get_api_token(db, hash_token("tok")))
+            await read.wait()
+
+            async with sessions() as writer:
+                row = await writer.get(APIToken, token.id)
+                row.is_revoked = True
+                await writer.commit()
+            await _settle()
+            release.set()
+            cached, _ = await loading
+            assert cached.is_valid
+
+        async with sessions() as db:
+            cached, _ = await principal_cache.get_api_token(db, hash_token("tok"))
+        assert not cached.is_valid
+
+    async def test_client_deactivation_invalidates(self, sessions, token):
+        async with sessions() as db:
+            await principal_cache.get_api_token(db, hash_token("tok"))
+
+        async with sessions() as db:
+            row = await db.get(APIClient, token.client_id)
+            row.is_active = False
+            await db.commit()
+        await _settle()
+
+        async with sessions() as db:
+            _, client = await principal_cache.get_api_token(db, hash_token("tok"))
+        assert client.is_active is False
+
+    async def test_touch_is_throttled(self, sessions, token):
+        cache = PrincipalCache(touch_interval=60)
+        async with sessions() as db:
+            cached, client = await cache.get_api_token(db, hash_token("tok"))
+            await cache.touch_api_token(db, cached, client)
+            writes = len(sessions.queries)
+            await cache.touch_api_token(db, cached, client)
+            assert len(sessions.queries) == writes
+
+        async with sessions() as db:
+            assert (await db.get(APIToken, token.id)).last_used_at is not None
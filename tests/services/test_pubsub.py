@@ -0,0 +1,135 @@
+"""
+Tests for cross-worker real-time fan-out: pub/sub hubs, targeting, bounded send queues and eviction.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.services.call_transcript_manager import TranscriptWSManager
+from app.services.pubsub import MemoryBroker, PubSub, SLOW_CONSUMER_CLOSE_CODE
+from app.services.websocket_manager import ConnectionManager
+
+WORKERS = 4
+
+
+class FakeSocket:
+    """Records sent text; a stalled socket never finishes a send."""
+
+    def __init__(self, stalled=False):
+        self.stalled = stalled
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+async def _workers(factory):
+    """One hub per simulated worker, all on one broker, each with its own manager."""
+    broker = MemoryBroker()
+    managers = []
+    for _ in range(WORKERS):
+        hub = PubSub(broker)
+        await hub.start()
+        managers.append(factory(hub))
+    return managers
+
+
+async def _settle(sockets, count, timeout=5.0):
+    """Wait until every socket has received count messages."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while any(len(s.sent) < count for s in sockets):
+        assert loop.time() < deadline, "messages were not delivered in time"
+        await asyncio.sleep(0.01)
+
+
+class TestConnectionManagerFanOut:
+    async def test_5k_sockets_across_4_workers(self, monkeypatch):
+        monkeypatch.setattr(settings, "WS_SEND_QUEUE_SIZE", 2)
+        managers = await _workers(lambda hub: ConnectionManager(pubsub=hub))
+        sockets = [FakeSocket() for _ in range(5000)]
+        for n, socket in enumerate(sockets):
+            await managers[n % WORKERS].connect(socket, user_id=n)
+        slow = [FakeSocket(stalled=True) for _ in range(WORKERS)]
+        for n, socket in enumerate(slow):
+            await managers[n].connect(socket, user_id=10_000 + n)
+
+        local = []
+        for seq in range(4):
+            local.append(await managers[0].broadcast_event("work_order.updated", {"seq": seq}))
+            await asyncio.sleep(0)
+        await _settle(sockets, 4)
+
+        # The stalled socket holds one message in its send and two queued; the fourth evicts it
+        assert local == [1251, 1251, 1251, 1250]
+
+        assert [json.loads(text)["data"]["seq"] for text in sockets[4999].sent] == [0, 1, 2, 3]
+        # Serialized once by the publisher, split once per receiving worker
+        assert len({id(s.sent[0]) for s in sockets}) == WORKERS
+        # Stalled consumers fell behind their 2-message queue and were evicted
+        await asyncio.sleep(0)
+        assert [s.closed_with for s in slow] == [SLOW_CONSUMER_CLOSE_CODE] * WORKERS
+        assert all(m.total_connections == 1250 for m in managers)
+
+    async def test_targets_resolve_on_every_worker(self):
+        managers = await _workers(lambda hub: ConnectionManager(pubsub=hub))
+        alice, bob, admin = FakeSocket(), FakeSocket(), FakeSocket()
+        await managers[1].connect(alice, user_id=1)
+        await managers[2].connect(bob, user_id=2)
+        await managers[3].connect(admin, user_id=3, user_role="admin")
+
+        await managers[0].send_to_user(2, {"type": "notification"})
+        await managers[0].send_to_role("admin", {"type": "alert"})
+        await managers[0].broadcast({"type": "refresh"}, exclude_user=1)
+        await _settle([bob, admin], 2)
+
+        assert [json.loads(t)["type"] for t in alice.sent] == []
+        assert [json.loads(t)["type"] for t in bob.sent] == ["notification", "refresh"]
+        assert [json.loads(t)["type"] for t in admin.sent] == ["alert", "refresh"]
+
+
+class TestTranscriptFanOut:
+    async def test_call_listeners_on_other_workers_get_the_transcript(self):
+        managers = await _workers(lambda hub: TranscriptWSManager(pubsub=hub))
+        watching, other_call = FakeSocket(), FakeSocket()
+        await managers[3].connect("CA123", watching)
+        await managers[2].connect("CA999", other_call)
+
+        await managers[0].broadcast_transcript("CA123", "my tank is backing up", is_final=True)
+        await managers[0].broadcast_event("CA123", "location_detected", {"city": "Columbia"})
+        await _settle([watching], 2)
+
+        assert json.loads(watching.sent[0])["text"] == "my tank is backing up"
+        assert json.loads(watching.sent[1])["type"] == "location_detected"
+        assert other_call.sent == []
+
+        await managers[3].disconnect("CA123", watching)
+        assert not managers[3].has_listeners("CA123")
+
+
+class TestPubSub:
+    @pytest.mark.parametrize("origin", [0, 1])
+    async def test_every_hub_hears_a_message_once(self, origin):
+        broker = MemoryBroker()
+        hubs = [PubSub(broker), PubSub(broker)]
+        heard = [[], []]
+        for n, hub in enumerate(hubs):
+            await hub.start()
+            hub.subscribe("t", lambda text, meta, n=n: heard[n].append((text, meta)))
+
+        await hubs[origin].publish("t", "hello", {"k": 1})
+        await asyncio.sleep(0)
+
+        assert heard == [[("hello", {"k": 1})], [("hello", {"k": 1})]]
@@ -0,0 +1,157 @@
+"""
+Tests for the outbound SMS dispatcher: commit-gated enqueue, per-sender rate limits, retries, status writes.
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.message import Message
+from app.services import sms_dispatcher
+from app.services.ringcentral_service import SMSResponse
+from app.services.sms_dispatcher import OutboundSMS, SMSDispatcher, enqueue_sms
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Message.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class Provider:
+    """Fake SMS provider: answers from a per-number script of status codes, recording every send."""
+
+    def __init__(self, script=None, delay=0.0):
+        self.script = script or {}
+        self.delay = delay
+        self.sends = []
+
+    async def __call__(self, sms):
+        self.sends.append((sms.from_number, sms.to, time.monotonic()))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        answers = self.script.get(sms.to, [])
+        code = answers.pop(0) if answers else 200
+        if code == "raise":
+            raise ConnectionError("connection reset")
+        if code != 200:
+            return SMSResponse(
+                sid="", status="failed", to=sms.to, body=sms.body, error=f"HTTP {code}", status_code=code
+            )
+        return SMSResponse(sid=f"RC-{len(self.sends)}", status="Queued", to=sms.to, body=sms.body,
+                           from_number=sms.from_number or "+15555550100")
+
+
+@pytest.fixture
+def dispatcher(sessions, monkeypatch):
+    def make(provider, **kwargs):
+        kwargs.setdefault("rate_per_number", 1000)
+        kwargs.setdefault("retry_base", 0.01)
+        instance = SMSDispatcher(transport=provider, session_factory=sessions, **kwargs)
+        monkeypatch.setattr(sms_dispatcher, "_dispatcher", instance)
+        return instance
+
+    return make
+
+
+async def _rows(sessions):
+    async with sessions() as db:
+        return {row.to_number: row for row in (await db.execute(select(Message))).scalars()}
+
+
+class TestSMSDispatcher:
+    async def test_sends_only_after_the_callers_commit(self, sessions, dispatcher):
+        provider = Provider()
+        instance = dispatcher(provider)
+
+        async with sessions() as db:
+            enqueue_sms("+16155550001", "Rolled back", db=db)
+            await db.rollback()
+            message_id = enqueue_sms("+16155550002", "Your tank is due", db=db)
+            await db.flush()
+            assert provider.sends == []
+            await db.commit()
+
+        await instance.flush()
+
+        rows = await _rows(sessions)
+        assert [to for _, to, _ in provider.sends] == ["+16155550002"]
+        assert list(rows) == ["+16155550002"]
+        row = rows["+16155550002"]
+        assert row.id == message_id
+        assert (row.status, row.external_id, row.direction, row.message_type) == ("sent", "RC-1", "outbound", "sms")
+        assert row.sent_at is not None
+        await instance.stop()
+
+    async def test_each_sender_number_has_its_own_rate_limit(self, sessions, dispatcher):
+        provider = Provider(delay=0.01)
+        instance = dispatcher(provider, rate_per_number=40)
+
+        started = time.monotonic()
+        for n in range(4):
+            for sender in ("+15125550100", "+16155550100"):
+                instance.enqueue(OutboundSMS(f"+1{sender[2:5]}555000{n}", "Hi", from_number=sender))
+        await instance.flush()
+        elapsed = time.monotonic() - started
+
+        # Four per lane at 40/s: the first uses the banked token, the rest wait ~25 ms each
+        assert elapsed >= 0.07
+        lanes = [[at for number, _, at in provider.sends if number == sender] for sender in instance._lanes]
+        assert [len(times) for times in lanes] == [4, 4]
+        assert all(times[-1] - times[0] >= 0.07 for times in lanes)
+        # ...and the two numbers send side by side
+        assert abs(lanes[0][0] - lanes[1][0]) < 0.02
+        assert len(await _rows(sessions)) == 8
+        await instance.stop()
+
+    async def test_transient_failures_are_retried_and_others_are_final(self, sessions, dispatcher):
+        provider = Provider({
+            "+16155550001": [503, "raise"],
+            "+16155550002": [400],
+            "+16155550003": [429, 429, 429, 429],
+        })
+        instance = dispatcher(provider, max_attempts=4)
+
+        for n in (1, 2, 3):
+            enqueue_sms(f"+1615555000{n}", "Alert")
+        await instance.flush()
+
+        rows = await _rows(sessions)
+        assert rows["+16155550001"].status == "sent"
+        assert (rows["+16155550002"].status, rows["+16155550002"].error_message) == ("failed", "HTTP 400")
+        assert rows["+16155550003"].status == "failed"
+        attempts = [to for _, to, _ in provider.sends]
+        assert [attempts.count(f"+1615555000{n}") for n in (1, 2, 3)] == [3, 1, 4]
+        assert instance.stats == {"sent": 1, "failed": 2, "retried": 5, "dropped": 0}
+        assert instance.depth == 0
+        await instance.stop()
+
+    async def test_full_queue_and_stopped_dispatcher_record_failures(self, sessions, dispatcher):
+        provider = Provider()
+        instance = dispatcher(provider, max_queue=1)
+        instance.start()
+
+        assert instance.enqueue(OutboundSMS("+16155550001", "First"))
+        assert not instance.enqueue(OutboundSMS("+16155550002", "Second"))
+        await instance.stop()
+        assert not instance.enqueue(OutboundSMS("+16155550003", "Third"))
+        await instance._write_batch()
+
+        rows = await _rows(sessions)
+        assert rows["+16155550001"].status == "sent"
+        assert rows["+16155550002"].error_message == "SMS queue full"
+        assert rows["+16155550003"].error_message == "SMS dispatcher stopped"
+        assert instance.stats["dropped"] == 2
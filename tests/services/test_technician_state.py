@@ -0,0 +1,221 @@
+"""
+Tests for the technician state snapshot and the recommendations built on it.
+"""
+
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.customer import Customer
+from app.models.gps_tracking import TechnicianLocation
+from app.models.technician import Technician
+from app.models.work_order import WorkOrder
+from app.services import technician_state
+from app.services.dispatch_service import recommend_for_many, recommend_technicians
+from app.services.technician_state import TechnicianState
+
+DAY = date.today()
+JOB = (35.60, -87.40)
+FAR = (35.60, -86.70)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tables = [Customer.__table__, Technician.__table__, WorkOrder.__table__, TechnicianLocation.__table__]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+def sessions(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+def state(monkeypatch):
+    """A fresh per-test snapshot, also used by the ORM listeners."""
+    fresh = TechnicianState()
+    monkeypatch.setattr(technician_state, "_state", fresh)
+    return fresh
+
+
+@pytest_asyncio.fixture
+async def crew(sessions):
+    async with sessions() as db:
+        customer = Customer(id=uuid.uuid4(), first_name="Pat", last_name="Lee")
+        near = Technician(
+            id=uuid.uuid4(), first_name="Nia", last_name="R", home_latitude=JOB[0] + 0.01, home_longitude=JOB[1],
+            skills=["pumping"], is_active=True,
+        )
+        far = Technician(
+            id=uuid.uuid4(), first_name="Fay", last_name="S", home_latitude=FAR[0], home_longitude=FAR[1],
+            skills=["pumping", "repair"], is_active=True, assigned_vehicle="Truck 7",
+        )
+        db.add_all([customer, near, far])
+        jobs = {
+            name: WorkOrder(
+                id=uuid.uuid4(), customer_id=customer.id, job_type=job_type, status="pending",
+                scheduled_date=DAY, service_latitude=JOB[0], service_longitude=JOB[1],
+            )
+            for name, job_type in (("pump", "pumping"), ("repair", "repair"))
+        }
+        db.add_all(jobs.values())
+        await db.commit()
+    return {"near": str(near.id), "far": str(far.id), **{k: str(v.id) for k, v in jobs.items()}}
+
+
+def _ranking(result):
+    return [t["technician_id"] for t in result["recommended_technicians"]]
+
+
+class TestRecommendations:
+    async def test_ranks_by_distance_and_skills(self, sessions, state, crew):
+        async with sessions() as db:
+            pump, repair, missing = await recommend_for_many(
+                db, [crew["pump"], crew["repair"], str(uuid.uuid4())], state=state
+            )
+
+        assert _ranking(pump) == [crew["near"], crew["far"]]
+        assert pump["recommended_technicians"][0]["location_source"] == "home"
+        assert pump["recommended_technicians"][0]["score"] == 100
+        # Only the far technician repairs
+        assert _ranking(repair)[0] == crew["far"]
+        assert repair["recommended_technicians"][1]["skills_missing"] == ["repair"]
+        assert missing["error"] == "Work order not found"
+
+    async def test_single_recommendation_keeps_its_shape(self, sessions, state, crew):
+        async with sessions() as db:
+            result = await recommend_technicians(db, crew["pump"], max_results=1)
+
+        assert result["total_active_technicians"] == 2
+        assert result["job_location"]["lat"] == JOB[0]
+        assert len(result["recommended_technicians"]) == 1
+
+    async def test_repeat_calls_only_query_the_work_orders(self, engine, sessions, state, crew):
+        async with sessions() as db:
+            await recommend_for_many(db, [crew["pump"]], state=state)
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        async with sessions() as db:
+            await recommend_for_many(db, [crew["pump"], crew["repair"]], state=state)
+
+        assert len(statements) == 1
+        assert "work_orders" in statements[0]
+
+
+class TestIncrementalUpdates:
+    async def test_gps_fix_moves_a_technician(self, sessions, state, crew):
+        async with sessions() as db:
+            await recommend_for_many(db, [crew["pump"]], state=state)
+            state.record_gps(crew["far"], JOB[0], JOB[1] + 0.001, "available", datetime.utcnow())
+            (result,) = await recommend_for_many(db, [crew["pump"]], state=state)
+
+        by_id = {t["technician_id"]: t for t in result["recommended_technicians"]}
+        assert by_id[crew["far"]]["location_source"] == "gps"
+        assert by_id[crew["far"]]["distance_miles"] == 0.1
+        assert by_id[crew["far"]]["score"] == 100
+
+    async def test_location_rows_reach_the_snapshot(self, sessions, state, crew):
+        async with sessions() as db:
+            db.add(
+                TechnicianLocation(
+                    technician_id=uuid.UUID(crew["far"]), latitude=JOB[0], longitude=JOB[1],
+                    captured_at=datetime.utcnow(), current_status="available",
+                )
+            )
+            await db.commit()
+
+        assert state.gps[crew["far"]][:2] == (JOB[0], JOB[1])
+
+    async def test_samsara_vehicle_is_matched_by_assigned_vehicle(self, sessions, state, crew):
+        truck = SimpleNamespace(
+            id="281474", name="TRUCK 7", status="moving", location=SimpleNamespace(lat=JOB[0], lng=JOB[1])
+        )
+        state.record_vehicles([truck])
+        async with sessions() as db:
+            (result,) = await recommend_for_many(db, [crew["pump"]], state=state)
+
+        by_id = {t["technician_id"]: t for t in result["recommended_technicians"]}
+        assert by_id[crew["far"]]["location_source"] == "samsara"
+        assert by_id[crew["far"]]["distance_miles"] == 0
+
+    async def test_status_change_updates_workload_without_reloading(self, engine, sessions, state, crew):
+        async with sessions() as db:
+            await recommend_for_many(db, [crew["pump"]], state=state)
+            job = await db.get(WorkOrder, uuid.UUID(crew["repair"]))
+            job.technician_id = uuid.UUID(crew["near"])
+            job.status = "on_site"
+            await db.commit()
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        async with sessions() as db:
+            (result,) = await recommend_for_many(db, [crew["pump"]], state=state)
+
+        assert len(statements) == 1
+        near = next(t for t in result["recommended_technicians"] if t["technician_id"] == crew["near"])
+        assert near["availability"] == "on_job"
+        assert near["job_load"] == {"active_jobs": 1, "scheduled_today": 1}
+
+        async with sessions() as db:
+            job = await db.get(WorkOrder, uuid.UUID(crew["repair"]))
+            job.status = "completed"
+            await db.commit()
+        assert state.workload[DAY][1][crew["near"]] == [0, 0]
+
+    async def test_technician_edit_keeps_the_old_roster_until_reloaded(self, sessions, state, crew):
+        async with sessions() as db:
+            await recommend_for_many(db, [crew["pump"]], state=state)
+            old = state.roster
+            far = await db.get(Technician, uuid.UUID(crew["far"]))
+            far.is_active = False
+            await db.commit()
+
+            # Readers in between still see a complete roster
+            assert state.roster is old
+            assert len(state.positions().lat) == 2
+            (result,) = await recommend_for_many(db, [crew["pump"]], state=state)
+
+        assert state.roster is not old
+        assert _ranking(result) == [crew["near"]]
+
+    async def test_invalidation_during_roster_load_is_kept(self, sessions, state, crew):
+        load = state._load_roster
+
+        async def load_then_edit(db):
+            roster = await load(db)
+            state.invalidate_roster()  # a technician write committed while the roster loaded
+            return roster
+
+        state._load_roster = load_then_edit
+        async with sessions() as db:
+            await state.refresh(db)
+            state._load_roster = load
+            first = state.roster
+            await state.refresh(db)
+
+        assert state.roster is not first
+
+    async def test_rollback_discards_changes(self, sessions, state, crew):
+        async with sessions() as db:
+            await recommend_for_many(db, [crew["pump"]], state=state)
+            job = await db.get(WorkOrder, uuid.UUID(crew["pump"]))
+            job.technician_id = uuid.UUID(crew["near"])
+            await db.flush()
+            await db.rollback()
+
+        assert crew["near"] not in state.workload[DAY][1]
@@ -1,8 +1,8 @@
 """Tests for the AI strategy scheduler.
 
-Verify the start function registers a Sunday 06:00 America/Chicago job
-and that the run target (run_strategy_and_email) calls run_weekly_strategy
-without hitting Anthropic.
+Verify the module registers a Sunday 06:00 America/Chicago job with the
+job scheduler and that the run target (run_strategy_and_email) calls
+run_weekly_strategy without hitting Anthropic.
 """
 from __future__ import annotations
 
@@ -19,6 +19,7 @@ import pytest
 import uuid as uuid_module
 
 from app.models.interaction_insight import InteractionInsight
+from app.services.job_scheduler import JOBS
 from app.tasks import ai_strategy_scheduler
 from app.tasks import ai_rescore_scheduler
 from app.tasks import ai_budget_scheduler
@@ -28,19 +29,11 @@ from app.tasks import ai_rc_poll_scheduler
 # ---------------------------------------------------------------------------
 # Strategy scheduler
 # ---------------------------------------------------------------------------
-@pytest.mark.asyncio
-async def test_start_ai_strategy_scheduler_registers_job():
-    # Ensure a clean global scheduler state per test.
-    ai_strategy_scheduler.scheduler = None
-    try:
-        ai_strategy_scheduler.start_ai_strategy_scheduler()
-        sched = ai_strategy_scheduler.get_scheduler()
-        jobs = sched.get_jobs()
-        ids = {j.id for j in jobs}
-        assert "ai_strategy_weekly" in ids
-    finally:
-        ai_strategy_scheduler.stop_ai_strategy_scheduler()
-        ai_strategy_scheduler.scheduler = None
+def test_ai_strategy_scheduler_registers_job():
+    job = JOBS["ai_strategy_weekly"]
+    assert job.func is ai_strategy_scheduler.run_strategy_and_email
+    assert str(job.trigger) == "cron[day_of_week='sun', hour='6', minute='0']"
+    assert str(job.trigger.timezone) == "America/Chicago"
 
 
 @pytest.mark.asyncio
@@ -87,43 +80,19 @@ async def test_run_strategy_and_email_invokes_strategy():
 # ---------------------------------------------------------------------------
 # Rescore scheduler
 # ---------------------------------------------------------------------------
-@pytest.mark.asyncio
-async def test_start_ai_rescore_scheduler_registers_job():
-    ai_rescore_scheduler.scheduler = None
-    try:
-        ai_rescore_scheduler.start_ai_rescore_scheduler()
-        ids = {j.id for j in ai_rescore_scheduler.get_scheduler().get_jobs()}
-        assert "ai_rescore_daily" in ids
-    finally:
-        ai_rescore_scheduler.stop_ai_rescore_scheduler()
-        ai_rescore_scheduler.scheduler = None
+def test_ai_rescore_scheduler_registers_job():
+    assert JOBS["ai_rescore_daily"].func is ai_rescore_scheduler.rescore_stale_hot_leads
 
 
 # ---------------------------------------------------------------------------
 # Budget scheduler
 # ---------------------------------------------------------------------------
-@pytest.mark.asyncio
-async def test_start_ai_budget_scheduler_registers_job():
-    ai_budget_scheduler.scheduler = None
-    try:
-        ai_budget_scheduler.start_ai_budget_scheduler()
-        ids = {j.id for j in ai_budget_scheduler.get_scheduler().get_jobs()}
-        assert "ai_budget_daily" in ids
-    finally:
-        ai_budget_scheduler.stop_ai_budget_scheduler()
-        ai_budget_scheduler.scheduler = None
+def test_ai_budget_scheduler_registers_job():
+    assert JOBS["ai_budget_daily"].func is ai_budget_scheduler.report_yesterday_spend
 
 
 # ---------------------------------------------------------------------------
 # RC poll scheduler
 # ---------------------------------------------------------------------------
-@pytest.mark.asyncio
-async def test_start_ai_rc_poll_scheduler_registers_job():
-    ai_rc_poll_scheduler.scheduler = None
-    try:
-        ai_rc_poll_scheduler.start_ai_rc_poll_scheduler()
-        ids = {j.id for j in ai_rc_poll_scheduler.get_scheduler().get_jobs()}
-        assert "ai_rc_poll_hourly" in ids
-    finally:
-        ai_rc_poll_scheduler.stop_ai_rc_poll_scheduler()
-        ai_rc_poll_scheduler.scheduler = None
+def test_ai_rc_poll_scheduler_registers_job():
+    assert JOBS["ai_rc_poll_hourly"].func is ai_rc_poll_scheduler.poll_missed_recordings
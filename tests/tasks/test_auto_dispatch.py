@@ -0,0 +1,55 @@
+"""Tests for the overnight auto-dispatch job: it plans the next business day in America/Chicago."""
+
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+from app.services.job_scheduler import JOBS
+from app.tasks import auto_dispatch
+
+# 18:00 CST on Monday 2 March is already Tuesday 3 March in UTC
+FIRE_TIME = datetime(2026, 3, 3, 0, 0, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FIRE_TIME.astimezone(tz) if tz else FIRE_TIME.replace(tzinfo=None)
+
+
+def test_job_fires_at_18_chicago():
+    job = JOBS["auto_dispatch_day_plan"]
+    assert job.func is auto_dispatch.auto_dispatch_unassigned
+    assert str(job.trigger.timezone) == "America/Chicago"
+
+
+async def test_plans_tomorrow_in_chicago_when_utc_is_past_midnight(monkeypatch):
+    planned, alerts = [], []
+
+    @asynccontextmanager
+    async def session_maker():
+        yield None
+
+    async def fake_create(db, day, created_by=None):
+        planned.append(day)
+        return SimpleNamespace(id=uuid.uuid4())
+
+    async def fake_run(plan_id):
+        return SimpleNamespace(id=plan_id, status="proposed", summary={"assigned_count": 3, "unassigned_count": 1})
+
+    async def fake_alert(count, target_date):
+        alerts.append(target_date)
+
+    monkeypatch.setattr(auto_dispatch, "datetime", _FrozenDatetime)
+    monkeypatch.setattr(auto_dispatch, "async_session_maker", session_maker)
+    monkeypatch.setattr(auto_dispatch, "create_day_plan", fake_create)
+    monkeypatch.setattr(auto_dispatch, "run_day_plan", fake_run)
+    monkeypatch.setattr(auto_dispatch, "_send_unassigned_alert", fake_alert)
+
+    result = await auto_dispatch.auto_dispatch_unassigned()
+
+    # The UTC date would have made this Wednesday 4 March
+    assert planned == [date(2026, 3, 3)]
+    assert alerts == [date(2026, 3, 3)]
+    assert result["proposed"] == 3
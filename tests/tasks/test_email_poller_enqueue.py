@@ -7,7 +7,6 @@ row's ID and channel="email"; that already-seen messages do NOT enqueue;
 and that an enqueue failure does not crash the poll cycle.
 """
 
-import asyncio
 import uuid
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -72,14 +71,6 @@ async def poller_session_maker():
     await engine.dispose()
 
 
-async def _drain_pending_tasks():
-    """Yield control so any asyncio.create_task() coroutines run to completion."""
-    # Two passes: first to schedule, second to drain. Some create_task calls may
-    # themselves schedule follow-up work.
-    for _ in range(3):
-        await asyncio.sleep(0)
-
-
 @pytest.mark.asyncio
 async def test_enqueue_called_for_each_new_inbound_email(poller_session_maker):
     """For each new InboundEmail row, enqueue_interaction_analysis is called once with channel='email'."""
@@ -93,7 +84,6 @@ async def test_enqueue_called_for_each_new_inbound_email(poller_session_maker):
          patch("app.services.ai.queue.enqueue_interaction_analysis", new=fake_enqueue):
 
         await email_poller.poll_inbound_emails()
-        await _drain_pending_tasks()
 
     # Verify rows landed in DB
     async with poller_session_maker() as db:
@@ -138,7 +128,6 @@ async def test_enqueue_not_called_for_duplicate_email(poller_session_maker):
          patch("app.services.ai.queue.enqueue_interaction_analysis", new=fake_enqueue):
 
         await email_poller.poll_inbound_emails()
-        await _drain_pending_tasks()
 
     # No new row should have been created (dedup hit)
     async with poller_session_maker() as db:
@@ -154,39 +143,21 @@ async def test_enqueue_failure_does_not_crash_poll_cycle(poller_session_maker):
     """If enqueue_interaction_analysis raises, the poll cycle still completes successfully."""
     emails = [_email_payload("msg-crash-1"), _email_payload("msg-crash-2", "eve@example.com", "Eve")]
 
-    # Raising AsyncMock — every await raises. Wrapped in try/except inside the poller
-    # via asyncio.create_task; the create_task call itself succeeds, but the coroutine
-    # will raise when awaited. We additionally verify the poller's own try/except path
-    # by patching create_task to raise synchronously for one call.
-    raising_enqueue = AsyncMock(side_effect=RuntimeError("boom"))
-
-    original_create_task = asyncio.create_task
-    call_count = {"n": 0}
-
-    def flaky_create_task(coro, *args, **kwargs):
-        call_count["n"] += 1
-        if call_count["n"] == 1:
-            # Close the coroutine so we don't leak it, then raise to exercise
-            # the poller's try/except around create_task.
-            try:
-                coro.close()
-            except Exception:
-                pass
-            raise RuntimeError("create_task failed")
-        return original_create_task(coro, *args, **kwargs)
+    # The first enqueue raises; the poller logs it and still enqueues the second row
+    flaky_enqueue = AsyncMock(side_effect=[RuntimeError("boom"), None])
 
     with patch.object(email_poller.MS365EmailService, "is_configured", return_value=True), \
          patch.object(email_poller.MS365EmailService, "get_unread_emails", new=AsyncMock(return_value=emails)), \
          patch.object(email_poller.MS365EmailService, "mark_as_read", new=AsyncMock(return_value=True)), \
-         patch("app.services.ai.queue.enqueue_interaction_analysis", new=raising_enqueue), \
-         patch.object(email_poller.asyncio, "create_task", side_effect=flaky_create_task):
+         patch("app.services.ai.queue.enqueue_interaction_analysis", new=flaky_enqueue):
 
         # Should NOT raise
         await email_poller.poll_inbound_emails()
-        await _drain_pending_tasks()
 
     # Both rows should still be persisted — DB commit happens before enqueue
     async with poller_session_maker() as db:
         from sqlalchemy import select
         rows = (await db.execute(select(InboundEmail))).scalars().all()
         assert len(rows) == 2
+
+    assert flaky_enqueue.await_count == 2
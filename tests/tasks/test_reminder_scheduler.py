@@ -19,23 +19,23 @@ from app.tasks.reminder_scheduler import (
     check_and_send_reminders,
     process_schedule_reminders,
     update_schedule_statuses,
-    get_scheduler,
 )
+from app.services.job_scheduler import JOBS
 
 
 class TestSchedulerSetup:
-    """Tests for scheduler initialization."""
-
-    def test_get_scheduler_returns_scheduler(self):
-        """Test that get_scheduler returns a scheduler instance."""
-        scheduler = get_scheduler()
-        assert scheduler is not None
-
-    def test_get_scheduler_singleton(self):
-        """Test that get_scheduler returns the same instance."""
-        scheduler1 = get_scheduler()
-        scheduler2 = get_scheduler()
-        assert scheduler1 is scheduler2
+    """Tests for job registration."""
+
+    def test_jobs_are_registered(self):
+        """Test that both jobs are registered with the job scheduler."""
+        assert JOBS["service_reminders"].func is check_and_send_reminders
+        assert JOBS["update_schedule_statuses"].func is update_schedule_statuses
+
+    def test_statuses_update_before_reminders_and_catch_up(self):
+        """Test that statuses update at 6 AM, reminders go out at 8 AM, and missed days run once."""
+        assert str(JOBS["update_schedule_statuses"].trigger) == "cron[hour='6', minute='0']"
+        assert str(JOBS["service_reminders"].trigger) == "cron[hour='8', minute='0']"
+        assert {JOBS[name].misfire for name in ("service_reminders", "update_schedule_statuses")} == {"run_once"}
 
 
 class TestUpdateScheduleStatuses:
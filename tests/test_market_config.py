@@ -5,6 +5,7 @@ from app.services.market_config import (
     lookup_city,
     point_in_polygon,
     get_zone,
+    market_bbox,
     DEFAULT_MARKET_SLUG,
 )
 
@@ -113,3 +114,19 @@ def test_get_zone_far_away_is_outside():
 def test_get_zone_no_polygons():
     zone = get_zone(29.88, -97.94, "san_marcos")
     assert zone == "outside"
+
+
+def test_market_bbox_covers_service_polygons():
+    min_lat, min_lng, max_lat, max_lng = market_bbox("nashville")
+    assert (min_lat, max_lat) == (35.30, 36.32)
+    assert (min_lng, max_lng) == (-87.45, -86.05)
+
+
+def test_market_bbox_without_polygons_boxes_the_center():
+    min_lat, min_lng, max_lat, max_lng = market_bbox("san_marcos")
+    assert min_lat < 29.8833 < max_lat
+    assert min_lng < -97.9414 < max_lng
+
+
+def test_market_bbox_unknown():
+    assert market_bbox("atlantis") is None
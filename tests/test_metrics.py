@@ -0,0 +1,204 @@
+"""
+Tests for the Prometheus metrics registry (app.core.metrics).
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core import metrics
+from app.core.metrics import Counter, Histogram, get_registry
+from app.middleware import MetricsMiddleware
+
+
+@pytest.fixture
+def registry():
+    registry = get_registry()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+class TestHistogram:
+    def test_bucket_bounds_are_inclusive(self):
+        histogram = Histogram("h", "help", ("path",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 1.0, 7.0):
+            histogram.observe(value, ("/x",))
+
+        counts, total = histogram.series()[("/x",)]
+        assert counts == [2, 2, 1]
+        assert total == pytest.approx(8.65)
+
+    def test_rendered_buckets_are_cumulative(self, registry):
+        for value in (0.001, 0.2, 30.0):
+            registry.http_request_duration.observe(value, ("GET", "/ping"))
+
+        text = registry.format_prometheus()
+        assert 'http_request_duration_seconds_bucket{method="GET",path="/ping",le="0.005"} 1' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",path="/ping",le="0.25"} 2' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",path="/ping",le="+Inf"} 3' in text
+        assert 'http_request_duration_seconds_count{method="GET",path="/ping"} 3' in text
+
+
+class TestSeriesCap:
+    def test_extra_label_sets_share_overflow_series(self):
+        counter = Counter("c", "help", ("path",), max_series=2)
+        for path in ("/a", "/b", "/c", "/d", "/a"):
+            counter.inc(labels=(path,))
+
+        assert counter.value(("/a",)) == 2
+        assert counter.value((metrics.OVERFLOW_LABEL,)) == 2
+        assert counter.overflowed == 2
+        assert len(counter.series()) == 3
+
+    def test_overflow_is_exported(self, registry, monkeypatch):
+        monkeypatch.setattr(registry.errors_total, "max_series", 1)
+        metrics.track_error("timeout")
+        metrics.track_error("refused")
+
+        text = registry.format_prometheus()
+        assert 'crm_errors_total{type="__overflow__"} 1.0' in text
+        assert 'crm_metrics_overflow_total{metric="crm_errors_total"} 1' in text
+
+    def test_label_values_are_escaped(self, registry):
+        metrics.track_error('bad "quote"\n')
+        assert 'crm_errors_total{type="bad \\"quote\\"\\n"} 1.0' in registry.format_prometheus()
+
+
+class TestRouteLabels:
+    @pytest.fixture
+    async def client(self):
+        async def item(request):
+            return PlainTextResponse("ok")
+
+        app = Starlette(routes=[Route("/api/v2/items/{item_id}", item)])
+        app.add_middleware(MetricsMiddleware)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+
+    async def test_requests_are_labelled_by_route_template(self, registry, client):
+        for item_id in ("1", "2", "some-slug", "abc?x=1"):
+            await client.get(f"/api/v2/items/{item_id}")
+        await client.get("/wp-admin/setup.php")
+
+        totals = registry.http_requests_total.series()
+        assert totals == {
+            ("GET", "200", "/api/v2/items/{item_id}"): 4.0,
+            ("GET", "404", metrics.UNMATCHED_ROUTE): 1.0,
+        }
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+class TestMultiprocess:
+    def _write(self, directory, pid, families, boot=None):
+        data = {"pid": pid, "boot": boot, "families": families}
+        (directory / f"metrics-{pid}.json").write_text(json.dumps(data))
+
+    def test_snapshots_are_merged(self, registry, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+        metrics.track_cache_hit("dash", "l1")
+        registry.http_request_duration.observe(0.2, ("GET", "/ping"))
+        registry.http_requests_in_flight.set(1)
+
+        dead = _dead_pid()
+        self._write(
+            tmp_path,
+            dead,
+            {
+                "crm_cache_hits_total": [[["dash", "l1"], 4.0]],
+                "http_request_duration_seconds": [[["GET", "/ping"], [[1] + [0] * 11, 0.001]]],
+                "http_requests_in_flight": [[[], 5.0]],
+            },
+        )
+
+        text = registry.format_prometheus()
+        assert (tmp_path / f"metrics-{metrics.os.getpid()}.json").exists()
+        # Counters and histograms keep the totals of workers that exited
+        assert 'crm_cache_hits_total{namespace="dash",tier="l1"} 5.0' in text
+        assert 'http_request_duration_seconds_count{method="GET",path="/ping"} 2' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",path="/ping",le="0.005"} 1' in text
+        # Gauges only count live workers
+        assert "http_requests_in_flight 1" in text
+
+    def test_shutdown_archives_and_removes_the_worker_snapshot(self, registry, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+        metrics.track_cache_hit("dash", "l1")
+        registry.http_requests_in_flight.set(3)
+
+        registry.retire_snapshot()
+
+        assert sorted(f.name for f in tmp_path.glob("*.json")) == ["metrics-archive.json"]
+        # A worker started later still reports the counter, but not the gauge
+        registry.reset()
+        text = registry.format_prometheus()
+        assert 'crm_cache_hits_total{namespace="dash",tier="l1"} 1.0' in text
+        assert "http_requests_in_flight 0" in text
+
+    def test_startup_prunes_snapshots_of_dead_workers(self, registry, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+        for _ in range(2):
+            self._write(
+                tmp_path,
+                _dead_pid(),
+                {"crm_cache_hits_total": [[["dash", "l1"], 2.0]], "http_requests_in_flight": [[[], 5.0]]},
+            )
+        registry.write_snapshot()
+
+        assert registry.prune_snapshots() == 2
+        own = f"metrics-{metrics.os.getpid()}.json"
+        assert {f.name for f in tmp_path.glob("*.json")} == {"metrics-archive.json", own}
+        text = registry.format_prometheus()
+        assert 'crm_cache_hits_total{namespace="dash",tier="l1"} 4.0' in text
+        assert "http_requests_in_flight 0" in text
+
+    def test_snapshot_of_an_earlier_process_with_our_pid_is_archived(self, registry, tmp_path, monkeypatch):
+        # PID 1 again after a container restart: same PID, different boot token
+        monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+        pid = metrics.os.getpid()
+        previous = {"id": "previous-boot", "started": metrics._boot_token()["started"]}
+        families = {"crm_cache_hits_total": [[["dash", "l1"], 2.0]], "http_requests_in_flight": [[[], 5.0]]}
+        self._write(tmp_path, pid, families, boot=previous)
+
+        # Archived rather than overwritten by this worker's first snapshot
+        metrics.track_cache_hit("dash", "l1")
+        text = registry.format_prometheus()
+        assert 'crm_cache_hits_total{namespace="dash",tier="l1"} 3.0' in text
+        assert "http_requests_in_flight 0" in text
+
+        self._write(tmp_path, pid, families, boot=previous)
+        assert registry.prune_snapshots() == 1
+
+    def test_reused_sibling_pid_is_archived(self, registry, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+        sibling = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            started = metrics._process_started(sibling.pid)
+            if started is None:
+                pytest.skip("needs /proc")
+            families = {"crm_cache_hits_total": [[["dash", "l1"], 2.0]]}
+            # Written by an exited worker whose PID the sibling now has
+            self._write(tmp_path, sibling.pid, families, boot={"id": "dead", "started": started - 1})
+            assert registry.prune_snapshots() == 1
+
+            self._write(tmp_path, sibling.pid, families, boot={"id": "live", "started": started})
+            assert registry.prune_snapshots() == 0
+        finally:
+            sibling.kill()
+            sibling.wait()
+
+    def test_unreadable_snapshot_is_skipped(self, registry, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+        (tmp_path / "metrics-1.json").write_text("{not json")
+        metrics.track_error("timeout")
+        assert 'crm_errors_total{type="timeout"} 1.0' in registry.format_prometheus()
@@ -0,0 +1,156 @@
+"""
+Tests for the pure-ASGI middleware stack (app.middleware).
+"""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.metrics import get_registry
+from app.middleware import (
+    CacheHeadersMiddleware,
+    CorrelationIdMiddleware,
+    MetricsMiddleware,
+    ProxyHeadersMiddleware,
+    SecurityHeadersMiddleware,
+    ServerTimingMiddleware,
+    correlation_id_ctx,
+)
+
+
+async def ping(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def items(request):
+    return JSONResponse(
+        {
+            "correlation_id": request.state.correlation_id,
+            "ctx": correlation_id_ctx.get(),
+            "scheme": request.url.scheme,
+        }
+    )
+
+
+async def missing(request):
+    return PlainTextResponse("nope", status_code=404)
+
+
+async def boom(request):
+    raise RuntimeError("boom")
+
+
+async def preview(request):
+    return PlainTextResponse("<html></html>", media_type="text/html")
+
+
+async def stream(request):
+    async def events():
+        for i in range(3):
+            yield f"data: {i}\n\n"
+            await asyncio.sleep(0)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def build_app():
+    app = Starlette(
+        routes=[
+            Route("/ping", ping),
+            Route("/api/v2/items", items, methods=["GET", "POST"]),
+            Route("/api/v2/missing", missing),
+            Route("/api/v2/boom", boom),
+            Route("/api/v2/documents/1/html", preview),
+            Route("/api/v2/stream", stream),
+        ]
+    )
+    # Same order as app/main.py
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(CacheHeadersMiddleware)
+    app.add_middleware(ProxyHeadersMiddleware)
+    app.add_middleware(CorrelationIdMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=build_app(), raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+class TestHeaders:
+    async def test_security_and_timing_headers(self, client):
+        response = await client.get("/ping")
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "default-src 'none'" in response.headers["Content-Security-Policy"]
+        assert response.headers["Server-Timing"].startswith("total;dur=")
+        assert response.headers["X-Response-Time"].endswith("ms")
+
+    async def test_iframe_preview_csp(self, client):
+        response = await client.get("/api/v2/documents/1/html")
+        assert response.headers["X-Frame-Options"].startswith("ALLOW-FROM")
+        assert "frame-ancestors https://react.ecbtx.com" in response.headers["Content-Security-Policy"]
+
+    async def test_correlation_ids(self, client):
+        response = await client.get("/api/v2/items", headers={"X-Correlation-ID": "abc"})
+        assert response.headers["X-Correlation-ID"] == "abc"
+        assert response.headers["X-Request-ID"]
+        assert response.json()["correlation_id"] == "abc"
+        assert response.json()["ctx"] == "abc"
+        assert correlation_id_ctx.get() == ""
+
+    async def test_forwarded_proto(self, client):
+        response = await client.get("/api/v2/items", headers={"X-Forwarded-Proto": "https"})
+        assert response.json()["scheme"] == "https"
+
+
+class TestCacheHeaders:
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("/ping", "public, max-age=30, stale-while-revalidate=60"),
+            ("/api/v2/items", "private, no-cache"),
+        ],
+    )
+    async def test_get(self, client, path, expected):
+        assert (await client.get(path)).headers["Cache-Control"] == expected
+
+    async def test_writes_are_no_store(self, client):
+        assert (await client.post("/api/v2/items")).headers["Cache-Control"] == "no-store"
+
+    async def test_errors_are_left_alone(self, client):
+        assert "Cache-Control" not in (await client.get("/api/v2/missing")).headers
+
+    def test_rules(self):
+        middleware = CacheHeadersMiddleware(app=None)
+        assert middleware.cache_control_for("GET", "/api/v2/technicians").startswith("private, max-age=60")
+        assert middleware.cache_control_for("GET", "/api/v2/technicians/1") == "private, no-cache"
+        assert middleware.cache_control_for("GET", "/static/app.js") is None
+
+
+class TestStreaming:
+    async def test_sse_chunks_pass_through(self, client):
+        chunks = []
+        async with client.stream("GET", "/api/v2/stream") as response:
+            assert response.headers["X-Frame-Options"] == "DENY"
+            async for chunk in response.aiter_text():
+                chunks.append(chunk)
+        assert "".join(chunks) == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+
+class TestMetrics:
+    async def test_status_is_recorded(self, client):
+        await client.get("/api/v2/missing")
+        await client.get("/api/v2/boom")
+
+        text = get_registry().format_prometheus()
+        assert 'status="404"' in text
+        assert 'status="500"' in text
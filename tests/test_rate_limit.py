@@ -0,0 +1,185 @@
+"""
+Tests for the async sliding-window rate limiter (app.core.rate_limit).
+
+Redis is replaced by a small stand-in whose registered script reproduces
+SLIDING_WINDOW_LUA in Python.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.rate_limit import AsyncRateLimiter, PublicAPIRateLimiter, SLIDING_WINDOW_LUA, close_rate_limiters
+
+
+class FakeScript:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+
+    async def __call__(self, keys, args):
+        redis = self._redis
+        redis.calls += 1
+        if redis.down:
+            raise ConnectionError("redis down")
+        key = keys[0]
+        now, window, limit, pending, member = float(args[0]), int(args[1]), int(args[2]), int(args[3]), args[4]
+        entries = {m: s for m, s in redis.zsets.get(key, {}).items() if s > now - window}
+        for i in range(1, pending + 1):
+            entries[f"{member}:{i}"] = now
+        allowed = 0
+        if len(entries) < limit:
+            entries[member] = now
+            allowed = 1
+        redis.zsets[key] = entries
+        return [allowed, len(entries), int(min(entries.values()) + window + 0.999)]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.calls = 0
+        self.down = False
+
+    def register_script(self, script):
+        assert script == SLIDING_WINDOW_LUA
+        return FakeScript(self)
+
+    async def delete(self, *keys):
+        return sum(1 for k in keys if self.zsets.pop(k, None) is not None)
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+class TestAsyncRateLimiter:
+    async def test_denies_over_limit(self, redis):
+        limiter = AsyncRateLimiter(redis)
+        results = [await limiter.hit("k", 5, 60) for _ in range(6)]
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert results[-1].remaining == 0
+        assert 1 <= results[-1].retry_after <= 61
+
+    async def test_denied_hits_are_not_recorded(self, redis):
+        limiter = AsyncRateLimiter(redis)
+        for _ in range(10):
+            await limiter.hit("k", 3, 60)
+        assert len(redis.zsets["k"]) == 3
+
+    async def test_clients_well_under_limit_skip_redis(self, redis):
+        limiter = AsyncRateLimiter(redis, lease_share=0.1)
+        for _ in range(50):
+            assert (await limiter.hit("k", 1000, 60)).allowed
+        assert redis.calls < 10
+        assert limiter.get_stats()["local_hits"] > 40
+
+    async def test_locally_admitted_hits_are_flushed_to_redis(self, redis):
+        limiter = AsyncRateLimiter(redis, lease_share=0.1)
+        for _ in range(12):
+            await limiter.hit("k", 1000, 60)
+        assert len(redis.zsets["k"]) == 1
+
+        # Expire the lease: the next round trip records the 11 local hits too
+        limiter._leases["k"].expires_at = 0
+        await limiter.hit("k", 1000, 60)
+        assert len(redis.zsets["k"]) == 13
+
+    async def test_expired_lease_is_flushed_without_another_hit(self, redis):
+        limiter = AsyncRateLimiter(redis, lease_share=0.1, lease_seconds=0.05)
+        for _ in range(12):
+            await limiter.hit("k", 1000, 60)
+        assert len(redis.zsets["k"]) == 1
+
+        await asyncio.sleep(0.15)
+        assert len(redis.zsets["k"]) == 12
+        assert limiter._leases == {}
+
+    async def test_close_flushes_pending_hits(self, redis):
+        limiter = AsyncRateLimiter(redis, lease_share=0.1, lease_seconds=60)
+        for _ in range(5):
+            await limiter.hit("k", 1000, 60)
+
+        await close_rate_limiters()
+        assert len(redis.zsets["k"]) == 5
+        assert limiter._flush_task is None
+
+    async def test_failed_flush_keeps_hits_for_the_next_one(self, redis):
+        limiter = AsyncRateLimiter(redis, lease_share=0.1, lease_seconds=60)
+        for _ in range(5):
+            await limiter.hit("k", 1000, 60)
+
+        redis.down = True
+        await limiter.flush(expired_only=False)
+        assert len(redis.zsets["k"]) == 1
+
+        redis.down = False
+        await limiter.flush()
+        assert len(redis.zsets["k"]) == 5
+        assert limiter._retired == []
+
+    async def test_failed_round_trip_keeps_the_lease_hits(self, redis):
+        limiter = AsyncRateLimiter(redis, lease_share=0.1, lease_seconds=60)
+        for _ in range(5):
+            await limiter.hit("k", 1000, 60)
+        limiter._leases["k"].expires_at = time.monotonic()
+
+        # The round trip carrying the 4 leased hits fails; this hit is admitted locally
+        redis.down = True
+        assert (await limiter.hit("k", 1000, 60)).allowed
+
+        redis.down = False
+        await limiter.close()
+        assert len(redis.zsets["k"]) == 5
+
+    async def test_no_lease_near_the_limit(self, redis):
+        limiter = AsyncRateLimiter(redis, lease_share=0.5)
+        for _ in range(8):
+            await limiter.hit("k", 10, 60)
+        calls = redis.calls
+        await limiter.hit("k", 10, 60)
+        assert redis.calls == calls + 1
+
+    async def test_open_circuit_falls_back_to_local_buckets(self, redis):
+        limiter = AsyncRateLimiter(redis, failure_threshold=2)
+        redis.down = True
+        results = [await limiter.hit("k", 3, 60) for _ in range(5)]
+
+        assert [r.allowed for r in results] == [True, True, True, False, False]
+        assert redis.calls == 2
+        assert limiter.get_stats()["circuit_state"] == "OPEN"
+
+    async def test_fail_closed_rejects_when_redis_down(self, redis):
+        limiter = AsyncRateLimiter(redis, fail_closed=True)
+        redis.down = True
+        with pytest.raises(HTTPException) as exc:
+            await limiter.hit("k", 3, 60)
+        assert exc.value.status_code == 503
+
+    async def test_local_only_without_redis(self):
+        limiter = AsyncRateLimiter()
+        results = [await limiter.hit("k", 2, 60) for _ in range(3)]
+        assert [r.allowed for r in results] == [True, True, False]
+        assert results[-1].retry_after >= 1
+
+
+class TestPublicAPIRateLimiter:
+    async def test_minute_limit_raises_429_with_headers(self, redis):
+        limiter = PublicAPIRateLimiter(redis_client=redis)
+        for _ in range(2):
+            await limiter.check_rate_limit("client", rate_limit_per_minute=2, rate_limit_per_hour=100)
+        with pytest.raises(HTTPException) as exc:
+            await limiter.check_rate_limit("client", rate_limit_per_minute=2, rate_limit_per_hour=100)
+
+        assert exc.value.status_code == 429
+        assert exc.value.headers["X-RateLimit-Limit"] == "2"
+        assert "Retry-After" in exc.value.headers
+
+    async def test_headers_reflect_last_check(self, redis):
+        limiter = PublicAPIRateLimiter(redis_client=redis)
+        assert limiter.get_rate_limit_headers("client", 10)["X-RateLimit-Remaining"] == "10"
+
+        await limiter.check_rate_limit("client", rate_limit_per_minute=10, rate_limit_per_hour=100)
+        assert limiter.get_rate_limit_headers("client", 10)["X-RateLimit-Remaining"] == "9"
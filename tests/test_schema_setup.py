@@ -0,0 +1,149 @@
+"""
+Tests for the startup schema setup (app.schema_setup): fingerprinting, skip when current, one runner at a time and
+retry after a failed step.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Column, Integer, MetaData, String, Table, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import schema_setup
+from app.config import settings
+from app.database import Base
+from app.models.schema_state import SchemaState
+from app.schema_setup import ensure_schema, run_schema_setup, schema_fingerprint
+
+calls = []
+
+
+async def ensure_widget_index():
+    calls.append("widget_index")
+    await asyncio.sleep(0.05)
+
+
+async def ensure_widget_index_v2():
+    calls.append("widget_index")
+    await asyncio.sleep(0.05)
+    calls.append("widget_index:v2")
+
+
+async def ensure_widget_column():
+    calls.append("widget_column")
+    schema_setup.logger.warning("Could not ensure widget column: OperationalError: database is locked")
+
+
+def _metadata(*extra_columns):
+    metadata = MetaData()
+    Table("widgets", metadata, Column("id", Integer, primary_key=True), Column("name", String(50)), *extra_columns)
+    return metadata
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest_asyncio.fixture
+async def bind(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[SchemaState.__table__])
+    yield engine
+    await engine.dispose()
+
+
+class _AcceptingSession:
+    """Stands in for app.database.async_session_maker: every statement the real steps run succeeds."""
+
+    def __init__(self):
+        self.execute = AsyncMock(return_value=MagicMock())
+        self.commit = AsyncMock()
+        self.rollback = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def _state(bind):
+    async with async_sessionmaker(bind, class_=AsyncSession)() as db:
+        return (await db.execute(select(SchemaState))).scalar_one_or_none()
+
+
+class TestFingerprint:
+    def test_changes_with_the_models_and_the_step_code(self):
+        base = schema_fingerprint([ensure_widget_index], _metadata())
+
+        assert schema_fingerprint([ensure_widget_index], _metadata()) == base
+        assert schema_fingerprint([ensure_widget_index], _metadata(Column("sku", String(20)))) != base
+        assert schema_fingerprint([ensure_widget_index], _metadata(Column("sku", String(40)))) != base
+        assert schema_fingerprint([ensure_widget_index_v2], _metadata()) != base
+        assert schema_fingerprint([], _metadata()) != base
+
+    def test_app_fingerprint_covers_every_setup_step(self):
+        assert schema_fingerprint() == schema_fingerprint()
+        assert schema_fingerprint() != schema_fingerprint(schema_setup.SETUP_STEPS[:-1])
+
+
+class TestSchemaSetup:
+    async def test_setup_runs_once_then_startup_skips_it(self, bind):
+        assert await ensure_schema(bind, [ensure_widget_index], _metadata()) is True
+        assert "widgets" in await _tables(bind)
+        state = await _state(bind)
+        assert state.fingerprint == schema_fingerprint([ensure_widget_index], _metadata())
+
+        for _ in range(3):
+            assert await ensure_schema(bind, [ensure_widget_index], _metadata()) is False
+        assert calls == ["widget_index"]
+
+        # A changed step (or model) makes the stored fingerprint stale
+        assert await ensure_schema(bind, [ensure_widget_index_v2], _metadata()) is True
+        assert calls == ["widget_index", "widget_index", "widget_index:v2"]
+
+    async def test_concurrent_workers_run_the_setup_once(self, bind):
+        ran = await asyncio.gather(*(ensure_schema(bind, [ensure_widget_index], _metadata()) for _ in range(8)))
+
+        assert sorted(ran) == [False] * 7 + [True]
+        assert calls == ["widget_index"]
+
+    async def test_failed_step_leaves_the_fingerprint_unrecorded(self, bind):
+        steps = [ensure_widget_index, ensure_widget_column]
+
+        assert await ensure_schema(bind, steps, _metadata()) is True
+        assert await _state(bind) is None
+        assert await ensure_schema(bind, steps, _metadata()) is True
+        assert calls == ["widget_index", "widget_column"] * 2
+
+    async def test_stale_schema_is_left_to_the_release_step_when_startup_setup_is_off(self, bind, monkeypatch):
+        monkeypatch.setattr(settings, "SCHEMA_SETUP_ON_STARTUP", False)
+
+        assert await ensure_schema(bind, [ensure_widget_index], _metadata()) is False
+        assert calls == []
+
+        assert await run_schema_setup(bind, [ensure_widget_index], _metadata()) is True
+        assert await run_schema_setup(bind, [ensure_widget_index], _metadata()) is False
+        assert await run_schema_setup(bind, [ensure_widget_index], _metadata(), force=True) is True
+        assert calls == ["widget_index", "widget_index"]
+
+    async def test_app_setup_steps_record_the_fingerprint(self, bind, monkeypatch):
+        # The real SETUP_STEPS (their Postgres DDL accepted by a stand-in session): a step that cannot even open a
+        # session, e.g. a missing import, logs a warning and would leave the fingerprint unrecorded on every start
+        monkeypatch.setattr("app.database.async_session_maker", _AcceptingSession)
+
+        assert await run_schema_setup(bind, metadata=MetaData()) is True
+        state = await _state(bind)
+        assert state is not None
+        assert state.fingerprint == schema_fingerprint(metadata=MetaData())
+        assert await ensure_schema(bind, metadata=MetaData()) is False
+
+
+async def _tables(bind):
+    async with bind.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
@@ -218,9 +218,7 @@ class TestRateLimiting:
         """Should enforce per-minute rate limit."""
         # Reset rate limiter
         rate_limiter = get_sms_rate_limiter()
-        rate_limiter._minute_windows.clear()
-        rate_limiter._hour_windows.clear()
-        rate_limiter._destination_windows.clear()
+        rate_limiter.reset()
 
         # Make requests up to limit (this will fail because Twilio isn't configured,
         # but we're testing the rate limit logic)
@@ -255,9 +253,7 @@ class TestRateLimiting:
         """Should enforce per-destination rate limit."""
         # Reset rate limiter
         rate_limiter = get_sms_rate_limiter()
-        rate_limiter._minute_windows.clear()
-        rate_limiter._hour_windows.clear()
-        rate_limiter._destination_windows.clear()
+        rate_limiter.reset()
 
         same_number = "+15551234567"
 
@@ -292,9 +288,7 @@ class TestRateLimiting:
         """Should include Retry-After header when rate limited."""
         # Reset and exhaust limit
         rate_limiter = get_sms_rate_limiter()
-        rate_limiter._minute_windows.clear()
-        rate_limiter._hour_windows.clear()
-        rate_limiter._destination_windows.clear()
+        rate_limiter.reset()
 
         # Exhaust per-destination limit
         same_number = "+15559999999"
@@ -339,9 +333,7 @@ class TestRBAC:
         """Regular users should have send_sms permission."""
         # Reset rate limiter
         rate_limiter = get_sms_rate_limiter()
-        rate_limiter._minute_windows.clear()
-        rate_limiter._hour_windows.clear()
-        rate_limiter._destination_windows.clear()
+        rate_limiter.reset()
 
         response = await authenticated_client.post(
             "/api/v2/communications/sms/send",
@@ -360,9 +352,7 @@ class TestRBAC:
         """Admin users should have all permissions."""
         # Reset rate limiter
         rate_limiter = get_sms_rate_limiter()
-        rate_limiter._minute_windows.clear()
-        rate_limiter._hour_windows.clear()
-        rate_limiter._destination_windows.clear()
+        rate_limiter.reset()
 
         response = await admin_client.post(
             "/api/v2/communications/sms/send",
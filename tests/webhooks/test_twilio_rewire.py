@@ -334,3 +334,44 @@ async def test_incoming_sms_bad_signature_returns_403(http_client):
 
     assert resp.status_code == 403
     enqueue_mock.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# /voice — inbound call screen pop + TwiML
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_incoming_voice_logs_call_and_returns_dial_twiml(http_client):
+    """POST /voice (valid sig, unknown caller) → CallLog added, screen pop broadcast
+    with the display-formatted caller, and TwiML dialing the forward number."""
+    fastapi_app.dependency_overrides[validate_twilio_signature] = _override_signature_valid(True)
+
+    db = _make_db_session([])
+    fake_manager = MagicMock()
+    fake_manager.broadcast_event = AsyncMock()
+
+    with patch("app.webhooks.twilio.async_session_maker", return_value=_FakeSessionCM(db)), \
+         patch("app.webhooks.twilio.phone_identity.resolve_customer", new=AsyncMock(return_value=None)), \
+         patch("app.webhooks.twilio.manager", new=fake_manager), \
+         patch("app.webhooks.twilio.settings") as mock_settings:
+        mock_settings.TWILIO_FORWARD_NUMBER = "+16155550199"
+        mock_settings.GOOGLE_STT_ENABLED = False
+
+        resp = await http_client.post(
+            "/webhooks/twilio/voice",
+            data={"CallSid": "CA" + "c" * 32, "From": "+16155550100", "To": "+16155550111"},
+        )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/xml")
+    assert "<Dial record=\"record-from-answer-dual\"" in resp.text
+    assert "+16155550199" in resp.text
+    assert "/webhooks/twilio/recording-status" in resp.text
+
+    db.add.assert_called_once()
+    db.commit.assert_awaited()
+    event, payload = fake_manager.broadcast_event.await_args.args
+    assert event == "incoming_call"
+    assert payload["caller_display"] == "(615) 555-0100"
+    assert payload["customer"] is None